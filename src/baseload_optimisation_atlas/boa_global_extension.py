@@ -1,7 +1,5 @@
 import numpy as np
 import xarray as xr
-import dask
-from dask import delayed
 from dask.distributed import Client
 import time
 import logging
@@ -22,15 +20,18 @@ from baseload_optimisation_atlas.boa_input_preprocessing import (
     process_global_baseload_simulation_costs,
 )
 from baseload_optimisation_atlas.boa_logic import (
-    capacity_sampling,
+    sample_design_space,
     return_global_average_costs,
-    filter_designs_according_to_coverage_and_calculate_costs,
+    calculate_costs_of_accepted_designs,
 )
 from baseload_optimisation_atlas.boa_plotting import (
     plot_regional_optimum_baseload_power_simulation_map,
     plot_global_optimum_baseload_power_simulation_map,
 )
 
+# Number of grid points whose profiles are extracted and sent to the workers at once
+POINT_BATCH_SIZE = 1000
+
 
 def extract_costs_for_point(
     lat: float,
@@ -117,11 +118,9 @@ def run_baseload_optimization_for_point(
     Optimize renewable energy system design for a grid point to minimize LCOE while meeting baseload demand coverage threshold.
 
     Steps:
-        1. Extract renewable energy profile for grid point and skip if zero potential
+        1. Extract renewable energy profile for grid point
         2. Calculate physical capacity limits based on grid area and minimum spacing (land use not considered)
-        3. Sample system designs and filter by hourly coverage threshold to obtain accepted designs
-        4. Calculate installation cost and LCOE for accepted designs
-        5. Select optimal design: accepted design with lowest LCOE
+        3. Optimize the design for the point's profile and limits (optimize_baseload_design)
 
     Args:
         lat: Latitude
@@ -141,11 +140,8 @@ def run_baseload_optimization_for_point(
             - LCOE (USD/MWh)
             - Installation cost (USD)
     """
-    # Get the profile for the current grid point; skipping grid points with zero potential
+    # Get the profile for the current grid point
     profile_grid_point_ds = profile.sel(x=lon, y=lat, method="nearest")
-    if np.sum(profile_grid_point_ds.solar.values) == 0 and np.sum(profile_grid_point_ds.wind.values) == 0:
-        logging.debug(f"Skipping grid point {lat}, {lon} due to zero potential.")
-        return {"solar": 0, "wind": 0, "battery": 0}, 0, 0
     profile_grid_point = {}
     for tech in ["solar", "wind"]:
         profile_grid_point[tech] = profile_grid_point_ds[tech].values.flatten()
@@ -155,15 +151,72 @@ def run_baseload_optimization_for_point(
     max_cap = max_cap_full.sel(x=lon, y=lat, method="nearest")
     overbuild_limit = {tech: float(max_cap[tech].values) / baseload_demand for tech in ["pv", "wind"]}
     overbuild_limit = {key.replace("pv", "solar"): value for key, value in overbuild_limit.items()}
+
+    return optimize_baseload_design(
+        lat,
+        lon,
+        profile_grid_point,
+        overbuild_limit,
+        baseload_demand,
+        costs,
+        storage_costs,
+        investment_horizon,
+        p,
+        n,
+    )
+
+
+def optimize_baseload_design(
+    lat: float,
+    lon: float,
+    profile_grid_point: dict[str, np.ndarray],
+    overbuild_limit: dict[str, float],
+    baseload_demand: float,
+    costs: xr.Dataset,
+    storage_costs: dict[str, np.ndarray],
+    investment_horizon: int,
+    p: int,
+    n: int,
+) -> tuple[dict, float, float]:
+    """
+    Optimize renewable energy system design for one grid point, given its profile and capacity limits.
+
+    Steps:
+        1. Skip grid points with zero potential
+        2. Sample system designs and filter by hourly coverage threshold to obtain accepted designs
+        3. Calculate installation cost and LCOE for accepted designs
+        4. Select optimal design: accepted design with lowest LCOE
+
+    Args:
+        lat: Latitude (used to look up the country's costs)
+        lon: Longitude (used to look up the country's costs)
+        profile_grid_point: Hourly solar and wind generation profiles of the grid point
+        overbuild_limit: Physical capacity limits for solar and wind as overscale factors relative to baseload demand
+        baseload_demand: Baseload demand (MW)
+        costs: Cost dataset
+        storage_costs: Battery storage cost parameters
+        investment_horizon: Investment horizon in years
+        p: Percentile threshold for demand coverage (e.g., 15 means 85% coverage required)
+        n: Number of random design samples
+
+    Returns:
+        Tuple containing:
+            - Optimal design dictionary with solar, wind, and battery overscale factors
+            - LCOE (USD/MWh)
+            - Installation cost (USD)
+    """
+    if np.sum(profile_grid_point["solar"]) == 0 and np.sum(profile_grid_point["wind"]) == 0:
+        logging.debug(f"Skipping grid point {lat}, {lon} due to zero potential.")
+        return {"solar": 0, "wind": 0, "battery": 0}, 0, 0
     logging.debug(f"Physical capacity limit for grid point {lat}, {lon}: {overbuild_limit}")
 
     # Create a sample of feasible designs (installed solar, wind, and battery capacity) given a certain RE profile
-    feasible_designs = capacity_sampling(profile_grid_point, p, limit=overbuild_limit, n_samples=n, seed=12)
+    designs = sample_design_space(profile_grid_point, p, limit=overbuild_limit, n_samples=n, seed=12)
 
     # Calculate the installation cost and LCOE for each accepted design (accepted designs are those that meet the demand MOST of the time)
     capex, opex_pct, cost_of_capital = extract_costs_for_point(lat, lon, costs)
-    accepted_designs, installation_costs, lcoes = filter_designs_according_to_coverage_and_calculate_costs(
-        feasible_designs,
+    accepted, installation_costs, lcoes = calculate_costs_of_accepted_designs(
+        designs,
         baseload_demand,
         capex,
         storage_costs,
@@ -175,18 +228,95 @@ def run_baseload_optimization_for_point(
     )
 
     # Find the optimal design (the one with the lowest LCOE)
-    if len(accepted_designs) == 0:
+    if len(accepted) == 0:
         logging.debug(f"No accepted designs for grid point {lat}, {lon}.")
         return {"solar": 0, "wind": 0, "battery": 0}, 0, 0
 
     opt_idx = np.argmin(lcoes)
-    optimal_design = accepted_designs[opt_idx]
+    optimal_design = {tech: designs[tech][accepted[opt_idx]] for tech in ["wind", "solar", "battery"]}
     optimal_lcoe = lcoes[opt_idx]
     optimal_cost = installation_costs[opt_idx]
 
     return optimal_design, optimal_lcoe, optimal_cost
 
 
+def extract_point_inputs(
+    profile: xr.Dataset, max_cap_full: xr.Dataset, points: np.ndarray, baseload_demand: float
+) -> tuple[np.ndarray, np.ndarray, list[dict[str, float]]]:
+    """
+    Extract the hourly profiles and capacity limits of many grid points with one selection.
+
+    Args:
+        profile: Renewable energy profile dataset
+        max_cap_full: Maximum capacity dataset
+        points: Array of (lat, lon) grid points
+        baseload_demand: Baseload demand (MW)
+
+    Returns:
+        Tuple containing:
+            - Hourly solar profiles, one row per point
+            - Hourly wind profiles, one row per point
+            - Capacity limits for solar and wind as overscale factors relative to baseload demand, one dict per point
+    """
+    lats = xr.DataArray(points[:, 0], dims="point")
+    lons = xr.DataArray(points[:, 1], dims="point")
+    profile_points = profile[["solar", "wind"]].sel(x=lons, y=lats, method="nearest")
+    solar = profile_points["solar"].transpose("point", ...).values.reshape(len(points), -1)
+    wind = profile_points["wind"].transpose("point", ...).values.reshape(len(points), -1)
+    max_cap_points = max_cap_full[["pv", "wind"]].sel(x=lons, y=lats, method="nearest")
+    solar_limits = max_cap_points["pv"].values.astype(np.float64).reshape(len(points)) / baseload_demand
+    wind_limits = max_cap_points["wind"].values.astype(np.float64).reshape(len(points)) / baseload_demand
+    overbuild_limits = [
+        {"solar": float(solar_limit), "wind": float(wind_limit)}
+        for solar_limit, wind_limit in zip(solar_limits, wind_limits)
+    ]
+    return solar, wind, overbuild_limits
+
+
+def assemble_optimal_solution(
+    land_points: np.ndarray,
+    all_lats: np.ndarray,
+    all_lons: np.ndarray,
+    results: list[tuple[dict, float, float]],
+) -> xr.Dataset:
+    """
+    Collect the optimal designs of all land grid points into a dataset covering the full cutout.
+
+    Results are written into preallocated arrays by flat grid position and wrapped into a dataset once, so assembly
+    time grows linearly with the number of points.
+
+    Args:
+        land_points: Array of (lat, lon) land grid points, in the order of the results
+        all_lats: All latitudes of the cutout
+        all_lons: All longitudes of the cutout
+        results: Optimal design, LCOE, and installation cost of each land point (see optimize_baseload_design)
+
+    Returns:
+        Dataset with variables lcoe, installation_cost, solar_factor, wind_factor, battery_factor on (lat, lon); zero
+        for sea points and points without a valid solution
+    """
+    shape = (len(all_lats), len(all_lons))
+    values = {
+        name: np.zeros(shape[0] * shape[1])
+        for name in ["lcoe", "installation_cost", "solar_factor", "wind_factor", "battery_factor"]
+    }
+    if len(results) > 0:
+        lat_index = np.abs(np.asarray(all_lats)[np.newaxis, :] - land_points[:, [0]]).argmin(axis=1)
+        lon_index = np.abs(np.asarray(all_lons)[np.newaxis, :] - land_points[:, [1]]).argmin(axis=1)
+        flat_index = lat_index * shape[1] + lon_index
+        lcoes = np.array([float(lcoe) for _, lcoe, _ in results])
+        valid = ~np.isnan(lcoes)
+        values["lcoe"][flat_index[valid]] = lcoes[valid]
+        values["installation_cost"][flat_index[valid]] = np.array([float(cost) for _, _, cost in results])[valid]
+        for tech in ["solar", "wind", "battery"]:
+            tech_values = np.array([float(design[tech]) for design, _, _ in results])
+            values[f"{tech}_factor"][flat_index[valid]] = tech_values[valid]
+    return xr.Dataset(
+        coords={"lat": all_lats, "lon": all_lons},
+        data_vars={name: (("lat", "lon"), array.reshape(shape)) for name, array in values.items()},
+    )
+
+
 def execute_baseload_optimization_for_region(
     year: int,
     region: str,
@@ -223,7 +353,10 @@ def execute_baseload_optimization_for_region(
         - Initializes geocoder in each worker
 
     Note:
-        If optimal solution already exists in output directory, it is loaded instead of recalculated
+        - If optimal solution already exists in output directory, it is loaded instead of recalculated
+        - Points are processed in batches of POINT_BATCH_SIZE. The profiles and capacity limits of a batch are
+          extracted with one selection and each task only receives its own point's data; the cost inputs are
+          scattered to the workers once. Results are assembled with assemble_optimal_solution.
     """
     # Check if the file exists already
     optimal_sol_path = (
@@ -246,65 +379,36 @@ def execute_baseload_optimization_for_region(
         )
         max_cap = xr.open_dataset(max_cap_path)
 
-        # Run optimization for all land grid points
+        # Run optimization for all land grid points; each task only receives its own point's profile and limits
         land_points, all_lats, all_lons = choose_land_points_in_cutout(profile, config.terrain_nc_path)
-        zeroes = np.zeros((len(all_lats), len(all_lons)))
-        optimal_sol = xr.Dataset(
-            coords={
-                "lat": all_lats,
-                "lon": all_lons,
-            },
-            data_vars={
-                "lcoe": (("lat", "lon"), zeroes),
-                "installation_cost": (("lat", "lon"), zeroes),
-                "solar_factor": (("lat", "lon"), zeroes),
-                "wind_factor": (("lat", "lon"), zeroes),
-                "battery_factor": (("lat", "lon"), zeroes),
-            },
-        )
         client = Client(n_workers=10)
         # Initialize geocoder in each worker
         client.run(worker_init_geocoder, config)
-        results = dask.compute(
-            *[
-                delayed(run_baseload_optimization_for_point)(
-                    lat,
-                    lon,
-                    profile,
-                    max_cap,
-                    baseload_demand,
-                    costs,
-                    storage_costs,
-                    investment_horizon,
-                    p,
-                    n,
-                )
-                for lat, lon in land_points
-            ]
-        )
+        costs_future, storage_costs_future = client.scatter([costs, storage_costs], broadcast=True)
+        results = []
+        for batch_start in range(0, len(land_points), POINT_BATCH_SIZE):
+            batch = land_points[batch_start : batch_start + POINT_BATCH_SIZE]
+            solar, wind, overbuild_limits = extract_point_inputs(profile, max_cap, batch, baseload_demand)
+            futures = client.map(
+                optimize_baseload_design,
+                batch[:, 0].tolist(),
+                batch[:, 1].tolist(),
+                [{"solar": solar[i], "wind": wind[i]} for i in range(len(batch))],
+                overbuild_limits,
+                baseload_demand=baseload_demand,
+                costs=costs_future,
+                storage_costs=storage_costs_future,
+                investment_horizon=investment_horizon,
+                p=p,
+                n=n,
+                pure=False,
+            )
+            results.extend(client.gather(futures))
+            logging.info(f"Optimized {len(results)} of {len(land_points)} grid points in {region}.")
         client.close()
 
         # Convert to an xarray dataset and save to file
-        for i, (lat, lon) in enumerate(land_points):
-            optimal_design, optimal_lcoe, optimal_cost = results[i]
-            if np.isnan(optimal_lcoe):
-                continue
-            temp_lcoe = optimal_sol["lcoe"].copy()
-            temp_installation_cost = optimal_sol["installation_cost"].copy()
-            temp_solar_factor = optimal_sol["solar_factor"].copy()
-            temp_wind_factor = optimal_sol["wind_factor"].copy()
-            temp_battery_factor = optimal_sol["battery_factor"].copy()
-
-            temp_lcoe.loc[dict(lat=lat, lon=lon)] = optimal_lcoe
-            temp_solar_factor.loc[dict(lat=lat, lon=lon)] = optimal_design["solar"]
-            temp_wind_factor.loc[dict(lat=lat, lon=lon)] = optimal_design["wind"]
-            temp_battery_factor.loc[dict(lat=lat, lon=lon)] = optimal_design["battery"]
-
-            optimal_sol["lcoe"] = temp_lcoe
-            optimal_sol["installation_cost"] = temp_installation_cost
-            optimal_sol["solar_factor"] = temp_solar_factor
-            optimal_sol["wind_factor"] = temp_wind_factor
-            optimal_sol["battery_factor"] = temp_battery_factor
+        optimal_sol = assemble_optimal_solution(land_points, all_lats, all_lons, results)
         optimal_sol_path.parent.mkdir(parents=True, exist_ok=True)
         optimal_sol.to_netcdf(optimal_sol_path, mode="w", format="NETCDF4")
 
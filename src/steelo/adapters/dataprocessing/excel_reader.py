@@ -34,6 +34,7 @@ import logging
 
 from ...domain.models import LegalProcessConnector
 from ...utilities.data_processing import normalize_product_name
+from .workbook_session import ExcelSource, read_sheet, sheet_names
 from steelo.utilities.utils import normalize_name
 
 # Import only true constants from global_variables
@@ -102,7 +103,7 @@ translate_country_names_to_iso3 = {
 
 
 def read_regional_input_prices_from_master_excel(
-    excel_path: Path,
+    excel_path: ExcelSource,
     input_costs_sheet: str = "Input costs",
 ) -> list[InputCosts]:
     """
@@ -116,7 +117,7 @@ def read_regional_input_prices_from_master_excel(
     """
 
     # 1) Load raw data
-    input_costs_df = pd.read_excel(excel_path, sheet_name=input_costs_sheet)
+    input_costs_df = read_sheet(excel_path, sheet_name=input_costs_sheet)
 
     # Store unit information before pivoting
     unit_mapping = dict(zip(input_costs_df["Commodity"], input_costs_df["Unit"]))
@@ -191,7 +192,7 @@ def read_regional_input_prices_from_master_excel(
 
 
 def read_aggregated_metallic_charge_constraints(
-    dynamic_business_cases_excel_path: str, excel_sheet: str
+    dynamic_business_cases_excel_path: ExcelSource, excel_sheet: str
 ) -> list[AggregatedMetallicChargeConstraint]:
     """
     Read and process wildcard constraints from Bill of Materials Excel.
@@ -214,7 +215,7 @@ def read_aggregated_metallic_charge_constraints(
         List of AggregatedMetallicChargeConstraint objects that define constraints
         for groups of feedstocks matching wildcard patterns.
     """
-    df = pd.read_excel(dynamic_business_cases_excel_path, sheet_name=excel_sheet)
+    df = read_sheet(dynamic_business_cases_excel_path, sheet_name=excel_sheet)
     aggregated_constraints: list[AggregatedMetallicChargeConstraint] = []
 
     # Look for rows with wildcards in Metallic charge and Metric type = Constraint
@@ -300,7 +301,7 @@ def read_aggregated_metallic_charge_constraints(
 
 
 def read_dynamic_business_cases(
-    dynamic_business_cases_excel_path: str, excel_sheet: str
+    dynamic_business_cases_excel_path: ExcelSource, excel_sheet: str
 ) -> tuple[dict[str, list[PrimaryFeedstock]], list[AggregatedMetallicChargeConstraint]]:
     """
     Read and process dynamic business cases from Excel to create PrimaryFeedstock objects.
@@ -325,7 +326,7 @@ def read_dynamic_business_cases(
           with associated materials, energy requirements, outputs, and constraints.
         - List of AggregatedMetallicChargeConstraint objects for wildcard constraints
     """
-    df = pd.read_excel(dynamic_business_cases_excel_path, sheet_name=excel_sheet)
+    df = read_sheet(dynamic_business_cases_excel_path, sheet_name=excel_sheet)
 
     # Ensure string types for key columns
     df["Metallic charge"] = df["Metallic charge"].fillna("").astype(str)
@@ -644,7 +645,9 @@ def _convert_units(value: float, unit: str, metric_type: str) -> float:
         return value
 
 
-def read_mines_as_suppliers(mine_data_excel_path: str, mine_data_sheet_name: str, location_csv: str) -> list[Supplier]:
+def read_mines_as_suppliers(
+    mine_data_excel_path: ExcelSource, mine_data_sheet_name: str, location_csv: str
+) -> list[Supplier]:
     """
     Read mine supply data from Excel and return a list of Supplier domain objects for mines.
     """
@@ -731,7 +734,7 @@ def read_mines_as_suppliers(mine_data_excel_path: str, mine_data_sheet_name: str
             assert -90 <= supplier.location.lat <= 90, f"Invalid latitude: {supplier.supplier_id}"
             assert -180 <= supplier.location.lon <= 180, f"Invalid longitude: {supplier.supplier_id}"
 
-    mine_data_df = pd.read_excel(mine_data_excel_path, sheet_name=mine_data_sheet_name)
+    mine_data_df = read_sheet(mine_data_excel_path, sheet_name=mine_data_sheet_name)
 
     # Strip whitespace from column names to handle Excel inconsistencies
     mine_data_df.columns = mine_data_df.columns.str.strip()
@@ -904,13 +907,13 @@ def refine_demand_centers_for_major_countries(old_centers):
 def read_demand_centers(
     *,
     gravity_distances_path: Path,
-    demand_excel_path: Path,
+    demand_excel_path: ExcelSource,
     demand_sheet_name: str,
     location_csv: Path,
 ) -> list[DemandCenter]:
     with gravity_distances_path.open("rb") as f:
         gravity_dict = pickle.load(f)
-    demand_df = pd.read_excel(demand_excel_path, sheet_name=demand_sheet_name)
+    demand_df = read_sheet(demand_excel_path, sheet_name=demand_sheet_name)
     demand_df = demand_df[demand_df["Scenario"] == CHOSEN_DEMAND_SCENARIO]
     # Strip whitespace from metric names to handle Excel inconsistencies
     demand_df["Metric"] = demand_df["Metric"].str.strip()
@@ -1040,7 +1043,7 @@ def refine_scrap_centers_for_major_countries(old_centers):
 
 
 def read_scrap_as_suppliers(
-    scrap_excel_path: str,
+    scrap_excel_path: ExcelSource,
     scrap_sheet_name: str,
     location_csv: str,
     gravity_distances_pkl_path: Path | None = None,
@@ -1053,7 +1056,7 @@ def read_scrap_as_suppliers(
     gravity_path = gravity_distances_pkl_path
     with gravity_path.open("rb") as f:
         gravity_dict = pickle.load(f)
-    scrap_df = pd.read_excel(scrap_excel_path, sheet_name=scrap_sheet_name)
+    scrap_df = read_sheet(scrap_excel_path, sheet_name=scrap_sheet_name)
     scrap_df = scrap_df[scrap_df["Scenario"] == CHOSEN_DEMAND_SCENARIO]
     # Strip whitespace from metric names to handle Excel inconsistencies
     scrap_df["Metric"] = scrap_df["Metric"].str.strip()
@@ -1206,7 +1209,7 @@ def _resolve_iso3_or_bloc_entry(entry: str, country_mappings: list, supported_bl
     return [entry]
 
 
-def read_carbon_costs(carbon_cost_excel_path: Path, sheet_name="Carbon cost") -> list[CarbonCostSeries]:
+def read_carbon_costs(carbon_cost_excel_path: ExcelSource, sheet_name="Carbon cost") -> list[CarbonCostSeries]:
     """
     Read carbon costs from an Excel file and return a list of CarbonCostSeries objects.
 
@@ -1221,7 +1224,7 @@ def read_carbon_costs(carbon_cost_excel_path: Path, sheet_name="Carbon cost") ->
     Returns:
         list[CarbonCostSeries]: A list of CarbonCostSeries objects with ISO3 codes and carbon costs by year.
     """
-    carbon_cost_df = pd.read_excel(carbon_cost_excel_path, sheet_name=sheet_name)
+    carbon_cost_df = read_sheet(carbon_cost_excel_path, sheet_name=sheet_name)
     carbon_costs: dict[str, dict[Year, float]] = {}
 
     # Check for new format with year columns
@@ -1305,7 +1308,9 @@ def read_carbon_costs(carbon_cost_excel_path: Path, sheet_name="Carbon cost") ->
     return carbon_costs_list
 
 
-def read_regional_emissivities(excel_path: Path, grid_sheet_name: str, gas_sheet_name: str) -> list[RegionEmissivity]:
+def read_regional_emissivities(
+    excel_path: ExcelSource, grid_sheet_name: str, gas_sheet_name: str
+) -> list[RegionEmissivity]:
     """
     Read grid_emissivity from from an Excel file and return a dictionary mapping ISO3 codes to Year and cost.
 
@@ -1317,8 +1322,8 @@ def read_regional_emissivities(excel_path: Path, grid_sheet_name: str, gas_sheet
         list[RegionEmissivity]: A list of RegionEmissivity objects containing emissions data
         for each country and scenario.
     """
-    grid_emission_df = pd.read_excel(excel_path, sheet_name=grid_sheet_name)
-    gas_coke_emissions_df = pd.read_excel(excel_path, sheet_name=gas_sheet_name)
+    grid_emission_df = read_sheet(excel_path, sheet_name=grid_sheet_name)
+    gas_coke_emissions_df = read_sheet(excel_path, sheet_name=gas_sheet_name)
 
     carbon_intensity_columns = [col for col in grid_emission_df.columns if col.lower().startswith("ghg_factor_scope_")]
 
@@ -1405,7 +1410,7 @@ def read_regional_emissivities(excel_path: Path, grid_sheet_name: str, gas_sheet
     return grid_emissivity_list
 
 
-def read_tariffs(tariff_excel_path: str, tariff_sheet_name: str, country_mappings: list) -> list[TradeTariff]:
+def read_tariffs(tariff_excel_path: ExcelSource, tariff_sheet_name: str, country_mappings: list) -> list[TradeTariff]:
     """
     Read tariff data from an Excel file and return a list of TradeTariff objects.
 
@@ -1420,7 +1425,7 @@ def read_tariffs(tariff_excel_path: str, tariff_sheet_name: str, country_mapping
     Returns:
         List of TradeTariff objects.
     """
-    tariff_df = pd.read_excel(tariff_excel_path, sheet_name=tariff_sheet_name)
+    tariff_df = read_sheet(tariff_excel_path, sheet_name=tariff_sheet_name)
     tariffs = []
 
     # Dynamically detect available trade blocs from country_mappings
@@ -1493,7 +1498,7 @@ def read_tariffs(tariff_excel_path: str, tariff_sheet_name: str, country_mapping
 
 
 def read_capex_and_learning_rate_data(
-    capex_excel_path: str, sheet_name: str = "Techno-economic details"
+    capex_excel_path: ExcelSource, sheet_name: str = "Techno-economic details"
 ) -> list[Capex]:
     """
     Read capex and learning rate data from an Excel file and return a list of Capex objects.
@@ -1504,7 +1509,7 @@ def read_capex_and_learning_rate_data(
         capex_excel_path (str): Path to the Excel file containing capex and learning rate data.
         sheet_name (str): Name of the sheet in the Excel file to read from.
     """
-    data = pd.read_excel(capex_excel_path, sheet_name=sheet_name)
+    data = read_sheet(capex_excel_path, sheet_name=sheet_name)
 
     # Check if data has required columns
     if "Value" not in data.columns:
@@ -1591,7 +1596,7 @@ def read_capex_and_learning_rate_data(
     return capex_list
 
 
-def read_cost_of_capital(coc_excel_path: str, sheet_name: str = "Cost of capital") -> list[CostOfCapital]:
+def read_cost_of_capital(coc_excel_path: ExcelSource, sheet_name: str = "Cost of capital") -> list[CostOfCapital]:
     """
     Read cost of capital data from an Excel file and return a list of CostOfCapital objects.
 
@@ -1603,7 +1608,7 @@ def read_cost_of_capital(coc_excel_path: str, sheet_name: str = "Cost of capital
         list[CostOfCapital]: A list of CostOfCapital objects containing the cost of capital data.
     """
 
-    data = pd.read_excel(coc_excel_path, sheet_name=sheet_name)
+    data = read_sheet(coc_excel_path, sheet_name=sheet_name)
 
     # Handle the case where "More risky assets" column might be unnamed (just whitespace)
     # In the actual Excel file, this column has a single space as its header
@@ -1637,9 +1642,9 @@ def read_cost_of_capital(coc_excel_path: str, sheet_name: str = "Cost of capital
 
 
 def read_legal_process_connectors(
-    excel_path: Path, sheet_name: str = "Legal Process connectors"
+    excel_path: ExcelSource, sheet_name: str = "Legal Process connectors"
 ) -> list[LegalProcessConnector]:
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    df = read_sheet(excel_path, sheet_name=sheet_name)
 
     legal_process_connectors = []
     for _, row in df.iterrows():
@@ -1672,7 +1677,7 @@ def read_legal_process_connectors(
     return legal_process_connectors
 
 
-def read_country_mappings(excel_path: Path, sheet_name: str = "Country mapping") -> list[CountryMapping]:
+def read_country_mappings(excel_path: ExcelSource, sheet_name: str = "Country mapping") -> list[CountryMapping]:
     """
     Reads country mapping data from the specified Excel sheet and converts it
     into a list of CountryMapping domain objects.
@@ -1688,7 +1693,7 @@ def read_country_mappings(excel_path: Path, sheet_name: str = "Country mapping")
         A list of CountryMapping objects.
     """
     try:
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        df = read_sheet(excel_path, sheet_name=sheet_name)
     except ValueError:
         logger.error(f"Sheet '{sheet_name}' not found in {excel_path}")
         return []
@@ -1784,7 +1789,7 @@ def read_country_mappings(excel_path: Path, sheet_name: str = "Country mapping")
     return mappings
 
 
-def read_carbon_border_mechanisms(excel_path: Path, sheet_name: str = "CBAM") -> list[CarbonBorderMechanism]:
+def read_carbon_border_mechanisms(excel_path: ExcelSource, sheet_name: str = "CBAM") -> list[CarbonBorderMechanism]:
     """
     Reads carbon border adjustment mechanism data from the CBAM sheet.
 
@@ -1805,7 +1810,7 @@ def read_carbon_border_mechanisms(excel_path: Path, sheet_name: str = "CBAM") ->
         A list of CarbonBorderMechanism objects.
     """
     try:
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        df = read_sheet(excel_path, sheet_name=sheet_name)
     except ValueError:
         logger.error(f"Sheet '{sheet_name}' not found in {excel_path}")
         return []
@@ -1892,7 +1897,9 @@ def read_carbon_border_mechanisms(excel_path: Path, sheet_name: str = "CBAM") ->
     return mechanisms
 
 
-def read_hydrogen_efficiency(excel_path: Path, sheet_name: str = "Hydrogen efficiency") -> list[HydrogenEfficiency]:
+def read_hydrogen_efficiency(
+    excel_path: ExcelSource, sheet_name: str = "Hydrogen efficiency"
+) -> list[HydrogenEfficiency]:
     """
     Read hydrogen efficiency data from Excel sheet and return domain objects.
 
@@ -1903,7 +1910,7 @@ def read_hydrogen_efficiency(excel_path: Path, sheet_name: str = "Hydrogen effic
     Returns:
         List of HydrogenEfficiency domain objects
     """
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    df = read_sheet(excel_path, sheet_name=sheet_name)
 
     hydrogen_efficiency = []
     for _, row in df.iterrows():
@@ -1924,7 +1931,7 @@ def read_hydrogen_efficiency(excel_path: Path, sheet_name: str = "Hydrogen effic
 
 
 def read_hydrogen_capex_opex(
-    excel_path: Path, sheet_name: str = "Hydrogen CAPEX_OPEX component"
+    excel_path: ExcelSource, sheet_name: str = "Hydrogen CAPEX_OPEX component"
 ) -> list[HydrogenCapexOpex]:
     """
     Read hydrogen CAPEX/OPEX component data from Excel sheet and return domain objects.
@@ -1936,7 +1943,7 @@ def read_hydrogen_capex_opex(
     Returns:
         List of HydrogenCapexOpex domain objects
     """
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    df = read_sheet(excel_path, sheet_name=sheet_name)
 
     hydrogen_capex_opex = []
     for _, row in df.iterrows():
@@ -2065,7 +2072,7 @@ def _parse_subsidy_type(subsidy_type: str | None, cost_item: str, row_index: int
 
 
 def read_subsidies(
-    excel_path: Path,
+    excel_path: ExcelSource,
     subsidies_sheet: str = "Subsidies",
     country_mapping_sheet: str = "Country mapping",
     techno_economic_sheet: str = "Techno-economic details",
@@ -2090,8 +2097,8 @@ def read_subsidies(
     """
     logger = logging.getLogger(__name__)
 
-    subsidies_df = pd.read_excel(excel_path, sheet_name=subsidies_sheet)
-    country_df = pd.read_excel(excel_path, sheet_name=country_mapping_sheet)
+    subsidies_df = read_sheet(excel_path, sheet_name=subsidies_sheet)
+    country_df = read_sheet(excel_path, sheet_name=country_mapping_sheet)
     # Trade bloc columns are columns containing only True/False values
     trade_bloc_columns = [
         col
@@ -2100,7 +2107,7 @@ def read_subsidies(
     ]
 
     # Get all technology names from techno-economic details sheet
-    techno_df = pd.read_excel(excel_path, sheet_name=techno_economic_sheet)
+    techno_df = read_sheet(excel_path, sheet_name=techno_economic_sheet)
     all_technologies = techno_df["Technology"].dropna().unique().tolist()
 
     # Normalize column names to handle headers with newlines and descriptions
@@ -2212,12 +2219,12 @@ def read_subsidies(
 
 
 def read_transport_kpis_combined(
-    excel_path: Path, emissions_sheet: str = "Transport emissions", costs_sheet: str = "Transportation costs"
+    excel_path: ExcelSource, emissions_sheet: str = "Transport emissions", costs_sheet: str = "Transportation costs"
 ) -> list[TransportKPI]:
     """Read and combine transport emissions and transportation costs into TransportKPI objects."""
 
     # Read emissions data
-    emissions_df = pd.read_excel(excel_path, sheet_name=emissions_sheet)
+    emissions_df = read_sheet(excel_path, sheet_name=emissions_sheet)
     emissions_dict: dict[tuple[str, str, str], dict[str, float | str]] = {}
 
     for _, row in emissions_df.iterrows():
@@ -2235,7 +2242,7 @@ def read_transport_kpis_combined(
             continue
 
     # Read transportation costs data
-    costs_df = pd.read_excel(excel_path, sheet_name=costs_sheet)
+    costs_df = read_sheet(excel_path, sheet_name=costs_sheet)
     costs_dict: dict[tuple[str, str, str], dict[str, float | str]] = {}
 
     for _, row in costs_df.iterrows():
@@ -2292,9 +2299,11 @@ def read_transport_kpis_combined(
     return transport_kpis
 
 
-def read_biomass_availability(excel_path: Path, sheet_name: str = "Biomass availability") -> list[BiomassAvailability]:
+def read_biomass_availability(
+    excel_path: ExcelSource, sheet_name: str = "Biomass availability"
+) -> list[BiomassAvailability]:
     """Read biomass availability from Excel sheet."""
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    df = read_sheet(excel_path, sheet_name=sheet_name)
 
     availabilities = []
     # Year columns are integers from 2024 to 2050
@@ -2336,7 +2345,9 @@ def read_biomass_availability(excel_path: Path, sheet_name: str = "Biomass avail
     return availabilities
 
 
-def read_co2_storage_availability(excel_path: Path, sheet_name: str = "CO2 storage") -> list[BiomassAvailability]:
+def read_co2_storage_availability(
+    excel_path: ExcelSource, sheet_name: str = "CO2 storage"
+) -> list[BiomassAvailability]:
     """
     Read CO2 storage availability from Excel sheet as secondary feedstock constraints.
 
@@ -2351,7 +2362,7 @@ def read_co2_storage_availability(excel_path: Path, sheet_name: str = "CO2 stora
         A list of BiomassAvailability objects representing CO2 storage constraints.
     """
     try:
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        df = read_sheet(excel_path, sheet_name=sheet_name)
     except ValueError:
         logger.warning(f"Sheet '{sheet_name}' not found in {excel_path}, returning empty list")
         return []
@@ -2400,7 +2411,7 @@ def read_co2_storage_availability(excel_path: Path, sheet_name: str = "CO2 stora
     return availabilities
 
 
-def read_fopex(excel_path: Path, sheet_name: str = "Fixed OPEX") -> list[FOPEX]:
+def read_fopex(excel_path: ExcelSource, sheet_name: str = "Fixed OPEX") -> list[FOPEX]:
     """
     Read Fixed Operating Expenditure (FOPEX) data from Excel sheet and return FOPEX domain objects.
 
@@ -2416,7 +2427,7 @@ def read_fopex(excel_path: Path, sheet_name: str = "Fixed OPEX") -> list[FOPEX]:
     Returns:
         List of FOPEX domain objects
     """
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    df = read_sheet(excel_path, sheet_name=sheet_name)
 
     # Check for required columns
     required_cols = ["ISO 3-letter code"]
@@ -2461,10 +2472,10 @@ def read_fopex(excel_path: Path, sheet_name: str = "Fixed OPEX") -> list[FOPEX]:
 
 
 def read_technology_emission_factors(
-    excel_path: Path, sheet_name: str = "Technology emission factors"
+    excel_path: ExcelSource, sheet_name: str = "Technology emission factors"
 ) -> list[TechnologyEmissionFactors]:
     """Read technology emission factors from Excel sheet."""
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    df = read_sheet(excel_path, sheet_name=sheet_name)
 
     emission_factors = []
     for _, row in df.iterrows():
@@ -2514,7 +2525,7 @@ def read_technology_emission_factors(
 
 
 def read_fallback_material_costs(
-    excel_path: Path, sheet_name: str = "Fallback material cost"
+    excel_path: ExcelSource, sheet_name: str = "Fallback material cost"
 ) -> list[FallbackMaterialCost]:
     """
     Read fallback material costs from an Excel file and return a list of FallbackMaterialCost objects.
@@ -2536,19 +2547,19 @@ def read_fallback_material_costs(
     logger.info(f"Reading fallback material costs from '{excel_path}' sheet '{sheet_name}'")
 
     try:
-        excel_file = pd.ExcelFile(excel_path)
+        available_sheets = sheet_names(excel_path)
     except Exception as e:
         logger.error("Failed to open Excel file '%s': %s", excel_path, e)
         raise
 
-    if sheet_name not in excel_file.sheet_names:
+    if sheet_name not in available_sheets:
         raise ValueError(
             f"'{excel_path}' is missing required sheet '{sheet_name}'. "
             "Ensure the latest master workbook (with the fallback BOM definition tab) is used during preparation."
         )
 
     try:
-        df = excel_file.parse(sheet_name=sheet_name)
+        df = read_sheet(excel_path, sheet_name=sheet_name)
     except Exception as e:
         logger.error("Failed to read sheet '%s' from '%s': %s", sheet_name, excel_path, e)
         raise
@@ -2645,7 +2656,9 @@ def read_fallback_material_costs(
     return fallback_costs
 
 
-def read_fallback_bom_definitions(excel_path: Path, sheet_name: str = "Fallback BOM definition") -> dict[str, str]:
+def read_fallback_bom_definitions(
+    excel_path: ExcelSource, sheet_name: str = "Fallback BOM definition"
+) -> dict[str, str]:
     """
     Read fallback BOM definitions from Excel sheet and return a dictionary mapping technologies to their default metallic charges.
 
@@ -2663,7 +2676,7 @@ def read_fallback_bom_definitions(excel_path: Path, sheet_name: str = "Fallback
     logger.info(f"Reading fallback BOM definitions from '{excel_path}' sheet '{sheet_name}'")
 
     try:
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        df = read_sheet(excel_path, sheet_name=sheet_name)
     except Exception as e:
         logger.error(f"Failed to read Excel file: {e}")
         raise
@@ -2726,7 +2739,7 @@ def read_fallback_bom_definitions(excel_path: Path, sheet_name: str = "Fallback
 
 
 def read_willingness_to_pay(
-    excel_path: Path,
+    excel_path: ExcelSource,
     country_mappings: list[CountryMapping],
     sheet_name: str = "Willingness to pay",
 ) -> list[WillingnessToPay]:
@@ -2750,7 +2763,7 @@ def read_willingness_to_pay(
         A list of WillingnessToPay objects, with one entry per ISO3/commodity combination.
     """
     try:
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        df = read_sheet(excel_path, sheet_name=sheet_name)
     except ValueError:
         logger.error(f"Sheet '{sheet_name}' not found in {excel_path}")
         return []
@@ -21,6 +21,7 @@ from steelo.adapters.dataprocessing.master_excel_validator import (
     ValidationReport,
 )
 from steelo.adapters.dataprocessing.preprocessing.iso3_finder import derive_iso3, Coordinate
+from steelo.adapters.dataprocessing.workbook_session import WorkbookSession, active_session
 from steelo.domain.constants import KT_TO_T, PLANT_LIFETIME
 
 logger = logging.getLogger(__name__)
@@ -53,19 +54,26 @@ class MasterExcelReader:
         self.excel_path = excel_path
         self.output_dir = output_dir or Path(tempfile.mkdtemp(prefix="master_excel_"))
         self.validator = MasterExcelValidator()
-        self._excel_file: pd.ExcelFile | None = None
+        self._workbook: WorkbookSession | None = None
+        self._owns_workbook = False
         self._validation_report: ValidationReport | None = None
 
     def __enter__(self):
         """Context manager entry"""
-        self._excel_file = pd.ExcelFile(self.excel_path)
+        self._workbook = self._open_workbook()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
-        if self._excel_file:
-            self._excel_file.close()
-            self._excel_file = None
+        if self._workbook and self._owns_workbook:
+            self._workbook.close()
+        self._workbook = None
+
+    def _open_workbook(self) -> WorkbookSession:
+        """Share the open session for this workbook (e.g. the one of the data preparation), or open our own."""
+        session = active_session(self.excel_path)
+        self._owns_workbook = session is None
+        return session or WorkbookSession(self.excel_path).open()
 
     def validate_all(self) -> ValidationReport:
         """
@@ -94,10 +102,10 @@ class MasterExcelReader:
 
         try:
             # Check if sheet exists
-            if not self._excel_file:
-                self._excel_file = pd.ExcelFile(self.excel_path)
+            if not self._workbook:
+                self._workbook = self._open_workbook()
 
-            if sheet_name not in self._excel_file.sheet_names:
+            if sheet_name not in self._workbook.sheet_names:
                 return ExtractionResult(
                     success=False,
                     errors=[
@@ -110,7 +118,7 @@ class MasterExcelReader:
                 )
 
             # Read the sheet
-            df = pd.read_excel(self._excel_file, sheet_name=sheet_name, index_col=0)
+            df = self._workbook.read_sheet(sheet_name, index_col=0)
 
             # Clean up: remove any unnamed columns
             df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
@@ -212,7 +220,7 @@ class MasterExcelReader:
             sheet_name = "Railway cost"
 
             # Check if sheet exists
-            if self._excel_file is None or sheet_name not in self._excel_file.sheet_names:
+            if self._workbook is None or sheet_name not in self._workbook.sheet_names:
                 return ExtractionResult(
                     success=False,
                     errors=[
@@ -225,7 +233,7 @@ class MasterExcelReader:
                 )
 
             # Read the sheet
-            df = pd.read_excel(self._excel_file, sheet_name=sheet_name)
+            df = self._workbook.read_sheet(sheet_name)
 
             # Check required columns
             required_cols = ["ISO-3 Code", "Railway capex"]
@@ -288,12 +296,12 @@ class MasterExcelReader:
         """Read the 'Steel production by plant' sheet."""
         sheet_name = "Steel production by plant"
 
-        if self._excel_file is None or sheet_name not in self._excel_file.sheet_names:
+        if self._workbook is None or sheet_name not in self._workbook.sheet_names:
             logger.warning(f"Sheet '{sheet_name}' not found, historical production will be empty")
             return pd.DataFrame()
 
         # Read with header at row 1 (0-indexed)
-        production_df = pd.read_excel(self._excel_file, sheet_name=sheet_name, header=1)
+        production_df = self._workbook.read_sheet(sheet_name, header=1)
         return production_df
 
     def _extract_historical_production(
@@ -517,14 +525,14 @@ class MasterExcelReader:
 
         try:
             # Check if sheet exists
-            if not self._excel_file:
-                self._excel_file = pd.ExcelFile(self.excel_path)
+            if not self._workbook:
+                self._workbook = self._open_workbook()
 
-            if sheet_name not in self._excel_file.sheet_names:
+            if sheet_name not in self._workbook.sheet_names:
                 raise ValueError(f"Sheet '{sheet_name}' not found in Excel file")
 
             # Read the plant sheet
-            plant_df = pd.read_excel(self._excel_file, sheet_name=sheet_name)
+            plant_df = self._workbook.read_sheet(sheet_name)
 
             # Track canonical metadata for each furnace group
             raw_canonical_metadata: dict[str, FurnaceGroupMetadata] = {}
@@ -533,7 +541,7 @@ class MasterExcelReader:
             if dynamic_feedstocks_dict is None or aggregated_constraints is None:
                 logger.info("Reading dynamic business cases from Bill of Materials sheet")
                 dynamic_feedstocks_dict, aggregated_constraints = read_dynamic_business_cases(
-                    str(self.excel_path), excel_sheet="Bill of Materials"
+                    cast(WorkbookSession, self._workbook), excel_sheet="Bill of Materials"
                 )
                 # Note: aggregated_constraints should be passed to the environment
 
@@ -1032,10 +1040,10 @@ class MasterExcelReader:
 
         try:
             # Check if sheet exists
-            if not self._excel_file:
-                self._excel_file = pd.ExcelFile(self.excel_path)
+            if not self._workbook:
+                self._workbook = self._open_workbook()
 
-            if sheet_name not in self._excel_file.sheet_names:
+            if sheet_name not in self._workbook.sheet_names:
                 return ExtractionResult(
                     success=False,
                     errors=[
@@ -1048,7 +1056,7 @@ class MasterExcelReader:
                 )
 
             # Read the sheet with improved handling
-            df = self._excel_file.parse(
+            df = self._workbook.read_sheet(
                 sheet_name,
                 dtype="object",  # Force strings to avoid float artifacts
                 keep_default_na=False,  # Don't interpret "NA", "NULL" etc. as NaN
@@ -1104,10 +1112,10 @@ class MasterExcelReader:
         sheet_name = "Bill of Materials"
 
         try:
-            if not self._excel_file:
-                self._excel_file = pd.ExcelFile(self.excel_path)
+            if not self._workbook:
+                self._workbook = self._open_workbook()
 
-            if sheet_name not in self._excel_file.sheet_names:
+            if sheet_name not in self._workbook.sheet_names:
                 return ExtractionResult(
                     success=False,
                     errors=[
@@ -1125,7 +1133,7 @@ class MasterExcelReader:
 
             # Copy just the BOM sheet to a new Excel file
             with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-                df = pd.read_excel(self._excel_file, sheet_name=sheet_name)
+                df = self._workbook.read_sheet(sheet_name)
                 df.to_excel(writer, sheet_name=sheet_name, index=False)
 
             logger.info(f"Successfully extracted Bill of Materials to {output_path}")
@@ -0,0 +1,171 @@
+"""Columnar per-year tables written by the DataCollector.
+
+Every simulated year produces four flat, typed Parquet tables in the ``TM`` output directory:
+
+- ``furnace_groups``: one row per reported furnace group with its plant / plant group facts and every scalar KPI
+  (production, unit costs, debt, subsidies, ...)
+- ``feedstocks``: long-format bill of materials, one row per furnace group, section (materials / energy) and feedstock
+- ``breakdowns``: long-format cost and carbon breakdown, one row per furnace group, feedstock, breakdown and item
+- ``emissions``: one row per furnace group, boundary and scope
+
+Post-processing (``post_process_datacollection``) reads them one year at a time and only the columns it needs, so
+its memory no longer grows with the nested per-plant dictionaries of the legacy
+``datacollection_post_allocation_{year}.pkl`` files.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Any, Sequence
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+FURNACE_GROUPS = "furnace_groups"
+FEEDSTOCKS = "feedstocks"
+BREAKDOWNS = "breakdowns"
+EMISSIONS = "emissions"
+TABLES = (FURNACE_GROUPS, FEEDSTOCKS, BREAKDOWNS, EMISSIONS)
+
+# Plant-level facts repeated on every furnace group row
+PLANT_COLUMNS = ["plant_id", "plant_group_id", "iso3", "plant_profit_and_loss", "plant_group_balance"]
+# Record fields holding nested dictionaries; they are flattened into the long tables instead
+_NESTED_FIELDS = frozenset(
+    {"bill_of_materials", "materials", "energy", "cost_breakdown", "carbon_breakdown", "ccs_outputs", "emissions"}
+)
+_EMISSIONS_PREFIX = "emissions_"
+_FEEDSTOCK_VALUES = ("demand", "total_cost", "unit_cost", "unit_cost_per_input")
+_EMPTY_SCHEMAS: dict[str, dict[str, str]] = {
+    FEEDSTOCKS: {
+        "furnace_group_id": "object",
+        "section": "object",
+        "feedstock": "object",
+        **{value: "float64" for value in _FEEDSTOCK_VALUES},
+    },
+    BREAKDOWNS: {
+        "furnace_group_id": "object",
+        "feedstock": "object",
+        "breakdown": "object",
+        "item": "object",
+        "value": "float64",
+    },
+    EMISSIONS: {"furnace_group_id": "object", "boundary": "object", "scope": "object", "value": "float64"},
+}
+
+
+def table_path(directory: Path, table: str, year: int) -> Path:
+    return Path(directory) / f"datacollection_{table}_{int(year)}.parquet"
+
+
+def has_year_tables(directory: Path, year: int) -> bool:
+    """True when all tables of ``year`` were written (a crash mid-write leaves the year to the legacy reader)."""
+    return all(table_path(directory, table, year).exists() for table in TABLES)
+
+
+def _as_float(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def flatten_plants(plants: dict[str, dict[str, Any]], year: int) -> dict[str, pd.DataFrame]:
+    """Flatten the DataCollector's per-plant records of one year into the four tables.
+
+    Args:
+        plants: ``{plant_id: {"furnace_groups": [record, ...], "plant_group_id": ..., "location": iso3,
+            "plant_profit_and_loss": ..., "plant_group_balance": ...}}`` as assembled by ``DataCollector.collect``.
+            Records keep their emissions as the nested ``"emissions"`` dict ``{boundary: {scope: tCO2e}}``.
+        year: Simulation year stored in every row.
+
+    Returns:
+        dict: ``{table name: DataFrame}``
+    """
+    facts: list[dict[str, Any]] = []
+    feedstocks: list[dict[str, Any]] = []
+    breakdowns: list[dict[str, Any]] = []
+    emissions: list[dict[str, Any]] = []
+    for plant_id, plant in plants.items():
+        plant_facts = {
+            "plant_id": plant_id,
+            "plant_group_id": plant.get("plant_group_id"),
+            "iso3": plant.get("location"),
+            "plant_profit_and_loss": plant.get("plant_profit_and_loss"),
+            "plant_group_balance": plant.get("plant_group_balance"),
+        }
+        for record in plant["furnace_groups"]:
+            fg_id = record["furnace_group_id"]
+            facts.append(
+                {
+                    "year": int(year),
+                    **plant_facts,
+                    **{
+                        key: value
+                        for key, value in record.items()
+                        if key not in _NESTED_FIELDS and not key.startswith(_EMISSIONS_PREFIX)
+                    },
+                }
+            )
+            for section in ("materials", "energy"):
+                for feedstock, entry in (record.get(section) or {}).items():
+                    feedstocks.append(
+                        {
+                            "furnace_group_id": fg_id,
+                            "section": section,
+                            "feedstock": feedstock,
+                            **{value: _as_float(entry.get(value)) for value in _FEEDSTOCK_VALUES},
+                        }
+                    )
+            for breakdown in ("cost", "carbon"):
+                for feedstock, items in (record.get(f"{breakdown}_breakdown") or {}).items():
+                    for item, value in items.items():
+                        breakdowns.append(
+                            {
+                                "furnace_group_id": fg_id,
+                                "feedstock": feedstock,
+                                "breakdown": breakdown,
+                                "item": item,
+                                "value": _as_float(value),
+                            }
+                        )
+            for boundary, by_scope in (record.get("emissions") or {}).items():
+                if not isinstance(by_scope, dict):
+                    continue
+                for scope, value in by_scope.items():
+                    emissions.append(
+                        {"furnace_group_id": fg_id, "boundary": boundary, "scope": scope, "value": _as_float(value)}
+                    )
+
+    tables = {FURNACE_GROUPS: pd.DataFrame.from_records(facts)}
+    if tables[FURNACE_GROUPS].empty:
+        tables[FURNACE_GROUPS] = pd.DataFrame({column: pd.Series(dtype="object") for column in PLANT_COLUMNS})
+    for table, rows in ((FEEDSTOCKS, feedstocks), (BREAKDOWNS, breakdowns), (EMISSIONS, emissions)):
+        schema = _EMPTY_SCHEMAS[table]
+        tables[table] = pd.DataFrame.from_records(rows, columns=list(schema)).astype(schema)
+    return tables
+
+
+def write_year_tables(plants: dict[str, dict[str, Any]], year: int, directory: Path) -> None:
+    """Write the tables of one simulated year as Parquet files into ``directory`` (each file atomically)."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for table, frame in flatten_plants(plants, year).items():
+        path = table_path(directory, table, year)
+        temporary = path.with_name(f".{path.name}.tmp")
+        frame.to_parquet(temporary, index=False)
+        os.replace(temporary, path)
+    logger.debug(f"operation=datacollection_write year={year} plants={len(plants)} directory={directory}")
+
+
+def read_year_table(directory: Path, table: str, year: int, columns: Sequence[str] | None = None) -> pd.DataFrame:
+    """Read one table of one year, optionally restricted to ``columns``."""
+    return pd.read_parquet(table_path(directory, table, year), columns=list(columns) if columns is not None else None)
+
+
+def read_table_columns(directory: Path, table: str, year: int) -> list[str]:
+    """Column names of one table of one year, read from the Parquet footer without loading any data."""
+    return list(pq.read_schema(table_path(directory, table, year)).names)
@@ -4,6 +4,15 @@ from pathlib import Path
 
 import logging
 
+from steelo.adapters.dataprocessing.postprocessing.datacollection_tables import (
+    BREAKDOWNS,
+    EMISSIONS,
+    FEEDSTOCKS,
+    FURNACE_GROUPS,
+    has_year_tables,
+    read_table_columns,
+    read_year_table,
+)
 from steelo.utilities.utils import normalize_name
 
 
@@ -30,6 +39,218 @@ def _filter_effectively_empty_frames(frames: list[pd.DataFrame]) -> list[pd.Data
     return cleaned
 
 
+FURNACE_GROUP_COLUMNS = [
+    "furnace_group_id",
+    "technology",
+    "product",
+    "chosen_reductant",
+    "capacity",
+    "production",
+    "unit_vopex",
+    "unit_fopex",
+    "unit_production_cost",
+    "debt_repayment_for_current_year",
+    "furnace_group_profit_and_loss",
+]
+OPTIONAL_FURNACE_GROUP_COLUMNS = [
+    "unit_debt_repayment",
+    "unit_secondary_output_costs",
+    "unit_carbon_cost",
+    "unit_carbon_cost_contribution - co2_slip",
+]
+FIXED_SUBSIDY_COLUMNS = [
+    "unit_subsidy_capex",
+    "unit_subsidy_opex",
+    "unit_subsidy_debt",
+    "unit_subsidy_electricity",
+    "unit_subsidy_hydrogen",
+]
+PLANT_FACT_COLUMNS = ["plant_id", "iso3", "plant_profit_and_loss", "plant_group_id", "plant_group_balance"]
+# Cost breakdown items that repeat the material cost columns and are therefore not reported as breakdown columns
+NON_PROCESS_COST_ITEMS = {
+    "total_cost",
+    "unit_cost",
+    "demand",
+    "product_volume",
+    "total_material_cost",
+    "unit_material_cost",
+}
+
+
+def _select_furnace_group_columns(columns: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Pick the reported furnace group columns out of ``columns``.
+
+    Returns the columns to read (base, optional, emissions and dynamic subsidy columns in report order) and the
+    subsidy columns that are reported even when missing (filled with 0.0).
+    """
+    selected = FURNACE_GROUP_COLUMNS + [c for c in OPTIONAL_FURNACE_GROUP_COLUMNS if c in columns]
+    selected += [c for c in columns if c.startswith("emissions_")]
+    # Subsidy columns: fixed order first, then dynamic carriers, then total
+    skip = set(FIXED_SUBSIDY_COLUMNS) | {"unit_subsidy_total"}
+    dynamic_subsidy_cols = sorted(c for c in columns if c.startswith("unit_subsidy_") and c not in skip)
+    return selected, FIXED_SUBSIDY_COLUMNS + dynamic_subsidy_cols + ["unit_subsidy_total"]
+
+
+def _read_year_from_tables(data_dir: Path, year: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Read one year of collected data from the columnar tables written by the DataCollector.
+
+    Only the reported columns are loaded, and the long-format BOM, breakdown and emission tables are pivoted with
+    vectorised group-bys instead of iterating over plants and furnace groups.
+
+    Returns:
+        tuple: (furnace groups with their plant facts, material feedstocks with their cost and carbon breakdowns)
+    """
+    available = read_table_columns(data_dir, FURNACE_GROUPS, year)
+    if "furnace_group_id" not in available:
+        return pd.DataFrame(), pd.DataFrame()
+    selected, subsidy_cols = _select_furnace_group_columns(available)
+    furnace_df = read_year_table(
+        data_dir,
+        FURNACE_GROUPS,
+        year,
+        columns=PLANT_FACT_COLUMNS + selected + [c for c in subsidy_cols if c in available],
+    )
+    for col in subsidy_cols:
+        furnace_df[col] = furnace_df[col].fillna(0.0) if col in furnace_df.columns else 0.0
+
+    emissions = read_year_table(data_dir, EMISSIONS, year)
+    if not emissions.empty:
+        emissions["column"] = "emissions_" + emissions["boundary"].astype(str) + "_" + emissions["scope"].astype(str)
+        by_column = emissions.groupby(["furnace_group_id", "column"], sort=False)["value"]
+        wide_emissions = by_column.first().unstack("column")
+        wide_emissions = wide_emissions[list(pd.unique(emissions["column"]))].reset_index()
+        furnace_df = furnace_df.merge(wide_emissions, on="furnace_group_id", how="left")
+    emission_cols = [c for c in furnace_df.columns if c.startswith("emissions_") and c not in selected]
+    furnace_df = furnace_df[PLANT_FACT_COLUMNS + selected + emission_cols + subsidy_cols]
+
+    feedstocks = read_year_table(
+        data_dir,
+        FEEDSTOCKS,
+        year,
+        columns=["furnace_group_id", "section", "feedstock", "demand", "total_cost", "unit_cost"],
+    )
+    long_df = (
+        feedstocks[feedstocks["section"] == "materials"]
+        .drop(columns="section")
+        .rename(
+            columns={
+                "total_cost": "total_cost - material and allocation",
+                "unit_cost": "unit_cost - material and alloction",
+            }
+        )
+    )
+    breakdowns = read_year_table(data_dir, BREAKDOWNS, year)
+    is_material_cost = (breakdowns["breakdown"] == "cost") & breakdowns["item"].isin(NON_PROCESS_COST_ITEMS)
+    breakdowns = breakdowns[~is_material_cost].copy()
+    if not breakdowns.empty:
+        breakdowns["column"] = breakdowns["breakdown"] + "_breakdown - " + breakdowns["item"].astype(str)
+        wide_breakdowns = (
+            breakdowns.groupby(["furnace_group_id", "feedstock", "column"], sort=False)["value"]
+            .first()
+            .unstack("column")
+            .reset_index()
+        )
+        long_df = long_df.merge(wide_breakdowns, on=["furnace_group_id", "feedstock"], how="left")
+    value_cols = [c for c in long_df.columns if c not in ("furnace_group_id", "feedstock")]
+    long_df[value_cols] = long_df[value_cols].fillna(0.0)
+    return furnace_df, long_df.reset_index(drop=True)
+
+
+def _read_year_from_pickle(allocation_file: Path) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Read one year of collected data from a legacy ``datacollection_post_allocation_{year}.pkl`` file.
+
+    Returns the same two frames as ``_read_year_from_tables``.
+    """
+    with open(allocation_file, "rb") as f:
+        data = pickle.load(f)
+    df = pd.DataFrame(data).T
+    furnaces = []
+    feedstock_proccess = []
+    for plant_id, row in df.iterrows():
+        plant = pd.DataFrame(row["furnace_groups"])
+        if plant.empty:
+            continue
+        fg_cols_to_select, subsidy_cols = _select_furnace_group_columns(list(plant.columns))
+        for col in subsidy_cols:
+            if col not in plant.columns:
+                plant[col] = 0.0
+        furnaces.append(plant[fg_cols_to_select + subsidy_cols])
+        # Include cost_breakdown if it exists in the plant DataFrame
+        cols_to_select = ["furnace_group_id", "materials", "energy"]
+        if "cost_breakdown" in plant.columns:
+            cols_to_select.append("cost_breakdown")
+        if "carbon_breakdown" in plant.columns:
+            cols_to_select.append("carbon_breakdown")
+        feedstock_proccess.append(plant[cols_to_select])
+
+    # Filter out empty/all-NA DataFrames to avoid pandas FutureWarning on concat
+    furnaces = _filter_effectively_empty_frames(furnaces)
+    feedstock_proccess = _filter_effectively_empty_frames(feedstock_proccess)
+
+    furnace_df = pd.concat(furnaces, axis=0).reset_index(drop=True) if furnaces else pd.DataFrame()
+    feedstock_df = (
+        pd.concat(feedstock_proccess, axis=0).reset_index(drop=True) if feedstock_proccess else pd.DataFrame()
+    )
+    records = []
+    for _aux, row in feedstock_df.iterrows():
+        fg = row["furnace_group_id"]
+        mats = row.get("materials", {})
+        if not isinstance(mats, dict):
+            mats = {}
+        cost_break = row.get("cost_breakdown", {})
+        if not isinstance(cost_break, dict):
+            cost_break = {}
+        carb_break = row.get("carbon_breakdown", {})
+        if not isinstance(carb_break, dict):
+            carb_break = {}
+
+        # get every feedstock that appears in either dict
+        for feed in set(mats):
+            m = mats.get(feed, {})
+            cb = cost_break.get(feed, {})
+            records_dict = {
+                "furnace_group_id": fg,
+                "feedstock": feed,
+                "demand": m.get("demand"),
+                "total_cost - material and allocation": m.get("total_cost"),
+                "unit_cost - material and alloction": m.get("unit_cost"),
+            }
+            for process_cost in cost_break.get(feed, {}):
+                if process_cost in NON_PROCESS_COST_ITEMS:
+                    continue
+                records_dict[f"cost_breakdown - {process_cost}"] = cb.get(process_cost, 0)
+
+            # Unpack carbon breakdown (tCO2/t-product)
+            cb_carbon = carb_break.get(feed, {})
+            for carbon_key in cb_carbon:
+                records_dict[f"carbon_breakdown - {carbon_key}"] = cb_carbon.get(carbon_key, 0)
+
+            records.append(records_dict)
+    long_df = pd.DataFrame.from_records(records)
+    if not long_df.empty and all(col in long_df.columns for col in ["furnace_group_id", "feedstock"]):
+        long_df = (
+            long_df.set_index(["furnace_group_id", "feedstock"])
+            .T.groupby(level=0)
+            .sum()
+            .T.reset_index()[long_df.columns]
+            .copy()
+        )
+
+    if furnace_df.empty:
+        return furnace_df, long_df
+    furnace_df["plant_id"] = furnace_df["furnace_group_id"].apply(lambda x: x.split("_")[0])
+    furnace_df = (
+        df[["location", "plant_profit_and_loss", "plant_group_id", "plant_group_balance"]]
+        .reset_index()
+        .rename(columns={"index": "plant_id", "location": "iso3"})
+        .merge(furnace_df, on="plant_id", how="right")
+    )
+    return furnace_df, long_df
+
+
 def extract_and_process_stored_dataCollection(
     commands: dict,
     data_dir: Path,
@@ -42,8 +263,10 @@ def extract_and_process_stored_dataCollection(
     iso3_to_region_map: dict[str, str] | None = None,
 ) -> pd.DataFrame | str:
     """
-    Extract and process stored pickle-files storing the collected data from the simulation.
-    This function is a placeholder and should be replaced with actual implementation.
+    Extract and process the data collected during the simulation into one row per furnace group, feedstock and year.
+
+    Each year is read from the columnar tables written by the DataCollector (see ``datacollection_tables``); years
+    that only have a legacy ``datacollection_post_allocation_{year}.pkl`` file are read from the pickle instead.
     """
     logging.info(f"extract_and_process_stored_dataCollection: Received commands for {len(commands)} years")
     if commands:
@@ -60,132 +283,17 @@ def extract_and_process_stored_dataCollection(
 
     all_furnaces = []
     for year in list(commands.keys()):
-        allocation_file = data_dir / f"datacollection_post_allocation_{str(year)}.pkl"
-        if not allocation_file.exists():
-            logging.warning(f"Warning: Allocation file for year {year} not found, skipping...")
-            continue
-        with open(allocation_file, "rb") as f:
-            data = pickle.load(f)
-        df = pd.DataFrame(data).T
-        furnaces = []
-        feedstock_proccess = []
-        for plant_id, row in df.iterrows():
-            plant = pd.DataFrame(row["furnace_groups"])
-            if plant.empty:
+        if has_year_tables(data_dir, year):
+            furnace_df, long_df = _read_year_from_tables(data_dir, year)
+        else:
+            allocation_file = data_dir / f"datacollection_post_allocation_{str(year)}.pkl"
+            if not allocation_file.exists():
+                logging.warning(f"Warning: Allocation file for year {year} not found, skipping...")
                 continue
-            # Build list of columns to select - include optional columns only if they exist
-            fg_cols_to_select = [
-                "furnace_group_id",
-                "technology",
-                "product",
-                "chosen_reductant",
-                "capacity",
-                "production",
-                "unit_vopex",
-                "unit_fopex",
-                "unit_production_cost",
-                "debt_repayment_for_current_year",
-                "furnace_group_profit_and_loss",
-            ]
-            if "unit_debt_repayment" in plant.columns:
-                fg_cols_to_select.append("unit_debt_repayment")
-            # Add optional columns if they exist in the DataFrame
-            if "unit_secondary_output_costs" in plant.columns:
-                fg_cols_to_select.append("unit_secondary_output_costs")
-            if "unit_carbon_cost" in plant.columns:
-                fg_cols_to_select.append("unit_carbon_cost")
-            if "unit_carbon_cost_contribution - co2_slip" in plant.columns:
-                fg_cols_to_select.append("unit_carbon_cost_contribution - co2_slip")
-            # Add emissions columns dynamically
-            fg_cols_to_select += plant.columns[plant.columns.str.startswith("emissions_")].tolist()
-            # Add subsidy columns: fixed order first, then dynamic carriers, then total
-            subsidy_cols = set(plant.columns[plant.columns.str.startswith("unit_subsidy_")])
-            fixed_subsidy_cols = [
-                "unit_subsidy_capex",
-                "unit_subsidy_opex",
-                "unit_subsidy_debt",
-                "unit_subsidy_electricity",
-                "unit_subsidy_hydrogen",
-            ]
-            skip = set(fixed_subsidy_cols) | {"unit_subsidy_total"}
-            dynamic_subsidy_cols = sorted(c for c in subsidy_cols if c not in skip)
-            for col in fixed_subsidy_cols:
-                if col not in plant.columns:
-                    plant[col] = 0.0
-            if "unit_subsidy_total" not in plant.columns:
-                plant["unit_subsidy_total"] = 0.0
-            fg_cols_to_select += fixed_subsidy_cols + dynamic_subsidy_cols + ["unit_subsidy_total"]
-
-            furnaces.append(plant[fg_cols_to_select])
-            # Include cost_breakdown if it exists in the plant DataFrame
-            cols_to_select = ["furnace_group_id", "materials", "energy"]
-            if "cost_breakdown" in plant.columns:
-                cols_to_select.append("cost_breakdown")
-            if "carbon_breakdown" in plant.columns:
-                cols_to_select.append("carbon_breakdown")
-            feedstock_proccess.append(plant[cols_to_select])
-
-        # Filter out empty/all-NA DataFrames to avoid pandas FutureWarning on concat
-        furnaces = _filter_effectively_empty_frames(furnaces)
-        feedstock_proccess = _filter_effectively_empty_frames(feedstock_proccess)
-
-        furnace_df = pd.concat(furnaces, axis=0).reset_index(drop=True) if furnaces else pd.DataFrame()
-        # print(furnace_df)
-        feedstock_df = (
-            pd.concat(feedstock_proccess, axis=0).reset_index(drop=True) if feedstock_proccess else pd.DataFrame()
-        )
-        # print(feedstock_df)
-        records = []
-        for _aux, row in feedstock_df.iterrows():
-            fg = row["furnace_group_id"]
-            mats = row.get("materials", {})
-            if not isinstance(mats, dict):
-                mats = {}
-            cost_break = row.get("cost_breakdown", {})
-            if not isinstance(cost_break, dict):
-                cost_break = {}
-            carb_break = row.get("carbon_breakdown", {})
-            if not isinstance(carb_break, dict):
-                carb_break = {}
-
-            # get every feedstock that appears in either dict
-            for feed in set(mats):
-                m = mats.get(feed, {})
-                cb = cost_break.get(feed, {})
-                records_dict = {
-                    "furnace_group_id": fg,
-                    "feedstock": feed,
-                    "demand": m.get("demand"),
-                    "total_cost - material and allocation": m.get("total_cost"),
-                    "unit_cost - material and alloction": m.get("unit_cost"),
-                }
-                for process_cost in cost_break.get(feed, {}):
-                    if process_cost in [
-                        "total_cost",
-                        "unit_cost",
-                        "demand",
-                        "product_volume",
-                        "total_material_cost",
-                        "unit_material_cost",
-                    ]:
-                        continue
-                    records_dict[f"cost_breakdown - {process_cost}"] = cb.get(process_cost, 0)
-
-                # Unpack carbon breakdown (tCO2/t-product)
-                cb_carbon = carb_break.get(feed, {})
-                for carbon_key in cb_carbon:
-                    records_dict[f"carbon_breakdown - {carbon_key}"] = cb_carbon.get(carbon_key, 0)
-
-                records.append(records_dict)
-        long_df = pd.DataFrame.from_records(records)
-        if not long_df.empty and all(col in long_df.columns for col in ["furnace_group_id", "feedstock"]):
-            long_df = (
-                long_df.set_index(["furnace_group_id", "feedstock"])
-                .T.groupby(level=0)
-                .sum()
-                .T.reset_index()[long_df.columns]
-                .copy()
-            )
+            furnace_df, long_df = _read_year_from_pickle(allocation_file)
+        if furnace_df.empty:
+            logging.warning(f"Warning: No furnace group data collected for year {year}, skipping...")
+            continue
 
         if not long_df.empty:
             # Ensure all canonical cost_breakdown and carbon_breakdown columns exist
@@ -208,15 +316,6 @@ def extract_and_process_stored_dataCollection(
             if carbon_breakdown_columns:
                 for col in carbon_breakdown_columns:
                     full_furnace_df[col] = None
-        full_furnace_df["plant_id"] = full_furnace_df["furnace_group_id"].apply(lambda x: x.split("_")[0])
-        full_furnace_df = (
-            df[["location", "plant_profit_and_loss", "plant_group_id", "plant_group_balance"]]
-            .reset_index()
-            .rename(columns={"index": "plant_id"})
-            .merge(full_furnace_df, on="plant_id", how="right")
-            .copy()
-        )
-        full_furnace_df.rename(columns={"location": "iso3"}, inplace=True)
         if iso3_to_country_map:
             full_furnace_df["country"] = full_furnace_df["iso3"].map(iso3_to_country_map)
         if iso3_to_region_map:
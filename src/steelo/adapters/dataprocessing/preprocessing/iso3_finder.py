@@ -1,14 +1,24 @@
+from __future__ import annotations
+
 import pycountry
 from functools import lru_cache
 import gc
 import numpy as np
-import xarray as xr
 import inspect
 from io import StringIO
 from dataclasses import dataclass
 import logging
+from typing import TYPE_CHECKING
 from geopy import distance  # type: ignore
-import reverse_geocoder as rg  # type: ignore
+
+from steelo.utilities.lazy_imports import lazy_module
+
+# xarray and reverse_geocoder (scipy) are only needed once coordinates are geocoded
+xr = lazy_module("xarray")
+if TYPE_CHECKING:
+    import reverse_geocoder as rg  # type: ignore
+else:
+    rg = lazy_module("reverse_geocoder")
 
 logger = logging.getLogger(__name__)
 
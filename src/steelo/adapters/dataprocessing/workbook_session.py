@@ -0,0 +1,227 @@
+"""Parse each Excel workbook once and serve its sheets as DataFrames.
+
+``pd.read_excel(path, sheet_name=...)`` opens and parses the whole workbook (shared strings, styles, sheet index)
+for every call. Data preparation reads more than forty sheets from the same master Excel file, one ``read_*``
+function after another, so the multi-megabyte workbook used to be parsed once per sheet.
+
+A ``WorkbookSession`` opens the workbook once (with ``python-calamine`` when it is installed, otherwise a read-only
+openpyxl pass) and caches every sheet it reads as a DataFrame. The ``excel_reader`` ``read_*`` functions and
+``MasterExcelReader`` accept a session wherever they accept a path. While a session is open as a context manager,
+reads given the plain path of its workbook are served by the session too, so code that threads the path through
+(e.g. ``DataRecreator``) shares the single parse without signature changes.
+
+Example:
+    >>> with WorkbookSession(master_excel_path) as workbook:
+    ...     mappings = read_country_mappings(workbook)
+    ...     tariffs = read_tariffs(master_excel_path, "Tariffs", mappings)  # also served by the session
+"""
+
+import hashlib
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Workbook parses per file (resolved path) in this process, by sessions and by direct reads alike
+PARSE_COUNTS: Counter[str] = Counter()
+
+_active_sessions: dict[Path, "WorkbookSession"] = {}
+
+# Sets collecting the names of the sheets read while ``record_sheet_reads`` blocks are open
+_sheet_recorders: list[set[str]] = []
+
+
+def _record_sheet_read(sheet_name: str) -> None:
+    for recorder in _sheet_recorders:
+        recorder.add(sheet_name)
+
+
+@contextmanager
+def record_sheet_reads() -> Iterator[set[str]]:
+    """Collect the names of all sheets read (parsed or served from a cache) inside the block.
+
+    Data preparation uses this to learn which sheets each prepared output depends on.
+
+    Example:
+        >>> with record_sheet_reads() as sheets:
+        ...     read_tariffs(master_excel_path, "Tariffs", mappings)
+        >>> sheets
+        {'Tariffs', 'Country mapping'}
+    """
+    sheets: set[str] = set()
+    _sheet_recorders.append(sheets)
+    try:
+        yield sheets
+    finally:
+        _sheet_recorders.remove(sheets)
+
+
+def _excel_engine() -> str | None:
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None  # pandas picks openpyxl for .xlsx
+    return "calamine"
+
+
+class WorkbookSession:
+    """One parsed Excel workbook whose sheets are read and cached on demand.
+
+    Args:
+        path: Path to the Excel file
+        engine: pandas Excel engine; defaults to ``calamine`` if ``python-calamine`` is installed, else openpyxl
+
+    Attributes:
+        parse_count: Number of times the workbook was opened (at most 1 per open/close cycle)
+        sheets_read: Number of distinct sheet reads parsed from the workbook
+        cache_hits: Number of sheet reads served from the cache
+        parse_seconds: Time spent opening the workbook and parsing sheets
+    """
+
+    def __init__(self, path: Path | str, engine: str | None = None):
+        self.path = Path(path)
+        self.engine = engine if engine is not None else _excel_engine()
+        self._excel_file: pd.ExcelFile | None = None
+        self._sheets: dict[tuple[str, str], pd.DataFrame] = {}
+        self.parse_count = 0
+        self.sheets_read = 0
+        self.cache_hits = 0
+        self.parse_seconds = 0.0
+
+    def __fspath__(self) -> str:
+        return str(self.path)
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    def open(self) -> "WorkbookSession":
+        """Parse the workbook now rather than on the first sheet read, so an unreadable file fails early."""
+        self._workbook()
+        return self
+
+    def _workbook(self) -> pd.ExcelFile:
+        if self._excel_file is None:
+            start = time.time()
+            self._excel_file = pd.ExcelFile(self.path, engine=self.engine)
+            self.parse_seconds += time.time() - start
+            self.parse_count += 1
+            PARSE_COUNTS[str(self.path.resolve())] += 1
+        return self._excel_file
+
+    @property
+    def sheet_names(self) -> list[str]:
+        return list(self._workbook().sheet_names)
+
+    def read_sheet(self, sheet_name: str, **kwargs: Any) -> pd.DataFrame:
+        """Return a sheet as a DataFrame, parsed on first use and copied from the cache afterwards.
+
+        Args:
+            sheet_name: Name of the sheet
+            **kwargs: Further ``pd.read_excel`` arguments (``header``, ``index_col``, ...); every combination is
+                cached separately
+
+        Returns:
+            A copy of the sheet, so callers may modify it
+
+        Raises:
+            ValueError: If the workbook has no sheet named ``sheet_name``
+        """
+        _record_sheet_read(sheet_name)
+        key = (sheet_name, repr(sorted(kwargs.items())))
+        if key in self._sheets:
+            self.cache_hits += 1
+            return self._sheets[key].copy()
+        workbook = self._workbook()
+        start = time.time()
+        df = workbook.parse(sheet_name=sheet_name, **kwargs)
+        self.parse_seconds += time.time() - start
+        self.sheets_read += 1
+        self._sheets[key] = df
+        return df.copy()
+
+    def sheet_hash(self, sheet_name: str) -> str:
+        """Content hash of a sheet's cell values, independent of the other sheets and of the file's zip layout.
+
+        Raises:
+            ValueError: If the workbook has no sheet named ``sheet_name``
+        """
+        values = self.read_sheet(sheet_name, header=None)
+        return hashlib.sha256(values.to_csv(index=False, header=False).encode()).hexdigest()[:16]
+
+    def close(self) -> None:
+        """Release the workbook and the cached sheets."""
+        if self._excel_file is not None:
+            self._excel_file.close()
+            self._excel_file = None
+        self._sheets.clear()
+
+    def log_stats(self) -> None:
+        logger.info(
+            f"operation=workbook_session file={self.path.name} engine={self.engine or 'openpyxl'} "
+            f"parses={self.parse_count} sheets_read={self.sheets_read} cache_hits={self.cache_hits} "
+            f"parse_s={self.parse_seconds:.3f}"
+        )
+
+    def __enter__(self) -> "WorkbookSession":
+        _active_sessions.setdefault(self.path.resolve(), self)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        key = self.path.resolve()
+        if _active_sessions.get(key) is self:
+            del _active_sessions[key]
+        self.log_stats()
+        self.close()
+
+
+ExcelSource = Union[str, os.PathLike, WorkbookSession]
+
+
+def active_session(source: ExcelSource) -> WorkbookSession | None:
+    """The session serving ``source``: the session itself, or the open session for its path (if any)."""
+    if isinstance(source, WorkbookSession):
+        return source
+    if not _active_sessions:
+        return None
+    try:
+        return _active_sessions.get(Path(source).resolve())
+    except TypeError:  # file-like objects
+        return None
+
+
+def read_sheet(source: ExcelSource, sheet_name: str, **kwargs: Any) -> pd.DataFrame:
+    """Read a sheet through the session serving ``source``, or parse the workbook directly if there is none.
+
+    Args:
+        source: A ``WorkbookSession`` or the path of an Excel file
+        sheet_name: Name of the sheet
+        **kwargs: Further ``pd.read_excel`` arguments
+
+    Returns:
+        The sheet as a DataFrame
+    """
+    session = active_session(source)
+    if session is not None:
+        return session.read_sheet(sheet_name, **kwargs)
+    _record_sheet_read(sheet_name)
+    if isinstance(source, (str, os.PathLike)):
+        PARSE_COUNTS[str(Path(source).resolve())] += 1
+    return pd.read_excel(source, sheet_name=sheet_name, **kwargs)
+
+
+def sheet_names(source: ExcelSource) -> list[str]:
+    """Names of the sheets in the workbook of ``source``."""
+    session = active_session(source)
+    if session is not None:
+        return session.sheet_names
+    if isinstance(source, (str, os.PathLike)):
+        PARSE_COUNTS[str(Path(source).resolve())] += 1
+    with pd.ExcelFile(source) as excel_file:
+        return list(excel_file.sheet_names)
@@ -0,0 +1,181 @@
+"""Pre-interpolated baseload LCOE cube.
+
+The baseload optimisation (BOA) writes one global NetCDF file per calculated year
+(``optimal_sol_GLOBAL_{year}_p{p}.nc``); years in between are linearly interpolated. Instead of decoding and
+interpolating these files in every simulation year, the whole simulation horizon is materialised once into a
+(year × lat × lon) cube per variable, stored as ``.npy`` files that are memory-mapped on read, so the per-year lookup
+is a single slice read.
+
+Layout: ``<cube_root>/p{p}/<key>/{manifest.json, lcoe.npy, solar_factor.npy, ...}``, where ``key`` hashes the source
+files (name, size, mtime) and the horizon years. A changed source file or horizon therefore leads to a new cube.
+Runs with different horizons share the directory, so old cubes are evicted least recently used first (use time =
+manifest mtime, refreshed on every open), and never while they may still be memory-mapped by a running simulation.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import xarray as xr
+
+logger = logging.getLogger(__name__)
+
+CUBE_VERSION = "1"  # Bump to invalidate all existing cubes
+OVERBUILD_FACTORS = ("solar_factor", "wind_factor", "battery_factor")
+_MANIFEST = "manifest.json"
+# Cubes kept per grid share; more are only kept while in use
+MAX_CUBES_PER_COVERAGE = 4
+# A cube used more recently than this may still be memory-mapped by a running simulation and is never evicted
+EVICTION_GRACE_SECONDS = 3600.0
+
+
+def cube_key(file_map: dict[int, Path], years: list[int]) -> str:
+    """Key of the cube built from ``file_map`` (source files by year) for the horizon ``years``."""
+    sha256_hash = hashlib.sha256(f"{CUBE_VERSION}\0{years}\0".encode())
+    for year in sorted(file_map):
+        stat = file_map[year].stat()
+        sha256_hash.update(f"{year}\0{file_map[year].name}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+    return sha256_hash.hexdigest()[:32]
+
+
+class BaseloadLcoeCube:
+    """Read access to one built cube; variables are memory-mapped and only the requested year is read."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        manifest = json.loads((self.path / _MANIFEST).read_text())
+        self.years: list[int] = manifest["years"]
+        self.variables: list[str] = manifest["variables"]
+        self.dims: list[str] = manifest["dims"]
+        self.coords: dict[str, list] = manifest["coords"]
+        self._year_index = {year: i for i, year in enumerate(self.years)}
+        self._arrays = {name: np.load(self.path / f"{name}.npy", mmap_mode="r") for name in self.variables}
+
+    def read_year(self, year: int) -> dict[str, xr.DataArray]:
+        """
+        Values of all variables for one year (USD/MWh for the LCOE, as in the source files).
+
+        Raises:
+            KeyError: If ``year`` is outside the cube's horizon.
+        """
+        i = self._year_index[year]
+        return {
+            name: xr.DataArray(np.array(array[i]), dims=self.dims, coords=self.coords, name=name)
+            for name, array in self._arrays.items()
+        }
+
+
+def build_baseload_lcoe_cube(file_map: dict[int, Path], years: list[int], target: Path) -> None:
+    """
+    Interpolate the source files to every year of the horizon and write the cube to ``target``.
+
+    Years with a source file are copied, years in between are linearly interpolated, years outside the range of
+    calculated years are NaN (same behaviour as the per-year interpolation in ``add_baseload_power_price``). The
+    overbuild factors are only included if every source file contains all of them.
+    """
+    source_years = sorted(file_map)
+    sources = [xr.open_dataset(file_map[year]) for year in source_years]
+    try:
+        variables = ["lcoe"]
+        if all(all(factor in source for factor in OVERBUILD_FACTORS) for source in sources):
+            variables.extend(OVERBUILD_FACTORS)
+        target.mkdir(parents=True)
+        for name in variables:
+            stacked = xr.concat([source[name] for source in sources], dim="year").assign_coords(year=source_years)
+            if len(source_years) > 1:
+                cube = stacked.interp(year=years, method="linear")
+            else:
+                cube = stacked.reindex(year=years)
+            cube = cube.astype(np.float64)
+            # Calculated years keep their exact values
+            calculated = [year for year in years if year in file_map]
+            if calculated:
+                cube.loc[{"year": calculated}] = stacked.sel(year=calculated).astype(np.float64).values
+            np.save(target / f"{name}.npy", cube.transpose("year", *stacked[0].dims).values)
+        dims = list(sources[0]["lcoe"].dims)
+        manifest = {
+            "years": years,
+            "variables": variables,
+            "dims": dims,
+            "coords": {dim: sources[0][dim].values.tolist() for dim in dims if dim in sources[0].coords},
+            "sources": {str(year): file_map[year].name for year in source_years},
+        }
+        (target / _MANIFEST).write_text(json.dumps(manifest))
+    finally:
+        for source in sources:
+            source.close()
+
+
+def get_or_build_baseload_lcoe_cube(
+    cube_root: Path, p: int, file_map: dict[int, Path], years: list[int]
+) -> BaseloadLcoeCube:
+    """
+    Open the cube for ``file_map`` and ``years``, building it first if it does not exist yet.
+
+    Args:
+        cube_root: Root directory of the cubes (``GeoDataPaths.baseload_lcoe_cube_dir``)
+        p: Grid share in percent (the ``p{p}`` BOA output directory the source files come from)
+        file_map: Source NetCDF file per calculated year
+        years: Simulation horizon
+
+    Returns:
+        The opened cube
+    """
+    coverage_dir = Path(cube_root) / f"p{p}"
+    key = cube_key(file_map, years)
+    path = coverage_dir / key
+    if not (path / _MANIFEST).exists():
+        logger.info(f"[GEO LAYERS] Building baseload LCOE cube for p{p} and years {years[0]}-{years[-1]}.")
+        temporary = coverage_dir / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(temporary, ignore_errors=True)
+        try:
+            build_baseload_lcoe_cube(file_map, years, temporary)
+            try:
+                os.replace(temporary, path)
+            except OSError:
+                # Another process finished the same cube first
+                if not (path / _MANIFEST).exists():
+                    raise
+        finally:
+            shutil.rmtree(temporary, ignore_errors=True)
+        evict_baseload_lcoe_cubes(coverage_dir)
+    else:
+        os.utime(path / _MANIFEST)
+    return BaseloadLcoeCube(path)
+
+
+def evict_baseload_lcoe_cubes(
+    coverage_dir: Path, max_cubes: int = MAX_CUBES_PER_COVERAGE, grace_seconds: float = EVICTION_GRACE_SECONDS
+) -> int:
+    """
+    Remove the least recently used cubes of one grid share beyond ``max_cubes``.
+
+    Cubes used within the last ``grace_seconds`` are kept even beyond ``max_cubes``, since another run may have them
+    memory-mapped.
+
+    Returns:
+        Number of removed cubes
+    """
+    cubes = []
+    for cube in Path(coverage_dir).iterdir():
+        if cube.name.startswith("."):
+            continue
+        try:
+            cubes.append((cube, (cube / _MANIFEST).stat().st_mtime))
+        except FileNotFoundError:
+            continue
+    cubes.sort(key=lambda entry: entry[1], reverse=True)
+    cutoff = time.time() - grace_seconds
+    removed = 0
+    for cube, last_used in cubes[max_cubes:]:
+        if last_used >= cutoff:
+            continue
+        shutil.rmtree(cube, ignore_errors=True)
+        removed += 1
+        logger.debug(f"operation=baseload_lcoe_cube_evict path={cube}")
+    return removed
@@ -1,7 +1,8 @@
+import hashlib
 import numpy as np
 import pandas as pd
 import xarray as xr
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
     from steelo.domain.models import GeoDataPaths
@@ -288,11 +289,80 @@ def get_weighted_location_dict_from_demand_centers(repository: Repository, year:
     return weighted_loc_dict
 
 
+def get_weighted_location_dict_from_iron_ore_suppliers(repository: Repository, year: int) -> dict[Location, float]:
+    """
+    Get a dictionary of iron ore mine locations and their capacities for the specified year.
+
+    Args:
+        repository: Repository containing supplier data
+        year: Year for which to retrieve capacities
+
+    Returns:
+        Dictionary mapping Location objects to iron ore capacity (tonnes) for the specified year
+    """
+    logger = logging.getLogger(f"{__name__}.get_weighted_location_dict_from_iron_ore_suppliers")
+    weighted_loc_dict: dict[Location, float] = {}
+    iron_ore_suppliers = [
+        supplier
+        for supplier in repository.suppliers.list()
+        if supplier.commodity.lower() in ["io_low", "io_mid", "io_high"]
+    ]
+    if not iron_ore_suppliers:
+        logger.warning("[GEO LAYERS] No iron ore suppliers found in the repository.")
+    for supplier in iron_ore_suppliers:
+        if supplier.location is None:
+            continue
+        weighted_loc_dict[supplier.location] = float(supplier.capacity_by_year[Year(year)])
+    return weighted_loc_dict
+
+
+def collect_distance_sources(
+    repository: Repository, year: int, active_statuses: list[str]
+) -> dict[str, dict[Location, float]]:
+    """
+    Collect the weighted locations the transportation cost layer measures distances to.
+
+    Args:
+        repository: Repository containing plants, suppliers, and demand centers data
+        year: Year for which to collect capacities and demand
+        active_statuses: List of statuses considered as active (e.g., ["operating", "operating pre-retirement"])
+
+    Returns:
+        Dictionary with keys "ore_mines", "iron_plants", "steel_plants" and "demand_centers", each mapping Location
+        objects to capacity or demand (tonnes)
+    """
+    return {
+        "ore_mines": get_weighted_location_dict_from_iron_ore_suppliers(repository, year),
+        "iron_plants": get_weighted_location_dict_from_plants(
+            repository, product_type="iron", active_statuses=active_statuses
+        ),
+        "steel_plants": get_weighted_location_dict_from_plants(
+            repository, product_type="steel", active_statuses=active_statuses
+        ),
+        "demand_centers": get_weighted_location_dict_from_demand_centers(repository, year),
+    }
+
+
+def fingerprint_distance_sources(sources: dict[str, dict[Location, float]]) -> str:
+    """
+    Hash of the weighted locations returned by ``collect_distance_sources``.
+
+    Two years with the same fingerprint produce identical distance layers, so the layers can be reused.
+    """
+    sha256_hash = hashlib.sha256()
+    for name in sorted(sources):
+        sha256_hash.update(name.encode())
+        for lat, lon, weight in sorted((loc.lat, loc.lon, float(weight)) for loc, weight in sources[name].items()):
+            sha256_hash.update(f"{lat!r},{lon!r},{weight!r};".encode())
+    return sha256_hash.hexdigest()
+
+
 def calculate_distance_to_demand_and_feedstock(
     repository: Repository,
     year: int,
     active_statuses: list[str],
     geo_paths: "GeoDataPaths",
+    sources: dict[str, dict[Location, float]] | None = None,
 ) -> tuple[xr.DataArray, xr.DataArray, xr.DataArray, xr.DataArray]:
     """
     Calculate the distance to demand centers and feedstock sources for iron and steel plants.
@@ -308,6 +378,7 @@ def calculate_distance_to_demand_and_feedstock(
         year: Year for which to calculate distances
         active_statuses: List of statuses considered as active (e.g., ["operating", "operating pre-retirement"])
         geo_paths: Paths to geospatial data files for plotting outputs
+        sources: Weighted locations from ``collect_distance_sources`` if already collected (collected here otherwise)
 
     Returns:
         dist_to_ore_mines: DataArray of distances to iron ore mines (km)
@@ -321,6 +392,9 @@ def calculate_distance_to_demand_and_feedstock(
     logger = logging.getLogger(f"{__name__}.calculate_distance_to_demand_and_feedstock")
     from steelo.utilities.plotting import plot_bubble_map
 
+    if sources is None:
+        sources = collect_distance_sources(repository, year, active_statuses)
+
     # Create spatial grid
     bbox = {"minx": -180, "miny": -90, "maxx": 180, "maxy": 90}
     grid = generate_grid(bbox=bbox, resolution=GEO_RESOLUTION)
@@ -329,18 +403,7 @@ def calculate_distance_to_demand_and_feedstock(
 
     # Iron ore mines
     logger.info("[GEO LAYERS] Calculating distances to iron ore mines.")
-    iron_feedstock_locations_weight: dict[Location, float | int | Volumes] = {}
-    iron_ore_suppliers = [
-        supplier
-        for supplier in repository.suppliers.list()
-        if supplier.commodity.lower() in ["io_low", "io_mid", "io_high"]
-    ]
-    if not iron_ore_suppliers:
-        logger.warning("[GEO LAYERS] No iron ore suppliers found in the repository.")
-    for supplier in iron_ore_suppliers:
-        if supplier.location is None:
-            continue
-        iron_feedstock_locations_weight[supplier.location] = float(supplier.capacity_by_year[Year(year)])
+    iron_feedstock_locations_weight = cast(dict[Location, float | int | Volumes], sources["ore_mines"])
     plot_paths_obj = PlotPaths(geo_plots_dir=geo_paths.geo_plots_dir)
     plot_bubble_map(
         data=iron_feedstock_locations_weight,
@@ -357,31 +420,24 @@ def calculate_distance_to_demand_and_feedstock(
 
     # Iron plants
     logger.info("[GEO LAYERS] Calculating distances to iron plants.")
-    iron_loc_dict = get_weighted_location_dict_from_plants(
-        repository, product_type="iron", active_statuses=active_statuses
-    )
     dist_to_iron_plants = distance_to_closest_location(
-        iron_loc_dict,
+        sources["iron_plants"],
         target_lats=lats,
         target_lons=lons,
     )
 
     # Steel plants
     logger.info("[GEO LAYERS] Calculating distances to steel plants.")
-    steel_loc_dict = get_weighted_location_dict_from_plants(
-        repository, product_type="steel", active_statuses=active_statuses
-    )
     dist_to_steel_plants = distance_to_closest_location(
-        steel_loc_dict,
+        sources["steel_plants"],
         target_lats=lats,
         target_lons=lons,
     )
 
     # Demand centers
     logger.info("[GEO LAYERS] Calculating distances to demand centers.")
-    demand_loc_dict = get_weighted_location_dict_from_demand_centers(repository, year)
     dist_to_demand_centers = distance_to_closest_location(
-        demand_loc_dict,
+        sources["demand_centers"],
         target_lats=lats,
         target_lons=lons,
     )
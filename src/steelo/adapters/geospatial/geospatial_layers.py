@@ -5,8 +5,10 @@ import logging
 
 # Set up SSL for bundled environments - do this BEFORE any imports that might use HTTPS
 import os
+import shutil
 import ssl
 import sys
+from pathlib import Path
 
 # Detect if we're in a bundled environment
 if getattr(sys, "frozen", False) or "steelo-electron" in sys.executable or "STEEL-IQ" in sys.executable:
@@ -23,6 +25,8 @@ if getattr(sys, "frozen", False) or "steelo-electron" in sys.executable or "STEE
         logging.warning("Warning: Running in bundled environment with SSL verification disabled")
 
 from steelo.adapters.geospatial.geospatial_toolbox import create_global_grid_with_iso
+from steelo.adapters.geospatial.baseload_lcoe_cube import BaseloadLcoeCube, get_or_build_baseload_lcoe_cube
+from steelo.adapters.geospatial.layer_cache import GeoLayerCache
 from steelo.adapters.geospatial.geospatial_calculations import (
     calculate_lcoh_from_power_price,
     calculate_regional_hydrogen_ceiling,
@@ -30,8 +34,9 @@ from steelo.adapters.geospatial.geospatial_calculations import (
     calculate_distance_to_demand_and_feedstock,
 )
 from steelo.adapters.repositories.interface import Repository
-from steelo.domain.models import CountryMappingService, Environment, PlotPaths
+from steelo.domain.models import CountryMappingService, Environment, Location, PlotPaths
 from steelo.utilities.variable_matching import LULC_LABELS_TO_NUM
+from steelo.utilities.plot_queue import submit_plot
 from steelo.utilities.plotting import (
     plot_screenshot,
     plot_value_histogram,
@@ -53,6 +58,61 @@ from steelo.domain.constants import (
 )
 
 
+def _persistent_layer_cache(geo_paths: "GeoDataPaths") -> GeoLayerCache | None:
+    """Cross-run layer cache configured in geo_paths, or None if disabled."""
+    cache_dir = getattr(geo_paths, "layer_cache_dir", None)
+    if not isinstance(cache_dir, (str, os.PathLike)):
+        return None
+    return GeoLayerCache(Path(cache_dir), max_size_gb=geo_paths.layer_cache_max_size_gb)
+
+
+def _grid_signature(ds: xr.Dataset) -> dict[str, list[float]]:
+    """Extent and size of the (lat, lon) grid, for layer cache keys."""
+    return {dim: [float(ds[dim].values[0]), float(ds[dim].values[-1]), int(ds[dim].size)] for dim in ("lat", "lon")}
+
+
+def _restore_static_layer(
+    geo_paths: "GeoDataPaths", layer: str, inputs: list[Path], params: dict[str, Any], target: Path
+) -> tuple[GeoLayerCache, str] | None:
+    """
+    Look up a static layer in the cross-run cache and place it at ``target`` if it is cached.
+
+    Returns:
+        (cache, key) to store the layer once computed, or None if the cache is disabled or the key cannot be built.
+    """
+    layer_cache = _persistent_layer_cache(geo_paths)
+    if layer_cache is None:
+        return None
+    try:
+        key = layer_cache.key(layer, inputs, params)
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"[GEO LAYERS] Layer cache disabled for {layer}: {e}")
+        return None
+    cached_path = layer_cache.get(layer, key)
+    if cached_path is not None:
+        logging.getLogger(__name__).info(f"[GEO LAYERS] Using cached {layer} from {cached_path}.")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(cached_path, target)
+        except OSError:
+            shutil.copyfile(cached_path, target)
+    return layer_cache, key
+
+
+def _baseload_lcoe_cube(
+    geo_paths: "GeoDataPaths", p: int, file_map: dict[int, Path], start_year: int | None, end_year: int | None
+) -> BaseloadLcoeCube | None:
+    """Pre-interpolated baseload LCOE cube for the simulation horizon, or None if disabled or the horizon is unknown."""
+    cube_dir = getattr(geo_paths, "baseload_lcoe_cube_dir", None)
+    if not isinstance(cube_dir, (str, os.PathLike)) or start_year is None or end_year is None:
+        return None
+    try:
+        return get_or_build_baseload_lcoe_cube(Path(cube_dir), p, file_map, list(range(start_year, end_year + 1)))
+    except (OSError, ValueError, KeyError) as e:
+        logging.getLogger(__name__).warning(f"[GEO LAYERS] Baseload LCOE cube unavailable, interpolating per year: {e}")
+        return None
+
+
 def add_iso3_codes(resolution: float, geo_paths: "GeoDataPaths") -> xr.Dataset:
     """
     Create a global grid with ISO3 codes assigned to each (lat,lon) point.
@@ -67,6 +127,7 @@ def add_iso3_codes(resolution: float, geo_paths: "GeoDataPaths") -> xr.Dataset:
     Side Effects:
         - Generates and saves plot of global grid with ISO3 codes
         - Saves ISO3 grid to NetCDF file in static_layers_dir for reuse
+        - Reuses / stores the ISO3 grid in the cross-run layer cache (geo_paths.layer_cache_dir) if configured
     """
     logger = logging.getLogger(f"{__name__}.add_iso3_codes")
     # Ensure required paths are provided
@@ -76,6 +137,15 @@ def add_iso3_codes(resolution: float, geo_paths: "GeoDataPaths") -> xr.Dataset:
             "Ensure geo_paths is provided and contains static_layers_dir."
         )
     iso3_grid_path = geo_paths.static_layers_dir / "global_grid_with_iso3.nc"
+    layer_cache = None
+    if not iso3_grid_path.exists():
+        layer_cache = _restore_static_layer(
+            geo_paths,
+            "global_grid_with_iso3",
+            inputs=[geo_paths.countries_shapefile_dir, geo_paths.disputed_areas_shapefile_dir],
+            params={"resolution": resolution},
+            target=iso3_grid_path,
+        )
 
     # Check if the output file already exists
     if iso3_grid_path.exists():
@@ -122,6 +192,8 @@ def add_iso3_codes(resolution: float, geo_paths: "GeoDataPaths") -> xr.Dataset:
             ds["iso3"].to_netcdf(iso3_grid_path, mode="w", format="NETCDF4")
         except (ImportError, ValueError):
             ds["iso3"].to_netcdf(iso3_grid_path, mode="w", engine="scipy")
+        if layer_cache is not None:
+            layer_cache[0].put("global_grid_with_iso3", layer_cache[1], iso3_grid_path)
     return ds
 
 
@@ -151,6 +223,7 @@ def add_feasibility_mask(ds: xr.Dataset, geo_config: "GeoConfig", geo_paths: "Ge
     Side Effects:
         - Generates and saves plots of land-sea mask, altitude, slope, and final feasibility mask
         - Saves feasibility mask to NetCDF file in static_layers_dir for reuse
+        - Reuses / stores the feasibility mask in the cross-run layer cache (geo_paths.layer_cache_dir) if configured
     """
     logger = logging.getLogger(f"{__name__}.add_feasibility_mask")
     # Ensure required paths are provided
@@ -166,6 +239,20 @@ def add_feasibility_mask(ds: xr.Dataset, geo_config: "GeoConfig", geo_paths: "Ge
             "Ensure geo_paths is provided and contains static_layers_dir."
         )
     feasibility_mask_path = geo_paths.static_layers_dir / "feasibility_mask.nc"
+    layer_cache = None
+    if not feasibility_mask_path.exists():
+        layer_cache = _restore_static_layer(
+            geo_paths,
+            "feasibility_mask",
+            inputs=[terrain_path],
+            params={
+                "grid": _grid_signature(ds),
+                "max_altitude": geo_config.max_altitude,
+                "max_slope": geo_config.max_slope,
+                "max_latitude": geo_config.max_latitude,
+            },
+            target=feasibility_mask_path,
+        )
 
     # Check if the output file already exists
     if feasibility_mask_path.exists():
@@ -191,7 +278,9 @@ def add_feasibility_mask(ds: xr.Dataset, geo_config: "GeoConfig", geo_paths: "Ge
         # Binary land sea mask
         landsea_mask_bin = (terrain["lsm"] > 0.5).astype(int)
         plot_paths_obj = PlotPaths(geo_plots_dir=geo_paths.geo_plots_dir)
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             landsea_mask_bin,
             title="Binary Land Sea Mask",
             var_type="binary",
@@ -204,7 +293,9 @@ def add_feasibility_mask(ds: xr.Dataset, geo_config: "GeoConfig", geo_paths: "Ge
         altitude = geopotential / GRAVITY_ACCELERATION  # Convert geopotential to altitude in meters
         altitude_pos = altitude.where(altitude > 0)
         altitude_bin = xr.where(altitude_pos < geo_config.max_altitude, 1, 0)
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             altitude_bin,
             title="Binary Altitude",
             var_type="binary",
@@ -216,7 +307,9 @@ def add_feasibility_mask(ds: xr.Dataset, geo_config: "GeoConfig", geo_paths: "Ge
         slope_rad = terrain["slor"]
         slope = slope_rad * rad_TO_deg
         slope_bin = xr.where(slope < geo_config.max_slope, 1, 0)
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             slope_bin,
             title="Binary Slope",
             var_type="binary",
@@ -250,7 +343,9 @@ def add_feasibility_mask(ds: xr.Dataset, geo_config: "GeoConfig", geo_paths: "Ge
 
         # Plot and save feasibility mask
         ds["feasibility_mask"] = feasibility_mask_corrected
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             ds["feasibility_mask"],
             title="Feasibility Mask",
             var_type="binary",
@@ -258,6 +353,8 @@ def add_feasibility_mask(ds: xr.Dataset, geo_config: "GeoConfig", geo_paths: "Ge
             plot_paths=plot_paths_obj,
         )
         ds["feasibility_mask"].to_netcdf(feasibility_mask_path, mode="w", format="NETCDF4")
+        if layer_cache is not None:
+            layer_cache[0].put("feasibility_mask", layer_cache[1], feasibility_mask_path)
     return ds
 
 
@@ -274,7 +371,9 @@ def add_baseload_power_price(
 
     The baseload power price is the LCOE (Levelized Cost of Energy) of the optimal renewable energy solution
     for the given coverage percentage. LCOE values are pre-calculated for select years and linearly interpolated
-    for in-between years to reduce computational cost.
+    for in-between years to reduce computational cost. If geo_paths.baseload_lcoe_cube_dir is set and the simulation
+    horizon is known, the interpolation is done once for the whole horizon (see baseload_lcoe_cube) and each year is
+    a slice read from the memory-mapped cube.
 
     Args:
         ds: Dataset to add baseload power price to
@@ -318,7 +417,18 @@ def add_baseload_power_price(
     if not available_years:
         raise FileNotFoundError(f"No LCOE files found in {lcoe_dir}")
 
-    if target_year in available_years:
+    cube = _baseload_lcoe_cube(geo_paths, p, file_map, start_year, end_year)
+    if cube is not None and target_year in cube.years:
+        # Read the pre-interpolated year from the cube
+        logger.info(f"[GEO LAYERS] Reading baseload LCOE for year {target_year} from the pre-interpolated cube.")
+        cube_year = cube.read_year(target_year)
+        baseload_lcoe_year = cube_year["lcoe"]
+        has_overbuild_factors = all(factor in cube_year for factor in ["solar_factor", "wind_factor", "battery_factor"])
+        if has_overbuild_factors:
+            solar_factor_year = cube_year["solar_factor"]
+            wind_factor_year = cube_year["wind_factor"]
+            battery_factor_year = cube_year["battery_factor"]
+    elif target_year in available_years:
         # Choose the data for the target year if available
         logger.info(f"[GEO LAYERS] Explicitly calculated LCOE is available for year {target_year}.")
         baseload_lcoe_path = file_map[target_year]
@@ -383,7 +493,9 @@ def add_baseload_power_price(
 
     plot_paths_obj = PlotPaths(geo_plots_dir=geo_paths.geo_plots_dir)
     if is_milestone_year:
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             ds["lcoe"].where(ds["feasibility_mask"] > 0) * PERkWh_TO_PERMWh,  # USD/kWh to USD/MWh
             title=f"Optimal LCOE for {100 - p}% coverage in {target_year} (USD/MWh)",
             var_type="sequential",
@@ -441,7 +553,9 @@ def add_grid_power_price(
     )
 
     plot_paths_obj = PlotPaths(geo_plots_dir=geo_paths.geo_plots_dir)
-    plot_screenshot(
+    submit_plot(
+        "geo",
+        plot_screenshot,
         ds["grid_price"].where(ds["feasibility_mask"] > 0) * PERkWh_TO_PERMWh,  # USD/kWh to USD/MWh
         title="Grid Power Price (USD/MWh)",
         var_type="sequential",
@@ -516,7 +630,9 @@ def add_power_price(
 
     plot_paths_obj = PlotPaths(geo_plots_dir=geo_paths.geo_plots_dir)
     if is_milestone_year:
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             ds["power_price"].where(ds["feasibility_mask"] > 0) * PERkWh_TO_PERMWh,  # USD/kWh to USD/MWh
             title=title,
             var_type="sequential",
@@ -592,7 +708,9 @@ def add_capped_hydrogen_price(
 
     if is_milestone_year:
         plot_paths_obj = PlotPaths(geo_plots_dir=geo_paths.geo_plots_dir)
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             ds["capped_lcoh"].where(ds["feasibility_mask"] > 0),
             title=f"Optimal (capped) LCOH in {year} (USD/kg)",
             var_type="sequential",
@@ -675,6 +793,7 @@ def add_cost_of_infrastructure(ds: xr.Dataset, environment: "Environment", geo_p
     Side Effects:
         - Generates and saves plots of rail distance and rail cost
         - Saves rail cost to NetCDF file in static_layers_dir for reuse
+        - Reuses / stores the rail cost in the cross-run layer cache (geo_paths.layer_cache_dir) if configured
 
     Note:
         Distance to existing rail is calculated as a straight line from any grid cell to the nearest rail line.
@@ -694,6 +813,22 @@ def add_cost_of_infrastructure(ds: xr.Dataset, environment: "Environment", geo_p
 
     # Check if the output file already exists
     rail_cost_path = geo_paths.static_layers_dir / "rail_cost.nc"
+    layer_cache = None
+    if not rail_cost_path.exists():
+        layer_cache = _restore_static_layer(
+            geo_paths,
+            "rail_cost",
+            inputs=[
+                geo_paths.rail_distance_nc_path,
+                geo_paths.countries_shapefile_dir,
+                geo_paths.disputed_areas_shapefile_dir,
+            ],
+            params={
+                "grid": _grid_signature(ds),
+                "railway_costs": sorted((cost.iso3, cost.cost_per_km) for cost in environment.railway_costs or []),
+            },
+            target=rail_cost_path,
+        )
     if rail_cost_path.exists():
         logger.info(f"[GEO LAYERS] Rail cost already exists at {rail_cost_path}. Loading from file.")
         ds["rail_cost"] = xr.open_dataset(rail_cost_path)["rail_cost"]
@@ -707,7 +842,9 @@ def add_cost_of_infrastructure(ds: xr.Dataset, environment: "Environment", geo_p
         ds["rail_distance"] = rail_dist_interp
 
         plot_paths_obj = PlotPaths(geo_plots_dir=geo_paths.geo_plots_dir)
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             ds["rail_distance"].where(ds["feasibility_mask"] > 0),
             title="Rail Distance (km)",
             var_type="sequential",
@@ -755,7 +892,9 @@ def add_cost_of_infrastructure(ds: xr.Dataset, environment: "Environment", geo_p
         rail_distance_array = cast(xr.DataArray, ds["rail_distance"]).astype(float)
         ds["rail_cost"] = rail_distance_array * rail_cost_per_km_array
 
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             ds["rail_cost"].where(ds["feasibility_mask"] > 0) * USD_TO_MioUSD,  # Convert USD to Mio USD
             title="Rail Buildout Cost (Million USD)",
             var_type="sequential",
@@ -764,6 +903,8 @@ def add_cost_of_infrastructure(ds: xr.Dataset, environment: "Environment", geo_p
             plot_paths=plot_paths_obj,
         )
         ds["rail_cost"].to_netcdf(rail_cost_path, mode="w", format="NETCDF4")
+        if layer_cache is not None:
+            layer_cache[0].put("rail_cost", layer_cache[1], rail_cost_path)
     return ds
 
 
@@ -776,6 +917,7 @@ def add_transportation_costs(
     geo_paths: "GeoDataPaths",
     start_year: int | None = None,
     end_year: int | None = None,
+    distance_sources: dict[str, dict[Location, float]] | None = None,
 ) -> xr.Dataset:
     """
     Add transportation costs for feedstock and demand for both iron and steel production.
@@ -795,6 +937,7 @@ def add_transportation_costs(
             to milestone years (start, end, and every 10 years after start). If either
             ``start_year`` or ``end_year`` is None, every year is plotted.
         end_year: Simulation end year. See ``start_year`` for plotting behaviour.
+        distance_sources: Weighted locations from ``collect_distance_sources`` if already collected
 
     Returns:
         Dataset with added transportation cost variables:
@@ -813,7 +956,9 @@ def add_transportation_costs(
 
     # Calculate distances to ore mines, iron plants, steel plants, and demand centers
     dist_to_ore_mines, dist_to_iron_plants, dist_to_steel_plants, dist_to_demand_centers = (
-        calculate_distance_to_demand_and_feedstock(repository, year, active_statuses, geo_paths)
+        calculate_distance_to_demand_and_feedstock(
+            repository, year, active_statuses, geo_paths, sources=distance_sources
+        )
     )
     ds_ = xr.merge(
         [
@@ -844,7 +989,9 @@ def add_transportation_costs(
     }
     if is_milestone_year:
         for var, title in distance_plot_titles.items():
-            plot_screenshot(
+            submit_plot(
+                "geo",
+                plot_screenshot,
                 ds_[var],
                 title=title,
                 var_type="sequential",
@@ -880,7 +1027,9 @@ def add_transportation_costs(
     }
     if is_milestone_year:
         for var, title in cost_plot_titles.items():
-            plot_screenshot(
+            submit_plot(
+                "geo",
+                plot_screenshot,
                 ds[var].where(ds["feasibility_mask"] > 0),
                 title=title,
                 var_type="sequential",
@@ -962,7 +1111,9 @@ def add_landtype_factor(ds: xr.Dataset, geo_config: "GeoConfig", geo_paths: "Geo
     # Add landtype factors to the global grid
     ds["landtype_factor"] = (("lat", "lon"), landtype_factors)
     plot_paths_obj = PlotPaths(geo_plots_dir=geo_paths.geo_plots_dir)
-    plot_screenshot(
+    submit_plot(
+        "geo",
+        plot_screenshot,
         ds["landtype_factor"],
         title="Landtype Factor",
         var_type="sequential",
@@ -225,6 +225,32 @@ def haversine_dask(lat1, lon1, lat2, lon2):
     return c * EARTH_RADIUS
 
 
+def haversine_matrix(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Calculate the pairwise distance matrix between two sets of points on Earth using the Haversine formula.
+
+    In-memory NumPy counterpart of ``haversine_dask`` for matrices that fit comfortably in RAM.
+
+    Args:
+        lat1: Latitude of first point(s) in degrees (array-like)
+        lon1: Longitude of first point(s) in degrees (array-like)
+        lat2: Latitude of second point(s) in degrees (array-like)
+        lon2: Longitude of second point(s) in degrees (array-like)
+
+    Returns:
+        Array of shape (len(lat1), len(lat2)) with distances in kilometers (NaN where a coordinate is missing)
+    """
+    lat1 = np.radians(np.asarray(lat1, dtype=float))[:, None]
+    lon1 = np.radians(np.asarray(lon1, dtype=float))[:, None]
+    lat2 = np.radians(np.asarray(lat2, dtype=float))[None, :]
+    lon2 = np.radians(np.asarray(lon2, dtype=float))[None, :]
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    c = 2 * np.arcsin(np.sqrt(a))
+    return c * EARTH_RADIUS
+
+
 def generate_grid(bbox: dict, resolution: float) -> gpd.GeoSeries:
     """
     Generate a grid of points within a bounding box.
@@ -0,0 +1,273 @@
+"""Persistent, content-addressed cache for static geospatial layers.
+
+The static GEO layers (ISO3 grid, feasibility mask, rail cost) only depend on their input files and a handful of
+configuration values, yet every run writes them to its own temporary ``static_layers_dir``. This cache keeps them
+across runs under ``<root>/<layer>/<key>.nc``, where ``key`` hashes the layer name, the contents of its input files
+and the relevant parameters, so scenario sweeps over identical geo inputs compute each layer only once.
+
+Concurrent workers may share one cache root:
+    - Entries are written to a temporary file and moved into place with ``os.replace`` (readers never see partial files)
+    - Building an entry is serialised per key with a lock file, so two workers do not compute the same layer twice;
+      the holder touches the lock while it builds, so only locks without a recent heartbeat are treated as abandoned
+    - The cache is bounded in size; the least recently used entries are evicted first (use time = file mtime, which is
+      refreshed on every hit)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE_GB = 5.0
+_BYTES_PER_GB = 1024**3
+_ENTRY_SUFFIX = ".nc"
+_LOCK_DIR = ".locks"
+# Hashes of large input rasters are reused within a process as long as size and mtime are unchanged
+_file_digest_memo: dict[tuple[str, int, int], str] = {}
+
+
+def _file_digest(path: Path) -> str:
+    """SHA-256 of a file's content (64KB chunks), memoised per (path, size, mtime)."""
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _file_digest_memo:
+        sha256_hash = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(65536):
+                sha256_hash.update(chunk)
+        _file_digest_memo[memo_key] = sha256_hash.hexdigest()
+    return _file_digest_memo[memo_key]
+
+
+def _iter_input_files(inputs: Iterable[Path]) -> Iterator[Path]:
+    """Expand directories into their files (sorted) so shapefile bundles hash as a whole."""
+    for path in inputs:
+        path = Path(path)
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.is_file())
+        else:
+            yield path
+
+
+def layer_cache_key(layer: str, inputs: Iterable[Path], params: dict[str, Any], version: str) -> str:
+    """
+    Content-addressed key of one layer.
+
+    Args:
+        layer: Layer name (e.g. ``"feasibility_mask"``)
+        inputs: Input files or directories the layer is computed from; their contents (not paths) enter the key
+        params: JSON-serialisable parameters the layer depends on (grid resolution, GeoConfig fields, ...)
+        version: Layer cache version (bump to invalidate old entries)
+
+    Returns:
+        32-character hex string
+
+    Raises:
+        FileNotFoundError: If an input file does not exist.
+    """
+    sha256_hash = hashlib.sha256()
+    sha256_hash.update(f"{layer}\0{version}\0".encode())
+    for path in _iter_input_files(inputs):
+        sha256_hash.update(f"{path.name}\0{_file_digest(path)}\0".encode())
+    sha256_hash.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return sha256_hash.hexdigest()[:32]
+
+
+@dataclass
+class LayerCacheEntry:
+    """One cached layer file."""
+
+    layer: str
+    key: str
+    path: Path
+    size_bytes: int
+    last_used: datetime
+
+
+class GeoLayerCache:
+    """Size-bounded LRU cache of static GEO layer files, safe to share between concurrent runs."""
+
+    CACHE_VERSION = "1"  # Bump to invalidate all cached layers
+    LOCK_HEARTBEAT_SECONDS = 30.0  # The lock holder refreshes the lock's mtime this often while building
+    LOCK_TIMEOUT_SECONDS = 300.0  # A lock without a heartbeat for this long is considered abandoned by a crashed worker
+
+    def __init__(self, cache_root: Path, max_size_gb: float = DEFAULT_MAX_SIZE_GB):
+        """Initialize the cache.
+
+        Args:
+            cache_root: Root directory of the cache (default location: $STEELO_HOME/geo_layer_cache)
+            max_size_gb: Size bound; least recently used entries are evicted once it is exceeded
+        """
+        self.cache_root = Path(cache_root)
+        self.max_size_bytes = int(max_size_gb * _BYTES_PER_GB)
+        self.cache_root.mkdir(parents=True, exist_ok=True)
+
+    def key(self, layer: str, inputs: Iterable[Path], params: dict[str, Any]) -> str:
+        return layer_cache_key(layer, inputs, params, self.CACHE_VERSION)
+
+    def entry_path(self, layer: str, key: str) -> Path:
+        return self.cache_root / layer / f"{key}{_ENTRY_SUFFIX}"
+
+    def get(self, layer: str, key: str) -> Path | None:
+        """Path of the cached layer, or None. A hit refreshes the entry's LRU timestamp."""
+        path = self.entry_path(layer, key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        logger.debug(f"operation=geo_layer_cache_hit layer={layer} key={key}")
+        return path
+
+    def get_or_create(self, layer: str, key: str, build: Callable[[Path], None]) -> Path:
+        """
+        Return the cached layer, building it with ``build(target_path)`` if it is missing.
+
+        ``build`` must write the complete layer file to ``target_path``; it runs under the key's lock and its output
+        only becomes visible once it has returned.
+        """
+        if (path := self.get(layer, key)) is not None:
+            return path
+        with self._lock(layer, key):
+            # Another worker may have built it while we were waiting for the lock
+            if (path := self.get(layer, key)) is not None:
+                return path
+            logger.debug(f"operation=geo_layer_cache_miss layer={layer} key={key}")
+            path = self.entry_path(layer, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_name(f".{path.stem}.{os.getpid()}.tmp{_ENTRY_SUFFIX}")
+            try:
+                build(temporary)
+                os.replace(temporary, path)
+            finally:
+                temporary.unlink(missing_ok=True)
+        self.evict(self.max_size_bytes)
+        return path
+
+    def put(self, layer: str, key: str, source: Path) -> Path:
+        """Store a copy of an existing layer file under ``key``."""
+
+        def _copy(target: Path) -> None:
+            shutil.copyfile(source, target)
+
+        return self.get_or_create(layer, key, _copy)
+
+    def entries(self) -> list[LayerCacheEntry]:
+        """All cached layers, least recently used first."""
+        entries = []
+        for path in self.cache_root.glob(f"*/*{_ENTRY_SUFFIX}"):
+            if path.name.startswith(".") or path.parent.name == _LOCK_DIR:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append(
+                LayerCacheEntry(
+                    layer=path.parent.name,
+                    key=path.stem,
+                    path=path,
+                    size_bytes=stat.st_size,
+                    last_used=datetime.fromtimestamp(stat.st_mtime),
+                )
+            )
+        return sorted(entries, key=lambda entry: entry.last_used)
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Get statistics about the cache."""
+        entries = self.entries()
+        layers: dict[str, int] = {}
+        for entry in entries:
+            layers[entry.layer] = layers.get(entry.layer, 0) + 1
+        total_size = sum(entry.size_bytes for entry in entries)
+        return {
+            "cache_directory": str(self.cache_root),
+            "total_entries": len(entries),
+            "entries_per_layer": layers,
+            "total_size_bytes": total_size,
+            "total_size_mb": total_size / (1024 * 1024),
+            "max_size_mb": self.max_size_bytes / (1024 * 1024),
+            "least_recently_used": entries[0].last_used.isoformat() if entries else None,
+            "most_recently_used": entries[-1].last_used.isoformat() if entries else None,
+        }
+
+    def evict(self, max_size_bytes: int | None = None, older_than_days: float | None = None) -> int:
+        """
+        Remove least recently used entries until the cache fits ``max_size_bytes``, and entries unused for more than
+        ``older_than_days``.
+
+        Returns:
+            Number of removed entries
+        """
+        entries = self.entries()
+        total_size = sum(entry.size_bytes for entry in entries)
+        cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+        removed = 0
+        for entry in entries:
+            too_big = max_size_bytes is not None and total_size > max_size_bytes
+            too_old = cutoff is not None and entry.last_used.timestamp() < cutoff
+            if not too_big and not too_old:
+                continue
+            entry.path.unlink(missing_ok=True)
+            total_size -= entry.size_bytes
+            removed += 1
+            logger.debug(f"operation=geo_layer_cache_evict layer={entry.layer} key={entry.key}")
+        return removed
+
+    def clear_cache(self) -> int:
+        """Remove all cached layers. Returns the number of removed entries."""
+        return self.evict(max_size_bytes=0)
+
+    @contextmanager
+    def _lock(self, layer: str, key: str) -> Iterator[None]:
+        """
+        Exclusive per-key lock using an O_EXCL lock file (portable across Linux, macOS and Windows).
+
+        While the lock is held, a heartbeat thread refreshes the lock file's mtime every ``LOCK_HEARTBEAT_SECONDS``,
+        so a build that takes longer than ``LOCK_TIMEOUT_SECONDS`` is not mistaken for an abandoned lock.
+        """
+        lock_dir = self.cache_root / _LOCK_DIR
+        lock_dir.mkdir(parents=True, exist_ok=True)
+        lock_path = lock_dir / f"{layer}_{key}.lock"
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime > self.LOCK_TIMEOUT_SECONDS:
+                        logger.warning(f"[GEO LAYER CACHE] Removing abandoned lock {lock_path}")
+                        lock_path.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                time.sleep(0.5)
+        stop_event = threading.Event()
+
+        def heartbeat() -> None:
+            while not stop_event.wait(self.LOCK_HEARTBEAT_SECONDS):
+                try:
+                    os.utime(lock_path)
+                except FileNotFoundError:
+                    break
+
+        thread = threading.Thread(target=heartbeat, daemon=True)
+        try:
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            thread.start()
+            yield
+        finally:
+            stop_event.set()
+            if thread.is_alive():
+                thread.join()
+            lock_path.unlink(missing_ok=True)
@@ -0,0 +1,130 @@
+"""Incremental GEO layer pipeline.
+
+The layers of ``get_candidate_locations_for_opening_new_plants`` form a small dependency graph. Each layer declares
+the external inputs it depends on (static data, simulation year, plant locations, configuration, ...) and the upstream
+layers whose variables it reads. ``GeoLayerPipeline`` keeps the dataset across simulation years and only recomputes a
+layer when one of its inputs changed or an upstream layer was recomputed; all other layers are reused from memory.
+Static layers are additionally backed by files on disk (``static_layers_dir`` and the cross-run layer cache).
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Hashable
+
+import xarray as xr
+
+logger = logging.getLogger("steelo.geospatial.timing")
+
+
+@dataclass
+class GeoLayer:
+    """
+    One node of the layer graph.
+
+    Attributes:
+        name: Layer name (used in logs and statistics)
+        compute: Adds the layer's variables to the dataset and returns it
+        inputs: Names of the external inputs the layer depends on (keys of the ``inputs`` passed to ``run``)
+        depends_on: Names of upstream layers whose variables the layer reads
+        enabled: Disabled layers are skipped (and their variables are not added)
+    """
+
+    name: str
+    compute: Callable[[xr.Dataset], xr.Dataset]
+    inputs: tuple[str, ...] = ()
+    depends_on: tuple[str, ...] = ()
+    enabled: bool = True
+
+
+@dataclass
+class LayerStats:
+    hits: int = 0
+    misses: int = 0
+    total_compute_s: float = 0.0
+
+
+@dataclass
+class GeoLayerPipeline:
+    """Runs a list of GeoLayers year after year, recomputing only the layers whose inputs changed."""
+
+    dataset: xr.Dataset | None = None
+    # Input values each layer was last computed with, and how often it was computed (read by downstream layers)
+    _input_values: dict[str, tuple] = field(default_factory=dict)
+    _generations: dict[str, int] = field(default_factory=dict)
+    # Variables each layer added to the dataset; dropped before the layer is recomputed (xr.merge refuses conflicts)
+    _outputs: dict[str, list[str]] = field(default_factory=dict)
+    stats: dict[str, LayerStats] = field(default_factory=dict)
+
+    def run(self, layers: list[GeoLayer], inputs: dict[str, Hashable]) -> xr.Dataset:
+        """
+        Bring the dataset up to date with ``inputs`` and return it.
+
+        Args:
+            layers: Layers in dependency order (every layer comes after the layers it depends on)
+            inputs: Current value of every external input; values are compared with ``==`` against the previous run
+
+        Returns:
+            Dataset with the variables of all enabled layers
+
+        Raises:
+            ValueError: If a layer depends on a layer that is not listed before it, or on an unknown input.
+        """
+        seen: set[str] = set()
+        for layer in layers:
+            missing_layers = [name for name in layer.depends_on if name not in seen]
+            if missing_layers:
+                raise ValueError(f"GEO layer {layer.name} depends on {missing_layers}, which must be listed before it")
+            missing_inputs = [name for name in layer.inputs if name not in inputs and layer.enabled]
+            if missing_inputs:
+                raise ValueError(f"GEO layer {layer.name} depends on unknown inputs {missing_inputs}")
+            seen.add(layer.name)
+
+        for layer in layers:
+            layer_stats = self.stats.setdefault(layer.name, LayerStats())
+            if not layer.enabled:
+                logger.debug(f"[GEO TIMING] {layer.name}: SKIPPED")
+                continue
+            input_values = tuple(inputs[name] for name in layer.inputs) + tuple(
+                self._generations.get(name, 0) for name in layer.depends_on
+            )
+            if self.dataset is not None and self._input_values.get(layer.name) == input_values:
+                layer_stats.hits += 1
+                logger.debug(f"[GEO TIMING] {layer.name}: reused")
+                continue
+
+            start = time.time()
+            previous = xr.Dataset() if self.dataset is None else self.dataset
+            previous = previous.drop_vars(self._outputs.get(layer.name, []), errors="ignore")
+            self.dataset = layer.compute(previous)
+            elapsed = time.time() - start
+            self._outputs[layer.name] = [str(name) for name in self.dataset.data_vars if name not in previous.data_vars]
+            self._input_values[layer.name] = input_values
+            self._generations[layer.name] = self._generations.get(layer.name, 0) + 1
+            layer_stats.misses += 1
+            layer_stats.total_compute_s += elapsed
+            logger.debug(f"[GEO TIMING] {layer.name}: {elapsed:.3f} seconds")
+
+        logger.info(
+            "[GEO TIMING] Layer reuse: "
+            + ", ".join(
+                f"{name}={layer_stats.hits} hit/{layer_stats.misses} miss ({layer_stats.total_compute_s:.1f}s)"
+                for name, layer_stats in self.stats.items()
+            )
+        )
+        assert self.dataset is not None
+        return self.dataset
+
+    def invalidate(self) -> None:
+        """Drop all in-memory layers; the next run recomputes (or reloads from disk) everything."""
+        self.dataset = None
+        self._input_values.clear()
+        self._outputs.clear()
+
+    def __getstate__(self):
+        # Run snapshots do not carry the global rasters; they are rebuilt (mostly from disk) after a resume
+        state = self.__dict__.copy()
+        state["dataset"] = None
+        state["_input_values"] = {}
+        state["_outputs"] = {}
+        return state
@@ -8,6 +8,7 @@ if TYPE_CHECKING:
     from steelo.simulation import GeoConfig
     from steelo.domain.models import GeoDataPaths
 
+from steelo.utilities.plot_queue import submit_plot
 from steelo.utilities.plotting import plot_screenshot
 from steelo.domain.models import PlotPaths
 from steelo.domain.constants import (
@@ -124,7 +125,9 @@ def calculate_outgoing_cashflow_proxy(
     )
     p = int((1 - baseload_coverage) * 100)
     if is_milestone_year:
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             masked_cashflow * USD_TO_BioUSD,
             title=f"Lifetime cost proxy for new {product} plant in {year} (Billion USD)",
             subtitle=(f"CAPEX + {plant_lifetime}-yr power, transport & rail · {100 - p}% baseload + {p}% grid"),
@@ -142,7 +145,9 @@ def calculate_outgoing_cashflow_proxy(
         standardized_cashflow = (masked_cashflow - min_val) / (max_val - min_val)
     inversed_cashflow = 1 - standardized_cashflow
     if is_milestone_year:
-        plot_screenshot(
+        submit_plot(
+            "geo",
+            plot_screenshot,
             inversed_cashflow,
             title=f"Priority map for new {product} plants in {year}",
             subtitle=f"{100 - p}% baseload + {p}% grid",
@@ -400,7 +405,9 @@ def calculate_priority_location_kpi(
 
         if is_top_locations_milestone_year:
             plot_paths_obj = PlotPaths(geo_plots_dir=geo_paths.geo_plots_dir)
-            plot_screenshot(
+            submit_plot(
+                "geo",
+                plot_screenshot,
                 ds_masked[f"top{str(geo_config.priority_pct)}_{product}_wlottery"],
                 var_type="binary",
                 title=f"Top {geo_config.priority_pct}% locations for {product} production in {year}",
@@ -2,13 +2,14 @@ import logging
 import time
 from contextlib import contextmanager
 import xarray as xr
-from typing import TYPE_CHECKING, Optional, Any
+from typing import TYPE_CHECKING, Optional, Any, Hashable
 
 if TYPE_CHECKING:
     from steelo.simulation import GeoConfig
     from steelo.domain.models import GeoDataPaths
 
 from steelo.domain.constants import GEO_RESOLUTION
+from steelo.domain.models import Location
 from steelo.adapters.geospatial.geospatial_layers import (
     add_iso3_codes,
     add_feasibility_mask,
@@ -19,7 +20,12 @@ from steelo.adapters.geospatial.geospatial_layers import (
     add_transportation_costs,
     add_landtype_factor,
 )
-from steelo.adapters.geospatial.geospatial_calculations import get_baseload_coverage
+from steelo.adapters.geospatial.geospatial_calculations import (
+    collect_distance_sources,
+    fingerprint_distance_sources,
+    get_baseload_coverage,
+)
+from steelo.adapters.geospatial.layer_pipeline import GeoLayer, GeoLayerPipeline
 from steelo.adapters.geospatial.priority_kpi import calculate_priority_location_kpi
 
 
@@ -62,13 +68,19 @@ def get_candidate_locations_for_opening_new_plants(
     Layer types:
         - Static: iso3, feasibility mask, cost of infrastructure (assuming negligible changes in time), land type factor.
           The first three layers are saved to temp files in the first simulation year and reused in subsequent years to
-          reduce runtime - temp files are cleaned up after simulation. The landtype factor only pre-calculates a part
-          which is independent from the user input.
+          reduce runtime - temp files are cleaned up after simulation. They are also kept in the cross-run layer cache
+          (geo_paths.layer_cache_dir), so runs with identical geo inputs skip their computation. The landtype factor
+          only pre-calculates a part which is independent from the user input.
         - Dynamic, PAM-independent: power price (both baseload and grid), hydrogen price, and some transportation costs
           (iron feedstock and steel demand). The hydrogen price is not used for the priority location KPI, but needed
           for the full NPV calculation later on.
         - Dynamic, PAM-dependent: plant CAPEX, some transportation costs (iron demand and steel feedstock)
 
+    The layers are run through env.geo_layer_pipeline, which keeps the dataset across simulation years and only
+    recomputes a layer if its inputs changed (see build_geo_layers): static layers are computed once per run, power and
+    hydrogen prices once per year, and transportation costs only if plant, supplier or demand center locations changed.
+    Per-layer timings and hit/miss counts are logged to steelo.geospatial.timing.
+
     Args:
         uow: Unit of work containing repository access to plants, demand centers, and suppliers
         env: Environment containing year, input costs, configuration, and cost curves
@@ -89,73 +101,28 @@ def get_candidate_locations_for_opening_new_plants(
     start = time.time()
     geo_timer_logger.info(f"[GEO TIMING] ========== Starting Geospatial Layers Pipeline for Year {env.year} ==========")
 
-    # Calculate all GEO layers with timing
     with time_step("get_baseload_coverage", geo_timer_logger):
         baseload_coverage = get_baseload_coverage(geo_config.included_power_mix)
 
-    with time_step("add_iso3_codes", geo_timer_logger):
-        # Always added; required as a basis for other layers
-        global_ds = add_iso3_codes(resolution=GEO_RESOLUTION, geo_paths=geo_paths)
-
-    with time_step("add_feasibility_mask", geo_timer_logger):
-        # Always added; required as a basis for other layers
-        global_ds = add_feasibility_mask(global_ds, geo_config, geo_paths=geo_paths)
-
-    with time_step("add_power_price", geo_timer_logger):
-        # Always added; required as for the energy costs of new plants. New plants' energy costs usually correspond to the power mix used for
-        # location prioritization, with one exception: If the power mix is set to "Not included" for location prioritization, the grid power
-        # price is used to set the energy costs of new plants. Reason: A plant cannot operate with zero energy costs.
-        global_ds = add_power_price(
-            global_ds,
-            env.year,
-            env.input_costs,
-            baseload_coverage,
-            geo_paths=geo_paths,
-            start_year=int(env.config.start_year),
-            end_year=int(env.config.end_year),
-        )
-
-    with time_step("add_capped_hydrogen_price", geo_timer_logger):
-        # Always added; required as for the energy costs of new plants
-        global_ds = add_capped_hydrogen_price(
-            global_ds,
-            env.year,
-            env.hydrogen_efficiency,
-            env.hydrogen_capex_opex,
-            env.country_mappings,
-            baseload_coverage,
-            geo_config,
-            geo_paths=geo_paths,
-            start_year=int(env.config.start_year),
-            end_year=int(env.config.end_year),
-        )
-
     with time_step("add_capex_proxy_for_steel_and_iron_making_tech", geo_timer_logger):
         # Always added; required as a basis for other layers
         capex = add_capex_proxy_for_steel_and_iron_making_tech(env.name_to_capex["greenfield"])
     if capex is None:
         raise ValueError("CAPEX could not be determined in GEO layers.")
 
-    with time_step("add_cost_of_infrastructure", geo_timer_logger):
-        # Always added; required as infrastructure costs for new plants
-        global_ds = add_cost_of_infrastructure(global_ds, environment=env, geo_paths=geo_paths)
-
-    with time_step("add_transportation_costs", geo_timer_logger, skip=not geo_config.include_transport_cost):
-        if geo_config.include_transport_cost:
-            global_ds = add_transportation_costs(
-                global_ds,
-                uow.repository,
-                env.year,
-                env.config.active_statuses,
-                geo_config,
-                geo_paths=geo_paths,
-                start_year=int(env.config.start_year),
-                end_year=int(env.config.end_year),
-            )
-
-    with time_step("add_landtype_factor", geo_timer_logger, skip=not geo_config.include_lulc_cost):
-        if geo_config.include_lulc_cost:
-            global_ds = add_landtype_factor(global_ds, geo_config, geo_paths=geo_paths)
+    # Calculate all GEO layers; layers whose inputs did not change since the previous year are reused
+    if env.geo_layer_pipeline is None:
+        env.geo_layer_pipeline = GeoLayerPipeline()
+    with time_step("collect_distance_sources", geo_timer_logger, skip=not geo_config.include_transport_cost):
+        distance_sources = (
+            collect_distance_sources(uow.repository, env.year, env.config.active_statuses)
+            if geo_config.include_transport_cost
+            else {}
+        )
+    layers, inputs = build_geo_layers(
+        uow, env, geo_config, geo_paths, baseload_coverage=baseload_coverage, distance_sources=distance_sources
+    )
+    global_ds = env.geo_layer_pipeline.run(layers, inputs)
 
     # Extract the top locations based on the priority location KPI
     with time_step("calculate_priority_location_kpi", geo_timer_logger):
@@ -188,3 +155,126 @@ def get_candidate_locations_for_opening_new_plants(
         f"[GEO TIMING] ========== Total Geospatial Layers Pipeline Time: {total_time:.3f} seconds ({total_time / 60:.2f} minutes) =========="
     )
     return top_locations, energy_prices
+
+
+def build_geo_layers(
+    uow,
+    env,
+    geo_config: "GeoConfig",
+    geo_paths: "GeoDataPaths",
+    baseload_coverage: float,
+    distance_sources: dict[str, dict[Location, float]],
+) -> tuple[list[GeoLayer], dict[str, Hashable]]:
+    """
+    Describe the GEO layers of the current year as a dependency graph.
+
+    Inputs:
+        - static: geo data paths and grid resolution
+        - railway_costs: railway cost per km and country
+        - baseload_coverage: share of the power mix covered by baseload power
+        - year: simulation year (power and hydrogen prices are year-indexed)
+        - geo_config: all geospatial configuration values
+        - distance_sources: fingerprint of the plant, mine and demand center locations and their weights
+        - transport_plot_year: the year on transport-plot milestone years (every 10 years, start and end), else None,
+          so milestone maps are still produced even if the plant set did not change
+
+    Returns:
+        layers: Layers in dependency order
+        inputs: Current value of every input
+    """
+    year = env.year
+    start_year = int(env.config.start_year)
+    end_year = int(env.config.end_year)
+    is_transport_milestone = year == start_year or year == end_year or (year - start_year) % 10 == 0
+    inputs: dict[str, Hashable] = {
+        "static": (repr(geo_paths), GEO_RESOLUTION),
+        "year": year,
+        "geo_config": repr(geo_config),
+        "baseload_coverage": baseload_coverage,
+        "railway_costs": tuple(sorted((cost.iso3, cost.cost_per_km) for cost in env.railway_costs or [])),
+        "distance_sources": fingerprint_distance_sources(distance_sources),
+        "transport_plot_year": year if is_transport_milestone else None,
+    }
+    layers = [
+        # Static layers (also cached on disk): required as a basis for other layers
+        GeoLayer(
+            "add_iso3_codes",
+            lambda ds: add_iso3_codes(resolution=GEO_RESOLUTION, geo_paths=geo_paths),
+            inputs=("static",),
+        ),
+        GeoLayer(
+            "add_feasibility_mask",
+            lambda ds: add_feasibility_mask(ds, geo_config, geo_paths=geo_paths),
+            inputs=("static", "geo_config"),
+            depends_on=("add_iso3_codes",),
+        ),
+        # Required for the energy costs of new plants. New plants' energy costs usually correspond to the power mix
+        # used for location prioritization, with one exception: If the power mix is set to "Not included" for location
+        # prioritization, the grid power price is used to set the energy costs of new plants. Reason: A plant cannot
+        # operate with zero energy costs.
+        GeoLayer(
+            "add_power_price",
+            lambda ds: add_power_price(
+                ds,
+                year,
+                env.input_costs,
+                baseload_coverage,
+                geo_paths=geo_paths,
+                start_year=start_year,
+                end_year=end_year,
+            ),
+            inputs=("static", "year", "baseload_coverage"),
+            depends_on=("add_iso3_codes", "add_feasibility_mask"),
+        ),
+        # Required for the energy costs of new plants
+        GeoLayer(
+            "add_capped_hydrogen_price",
+            lambda ds: add_capped_hydrogen_price(
+                ds,
+                year,
+                env.hydrogen_efficiency,
+                env.hydrogen_capex_opex,
+                env.country_mappings,
+                baseload_coverage,
+                geo_config,
+                geo_paths=geo_paths,
+                start_year=start_year,
+                end_year=end_year,
+            ),
+            inputs=("static", "year", "geo_config", "baseload_coverage"),
+            depends_on=("add_iso3_codes", "add_feasibility_mask", "add_power_price"),
+        ),
+        # Required as infrastructure costs for new plants
+        GeoLayer(
+            "add_cost_of_infrastructure",
+            lambda ds: add_cost_of_infrastructure(ds, environment=env, geo_paths=geo_paths),
+            inputs=("static", "railway_costs"),
+            depends_on=("add_iso3_codes", "add_feasibility_mask"),
+        ),
+        # Only layer that depends on the plant set
+        GeoLayer(
+            "add_transportation_costs",
+            lambda ds: add_transportation_costs(
+                ds,
+                uow.repository,
+                year,
+                env.config.active_statuses,
+                geo_config,
+                geo_paths=geo_paths,
+                start_year=start_year,
+                end_year=end_year,
+                distance_sources=distance_sources,
+            ),
+            inputs=("static", "geo_config", "distance_sources", "transport_plot_year"),
+            depends_on=("add_iso3_codes", "add_feasibility_mask"),
+            enabled=geo_config.include_transport_cost,
+        ),
+        GeoLayer(
+            "add_landtype_factor",
+            lambda ds: add_landtype_factor(ds, geo_config, geo_paths=geo_paths),
+            inputs=("static", "geo_config"),
+            depends_on=("add_iso3_codes",),
+            enabled=geo_config.include_lulc_cost,
+        ),
+    ]
+    return layers, inputs
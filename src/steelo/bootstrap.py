@@ -9,6 +9,7 @@ import numpy as np
 from .service_layer import handlers, UnitOfWork, MessageBus, SimulationCheckpoint
 from .domain.models import Environment, PlantGroup
 from .adapters.repositories import JsonRepository, InMemoryRepository, Repository
+from .config import get_steelo_home
 from .data.path_resolver import DataPathResolver
 
 if TYPE_CHECKING:
@@ -460,6 +461,8 @@ def bootstrap_simulation(
             landtype_percentage_path=path_resolver.landtype_percentage_nc_path
             if path_resolver.landtype_percentage_nc_path.exists()
             else config.data_dir / "landtype_percentage.nc",
+            layer_cache_dir=get_steelo_home() / "geo_layer_cache",
+            baseload_lcoe_cube_dir=config.data_dir / "outputs" / "GEO" / "baseload_lcoe_cube",
         )
 
     # Calculate initial state using Environment methods
@@ -512,8 +515,8 @@ def bootstrap_simulation(
     if env.dynamic_feedstocks:
         env.set_primary_feedstocks_in_furnace_groups(world_plants=repository.plants.list())
 
-    # Create message bus
-    bus = bootstrap(uow=uow, env=env, config=config)
+    # Create message bus; the periodic checkpoints go to the run's output directory, next to its snapshots
+    bus = bootstrap(uow=uow, env=env, config=config, checkpoint_dir=str(Path(config.output_dir) / "checkpoints"))
 
     # Create simulation runner
     return SimulationRunner(bus=bus, config=config)
@@ -3,23 +3,40 @@
 This module handles downloading, caching, and managing data files
 required by the steel model, including bundled data from S3 and
 user-provided Excel files.
+
+The exports are imported on first access, so importing a submodule (e.g. ``steelo.data.cache_manager`` for
+``steelo-cache``) does not load the master Excel readers behind ``DataPreparationService``.
 """
 
-from .manager import DataManager
-from .manifest import DataManifest
-from .exceptions import DataValidationError, DataDownloadError
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .exceptions import DataDownloadError, DataValidationError
+    from .manager import DataManager
+    from .manifest import DataManifest
+    from .path_resolver import DataPathResolver
+    from .preparation import DataPreparationService, FileSource, PreparationResult, PreparationStep, PreparedFile
 
-# Skip DataRecreator import for now to avoid CLI dependency cycles
-# from .recreate import DataRecreator
-from .path_resolver import DataPathResolver
-from .preparation import DataPreparationService, PreparationResult, PreparedFile, FileSource, PreparationStep
+# Skip DataRecreator export for now to avoid CLI dependency cycles (import it from .recreate)
+_EXPORTS = {
+    "DataManager": ".manager",
+    "DataManifest": ".manifest",
+    "DataValidationError": ".exceptions",
+    "DataDownloadError": ".exceptions",
+    "DataPathResolver": ".path_resolver",
+    "DataPreparationService": ".preparation",
+    "PreparationResult": ".preparation",
+    "PreparedFile": ".preparation",
+    "FileSource": ".preparation",
+    "PreparationStep": ".preparation",
+}
 
 __all__ = [
     "DataManager",
     "DataManifest",
     "DataValidationError",
     "DataDownloadError",
-    # "DataRecreator",  # Temporarily removed to avoid circular imports
     "DataPathResolver",
     "DataPreparationService",
     "PreparationResult",
@@ -27,3 +44,15 @@ __all__ = [
     "FileSource",
     "PreparationStep",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
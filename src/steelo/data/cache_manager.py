@@ -6,7 +6,9 @@ import shutil
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING
+
+from ..adapters.dataprocessing.workbook_session import WorkbookSession
 
 if TYPE_CHECKING:
     from .preparation import PreparationResult
@@ -35,6 +37,103 @@ def get_preparation_hash(master_excel_path: Path, version: str = "1.0") -> str:
     return sha256_hash.hexdigest()[:16]
 
 
+def build_dependency_manifest(result: "PreparationResult", data_root: Path) -> dict[str, Any]:
+    """Map each prepared output to the master Excel sheets and files it was created from.
+
+    Args:
+        result: Preparation result whose files record the sheets they were read from
+        data_root: Directory the output paths are stored relative to
+
+    Returns:
+        ``{"sheets": {sheet: content hash}, "outputs": {relative path: {"sheets": [...], "inputs": [...]}}}``.
+        Master Excel and derived outputs whose sheets were not recorded get ``"sheets": None``; copied core and geo
+        data files are left out.
+    """
+    outputs = {}
+    for file in result.files:
+        created_from_excel = file.source.value in ("master-excel", "derived") and file.path != result.master_excel_path
+        if file.sheets is None and not created_from_excel:
+            continue
+        try:
+            relative_path = file.path.resolve().relative_to(data_root.resolve())
+        except ValueError:
+            continue
+        sheets = sorted(file.sheets) if file.sheets is not None else None
+        outputs[relative_path.as_posix()] = {"sheets": sheets, "inputs": sorted(file.inputs)}
+    return {"sheets": dict(sorted(result.sheet_hashes.items())), "outputs": outputs}
+
+
+def stale_outputs(manifest: dict[str, Any], sheet_hashes: dict[str, str | None]) -> dict[str, list[str]]:
+    """Outputs of a dependency manifest that are out of date, with the reasons why.
+
+    An output is stale if a sheet it was read from changed or disappeared, if the sheets it was read from were not
+    recorded, or if it is derived from a stale output.
+
+    Args:
+        manifest: Dependency manifest from ``build_dependency_manifest``
+        sheet_hashes: Current content hash of each manifest sheet (None if the sheet no longer exists)
+
+    Returns:
+        Reasons per stale output path; outputs that are up to date are not included
+    """
+    sheet_changes = {}
+    for sheet, old_hash in manifest["sheets"].items():
+        new_hash = sheet_hashes.get(sheet)
+        if new_hash is None:
+            sheet_changes[sheet] = f"sheet '{sheet}' was removed"
+        elif new_hash != old_hash:
+            sheet_changes[sheet] = f"sheet '{sheet}' changed"
+
+    outputs = manifest["outputs"]
+    stale: dict[str, list[str]] = {}
+    for output, dependencies in outputs.items():
+        if dependencies["sheets"] is None:
+            stale[output] = ["dependencies were not recorded"]
+            continue
+        reasons = [
+            sheet_changes.get(sheet, f"no hash recorded for sheet '{sheet}'")
+            for sheet in dependencies["sheets"]
+            if sheet in sheet_changes or sheet not in manifest["sheets"]
+        ]
+        if reasons:
+            stale[output] = reasons
+
+    # Propagate to outputs derived from stale outputs (e.g. plant_groups.json from plants.json)
+    outputs_by_name = {Path(output).name: output for output in outputs}
+    propagated = True
+    while propagated:
+        propagated = False
+        for output, dependencies in outputs.items():
+            for input_name in dependencies["inputs"]:
+                upstream = outputs_by_name.get(input_name)
+                reason = f"depends on {input_name}"
+                if upstream in stale and upstream != output and reason not in stale.get(output, []):
+                    stale.setdefault(output, []).append(reason)
+                    propagated = True
+    return stale
+
+
+@dataclass
+class StaleOutputs:
+    """Which outputs of an earlier cached preparation are out of date for the current master Excel file.
+
+    Attributes:
+        base_key: Cache key of the earlier preparation
+        data_dir: Directory holding the earlier preparation's data
+        stale: Reasons per stale output path (relative to ``data_dir``)
+        fresh: Output paths whose sheets and inputs are unchanged
+        sheet_hashes: Current content hashes of the sheets the earlier preparation read
+        manifest: Dependency manifest of the earlier preparation
+    """
+
+    base_key: str
+    data_dir: Path
+    stale: dict[str, list[str]]
+    fresh: list[str]
+    sheet_hashes: dict[str, str | None]
+    manifest: dict[str, Any]
+
+
 @dataclass
 class CacheMetadata:
     """Metadata stored with each cached preparation."""
@@ -246,9 +345,10 @@ class DataPreparationCache:
             "total_size_bytes": metadata.total_size_bytes,
         }
 
-        # Include detailed timing if available
+        # Include detailed timing and the output -> sheet dependencies if available
         if result:
             metadata_dict["timing_details"] = result.to_dict()
+            metadata_dict["dependencies"] = build_dependency_manifest(result, source_dir)
 
         (cache_dir / "metadata.json").write_text(json.dumps(metadata_dict, indent=2))
 
@@ -257,6 +357,50 @@ class DataPreparationCache:
 
         return cache_dir
 
+    def _find_dependency_base(self, master_excel_path: Path) -> Optional[tuple[str, Path, dict[str, Any]]]:
+        """Most recent cached preparation with a dependency manifest, preferring ones of the same file path."""
+        candidates = []
+        for prep_dir in self.cache_root.glob("prep_*"):
+            metadata_path = prep_dir / "metadata.json"
+            if not (prep_dir / "data").is_dir() or not metadata_path.exists():
+                continue
+            try:
+                metadata = json.loads(metadata_path.read_text())
+                if metadata.get("cache_version") != self.CACHE_VERSION or "dependencies" not in metadata:
+                    continue
+                same_path = metadata["master_excel_path"] == str(master_excel_path)
+                candidates.append((same_path, metadata["created_at"], prep_dir, metadata["dependencies"]))
+            except Exception:
+                continue
+        if not candidates:
+            return None
+        _, _, prep_dir, manifest = max(candidates, key=lambda candidate: candidate[:2])
+        return prep_dir.name.replace("prep_", ""), prep_dir / "data", manifest
+
+    def find_stale_outputs(self, master_excel_path: Path) -> Optional[StaleOutputs]:
+        """Compare the master Excel file sheet by sheet with the most recent cached preparation.
+
+        Args:
+            master_excel_path: Path to master Excel file
+
+        Returns:
+            Stale and fresh outputs of that preparation, or None if no cached preparation records its dependencies
+        """
+        base = self._find_dependency_base(master_excel_path)
+        if base is None:
+            return None
+        base_key, data_dir, manifest = base
+
+        sheet_hashes: dict[str, str | None] = {}
+        with WorkbookSession(master_excel_path) as workbook:
+            existing_sheets = set(workbook.sheet_names)
+            for sheet in manifest["sheets"]:
+                sheet_hashes[sheet] = workbook.sheet_hash(sheet) if sheet in existing_sheets else None
+
+        stale = stale_outputs(manifest, sheet_hashes)
+        fresh = [output for output in manifest["outputs"] if output not in stale]
+        return StaleOutputs(base_key, data_dir, stale, fresh, sheet_hashes, manifest)
+
     def get_cache_stats(self) -> dict:
         """Get statistics about the cache."""
         total_size = 0
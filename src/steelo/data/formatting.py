@@ -87,6 +87,27 @@ class ResultFormatter:
 
             self.console.print(step_table)
 
+        # Workbook parse table
+        if result.workbook_reads:
+            self.console.print("\n[bold cyan]Workbook Parsing:[/bold cyan]")
+            workbook_table = Table(show_header=True, header_style="bold magenta")
+            workbook_table.add_column("Workbook", style="cyan", width=35)
+            workbook_table.add_column("Parses", justify="right", style="yellow")
+            workbook_table.add_column("Sheets read", justify="right", style="blue")
+            workbook_table.add_column("Cache hits", justify="right", style="blue")
+            workbook_table.add_column("Time (seconds)", justify="right", style="green")
+
+            for workbook in result.workbook_reads:
+                workbook_table.add_row(
+                    workbook.filename,
+                    str(workbook.parses),
+                    str(workbook.sheets_read),
+                    str(workbook.cache_hits),
+                    f"{workbook.parse_duration:.2f}",
+                )
+
+            self.console.print(workbook_table)
+
         # File timing table
         if result.files:
             self.console.print("\n[bold cyan]Detailed File Creation Timing:[/bold cyan]")
@@ -14,12 +14,13 @@ from enum import Enum
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 
-from .cache_manager import DataPreparationCache
+from .cache_manager import DataPreparationCache, StaleOutputs
 from .manager import DataManager
 from .recreate import DataRecreator
 from .recreation_config import RecreationConfig, FILE_RECREATION_SPECS
 from .path_resolver import DataPathResolver
 from ..adapters.dataprocessing.master_excel_reader import MasterExcelReader
+from ..adapters.dataprocessing.workbook_session import PARSE_COUNTS, WorkbookSession, record_sheet_reads
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +46,8 @@ class PreparedFile:
     path: Path
     size_bytes: Optional[int] = None
     skipped: bool = False  # True if file already existed
+    sheets: Optional[List[str]] = None  # Master Excel sheets the file was created from (None if not tracked)
+    inputs: List[str] = field(default_factory=list)  # Other prepared files it was derived from
 
     @property
     def source_display(self) -> str:
@@ -71,6 +74,8 @@ class PreparedFile:
             "path": str(self.path),
             "size_bytes": self.size_bytes,
             "skipped": self.skipped,
+            "sheets": self.sheets,
+            "inputs": self.inputs,
         }
 
 
@@ -87,6 +92,27 @@ class PreparationStep:
         return {"name": self.name, "duration": round(self.duration, 2), "percentage": round(self.percentage, 1)}
 
 
+@dataclass
+class WorkbookRead:
+    """How often a source workbook was parsed and how many sheets were read from it."""
+
+    filename: str
+    parses: int
+    sheets_read: int
+    cache_hits: int
+    parse_duration: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "filename": self.filename,
+            "parses": self.parses,
+            "sheets_read": self.sheets_read,
+            "cache_hits": self.cache_hits,
+            "parse_duration": round(self.parse_duration, 2),
+        }
+
+
 @dataclass
 class PreparationResult:
     """Complete result of a data preparation operation."""
@@ -96,6 +122,8 @@ class PreparationResult:
     total_duration: float = 0.0
     output_directory: Optional[Path] = None
     master_excel_path: Optional[Path] = None
+    workbook_reads: List[WorkbookRead] = field(default_factory=list)
+    sheet_hashes: Dict[str, str] = field(default_factory=dict)  # Content hash of each master Excel sheet read
 
     def add_file(self, file: PreparedFile) -> None:
         """Add a prepared file to the result."""
@@ -153,6 +181,8 @@ class PreparationResult:
             "total_duration": round(self.total_duration, 2),
             "output_directory": str(self.output_directory) if self.output_directory else None,
             "master_excel_path": str(self.master_excel_path) if self.master_excel_path else None,
+            "workbook_reads": [w.to_dict() for w in self.workbook_reads],
+            "sheet_hashes": self.sheet_hashes,
             "summary": self.get_summary_stats(),
         }
 
@@ -168,6 +198,8 @@ class PreparationResult:
                 path=Path(file_data["path"]),
                 size_bytes=file_data.get("size_bytes"),
                 skipped=file_data.get("skipped", False),
+                sheets=file_data.get("sheets"),
+                inputs=file_data.get("inputs", []),
             )
             self.files.append(file)
 
@@ -180,6 +212,9 @@ class PreparationResult:
             )
             self.steps.append(step)
 
+        self.workbook_reads = [WorkbookRead(**workbook_data) for workbook_data in data.get("workbook_reads", [])]
+        self.sheet_hashes = data.get("sheet_hashes", {})
+
         self.total_duration = data.get("total_duration", 0.0)
         self.output_directory = Path(data["output_directory"]) if data.get("output_directory") else None
         self.master_excel_path = Path(data["master_excel_path"]) if data.get("master_excel_path") else None
@@ -298,7 +333,21 @@ class DataPreparationService:
                 result.finalize()
                 return result
 
-        # Not cached, proceed with normal preparation
+        # Not cached: reuse the outputs of the latest cached preparation whose master Excel sheets did not change,
+        # so that only the stale outputs (the missing files) are prepared again
+        stale_outputs = None
+        reuse_time = 0.0
+        if self.use_cache and not force_refresh and master_excel_path.exists():
+            reuse_start = time.time()
+            try:
+                stale_outputs = self.cache_manager.find_stale_outputs(master_excel_path)
+            except Exception as e:
+                logging.warning(f"Failed to compare with cached preparations, preparing everything: {e}")
+            if stale_outputs is not None:
+                self._reuse_fresh_outputs(stale_outputs, output_dir, verbose)
+                skip_existing = True
+            reuse_time = time.time() - reuse_start
+
         result = self._prepare_data_internal(
             output_dir=output_dir,
             master_excel_path=master_excel_path,
@@ -312,11 +361,17 @@ class DataPreparationService:
         if not result.master_excel_path:
             result.master_excel_path = master_excel_path
 
+        if stale_outputs is not None:
+            self._inherit_dependencies(stale_outputs, output_dir, result)
+            result.add_step(PreparationStep("Reuse unchanged cached outputs", reuse_time))
+            result.total_duration += reuse_time
+            result.finalize()
+
         # Save to cache if applicable
         if self.use_cache and master_excel_path and master_excel_path.exists() and result.total_duration > 0:
             try:
                 self.cache_manager.save_preparation(
-                    source_dir=output_dir.parent if output_dir.name == "fixtures" else output_dir,  # Handle both cases
+                    source_dir=self._cache_data_root(output_dir),  # Handle both cases
                     master_excel_path=master_excel_path,
                     preparation_time=result.total_duration,
                     result=result,
@@ -329,6 +384,56 @@ class DataPreparationService:
 
         return result
 
+    @staticmethod
+    def _cache_data_root(output_dir: Path) -> Path:
+        """Directory whose contents are cached for a preparation into ``output_dir``."""
+        return output_dir.parent if output_dir.name == "fixtures" else output_dir
+
+    def _reuse_fresh_outputs(self, stale_outputs: StaleOutputs, output_dir: Path, verbose: bool) -> None:
+        """Copy an earlier cached preparation into ``output_dir`` without its stale outputs.
+
+        The stale outputs are removed from ``output_dir`` as well, so preparing with ``skip_existing`` recreates
+        exactly those.
+        """
+        data_root = self._cache_data_root(output_dir)
+        for src_file in stale_outputs.data_dir.rglob("*"):
+            relative_path = src_file.relative_to(stale_outputs.data_dir).as_posix()
+            if src_file.is_file() and relative_path not in stale_outputs.stale:
+                dst_file = data_root / relative_path
+                dst_file.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(src_file, dst_file)
+        for relative_path in stale_outputs.stale:
+            (data_root / relative_path).unlink(missing_ok=True)
+
+        logger.info(
+            f"operation=incremental_preparation base={stale_outputs.base_key} reused={len(stale_outputs.fresh)} "
+            f"stale={len(stale_outputs.stale)}"
+        )
+        if verbose:
+            for relative_path, reasons in sorted(stale_outputs.stale.items()):
+                logging.info(f"↻ Recreating {relative_path}: {'; '.join(reasons)}")
+
+    def _inherit_dependencies(self, stale_outputs: StaleOutputs, output_dir: Path, result: PreparationResult) -> None:
+        """Carry the recorded sheets of reused outputs over from the earlier preparation they were copied from."""
+        data_root = self._cache_data_root(output_dir).resolve()
+        for file in result.files:
+            if file.sheets is not None:
+                continue
+            try:
+                relative_path = file.path.resolve().relative_to(data_root).as_posix()
+            except ValueError:
+                continue
+            dependencies = stale_outputs.manifest["outputs"].get(relative_path)
+            if relative_path in stale_outputs.fresh and dependencies and dependencies["sheets"] is not None:
+                file.sheets = list(dependencies["sheets"])
+                file.inputs = list(dependencies["inputs"])
+
+        # The sheets were hashed when comparing with the earlier preparation
+        for sheet in {sheet for file in result.files if file.sheets for sheet in file.sheets}:
+            sheet_hash = stale_outputs.sheet_hashes.get(sheet)
+            if sheet_hash is not None:
+                result.sheet_hashes.setdefault(sheet, sheet_hash)
+
     def _prepare_data_internal(
         self,
         output_dir: Path,
@@ -358,32 +463,51 @@ class DataPreparationService:
         result.master_excel_path = master_excel_path
         result.add_step(PreparationStep("Master Excel processing", time.time() - step_start))
 
-        # Step 2: Extract tech switches from master Excel
-        step_start = time.time()
-        self._extract_tech_switches(master_excel_path, fixtures_dir, result, skip_existing, verbose)
-        result.add_step(PreparationStep("Tech switches extraction", time.time() - step_start))
-
-        # Step 3: Extract railway cost from master Excel
-        step_start = time.time()
-        self._extract_railway_cost(master_excel_path, data_dir, result, skip_existing, verbose)
-        result.add_step(PreparationStep("Railway cost extraction", time.time() - step_start))
-
-        # Step 4: Extract technologies from master Excel
-        step_start = time.time()
-        self._extract_technologies(master_excel_path, data_dir, result, skip_existing, verbose)
-        result.add_step(PreparationStep("Technologies extraction", time.time() - step_start))
-
-        # Step 6: Process core data package
-        step_start = time.time()
-        self._process_core_data(fixtures_dir, result, skip_existing, verbose)
-        result.add_step(PreparationStep("Core data processing", time.time() - step_start))
-
-        # Step 7: Create JSON repositories
-        step_start = time.time()
-        self._create_json_repositories(
-            fixtures_dir, master_excel_path, result, skip_existing, verbose, progress_callback
+        # Steps 2-7 read the master Excel file through one session, which parses the workbook once and caches
+        # every sheet it reads, instead of every reader parsing the whole workbook again
+        parses_before = PARSE_COUNTS[str(master_excel_path.resolve())]
+        with WorkbookSession(master_excel_path) as workbook:
+            # Step 2: Extract tech switches from master Excel
+            step_start = time.time()
+            self._extract_tech_switches(master_excel_path, fixtures_dir, result, skip_existing, verbose)
+            result.add_step(PreparationStep("Tech switches extraction", time.time() - step_start))
+
+            # Step 3: Extract railway cost from master Excel
+            step_start = time.time()
+            self._extract_railway_cost(master_excel_path, data_dir, result, skip_existing, verbose)
+            result.add_step(PreparationStep("Railway cost extraction", time.time() - step_start))
+
+            # Step 4: Extract technologies from master Excel
+            step_start = time.time()
+            self._extract_technologies(master_excel_path, data_dir, result, skip_existing, verbose)
+            result.add_step(PreparationStep("Technologies extraction", time.time() - step_start))
+
+            # Step 6: Process core data package
+            step_start = time.time()
+            self._process_core_data(fixtures_dir, result, skip_existing, verbose)
+            result.add_step(PreparationStep("Core data processing", time.time() - step_start))
+
+            # Step 7: Create JSON repositories
+            step_start = time.time()
+            self._create_json_repositories(
+                fixtures_dir, master_excel_path, result, skip_existing, verbose, progress_callback
+            )
+            result.add_step(PreparationStep("JSON repository creation", time.time() - step_start))
+
+            # Hash the sheets the outputs were read from, so a later preparation can tell which outputs went stale
+            step_start = time.time()
+            sheets = sorted({sheet for file in result.files if file.sheets for sheet in file.sheets})
+            result.sheet_hashes = {sheet: workbook.sheet_hash(sheet) for sheet in sheets}
+            result.add_step(PreparationStep("Sheet hashing", time.time() - step_start))
+        result.workbook_reads.append(
+            WorkbookRead(
+                filename=master_excel_path.name,
+                parses=PARSE_COUNTS[str(master_excel_path.resolve())] - parses_before,
+                sheets_read=workbook.sheets_read,
+                cache_hits=workbook.cache_hits,
+                parse_duration=workbook.parse_seconds,
+            )
         )
-        result.add_step(PreparationStep("JSON repository creation", time.time() - step_start))
 
         # Step 8: Extract geo data
         step_start = time.time()
@@ -485,7 +609,7 @@ class DataPreparationService:
         extraction_dir = output_dir.parent / "extraction"
         extraction_dir.mkdir(exist_ok=True)
 
-        with MasterExcelReader(master_excel_path, output_dir=extraction_dir) as reader:
+        with record_sheet_reads() as sheets, MasterExcelReader(master_excel_path, output_dir=extraction_dir) as reader:
             tech_switches_result = reader.read_tech_switches()
 
             if not tech_switches_result.success:
@@ -508,6 +632,7 @@ class DataPreparationService:
                 duration=duration,
                 path=dest_path,
                 size_bytes=dest_path.stat().st_size,
+                sheets=sorted(sheets),
             )
         )
 
@@ -540,7 +665,7 @@ class DataPreparationService:
         extraction_dir = data_dir / "extraction"
         extraction_dir.mkdir(exist_ok=True)
 
-        with MasterExcelReader(master_excel_path, output_dir=extraction_dir) as reader:
+        with record_sheet_reads() as sheets, MasterExcelReader(master_excel_path, output_dir=extraction_dir) as reader:
             railway_cost_result = reader.read_railway_cost()
 
             if not railway_cost_result.success:
@@ -561,6 +686,7 @@ class DataPreparationService:
                 duration=duration,
                 path=dest_path,
                 size_bytes=dest_path.stat().st_size,
+                sheets=sorted(sheets),
             )
         )
 
@@ -593,7 +719,7 @@ class DataPreparationService:
         extraction_dir = data_dir / "extraction"
         extraction_dir.mkdir(exist_ok=True)
 
-        with MasterExcelReader(master_excel_path, output_dir=extraction_dir) as reader:
+        with record_sheet_reads() as sheets, MasterExcelReader(master_excel_path, output_dir=extraction_dir) as reader:
             technologies_result = reader.read_technologies_config()
 
             if not technologies_result.success:
@@ -615,6 +741,7 @@ class DataPreparationService:
                 duration=duration,
                 path=dest_path,
                 size_bytes=dest_path.stat().st_size,
+                sheets=sorted(sheets),
             )
         )
 
@@ -843,6 +970,8 @@ class DataPreparationService:
                         path=path,
                         size_bytes=path.stat().st_size if path.exists() else None,
                         skipped=skipped,
+                        sheets=sorted(recreator.sheets_read[filename]) if filename in recreator.sheets_read else None,
+                        inputs=list(spec.dependencies),
                     )
                 )
 
@@ -13,6 +13,7 @@ from typing import Any, Callable
 from rich.console import Console
 
 from .manager import DataManager
+from ..adapters.dataprocessing.workbook_session import record_sheet_reads
 from .recreation_config import RecreationConfig, RecreationManager, FILE_RECREATION_SPECS
 
 
@@ -59,6 +60,8 @@ class DataRecreator:
         """
         self.data_manager = data_manager or DataManager()
         self.recreation_manager: RecreationManager | None = None
+        # Master Excel sheets read for each file recreated by recreate_with_config
+        self.sheets_read: dict[str, set[str]] = {}
 
     def recreate_from_package(
         self,
@@ -397,7 +400,9 @@ class DataRecreator:
                         config.report_progress(f"Retrying {filename} (attempt {attempt + 1})", progress)
 
                     # Call the appropriate recreation function
-                    success = self._recreate_single_file(spec, output_dir, package_dir, master_excel_path)
+                    with record_sheet_reads() as sheets:
+                        success = self._recreate_single_file(spec, output_dir, package_dir, master_excel_path)
+                    self.sheets_read[filename] = sheets
 
                     if success and file_path.exists():
                         created_paths[filename] = file_path
@@ -1,7 +1,9 @@
 import logging
-from typing import TYPE_CHECKING, TypedDict, Any
+from typing import TYPE_CHECKING, TypedDict, Any, Sequence
 import math
 
+import numpy as np
+
 from steelo.utilities.utils import normalize_name
 
 from steelo.domain.calculate_emissions import (
@@ -1025,6 +1027,184 @@ def calculate_npv_costs(
     return npv
 
 
+def calculate_debt_repayment_schedules(total_debt: np.ndarray, lifetime: int, cost_of_debt: np.ndarray) -> np.ndarray:
+    """
+    Vectorised ``calculate_debt_repayment`` for many investments at once.
+
+    Args:
+        total_debt (np.ndarray): Debt financed part of each investment ($), one entry per investment.
+        lifetime (int): The full repayment lifetime in years.
+        cost_of_debt (np.ndarray): The annual interest rate on debt of each investment.
+
+    Returns:
+        np.ndarray: Yearly repayments (principal + interest), investments × lifetime. Rows are bit-for-bit equal to
+            ``calculate_debt_repayment`` since the same operations run in the same order, one year at a time.
+    """
+    schedules = np.zeros((len(total_debt), lifetime))
+    has_debt = total_debt != 0
+    if lifetime == 0 or not has_debt.any():
+        return schedules
+    debt = total_debt[has_debt]
+    rate = cost_of_debt[has_debt]
+    capital_repayment = debt / lifetime
+    for year in range(lifetime):
+        remaining_debt = debt - capital_repayment
+        schedules[has_debt, year] = ((debt + remaining_debt) / 2) * rate + capital_repayment
+        debt = remaining_debt
+    return schedules
+
+
+def _discount_factors(cost_of_equity: np.ndarray, years: int) -> np.ndarray:
+    # Python's float power (as in calculate_npv_costs) rather than np.power, whose SIMD loops may round differently;
+    # candidates share few distinct rates, so this is computed once per rate.
+    factors = np.empty((len(cost_of_equity), years))
+    rows_by_rate: dict[float, list[int]] = {}
+    for row, rate in enumerate(cost_of_equity.tolist()):
+        rows_by_rate.setdefault(rate, []).append(row)
+    for rate, rows in rows_by_rate.items():
+        factors[rows] = [(1 + rate) ** t for t in range(1, years + 1)]
+    return factors
+
+
+def calculate_npvs(
+    unit_opex: np.ndarray,
+    unit_carbon_costs: np.ndarray,
+    unit_secondary_adjustments: np.ndarray,
+    price: np.ndarray,
+    debt_repayment: np.ndarray,
+    expected_production: np.ndarray,
+    cost_of_equity: np.ndarray,
+    equity_investment: np.ndarray,
+) -> np.ndarray:
+    """
+    Batched NPV kernel: the equity NPVs of many investment candidates at once.
+
+    All 2-D inputs are candidates × years, with the construction lag already applied (zeros in construction years).
+    Cash flows follow ``calculate_gross_cash_flow``, ``calculate_net_cash_flow`` and ``calculate_npv_costs``: years
+    without unit cost yield no cash flow, and candidates with an invalid cost of equity (<= -1) or NaN cash flows
+    get -1e9. Element-wise operations run in the same order as the scalar functions and the discounted cash flows are
+    summed one year at a time, so every NPV is bit-for-bit equal to the scalar calculation.
+
+    Args:
+        unit_opex (np.ndarray): Unit total OPEX per year ($/unit).
+        unit_carbon_costs (np.ndarray): Unit carbon costs per year ($/unit); zeros where not applied.
+        unit_secondary_adjustments (np.ndarray): Unit cost adjustment from secondary outputs per year ($/unit).
+        price (np.ndarray): Market price per unit product per year ($/unit).
+        debt_repayment (np.ndarray): Debt repayment per year ($).
+        expected_production (np.ndarray): Production volume per year of each candidate (units).
+        cost_of_equity (np.ndarray): Discount rate of each candidate.
+        equity_investment (np.ndarray): Equity financed part of the investment of each candidate ($).
+
+    Returns:
+        np.ndarray: The NPV of each candidate.
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        opex = (unit_opex + unit_carbon_costs) + unit_secondary_adjustments
+        gross_cash_flow = np.where(opex == 0, 0.0, (price - opex) * expected_production[:, None])
+        net_cash_flow = gross_cash_flow - debt_repayment
+        discount_factors = _discount_factors(cost_of_equity, net_cash_flow.shape[1])
+        npvs = -equity_investment
+        for year in range(net_cash_flow.shape[1]):
+            npvs = npvs + net_cash_flow[:, year] / discount_factors[:, year]
+    invalid = (cost_of_equity <= -1.0) | np.isnan(net_cash_flow).any(axis=1)
+    return np.where(invalid, -1e9, npvs)
+
+
+def calculate_npv_full_batch(
+    capex: Sequence[float],
+    capacity: float | Sequence[float],
+    unit_total_opex_lists: Sequence[Sequence[float]],
+    expected_utilisation_rates: Sequence[float],
+    price_series: Sequence[Sequence[float]],
+    cost_of_debt: Sequence[float],
+    cost_of_equity: Sequence[float],
+    equity_share: float,
+    lifetime: int,
+    construction_time: int,
+    carbon_costs: Sequence[Sequence[float] | None] | None = None,
+    infrastructure_costs: float | Sequence[float] = 0.0,
+    secondary_output_adjustments: float | Sequence[float] = 0.0,
+) -> np.ndarray:
+    """
+    Calculate the full NPV of many technology investments at once (see ``calculate_npv_full``).
+
+    Stacks the per-candidate inputs into candidates × years arrays (construction years first) and evaluates them with
+    ``calculate_npvs``. Arguments are those of ``calculate_npv_full`` with one entry per candidate; ``capacity``,
+    ``infrastructure_costs`` and ``secondary_output_adjustments`` may also be a single value shared by all.
+
+    Returns:
+        np.ndarray: The NPV of each candidate, bit-for-bit equal to ``calculate_npv_full``.
+
+    Raises:
+        ValueError: If the OPEX (or applied carbon cost) series of a candidate does not cover its lifetime.
+        IndexError: If a price series is shorter than the years with production.
+    """
+    func_logger = logging.getLogger(f"{__name__}.calculate_npv_full")
+
+    n = len(capex)
+    years = construction_time + lifetime
+    capacity_array = np.broadcast_to(np.asarray(capacity, dtype=float), (n,))
+    total_investment = capacity_array * np.asarray(capex, dtype=float) + np.broadcast_to(
+        np.asarray(infrastructure_costs, dtype=float), (n,)
+    )
+    expected_production = np.asarray(expected_utilisation_rates, dtype=float) * capacity_array
+    carbon_costs = carbon_costs if carbon_costs is not None else [None] * n
+
+    # Carbon costs are only applied with production; like the scalar list arithmetic, the shorter of the OPEX and
+    # carbon cost series sets the number of operating years, which must match the debt repayment schedule
+    apply_carbon = [production != 0 and bool(carbon) for production, carbon in zip(expected_production, carbon_costs)]
+    for opex_list, carbon, applied in zip(unit_total_opex_lists, carbon_costs, apply_carbon):
+        operating_years = min(len(opex_list), len(carbon)) if applied and carbon is not None else len(opex_list)
+        if operating_years != lifetime:
+            raise ValueError("The lengths of total_debt_repayment and gross_cash_flow must be the same.")
+    if not expected_production.all():
+        func_logger.warning(
+            f"[NPV FULL] Expected production is zero for {n - np.count_nonzero(expected_production)} of {n} "
+            "candidates. Not applying carbon costs to OPEX."
+        )
+    if not all(bool(carbon) for production, carbon in zip(expected_production, carbon_costs) if production != 0):
+        func_logger.warning("[NPV FULL] No carbon costs provided. Not applying carbon costs to OPEX.")
+
+    unit_opex = np.zeros((n, years))
+    unit_carbon_costs = np.zeros((n, years))
+    unit_secondary_adjustments = np.zeros((n, years))
+    if n:
+        unit_opex[:, construction_time:] = np.array([opex_list[:lifetime] for opex_list in unit_total_opex_lists])
+        unit_secondary_adjustments[:, construction_time:] = np.broadcast_to(
+            np.asarray(secondary_output_adjustments, dtype=float), (n,)
+        )[:, None]
+    for row, (carbon, applied) in enumerate(zip(carbon_costs, apply_carbon)):
+        if applied and carbon is not None:
+            unit_carbon_costs[row, construction_time:] = (
+                np.asarray(carbon[:lifetime], dtype=float) / expected_production[row]
+            )
+
+    price = np.full((n, years), np.nan)
+    price_lengths = np.array([len(prices) for prices in price_series], dtype=np.int64)
+    for row, prices in enumerate(price_series):
+        price[row, : min(len(prices), years)] = prices[:years]
+    missing_price = np.arange(years)[None, :] >= price_lengths[:, None]
+    if missing_price.any():
+        opex = (unit_opex + unit_carbon_costs) + unit_secondary_adjustments
+        if (missing_price & (opex != 0)).any():
+            raise IndexError("list index out of range")
+
+    debt_repayment = np.zeros((n, years))
+    debt_repayment[:, construction_time:] = calculate_debt_repayment_schedules(
+        total_investment * (1 - equity_share), lifetime, np.asarray(cost_of_debt, dtype=float)
+    )
+    return calculate_npvs(
+        unit_opex=unit_opex,
+        unit_carbon_costs=unit_carbon_costs,
+        unit_secondary_adjustments=unit_secondary_adjustments,
+        price=price,
+        debt_repayment=debt_repayment,
+        expected_production=expected_production,
+        cost_of_equity=np.asarray(cost_of_equity, dtype=float),
+        equity_investment=total_investment * equity_share,
+    )
+
+
 def calculate_npv_full(
     capex: float,
     capacity: float,
@@ -1077,64 +1257,25 @@ def calculate_npv_full(
     Returns:
         float: The calculated NPV for the technology investment.
 
-    Note: Equity share must be passed explicitly from the config for new plants.
+    Note: Equity share must be passed explicitly from the config for new plants. Single-candidate wrapper around
+    calculate_npv_full_batch.
     """
-    # Use function-specific logger that respects the centralized configuration
-    func_logger = logging.getLogger(f"{__name__}.calculate_npv_full")
-
-    # Calculate total investment and expected production
-    total_investment = capacity * capex + infrastructure_costs
-    expected_production = expected_utilisation_rate * capacity
-
-    # Calculate debt repayment schedule over lifetime
-    debt_repayment = calculate_debt_repayment(
-        total_investment=total_investment, equity_share=equity_share, lifetime=lifetime, cost_of_debt=cost_of_debt
-    )
-
-    # Apply construction time lag to debt repayments and OPEX
-    zeros = [0.0] * construction_time
-    debt_repayment_lagged = zeros + debt_repayment
-    unit_opex_lagged = zeros + unit_total_opex_list
-
-    # Add carbon costs to OPEX if provided and production is positive
-    if expected_production == 0:
-        func_logger.warning("[NPV FULL] Expected production is zero. Not applying carbon costs to OPEX.")
-    elif not carbon_costs:
-        func_logger.warning("[NPV FULL] No carbon costs provided. Not applying carbon costs to OPEX.")
-    else:
-        # Convert total carbon costs to unit carbon costs and apply construction lag
-        unit_carbon_costs = [carbon_cost / expected_production for carbon_cost in carbon_costs]
-        unit_carbon_costs_lagged = zeros + unit_carbon_costs
-        unit_opex_lagged = [x + y for x, y in zip(unit_opex_lagged, unit_carbon_costs_lagged)]
-
-    # Add secondary output cost adjustment (by-product revenue/cost) to OPEX during operational years only
-    secondary_adjustment_lagged = zeros + [secondary_output_adjustment] * len(unit_total_opex_list)
-    unit_opex_lagged = [x + y for x, y in zip(unit_opex_lagged, secondary_adjustment_lagged)]
-    func_logger.debug(f"[NPV FULL] Secondary output adjustment: ${secondary_output_adjustment:,.4f}/t applied to OPEX")
-
-    # Calculate cash flows
-    gross_cash_flow = calculate_gross_cash_flow(
-        total_opex=unit_opex_lagged, price_series=price_series, expected_production=expected_production
-    )
-    net_cash_flow = calculate_net_cash_flow(total_debt_repayment=debt_repayment_lagged, gross_cash_flow=gross_cash_flow)
-
-    # Log all intermediate calculations together for easier debugging
-    func_logger.debug(f"[NPV FULL] Total investment: ${total_investment:,.2f}")
-    func_logger.debug(f"[NPV FULL] Expected production: {expected_production:,.0f} kt")
-    func_logger.debug(f"[NPV FULL] Debt repayment: {debt_repayment}")
-    func_logger.debug(f"[NPV FULL] Debt repayment lagged: {debt_repayment_lagged}")
-    func_logger.debug(f"[NPV FULL] Secondary output adjustment: ${secondary_output_adjustment:,.4f}/t")
-    func_logger.debug(f"[NPV FULL] OPEX list (incl. carbon + secondary): {unit_opex_lagged}")
-    func_logger.debug(f"[NPV FULL] Gross cash flow: {gross_cash_flow}")
-    func_logger.debug(f"[NPV FULL] Net cash flow: {net_cash_flow}")
-
-    # Calculate and return NPV
-    return calculate_npv_costs(
-        net_cash_flow=net_cash_flow,
-        cost_of_equity=cost_of_equity,
+    npv = calculate_npv_full_batch(
+        capex=[capex],
+        capacity=capacity,
+        unit_total_opex_lists=[unit_total_opex_list],
+        expected_utilisation_rates=[expected_utilisation_rate],
+        price_series=[price_series],
+        cost_of_debt=[cost_of_debt],
+        cost_of_equity=[cost_of_equity],
         equity_share=equity_share,
-        total_investment=total_investment,
+        lifetime=lifetime,
+        construction_time=construction_time,
+        carbon_costs=[carbon_costs],
+        infrastructure_costs=infrastructure_costs,
+        secondary_output_adjustments=secondary_output_adjustment,
     )
+    return float(npv[0])
 
 
 def stranding_asset_cost(
@@ -1249,19 +1390,34 @@ def calculate_business_opportunity_npvs(
         - cost_data has been validated by validate_and_clean_cost_data to ensure all required fields are
           present with correct types (floats for costs, dict for bom).
     """
-    from steelo.domain.calculate_costs import calculate_npv_full, collect_active_subsidies_over_period
-
     logger = logging.getLogger(f"{__name__}.calculate_business_opportunity_npvs")
     npv_dict: dict[str, dict[tuple[float, float, str], dict[str, float]]] = {}  # product -> site_id -> tech -> NPV
+
+    # Earliest possible years of operation
+    start_year = Year(target_year + construction_time)
+    end_year = Year(start_year + plant_lifetime)
+
+    # Collect the NPV inputs of all business opportunities and calculate their NPVs in one batch
+    candidates: list[tuple[str, tuple[float, float, str], str]] = []
+    npv_inputs: dict[str, list[Any]] = {
+        key: []
+        for key in (
+            "capex",
+            "unit_total_opex_lists",
+            "expected_utilisation_rates",
+            "price_series",
+            "cost_of_debt",
+            "cost_of_equity",
+            "carbon_costs",
+            "infrastructure_costs",
+            "secondary_output_adjustments",
+        )
+    }
     for prod, sites in cost_data.items():
         npv_dict[prod] = {}
         for site_id, business_ops in sites.items():
             npv_dict[prod][site_id] = {}
             for tech, bo_costs in business_ops.items():
-                # Earliest possible year of operation
-                start_year = Year(target_year + construction_time)
-                end_year = Year(start_year + plant_lifetime)
-
                 # Calculate unit total opex with subsidies applied for earliest possible operation years
                 all_opex_subsidies: list["Subsidy"] = bo_costs.get("all_opex_subsidies", [])  # type: ignore[assignment]
                 selected_opex_subsidies = collect_active_subsidies_over_period(
@@ -1320,32 +1476,33 @@ def calculate_business_opportunity_npvs(
                     f"[NEW PLANT NPV] {prod}/{tech} secondary output adjustment: ${secondary_output_adj:,.4f}/t"
                 )
 
-                # Calculate NPV
-                npv_value = calculate_npv_full(
-                    capex=bo_costs["capex"],  # type: ignore[arg-type]
-                    capacity=steel_plant_capacity,
-                    unit_total_opex_list=unit_total_opex_list,  # type: ignore[arg-type]
-                    expected_utilisation_rate=bo_costs["utilization_rate"],  # type: ignore[arg-type]
-                    price_series=market_price[prod],
-                    lifetime=plant_lifetime,
-                    construction_time=construction_time,
-                    cost_of_debt=bo_costs["cost_of_debt"],  # type: ignore[arg-type]
-                    cost_of_equity=bo_costs["cost_of_equity"],  # type: ignore[arg-type]
-                    equity_share=equity_share,
-                    infrastructure_costs=bo_costs["railway_cost"],  # type: ignore[arg-type]
-                    carbon_costs=carbon_cost_list,
-                    secondary_output_adjustment=secondary_output_adj,
-                )
-
-                # Set to very negative NPV if calculation returned NaN
-                if math.isnan(npv_value):
-                    logger.warning(
-                        f"NPV calculation returned NaN for product {prod} - site {site_id} - "
-                        f"technology {tech}. Returning -inf."
-                    )
-                    npv_dict[prod][site_id][tech] = float("-inf")
-                else:
-                    npv_dict[prod][site_id][tech] = npv_value
+                candidates.append((prod, site_id, tech))
+                npv_inputs["capex"].append(bo_costs["capex"])
+                npv_inputs["unit_total_opex_lists"].append(unit_total_opex_list)
+                npv_inputs["expected_utilisation_rates"].append(bo_costs["utilization_rate"])
+                npv_inputs["price_series"].append(market_price[prod])
+                npv_inputs["cost_of_debt"].append(bo_costs["cost_of_debt"])
+                npv_inputs["cost_of_equity"].append(bo_costs["cost_of_equity"])
+                npv_inputs["carbon_costs"].append(carbon_cost_list)
+                npv_inputs["infrastructure_costs"].append(bo_costs["railway_cost"])
+                npv_inputs["secondary_output_adjustments"].append(secondary_output_adj)
+
+    npv_values = calculate_npv_full_batch(
+        capacity=steel_plant_capacity,
+        lifetime=plant_lifetime,
+        construction_time=construction_time,
+        equity_share=equity_share,
+        **npv_inputs,
+    )
+    for (prod, site_id, tech), npv_value in zip(candidates, npv_values.tolist()):
+        # Set to very negative NPV if calculation returned NaN
+        if math.isnan(npv_value):
+            logger.warning(
+                f"NPV calculation returned NaN for product {prod} - site {site_id} - technology {tech}. Returning -inf."
+            )
+            npv_dict[prod][site_id][tech] = float("-inf")
+        else:
+            npv_dict[prod][site_id][tech] = npv_value
     return npv_dict
 
 
@@ -0,0 +1,191 @@
+"""Supply cost curve of one product, backed by parallel NumPy arrays in merit order.
+
+The curve holds one entry per furnace group: its unit cost of production and its (capacity-limited) capacity, sorted
+by unit cost, with the cumulative capacity up to and including each entry. Ties in unit cost are ordered by furnace
+group ID, so a curve maintained by incremental ``upsert``/``discard`` calls is identical to one rebuilt from scratch.
+
+Price lookups are binary searches on the cumulative capacity (``np.searchsorted``) and accept many demand levels at
+once. For code that still treats a cost curve as a list, ``CostCurve`` is a sequence of
+``{"cumulative_capacity": ..., "production_cost": ...}`` dicts and compares equal to such a list.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Iterable, overload
+
+import numpy as np
+
+
+class CostCurve(Sequence):
+    """Merit-order cost curve of furnace groups producing one product.
+
+    Args:
+        unit_costs: Unit cost of production per furnace group (any order)
+        capacities: Capacity per furnace group, aligned with ``unit_costs``
+        furnace_group_ids: Furnace group IDs, aligned with ``unit_costs``
+    """
+
+    def __init__(
+        self,
+        unit_costs: Iterable[float] = (),
+        capacities: Iterable[float] = (),
+        furnace_group_ids: Iterable[str] = (),
+    ):
+        costs = np.asarray(list(unit_costs), dtype=float)
+        caps = np.asarray(list(capacities), dtype=float)
+        ids = np.asarray(list(furnace_group_ids), dtype=object)
+        if not len(costs) == len(caps) == len(ids):
+            raise ValueError("unit_costs, capacities and furnace_group_ids must have the same length")
+        order = np.lexsort((_ranks(ids), costs)) if len(costs) else np.empty(0, dtype=np.int64)
+        self._set(costs[order], caps[order], ids[order])
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[dict[str, float]]) -> "CostCurve":
+        """Build a curve from ``{"cumulative_capacity", "production_cost"}`` dicts already in merit order.
+
+        The entries keep their order and cumulative capacities; they have no furnace group IDs.
+        """
+        entries = list(entries)
+        curve = cls()
+        curve._costs = np.array([entry["production_cost"] for entry in entries], dtype=float)
+        curve._cumulative = np.array([entry["cumulative_capacity"] for entry in entries], dtype=float)
+        curve._capacities = np.diff(curve._cumulative, prepend=0.0)
+        curve._ids = np.full(len(entries), "", dtype=object)
+        return curve
+
+    @classmethod
+    def coerce(cls, curve: "CostCurve | Iterable[dict[str, float]]") -> "CostCurve":
+        """Return ``curve`` itself if it is a ``CostCurve``, else build one from its list of entries."""
+        return curve if isinstance(curve, CostCurve) else cls.from_entries(curve)
+
+    def _set(self, costs: np.ndarray, capacities: np.ndarray, ids: np.ndarray) -> None:
+        self._costs = costs
+        self._capacities = capacities
+        self._ids = ids
+        # Sequential sum, so the cumulative capacities match a running total over the entries exactly
+        self._cumulative = np.cumsum(capacities)
+
+    @property
+    def unit_costs(self) -> np.ndarray:
+        """Unit costs of production in merit order (read-only view)."""
+        return _read_only(self._costs)
+
+    @property
+    def cumulative_capacities(self) -> np.ndarray:
+        """Cumulative capacity up to and including each entry (read-only view)."""
+        return _read_only(self._cumulative)
+
+    @property
+    def furnace_group_ids(self) -> np.ndarray:
+        """Furnace group ID of each entry ("" for curves built with ``from_entries``)."""
+        return _read_only(self._ids)
+
+    @property
+    def total_capacity(self) -> float:
+        return float(self._cumulative[-1]) if len(self._cumulative) else 0.0
+
+    def __len__(self) -> int:
+        return len(self._costs)
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, float]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, float]]: ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, float] | list[dict[str, float]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return {"cumulative_capacity": float(self._cumulative[index]), "production_cost": float(self._costs[index])}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"CostCurve(entries={len(self)}, total_capacity={self.total_capacity:,.0f})"
+
+    def position(self, furnace_group_id: str) -> int | None:
+        """Index of the entry of ``furnace_group_id``, or None if it is not on the curve."""
+        positions = np.flatnonzero(self._ids == furnace_group_id)
+        return int(positions[0]) if len(positions) else None
+
+    def discard(self, furnace_group_id: str) -> bool:
+        """Remove the entry of ``furnace_group_id`` if there is one; returns whether an entry was removed."""
+        position = self.position(furnace_group_id)
+        if position is None:
+            return False
+        self._set(
+            np.delete(self._costs, position), np.delete(self._capacities, position), np.delete(self._ids, position)
+        )
+        return True
+
+    def upsert(self, furnace_group_id: str, unit_cost: float, capacity: float) -> None:
+        """Insert the entry of ``furnace_group_id``, replacing its previous entry if it has one."""
+        position = self.position(furnace_group_id)
+        costs, capacities, ids = self._costs, self._capacities, self._ids
+        if position is not None:
+            costs, capacities, ids = (np.delete(array, position) for array in (costs, capacities, ids))
+        # After all cheaper entries, and among entries of the same cost in furnace group ID order
+        low = int(np.searchsorted(costs, unit_cost, side="left"))
+        high = int(np.searchsorted(costs, unit_cost, side="right"))
+        insert_at = low + int(np.searchsorted(ids[low:high], furnace_group_id, side="right"))
+        self._set(
+            np.insert(costs, insert_at, unit_cost),
+            np.insert(capacities, insert_at, capacity),
+            np.insert(ids, insert_at, furnace_group_id),
+        )
+
+    def dispatchable_count(self, share: float) -> int:
+        """Number of entries within the market-clearing share of the total capacity.
+
+        Strict inequality: entries with ``cumulative_capacity <= share * total`` are kept. The boundary furnace (the
+        first to exceed the threshold) is excluded along with everything above it. At ``share = 1.0`` every entry
+        is kept.
+        """
+        return int(np.searchsorted(self._cumulative, share * self.total_capacity, side="right"))
+
+    def merit_order_prices(self, demands: Any) -> np.ndarray:
+        """Production cost of the first entry whose cumulative capacity meets each demand level.
+
+        Demand above the total capacity gets the cost of the last entry. The curve must not be empty.
+        """
+        positions = np.searchsorted(self._cumulative, np.asarray(demands, dtype=float), side="left")
+        return self._costs[np.minimum(positions, len(self) - 1)]
+
+    def clearing_prices(self, demands: Any, share: float, buffer: float) -> np.ndarray:
+        """Market-clearing prices for many demand levels at once.
+
+        Demand within ``share`` of the total capacity clears in merit order on the full curve (so the boundary
+        furnace is reachable at its own cost). Above it, the price is the cost of the last dispatchable entry plus
+        ``buffer``. If no entry is dispatchable (degenerate share), the full curve is used with the total capacity as
+        the threshold. The curve must not be empty.
+
+        Args:
+            demands: Demand levels (scalar or array)
+            share: Market-clearing share of the total capacity
+            buffer: Price premium in the shortage regime
+
+        Returns:
+            Price per demand level
+        """
+        demands = np.asarray(demands, dtype=float)
+        dispatchable = self.dispatchable_count(share)
+        if dispatchable == 0:
+            threshold, boundary_cost = self.total_capacity, self._costs[-1]
+        else:
+            threshold, boundary_cost = share * self.total_capacity, self._costs[dispatchable - 1]
+        return np.where(demands > threshold, boundary_cost + buffer, self.merit_order_prices(demands))
+
+
+def _ranks(ids: np.ndarray) -> np.ndarray:
+    """Rank of each ID in sorted order, for use as a secondary ``np.lexsort`` key."""
+    ranks = np.empty(len(ids), dtype=np.int64)
+    ranks[np.argsort(ids, kind="stable")] = np.arange(len(ids))
+    return ranks
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
@@ -10,16 +10,25 @@ import os
 from .constants import Year
 import logging
 
+from steelo.adapters.dataprocessing.postprocessing.datacollection_tables import write_year_tables
+
 
 class DataCollector:
     def __init__(
-        self, world_plant_groups: list[PlantGroup], env: Environment, custom_function=None, output_dir=None
+        self,
+        world_plant_groups: list[PlantGroup],
+        env: Environment,
+        custom_function=None,
+        output_dir=None,
+        write_legacy_pickles: bool = False,
     ) -> None:
         self.plant_groups = world_plant_groups
         self.env = env
         if output_dir is None:
             raise ValueError("output_dir is required")
         self.output_dir = Path(output_dir)
+        # Per-year results go to columnar tables (see datacollection_tables); the pickled dicts are opt-in
+        self.write_legacy_pickles = write_legacy_pickles
         self.cost_breakdown: dict[str, dict] = {}
         self.trace_capacity: dict[int, dict[str, float]] = {}
         self.trace_price: dict[int, dict[str, float]] = {}  # {year: {product: price}}
@@ -725,6 +734,7 @@ class DataCollector:
                     if ccs_outputs:
                         record["ccs_outputs"] = ccs_outputs
                     if fg.emissions is not None:
+                        record["emissions"] = fg.emissions
                         for boundary in fg.emissions:
                             for scope in fg.emissions[boundary]:
                                 record[f"emissions_{boundary}_{scope}"] = fg.emissions[boundary][scope]
@@ -826,5 +836,7 @@ class DataCollector:
         tm_dir = self.output_dir / "TM"
         tm_dir.mkdir(parents=True, exist_ok=True)
 
-        with open(tm_dir / f"datacollection_post_allocation_{year}.pkl", "wb") as f:
-            pickle.dump(plants, f)
+        write_year_tables(plants, year, tm_dir)
+        if self.write_legacy_pickles:
+            with open(tm_dir / f"datacollection_post_allocation_{year}.pkl", "wb") as f:
+                pickle.dump(plants, f)
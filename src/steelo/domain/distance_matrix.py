@@ -0,0 +1,190 @@
+"""Process-center distance matrix shared by the trade LP and furnace group clustering.
+
+Locations are identified by their coordinates, so a plant keeps its row and column for the whole run (and across runs
+when the matrix is persisted next to the prepared data). The matrix holds great-circle (haversine) distances in km as
+float32; "pref_economic" distances put each origin's country distance table (``Location.distance_to_other_iso3``) on
+top, exactly like ``ProcessCenter.distance_to_other_processcenter``. New locations extend the matrix incrementally:
+only the rows and columns of the new locations are computed.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+from steelo.adapters.geospatial.geospatial_toolbox import haversine_matrix
+
+logger = logging.getLogger(__name__)
+
+# Key shared by all locations without coordinates; its row and column are NaN
+_MISSING = None
+
+
+def _location_key(location: Any) -> tuple[float, float] | None:
+    if location is None or location.lat is None or location.lon is None:
+        return _MISSING
+    lat, lon = float(location.lat), float(location.lon)
+    if np.isnan(lat) or np.isnan(lon):
+        return _MISSING
+    return (lat, lon)
+
+
+def apply_country_distance_tables(
+    distances: np.ndarray, from_locations: Sequence[Any], to_locations: Sequence[Any]
+) -> np.ndarray:
+    """Overwrite ``distances`` (from × to, in place) with the origin's country distance table where it has the
+    destination's ISO3 code; pairs without a table entry keep their haversine distance."""
+    to_iso3 = [location.iso3 if location is not None else None for location in to_locations]
+    unique_iso3 = list(dict.fromkeys(to_iso3))
+    iso3_position = {iso3: position for position, iso3 in enumerate(unique_iso3)}
+    to_iso3_idx = np.fromiter((iso3_position[iso3] for iso3 in to_iso3), dtype=np.int64, count=len(to_iso3))
+    # Locations of one country share the same table, so each table is expanded to the to-columns only once
+    overrides_by_table: dict[int, np.ndarray | None] = {}
+    for row, location in enumerate(from_locations):
+        table = location.distance_to_other_iso3 if location is not None else None
+        if not table:
+            continue
+        if id(table) not in overrides_by_table:
+            per_iso3 = np.array(
+                [table.get(iso3, np.nan) if iso3 is not None else np.nan for iso3 in unique_iso3], dtype=float
+            )
+            overrides_by_table[id(table)] = None if np.isnan(per_iso3).all() else per_iso3[to_iso3_idx]
+        overrides = overrides_by_table[id(table)]
+        if overrides is not None:
+            distances[row] = np.where(np.isnan(overrides), distances[row], overrides)
+    return distances
+
+
+class DistanceMatrix:
+    """Growable square matrix of haversine distances between every location seen so far.
+
+    Attributes:
+        computed_pairs: Number of location pairs whose distance was computed (not loaded) in this process
+        lookups: Number of distance requests served, counting each pair of a block request
+        persisted_size: Number of locations in the matrix when it was last loaded or saved
+    """
+
+    MATRIX_FILE = "distance_matrix.npy"
+    COORDINATES_FILE = "distance_matrix_coordinates.npy"
+
+    def __init__(self):
+        self._index: dict[tuple[float, float] | None, int] = {}
+        self._coordinates = np.empty((0, 2))
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._size = 0
+        self.computed_pairs = 0
+        self.lookups = 0
+        self.persisted_size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def indices(self, locations: Sequence[Any]) -> np.ndarray:
+        """Matrix positions of ``locations``, adding rows and columns for locations not seen before."""
+        positions = np.empty(len(locations), dtype=np.int64)
+        new_keys: list[tuple[float, float] | None] = []
+        for i, location in enumerate(locations):
+            key = _location_key(location)
+            position = self._index.get(key)
+            if position is None:
+                position = self._size + len(new_keys)
+                self._index[key] = position
+                new_keys.append(key)
+            positions[i] = position
+        if new_keys:
+            self._extend(new_keys)
+        return positions
+
+    def haversine(self, from_locations: Sequence[Any], to_locations: Sequence[Any]) -> np.ndarray:
+        """Great-circle distances (km, float64) for every pair of ``from_locations`` × ``to_locations``."""
+        rows = self.indices(from_locations)
+        cols = self.indices(to_locations)
+        self.lookups += len(rows) * len(cols)
+        return self._matrix[np.ix_(rows, cols)].astype(float)
+
+    def pref_economic(self, from_locations: Sequence[Any], to_locations: Sequence[Any]) -> np.ndarray:
+        """Country-table distances where available, else haversine, for every pair (see module docstring)."""
+        return apply_country_distance_tables(self.haversine(from_locations, to_locations), from_locations, to_locations)
+
+    def distance(self, from_location: Any, to_location: Any) -> float:
+        """Scalar ``pref_economic`` distance between two locations."""
+        table = from_location.distance_to_other_iso3 if from_location is not None else None
+        if table is not None and to_location is not None and to_location.iso3 is not None and to_location.iso3 in table:
+            self.lookups += 1
+            return table[to_location.iso3]
+        from_position, to_position = self.indices([from_location, to_location])
+        self.lookups += 1
+        return float(self._matrix[from_position, to_position])
+
+    def _extend(self, new_keys: list[tuple[float, float] | None]) -> None:
+        old_size = self._size
+        new_size = old_size + len(new_keys)
+        new_coordinates = np.array([key if key is not _MISSING else (np.nan, np.nan) for key in new_keys], dtype=float)
+        coordinates = np.vstack([self._coordinates, new_coordinates])
+
+        capacity = self._matrix.shape[0]
+        if new_size > capacity or not self._matrix.flags.writeable:
+            # Grow geometrically so plants opening one by one do not copy the matrix every year. A memory-mapped
+            # matrix is read-only and is copied into memory on its first extension.
+            grown = np.full((max(new_size, 2 * capacity),) * 2, np.nan, dtype=np.float32)
+            grown[:old_size, :old_size] = self._matrix[:old_size, :old_size]
+            self._matrix = grown
+
+        lat, lon = coordinates[:, 0], coordinates[:, 1]
+        self._matrix[old_size:new_size, :new_size] = haversine_matrix(
+            lat[old_size:], lon[old_size:], lat[:new_size], lon[:new_size]
+        )
+        self._matrix[:old_size, old_size:new_size] = haversine_matrix(
+            lat[:old_size], lon[:old_size], lat[old_size:], lon[old_size:]
+        )
+        self.computed_pairs += new_size * new_size - old_size * old_size
+        self._coordinates = coordinates
+        self._size = new_size
+
+    def save(self, directory: Path) -> None:
+        """Write the matrix and its location coordinates as ``.npy`` files into ``directory`` (atomically)."""
+        directory.mkdir(parents=True, exist_ok=True)
+        for file_name, array in (
+            (self.COORDINATES_FILE, self._coordinates),
+            (self.MATRIX_FILE, np.ascontiguousarray(self._matrix[: self._size, : self._size])),
+        ):
+            temporary = directory / f".{file_name}.tmp"
+            with open(temporary, "wb") as handle:
+                np.save(handle, array)
+            os.replace(temporary, directory / file_name)
+        self.persisted_size = self._size
+        logger.info(f"operation=distance_matrix_save locations={self._size} directory={directory}")
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "DistanceMatrix | None":
+        """Load a matrix written by ``save``; memory-mapped read-only unless ``mmap`` is False.
+
+        Returns None when the files are missing or inconsistent, in which case the caller starts from scratch.
+        """
+        matrix_path = directory / cls.MATRIX_FILE
+        coordinates_path = directory / cls.COORDINATES_FILE
+        if not matrix_path.exists() or not coordinates_path.exists():
+            return None
+        try:
+            coordinates = np.load(coordinates_path)
+            matrix = np.load(matrix_path, mmap_mode="r" if mmap else None)
+        except (OSError, ValueError) as error:
+            logger.warning(f"Ignoring unreadable distance matrix in {directory}: {error}")
+            return None
+        size = len(coordinates)
+        if coordinates.shape != (size, 2) or matrix.shape != (size, size) or matrix.dtype != np.float32:
+            logger.warning(f"Ignoring inconsistent distance matrix in {directory}")
+            return None
+
+        distance_matrix = cls()
+        for position, (lat, lon) in enumerate(coordinates.tolist()):
+            key = _MISSING if np.isnan(lat) or np.isnan(lon) else (lat, lon)
+            distance_matrix._index.setdefault(key, position)
+        distance_matrix._coordinates = coordinates
+        distance_matrix._matrix = matrix
+        distance_matrix._size = size
+        distance_matrix.persisted_size = size
+        logger.info(f"operation=distance_matrix_load locations={size} directory={directory} mmap={mmap}")
+        return distance_matrix
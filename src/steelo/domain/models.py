@@ -4,13 +4,17 @@ from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
 import copy
+import functools
 import math
 import logging
+import os
 import random
 import uuid
+import numpy as np
 from geopy.distance import geodesic  # type: ignore
 from typing import TYPE_CHECKING, TypeVar, ClassVar, FrozenSet, Dict, Tuple, Union, Any, Callable, Optional
 from collections import defaultdict, Counter
+from collections.abc import Sequence
 from steelo.domain import events, commands
 from steelo.domain.calculate_costs import (
     calculate_capex_with_subsidies,
@@ -30,9 +34,11 @@ from steelo.domain.calculate_emissions import (
     materiall_bill_business_case_match,
 )
 from steelo.domain.carbon_cost import CarbonCost, CarbonCostService
+from steelo.domain.cost_curve import CostCurve
 from steelo.domain import diagnostics as diag
 from steelo.utilities.utils import merge_two_dictionaries
 from steelo.core.parse import normalize_code
+from steelo.logging_config import get_logger, hot_path
 from steelo.simulation_types import TechSettingsMap
 
 # Import only true constants from constants file
@@ -49,6 +55,14 @@ from steelo.domain.constants import (
 
 if TYPE_CHECKING:
     from steelo.simulation import SimulationConfig
+    from steelo.domain.trade_modelling.highs_matrix_backend import PersistentHighsSolver
+    from steelo.domain.distance_matrix import DistanceMatrix
+    from steelo.adapters.geospatial.layer_pipeline import GeoLayerPipeline
+
+
+# Recompute memoised furnace group costs on every cache hit and fail on a stale value (slow; for finding missing
+# invalidation after in-place mutations)
+COST_CACHE_DEBUG = os.getenv("STEELO_COST_CACHE_DEBUG", "0") == "1"
 
 
 class UnknownTechnologyError(KeyError):
@@ -340,6 +354,11 @@ class GeoDataPaths:
         Path  # Directory for static geospatial layers (feasibility_mask.nc, rail_cost.nc, global_grid_with_iso3.nc)
     )
     landtype_percentage_path: Path
+    # Persistent cross-run cache of the static layers, keyed by input file contents and parameters (None = disabled)
+    layer_cache_dir: Optional[Path] = None
+    layer_cache_max_size_gb: float = 5.0
+    # Baseload LCOE pre-interpolated to every simulation year (None = interpolate in every year)
+    baseload_lcoe_cube_dir: Optional[Path] = None
 
 
 @dataclass
@@ -1064,7 +1083,54 @@ class ProductionThreshold:
     high: float = 0.95
 
 
+def _memoised_cost(compute: Callable[[Any], float]) -> Callable[[Any], float]:
+    """Memoise a furnace group cost getter in the group's cost cache (see ``FurnaceGroup.invalidate_cost_cache``)."""
+    name = compute.__name__
+
+    @functools.wraps(compute)
+    def cached(self: "FurnaceGroup") -> float:
+        cache = self.__dict__.setdefault("_cost_cache", {})
+        if name not in cache:
+            value = compute(self)
+            # Computing may rebind a cost input (e.g. repair the BOM), which clears the cache
+            self.__dict__.setdefault("_cost_cache", {})[name] = value
+            return value
+        value = cache[name]
+        if COST_CACHE_DEBUG:
+            fresh = compute(self)
+            if not (fresh == value or (math.isnan(fresh) and math.isnan(value))):
+                raise AssertionError(
+                    f"Stale cached {name} for FurnaceGroup {self.furnace_group_id}: cached {value!r}, fresh {fresh!r}"
+                )
+        return value
+
+    return cached
+
+
 class FurnaceGroup:
+    # Rebinding any of these clears the memoised unit costs; in-place changes must call invalidate_cost_cache()
+    COST_INPUTS: ClassVar[FrozenSet[str]] = frozenset(
+        {
+            "capacity",
+            "status",
+            "technology",
+            "utilization_rate",
+            "lifetime",
+            "production_threshold",
+            "bill_of_materials",
+            "chosen_reductant",
+            "disposal_cost_outputs",
+            "equity_share",
+            "cost_of_debt",
+            "legacy_debt_schedule",
+            "applied_subsidies",
+            "energy_costs",
+            "output_energy_costs",
+            "tech_unit_fopex",
+            "_carbon_cost",
+        }
+    )
+
     def __init__(
         self,
         *,
@@ -1101,6 +1167,7 @@ class FurnaceGroup:
         carbon_breakdown_keys: list[str] | None = None,
         disposal_cost_outputs: frozenset[str] | None = None,
     ) -> None:
+        self._cost_cache: dict[str, float] = {}
         self.furnace_group_id = furnace_group_id
         self.capacity = capacity
         self.status = status
@@ -1245,6 +1312,7 @@ class FurnaceGroup:
         self.energy_costs_no_subsidy = no_subsidy_prices
         for carrier, subs in energy_subsidies.items():
             self.applied_subsidies[carrier] = subs
+        self.invalidate_cost_cache()
         diffs = [
             f"{c} in=${input_costs.get(c, no_subsidy_prices[c]):.4f}"
             f" out=${output_costs.get(c, no_subsidy_prices[c]):.4f}"
@@ -1254,6 +1322,21 @@ class FurnaceGroup:
         if diffs:
             logger.debug("[ENERGY SUBS] FG set: %s", ", ".join(diffs))
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in FurnaceGroup.COST_INPUTS:
+            self.__dict__.pop("_cost_cache", None)
+        object.__setattr__(self, name, value)
+
+    def invalidate_cost_cache(self) -> None:
+        """
+        Drop the memoised unit costs (``unit_vopex``, ``unit_total_opex``, ``unit_production_cost``, ...).
+
+        Rebinding a cost input attribute (see ``COST_INPUTS``) does this automatically; call it after changing one
+        in place, e.g. scaling BOM entries, appending to ``applied_subsidies`` or updating ``technology.capex``.
+        Set ``STEELO_COST_CACHE_DEBUG=1`` to verify every cache hit against a fresh computation.
+        """
+        self.__dict__.pop("_cost_cache", None)
+
     def __repr__(self) -> str:
         return f"FurnaceGroup: <{self.furnace_group_id}>"
 
@@ -1316,6 +1399,7 @@ class FurnaceGroup:
         self.technology.capex = capex
         # Set baseline capital expenditure without subsidies
         self.technology.capex_no_subsidy = capex_no_subsidy
+        self.invalidate_cost_cache()
 
     @property
     def is_ccs_or_ccu(self) -> bool:
@@ -1515,6 +1599,8 @@ class FurnaceGroup:
         return self.tech_unit_fopex / effective_utilisation
 
     @property
+    @_memoised_cost
+    @hot_path
     def unit_vopex(self) -> float:
         """
         Calculate unit variable operating expenditure based on bill of materials.
@@ -1530,7 +1616,7 @@ class FurnaceGroup:
 
         Note: Excludes carbon costs and debt repayment (those are calculated separately).
         """
-        logger = logging.getLogger(f"{__name__}.FurnaceGroup.unit_vopex")
+        logger = get_logger(f"{__name__}.FurnaceGroup.unit_vopex")
         from .calculate_costs import calculate_variable_opex
 
         # Validate and repair BOM structure if needed
@@ -1538,7 +1624,7 @@ class FurnaceGroup:
             # Check if BOM is a dict
             if not isinstance(self.bill_of_materials, dict):
                 logger.error(
-                    f"[UNIT VOPEX]: BOM is not a dict! Type: {type(self.bill_of_materials)}, Value: {self.bill_of_materials}"
+                    lambda: f"[UNIT VOPEX]: BOM is not a dict! Type: {type(self.bill_of_materials)}, Value: {self.bill_of_materials}"
                 )
                 if self.utilization_rate > 0:
                     raise ValueError("BOM must exist for FG with utilization rate > 0")
@@ -1548,7 +1634,7 @@ class FurnaceGroup:
             # Check if BOM has required keys
             elif "materials" not in self.bill_of_materials or "energy" not in self.bill_of_materials:
                 logger.error(
-                    f"[UNIT VOPEX]: BOM missing required keys! Keys: {list(self.bill_of_materials.keys())}, Value: {self.bill_of_materials}"
+                    lambda: f"[UNIT VOPEX]: BOM missing required keys! Keys: {list(self.bill_of_materials.keys())}, Value: {self.bill_of_materials}"
                 )
                 # Add missing keys to prevent crash
                 if "materials" not in self.bill_of_materials:
@@ -1606,6 +1692,7 @@ class FurnaceGroup:
         return vopex
 
     @property
+    @_memoised_cost
     def unit_total_opex(self) -> float:
         """
         Calculate unit total operating expenditure with subsidies applied.
@@ -1624,6 +1711,7 @@ class FurnaceGroup:
         )
 
     @property
+    @_memoised_cost
     def unit_total_opex_no_subsidy(self) -> float:
         """
         Calculate unit total operating expenditure without subsidies.
@@ -1925,6 +2013,7 @@ class FurnaceGroup:
         return self.utilization_rate * self.capacity
 
     @property
+    @_memoised_cost
     def cost_adjustments_from_secondary_outputs(self) -> float:
         """
         Cost adjustments from secondary outputs such as by-product sales (USD/t).
@@ -1947,6 +2036,7 @@ class FurnaceGroup:
         )
 
     @property
+    @_memoised_cost
     def unit_production_cost(self) -> float:
         """
         Calculate the total cost per unit of production.
@@ -2149,6 +2239,7 @@ class FurnaceGroup:
         return breakdown
 
     @property
+    @_memoised_cost
     def unit_current_debt_repayment(self) -> float:
         """
         Debt repayment per unit of production (USD/t) or per unit of capacity if not producing.
@@ -2196,6 +2287,7 @@ class FurnaceGroup:
             carbon_breakdown_keys=self.carbon_breakdown_keys,
         )
 
+    @hot_path
     def optimal_technology_name(
         self,
         market_price_series: dict[str, list[float]],
@@ -2295,30 +2387,30 @@ class FurnaceGroup:
             calculate_emissions_cost_series,
         )
 
-        logger = logging.getLogger(f"{__name__}.optimal_technology_name")
+        logger = get_logger(f"{__name__}.optimal_technology_name")
 
         # Log initial furnace group state
-        logger.info(f"[OPTIMAL TECH] Starting technology evaluation for FurnaceGroup {self.furnace_group_id}")
+        logger.info(lambda: f"[OPTIMAL TECH] Starting technology evaluation for FurnaceGroup {self.furnace_group_id}")
         logger.info(
-            f"[OPTIMAL TECH] Current technology: {self.technology.name}, "
+            lambda: f"[OPTIMAL TECH] Current technology: {self.technology.name}, "
             f"Capacity: {self.capacity * T_TO_KT:,.0f} kt, Utilization: {self.utilization_rate:.1%}"
         )
         logger.debug(
-            f"[OPTIMAL TECH] Current year: {current_year}, "
+            lambda: f"[OPTIMAL TECH] Current year: {current_year}, "
             f"Lifetime remaining: {self.lifetime.remaining_number_of_years} years"
         )
-        logger.debug(f"[OPTIMAL TECH] Market price series for steel ($/t): ${market_price_series['steel']}")
-        logger.debug(f"[OPTIMAL TECH] Market price series for iron ($/t): ${market_price_series['iron']}")
+        logger.debug(lambda: f"[OPTIMAL TECH] Market price series for steel ($/t): ${market_price_series['steel']}")
+        logger.debug(lambda: f"[OPTIMAL TECH] Market price series for iron ($/t): ${market_price_series['iron']}")
         logger.debug(
-            f"[OPTIMAL TECH] Allowed transitions from {self.technology.name}: "
+            lambda: f"[OPTIMAL TECH] Allowed transitions from {self.technology.name}: "
             f"{allowed_furnace_transitions.get(self.technology.name, [])}"
         )
 
         # Log current operating costs
-        logger.debug(f"[OPTIMAL TECH] Unit fixed OPEX: ${self.unit_fopex:,.2f}/t")
-        logger.debug(f"[OPTIMAL TECH] Unit variable OPEX: ${self.unit_vopex:,.2f}/t")
-        logger.debug(f"[OPTIMAL TECH] Unit total OPEX: ${self.unit_total_opex:,.2f}/t")
-        logger.debug(f"[OPTIMAL TECH] Debt repayment number of years: {len(self.debt_repayment_per_year)}")
+        logger.debug(lambda: f"[OPTIMAL TECH] Unit fixed OPEX: ${self.unit_fopex:,.2f}/t")
+        logger.debug(lambda: f"[OPTIMAL TECH] Unit variable OPEX: ${self.unit_vopex:,.2f}/t")
+        logger.debug(lambda: f"[OPTIMAL TECH] Unit total OPEX: ${self.unit_total_opex:,.2f}/t")
+        logger.debug(lambda: f"[OPTIMAL TECH] Debt repayment number of years: {len(self.debt_repayment_per_year)}")
 
         # ========== STAGE 2: Calculate Current Technology OPEX with Subsidies ==========
         # Collect all active OPEX subsidies across the remaining lifetime
@@ -2337,9 +2429,9 @@ class FurnaceGroup:
         )
 
         logger.debug(
-            f"[OPTIMAL TECH] Applied OPEX subsidies for current technology {self.technology.name}: {applied_opex_subsidies}"
+            lambda: f"[OPTIMAL TECH] Applied OPEX subsidies for current technology {self.technology.name}: {applied_opex_subsidies}"
         )
-        logger.debug(f"[OPTIMAL TECH] Unit opex list with subsidies (without carbon costs): {unit_opex_list}")
+        logger.debug(lambda: f"[OPTIMAL TECH] Unit opex list with subsidies (without carbon costs): {unit_opex_list}")
 
         # ========== STAGE 3: Calculate Carbon Costs for Current Technology ==========
         # Calculate total carbon costs over remaining lifetime
@@ -2361,30 +2453,32 @@ class FurnaceGroup:
         cosa_secondary_adj = self.cost_adjustments_from_secondary_outputs
         unit_opex_carbon_costs = [x + y + cosa_secondary_adj for x, y in zip(unit_opex_list, unit_carbon_cost_list)]
         logger.debug(
-            f"[OPTIMAL TECH] COSA secondary output adjustment for {self.technology.name}: ${cosa_secondary_adj:,.4f}/t"
+            lambda: f"[OPTIMAL TECH] COSA secondary output adjustment for {self.technology.name}: ${cosa_secondary_adj:,.4f}/t"
         )
 
-        logger.debug(f"[OPTIMAL TECH] Calculating carbon costs for current technology {self.technology.name}")
-        logger.debug(f"[OPTIMAL TECH] Emission boundary: {chosen_emissions_boundary_for_carbon_costs}")
+        logger.debug(lambda: f"[OPTIMAL TECH] Calculating carbon costs for current technology {self.technology.name}")
+        logger.debug(lambda: f"[OPTIMAL TECH] Emission boundary: {chosen_emissions_boundary_for_carbon_costs}")
         logger.debug(
-            f"[OPTIMAL TECH] Carbon cost series length: {len(unit_carbon_cost_list)}, "
+            lambda: f"[OPTIMAL TECH] Carbon cost series length: {len(unit_carbon_cost_list)}, "
             f"First 5 values: {unit_carbon_cost_list[:5] if unit_carbon_cost_list else 'None'}"
         )
-        logger.debug(f"[OPTIMAL TECH] Unit opex list with subsidies (after carbon costs): {unit_opex_carbon_costs}")
+        logger.debug(
+            lambda: f"[OPTIMAL TECH] Unit opex list with subsidies (after carbon costs): {unit_opex_carbon_costs}"
+        )
 
         # ========== STAGE 4: Calculate Cost of Stranded Assets (COSA) ==========
         # COSA represents the economic penalty for abandoning current technology before end of life
-        logger.debug(f"[OPTIMAL TECH] Calculating COSA for current technology {self.technology.name}")
+        logger.debug(lambda: f"[OPTIMAL TECH] Calculating COSA for current technology {self.technology.name}")
         logger.debug(
-            f"[OPTIMAL TECH] Debt repayment years: {len(self.debt_repayment_per_year)}, "
+            lambda: f"[OPTIMAL TECH] Debt repayment years: {len(self.debt_repayment_per_year)}, "
             f"Remaining lifetime: {self.lifetime.remaining_number_of_years} years"
         )
-        logger.debug(f"[OPTIMAL TECH] Debt repayment per year: {self.debt_repayment_per_year}")
+        logger.debug(lambda: f"[OPTIMAL TECH] Debt repayment per year: {self.debt_repayment_per_year}")
         logger.debug(
-            f"[OPTIMAL TECH] Product: {self.technology.product}, "
+            lambda: f"[OPTIMAL TECH] Product: {self.technology.product}, "
             f"Expected production: {self.production * T_TO_KT:,.0f} kt"
         )
-        logger.debug(f"[OPTIMAL TECH] Price series ($/t): {market_price_series.get(self.technology.product)}")
+        logger.debug(lambda: f"[OPTIMAL TECH] Price series ($/t): {market_price_series.get(self.technology.product)}")
 
         # Calculate economic COSA based on remaining cash flows
         original_cosa = stranding_asset_cost(
@@ -2401,11 +2495,11 @@ class FurnaceGroup:
         cosa = max(remaining_debt, original_cosa)
 
         logger.debug(
-            f"[OPTIMAL TECH] COSA calculation - Original: ${original_cosa:,.0f}, "
+            lambda: f"[OPTIMAL TECH] COSA calculation - Original: ${original_cosa:,.0f}, "
             f"Remaining debt: ${remaining_debt:,.0f}, Final COSA: ${cosa:,.0f}"
         )
         logger.debug(
-            f"[OPTIMAL TECH] COSA decision - Using {'remaining debt' if cosa == remaining_debt else 'calculated COSA'} as final value"
+            lambda: f"[OPTIMAL TECH] COSA decision - Using {'remaining debt' if cosa == remaining_debt else 'calculated COSA'} as final value"
         )
 
         # ========== STAGE 5: Check for Allowed Technology Transitions ==========
@@ -2415,26 +2509,28 @@ class FurnaceGroup:
 
         # Check if current technology has any allowed transitions defined
         if self.technology.name not in allowed_furnace_transitions:
-            logger.info(f"[OPTIMAL TECH] NO TRANSITIONS ALLOWED - {self.technology.name} has no defined transitions")
+            logger.info(
+                lambda: f"[OPTIMAL TECH] NO TRANSITIONS ALLOWED - {self.technology.name} has no defined transitions"
+            )
             logger.info("[OPTIMAL TECH] Returning empty results - no technology switch possible")
             logger.info("[OPTIMAL TECH] NPV dict: {}")
-            logger.info(f"[OPTIMAL TECH] NPV capex dict: {npv_capex_dict}")
+            logger.info(lambda: f"[OPTIMAL TECH] NPV capex dict: {npv_capex_dict}")
             logger.info("[OPTIMAL TECH] COSA: None")
-            logger.info(f"[OPTIMAL TECH] BOM dict: {bom_dict}")
+            logger.info(lambda: f"[OPTIMAL TECH] BOM dict: {bom_dict}")
             return {}, npv_capex_dict, None, bom_dict
 
         # ========== STAGE 6: Evaluate Each Allowed Technology Transition ==========
         logger.debug(
-            f"[OPTIMAL TECH] Beginning evaluation of {len(allowed_furnace_transitions[self.technology.name])} "
+            lambda: f"[OPTIMAL TECH] Beginning evaluation of {len(allowed_furnace_transitions[self.technology.name])} "
             f"possible transitions: {allowed_furnace_transitions[self.technology.name]}"
         )
 
         for tech in allowed_furnace_transitions[self.technology.name]:
-            logger.info(f"[OPTIMAL TECH] ===== Evaluating transition to {tech} =====")
+            logger.info(lambda: f"[OPTIMAL TECH] ===== Evaluating transition to {tech} =====")
 
             # Skip if technology lacks capex data
             if tech not in capex_dict:
-                logger.info(f"[OPTIMAL TECH] SKIPPING {tech} - No capex data available")
+                logger.info(lambda: f"[OPTIMAL TECH] SKIPPING {tech} - No capex data available")
                 continue
 
             # BOF requires smelter furnace (for pig iron production)
@@ -2455,13 +2551,13 @@ class FurnaceGroup:
             original_capex = capex_dict[tech]
             capex = calculate_capex_with_subsidies(original_capex, capex_subsidies)
 
-            logger.debug(f"[OPTIMAL TECH] Base capex for {tech}: ${original_capex:,.2f}")
+            logger.debug(lambda: f"[OPTIMAL TECH] Base capex for {tech}: ${original_capex:,.2f}")
             logger.debug(
-                f"[OPTIMAL TECH] Capex after subsidies: ${capex:.2f}, Reduction: ${original_capex - capex:.2f}"
+                lambda: f"[OPTIMAL TECH] Capex after subsidies: ${capex:.2f}, Reduction: ${original_capex - capex:.2f}"
             )
-            logger.debug(f"[OPTIMAL TECH] Capex subsidies: {capex_subsidies}")
-            logger.debug(f"[OPTIMAL TECH] Debt subsidies: {debt_subsidies}")
-            logger.debug(f"[OPTIMAL TECH] Opex subsidies: {opex_subsidies}")
+            logger.debug(lambda: f"[OPTIMAL TECH] Capex subsidies: {capex_subsidies}")
+            logger.debug(lambda: f"[OPTIMAL TECH] Debt subsidies: {debt_subsidies}")
+            logger.debug(lambda: f"[OPTIMAL TECH] Opex subsidies: {opex_subsidies}")
 
             # === STAGE 7: Branch Based on Current vs New Technology ==========
             if tech == self.technology.name:  # Renovate current technology (brownfield)
@@ -2477,13 +2573,13 @@ class FurnaceGroup:
                 util_rate = self.utilization_rate
                 secondary_output_adj = self.cost_adjustments_from_secondary_outputs
                 logger.debug(
-                    f"[OPTIMAL TECH] {tech} brownfield secondary output adjustment: ${secondary_output_adj:,.4f}/t"
+                    lambda: f"[OPTIMAL TECH] {tech} brownfield secondary output adjustment: ${secondary_output_adj:,.4f}/t"
                 )
 
                 # Validate BOM structure before proceeding
                 if not bill_of_materials or "materials" not in bill_of_materials or "energy" not in bill_of_materials:
-                    logger.warning(f"[OPTIMAL TECH] SKIPPING {tech} - Invalid or missing BOM structure")
-                    logger.warning(f"Invalid or missing BOM for current technology {tech}, skipping")
+                    logger.warning(lambda: f"[OPTIMAL TECH] SKIPPING {tech} - Invalid or missing BOM structure")
+                    logger.warning(lambda: f"Invalid or missing BOM for current technology {tech}, skipping")
                     continue
 
                 # Calculate carbon costs using existing emissions profile
@@ -2495,26 +2591,26 @@ class FurnaceGroup:
                     end_year=self.lifetime.current + self.lifetime.plant_lifetime,
                 )
 
-                logger.debug(f"[OPTIMAL TECH] Evaluating CURRENT technology {tech} as brownfield renovation")
+                logger.debug(lambda: f"[OPTIMAL TECH] Evaluating CURRENT technology {tech} as brownfield renovation")
                 logger.debug(
-                    f"[OPTIMAL TECH] Capex renovation share adjustment - Share: {capex_renovation_share_for_tech:.2%}, Adjusted: ${capex:,.2f}"
+                    lambda: f"[OPTIMAL TECH] Capex renovation share adjustment - Share: {capex_renovation_share_for_tech:.2%}, Adjusted: ${capex:,.2f}"
                 )
-                logger.debug(f"[OPTIMAL TECH] Using existing BOM and utilization rate: {util_rate:.2%}")
-                logger.debug(f"[OPTIMAL TECH] BOM for {tech}: {bill_of_materials}")
+                logger.debug(lambda: f"[OPTIMAL TECH] Using existing BOM and utilization rate: {util_rate:.2%}")
+                logger.debug(lambda: f"[OPTIMAL TECH] BOM for {tech}: {bill_of_materials}")
                 logger.debug(
                     "[OPTIMAL TECH] Carbon costs calculated for plant lifetime horizon using existing emissions"
                 )
 
             else:  # Switch to a new technology (greenfield)
                 # ========== BRANCH B: Greenfield Installation (New Technology) ==========
-                if self.energy_costs_no_subsidy:
+                if self.energy_costs_no_subsidy and logger.isEnabledFor(logging.DEBUG):
                     diffs = []
                     for carrier, original in self.energy_costs_no_subsidy.items():
                         current = self.energy_costs.get(carrier, original)
                         if current != original:
                             diffs.append(f"{carrier} ${original:.4f}->${current:.4f}")
                     if diffs:
-                        logger.debug(f"[OPTIMAL TECH] {tech} using subsidised energy: {', '.join(diffs)}")
+                        logger.debug(lambda: f"[OPTIMAL TECH] {tech} using subsidised energy: {', '.join(diffs)}")
 
                 # Fetch average BOM for the new technology from historical data
                 chosen_reductant = most_common_reductant_by_tech.get(tech)
@@ -2523,8 +2619,8 @@ class FurnaceGroup:
 
                 # Skip if BOM retrieval failed
                 if bill_of_materials_opt is None:
-                    logger.warning(f"[OPTIMAL TECH] SKIPPING {tech} - Could not retrieve BOM from averages")
-                    logger.warning(f"Could not get bill of materials for technology {tech}, skipping")
+                    logger.warning(lambda: f"[OPTIMAL TECH] SKIPPING {tech} - Could not retrieve BOM from averages")
+                    logger.warning(lambda: f"Could not get bill of materials for technology {tech}, skipping")
                     continue
 
                 bill_of_materials = bill_of_materials_opt
@@ -2546,7 +2642,7 @@ class FurnaceGroup:
                     disposal_cost_outputs=self.disposal_cost_outputs,
                 )
                 logger.debug(
-                    f"[OPTIMAL TECH] {tech} greenfield secondary output adjustment: ${secondary_output_adj:,.4f}/t"
+                    lambda: f"[OPTIMAL TECH] {tech} greenfield secondary output adjustment: ${secondary_output_adj:,.4f}/t"
                 )
 
                 # Calculate emissions profile for new technology
@@ -2565,19 +2661,19 @@ class FurnaceGroup:
                     end_year=self.lifetime.current + construction_time + self.lifetime.plant_lifetime,
                 )
 
-                logger.debug(f"[OPTIMAL TECH] Evaluating NEW technology {tech} as greenfield installation")
-                logger.debug(f"[OPTIMAL TECH] Full greenfield capex: ${capex:,.2f}")
+                logger.debug(lambda: f"[OPTIMAL TECH] Evaluating NEW technology {tech} as greenfield installation")
+                logger.debug(lambda: f"[OPTIMAL TECH] Full greenfield capex: ${capex:,.2f}")
                 logger.debug(
-                    f"[OPTIMAL TECH] Fetching average BOM for {tech} with capacity {self.capacity * T_TO_KT:.2f} kt"
+                    lambda: f"[OPTIMAL TECH] Fetching average BOM for {tech} with capacity {self.capacity * T_TO_KT:.2f} kt"
                 )
                 logger.debug(
-                    f"[OPTIMAL TECH] Retrieved BOM successfully - Utilization: {util_rate:.2%}, Reductant: {reductant}"
+                    lambda: f"[OPTIMAL TECH] Retrieved BOM successfully - Utilization: {util_rate:.2%}, Reductant: {reductant}"
                 )
-                logger.debug(f"[OPTIMAL TECH] Found {len(tech_business_cases)} business cases for {tech}")
-                logger.debug(f"[OPTIMAL TECH] Business cases: {tech_business_cases}")
-                logger.debug(f"[OPTIMAL TECH] Matched {len(matched_business_cases)} business cases with BOM")
-                logger.debug(f"[OPTIMAL TECH] Matched business cases: {matched_business_cases}")
-                logger.debug(f"[OPTIMAL TECH] Calculated emissions for {len(bom_emissions)} boundaries")
+                logger.debug(lambda: f"[OPTIMAL TECH] Found {len(tech_business_cases)} business cases for {tech}")
+                logger.debug(lambda: f"[OPTIMAL TECH] Business cases: {tech_business_cases}")
+                logger.debug(lambda: f"[OPTIMAL TECH] Matched {len(matched_business_cases)} business cases with BOM")
+                logger.debug(lambda: f"[OPTIMAL TECH] Matched business cases: {matched_business_cases}")
+                logger.debug(lambda: f"[OPTIMAL TECH] Calculated emissions for {len(bom_emissions)} boundaries")
                 logger.debug("[OPTIMAL TECH] Calculated carbon costs for new technology over plant lifetime")
 
             # ========== STAGE 8: Calculate NPV for Technology ==========
@@ -2588,7 +2684,9 @@ class FurnaceGroup:
                 # Validate and retrieve product price series for this technology
                 product_type = tech_to_product[tech]
                 if not product_type or product_type not in market_price_series:
-                    logger.debug(f"[OPTIMAL TECH] SKIPPING {tech} - Invalid or missing product type: {product_type}")
+                    logger.debug(
+                        lambda: f"[OPTIMAL TECH] SKIPPING {tech} - Invalid or missing product type: {product_type}"
+                    )
                     continue
                 product_price_series = market_price_series[product_type]
 
@@ -2636,33 +2734,35 @@ class FurnaceGroup:
                     secondary_output_adjustment=secondary_output_adj,
                 )
 
-                logger.debug(f"[OPTIMAL TECH] Proceeding with NPV calculation for {tech}")
+                logger.debug(lambda: f"[OPTIMAL TECH] Proceeding with NPV calculation for {tech}")
+                logger.debug(
+                    lambda: f"[OPTIMAL TECH] Product type: {product_type}, Market price series ($/t): {product_price_series}"
+                )
+                logger.debug(lambda: f"[OPTIMAL TECH] Unit FOPEX for {tech}: ${unit_fopex:,.2f}")
                 logger.debug(
-                    f"[OPTIMAL TECH] Product type: {product_type}, Market price series ($/t): {product_price_series}"
+                    lambda: f"[OPTIMAL TECH] Operating subsidies calculated for {self.lifetime.plant_lifetime} years"
                 )
-                logger.debug(f"[OPTIMAL TECH] Unit FOPEX for {tech}: ${unit_fopex:,.2f}")
-                logger.debug(f"[OPTIMAL TECH] Operating subsidies calculated for {self.lifetime.plant_lifetime} years")
                 logger.debug(
-                    f"[OPTIMAL TECH] Cost of debt for {tech}: {original_cost_of_debt:.1%} -> {cost_of_debt:.1%} (after subsidies)"
+                    lambda: f"[OPTIMAL TECH] Cost of debt for {tech}: {original_cost_of_debt:.1%} -> {cost_of_debt:.1%} (after subsidies)"
                 )
                 logger.debug("[OPTIMAL TECH] Calculating NPV with parameters:")
-                logger.debug(f"[OPTIMAL TECH]   - Technology: {tech}")
+                logger.debug(lambda: f"[OPTIMAL TECH]   - Technology: {tech}")
                 logger.debug(
-                    f"[OPTIMAL TECH]   - Capex per tonne: ${capex:,.2f} (before subsidy: ${original_capex:,.2f})"
+                    lambda: f"[OPTIMAL TECH]   - Capex per tonne: ${capex:,.2f} (before subsidy: ${original_capex:,.2f})"
                 )
                 logger.debug(
-                    f"[OPTIMAL TECH]   - Total opex per tonne: {unit_total_opex_list} (before subsidy: ${unit_total_opex:,.2f})"
+                    lambda: f"[OPTIMAL TECH]   - Total opex per tonne: {unit_total_opex_list} (before subsidy: ${unit_total_opex:,.2f})"
                 )
-                logger.debug(f"[OPTIMAL TECH]   - Capacity: {self.capacity:.2f} t")
-                logger.debug(f"[OPTIMAL TECH]   - Utilization rate: {util_rate:.2%}")
-                logger.debug(f"[OPTIMAL TECH]   - Price series ($/t): {product_price_series}")
-                logger.debug(f"[OPTIMAL TECH]   - Lifetime: {self.lifetime.plant_lifetime} years")
+                logger.debug(lambda: f"[OPTIMAL TECH]   - Capacity: {self.capacity:.2f} t")
+                logger.debug(lambda: f"[OPTIMAL TECH]   - Utilization rate: {util_rate:.2%}")
+                logger.debug(lambda: f"[OPTIMAL TECH]   - Price series ($/t): {product_price_series}")
+                logger.debug(lambda: f"[OPTIMAL TECH]   - Lifetime: {self.lifetime.plant_lifetime} years")
                 logger.debug(
-                    f"[OPTIMAL TECH]   - Cost of debt: {cost_of_debt:.2%} (before subsidy: {original_cost_of_debt:.2%})"
+                    lambda: f"[OPTIMAL TECH]   - Cost of debt: {cost_of_debt:.2%} (before subsidy: {original_cost_of_debt:.2%})"
                 )
-                logger.debug(f"[OPTIMAL TECH]   - Cost of equity: {cost_of_equity:.2%}")
-                logger.debug(f"[OPTIMAL TECH]   - Equity share: {self.equity_share:.2%}")
-                logger.debug(f"[OPTIMAL TECH] Raw NPV for {tech}: ${npv_dict[tech]:,.2f}")
+                logger.debug(lambda: f"[OPTIMAL TECH]   - Cost of equity: {cost_of_equity:.2%}")
+                logger.debug(lambda: f"[OPTIMAL TECH]   - Equity share: {self.equity_share:.2%}")
+                logger.debug(lambda: f"[OPTIMAL TECH] Raw NPV for {tech}: ${npv_dict[tech]:,.2f}")
 
                 # ========== STAGE 9: Adjust NPV for COSA (Technology Switches Only) ==========
                 # Subtract COSA penalty only when switching to a different technology
@@ -2670,15 +2770,15 @@ class FurnaceGroup:
                     original_npv = npv_dict[tech]
                     npv_dict[tech] -= cosa
                     logger.debug(
-                        f"[OPTIMAL TECH] COSA adjustment for {tech} - "
+                        lambda: f"[OPTIMAL TECH] COSA adjustment for {tech} - "
                         f"Original NPV: ${original_npv:,.2f}, COSA: ${cosa:,.2f}, Adjusted NPV: ${npv_dict[tech]:,.2f}"
                     )
                     logger.debug(
-                        f"[OPTIMAL TECH] Technology switch {self.technology.name} -> {tech} "
+                        lambda: f"[OPTIMAL TECH] Technology switch {self.technology.name} -> {tech} "
                         f"is {'PROFITABLE' if npv_dict[tech] > 0 else 'UNPROFITABLE'} after COSA"
                     )
                 else:
-                    logger.debug(f"[OPTIMAL TECH] No COSA adjustment for current technology {tech}")
+                    logger.debug(lambda: f"[OPTIMAL TECH] No COSA adjustment for current technology {tech}")
             else:
                 # Skip NPV calculation - log reasons
                 reasons = []
@@ -2689,24 +2789,28 @@ class FurnaceGroup:
                 if current_year is None:
                     reasons.append("current_year is None")
 
-                logger.debug(f"[OPTIMAL TECH] SKIPPING NPV calculation for {tech} - Reasons: {', '.join(reasons)}")
+                logger.debug(
+                    lambda: f"[OPTIMAL TECH] SKIPPING NPV calculation for {tech} - Reasons: {', '.join(reasons)}"
+                )
 
         # ========== STAGE 10: Return Results ==========
         # Log final evaluation summary
         if npv_dict:
             best_tech = max(npv_dict, key=lambda k: npv_dict[k])
             logger.debug("[OPTIMAL TECH] ===== Evaluation Complete =====")
-            logger.debug(f"[OPTIMAL TECH] Technologies evaluated: {list(npv_dict.keys())}")
-            logger.debug(f"[OPTIMAL TECH] Best technology by NPV: {best_tech} with NPV: ${npv_dict[best_tech]:,.2f}")
+            logger.debug(lambda: f"[OPTIMAL TECH] Technologies evaluated: {list(npv_dict.keys())}")
+            logger.debug(
+                lambda: f"[OPTIMAL TECH] Best technology by NPV: {best_tech} with NPV: ${npv_dict[best_tech]:,.2f}"
+            )
             if cosa:
-                logger.debug(f"[OPTIMAL TECH] COSA calculated: ${cosa:,.2f}")
+                logger.debug(lambda: f"[OPTIMAL TECH] COSA calculated: ${cosa:,.2f}")
             else:
                 logger.debug("[OPTIMAL TECH] COSA is None")
         else:
             logger.debug("[OPTIMAL TECH] ===== Evaluation Complete =====")
             logger.debug("[OPTIMAL TECH] No viable technology transitions found")
             if cosa:
-                logger.debug(f"[OPTIMAL TECH] COSA calculated: ${cosa:,.2f}")
+                logger.debug(lambda: f"[OPTIMAL TECH] COSA calculated: ${cosa:,.2f}")
             else:
                 logger.debug("[OPTIMAL TECH] COSA is None")
 
@@ -3213,6 +3317,22 @@ class FurnaceGroup:
             )
 
 
+@dataclass(frozen=True)
+class TechnologyOptions:
+    """Result of ``FurnaceGroup.optimal_technology_name`` tagged with the transitions it was computed for.
+
+    Lets the NPV evaluation of a furnace group strategy run ahead of time (e.g. in a worker process, see
+    ``PlantAgentsModel``); ``Plant.evaluate_furnace_group_strategy`` reuses it only when its own CO2-gated
+    transitions are the same.
+    """
+
+    transitions: tuple[str, ...] | None  # Allowed transitions from the current technology (None = none defined)
+    npv: dict[str, float]
+    capex: dict[str, float]
+    cosa: float | None
+    bom: dict[str, dict[str, dict[str, dict[str, float]]]]
+
+
 class Plant:
     def __init__(
         self,
@@ -3719,6 +3839,7 @@ class Plant:
             )
         )
 
+    @hot_path
     def evaluate_furnace_group_strategy(
         self,
         furnace_group_id: str,
@@ -3753,6 +3874,7 @@ class Plant:
         get_co2_headroom: Callable[[str, int, float], float] | None = None,
         get_co2_need_by_name: Callable[[str, float, str], float] | None = None,
         co2_storage_diagnostics: Callable[[str, int], tuple[float, float, float]] | None = None,
+        technology_options: dict[str, TechnologyOptions] | None = None,
     ) -> commands.Command | None:
         """
         Evaluate the economic strategy for a furnace group using NPV-based decision making.
@@ -3809,6 +3931,9 @@ class Plant:
             tech_capex_subsidies: Capital subsidies by technology {tech_name: [Subsidy]}
             tech_opex_subsidies: Operating subsidies by technology {tech_name: [Subsidy]}
             tech_debt_subsidies: Debt subsidies by technology {tech_name: [Subsidy]}
+            technology_options: Technology NPVs by furnace group ID, computed ahead of time. An entry is reused in
+                STAGE 4 when it was computed for the same CO2-gated transitions; otherwise the NPVs are computed and the
+                entry is (re)written.
 
         Returns:
             Command object (ChangeFurnaceGroupTechnology for switches, RenovateFurnaceGroup for renovations,
@@ -3819,7 +3944,7 @@ class Plant:
             renovation or technology switch is approved. No mutation of plant-level
             state.
         """
-        logger = logging.getLogger(f"{__name__}.evaluate_furnace_group_strategy")
+        logger = get_logger(f"{__name__}.evaluate_furnace_group_strategy")
         furnace_group = self.get_furnace_group(furnace_group_id)
 
         active_energy_subs = {
@@ -3827,29 +3952,29 @@ class Plant:
             for k, v in furnace_group.applied_subsidies.items()
             if k not in ("capex", "opex", "debt", "cost of debt") and v
         }
-        if active_energy_subs:
+        if active_energy_subs and logger.isEnabledFor(logging.DEBUG):
             diffs = []
             for carrier in sorted(active_energy_subs):
                 no_sub = furnace_group.energy_costs_no_subsidy.get(carrier, 0)
                 with_sub = furnace_group.energy_costs.get(carrier, 0)
                 diffs.append(f"{carrier} ${no_sub:.4f}->${with_sub:.4f}")
-            logger.debug(f"[FG STRATEGY] FG:{furnace_group_id} {self.location.iso3} | {', '.join(diffs)}")
+            logger.debug(lambda: f"[FG STRATEGY] FG:{furnace_group_id} {self.location.iso3} | {', '.join(diffs)}")
 
         # Log initial state for debugging
-        logger.debug(f"[FG STRATEGY] ========== Starting evaluation for FG {furnace_group_id} ==========")
-        logger.debug(f"[FG STRATEGY]   - Current year: {current_year}")
-        logger.debug(f"[FG STRATEGY]   - Current tech: {furnace_group.technology.name}")
-        logger.debug(f"[FG STRATEGY]   - Capacity: {furnace_group.capacity * T_TO_KT:,.0f} kt")
-        logger.debug(f"[FG STRATEGY]   - Status: {furnace_group.status}")
-        logger.debug(f"[FG STRATEGY]   - FG balance: ${furnace_group.balance:,.2f}")
-        logger.debug(f"[FG STRATEGY]   - Historic balance: ${furnace_group.historic_balance:,.2f}")
-        logger.debug(f"[FG STRATEGY]   - Plant group balance: ${plant_group.balance:,.2f}")
-        logger.debug(f"[FG STRATEGY]   - Location: {self.location.iso3}")
+        logger.debug(lambda: f"[FG STRATEGY] ========== Starting evaluation for FG {furnace_group_id} ==========")
+        logger.debug(lambda: f"[FG STRATEGY]   - Current year: {current_year}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Current tech: {furnace_group.technology.name}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Capacity: {furnace_group.capacity * T_TO_KT:,.0f} kt")
+        logger.debug(lambda: f"[FG STRATEGY]   - Status: {furnace_group.status}")
+        logger.debug(lambda: f"[FG STRATEGY]   - FG balance: ${furnace_group.balance:,.2f}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Historic balance: ${furnace_group.historic_balance:,.2f}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Plant group balance: ${plant_group.balance:,.2f}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Location: {self.location.iso3}")
 
         # ===== STAGE 1: Check furnace group status =====
         # Skip if already scheduled for retirement
         if furnace_group.status.lower() == "operating pre-retirement":
-            logger.debug(f"[FG STRATEGY] DECISION - No action (FG status: {furnace_group.status})")
+            logger.debug(lambda: f"[FG STRATEGY] DECISION - No action (FG status: {furnace_group.status})")
             return None
 
         # ===== STAGE 2: Check for forced closure =====
@@ -3860,14 +3985,14 @@ class Plant:
 
         closure_threshold = current_capex_per_tonne * furnace_group.capacity
         logger.debug("[FG STRATEGY] Closure threshold check:")
-        logger.debug(f"[FG STRATEGY]   - CAPEX: ${current_capex_per_tonne:,.2f}/t")
-        logger.debug(f"[FG STRATEGY]   - FG capacity: {furnace_group.capacity * T_TO_KT:,.2f} kt")
-        logger.debug(f"[FG STRATEGY]   - Closure threshold (CAPEX × capacity): ${-closure_threshold:,.2f}")
-        logger.debug(f"[FG STRATEGY]   - Historic balance: ${furnace_group.historic_balance:,.2f}")
+        logger.debug(lambda: f"[FG STRATEGY]   - CAPEX: ${current_capex_per_tonne:,.2f}/t")
+        logger.debug(lambda: f"[FG STRATEGY]   - FG capacity: {furnace_group.capacity * T_TO_KT:,.2f} kt")
+        logger.debug(lambda: f"[FG STRATEGY]   - Closure threshold (CAPEX × capacity): ${-closure_threshold:,.2f}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Historic balance: ${furnace_group.historic_balance:,.2f}")
 
         if furnace_group.historic_balance < -closure_threshold:
             logger.info(
-                f"[FG STRATEGY] DECISION - CLOSE FG (historic losses ${furnace_group.historic_balance:,.2f} "
+                lambda: f"[FG STRATEGY] DECISION - CLOSE FG (historic losses ${furnace_group.historic_balance:,.2f} "
                 f"exceed threshold ${-closure_threshold:,.2f})"
             )
             return commands.CloseFurnaceGroup(plant_id=self.plant_id, furnace_group_id=furnace_group.furnace_group_id)
@@ -3902,7 +4027,7 @@ class Plant:
         if dropped_ccs_techs and co2_storage_diagnostics is not None:
             _firm, _reserved, limit = co2_storage_diagnostics(self.location.iso3, lookup_year)
             logger.info(
-                f"[CO2 GATE] gate=P2 iso3={self.location.iso3} year={int(current_year)} "
+                lambda: f"[CO2 GATE] gate=P2 iso3={self.location.iso3} year={int(current_year)} "
                 f"lookup_year={lookup_year} fg_id={furnace_group_id} plant_id={self.plant_id} "
                 f"headroom={headroom:.0f} limit={limit:.0f} "
                 f"dropped_ccs_techs={','.join(sorted(dropped_ccs_techs))} "
@@ -3910,44 +4035,55 @@ class Plant:
             )
 
         logger.debug(
-            f"[FG STRATEGY] Allowed transitions from {furnace_group.technology.name}: "
+            lambda: f"[FG STRATEGY] Allowed transitions from {furnace_group.technology.name}: "
             f"{filtered_allowed_furnace_transitions.get(furnace_group.technology.name)}"
         )
 
         # ===== STAGE 4: Calculate NPV for all technology options =====
         logger.debug("[FG STRATEGY] === Calculating NPV for all technology options ===")
-        logger.debug(f"[FG STRATEGY] Fixed opex for technologies: {self.technology_unit_fopex}")
-        tech_npv_dict, npv_capex_dict, cosa, bom_dict = furnace_group.optimal_technology_name(
-            market_price_series=market_price_series,
-            cost_of_debt=cost_of_debt,
-            cost_of_equity=cost_of_equity,
-            get_bom_from_avg_boms=get_bom_from_avg_boms,
-            allowed_furnace_transitions=filtered_allowed_furnace_transitions,
-            capex_dict=region_capex,
-            capex_renovation_share=capex_renovation_share,
-            technology_fopex_dict=self.technology_unit_fopex,
-            carbon_cost_series=self.carbon_cost_series,
-            dynamic_business_cases=dynamic_business_cases,
-            tech_capex_subsidies=tech_capex_subsidies,
-            tech_opex_subsidies=tech_opex_subsidies,
-            current_year=current_year,
-            chosen_emissions_boundary_for_carbon_costs=chosen_emissions_boundary_for_carbon_costs,
-            technology_emission_factors=technology_emission_factors,
-            tech_to_product=tech_to_product,
-            plant_lifetime=plant_lifetime,
-            construction_time=construction_time,
-            tech_debt_subsidies=tech_debt_subsidies,
-            risk_free_rate=risk_free_rate,
-            most_common_reductant_by_tech=most_common_reductant_by_tech,
-        )
+        logger.debug(lambda: f"[FG STRATEGY] Fixed opex for technologies: {self.technology_unit_fopex}")
+        current_transitions = filtered_allowed_furnace_transitions.get(furnace_group.technology.name)
+        transitions = tuple(current_transitions) if current_transitions is not None else None
+        options = technology_options.get(furnace_group_id) if technology_options is not None else None
+        if options is not None and options.transitions == transitions:
+            logger.debug(lambda: f"[FG STRATEGY] Reusing precomputed technology NPVs for FG {furnace_group_id}")
+            tech_npv_dict, npv_capex_dict, cosa, bom_dict = options.npv, options.capex, options.cosa, options.bom
+        else:
+            tech_npv_dict, npv_capex_dict, cosa, bom_dict = furnace_group.optimal_technology_name(
+                market_price_series=market_price_series,
+                cost_of_debt=cost_of_debt,
+                cost_of_equity=cost_of_equity,
+                get_bom_from_avg_boms=get_bom_from_avg_boms,
+                allowed_furnace_transitions=filtered_allowed_furnace_transitions,
+                capex_dict=region_capex,
+                capex_renovation_share=capex_renovation_share,
+                technology_fopex_dict=self.technology_unit_fopex,
+                carbon_cost_series=self.carbon_cost_series,
+                dynamic_business_cases=dynamic_business_cases,
+                tech_capex_subsidies=tech_capex_subsidies,
+                tech_opex_subsidies=tech_opex_subsidies,
+                current_year=current_year,
+                chosen_emissions_boundary_for_carbon_costs=chosen_emissions_boundary_for_carbon_costs,
+                technology_emission_factors=technology_emission_factors,
+                tech_to_product=tech_to_product,
+                plant_lifetime=plant_lifetime,
+                construction_time=construction_time,
+                tech_debt_subsidies=tech_debt_subsidies,
+                risk_free_rate=risk_free_rate,
+                most_common_reductant_by_tech=most_common_reductant_by_tech,
+            )
+            if technology_options is not None:
+                technology_options[furnace_group_id] = TechnologyOptions(
+                    transitions, tech_npv_dict, npv_capex_dict, cosa, bom_dict
+                )
 
         # Log NPV calculation results
         cosa_msg = f"${cosa:,.2f}" if cosa else "None"
         logger.debug("[FG STRATEGY] NPV results by tech (COSA adjusted):")
         for tech, npv in tech_npv_dict.items():
-            logger.debug(f"[FG STRATEGY]   {tech}: NPV = ${npv:,.2f}")
-        logger.debug(f"[FG STRATEGY] CAPEX by tech ($/t): {npv_capex_dict}")
-        logger.debug(f"[FG STRATEGY] COSA: {cosa_msg}")
+            logger.debug(lambda: f"[FG STRATEGY]   {tech}: NPV = ${npv:,.2f}")
+        logger.debug(lambda: f"[FG STRATEGY] CAPEX by tech ($/t): {npv_capex_dict}")
+        logger.debug(lambda: f"[FG STRATEGY] COSA: {cosa_msg}")
 
         def renovate_or_close_expired() -> commands.Command:
             """Resolve an expired lifetime when no switch happens: renovate or close.
@@ -3961,7 +4097,7 @@ class Plant:
             incumbent_npv = tech_npv_dict.get(incumbent)
             if incumbent_npv is None or not math.isfinite(incumbent_npv) or incumbent_npv <= 0:
                 logger.info(
-                    f"[FG STRATEGY] DECISION - CLOSE FG plant_id={self.plant_id} "
+                    lambda: f"[FG STRATEGY] DECISION - CLOSE FG plant_id={self.plant_id} "
                     f"plant_group_id={plant_group.plant_group_id} "
                     f"(lifetime expired, incumbent {incumbent} NPV not positive: {incumbent_npv})"
                 )
@@ -3990,13 +4126,13 @@ class Plant:
 
             renovate_cost = renovation_capex_per_tonne * furnace_group.capacity * furnace_group.equity_share
             logger.info(
-                f"[FG STRATEGY] plant_id={self.plant_id} plant_group_id={plant_group.plant_group_id} "
+                lambda: f"[FG STRATEGY] plant_id={self.plant_id} plant_group_id={plant_group.plant_group_id} "
                 f"renovate_cost=${renovate_cost:,.2f} balance=${plant_group.balance:,.2f} "
                 f"headroom=${plant_group.balance - renovate_cost:,.2f}"
             )
             if renovate_cost > plant_group.balance:
                 logger.info(
-                    f"[FG STRATEGY] DECISION - CLOSE FG plant_id={self.plant_id} "
+                    lambda: f"[FG STRATEGY] DECISION - CLOSE FG plant_id={self.plant_id} "
                     f"plant_group_id={plant_group.plant_group_id} gate_pass=False "
                     f"(cannot afford renovation: ${renovate_cost:,.2f} > "
                     f"group balance ${plant_group.balance:,.2f})"
@@ -4008,7 +4144,7 @@ class Plant:
             # Debit the group treasury via the single-site capex mutation
             plant_group.deduct_equity(renovate_cost, reason="renovation")
             logger.info(
-                f"[FG STRATEGY] DECISION - RENOVATE {incumbent} plant_id={self.plant_id} "
+                lambda: f"[FG STRATEGY] DECISION - RENOVATE {incumbent} plant_id={self.plant_id} "
                 f"plant_group_id={plant_group.plant_group_id} gate_pass=True "
                 f"(cost: ${renovate_cost:,.2f}, new group balance: ${plant_group.balance:,.2f})"
             )
@@ -4025,7 +4161,7 @@ class Plant:
 
         # ===== STAGE 5: Check if any technology option is profitable =====
         best_npv = max(tech_npv_dict.values(), default=0)
-        logger.debug(f"[FG STRATEGY] Best NPV across all options: ${best_npv:,.2f}")
+        logger.debug(lambda: f"[FG STRATEGY] Best NPV across all options: ${best_npv:,.2f}")
 
         if best_npv <= 0:
             if furnace_group.lifetime.expired:
@@ -4040,7 +4176,7 @@ class Plant:
         is_current_best = current_tech == optimal_tech
 
         logger.debug(
-            f"[FG STRATEGY] Current tech: {current_tech}, Optimal tech: {optimal_tech}, "
+            lambda: f"[FG STRATEGY] Current tech: {current_tech}, Optimal tech: {optimal_tech}, "
             f"Current is best: {is_current_best}"
         )
 
@@ -4053,10 +4189,10 @@ class Plant:
             valid_techs = {
                 k: v for k, v in tech_npv_dict.items() if v is not None and not math.isinf(v) and not math.isnan(v)
             }
-            logger.debug(f"[FG STRATEGY] Valid technology options: {list(valid_techs.keys())}")
+            logger.debug(lambda: f"[FG STRATEGY] Valid technology options: {list(valid_techs.keys())}")
 
             if not valid_techs:
-                logger.warning(f"[FG STRATEGY] No valid NPV values found for plant {self.plant_id}")
+                logger.warning(lambda: f"[FG STRATEGY] No valid NPV values found for plant {self.plant_id}")
                 if furnace_group.lifetime.expired:
                     return renovate_or_close_expired()
                 return None
@@ -4064,7 +4200,7 @@ class Plant:
             # Weighted random selection based on NPV (negative NPVs get zero weight)
             weights = [max(v, 0) for v in valid_techs.values()]
             formatted_dict = {k: f"{v:,.0f}" for k, v in zip(valid_techs.keys(), weights)}
-            logger.debug(f"[FG STRATEGY] Selection weights: {formatted_dict}")
+            logger.debug(lambda: f"[FG STRATEGY] Selection weights: {formatted_dict}")
 
             if sum(weights) < 0.0001:
                 if furnace_group.lifetime.expired:
@@ -4072,7 +4208,7 @@ class Plant:
                 return None
 
             best_tech = random.choices(population=list(valid_techs.keys()), weights=weights, k=1)[0]
-            logger.debug(f"[FG STRATEGY] Selected technology: {best_tech} (weighted random)")
+            logger.debug(lambda: f"[FG STRATEGY] Selected technology: {best_tech} (weighted random)")
         else:
             logger.debug("[FG STRATEGY] Current technology is already optimal")
             best_tech = current_tech
@@ -4080,7 +4216,7 @@ class Plant:
         # Final profitability check for selected technology
         if tech_npv_dict[best_tech] <= 0:
             logger.debug(
-                f"[FG STRATEGY] DECISION - No action "
+                lambda: f"[FG STRATEGY] DECISION - No action "
                 f"(selected tech {best_tech} has NPV ${tech_npv_dict[best_tech]:,.2f} <= 0)"
             )
             return None
@@ -4112,12 +4248,12 @@ class Plant:
                 f"years {subsidy.start_year}-{subsidy.end_year}"
             )
 
-        logger.debug(f"[FG STRATEGY] Filtering subsidies for year {current_year}:")
-        logger.debug(f"[FG STRATEGY]   - Total CAPEX subsidies available: {len(all_capex_subs)}")
-        logger.debug(f"[FG STRATEGY]   - Active CAPEX subsidies: {len(capex_subs)}")
-        logger.debug(f"[FG STRATEGY]   - Total debt subsidies available: {len(all_debt_subs)}")
-        logger.debug(f"[FG STRATEGY]   - Active debt subsidies: {len(debt_subs)}")
-        logger.debug(f"[FG STRATEGY]   - Technology: {best_tech}")
+        logger.debug(lambda: f"[FG STRATEGY] Filtering subsidies for year {current_year}:")
+        logger.debug(lambda: f"[FG STRATEGY]   - Total CAPEX subsidies available: {len(all_capex_subs)}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Active CAPEX subsidies: {len(capex_subs)}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Total debt subsidies available: {len(all_debt_subs)}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Active debt subsidies: {len(debt_subs)}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Technology: {best_tech}")
         if subsidy_details:
             for detail in subsidy_details:
                 logger.debug(detail)
@@ -4138,13 +4274,13 @@ class Plant:
                 return renovate_or_close_expired()
             else:
                 logger.debug(
-                    f"[FG STRATEGY] DECISION - No action "
+                    lambda: f"[FG STRATEGY] DECISION - No action "
                     f"(current tech optimal, lifetime not expired: {furnace_group.lifetime.remaining_number_of_years} years left)"
                 )
                 return None
 
         # ===== STAGE 9: Handle technology switch scenario =====
-        logger.debug(f"[FG STRATEGY] Evaluating technology switch from {current_tech} to {best_tech}")
+        logger.debug(lambda: f"[FG STRATEGY] Evaluating technology switch from {current_tech} to {best_tech}")
 
         # Get subsidized greenfield CAPEX per tonne
         capex_per_tonne_opt = npv_capex_dict.get(best_tech)
@@ -4156,12 +4292,12 @@ class Plant:
         switch_cost = capex_per_tonne * furnace_group.capacity * furnace_group.equity_share
 
         logger.debug("[FG STRATEGY] Switch cost calculation:")
-        logger.debug(f"[FG STRATEGY]   - Subsidized CAPEX: ${capex_per_tonne:,.2f}/t")
-        logger.debug(f"[FG STRATEGY]   - Capacity: {furnace_group.capacity * T_TO_KT:,.0f} kt")
-        logger.debug(f"[FG STRATEGY]   - Equity share: {furnace_group.equity_share:.1%}")
-        logger.debug(f"[FG STRATEGY]   - Total cost: ${switch_cost:,.2f}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Subsidized CAPEX: ${capex_per_tonne:,.2f}/t")
+        logger.debug(lambda: f"[FG STRATEGY]   - Capacity: {furnace_group.capacity * T_TO_KT:,.0f} kt")
+        logger.debug(lambda: f"[FG STRATEGY]   - Equity share: {furnace_group.equity_share:.1%}")
+        logger.debug(lambda: f"[FG STRATEGY]   - Total cost: ${switch_cost:,.2f}")
         logger.info(
-            f"[FG STRATEGY] plant_id={self.plant_id} plant_group_id={plant_group.plant_group_id} "
+            lambda: f"[FG STRATEGY] plant_id={self.plant_id} plant_group_id={plant_group.plant_group_id} "
             f"switch_cost=${switch_cost:,.2f} balance=${plant_group.balance:,.2f} "
             f"headroom=${plant_group.balance - switch_cost:,.2f}"
         )
@@ -4169,7 +4305,7 @@ class Plant:
         # Check affordability against group treasury
         if switch_cost > plant_group.balance:
             logger.debug(
-                f"[FG STRATEGY] Cannot afford switch plant_id={self.plant_id} "
+                lambda: f"[FG STRATEGY] Cannot afford switch plant_id={self.plant_id} "
                 f"plant_group_id={plant_group.plant_group_id} gate_pass=False "
                 f"(${switch_cost:,.2f} > group balance ${plant_group.balance:,.2f})"
             )
@@ -4185,8 +4321,8 @@ class Plant:
         if probabilistic_agents:
             accept_prob = math.exp(-switch_cost / tech_npv_dict[best_tech])
             logger.debug("[FG STRATEGY] Probabilistic decision mode:")
-            logger.debug(f"[FG STRATEGY]   - Acceptance probability: {accept_prob:.2%}")
-            logger.debug(f"[FG STRATEGY]   - Cost/NPV ratio: {switch_cost / tech_npv_dict[best_tech]:.2f}")
+            logger.debug(lambda: f"[FG STRATEGY]   - Acceptance probability: {accept_prob:.2%}")
+            logger.debug(lambda: f"[FG STRATEGY]   - Cost/NPV ratio: {switch_cost / tech_npv_dict[best_tech]:.2f}")
         else:
             accept_prob = 1.0
             logger.debug("[FG STRATEGY] Deterministic decision mode (100% acceptance)")
@@ -4220,20 +4356,20 @@ class Plant:
                     raise ValueError(f"Unknown product type: '{tech_product}' for technology: '{best_tech}'")
 
                 logger.debug("[FG STRATEGY] CAPACITY LIMIT check:")
-                logger.debug(f"[FG STRATEGY]   - Product: {tech_product}")
-                logger.debug(f"[FG STRATEGY]   - New plants: {new_plant_capacity * T_TO_KT:,.0f} kt")
+                logger.debug(lambda: f"[FG STRATEGY]   - Product: {tech_product}")
+                logger.debug(lambda: f"[FG STRATEGY]   - New plants: {new_plant_capacity * T_TO_KT:,.0f} kt")
                 logger.debug(
-                    f"[FG STRATEGY]   - Expansions/switches so far: {expansion_and_switch_capacity * T_TO_KT:,.0f} kt"
+                    lambda: f"[FG STRATEGY]   - Expansions/switches so far: {expansion_and_switch_capacity * T_TO_KT:,.0f} kt"
                 )
-                logger.debug(f"[FG STRATEGY]   - To add (switch): {furnace_group.capacity * T_TO_KT:,.0f} kt")
+                logger.debug(lambda: f"[FG STRATEGY]   - To add (switch): {furnace_group.capacity * T_TO_KT:,.0f} kt")
                 logger.debug(
-                    f"[FG STRATEGY]   - Total after: {(expansion_and_switch_capacity + furnace_group.capacity) * T_TO_KT:,.0f} kt"
+                    lambda: f"[FG STRATEGY]   - Total after: {(expansion_and_switch_capacity + furnace_group.capacity) * T_TO_KT:,.0f} kt"
                 )
-                logger.debug(f"[FG STRATEGY]   - Expansion/switch limit: {expansion_limit * T_TO_KT:,.0f} kt")
+                logger.debug(lambda: f"[FG STRATEGY]   - Expansion/switch limit: {expansion_limit * T_TO_KT:,.0f} kt")
 
                 if expansion_and_switch_capacity + furnace_group.capacity > expansion_limit:
                     logger.warning(
-                        f"[FG STRATEGY] BLOCKED - Expansion/switch capacity limit reached for {tech_product}: "
+                        lambda: f"[FG STRATEGY] BLOCKED - Expansion/switch capacity limit reached for {tech_product}: "
                         f"{expansion_and_switch_capacity * T_TO_KT:,.0f} kt + {furnace_group.capacity * T_TO_KT:,.0f} kt > "
                         f"{expansion_limit * T_TO_KT:,.0f} kt"
                     )
@@ -4245,7 +4381,7 @@ class Plant:
             # Debit group treasury and return command
             plant_group.deduct_equity(switch_cost, reason="switch")
             logger.info(
-                f"[FG STRATEGY] DECISION - SWITCH TECHNOLOGY {current_tech} → {best_tech} "
+                lambda: f"[FG STRATEGY] DECISION - SWITCH TECHNOLOGY {current_tech} → {best_tech} "
                 f"plant_id={self.plant_id} plant_group_id={plant_group.plant_group_id} gate_pass=True "
                 f"(NPV: ${tech_npv_dict.get(best_tech, 0):,.2f}, cost: ${switch_cost:,.2f}, "
                 f"new group balance: ${plant_group.balance:,.2f})"
@@ -4306,9 +4442,9 @@ class Plant:
                 else f"probabilistic rejection ({random_draw:.2%} >= {accept_prob:.2%})"
             )
             if furnace_group.lifetime.expired:
-                logger.debug(f"[FG STRATEGY] Switch not taken ({rejection_reason}), lifetime expired")
+                logger.debug(lambda: f"[FG STRATEGY] Switch not taken ({rejection_reason}), lifetime expired")
                 return renovate_or_close_expired()
-            logger.debug(f"[FG STRATEGY] DECISION - No action ({rejection_reason})")
+            logger.debug(lambda: f"[FG STRATEGY] DECISION - No action ({rejection_reason})")
             return None
 
     def generate_new_furnace(
@@ -5094,6 +5230,7 @@ class PlantGroup:
         get_co2_headroom: Callable[[str, int, float], float] | None = None,
         get_co2_need_by_name: Callable[[str, float, str], float] | None = None,
         co2_storage_diagnostics: Callable[[str, int], tuple[float, float, float]] | None = None,
+        expansion_npvs: dict[tuple[str, str], float | None] | None = None,
     ) -> dict[str, tuple[float | None, str, float]]:
         """
         Calculate NPV and optimal technology choice for all plants in the group considering allowed technologies and
@@ -5134,6 +5271,9 @@ class PlantGroup:
             capex_subsidies (dict[str, dict[str, list[Subsidy]]]): CAPEX subsidies by ISO3, technology, and subsidy
             opex_subsidies (dict[str, dict[str, list[Subsidy]]]): OPEX subsidies by ISO3, technology, and subsidy
             debt_subsidies (dict[str, dict[str, list[Subsidy]]]): Debt subsidies by ISO3, technology, and subsidy
+            expansion_npvs (dict[tuple[str, str], float | None] | None): NPVs by (plant ID, technology) computed
+                ahead of time and reused instead of recomputed; missing entries are computed and added. ``None``
+                values mark options skipped for lack of BOM or price data
 
         Returns:
             dict[str, tuple[float | None, str, float]]: Dictionary mapping plant IDs to tuples of (NPV, best_technology,
@@ -5225,6 +5365,16 @@ class PlantGroup:
                             dropped_ccs_techs.add(tech)
                             continue
 
+                # Reuse an NPV computed ahead of time; None marks an option skipped for lack of BOM or price data
+                npv_key = (plant.plant_id, tech)
+                if expansion_npvs is not None and npv_key in expansion_npvs:
+                    precomputed_npv = expansion_npvs[npv_key]
+                    if precomputed_npv is not None:
+                        NPV[tech] = precomputed_npv
+                    continue
+                if expansion_npvs is not None:
+                    expansion_npvs[npv_key] = None
+
                 # Get bill of materials for this technology
                 if get_bom_from_avg_boms is None:
                     continue
@@ -5248,10 +5398,6 @@ class PlantGroup:
                 )
 
                 # Apply subsidies (filter to only active ones in current year)
-                from steelo.domain.calculate_costs import (
-                    filter_subsidies_for_year,
-                    collect_active_subsidies_over_period,
-                )
 
                 # CAPEX subsidies
                 all_capex_subsidies = capex_subsidies.get(plant.location.iso3, {}).get(tech, [])
@@ -5346,6 +5492,8 @@ class PlantGroup:
                     carbon_costs=carbon_cost_list,
                     secondary_output_adjustment=secondary_output_adj,
                 )
+                if expansion_npvs is not None:
+                    expansion_npvs[npv_key] = NPV[tech]
 
             if dropped_ccs_techs and co2_storage_diagnostics is not None:
                 lookup_year = int(current_year) + construction_time
@@ -5381,6 +5529,7 @@ class PlantGroup:
 
         return NPV_p
 
+    @hot_path
     def evaluate_expansion(
         self,
         price_series: dict[str, list[float]],
@@ -5414,6 +5563,7 @@ class PlantGroup:
         get_co2_headroom: Callable[[str, int, float], float] | None = None,
         get_co2_need_by_name: Callable[[str, float, str], float] | None = None,
         co2_storage_diagnostics: Callable[[str, int], tuple[float, float, float]] | None = None,
+        expansion_npvs: dict[tuple[str, str], float | None] | None = None,
     ) -> commands.Command | None:
         """
         Evaluate and execute the most profitable furnace expansion across all plants in the plant group.
@@ -5462,6 +5612,8 @@ class PlantGroup:
             capex_subsidies (dict[str, dict[str, list[Subsidy]]]): CAPEX subsidies by ISO3, technology, and subsidy
             opex_subsidies (dict[str, dict[str, list[Subsidy]]]): OPEX subsidies by ISO3, technology, and subsidy
             debt_subsidies (dict[str, dict[str, list[Subsidy]]]): Debt subsidies by ISO3, technology, and subsidy
+            expansion_npvs (dict[tuple[str, str], float | None] | None): Passed on to
+                ``evaluate_expansion_options``
 
         Returns:
             commands.Command | None: AddFurnaceGroup command if expansion is approved, None otherwise.
@@ -5478,11 +5630,11 @@ class PlantGroup:
         - Capacity limits distinguish between new plants and expansions/switches
         - All subsidies are filtered to only include those active in the current year
         """
-        logger = logging.getLogger(f"{__name__}.PlantGroup.evaluate_expansion")
+        logger = get_logger(f"{__name__}.PlantGroup.evaluate_expansion")
 
         # ========== STAGE 1: INITIALIZATION ==========
         logger.debug(
-            f"[PG EXPANSION] {self.plant_group_id}: "
+            lambda: f"[PG EXPANSION] {self.plant_group_id}: "
             f"balance=${self.balance:,.2f}, plants={len(self.plants)}, year={current_year}"
         )
 
@@ -5514,6 +5666,7 @@ class PlantGroup:
             get_co2_headroom=get_co2_headroom,
             get_co2_need_by_name=get_co2_need_by_name,
             co2_storage_diagnostics=co2_storage_diagnostics,
+            expansion_npvs=expansion_npvs,
         )
 
         # ========== STAGE 3: CHECK IF ANY EXPANSION OPTIONS EXIST ==========
@@ -5522,22 +5675,22 @@ class PlantGroup:
             return None
 
         # Log all expansion options found
-        logger.debug(f"[PG EXPANSION] Found {len(expansion_options)} options:")
+        logger.debug(lambda: f"[PG EXPANSION] Found {len(expansion_options)} options:")
         for pid, (npv, tech, capex) in expansion_options.items():
             npv_str = "None" if npv is None else f"${npv:,.0f}"
-            logger.debug(f"[PG EXPANSION]   {pid}: {tech} NPV={npv_str} CAPEX=${capex:.2f}/t")
+            logger.debug(lambda: f"[PG EXPANSION]   {pid}: {tech} NPV={npv_str} CAPEX=${capex:.2f}/t")
 
         # ========== STAGE 4: SELECT HIGHEST NPV OPTION ==========
         highest_plant_and_tech = max(expansion_options.items(), key=lambda item: item[1][0] or float("-inf"))
         plant_id, (npv, tech, capex) = highest_plant_and_tech
 
         npv_str = "None" if npv is None else f"{npv:,.0f}"
-        logger.debug(f"[PG EXPANSION] Best: {plant_id} {tech} NPV=${npv_str} CAPEX=${capex:,.2f}/t")
+        logger.debug(lambda: f"[PG EXPANSION] Best: {plant_id} {tech} NPV=${npv_str} CAPEX=${capex:,.2f}/t")
 
         # ========== STAGE 5: CHECK NPV PROFITABILITY ==========
         if npv is None or npv <= 0:
             logger.debug(
-                f"[PG EXPANSION] DECISION - No expansion (NPV {'is None' if npv is None else f'= ${npv:,.0f} ≤ 0'})"
+                lambda: f"[PG EXPANSION] DECISION - No expansion (NPV {'is None' if npv is None else f'= ${npv:,.0f} ≤ 0'})"
             )
             return None
 
@@ -5548,7 +5701,7 @@ class PlantGroup:
 
         if self.balance < equity_needed:
             logger.debug(
-                f"[PG EXPANSION] DECISION - No expansion (insufficient funds: "
+                lambda: f"[PG EXPANSION] DECISION - No expansion (insufficient funds: "
                 f"${self.balance:,.2f} < ${equity_needed:,.2f})"
             )
             return None
@@ -5579,7 +5732,7 @@ class PlantGroup:
 
         if not accepted:
             logger.debug(
-                f"[PG EXPANSION] DECISION - No expansion (probabilistic rejection: "
+                lambda: f"[PG EXPANSION] DECISION - No expansion (probabilistic rejection: "
                 f"draw={random_draw:.4f} >= prob={acceptance_probability:.2%})"
             )
             return None
@@ -5608,15 +5761,15 @@ class PlantGroup:
             # Check if expansion would exceed limit
             if expansion_and_switch_capacity + capacity > expansion_limit:
                 logger.warning("[PG EXPANSION] === Stage 8: Capacity limit EXCEEDED ===")
-                logger.warning(f"[PG EXPANSION]   - Product: {expansion_product}")
+                logger.warning(lambda: f"[PG EXPANSION]   - Product: {expansion_product}")
                 logger.warning(
-                    f"[PG EXPANSION]   - Current expansion/switch capacity: {expansion_and_switch_capacity * T_TO_KT:,.0f} kt"
+                    lambda: f"[PG EXPANSION]   - Current expansion/switch capacity: {expansion_and_switch_capacity * T_TO_KT:,.0f} kt"
                 )
-                logger.warning(f"[PG EXPANSION]   - New expansion capacity: {capacity * T_TO_KT:,.0f} kt")
+                logger.warning(lambda: f"[PG EXPANSION]   - New expansion capacity: {capacity * T_TO_KT:,.0f} kt")
                 logger.warning(
-                    f"[PG EXPANSION]   - Total after expansion: {(expansion_and_switch_capacity + capacity) * T_TO_KT:,.0f} kt"
+                    lambda: f"[PG EXPANSION]   - Total after expansion: {(expansion_and_switch_capacity + capacity) * T_TO_KT:,.0f} kt"
                 )
-                logger.warning(f"[PG EXPANSION]   - Limit: {expansion_limit * T_TO_KT:,.0f} kt")
+                logger.warning(lambda: f"[PG EXPANSION]   - Limit: {expansion_limit * T_TO_KT:,.0f} kt")
                 logger.warning("[PG EXPANSION]   - DECISION - No expansion (capacity limit reached)")
                 return None
 
@@ -5635,16 +5788,16 @@ class PlantGroup:
         # Find the plant and validate location
         plant = next((p for p in self.plants if p.plant_id == plant_id), None)
         if plant is None:
-            logger.warning(f"[PG EXPANSION] ERROR - Plant {plant_id} not found in plant group")
+            logger.warning(lambda: f"[PG EXPANSION] ERROR - Plant {plant_id} not found in plant group")
             return None
 
         if plant.location.iso3 is None:
-            logger.warning(f"[PG EXPANSION] ERROR - Plant {plant_id} has no ISO3 location")
+            logger.warning(lambda: f"[PG EXPANSION] ERROR - Plant {plant_id} has no ISO3 location")
             return None
 
         region = iso3_to_region_map.get(plant.location.iso3)
         if region is None:
-            logger.warning(f"[PG EXPANSION] ERROR - No region mapping for ISO3: {plant.location.iso3}")
+            logger.warning(lambda: f"[PG EXPANSION] ERROR - No region mapping for ISO3: {plant.location.iso3}")
             return None
 
         # Get base cost of debt
@@ -5695,7 +5848,7 @@ class PlantGroup:
 
         # Safety check: ensure technology has product mapping
         if tech not in tech_to_product:
-            logger.warning(f"[PG EXPANSION] ERROR - No product mapping for technology: {tech}")
+            logger.warning(lambda: f"[PG EXPANSION] ERROR - No product mapping for technology: {tech}")
             return None
         product = tech_to_product[tech]
 
@@ -5721,12 +5874,14 @@ class PlantGroup:
             )
 
         logger.info("[PG EXPANSION] ✓ SUCCESS - Expansion approved")
-        logger.info(f"[PG EXPANSION]   - Plant: {plant_id}, Technology: {tech}, Product: {product}")
-        logger.info(f"[PG EXPANSION]   - Capacity: {capacity * T_TO_KT:,.0f} kt, NPV: ${npv:,.0f}")
-        logger.info(f"[PG EXPANSION]   - Investment: ${investment:,.0f} (equity to debit: ${equity_needed:,.0f})")
-        logger.info(f"[PG EXPANSION]   - CAPEX: ${base_capex:.2f}/t → ${capex:.2f}/t (with subsidies)")
+        logger.info(lambda: f"[PG EXPANSION]   - Plant: {plant_id}, Technology: {tech}, Product: {product}")
+        logger.info(lambda: f"[PG EXPANSION]   - Capacity: {capacity * T_TO_KT:,.0f} kt, NPV: ${npv:,.0f}")
+        logger.info(
+            lambda: f"[PG EXPANSION]   - Investment: ${investment:,.0f} (equity to debit: ${equity_needed:,.0f})"
+        )
+        logger.info(lambda: f"[PG EXPANSION]   - CAPEX: ${base_capex:.2f}/t → ${capex:.2f}/t (with subsidies)")
         logger.info(
-            f"[PG EXPANSION]   - Cost of debt: {cost_of_debt_original:.2%} → {cost_of_debt:.2%} (with subsidies)"
+            lambda: f"[PG EXPANSION]   - Cost of debt: {cost_of_debt_original:.2%} → {cost_of_debt:.2%} (with subsidies)"
         )
 
         # if subsidy_details:
@@ -7004,6 +7159,14 @@ class VirginIronDemand:
         return [self._demand_by_year.get(Year(y), 0.0) for y in range(start_year, end_year + 1)]
 
 
+def _index_process_centers_by_name(process_centers: list) -> dict:
+    """Name → ProcessCenter index; the first process center wins on duplicate names, like a linear scan."""
+    index: dict = {}
+    for pc in process_centers:
+        index.setdefault(pc.name, pc)
+    return index
+
+
 class Environment:
     """
     Class to track system environment, e.g. the collective macro-scale of the system
@@ -7083,13 +7246,12 @@ class Environment:
         # Initialize input costs as empty dict
         self.input_costs: dict[str | None, dict[Year, dict[str, float]]] = {}
         # Initialize cost curves as empty dicts
-        self.cost_curve: dict[str, list[dict[str, float]]] = {"steel": [], "iron": []}
-        self.future_cost_curve: dict[str, list[dict[str, float]]] = {"steel": [], "iron": []}
+        self.cost_curve: dict[str, CostCurve] = {"steel": CostCurve(), "iron": CostCurve()}
+        self.future_cost_curve: dict[str, CostCurve] = {"steel": CostCurve(), "iron": CostCurve()}
 
-        # Performance optimization: Distance cache for trade LP
-        # Persists across years to avoid recomputation
-        self._distance_cache: dict[tuple[str, str], float] = {}
-        self._distance_cache_stats = {"hits": 0, "misses": 0, "computations": 0}
+        # Performance optimization: Distance matrix for trade LP and clustering, keyed by location coordinates.
+        # Persists across years (and across runs, see distance_matrix_dir) to avoid recomputation
+        self._distance_matrix: DistanceMatrix | None = None
 
         # Global technology restrictions - now handled via allowed_techs system
         self.aggregated_metallic_charge_constraints: list[AggregatedMetallicChargeConstraint] = []
@@ -7101,7 +7263,11 @@ class Environment:
 
         # LP warm-starting support (OPT-2) - store previous year's solution for faster convergence
         self.previous_lp_solution: dict[tuple[str, str, str], float] | None = None
+        # Persistent trade LP (config.persistent_trade_lp) - HiGHS instance reused and updated across years
+        self.persistent_lp_solver: PersistentHighsSolver | None = None
         self.geo_paths: Optional[GeoDataPaths] = None
+        # GEO layers kept across years; only layers whose inputs changed are recomputed
+        self.geo_layer_pipeline: GeoLayerPipeline | None = None
 
         self.transport_emissions: list[TransportKPI] = []
         # Initialize fallback material costs as empty list
@@ -7968,6 +8134,20 @@ class Environment:
         """
         Generate a dict representation of the costs for all furnace_groups
         """
+        assets = self._cost_entries(world_furnace_groups, lag, environment_most_common_reductant)
+        if lag == 0:
+            self.cost_dict = assets
+        elif lag > 0:
+            self.future_cost_dict = assets
+        return assets
+
+    def _cost_entries(
+        self,
+        world_furnace_groups: list[FurnaceGroup],
+        lag: int = 0,
+        environment_most_common_reductant: dict[str, str] = {},
+    ) -> dict[str, dict[str, dict[str, float]]]:
+        """Capacity and unit cost of production per product and furnace group, without storing them."""
         logger = logging.getLogger(f"{__name__}.Environment._generate_cost_dict")
         from .calculate_costs import calculate_variable_opex
 
@@ -7989,8 +8169,6 @@ class Environment:
                     "capacity": self.config.capacity_limit * fg.capacity,
                     "unit_cost_of_production": unit_cost,
                 }
-            # Sort by unit cost of production
-            self.cost_dict = assets
             return assets
         elif lag > 0:
             for fg in world_furnace_groups:
@@ -8020,24 +8198,21 @@ class Environment:
                         "capacity": self.config.capacity_limit * fg.capacity,
                         "unit_cost_of_production": unit_cost,
                     }
-            self.future_cost_dict = future_assets
             return future_assets
         else:
             # Default case for invalid lag values
             return assets
 
-    def generate_cost_curve(
-        self, world_furnace_groups: list[FurnaceGroup], lag: int
-    ) -> dict[str, list[dict[str, float]]]:
+    def generate_cost_curve(self, world_furnace_groups: list[FurnaceGroup], lag: int) -> dict[str, CostCurve]:
         """
         Generate a cost curve based on the unit cost of production for furnace groups.
 
-        1) Generates and sorts the internal cost dictionary by the unit cost of production,
-        2) Computes a cumulative production capacity and associates it with the corresponding production cost.
+        1) Generates the internal cost dictionary (capacity and unit cost of production per furnace group),
+        2) Sorts it by unit cost into a ``CostCurve`` with the cumulative production capacity of each entry.
 
 
         Returns:
-            list[dict]: A list of dictionaries representing the cost curve. Each dictionary has keys:
+            dict[str, CostCurve]: The cost curve per product. Each curve is a sequence of dicts with keys:
                 - "cumulative_capacity" (float): The cumulative production capacity.
                 - "production_cost" (float): The unit cost of production at that cumulative capacity.
 
@@ -8049,23 +8224,12 @@ class Environment:
         )
         cost_dict = self.cost_dict if lag == 0 else self.future_cost_dict
         for product, product_cost_dict in cost_dict.items():
-            sorted_product_costs = dict(
-                sorted(product_cost_dict.items(), key=lambda item: item[1]["unit_cost_of_production"])
+            cost_curve[product] = CostCurve(
+                unit_costs=[values["unit_cost_of_production"] for values in product_cost_dict.values()],
+                capacities=[values["capacity"] for values in product_cost_dict.values()],
+                furnace_group_ids=product_cost_dict.keys(),
             )
 
-            # Sort by unit cost of production
-            # Generate cost curve
-            cumulative_production: float = 0
-            curve = []
-            for fg_id, values in sorted_product_costs.items():
-                cap = values["capacity"]
-                cost = values["unit_cost_of_production"]
-
-                cumulative_production += cap
-
-                curve.append({"cumulative_capacity": cumulative_production, "production_cost": cost})
-            cost_curve[product] = curve
-
         if lag > 0:
             self.future_cost_curve = cost_curve
         else:
@@ -8088,44 +8252,59 @@ class Environment:
 
         """
         self.generate_cost_curve(
-            [
-                fg
-                for fg in world_furnace_groups
-                if isinstance(fg.technology.product, str)
-                and fg.technology.product.lower() in product_type
-                and fg.status in self.config.active_statuses
-            ],
+            [fg for fg in world_furnace_groups if self._on_cost_curve(fg, product_type)],
             lag=lag,
         )
 
-    @staticmethod
-    def _truncate_curve(
-        curve_entries: list[dict[str, float]], share: float
-    ) -> tuple[list[dict[str, float]], dict[str, float] | None]:
+    def _on_cost_curve(self, fg: FurnaceGroup, product_type=["steel", "iron"]) -> bool:
+        return (
+            isinstance(fg.technology.product, str)
+            and fg.technology.product.lower() in product_type
+            and fg.status in self.config.active_statuses
+        )
+
+    def update_cost_curve_entry(self, furnace_group_id: str, fg: FurnaceGroup | None, lag: int) -> bool:
         """
-        Apply the market-clearing-share cutoff to an ascending-cost curve.
+        Insert, update or remove the cost curve entry of a single furnace group.
 
-        Strict-inequality (Option A): keep entries with ``cumulative_capacity <= share * total``.
-        The boundary furnace (first to strictly exceed the threshold) is excluded along with everything
-        above it. At ``share = 1.0`` the last entry's cumulative equals total, so all entries are kept
-        and behaviour is byte-identical to no truncation.
+        Used when only this furnace group changed status or cost (closure, renovation, technology switch, new
+        capacity), instead of regenerating the whole curve from every plant. The entry is computed exactly as in
+        ``generate_cost_curve`` and ``update_cost_curve``, and the cost dictionary is kept in sync.
 
         Args:
-            curve_entries: Cost-curve entries sorted ascending by production_cost (each with
-                ``cumulative_capacity`` and ``production_cost`` keys).
-            share: Fraction of total cumulative capacity that participates in market clearing.
+            furnace_group_id: ID of the furnace group that changed.
+            fg: The furnace group, or None if it no longer exists (its entries are removed).
+            lag: 0 for the current cost curve, > 0 for the future cost curve.
 
         Returns:
-            ``(truncated_prefix, last_full_entry)``. ``last_full_entry`` is ``None`` iff
-            ``curve_entries`` is empty; otherwise it is the highest-cost entry of the full curve and
-            is used as the reference for the empty-truncated fallback.
+            False if the curve was never generated (nothing was updated; generate it in full instead).
         """
-        if not curve_entries:
-            return [], None
-        last_full = curve_entries[-1]
-        threshold = share * last_full["cumulative_capacity"]
-        truncated = [e for e in curve_entries if e["cumulative_capacity"] <= threshold]
-        return truncated, last_full
+        cost_dict = getattr(self, "cost_dict" if lag == 0 else "future_cost_dict", None)
+        if cost_dict is None:
+            return False
+        cost_curve = self.cost_curve if lag == 0 else self.future_cost_curve
+
+        entries: dict[str, dict[str, dict[str, float]]] = {}
+        if fg is not None and (lag > 0 or self._on_cost_curve(fg)):
+            entries = self._cost_entries([fg], lag, self.most_common_reductant_by_tech)
+        for product in ("steel", "iron"):
+            curve = cost_curve[product] = CostCurve.coerce(cost_curve.get(product, []))
+            entry = entries.get(product, {}).get(furnace_group_id)
+            if entry is None:
+                cost_dict.get(product, {}).pop(furnace_group_id, None)
+                curve.discard(furnace_group_id)
+            else:
+                cost_dict.setdefault(product, {})[furnace_group_id] = entry
+                curve.upsert(furnace_group_id, entry["unit_cost_of_production"], entry["capacity"])
+        return True
+
+    def _clearing_parameters(self, product: str) -> tuple[float, float]:
+        """Market-clearing share and shortage price buffer of ``product``."""
+        if product == "steel":
+            return self.config.steel_market_clearing_share, self.config.steel_price_buffer
+        elif product == "iron":
+            return self.config.iron_market_clearing_share, self.config.iron_price_buffer
+        raise KeyError(f"Unsupported product {product!r}; expected 'steel' or 'iron'.")
 
     def extract_price_from_costcurve(self, demand: float, product: str, future: bool = False) -> float:
         """
@@ -8184,30 +8363,21 @@ class Environment:
             logger.warning(f"Empty cost curve for {product}. Returning default price.")
             return 100.0
 
-        if product == "steel":
-            share = self.config.steel_market_clearing_share
-            buffer = self.config.steel_price_buffer
-        elif product == "iron":
-            share = self.config.iron_market_clearing_share
-            buffer = self.config.iron_price_buffer
-        else:
-            raise KeyError(f"Unsupported product {product!r}; expected 'steel' or 'iron'.")
-
-        truncated, last_full = self._truncate_curve(cost_curve[product], share)
-        # `last_full` is non-None here because the empty-curve case returned 100.0 above.
-        assert last_full is not None
-        total = last_full["cumulative_capacity"]
+        share, buffer = self._clearing_parameters(product)
+        curve = CostCurve.coerce(cost_curve[product])
+        total = curve.total_capacity
         threshold = share * total
+        dispatchable = curve.dispatchable_count(share)
 
-        if not truncated:
+        if dispatchable == 0:
             logger.warning(
                 f"Empty truncated {product} curve at share={share} in the {year}; degrading to full-curve merit-order."
             )
             # Degenerate share — fall back to legacy full-curve merit-order with no premium.
-            truncated = list(cost_curve[product])
+            dispatchable = len(curve)
             threshold = total
 
-        last_truncated = truncated[-1]
+        last_truncated = curve[dispatchable - 1]
 
         if last_truncated["production_cost"] == float("inf"):
             logger.error(f"[COST CURVE]: Infinite production cost for {product}.")
@@ -8224,64 +8394,15 @@ class Environment:
             )
             base_price = last_truncated["production_cost"] + buffer
         else:
-            # Walk full curve so the boundary furnace is reachable when demand lands inside it.
-            for entry in cost_curve[product]:
-                if entry["cumulative_capacity"] >= demand:
-                    base_price = entry["production_cost"]
-                    break
-            else:
-                # Unreachable: demand <= threshold <= total, and the full curve ends at total.
-                raise ValueError(
-                    f"Unreachable: walked the {product} curve without finding an entry meeting demand={demand}."
-                )
+            # Binary search on the full curve so the boundary furnace is reachable when demand lands inside it.
+            base_price = float(curve.merit_order_prices(demand))
 
         if product == "iron" and not future and self.config.peg_iron_to_steel_price:
-            steel_demand = self.current_demand
-            steel_share = self.config.steel_market_clearing_share
-            steel_buffer = self.config.steel_price_buffer
-            steel_truncated, steel_last_full = self._truncate_curve(cost_curve.get("steel", []), steel_share)
-
-            if steel_last_full is None:
+            steel_price = self._pegging_steel_price(cost_curve, year)
+            if steel_price is None:
                 # No steel curve — preserve legacy behaviour (no pegging applied).
                 return base_price
 
-            steel_total = steel_last_full["cumulative_capacity"]
-            steel_threshold = steel_share * steel_total
-
-            if not steel_truncated:
-                logger.warning(
-                    f"Empty truncated steel curve for iron pegging at share={steel_share} in {year}; "
-                    f"degrading to full-curve merit-order for pegging reference."
-                )
-                steel_truncated = list(cost_curve["steel"])
-                steel_threshold = steel_total
-
-            last_steel_truncated = steel_truncated[-1]
-            if steel_demand > steel_threshold:
-                regime = (
-                    "exceeds total"
-                    if steel_demand > steel_total
-                    else f"in shortage band (above dispatchable {steel_share:.0%})"
-                )
-                logger.warning(
-                    f"[PEGGING] Steel reference {regime} in {year}: "
-                    f"steel_demand={steel_demand * T_TO_KT:,.0f}kt → boundary "
-                    f"{last_steel_truncated['production_cost']:.1f} +${steel_buffer:.0f}"
-                )
-                steel_price = last_steel_truncated["production_cost"] + steel_buffer
-            else:
-                # Walk full steel curve so the boundary furnace is reachable when steel_demand lands inside it.
-                for entry in cost_curve["steel"]:
-                    if entry["cumulative_capacity"] >= steel_demand:
-                        steel_price = entry["production_cost"]
-                        break
-                else:
-                    # Unreachable: steel_demand <= steel_threshold <= steel_total.
-                    raise ValueError(
-                        f"Unreachable: walked the steel curve without finding an entry "
-                        f"meeting steel_demand={steel_demand}."
-                    )
-
             ratio = self.config.iron_to_steel_price_ratio
             pegged_price = steel_price * ratio
             final_price = max(base_price, pegged_price)
@@ -8296,6 +8417,90 @@ class Environment:
 
         return base_price
 
+    def extract_prices_from_costcurve(self, demands: Sequence[float], product: str, future: bool = False) -> np.ndarray:
+        """
+        Vectorised ``extract_price_from_costcurve``: the market-clearing price for many demand levels at once.
+
+        Every demand level is priced on the same curve with one binary search, instead of one curve walk per
+        demand level. Prices are identical to calling ``extract_price_from_costcurve`` per demand level, including
+        the shortage premium and the iron-to-steel price peg; shortages are logged once per call.
+
+        Args:
+            demands: Tonnes of the product demanded, e.g. one entry per future year.
+            product: ``"steel"`` or ``"iron"``.
+            future: When True, use ``self.future_cost_curve`` instead of ``self.cost_curve``.
+
+        Returns:
+            Market price in USD/tonne per demand level.
+        """
+        logger = logging.getLogger(f"{__name__}.Environment.extract_prices_from_costcurve")
+        cost_curve = self.future_cost_curve if future else self.cost_curve
+        year = "future year" if future else f"current year {self.year}"
+        demand_array = np.asarray(demands, dtype=float)
+
+        if not product:
+            raise KeyError("A product name - lower case - needs to be specified")
+        if product not in cost_curve or not cost_curve[product]:
+            logger.warning(f"Empty cost curve for {product}. Returning default price.")
+            return np.full(demand_array.shape, 100.0)
+
+        share, buffer = self._clearing_parameters(product)
+        curve = CostCurve.coerce(cost_curve[product])
+        prices = curve.clearing_prices(demand_array, share, buffer)
+        shortages = int(np.count_nonzero(demand_array > share * curve.total_capacity))
+        if shortages:
+            logger.warning(
+                f"{product.capitalize()} demand above the dispatchable {share:.0%} of capacity in {year} for "
+                f"{shortages} of {demand_array.size} demand levels: total={curve.total_capacity * T_TO_KT:,.0f}kt"
+            )
+
+        if product == "iron" and not future and self.config.peg_iron_to_steel_price:
+            steel_price = self._pegging_steel_price(cost_curve, year)
+            if steel_price is not None:
+                prices = np.maximum(prices, steel_price * self.config.iron_to_steel_price_ratio)
+        return prices
+
+    def _pegging_steel_price(self, cost_curve: dict[str, CostCurve], year: str) -> float | None:
+        """
+        Steel reference price for pegging the iron price: the steel price at the current steel demand.
+
+        Returns None if there is no steel cost curve.
+        """
+        logger = logging.getLogger(f"{__name__}.Environment.extract_price_from_costcurve")
+        if not cost_curve.get("steel"):
+            return None
+        steel_curve = CostCurve.coerce(cost_curve["steel"])
+        steel_demand = self.current_demand
+        steel_share = self.config.steel_market_clearing_share
+        steel_buffer = self.config.steel_price_buffer
+        steel_total = steel_curve.total_capacity
+        steel_threshold = steel_share * steel_total
+        dispatchable = steel_curve.dispatchable_count(steel_share)
+
+        if dispatchable == 0:
+            logger.warning(
+                f"Empty truncated steel curve for iron pegging at share={steel_share} in {year}; "
+                f"degrading to full-curve merit-order for pegging reference."
+            )
+            dispatchable = len(steel_curve)
+            steel_threshold = steel_total
+
+        last_steel_truncated = steel_curve[dispatchable - 1]
+        if steel_demand > steel_threshold:
+            regime = (
+                "exceeds total"
+                if steel_demand > steel_total
+                else f"in shortage band (above dispatchable {steel_share:.0%})"
+            )
+            logger.warning(
+                f"[PEGGING] Steel reference {regime} in {year}: "
+                f"steel_demand={steel_demand * T_TO_KT:,.0f}kt → boundary "
+                f"{last_steel_truncated['production_cost']:.1f} +${steel_buffer:.0f}"
+            )
+            return last_steel_truncated["production_cost"] + steel_buffer
+        # Binary search on the full steel curve so the boundary furnace is reachable when steel_demand lands inside it.
+        return float(steel_curve.merit_order_prices(steel_demand))
+
     def extract_global_average_feedstock_cost(self, world_furances: list[FurnaceGroup]) -> dict[str, float]:
         """
         Extract the average cost of feedstocks across all furnaces, using a weighted average cost
@@ -9601,52 +9806,77 @@ class Environment:
             # Store on the instance
             self.allowed_furnace_transitions[origin] = allowed
 
-    def get_cached_distance(self, from_pc_name: str, to_pc_name: str, process_centers: list | None = None) -> float:
+    @property
+    def distance_matrix_dir(self) -> Path | None:
+        """Directory the distance matrix is persisted in: the prepared fixtures, when the config points at them."""
+        data_dir = getattr(self.config, "data_dir", None)
+        if not isinstance(data_dir, (str, Path)):
+            return None
+        fixtures_dir = Path(data_dir) / "fixtures"
+        return fixtures_dir if fixtures_dir.is_dir() else None
+
+    @property
+    def distance_matrix(self) -> DistanceMatrix:
+        """Shared process-center distance matrix, loaded (memory-mapped) from ``distance_matrix_dir`` on first use."""
+        if self._distance_matrix is None:
+            from steelo.domain.distance_matrix import DistanceMatrix
+
+            directory = self.distance_matrix_dir
+            loaded = DistanceMatrix.load(directory) if directory is not None else None
+            self._distance_matrix = loaded if loaded is not None else DistanceMatrix()
+        return self._distance_matrix
+
+    def persist_distance_matrix(self) -> None:
+        """Save the distance matrix next to the prepared data if locations were added since it was loaded."""
+        directory = self.distance_matrix_dir
+        matrix = self._distance_matrix
+        if directory is None or matrix is None or len(matrix) == matrix.persisted_size:
+            return
+        try:
+            matrix.save(directory)
+        except OSError as error:
+            logging.getLogger(f"{__name__}.Environment").warning(f"Could not persist distance matrix: {error}")
+
+    def get_cached_distance(
+        self,
+        from_pc_name: str,
+        to_pc_name: str,
+        process_centers: list | None = None,
+        process_centers_by_name: dict | None = None,
+    ) -> float:
         """
-        Get cached distance between two process centers.
+        Get the distance between two process centers from the distance matrix.
 
         Args:
             from_pc_name: Source process center name
             to_pc_name: Destination process center name
-            process_centers: Optional list of ProcessCenter objects for fallback computation
+            process_centers: Optional list of ProcessCenter objects to resolve the names in
+            process_centers_by_name: Optional name → ProcessCenter index; preferred over ``process_centers`` so
+                names resolve in O(1)
 
         Returns:
             Distance in km, or float('inf') if not computable
         """
-        key = (from_pc_name, to_pc_name)
-
-        # Check cache first
-        if key in self._distance_cache:
-            self._distance_cache_stats["hits"] += 1
-            return self._distance_cache[key]
-
-        # Cache miss - need to compute
-        self._distance_cache_stats["misses"] += 1
-
-        if process_centers is None:
+        if process_centers_by_name is not None:
+            from_pc = process_centers_by_name.get(from_pc_name)
+            to_pc = process_centers_by_name.get(to_pc_name)
+        elif process_centers is not None:
+            from_pc = next((pc for pc in process_centers if pc.name == from_pc_name), None)
+            to_pc = next((pc for pc in process_centers if pc.name == to_pc_name), None)
+        else:
             return float("inf")  # Can't compute without data
 
-        # Find process centers (still O(n) but only on cache miss)
-        from_pc = next((pc for pc in process_centers if pc.name == from_pc_name), None)
-        to_pc = next((pc for pc in process_centers if pc.name == to_pc_name), None)
-
         if from_pc is None or to_pc is None:
-            distance = float("inf")
-        else:
-            # Use existing method that checks ISO3 cache first
-            distance = from_pc.distance_to_other_processcenter(to_pc)
-            self._distance_cache_stats["computations"] += 1
-
-        # Cache for future use
-        self._distance_cache[key] = distance
-        return distance
+            return float("inf")
+        # Same semantics as ProcessCenter.distance_to_other_processcenter (country table first, else haversine)
+        return self.distance_matrix.distance(from_pc.location, to_pc.location)
 
     def build_distance_function_for_trade_lp(self, process_centers: list):
         """
         Build a distance lookup function for TradeLPModel.
 
-        This creates a closure that captures the process_centers list
-        and can compute/cache distances as needed.
+        This creates a closure that captures the process_centers list and reads distances from the distance matrix.
+        The matrix is extended for all process centers up front, so lookups never compute distances.
 
         Args:
             process_centers: List of ProcessCenter objects for this year
@@ -9655,25 +9885,25 @@ class Environment:
             Callable[[str, str], float] that returns distances
         """
 
+        process_centers_by_name = _index_process_centers_by_name(process_centers)
+        self.distance_matrix.indices([pc.location for pc in process_centers_by_name.values()])
+
         def distance_lookup(from_pc_name: str, to_pc_name: str) -> float:
-            return self.get_cached_distance(from_pc_name, to_pc_name, process_centers)
+            return self.get_cached_distance(from_pc_name, to_pc_name, process_centers_by_name=process_centers_by_name)
 
         return distance_lookup
 
     def log_distance_cache_stats(self):
-        """Log cache performance statistics."""
+        """Log distance matrix statistics."""
         import logging
 
         logger = logging.getLogger(f"{__name__}.Environment")
 
-        stats = self._distance_cache_stats
-        total = stats["hits"] + stats["misses"]
-        if total > 0:
-            hit_rate = (stats["hits"] / total) * 100
+        matrix = self._distance_matrix
+        if matrix is not None and matrix.lookups > 0:
             logger.info(
-                f"Distance cache stats: {stats['hits']} hits, {stats['misses']} misses "
-                f"({hit_rate:.1f}% hit rate), {stats['computations']} distances computed, "
-                f"{len(self._distance_cache)} entries cached"
+                f"Distance matrix stats: {matrix.lookups} lookups, {len(matrix)} locations "
+                f"({matrix.persisted_size} loaded or saved), {matrix.computed_pairs} distances computed"
             )
 
     def precompute_distances_for_hot_metal_check(self, process_centers: list, hot_metal_radius: float) -> set:
@@ -9681,20 +9911,17 @@ class Environment:
         Precompute which PC pairs are within hot metal radius.
         Returns set of (from_name, to_name) tuples within radius.
 
-        This converts the distance check from 100,000 float comparisons
-        to 100,000 set membership checks (much faster).
+        The check is a single boolean mask over the distance matrix block of ``process_centers``.
         """
         import logging
 
         logger = logging.getLogger(f"{__name__}.Environment")
 
-        within_radius = set()
-
-        for from_pc in process_centers:
-            for to_pc in process_centers:
-                distance = self.get_cached_distance(from_pc.name, to_pc.name, process_centers=process_centers)
-                if distance <= hot_metal_radius:
-                    within_radius.add((from_pc.name, to_pc.name))
+        locations = [pc.location for pc in process_centers]
+        within = self.distance_matrix.pref_economic(locations, locations) <= hot_metal_radius
+        names = [pc.name for pc in process_centers]
+        rows, cols = within.nonzero()
+        within_radius = {(names[i], names[j]) for i, j in zip(rows.tolist(), cols.tolist())}
 
         logger.info(
             f"Pre-computed hot metal radius check: {len(within_radius)} pairs "
@@ -10128,7 +10355,7 @@ class CommodityAllocations:
         self.commodity = commodity
         self.allocations = allocations  # Nested dictionary: {Source: {Destination: Volumes}}
         self.allocation_costs = allocation_costs
-        self.cost_curve: Union[dict[str, list[dict[str, float]]], list[dict[str, Any]]] = []
+        self.cost_curve: Union[dict[str, CostCurve], dict[str, list[dict[str, float]]], list[dict[str, Any]]] = []
         self.price: float = 0.0
 
     def add_allocation(self, source: Source, destination: Destination, volume: "Volumes") -> None:
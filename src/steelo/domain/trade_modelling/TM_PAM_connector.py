@@ -1627,6 +1627,8 @@ class TM_PAM_connector:
                     entry["unit_cost"] = carrier_cost / new_production if new_production > 0 else 0.0
                     entry["product_volume"] = new_production
 
+            # The BOM entries were rescaled in place
+            fg.invalidate_cost_cache()
             corrected += 1
 
         if corrected:
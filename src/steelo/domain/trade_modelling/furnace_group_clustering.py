@@ -15,20 +15,26 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 import logging
-import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
 
 from steelo.domain.models import Location, Plant, FurnaceGroup, PrimaryFeedstock, Volumes
 from steelo.domain.constants import T_TO_KT
 from steelo.utilities.utils import normalize_name
 from steelo.utilities.data_processing import normalize_product_name
-from steelo.adapters.geospatial.geospatial_toolbox import haversine_distance
+from steelo.adapters.geospatial.geospatial_toolbox import haversine_distance, haversine_matrix
+from steelo.domain.trade_modelling.transport_lp import TransportBlock, solve_transport_blocks
+from steelo.logging_config import get_logger, hot_path
+from steelo.utilities.tracing import traced
 
 if TYPE_CHECKING:
     from steelo.simulation import SimulationConfig
     from steelo.adapters.repositories.in_memory_repository import PlantInMemoryRepository
     from steelo.domain.trade_modelling.trade_lp_modelling import Allocations, Process, ProcessCenter
+    from steelo.domain.distance_matrix import DistanceMatrix
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 # Commodity substitution mappings: cold (distant) → hot (close)
 # These are the same product in different thermal/transport states
@@ -42,6 +48,12 @@ COLD_TO_HOT_COMMODITY = {
 # Reverse mapping: hot (close) → cold (distant) for relabeling flows that exceed the radius
 HOT_TO_COLD_COMMODITY = {hot: cold for cold, hot in COLD_TO_HOT_COMMODITY.items()}
 
+# Cost ($/t) of a hot-metal-radius-violating edge in the disaggregation transportation problems: far above any
+# real allocation cost, so these edges only carry flow when no in-radius route exists
+INFEASIBLE_EDGE_COST = 1e7
+# Supplies, demands and flows (t) at or below this volume are treated as zero in the transportation problems
+MIN_TRANSPORT_VOLUME = 1e-6
+
 
 def _substitute_commodity_by_distance(
     commodity,
@@ -533,6 +545,8 @@ def calculate_center_of_gravity(furnace_groups_with_plants: list[tuple[FurnaceGr
     )
 
 
+@hot_path
+@traced()
 def cluster_furnace_groups(
     plants: list[Plant],
     config: "SimulationConfig",
@@ -615,7 +629,7 @@ def cluster_furnace_groups(
                     if not has_in_country_access:
                         filtered_bofs_no_hot_metal += 1
                         logger.debug(
-                            f"[CLUSTERING] Filtering BOF FG {fg.furnace_group_id} "
+                            lambda: f"[CLUSTERING] Filtering BOF FG {fg.furnace_group_id} "
                             f"(plant {plant.plant_id}, {iso3}): no active BF/ESF/SR "
                             f"in same country within {config.hot_metal_radius:.0f} km"
                         )
@@ -624,11 +638,11 @@ def cluster_furnace_groups(
 
     if filtered_bofs_no_hot_metal > 0:
         logger.warning(
-            f"[CLUSTERING] Filtered out {filtered_bofs_no_hot_metal} BOF furnace group(s) "
+            lambda: f"[CLUSTERING] Filtered out {filtered_bofs_no_hot_metal} BOF furnace group(s) "
             f"without in-country hot-metal access within {config.hot_metal_radius:.0f} km"
         )
 
-    logger.info(f"[CLUSTERING] Found {len(active_fgs)} active furnace groups to cluster")
+    logger.info(lambda: f"[CLUSTERING] Found {len(active_fgs)} active furnace groups to cluster")
 
     # Step 2: Group by cluster key (including feedstock configuration)
     clusters: dict[ClusterKey, list[tuple[FurnaceGroup, Plant]]] = {}
@@ -662,7 +676,7 @@ def cluster_furnace_groups(
         clusters[cluster_key].append((fg, plant))
 
     logger.info(
-        f"[CLUSTERING] Created {len(clusters)} unique clusters "
+        lambda: f"[CLUSTERING] Created {len(clusters)} unique clusters "
         f"({n_plant_group_keyed} FGs keyed by plant_group, {n_iso3_keyed} by iso3)"
     )
 
@@ -683,7 +697,7 @@ def cluster_furnace_groups(
             else:
                 total_filtered_fgs += 1
                 logger.debug(
-                    f"[CLUSTERING] Filtered out FG {fg.furnace_group_id} with no effective_primary_feedstocks. "
+                    lambda: f"[CLUSTERING] Filtered out FG {fg.furnace_group_id} with no effective_primary_feedstocks. "
                     f"Tech: {fg.technology.name}, Capacity: {fg.capacity}"
                 )
 
@@ -698,7 +712,7 @@ def cluster_furnace_groups(
 
     if total_filtered_fgs > 0:
         logger.warning(
-            f"[CLUSTERING] Filtered out {total_filtered_fgs} FGs without effective_primary_feedstocks. "
+            lambda: f"[CLUSTERING] Filtered out {total_filtered_fgs} FGs without effective_primary_feedstocks. "
             f"These FGs will not participate in the LP."
         )
     else:
@@ -732,7 +746,7 @@ def cluster_furnace_groups(
             if abs(total_eff_cap - total_phys_cap) > 0.5:
                 reduction_pct = (1.0 - total_eff_cap / total_phys_cap) * 100.0
                 logger.debug(
-                    f"[CLUSTERING] BOF cluster {meta_fg_id}: "
+                    lambda: f"[CLUSTERING] BOF cluster {meta_fg_id}: "
                     f"physical {total_phys_cap * T_TO_KT:.1f} kt → "
                     f"effective {total_eff_cap * T_TO_KT:.1f} kt "
                     f"({reduction_pct:.1f}% reduction from hot-metal supply limit)"
@@ -742,7 +756,7 @@ def cluster_furnace_groups(
                     eff = effective_caps[fg.furnace_group_id]
                     if abs(eff - phys) > 0.5:
                         logger.debug(
-                            f"[CLUSTERING]   FG {fg.furnace_group_id}: {phys * T_TO_KT:.1f} kt → {eff * T_TO_KT:.1f} kt"
+                            lambda: f"[CLUSTERING]   FG {fg.furnace_group_id}: {phys * T_TO_KT:.1f} kt → {eff * T_TO_KT:.1f} kt"
                         )
 
         # Calculate capacity shares based on effective capacities
@@ -773,7 +787,7 @@ def cluster_furnace_groups(
         dynamic_business_case = cluster_fgs[0][0].technology.dynamic_business_case
 
         logger.debug(
-            f"[CLUSTERING] Cluster {meta_fg_id}: dynamic_business_case from first FG = "
+            lambda: f"[CLUSTERING] Cluster {meta_fg_id}: dynamic_business_case from first FG = "
             f"{dynamic_business_case is not None and len(dynamic_business_case) if dynamic_business_case else 0} feedstocks"
         )
 
@@ -781,7 +795,7 @@ def cluster_furnace_groups(
         for i, (fg, _) in enumerate(cluster_fgs[1:], start=1):
             if fg.technology.dynamic_business_case != dynamic_business_case:
                 logger.warning(
-                    f"[CLUSTERING] Furnace group {fg.furnace_group_id} has different "
+                    lambda: f"[CLUSTERING] Furnace group {fg.furnace_group_id} has different "
                     f"dynamic_business_case than others in cluster {meta_fg_id}. "
                     f"Using first FG's business case."
                 )
@@ -855,7 +869,7 @@ def cluster_furnace_groups(
         cluster_mapping[meta_fg_id] = constituent_fg_ids
 
         logger.debug(
-            f"[CLUSTERING] Created {meta_fg_id}: "
+            lambda: f"[CLUSTERING] Created {meta_fg_id}: "
             f"{len(constituent_fg_ids)} FGs, "
             f"{float(total_capacity) * T_TO_KT:.1f} kt capacity, "
             f"centroid at ({location.lat:.2f}, {location.lon:.2f})"
@@ -869,11 +883,11 @@ def cluster_furnace_groups(
     max_cluster_size = max(len(fgs) for fgs in cluster_mapping.values()) if cluster_mapping else 0
 
     logger.info("[CLUSTERING] Statistics:")
-    logger.info(f"  Original FGs: {n_original}")
-    logger.info(f"  Meta-FGs: {n_clustered}")
-    logger.info(f"  Reduction: {reduction_pct:.1f}%")
-    logger.info(f"  Avg cluster size: {avg_cluster_size:.1f}")
-    logger.info(f"  Largest cluster: {max_cluster_size} FGs")
+    logger.info(lambda: f"  Original FGs: {n_original}")
+    logger.info(lambda: f"  Meta-FGs: {n_clustered}")
+    logger.info(lambda: f"  Reduction: {reduction_pct:.1f}%")
+    logger.info(lambda: f"  Avg cluster size: {avg_cluster_size:.1f}")
+    logger.info(lambda: f"  Largest cluster: {max_cluster_size} FGs")
 
     return meta_furnace_groups, cluster_mapping
 
@@ -891,6 +905,31 @@ def _calculate_distance_km(loc1: Location, loc2: Location) -> float:
     return haversine_distance([loc1.lat, loc1.lon, loc2.lat, loc2.lon])
 
 
+def _reach_mask(
+    dest_locations: list["Location | None"],
+    source_locations: list["Location | None"],
+    hot_metal_radius: float,
+    distance_matrix: "DistanceMatrix | None" = None,
+) -> np.ndarray:
+    """Boolean matrix (dest × source): True where the source is within `hot_metal_radius` of the destination.
+
+    Pairs with a missing location count as reachable (no distance constraint enforceable), as in the
+    per-pair checks of the reach-based helpers. Distances are haversine, read from `distance_matrix` when given.
+    """
+    if distance_matrix is not None:
+        distances = distance_matrix.haversine(dest_locations, source_locations)
+    else:
+        distances = haversine_matrix(
+            [loc.lat if loc is not None else None for loc in dest_locations],
+            [loc.lon if loc is not None else None for loc in dest_locations],
+            [loc.lat if loc is not None else None for loc in source_locations],
+            [loc.lon if loc is not None else None for loc in source_locations],
+        )
+    dest_missing = np.array([loc is None for loc in dest_locations], dtype=bool)
+    source_missing = np.array([loc is None for loc in source_locations], dtype=bool)
+    return (distances <= hot_metal_radius) | dest_missing[:, None] | source_missing[None, :]
+
+
 def _is_flow_feasible(commodity, distance_km: float, config: "SimulationConfig") -> bool:
     """Check if a commodity flow is feasible given the distance constraint.
 
@@ -990,401 +1029,151 @@ def _compute_allocation_costs(
     return allocation_costs
 
 
-def _solve_batched_transportation_problem(
-    source_supplies: dict[str, float],  # {source_id: supply_volume}
-    dest_demands: dict[str, float],  # {dest_id: demand_volume}
-    source_locations: dict[str, Location],  # {source_id: Location}
-    dest_locations: dict[str, Location],  # {dest_id: Location}
-    commodity,
-    config: "SimulationConfig",
-    allocation_costs: dict[tuple[str, str], float] | None = None,  # {(source_id, dest_id): $/ton}
-    is_hot_commodity: bool = False,  # Whether this commodity is a hot (close) product
-    strict_radius: bool = False,  # If True, radius-violating edges are omitted and solver failure raises
-    context_label: str = "",  # Optional label for error messages (e.g. "hot_metal → BOF cluster X")
-) -> tuple[dict[tuple[str, str], float], dict]:
-    """Solve batched transportation problem for multiple sources and destinations.
-
-    This is the general solver that handles:
-    - Many suppliers → Many FGs (Case 3 batched)
-    - Many FGs → Many suppliers (Case 2 batched)
-    - Many FGs → Many FGs (Case 4, inter-cluster)
-
-    Args:
-        source_supplies: Dictionary mapping source IDs to their supply volumes
-        dest_demands: Dictionary mapping destination IDs to their demand volumes
-        source_locations: Dictionary mapping source IDs to their locations
-        dest_locations: Dictionary mapping destination IDs to their locations
-        commodity: Commodity being transported
-        config: Simulation configuration
-        allocation_costs: Optional pre-computed costs per edge (source_id, dest_id) → $/ton
-            If provided, uses these costs instead of distance-based fallback
+@dataclass
+class _TransportProblem:
+    """One disaggregation transportation problem, ready for ``solve_transport_blocks``.
 
-    Returns:
-        Tuple of (flow_dict, stats_dict) where:
-        - flow_dict: {(source_id, dest_id): volume} for non-zero flows only
-        - stats_dict: Statistics about reduction (total_pairs, used_edges, etc.)
+    ``block`` holds the supplies, the (balanced) demands and the allowed edges by position in ``source_ids`` /
+    ``dest_ids``. Radius-violating pairs are recorded in ``infeasible_edge_metadata`` whether or not they are
+    allowed as (penalised) edges.
     """
-    # Build bipartite graph for transportation problem
-    G = nx.DiGraph()
-
-    # Add source and sink nodes for flow balancing
-    SOURCE = "__source__"
-    SINK = "__sink__"
-
-    # Track statistics
-    total_pairs = len(source_supplies) * len(dest_demands)
-    infeasible_pairs = 0
-    infeasible_pairs_set: set[tuple[str, str]] = set()  # (source_id, dest_id) pairs that violate hot metal radius
-    # (source_id, dest_id) -> (distance_km, source_iso3, dest_iso3) for all infeasible pairs
-    infeasible_edge_metadata: dict[tuple[str, str], tuple[float, str, str]] = {}
-
-    # Very high cost for infeasible flows (essentially infinity)
-    INFEASIBLE_COST = int(1e9)
-
-    # Store original (exact) totals for scaling solution back
-    original_total_supply = sum(source_supplies.values())
-
-    # Convert to integers for NetworkX (network_simplex requires integer node demands
-    # and edge capacities). We multiply by TRANSPORT_PROBLEM_SCALE before rounding so
-    # the per-entry rounding error is ≤ 0.5/SCALE tons (≈ 0.5 kg at SCALE=1000).
-    # This eliminates the prior bug where plain int(v) per-entry truncation could lose
-    # several tons of supply/demand and break per-pocket Hall's condition that Stage A
-    # had verified only at the float level. SCALE=1000 keeps integer values well under
-    # int64 limits (max ~1e10 for plant-level capacities) and adds <15% solver time.
-    TRANSPORT_PROBLEM_SCALE = 1000
-    source_supplies_int = {k: int(round(v * TRANSPORT_PROBLEM_SCALE)) for k, v in source_supplies.items()}
-    dest_demands_int = {k: int(round(v * TRANSPORT_PROBLEM_SCALE)) for k, v in dest_demands.items()}
-
-    # Filter out zeros AFTER scaling
-    source_supplies_int = {k: v for k, v in source_supplies_int.items() if v > 0}
-    dest_demands_int = {k: v for k, v in dest_demands_int.items() if v > 0}
-
-    if not source_supplies_int or not dest_demands_int:
-        # No valid sources or destinations after scaling
-        return {}, {
-            "total_pairs": 0,
-            "used_edges": 0,
-            "infeasible_pairs": 0,
-            "infeasible_flow_volume": 0.0,
-            "total_flow_volume": 0.0,
-            "infeasible_edge_details": [],
-        }
-
-    # Calculate total volume from SCALED dictionaries (integers for NetworkX).
-    # These totals are in units of tons * TRANSPORT_PROBLEM_SCALE; flows extracted
-    # from the solver are likewise scaled and divided back at the end.
-    total_supply = sum(source_supplies_int.values())
-    total_demand = sum(dest_demands_int.values())
-
-    # Use scaled values for the transportation problem
-    # Type ignore needed because we're intentionally converting from dict[str, float] to dict[str, int]
-    source_supplies = source_supplies_int  # type: ignore[assignment]
-    dest_demands = dest_demands_int  # type: ignore[assignment]
-
-    # After flooring, adjust demands to match supply exactly (for NetworkX balance requirement)
-    diff = total_supply - total_demand
 
-    if diff != 0:
-        # Adjust largest demand to balance (small adjustments from flooring)
-        if dest_demands:
-            # Find demand with largest value
-            max_demand_key = max(dest_demands.keys(), key=lambda k: dest_demands[k])
-            dest_demands[max_demand_key] += diff
-            total_demand = total_supply  # Now balanced
-
-    # Add source node with supply (negative demand)
-    # IMPORTANT: Use same variable for both to ensure sum = 0 exactly
-    G.add_node(SOURCE, demand=-total_supply)
-
-    # Add sink node with demand (positive demand)
-    # Use total_supply to ensure exact balance (sum of demands = 0)
-    G.add_node(SINK, demand=total_supply)
-
-    # Add edges from source to each origin
-    for source_id, supply in source_supplies.items():
-        source_node = f"from_{source_id}"
-        G.add_node(source_node, demand=0)  # Intermediate nodes have zero demand
-        G.add_edge(SOURCE, source_node, weight=0, capacity=supply)
-
-    # Add edges from each destination to sink
-    for dest_id, demand in dest_demands.items():
-        dest_node = f"to_{dest_id}"
-        G.add_node(dest_node, demand=0)  # Intermediate nodes have zero demand
-        G.add_edge(dest_node, SINK, weight=0, capacity=demand)
-
-    # Slack edge SOURCE→SINK. Tightly-balanced sub-pockets (supply==demand exactly
-    # for some subset of nodes at float level) can flip infeasible after the
-    # ±0.5 kg per-node rounding above; the slack edge lets the solver bypass a
-    # few kg of bipartite flow to absorb that noise. Sized at 2 kg per
-    # participating node — orders of magnitude below the smallest legitimate flow
-    # but enough to absorb the worst-case rounding sum.
-    # Cost is strictly greater than INFEASIBLE_COST so the solver prefers any
-    # bipartite route (real or radius-violating) over slack — slack only carries
-    # flow when no bipartite path exists. We check post-solve whether it
-    # saturated; if so the infeasibility is structural rather than
-    # rounding-induced and we re-raise.
-    slack_capacity_kg = 2 * (len(source_supplies) + len(dest_demands))
-    SLACK_COST = INFEASIBLE_COST * 2
-    G.add_edge(SOURCE, SINK, weight=SLACK_COST, capacity=slack_capacity_kg)
-
-    # Add edges between origins and destinations with distance-based costs
-    for source_id, supply in source_supplies.items():
-        source_location = source_locations.get(source_id)
-
-        for dest_id, demand in dest_demands.items():
-            dest_location = dest_locations.get(dest_id)
+    source_ids: list[str]
+    dest_ids: list[str]
+    block: TransportBlock
+    distances: np.ndarray  # source × dest, km (0 where a location is missing)
+    located: np.ndarray  # source × dest, True where both locations are known
+    edge_infeasible: np.ndarray  # per allowed edge, True if it violates the hot metal radius
+    total_pairs: int
+    # (source_id, dest_id) -> (distance_km, source_iso3, dest_iso3) for all radius-violating pairs
+    infeasible_edge_metadata: dict[tuple[str, str], tuple[float, str, str]]
 
-            # Calculate distance (if both locations available)
-            if source_location and dest_location:
-                distance_km = _calculate_distance_km(source_location, dest_location)
-                is_feasible = _is_flow_feasible(commodity, distance_km, config)
-                commodity_name = commodity.name if hasattr(commodity, "name") else str(commodity)
-            else:
-                # No location data, assume feasible with zero cost
-                distance_km = 0
-                is_feasible = True
-
-            # Get commodity name for logging
-            commodity_name = commodity.name if hasattr(commodity, "name") else str(commodity)
-            if is_hot_commodity and distance_km > config.hot_metal_radius:
-                # Additional check for hot commodities: enforce distance constraint
-                is_feasible = False
-
-            if is_feasible:
-                # Use pre-computed allocation cost if available, otherwise fall back to distance
-                if allocation_costs and (source_id, dest_id) in allocation_costs:
-                    # Use pre-computed cost (already in $/ton from LP cost structure)
-                    cost = int(max(allocation_costs[(source_id, dest_id)], 0.0) * 100)
-                else:
-                    # Fallback: use distance as proxy for transportation cost
-                    cost = int(distance_km * 100)  # Scale for integer arithmetic
-            else:
-                # Infeasible flow: use very high cost (but allow as last resort)
-                cost = INFEASIBLE_COST
-                infeasible_pairs += 1
-                infeasible_pairs_set.add((source_id, dest_id))
-                infeasible_edge_metadata[(source_id, dest_id)] = (
-                    distance_km,
-                    source_location.iso3 if source_location else "unknown",
-                    dest_location.iso3 if dest_location else "unknown",
-                )
-                if strict_radius:
-                    # Hard-infeasible: omit the edge entirely so the solver cannot route across it
-                    continue
-
-            # Add edge with capacity = total supply (effectively unbounded)
-            max_flow = total_supply
-            G.add_edge(f"from_{source_id}", f"to_{dest_id}", weight=cost, capacity=max_flow)
-
-    # Validate graph before solving
-    # Check: sum of all node demands must be 0
-    total_node_demand = sum(G.nodes[n].get("demand", 0) for n in G.nodes())
-    if abs(total_node_demand) > 1e-9:
-        commodity_name = commodity.name if hasattr(commodity, "name") else str(commodity)
-        logger.error(
-            f"[DISAGGREGATION] Graph validation FAILED for {commodity_name}: "
-            f"Sum of node demands = {total_node_demand:.15f} (should be 0)"
-        )
-
-    # Check for negative capacities or zero-capacity edges
-    negative_capacity_edges = [(u, v) for u, v, d in G.edges(data=True) if d.get("capacity", 0) <= 0]
-    if negative_capacity_edges:
-        commodity_name = commodity.name if hasattr(commodity, "name") else str(commodity)
-        logger.error(
-            f"[DISAGGREGATION] Found {len(negative_capacity_edges)} edges with capacity <= 0 for {commodity_name}"
-        )
 
-    # Check capacity balance: sum of capacities from SOURCE should equal sum of capacities to SINK
-    source_out_capacity = sum(G[SOURCE][n]["capacity"] for n in G.successors(SOURCE))
-    sink_in_capacity = sum(G[n][SINK]["capacity"] for n in G.predecessors(SINK))
-    if abs(source_out_capacity - sink_in_capacity) > 1e-6:
-        commodity_name = commodity.name if hasattr(commodity, "name") else str(commodity)
-        logger.error(
-            f"[DISAGGREGATION] Capacity mismatch for {commodity_name}: "
-            f"SOURCE out={source_out_capacity:.10f}, SINK in={sink_in_capacity:.10f}, "
-            f"diff={abs(source_out_capacity - sink_in_capacity):.10f}"
-        )
+def _empty_transport_stats(total_pairs: int = 0, infeasible_pairs: int = 0) -> dict:
+    return {
+        "total_pairs": total_pairs,
+        "used_edges": 0,
+        "infeasible_pairs": infeasible_pairs,
+        "infeasible_flow_volume": 0.0,
+        "total_flow_volume": 0.0,
+        "infeasible_edge_details": [],
+    }
 
-    # Solve min-cost flow (demands are set as node attributes)
-    try:
-        flow_dict = nx.min_cost_flow(G)
-        slack_flow_kg = flow_dict.get(SOURCE, {}).get(SINK, 0)
-        if slack_flow_kg >= slack_capacity_kg:
-            # Slack saturated → bipartite graph couldn't absorb the supply within
-            # sub-kg tolerance. Structural infeasibility, not rounding noise.
-            # Re-raise to fall through to the existing diagnostic path.
-            raise nx.NetworkXUnfeasible(f"rounding-slack saturated ({slack_flow_kg} kg ≥ cap {slack_capacity_kg} kg)")
-    except nx.NetworkXUnfeasible:
-        commodity_name = commodity.name if hasattr(commodity, "name") else str(commodity)
 
-        # Debug: Check graph connectivity
-        num_nodes = G.number_of_nodes()
-        num_edges = G.number_of_edges()
+def _build_transport_problem(
+    source_supplies: dict[str, float],
+    dest_demands: dict[str, float],
+    source_locations: dict[str, Location],
+    dest_locations: dict[str, Location],
+    commodity,
+    config: "SimulationConfig",
+    allocation_costs: dict[tuple[str, str], float] | None,
+    is_hot_commodity: bool,
+    strict_radius: bool,
+) -> _TransportProblem | None:
+    """Build the edges, costs and balanced volumes of a transportation problem.
 
-        # Check if all source/dest nodes are reachable
-        source_nodes_in_graph = [n for n in G.nodes() if n.startswith("from_")]
-        dest_nodes_in_graph = [n for n in G.nodes() if n.startswith("to_")]
+    Edge costs are the pre-computed allocation costs (clipped at zero) where given, the distance in km
+    otherwise. Radius-violating edges cost ``INFEASIBLE_EDGE_COST`` (last resort), or are omitted when
+    ``strict_radius`` is set. Demands are balanced to the total supply by adjusting the largest demand.
 
-        # Check edges between sources and dests
-        source_dest_edges = [(u, v) for u, v in G.edges() if u.startswith("from_") and v.startswith("to_")]
+    Returns:
+        The problem, or None if no source or no destination has a positive volume
+    """
+    supplies = {k: v for k, v in source_supplies.items() if v > MIN_TRANSPORT_VOLUME}
+    demands = {k: v for k, v in dest_demands.items() if v > MIN_TRANSPORT_VOLUME}
+    if not supplies or not demands:
+        return None
 
-        logger.error(
-            f"[DISAGGREGATION] Batched transportation problem infeasible for commodity={commodity_name}. "
-            f"Sources={len(source_supplies)}, Destinations={len(dest_demands)}, "
-            f"Total supply={total_supply / TRANSPORT_PROBLEM_SCALE:.2f}t, "
-            f"Total demand={total_demand / TRANSPORT_PROBLEM_SCALE:.2f}t, "
-            f"Infeasible edges={infeasible_pairs}/{total_pairs}. "
-            f"Graph: {num_nodes} nodes, {num_edges} edges. "
-            f"Source nodes={len(source_nodes_in_graph)}, Dest nodes={len(dest_nodes_in_graph)}, "
-            f"Source→Dest edges={len(source_dest_edges)}"
+    # Small imbalances (floating point noise, per-component normalisation tolerance) go to the largest demand
+    diff = sum(supplies.values()) - sum(demands.values())
+    if diff != 0:
+        max_demand_key = max(demands.keys(), key=lambda k: demands[k])
+        demands[max_demand_key] += diff
+
+    source_ids = list(supplies)
+    dest_ids = list(demands)
+    source_locs = [source_locations.get(sid) or None for sid in source_ids]
+    dest_locs = [dest_locations.get(did) or None for did in dest_ids]
+    located = (
+        np.array([loc is not None for loc in source_locs], dtype=bool)[:, None]
+        & np.array([loc is not None for loc in dest_locs], dtype=bool)[None, :]
+    )
+    distances = haversine_matrix(
+        [loc.lat if loc is not None else None for loc in source_locs],
+        [loc.lon if loc is not None else None for loc in source_locs],
+        [loc.lat if loc is not None else None for loc in dest_locs],
+        [loc.lon if loc is not None else None for loc in dest_locs],
+    )
+    # No location data: assume feasible with zero distance
+    distances = np.where(located, distances, 0.0)
+
+    feasible = np.ones(located.shape, dtype=bool)
+    if is_hot_commodity or not _is_flow_feasible(commodity, float("inf"), config):
+        # Distance-restricted commodity: only flows within the hot metal radius are feasible
+        feasible = distances <= config.hot_metal_radius
+
+    costs = distances.copy()
+    if allocation_costs:
+        source_index = {sid: i for i, sid in enumerate(source_ids)}
+        dest_index = {did: j for j, did in enumerate(dest_ids)}
+        for (sid, did), cost in allocation_costs.items():
+            i = source_index.get(sid)
+            j = dest_index.get(did)
+            if i is not None and j is not None:
+                costs[i, j] = max(cost, 0.0)
+    costs[~feasible] = INFEASIBLE_EDGE_COST
+
+    infeasible_edge_metadata = {}
+    for i, j in zip(*np.nonzero(~feasible)):
+        source_location, dest_location = source_locs[i], dest_locs[j]
+        infeasible_edge_metadata[(source_ids[i], dest_ids[j])] = (
+            float(distances[i, j]),
+            source_location.iso3 if source_location else "unknown",
+            dest_location.iso3 if dest_location else "unknown",
         )
 
-        # If there are no source→dest edges, that's the problem!
-        if len(source_dest_edges) == 0:
-            logger.error("[DISAGGREGATION] PROBLEM: No edges between sources and destinations! Graph is disconnected.")
-
-        # For small cases, log detailed graph state for debugging
-        if len(source_supplies) <= 2 and len(dest_demands) <= 2:
-            logger.error(
-                f"[DISAGGREGATION] DETAILED DEBUG for {commodity_name}:\n"
-                f"  source_supplies: {source_supplies}\n"
-                f"  dest_demands: {dest_demands}\n"
-                f"  Node demands: {dict(G.nodes(data='demand'))}\n"
-                f"  Edges: {[(u, v, d.get('capacity'), d.get('weight')) for u, v, d in G.edges(data=True)]}"
-            )
+    # Hard-infeasible in strict mode: omit the edges entirely so the solver cannot route across them
+    edge_source, edge_dest = np.nonzero(feasible if strict_radius else np.ones_like(feasible))
+    block = TransportBlock(
+        supplies=np.array(list(supplies.values())),
+        demands=np.array(list(demands.values())),
+        edge_source=edge_source,
+        edge_dest=edge_dest,
+        edge_cost=costs[edge_source, edge_dest],
+    )
+    return _TransportProblem(
+        source_ids=source_ids,
+        dest_ids=dest_ids,
+        block=block,
+        distances=distances,
+        located=located,
+        edge_infeasible=~feasible[edge_source, edge_dest],
+        total_pairs=len(source_supplies) * len(dest_demands),
+        infeasible_edge_metadata=infeasible_edge_metadata,
+    )
 
-        if strict_radius:
-            # In strict mode, infeasibility is a hard error — identify which destinations are unreachable
-            unreachable_dests = []
-            for dest_id in dest_demands:
-                dest_node = f"to_{dest_id}"
-                if dest_node in G and not any(u.startswith("from_") for u in G.predecessors(dest_node)):
-                    unreachable_dests.append((dest_id, dest_demands[dest_id]))
-
-            # For small problems, include every node's supply/demand and every edge
-            # (both feasible and blocked) so the infeasibility can be diagnosed inline.
-            debug_details = ""
-            largest_side = max(len(source_supplies), len(dest_demands))
-            if largest_side <= 10:
-                lines = ["", "  Source supplies:"]
-                for sid, supply in sorted(source_supplies.items(), key=lambda x: -x[1]):
-                    loc = source_locations.get(sid)
-                    iso3 = loc.iso3 if loc else "?"
-                    lines.append(f"    {sid} ({iso3}): {supply / TRANSPORT_PROBLEM_SCALE:.2f}t supply")
-                lines.append("  Destination demands:")
-                for did, demand in sorted(dest_demands.items(), key=lambda x: -x[1]):
-                    loc = dest_locations.get(did)
-                    iso3 = loc.iso3 if loc else "?"
-                    lines.append(f"    {did} ({iso3}): {demand / TRANSPORT_PROBLEM_SCALE:.2f}t demand")
-                feasible_lines = []
-                blocked_in_subproblem_lines = []
-                # Only iterate sources/destinations that participate in THIS sub-problem.
-                # source_locations/dest_locations are shared dicts from the parent joint
-                # cluster and contain entries from sibling components; iterating them
-                # would print radius-distant pairs as "feasible" simply because they were
-                # never evaluated against the radius for this sub-problem. Restrict to
-                # source_supplies_int / dest_demands keys to get a faithful picture.
-                active_sources = set(source_supplies_int.keys())
-                active_dests = set(dest_demands.keys())
-                radius_km = config.hot_metal_radius
-                for sid in sorted(active_sources):
-                    src_loc = source_locations.get(sid)
-                    for did in sorted(active_dests):
-                        dst_loc = dest_locations.get(did)
-                        if (sid, did) in infeasible_pairs_set:
-                            continue  # surfaced separately under "Blocked edges" below
-                        if src_loc and dst_loc:
-                            dkm = _calculate_distance_km(src_loc, dst_loc)
-                            if dkm > radius_km:
-                                # Edge wasn't in infeasible_pairs_set yet still exceeds the
-                                # radius — flag it so the debug output can't misrepresent it.
-                                blocked_in_subproblem_lines.append(
-                                    f"    {sid} → {did}: {dkm:.0f} km  [out-of-radius, not added to graph]"
-                                )
-                            else:
-                                feasible_lines.append(f"    {sid} → {did}: {dkm:.0f} km  [feasible]")
-                        else:
-                            feasible_lines.append(f"    {sid} → {did}: (no location data)  [feasible]")
-                if feasible_lines:
-                    lines.append(f"  Feasible edges (within {radius_km:.0f} km radius):")
-                    lines.extend(feasible_lines)
-                else:
-                    lines.append(
-                        f"  Feasible edges (within {radius_km:.0f} km radius): NONE — every source is out of radius for every destination"
-                    )
-                if blocked_in_subproblem_lines:
-                    lines.append("  Out-of-radius pairs in this sub-problem (not in graph):")
-                    lines.extend(blocked_in_subproblem_lines)
-                if infeasible_edge_metadata:
-                    lines.append("  Blocked edges (radius-violating, omitted from graph):")
-                    for (sid, did), (dkm, src_iso3, dst_iso3) in sorted(infeasible_edge_metadata.items()):
-                        lines.append(f"    {sid} ({src_iso3}) → {did} ({dst_iso3}): {dkm:.0f} km  [blocked]")
-                debug_details = "\n" + "\n".join(lines)
-
-            raise RuntimeError(
-                f"[DISAGGREGATION] STRICT-RADIUS transportation problem infeasible "
-                f"for commodity={commodity_name}"
-                f"{f' ({context_label})' if context_label else ''}. "
-                f"{len(unreachable_dests)} destination(s) have no in-radius supplier. "
-                f"Unreachable: {unreachable_dests[:5]}{'...' if len(unreachable_dests) > 5 else ''}. "
-                f"Total supply={total_supply / TRANSPORT_PROBLEM_SCALE:.2f}t, "
-                f"total demand={total_demand / TRANSPORT_PROBLEM_SCALE:.2f}t."
-                f"{debug_details}"
-            )
 
-        # Fallback: return empty flows
-        return {}, {
-            "total_pairs": total_pairs,
-            "used_edges": 0,
-            "infeasible_pairs": infeasible_pairs,
-            "infeasible_flow_volume": 0.0,
-            "total_flow_volume": 0.0,
-            "infeasible_edge_details": [],
-        }
-
-    # Extract non-zero flows (ignore source/sink flows)
+def _transport_flows_and_stats(
+    problem: _TransportProblem, edge_flows: np.ndarray, commodity
+) -> tuple[dict[tuple[str, str], float], dict]:
+    """Turn the solved edge flows of ``problem`` into the ``(flow_dict, stats_dict)`` of the batched solver."""
     result_flows = {}
-    used_edges = 0
     infeasible_flow_volume = 0.0
     total_flow_volume = 0.0
     # (distance_km, volume, source_iso3, dest_iso3) for each violated edge that carried flow
     infeasible_edge_details: list[tuple[float, float, str, str]] = []
 
-    for from_node, destinations in flow_dict.items():
-        if from_node.startswith("from_"):
-            source_id = from_node[5:]  # Remove "from_" prefix
-
-            for to_node, flow_value_scaled in destinations.items():
-                if not to_node.startswith("to_"):
-                    continue
-                # Divide solver flows back into tons. The 1e-6 t threshold matches the
-                # pre-scaling code; numerical noise in network_simplex is far below it.
-                flow_value = flow_value_scaled / TRANSPORT_PROBLEM_SCALE
-                if flow_value <= 1e-6:
-                    continue
-                dest_id = to_node[3:]  # Remove "to_" prefix
-                result_flows[(source_id, dest_id)] = flow_value
-                used_edges += 1
-                total_flow_volume += flow_value
-                if (source_id, dest_id) in infeasible_pairs_set:
-                    infeasible_flow_volume += flow_value
-                    dist_km, src_iso3, dst_iso3 = infeasible_edge_metadata[(source_id, dest_id)]
-                    infeasible_edge_details.append((dist_km, flow_value, src_iso3, dst_iso3))
-
-    # Scale flows back to original (pre-rounding) total to preserve exact BOM constraints.
-    # With TRANSPORT_PROBLEM_SCALE=1000 the per-entry rounding error is ≤ 0.5 kg, so this
-    # correction is effectively a no-op (scale_factor ≈ 1.000000…) — kept as belt-and-braces
-    # to absorb any residual sub-gram imbalance from the diff-rebalance step above.
-    actual_total_supply_tons = total_supply / TRANSPORT_PROBLEM_SCALE
-    if actual_total_supply_tons > 0 and abs(original_total_supply - actual_total_supply_tons) > 1e-9:
-        scale_factor = original_total_supply / actual_total_supply_tons
-        result_flows = {k: v * scale_factor for k, v in result_flows.items()}
-        commodity_name = commodity.name if hasattr(commodity, "name") else str(commodity)
-        logger.debug(
-            f"[DISAGGREGATION] Scaled flows for {commodity_name} by {scale_factor:.10f} "
-            f"to preserve exact BOM (post-round total: {actual_total_supply_tons:.6f}t, "
-            f"original: {original_total_supply:.2f}t)"
-        )
+    for edge in np.flatnonzero(edge_flows > MIN_TRANSPORT_VOLUME).tolist():
+        source_id = problem.source_ids[problem.block.edge_source[edge]]
+        dest_id = problem.dest_ids[problem.block.edge_dest[edge]]
+        flow_value = float(edge_flows[edge])
+        result_flows[(source_id, dest_id)] = flow_value
+        total_flow_volume += flow_value
+        if problem.edge_infeasible[edge]:
+            infeasible_flow_volume += flow_value
+            dist_km, src_iso3, dst_iso3 = problem.infeasible_edge_metadata[(source_id, dest_id)]
+            infeasible_edge_details.append((dist_km, flow_value, src_iso3, dst_iso3))
 
     # Log if any flows ended up on radius-violating edges. For substitutable hot commodities
     # (those with a cold equivalent in HOT_TO_COLD_COMMODITY), this is resolved downstream by
@@ -1408,20 +1197,187 @@ def _solve_batched_transportation_problem(
                 f"hot-metal-radius-violating edges (last-resort fallback)"
             )
 
-    # Prepare statistics
+    total_pairs = problem.total_pairs
+    used_edges = len(result_flows)
     stats = {
         "total_pairs": total_pairs,
         "used_edges": used_edges,
-        "infeasible_pairs": infeasible_pairs,
+        "infeasible_pairs": len(problem.infeasible_edge_metadata),
         "infeasible_flow_volume": infeasible_flow_volume,
         "total_flow_volume": total_flow_volume,
         "infeasible_edge_details": infeasible_edge_details,
         "reduction_pct": (1 - used_edges / total_pairs) * 100 if total_pairs > 0 else 0,
     }
-
     return result_flows, stats
 
 
+def _report_infeasible_transport_problem(
+    problem: _TransportProblem,
+    commodity,
+    config: "SimulationConfig",
+    strict_radius: bool,
+    context_label: str,
+    source_locations: dict[str, Location],
+    dest_locations: dict[str, Location],
+) -> tuple[dict[tuple[str, str], float], dict]:
+    """Log why a transportation problem has no feasible flow; raise in strict mode, else return empty flows.
+
+    Raises:
+        RuntimeError: If ``strict_radius`` is set.
+    """
+    commodity_name = commodity.name if hasattr(commodity, "name") else str(commodity)
+    block = problem.block
+    source_supplies = dict(zip(problem.source_ids, block.supplies.tolist()))
+    dest_demands = dict(zip(problem.dest_ids, block.demands.tolist()))
+    total_supply = sum(source_supplies.values())
+    total_demand = sum(dest_demands.values())
+    infeasible_pairs = len(problem.infeasible_edge_metadata)
+
+    logger.error(
+        f"[DISAGGREGATION] Batched transportation problem infeasible for commodity={commodity_name}. "
+        f"Sources={len(source_supplies)}, Destinations={len(dest_demands)}, "
+        f"Total supply={total_supply:.2f}t, "
+        f"Total demand={total_demand:.2f}t, "
+        f"Infeasible edges={infeasible_pairs}/{problem.total_pairs}. "
+        f"Source→Dest edges={block.num_edges}"
+    )
+
+    # If there are no source→dest edges, that's the problem!
+    if block.num_edges == 0:
+        logger.error("[DISAGGREGATION] PROBLEM: No edges between sources and destinations! Graph is disconnected.")
+
+    # For small cases, log detailed problem state for debugging
+    if len(source_supplies) <= 2 and len(dest_demands) <= 2:
+        edges = [
+            (problem.source_ids[i], problem.dest_ids[j], float(cost))
+            for i, j, cost in zip(block.edge_source, block.edge_dest, block.edge_cost)
+        ]
+        logger.error(
+            f"[DISAGGREGATION] DETAILED DEBUG for {commodity_name}:\n"
+            f"  source_supplies: {source_supplies}\n"
+            f"  dest_demands: {dest_demands}\n"
+            f"  Edges: {edges}"
+        )
+
+    if not strict_radius:
+        # Fallback: return empty flows
+        return {}, _empty_transport_stats(problem.total_pairs, infeasible_pairs)
+
+    # In strict mode, infeasibility is a hard error — identify which destinations are unreachable
+    reachable_dests = set(block.edge_dest.tolist())
+    unreachable_dests = [(did, dest_demands[did]) for j, did in enumerate(problem.dest_ids) if j not in reachable_dests]
+
+    # For small problems, include every node's supply/demand and every edge
+    # (both feasible and blocked) so the infeasibility can be diagnosed inline.
+    debug_details = ""
+    largest_side = max(len(source_supplies), len(dest_demands))
+    if largest_side <= 10:
+        lines = ["", "  Source supplies:"]
+        for sid, supply in sorted(source_supplies.items(), key=lambda x: -x[1]):
+            loc = source_locations.get(sid)
+            iso3 = loc.iso3 if loc else "?"
+            lines.append(f"    {sid} ({iso3}): {supply:.2f}t supply")
+        lines.append("  Destination demands:")
+        for did, demand in sorted(dest_demands.items(), key=lambda x: -x[1]):
+            loc = dest_locations.get(did)
+            iso3 = loc.iso3 if loc else "?"
+            lines.append(f"    {did} ({iso3}): {demand:.2f}t demand")
+        feasible_lines = []
+        radius_km = config.hot_metal_radius
+        for i, sid in sorted(enumerate(problem.source_ids), key=lambda x: x[1]):
+            for j, did in sorted(enumerate(problem.dest_ids), key=lambda x: x[1]):
+                if (sid, did) in problem.infeasible_edge_metadata:
+                    continue  # surfaced separately under "Blocked edges" below
+                if problem.located[i, j]:
+                    feasible_lines.append(f"    {sid} → {did}: {problem.distances[i, j]:.0f} km  [feasible]")
+                else:
+                    feasible_lines.append(f"    {sid} → {did}: (no location data)  [feasible]")
+        if feasible_lines:
+            lines.append(f"  Feasible edges (within {radius_km:.0f} km radius):")
+            lines.extend(feasible_lines)
+        else:
+            lines.append(
+                f"  Feasible edges (within {radius_km:.0f} km radius): NONE — every source is out of radius for every destination"
+            )
+        if problem.infeasible_edge_metadata:
+            lines.append("  Blocked edges (radius-violating, omitted from graph):")
+            for (sid, did), (dkm, src_iso3, dst_iso3) in sorted(problem.infeasible_edge_metadata.items()):
+                lines.append(f"    {sid} ({src_iso3}) → {did} ({dst_iso3}): {dkm:.0f} km  [blocked]")
+        debug_details = "\n" + "\n".join(lines)
+
+    raise RuntimeError(
+        f"[DISAGGREGATION] STRICT-RADIUS transportation problem infeasible "
+        f"for commodity={commodity_name}"
+        f"{f' ({context_label})' if context_label else ''}. "
+        f"{len(unreachable_dests)} destination(s) have no in-radius supplier. "
+        f"Unreachable: {unreachable_dests[:5]}{'...' if len(unreachable_dests) > 5 else ''}. "
+        f"Total supply={total_supply:.2f}t, "
+        f"total demand={total_demand:.2f}t."
+        f"{debug_details}"
+    )
+
+
+def _solve_batched_transportation_problem(
+    source_supplies: dict[str, float],  # {source_id: supply_volume}
+    dest_demands: dict[str, float],  # {dest_id: demand_volume}
+    source_locations: dict[str, Location],  # {source_id: Location}
+    dest_locations: dict[str, Location],  # {dest_id: Location}
+    commodity,
+    config: "SimulationConfig",
+    allocation_costs: dict[tuple[str, str], float] | None = None,  # {(source_id, dest_id): $/ton}
+    is_hot_commodity: bool = False,  # Whether this commodity is a hot (close) product
+    strict_radius: bool = False,  # If True, radius-violating edges are omitted and solver failure raises
+    context_label: str = "",  # Optional label for error messages (e.g. "hot_metal → BOF cluster X")
+) -> tuple[dict[tuple[str, str], float], dict]:
+    """Solve batched transportation problem for multiple sources and destinations.
+
+    This is the general solver that handles:
+    - Many suppliers → Many FGs (Case 3 batched)
+    - Many FGs → Many suppliers (Case 2 batched)
+    - Many FGs → Many FGs (Case 4, inter-cluster)
+
+    The problem is solved as a sparse LP (``solve_transport_blocks``) on the volumes as given: every source ships
+    exactly its supply and every destination receives its demand (balanced to the total supply).
+
+    Args:
+        source_supplies: Dictionary mapping source IDs to their supply volumes
+        dest_demands: Dictionary mapping destination IDs to their demand volumes
+        source_locations: Dictionary mapping source IDs to their locations
+        dest_locations: Dictionary mapping destination IDs to their locations
+        commodity: Commodity being transported
+        config: Simulation configuration
+        allocation_costs: Optional pre-computed costs per edge (source_id, dest_id) → $/ton
+            If provided, uses these costs instead of distance-based fallback
+
+    Returns:
+        Tuple of (flow_dict, stats_dict) where:
+        - flow_dict: {(source_id, dest_id): volume} for non-zero flows only
+        - stats_dict: Statistics about reduction (total_pairs, used_edges, etc.)
+    """
+    problem = _build_transport_problem(
+        source_supplies,
+        dest_demands,
+        source_locations,
+        dest_locations,
+        commodity,
+        config,
+        allocation_costs,
+        is_hot_commodity,
+        strict_radius,
+    )
+    if problem is None:
+        # No valid sources or destinations
+        return {}, _empty_transport_stats()
+
+    solution = solve_transport_blocks([problem.block])
+    if solution is None:
+        return _report_infeasible_transport_problem(
+            problem, commodity, config, strict_radius, context_label, source_locations, dest_locations
+        )
+    return _transport_flows_and_stats(problem, solution[0], commodity)
+
+
+@hot_path
 def _validate_fg_can_receive_allocation(fg_id: str, plants_repo: "PlantInMemoryRepository | None") -> bool:
     """Check if a furnace group should receive allocations (minimal validation).
 
@@ -1458,7 +1414,7 @@ def _validate_fg_can_receive_allocation(fg_id: str, plants_repo: "PlantInMemoryR
 
         # Only filter FGs with near-zero capacity (clearly unusable)
         if fg.capacity is not None and fg.capacity < 0.1:  # Less than 0.1 kt/year
-            logger.debug(f"[DISAGGREGATION] Filtering FG {fg_id} with near-zero capacity: {fg.capacity}")
+            logger.debug(lambda: f"[DISAGGREGATION] Filtering FG {fg_id} with near-zero capacity: {fg.capacity}")
             return False
 
         # Note: FGs without effective_primary_feedstocks are already filtered during clustering
@@ -1466,7 +1422,7 @@ def _validate_fg_can_receive_allocation(fg_id: str, plants_repo: "PlantInMemoryR
         return True
 
     except Exception as e:
-        logger.debug(f"[DISAGGREGATION] Error validating FG {fg_id}: {e}")
+        logger.debug("[DISAGGREGATION] Error validating FG %s: %s", fg_id, e)
         return True  # Assume valid on error
 
 
@@ -1478,6 +1434,7 @@ def _reach_based_source_supplies(
     hot_metal_radius: float,
     strict_radius: bool = False,
     context_label: str = "",
+    distance_matrix: "DistanceMatrix | None" = None,
 ) -> dict[str, float]:
     """Split cluster supply by the destination capacity each source can physically reach.
 
@@ -1517,6 +1474,7 @@ def _reach_based_source_supplies(
             silently dropping demand.
         context_label: Optional label included in the strict-mode error message
             (e.g. "hot_metal → cluster_BOF__DEU (BOF, min-constraint)").
+        distance_matrix: Shared distance matrix (``Environment.distance_matrix``) to read distances from.
 
     Returns:
         fg_id → supply volume for every source FG, including zeros for isolated sources.
@@ -1529,18 +1487,21 @@ def _reach_based_source_supplies(
     # (dest_id, demand, dest_location, sorted_source_distances) for unreachable dests
     unreachable: list[tuple[str, float, "Location | None", list[tuple[str, float]]]] = []
 
-    for did, demand in dest_demands.items():
+    source_items = list(source_capacity_shares.items())
+    # No location data → assume reachable (can't enforce)
+    reach = _reach_mask(
+        [dest_locations.get(did) for did in dest_demands],
+        [source_locations.get(sid) for sid, _ in source_items],
+        hot_metal_radius,
+        distance_matrix,
+    )
+
+    for dest_position, (did, demand) in enumerate(dest_demands.items()):
         dloc = dest_locations.get(did)
         # Collect sources that can reach this destination, with their capacity shares
-        reaching: list[tuple[str, float]] = []
-        for sid, cap_share in source_capacity_shares.items():
-            sloc = source_locations.get(sid)
-            if sloc is None or dloc is None:
-                # No location data → assume reachable (can't enforce)
-                reaching.append((sid, cap_share))
-                continue
-            if _calculate_distance_km(sloc, dloc) <= hot_metal_radius:
-                reaching.append((sid, cap_share))
+        reaching: list[tuple[str, float]] = [
+            item for item, reachable in zip(source_items, reach[dest_position].tolist()) if reachable
+        ]
         if not reaching:
             if strict_radius:
                 # Collect every source distance for this dest so the error can show
@@ -1603,6 +1564,7 @@ def _reach_based_joint_supplies(
     hot_metal_radius: float,
     strict_radius: bool = True,
     context_label: str = "",
+    distance_matrix: "DistanceMatrix | None" = None,
 ) -> dict[str, float]:
     """Compute reach-based supplies for a joint multi-source hot-metal disaggregation.
 
@@ -1630,6 +1592,7 @@ def _reach_based_joint_supplies(
         strict_radius: If True, raise ``RuntimeError`` when a destination has no
             reachable source.  If False, silently drop the demand.
         context_label: Optional label included in error messages.
+        distance_matrix: Shared distance matrix (``Environment.distance_matrix``) to read distances from.
 
     Returns:
         BF FG → reach-based supply (sums to total demand).
@@ -1640,16 +1603,19 @@ def _reach_based_joint_supplies(
     """
     supplies: dict[str, float] = {sid: 0.0 for sid in source_fg_supplies}
 
-    for did, demand in dest_demands.items():
-        dloc = dest_locations.get(did)
-        reaching: list[tuple[str, float]] = []  # (source_fg_id, supply_weight)
+    source_items = list(source_fg_supplies.items())
+    reach = _reach_mask(
+        [dest_locations.get(did) for did in dest_demands],
+        [source_locations.get(sid) for sid, _ in source_items],
+        hot_metal_radius,
+        distance_matrix,
+    )
 
-        for sid, fg_supply in source_fg_supplies.items():
-            sloc = source_locations.get(sid)
-            if sloc is None or dloc is None:
-                reaching.append((sid, fg_supply))
-            elif _calculate_distance_km(sloc, dloc) <= hot_metal_radius:
-                reaching.append((sid, fg_supply))
+    for dest_position, (did, demand) in enumerate(dest_demands.items()):
+        # (source_fg_id, supply_weight)
+        reaching: list[tuple[str, float]] = [
+            item for item, reachable in zip(source_items, reach[dest_position].tolist()) if reachable
+        ]
 
         if not reaching:
             if strict_radius:
@@ -1689,22 +1655,21 @@ def _solve_strict_by_components(
 
     Under strict radius, only edges within ``config.hot_metal_radius`` are
     allowed.  A single cluster may span several geographic pockets that are
-    mutually unreachable.  Running one big min-cost-flow would expose integer-
-    flooring artefacts across pockets (the rebalancing step shifts rounding
-    error to a destination that might be unreachable from the source that lost
-    the fractional ton).
+    mutually unreachable, and supply and demand have to balance within each
+    pocket, not just across the cluster.
 
     This helper decomposes the bipartite feasibility graph into connected
     components.  Within each component every source can (transitively) reach
-    every destination, so the existing per-solve integer rebalancing stays
-    local and can never create cross-pocket infeasibility.
+    every destination.  Per component, supplies and demands are normalised to
+    match.  When ``source_capacities`` is provided, each source FG's supply is
+    capped at the given value.  If capping makes component supply fall below
+    demand, the demand is scaled down proportionally — the excess destination
+    demand is propagated as "unmet" downstream (fewer tonnes produced than LP)
+    via ``stats["dest_unmet_demand"]``.
 
-    Per component, supplies and demands are normalised to match.  When
-    ``source_capacities`` is provided, each source FG's supply is capped at the
-    given value.  If capping makes component supply fall below demand, the demand
-    is scaled down proportionally — the excess destination demand is propagated
-    as "unmet" downstream (fewer tonnes produced than LP) via
-    ``stats["dest_unmet_demand"]``.
+    The per-component maximum-flow checks and the final min-cost transportation
+    problems are each solved for all components at once, as one block-diagonal
+    sparse LP (``solve_transport_blocks``).
 
     Args:
         source_supplies: fg_id → supply volume (from ``_reach_based_source_supplies``).
@@ -1727,34 +1692,28 @@ def _solve_strict_by_components(
     Returns:
         Merged ``(flow_dict, stats_dict)`` across all components.
     """
-    import networkx as nx
-
     # Only sources with supply > 0 participate in the graph.
     active_sources = {sid: s for sid, s in source_supplies.items() if s > 1e-6}
     active_dests = {did: d for did, d in dest_demands.items() if d > 1e-6}
-
-    # Build undirected bipartite feasibility graph.  Prefixes distinguish the
-    # two sides so source/dest FG IDs can overlap (e.g. same plant).
-    fg = nx.Graph()
-    for sid in active_sources:
-        fg.add_node(f"s_{sid}")
-    for did in active_dests:
-        fg.add_node(f"d_{did}")
-
-    for sid in active_sources:
-        sloc = source_locations.get(sid)
-        for did in active_dests:
-            dloc = dest_locations.get(did)
-            if sloc is None or dloc is None:
-                # No location data → assume reachable (can't enforce radius)
-                fg.add_edge(f"s_{sid}", f"d_{did}")
-            elif _calculate_distance_km(sloc, dloc) <= config.hot_metal_radius:
-                fg.add_edge(f"s_{sid}", f"d_{did}")
-
-    components = list(nx.connected_components(fg))
+    source_ids = list(active_sources)
+    dest_ids = list(active_dests)
+
+    # Bipartite feasibility graph (sources first, then destinations).  Pairs without
+    # location data are assumed reachable (can't enforce radius).
+    reach = _reach_mask(
+        [dest_locations.get(did) for did in dest_ids],
+        [source_locations.get(sid) for sid in source_ids],
+        config.hot_metal_radius,
+    )
+    reach_dest, reach_source = np.nonzero(reach)
+    num_nodes = len(source_ids) + len(dest_ids)
+    adjacency = sparse.coo_matrix(
+        (np.ones(len(reach_source)), (reach_source, len(source_ids) + reach_dest)), shape=(num_nodes, num_nodes)
+    )
+    num_components, labels = connected_components(adjacency, directed=False) if num_nodes else (0, np.zeros(0))
     logger.info(
         f"[DISAGGREGATION] Strict-radius decomposition: "
-        f"{len(components)} connected component(s) for {context_label or commodity}"
+        f"{num_components} connected component(s) for {context_label or commodity}"
     )
 
     merged_flows: dict[tuple[str, str], float] = {}
@@ -1771,13 +1730,16 @@ def _solve_strict_by_components(
     # less scrap consumed, …) so BOM holds at the BOF FG level.
     merged_stats["dest_unmet_demand"] = {}  # type: ignore[index]
 
-    for comp_nodes in components:
-        comp_source_ids = {n[2:] for n in comp_nodes if n.startswith("s_")}
-        comp_dest_ids = {n[2:] for n in comp_nodes if n.startswith("d_")}
-
-        comp_supply = {sid: active_sources[sid] for sid in comp_source_ids if sid in active_sources}
-        comp_demand = {did: active_dests[did] for did in comp_dest_ids if did in active_dests}
+    # (supply by source, demand by destination) of every component with something to route
+    component_supplies: list[dict[str, float]] = [{} for _ in range(num_components)]
+    component_demands: list[dict[str, float]] = [{} for _ in range(num_components)]
+    for sid, label in zip(source_ids, labels[: len(source_ids)].tolist()):
+        component_supplies[label][sid] = active_sources[sid]
+    for did, label in zip(dest_ids, labels[len(source_ids) :].tolist()):
+        component_demands[label][did] = active_dests[did]
 
+    pockets: list[tuple[dict[str, float], dict[str, float]]] = []
+    for comp_supply, comp_demand in zip(component_supplies, component_demands):
         if not comp_supply or not comp_demand:
             # Isolated source(s) with no reachable dest, or vice versa.
             # _reach_based_source_supplies should have caught this under strict
@@ -1826,106 +1788,133 @@ def _solve_strict_by_components(
             else:
                 supply_scale = total_d / total_s
                 comp_supply = {sid: s * supply_scale for sid, s in comp_supply.items()}
+        pockets.append((comp_supply, comp_demand))
+
+    # Per-source structural feasibility check.  Even when total supply == total
+    # demand within the component, sub-component reachability (Hall's condition)
+    # can make the transportation problem infeasible — e.g. 3 dests reachable
+    # only by source A whose capped supply is less than their combined demand,
+    # while B/C have surplus they can't ship anywhere because every other dest
+    # is more than the radius from them.  We compute the max-flow of each
+    # component and, when it falls short of the (already balanced) total demand,
+    # use the max-flow's per-edge flow assignment to set new supply / demand caps.
+    # Reading the actual per-source / per-dest flow values — instead of uniformly
+    # scaling everything by max_flow / total — preserves Hall's condition by
+    # construction: the max-flow assignment IS a feasible flow under those caps,
+    # so the downstream min-cost problem cannot be infeasible. Uniform scaling
+    # preserved only the global total and could leave constrained sources still
+    # over-supplied relative to the dests they can reach.
+    source_position = {sid: i for i, sid in enumerate(source_ids)}
+    dest_position = {did: j for j, did in enumerate(dest_ids)}
+    checked = [
+        p
+        for p, (comp_supply, comp_demand) in enumerate(pockets)
+        if sum(comp_demand.values()) > 1.0 and len(comp_supply) > 1 and len(comp_demand) > 1
+    ]
+    max_flow_blocks = []
+    for p in checked:
+        comp_supply, comp_demand = pockets[p]
+        comp_reach = reach[
+            np.ix_([dest_position[did] for did in comp_demand], [source_position[sid] for sid in comp_supply])
+        ]
+        edge_dest, edge_source = np.nonzero(comp_reach)
+        max_flow_blocks.append(
+            TransportBlock(
+                supplies=np.array(list(comp_supply.values())),
+                demands=np.array(list(comp_demand.values())),
+                edge_source=edge_source,
+                edge_dest=edge_dest,
+                edge_cost=np.zeros(len(edge_source)),
+            )
+        )
+    max_flows = solve_transport_blocks(max_flow_blocks, maximise_flow=True)
 
-        # Per-source structural feasibility check.  Even when total supply == total
-        # demand within the component, sub-component reachability (Hall's condition)
-        # can make the transportation problem infeasible — e.g. 3 dests reachable
-        # only by source A whose capped supply is less than their combined demand,
-        # while B/C have surplus they can't ship anywhere because every other dest
-        # is more than the radius from them.  We compute max-flow on the bipartite
-        # supply/demand graph and, when it falls short of the (already balanced)
-        # total demand, use the max-flow's per-edge flow assignment to set new
-        # supply / demand caps. Reading the actual per-source / per-dest flow values
-        # — instead of uniformly scaling everything by max_flow / total — preserves
-        # Hall's condition by construction: the max-flow assignment IS a feasible
-        # flow under those caps, so the downstream min-cost-flow cannot be
-        # infeasible. Uniform scaling preserved only the global total and could
-        # leave constrained sources still over-supplied relative to the dests they
-        # can reach.
+    for position, p in enumerate(checked):
+        comp_supply, comp_demand = pockets[p]
         comp_total = sum(comp_demand.values())
-        if comp_total > 1.0 and len(comp_supply) > 1 and len(comp_demand) > 1:
-            mf = nx.DiGraph()
-            SUPER_SRC = "__mf_src__"
-            SUPER_SNK = "__mf_snk__"
-            for sid, sup in comp_supply.items():
-                mf.add_edge(SUPER_SRC, f"s_{sid}", capacity=sup)
-            for did, dem in comp_demand.items():
-                mf.add_edge(f"d_{did}", SUPER_SNK, capacity=dem)
-            for sid in comp_supply:
-                sloc = source_locations.get(sid)
-                for did in comp_demand:
-                    dloc = dest_locations.get(did)
-                    if sloc is None or dloc is None or (_calculate_distance_km(sloc, dloc) <= config.hot_metal_radius):
-                        mf.add_edge(f"s_{sid}", f"d_{did}", capacity=float("inf"))
-            try:
-                max_flow_value, flow_dict = nx.maximum_flow(mf, SUPER_SRC, SUPER_SNK)
-            except (nx.NetworkXError, nx.NetworkXUnfeasible):
-                max_flow_value = comp_total  # leave it to the downstream solver
-                flow_dict = None
-            if max_flow_value < comp_total - 1.0:
-                pre_demand2 = dict(comp_demand)
-                if flow_dict is not None:
-                    # Per-source / per-dest scaling using the max-flow's flow
-                    # assignment.  drainable[s] = total outflow from source s in
-                    # the max-flow result; achievable[d] = total inflow into
-                    # dest d.  By construction Σ drainable = Σ achievable =
-                    # max_flow_value, AND the max-flow assignment is itself a
-                    # feasible flow respecting these per-node caps — so the
-                    # downstream min-cost-flow is guaranteed feasible.
-                    drainable = {sid: float(flow_dict.get(SUPER_SRC, {}).get(f"s_{sid}", 0.0)) for sid in comp_supply}
-                    achievable = {did: float(flow_dict.get(f"d_{did}", {}).get(SUPER_SNK, 0.0)) for did in comp_demand}
-                    comp_supply = drainable
-                    comp_demand = achievable
-                    scaling_mode = "per-source/per-dest from max-flow"
-                else:
-                    # Fallback: max_flow raised. Use uniform scaling — the
-                    # legacy behaviour, retained as a safety net for the very
-                    # rare case where networkx couldn't compute max-flow.
-                    feasibility_scale = max_flow_value / comp_total
-                    comp_demand = {did: d * feasibility_scale for did, d in comp_demand.items()}
-                    new_total_d = sum(comp_demand.values())
-                    new_total_s = sum(comp_supply.values())
-                    if new_total_s > new_total_d + 0.01:
-                        supply_scale = new_total_d / new_total_s
-                        comp_supply = {sid: s * supply_scale for sid, s in comp_supply.items()}
-                    scaling_mode = "uniform (max_flow fallback)"
-
-                # Per-dest unmet demand bookkeeping is the same regardless of
-                # which scaling path we took.
-                for did, d_before in pre_demand2.items():
-                    extra_shortfall = d_before - comp_demand[did]
-                    if extra_shortfall > 1.0:
-                        merged_stats["dest_unmet_demand"][did] = (  # type: ignore[index]
-                            merged_stats["dest_unmet_demand"].get(did, 0.0) + extra_shortfall  # type: ignore[union-attr,attr-defined]
-                        )
+        if max_flows is not None:
+            block = max_flow_blocks[position]
+            edge_flows = max_flows[position]
+            max_flow_value = float(edge_flows.sum())
+        else:
+            max_flow_value = comp_total  # leave it to the downstream solver
+        if max_flow_value >= comp_total - 1.0:
+            continue
 
-                feasibility_scale = max_flow_value / comp_total
-                logger.warning(
-                    f"[DISAGGREGATION] Strict-radius pocket has per-source reachability "
-                    f"infeasibility ({context_label or commodity}): max-flow="
-                    f"{max_flow_value:.1f}t < balanced total={comp_total:.1f}t; "
-                    f"applying {scaling_mode} scaling so every destination's demand is "
-                    f"reachable from its in-radius suppliers (net reduction "
-                    f"{(1.0 - feasibility_scale) * 100:.1f}%)."
+        pre_demand2 = dict(comp_demand)
+        # Per-source / per-dest scaling using the max-flow's flow
+        # assignment.  drainable[s] = total outflow from source s in
+        # the max-flow result; achievable[d] = total inflow into
+        # dest d.  By construction Σ drainable = Σ achievable =
+        # max_flow_value, AND the max-flow assignment is itself a
+        # feasible flow respecting these per-node caps — so the
+        # downstream min-cost problem is guaranteed feasible.
+        drainable = np.bincount(block.edge_source, weights=edge_flows, minlength=len(comp_supply))
+        achievable = np.bincount(block.edge_dest, weights=edge_flows, minlength=len(comp_demand))
+        comp_supply = dict(zip(comp_supply, drainable.tolist()))
+        comp_demand = dict(zip(comp_demand, achievable.tolist()))
+        pockets[p] = (comp_supply, comp_demand)
+
+        for did, d_before in pre_demand2.items():
+            extra_shortfall = d_before - comp_demand[did]
+            if extra_shortfall > 1.0:
+                merged_stats["dest_unmet_demand"][did] = (  # type: ignore[index]
+                    merged_stats["dest_unmet_demand"].get(did, 0.0) + extra_shortfall  # type: ignore[union-attr,attr-defined]
                 )
 
-        # Solve this component independently.  strict_radius=True inside the
-        # batched solver ensures individual edges beyond the radius are still
-        # omitted (belt-and-braces; the component graph already guarantees
-        # feasibility, but the solver's own radius check is cheap insurance).
-        flows, stats = _solve_batched_transportation_problem(
-            source_supplies=comp_supply,
-            dest_demands=comp_demand,
-            source_locations=source_locations,
-            dest_locations=dest_locations,
-            commodity=commodity,
-            config=config,
-            allocation_costs=allocation_costs,
+        feasibility_scale = max_flow_value / comp_total
+        logger.warning(
+            f"[DISAGGREGATION] Strict-radius pocket has per-source reachability "
+            f"infeasibility ({context_label or commodity}): max-flow="
+            f"{max_flow_value:.1f}t < balanced total={comp_total:.1f}t; "
+            f"applying per-source/per-dest from max-flow scaling so every destination's demand is "
+            f"reachable from its in-radius suppliers (net reduction "
+            f"{(1.0 - feasibility_scale) * 100:.1f}%)."
+        )
+
+    # Solve all components together as one block-diagonal LP.  strict_radius=True
+    # ensures individual edges beyond the radius are still omitted (belt-and-braces;
+    # the component graph already guarantees feasibility).
+    problems = []
+    for comp_supply, comp_demand in pockets:
+        problem = _build_transport_problem(
+            comp_supply,
+            comp_demand,
+            source_locations,
+            dest_locations,
+            commodity,
+            config,
+            allocation_costs,
             is_hot_commodity=True,
             strict_radius=True,
-            context_label=context_label,
         )
+        if problem is not None:
+            problems.append(problem)
+    solutions = solve_transport_blocks([problem.block for problem in problems])
+    if solutions is None:
+        # Some component is infeasible: solve them one by one, which reports (and raises on) the culprit
+        component_results = [
+            _solve_batched_transportation_problem(
+                source_supplies=comp_supply,
+                dest_demands=comp_demand,
+                source_locations=source_locations,
+                dest_locations=dest_locations,
+                commodity=commodity,
+                config=config,
+                allocation_costs=allocation_costs,
+                is_hot_commodity=True,
+                strict_radius=True,
+                context_label=context_label,
+            )
+            for comp_supply, comp_demand in pockets
+        ]
+    else:
+        component_results = [
+            _transport_flows_and_stats(problem, edge_flows, commodity)
+            for problem, edge_flows in zip(problems, solutions)
+        ]
 
+    for flows, stats in component_results:
         merged_flows.update(flows)
         merged_stats["total_pairs"] += stats.get("total_pairs", 0)  # type: ignore[operator]
         merged_stats["used_edges"] += stats.get("used_edges", 0)  # type: ignore[operator]
@@ -1950,6 +1939,7 @@ def _solve_transportation_problem(
     aggregated_constraints: list | None = None,
     source_shares: dict[str, float] | None = None,
     dest_shares: dict[str, float] | None = None,
+    distance_matrix: "DistanceMatrix | None" = None,
 ) -> tuple[dict[tuple[str, str], float], dict]:
     """Solve transportation problem for meta-FG → meta-FG (Case 4).
 
@@ -1975,6 +1965,7 @@ def _solve_transportation_problem(
             Case 2 / Case 3 is required for BOM to hold at the FG level.
         dest_shares: Optional override for dest-side per-FG split.  Same rationale as
             ``source_shares`` but on the destination side.
+        distance_matrix: Optional shared distance matrix for the hot-metal reach checks.
 
     Returns:
         Tuple of (flow_dict, stats_dict)
@@ -2052,6 +2043,7 @@ def _solve_transportation_problem(
             hot_metal_radius=config.hot_metal_radius,
             strict_radius=True,
             context_label=context_label,
+            distance_matrix=distance_matrix,
         )
     else:
         # Non-strict (cold commodity, or hot commodity with no min-constraint):
@@ -2079,12 +2071,9 @@ def _solve_transportation_problem(
         )
 
     # When strict_radius is on, the cluster may contain geographically separated
-    # pockets. Running one big min-cost-flow over the whole cluster causes integer-
-    # flooring mismatches to propagate across pockets (the rebalancing step shifts
-    # rounding error to a destination that might be unreachable from the source that
-    # lost the fraction). Instead, decompose the problem into connected components
-    # of the feasibility graph — each pocket gets its own balanced sub-problem so
-    # rounding is always local to nodes that can actually cover each other.
+    # pockets whose supply and demand must balance locally. Decompose the problem
+    # into connected components of the feasibility graph — each pocket gets its own
+    # balanced sub-problem (all solved together as one block-diagonal LP).
     if strict_radius:
         return _solve_strict_by_components(
             source_supplies=source_supplies,
@@ -2119,6 +2108,7 @@ def _compute_effective_shares_by_cluster(
     config: "SimulationConfig",
     aggregated_constraints: list | None = None,
     case2_batches: dict | None = None,
+    distance_matrix: "DistanceMatrix | None" = None,
 ) -> dict[str, dict[str, float]]:
     """Compute per-FG "effective shares" for each cluster, reflecting geographic reality.
 
@@ -2164,6 +2154,7 @@ def _compute_effective_shares_by_cluster(
             Used to include outgoing cluster→demand flows in the effective_share calculation
             so FGs that export cold product (no strict radius) contribute their capacity
             share to the totals.
+        distance_matrix: Optional shared distance matrix for the hot-metal reach checks.
 
     Returns:
         `{cluster_id: {fg_id: effective_share, ...}, ...}` — shares sum to 1 per cluster,
@@ -2302,6 +2293,7 @@ def _compute_effective_shares_by_cluster(
             hot_metal_radius=config.hot_metal_radius,
             strict_radius=False,
             context_label=f"{commodity_name} → {to_meta_fg_id} (effective-shares)",
+            distance_matrix=distance_matrix,
         )
 
         # Renormalize per-cluster supplies to LP volumes to prevent cross-cluster attribution.
@@ -2565,8 +2557,8 @@ def _validate_disaggregated_allocations(
     blended charges (hot_metal + pig_iron + scrap, for example), each charge's
     normalised share contributes to the sum; at LP BOM balance they add to 1.
 
-    ``BOM_TOL = 0.03`` (3 %).  Residual numerical noise comes from integer rounding
-    in the min-cost-flow solver, commodity substitution at the radius boundary, and
+    ``BOM_TOL = 0.03`` (3 %).  Residual numerical noise comes from LP solver
+    tolerances, commodity substitution at the radius boundary, and
     small mass-balance deltas when a capacity-capped FG scales its inputs down (see
     ``_bom_fix_up_per_fg``).  The systematic ratio-approximation error is removed
     by the fix-up pass, which recomputes each FG's output directly from the BOM
@@ -2647,8 +2639,8 @@ def _validate_disaggregated_allocations(
     BOM_TOL = 0.03  # 3% deviation from the unit total-share.  The per-FG BOM fix-up
     # (``_bom_fix_up_per_fg``) removes the systematic ratio-approximation error by
     # recomputing each FG's output directly from the BOM equation; this tolerance is
-    # left at 3% for residual numerical noise (integer rounding in the min-cost-flow
-    # solver, commodity-substitution rounding, etc.).
+    # left at 3% for residual numerical noise (transportation LP
+    # tolerances, commodity-substitution rounding, etc.).
     bom_violations: list[str] = []
     for fg_id in sorted(all_fg_ids):
         mfg = fg_to_meta.get(fg_id)  # type: ignore[assignment]
@@ -2840,6 +2832,7 @@ def _rebalance_case3_for_cluster_drift(
     return new_batches
 
 
+@traced()
 def disaggregate_allocations(
     clustered_allocations: "Allocations",
     meta_furnace_groups: list[MetaFurnaceGroup],
@@ -2848,6 +2841,7 @@ def disaggregate_allocations(
     transport_kpis: list | None = None,
     willingness_to_pay: list | None = None,
     aggregated_constraints: list | None = None,
+    distance_matrix: "DistanceMatrix | None" = None,
 ) -> "Allocations":
     """Disaggregate LP allocations from meta-furnace groups (clusters) to individual FGs.
 
@@ -2931,7 +2925,7 @@ def disaggregate_allocations(
       strict, it recomputes the FG's output directly from the BOM equation
       (``steel_j = Σ_X charge_in_j,X / expected_ratio_X``) and rescales outgoing flows
       to match.  ``BOM_TOL = 0.03`` then absorbs only residual numerical noise
-      (integer rounding in the solver, etc.).
+      (solver tolerances, etc.).
     * **Stranded material at source FGs when a BOF is capacity-capped**.  If the
       BOM-ideal output for a BOF FG exceeds its physical capacity, the fix-up caps
       the output and scales the FG's inputs down proportionally.  The scaled-down
@@ -2952,6 +2946,8 @@ def disaggregate_allocations(
         willingness_to_pay: Optional list of WillingnessToPay objects
         aggregated_constraints: Optional list of ``AggregatedMetallicChargeConstraint``
             (wildcard feedstock minimums that trigger strict radius on hot commodities).
+        distance_matrix: Optional shared distance matrix (``Environment.distance_matrix``) for the
+            hot-metal reach checks; computed on the fly when omitted.
 
     Returns:
         Allocations: New allocations object with individual FG ProcessCenters.
@@ -3144,6 +3140,7 @@ def disaggregate_allocations(
         config=config,
         aggregated_constraints=aggregated_constraints,
         case2_batches=case2_batches,
+        distance_matrix=distance_matrix,
     )
     # Log any cluster where effective shares diverge from capacity shares (i.e. the
     # cluster is geographically split — the reach-based split is doing real work here).
@@ -3329,6 +3326,7 @@ def disaggregate_allocations(
                 hot_metal_radius=config.hot_metal_radius,
                 strict_radius=True,
                 context_label=context_label,
+                distance_matrix=distance_matrix,
             )
 
             # Renormalize per-cluster FG supplies to LP volumes to prevent cross-cluster
@@ -3838,6 +3836,7 @@ def disaggregate_allocations(
             transport_cost_lookup=transport_cost_lookup,
             wtp_lookup=wtp_lookup,
             aggregated_constraints=aggregated_constraints,
+            distance_matrix=distance_matrix,
         )
 
         # Track statistics
@@ -0,0 +1,733 @@
+"""Direct HiGHS matrix backend for the trade LP.
+
+The Pyomo path in ``TradeLPModel.build_lp_model`` creates one ``Var`` per legal allocation and one
+expression object per constraint term, which Pyomo then has to translate again into HiGHS' column-wise
+arrays. For models with hundreds of thousands of allocations that generation step costs about as much
+time as the solve itself and dominates peak memory.
+
+This module builds the *same* constraint set straight into sparse COO arrays (collapsed into CSC with
+``scipy.sparse``) from the index maps ``TradeLPModel`` already computes (inbound/outbound arcs, BOM
+groupings, ratio sets, ...) and passes them to ``highspy`` without any Pyomo expression objects.
+
+Variables are represented by ``MatrixColumnSet``, a name-keyed stand-in for a Pyomo indexed ``Var`` that
+supports the small part of the ``Var`` API the set-up code relies on (iteration over keys, membership and
+``.fix(0)``), so helpers such as ``fix_to_zero_allocations_where_distance_doesnt_match_commodity`` work
+unchanged for both backends.
+"""
+
+import logging
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+import highspy
+import numpy as np
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+from scipy import sparse
+
+if TYPE_CHECKING:
+    from steelo.domain.trade_modelling.trade_lp_modelling import TradeLPModel
+
+logger = logging.getLogger(__name__)
+
+INPUT_RATIO = "input_ratio"
+MINIMUM_RATIO = "minimum_ratio"
+MAXIMUM_RATIO = "maximum_ratio"
+
+# Names of HighsMatrixLP.column_sets, in column order
+COLUMN_SET_NAMES = ("allocation", "demand_slack", "minimum_capacity_slack")
+
+# HiGHS model status → (legacy Pyomo termination condition, legacy Pyomo solver status), mirroring appsi_highs
+_STATUS_MAP: dict[Any, tuple[TerminationCondition, SolverStatus]] = {
+    highspy.HighsModelStatus.kOptimal: (TerminationCondition.optimal, SolverStatus.ok),
+    highspy.HighsModelStatus.kInfeasible: (TerminationCondition.infeasible, SolverStatus.error),
+    highspy.HighsModelStatus.kUnbounded: (TerminationCondition.unbounded, SolverStatus.error),
+    highspy.HighsModelStatus.kUnboundedOrInfeasible: (TerminationCondition.infeasibleOrUnbounded, SolverStatus.error),
+    highspy.HighsModelStatus.kTimeLimit: (TerminationCondition.maxTimeLimit, SolverStatus.aborted),
+    highspy.HighsModelStatus.kIterationLimit: (TerminationCondition.maxIterations, SolverStatus.aborted),
+}
+
+
+class MatrixColumn:
+    """One LP column: its position in the matrix and whether it is fixed (to ``value``)."""
+
+    __slots__ = ("fixed", "index", "value")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.fixed = False
+        self.value: float | None = None
+
+    def fix(self, value: float | None = None) -> None:
+        self.fixed = True
+        if value is not None:
+            self.value = value
+
+    def unfix(self) -> None:
+        self.fixed = False
+
+    def set_value(self, value: float) -> None:
+        self.value = value
+
+
+class MatrixColumnSet(dict):
+    """Name-keyed columns standing in for a Pyomo indexed ``Var`` in the ``highs`` backend.
+
+    Column indices are local to the set (0..n-1); ``HighsMatrixLP`` assigns the global offset of each set.
+    """
+
+    def __init__(self, keys: Iterable[Any]):
+        super().__init__()
+        for key in keys:
+            if key not in self:
+                self[key] = MatrixColumn(len(self))
+
+    def index_set(self):
+        return list(self.keys())
+
+
+class HighsMatrixLP:
+    """Sparse, column-wise representation of the trade LP, solved directly with highspy.
+
+    Column layout: allocation variables first (in ``legal_allocations`` order), then demand slacks, then soft
+    minimum capacity slacks. Row order follows the constraint order of the Pyomo path.
+    """
+
+    def __init__(
+        self,
+        allocation_keys: list[tuple[str, str, str]],
+        column_sets: list[MatrixColumnSet],
+        col_cost: np.ndarray,
+        matrix: sparse.csc_matrix,
+        row_lower: np.ndarray,
+        row_upper: np.ndarray,
+        row_families: dict[str, int],
+        row_keys: list[tuple[str, Any]] | None = None,
+    ):
+        self.allocation_keys = allocation_keys
+        self.column_sets = column_sets
+        self.col_cost = col_cost
+        self.matrix = matrix
+        self.row_lower = row_lower
+        self.row_upper = row_upper
+        self.row_families = row_families
+        # (constraint family, constraint index) per row; lets PersistentHighsSolver match rows across years
+        self.row_keys = row_keys if row_keys is not None else []
+        self.col_value: np.ndarray | None = None
+        self.model_status: highspy.HighsModelStatus | None = None
+
+    @property
+    def num_col(self) -> int:
+        return self.matrix.shape[1]
+
+    @property
+    def num_row(self) -> int:
+        return self.matrix.shape[0]
+
+    @classmethod
+    def from_trade_lp(cls, trade_lp: "TradeLPModel") -> "HighsMatrixLP":
+        """Assemble the constraint matrix, bounds and objective from a TradeLPModel whose parameter maps are built.
+
+        Expects ``build_lp_model`` to have run all parameter and map steps (``add_allocation_maps_to_parameters``,
+        ``add_bom_inflow_maps_to_parameters``, ``add_ratio_constraint_maps_to_parameters``,
+        ``add_dependent_commodity_maps_to_parameters`` and, if configured, the aggregate commodity maps).
+        """
+        start_time = time.time()
+        m = trade_lp.lp_model
+        allocation_columns: MatrixColumnSet = m.allocation_variables
+        demand_slack: MatrixColumnSet = m.demand_slack_variable
+        min_capacity_slack: MatrixColumnSet = m.minimum_capacity_slack_variable
+
+        n_alloc = len(allocation_columns)
+        demand_offset = n_alloc
+        min_capacity_offset = demand_offset + len(demand_slack)
+        n_cols = min_capacity_offset + len(min_capacity_slack)
+
+        allocation_keys = list(allocation_columns.keys())
+        col_of = {key: column.index for key, column in allocation_columns.items()}
+
+        # ---------- Objective ----------
+        col_cost = np.zeros(n_cols)
+        allocation_costs = m.allocation_costs
+        if n_alloc:
+            col_cost[:n_alloc] = np.fromiter(
+                (allocation_costs[key] for key in allocation_keys), dtype=float, count=n_alloc
+            ) / float(trade_lp.real_life_costs_normalization_factor)
+        allocation_cost_values = list(allocation_costs.values())
+        largest_allocation_cost = max(allocation_cost_values) if allocation_cost_values else 1.0
+        col_cost[demand_offset:min_capacity_offset] = max(trade_lp.demand_slack_cost, largest_allocation_cost * 5)
+        col_cost[min_capacity_offset:] = trade_lp.soft_minimum_capacity_slack_cost
+
+        # ---------- Rows ----------
+        rows = _RowBuffer()
+        inf = highspy.kHighsInf
+        pc_type = {pc.name: pc.process.type.value for pc in trade_lp.process_centers}
+        outbound_arcs = m.outbound_arcs
+        inbound_arcs = m.inbound_arcs
+
+        def cols(arcs) -> list[int]:
+            return [col_of[arc] for arc in arcs]
+
+        # Aggregate commodity ratio constraints (max, then min)
+        if trade_lp.aggregated_commodity_constraints is not None:
+            for params, lower, upper, family in (
+                (m.maximum_aggregate_commodity_constraints_params, -inf, 0.0, "aggregate_maximum_ratio"),
+                (m.minimum_aggregate_commodity_constraints_params, 0.0, inf, "aggregate_minimum_ratio"),
+            ):
+                for key, ratio in params.items():
+                    all_inbound = m.all_inbound_allocations_agg.get(key)
+                    matching = m.allocations_of_bom_commodity_agg.get(key) or ()
+                    if not all_inbound or (not matching and key not in m.aggregate_masks_with_pruned_inbound):
+                        continue
+                    rows.add(
+                        cols(matching) + cols(all_inbound),
+                        [1.0] * len(matching) + [-ratio] * len(all_inbound),
+                        lower,
+                        upper,
+                        family,
+                        key,
+                    )
+
+        # Production capacity: outflow <= capacity
+        for pc in trade_lp.process_centers:
+            if pc_type[pc.name] not in ("production", "supply"):
+                continue
+            arcs = outbound_arcs[pc.name]
+            if not arcs:
+                continue
+            rows.add(cols(arcs), 1.0, -inf, m.capacities[pc.name], "production", pc.name)
+
+        # Demand: steel inflow + slack == demand
+        for pc in trade_lp.process_centers:
+            if pc_type[pc.name] != "demand" or pc.capacity is None:
+                continue
+            steel_cols = [col_of[arc] for arc in inbound_arcs[pc.name] if arc[2] == "steel"]
+            slack_col = demand_offset + demand_slack[pc.name].index
+            rows.add(steel_cols + [slack_col], 1.0, m.capacities[pc.name], m.capacities[pc.name], "demand", pc.name)
+
+        # BOM inflow: sum(input / input_ratio) - sum(output) == 0
+        ratio_inv = m._bom_ratio_inv
+        for key in m.bom_inflow_constraint_keys:
+            incoming = m.allocations_incoming_ingredients.get(key, ())
+            outgoing = m.allocations_outgoing_product.get(key, ())
+            if not incoming and not outgoing:
+                continue
+            rows.add(
+                cols(incoming) + cols(outgoing),
+                [ratio_inv[t, c] for (_f, t, c) in incoming] + [-1.0] * len(outgoing),
+                0.0,
+                0.0,
+                "bom_inflow",
+                key,
+            )
+
+        # BOM minimum / maximum ratios (max first, as in the Pyomo path)
+        for parameter, lower, upper, family in (
+            (MAXIMUM_RATIO, -inf, 0.0, "maximum_ratio"),
+            (MINIMUM_RATIO, 0.0, inf, "minimum_ratio"),
+        ):
+            for pc_name, bom_c in _ratio_constraint_keys(trade_lp, parameter):
+                same_output = m.allocations_that_produce_same_outputs.get((pc_name, bom_c))
+                bom_commodity = m.allocations_of_bom_commodity.get((pc_name, bom_c)) or ()
+                if not same_output or (not bom_commodity and not trade_lp.has_pruned_inbound(pc_name, (bom_c,))):
+                    continue
+                ratio = m.bom_parameters[pc_name, bom_c, parameter]
+                rows.add(
+                    cols(bom_commodity) + cols(same_output),
+                    [1.0] * len(bom_commodity) + [-ratio] * len(same_output),
+                    lower,
+                    upper,
+                    family,
+                    (pc_name, bom_c),
+                )
+
+        # Trade quotas
+        for tariff_key, arcs in m.quota_allocations.items():
+            rows.add(cols(arcs), 1.0, -inf, trade_lp.tariff_quotas_by_iso3[tariff_key], "trade_quota", tariff_key)
+
+        # Soft minimum capacity: outflow + slack >= soft_min * capacity
+        for pc_name, soft_minimum in m.soft_minimum_capacities.items():
+            arcs = outbound_arcs[pc_name]
+            if not arcs and pc_name not in trade_lp.pruned_outbound:
+                continue
+            arc_cols = cols(arcs)
+            coefficients = [1.0] * len(arc_cols)
+            if pc_name in min_capacity_slack:
+                arc_cols.append(min_capacity_offset + min_capacity_slack[pc_name].index)
+                coefficients.append(1.0)
+            rows.add(
+                arc_cols, coefficients, soft_minimum * m.capacities[pc_name], inf, "soft_minimum_capacity", pc_name
+            )
+
+        # Secondary feedstock availability
+        for commodity_name, limits in trade_lp.secondary_feedstock_constraints.items():
+            for iso3_key, max_allocation in limits.items():
+                arcs = m.secondary_feestock_constraints_allocations.get(commodity_name, {}).get(iso3_key, [])
+                if not arcs:
+                    continue
+                rows.add(cols(arcs), 1.0, -inf, max_allocation, "secondary_feedstock", (commodity_name, iso3_key))
+
+        # Dependent commodities: inflow of dependent commodity == sum(ratio * inflow of primary input)
+        for pc_name, dep_com_name in dict.fromkeys(m.dependent_commodities_constraint_index):
+            sources = m.allocations_of_dependent_commodities_to_pc.get((pc_name, dep_com_name), [])
+            if not sources and not trade_lp.has_pruned_inbound(pc_name, (dep_com_name,)):
+                continue
+            needing = [
+                (f, t, c)
+                for (f, t, c) in m.allocations_of_boms_that_need_dependent_commodity_to_pc.get(
+                    (pc_name, dep_com_name), []
+                )
+                if (pc_name, c, dep_com_name) in m.dependent_commodities
+            ]
+            if not sources and not needing:
+                continue
+            rows.add(
+                cols(sources) + cols(needing),
+                [1.0] * len(sources) + [-m.dependent_commodities[pc_name, c, dep_com_name] for (_f, _t, c) in needing],
+                0.0,
+                0.0,
+                "dependent_commodities",
+                (pc_name, dep_com_name),
+            )
+
+        matrix, row_lower, row_upper = rows.to_csc(n_cols)
+        logger.info(
+            f"operation=build_highs_matrix columns={n_cols} rows={matrix.shape[0]} nonzeros={matrix.nnz} "
+            f"duration_s={time.time() - start_time:.3f}"
+        )
+        return cls(
+            allocation_keys=allocation_keys,
+            column_sets=[allocation_columns, demand_slack, min_capacity_slack],
+            col_cost=col_cost,
+            matrix=matrix,
+            row_lower=row_lower,
+            row_upper=row_upper,
+            row_families=rows.families,
+            row_keys=rows.keys,
+        )
+
+    def column_bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return (lower, upper) column bounds, honouring columns fixed since the matrix was built."""
+        lower = np.zeros(self.num_col)
+        upper = np.full(self.num_col, highspy.kHighsInf)
+        offset = 0
+        for column_set in self.column_sets:
+            for column in column_set.values():
+                if column.fixed:
+                    fixed_value = column.value if column.value is not None else 0.0
+                    lower[offset + column.index] = fixed_value
+                    upper[offset + column.index] = fixed_value
+            offset += len(column_set)
+        return lower, upper
+
+    @property
+    def col_keys(self) -> list[tuple[str, Any]]:
+        """(column set, name) per column, in matrix order."""
+        return [
+            (set_name, key) for set_name, column_set in zip(COLUMN_SET_NAMES, self.column_sets) for key in column_set
+        ]
+
+    def solve(
+        self,
+        solver_options: dict[str, Any],
+        random_seed: int,
+        warm_start: dict[tuple[str, str, str], float] | None = None,
+    ) -> SolverResults:
+        """Pass the arrays to highspy, run it and store the column values.
+
+        Returns a legacy Pyomo ``SolverResults`` so callers can treat both backends alike.
+        """
+        highs = _configured_highs(solver_options, random_seed)
+        self.pass_model_to(highs)
+
+        if warm_start:
+            col_of = self.column_sets[0]
+            start_values = np.zeros(self.num_col)
+            for key, value in warm_start.items():
+                column = col_of.get(key)
+                if column is not None:
+                    start_values[column.index] = value
+            solution = highspy.HighsSolution()
+            solution.col_value = start_values
+            solution.value_valid = True
+            solution.dual_valid = False
+            highs.setSolution(solution)
+
+        highs.run()
+        return self.read_solution_from(highs)
+
+    def pass_model_to(self, highs: highspy.Highs) -> None:
+        """Load the full model into ``highs``, replacing whatever it held."""
+        lp = highspy.HighsLp()
+        lp.num_col_ = self.num_col
+        lp.num_row_ = self.num_row
+        col_lower, col_upper = self.column_bounds()
+        lp.col_cost_ = self.col_cost
+        lp.col_lower_ = col_lower
+        lp.col_upper_ = col_upper
+        lp.row_lower_ = self.row_lower
+        lp.row_upper_ = self.row_upper
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.start_ = self.matrix.indptr
+        lp.a_matrix_.index_ = self.matrix.indices
+        lp.a_matrix_.value_ = self.matrix.data
+        highs.passModel(lp)
+
+    def read_solution_from(self, highs: highspy.Highs, col_order: np.ndarray | None = None) -> SolverResults:
+        """Store the model status and column values of a finished run.
+
+        ``col_order[i]`` is the matrix column held at HiGHS position ``i`` when the two orders differ (persistent
+        models append new columns at the end).
+        """
+        self.model_status = highs.getModelStatus()
+        termination_condition, status = _STATUS_MAP.get(
+            self.model_status, (TerminationCondition.unknown, SolverStatus.unknown)
+        )
+        if termination_condition == TerminationCondition.optimal:
+            highs_values = np.asarray(highs.getSolution().col_value, dtype=float)
+            if col_order is None:
+                self.col_value = highs_values
+            else:
+                self.col_value = np.empty(self.num_col)
+                self.col_value[col_order] = highs_values
+        else:
+            self.col_value = None
+
+        result = SolverResults()
+        result.solver.status = status
+        result.solver.termination_condition = termination_condition
+        return result
+
+    def values_of(self, set_position: int, minimum: float | None = None) -> dict[Any, float]:
+        """Return the solved value of every column in ``column_sets[set_position]``, keyed by name.
+
+        With ``minimum``, only columns whose value is at least ``minimum`` are returned (filtered on the array).
+        """
+        if self.col_value is None:
+            return {}
+        offset = sum(len(column_set) for column_set in self.column_sets[:set_position])
+        column_set = self.column_sets[set_position]
+        values = self.col_value[offset : offset + len(column_set)]
+        if minimum is None:
+            return dict(zip(column_set.keys(), values.tolist()))
+        keys = self.allocation_keys if set_position == 0 else list(column_set.keys())
+        selected = np.flatnonzero(values >= minimum)
+        return dict(zip([keys[i] for i in selected.tolist()], values[selected].tolist()))
+
+
+class PersistentHighsSolver:
+    """Keeps one HiGHS instance alive across simulation years and updates it in place.
+
+    Between consecutive years most process centers, connectors and legal allocations stay the same; capacities,
+    demand, costs and tariffs change, and a few furnace groups open or close. ``solve`` matches the new year's
+    ``HighsMatrixLP`` against the loaded model by column and row keys, deletes the columns/rows that disappeared,
+    appends the new ones and pushes only the changed coefficients, costs and bounds. HiGHS keeps its basis through
+    these edits, so the following simplex run starts from last year's optimal basis.
+
+    Falls back to a full reload when the rows cannot be matched by key or when more than ``max_changed_fraction``
+    of the matrix entries changed (then re-sending the model is cheaper than editing it).
+    """
+
+    def __init__(self, max_changed_fraction: float = 0.2):
+        self.max_changed_fraction = max_changed_fraction
+        self.full_loads = 0
+        self.incremental_updates = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._highs: highspy.Highs | None = None
+        self._solver_options: dict[str, Any] = {}
+        self._random_seed = 0
+        # Basis statuses (columns, rows) of the loaded model kept by a pickled solver; see __getstate__
+        self._basis: tuple[np.ndarray, np.ndarray] | None = None
+        self._col_keys: list[tuple[str, Any]] = []
+        self._row_keys: list[tuple[str, Any]] = []
+        self._matrix: sparse.csc_matrix | None = None
+        self._col_cost = np.zeros(0)
+        self._col_lower = np.zeros(0)
+        self._col_upper = np.zeros(0)
+        self._row_lower = np.zeros(0)
+        self._row_upper = np.zeros(0)
+
+    def __getstate__(self):
+        # HiGHS instances cannot be pickled (run snapshots). The loaded model is kept in the arrays below, so only
+        # the basis is added; a restored solver rebuilds the instance and continues exactly as the live one would.
+        state = self.__dict__.copy()
+        state["_highs"] = None
+        if self._highs is not None:
+            basis = self._highs.getBasis()
+            state["_basis"] = (
+                (
+                    np.array([int(status) for status in basis.col_status], dtype=np.int8),
+                    np.array([int(status) for status in basis.row_status], dtype=np.int8),
+                )
+                if basis.valid
+                else None
+            )
+        return state
+
+    def _rebuild(self, matrix: sparse.csc_matrix) -> highspy.Highs:
+        """Re-create the HiGHS instance of an unpickled solver from the stored model (``matrix``) and basis."""
+        highs = _configured_highs(self._solver_options, self._random_seed)
+        lp = highspy.HighsLp()
+        lp.num_col_ = len(self._col_cost)
+        lp.num_row_ = len(self._row_lower)
+        lp.col_cost_ = self._col_cost
+        lp.col_lower_ = self._col_lower
+        lp.col_upper_ = self._col_upper
+        lp.row_lower_ = self._row_lower
+        lp.row_upper_ = self._row_upper
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.start_ = matrix.indptr
+        lp.a_matrix_.index_ = matrix.indices
+        lp.a_matrix_.value_ = matrix.data
+        highs.passModel(lp)
+        if self._basis is not None:
+            basis = highspy.HighsBasis()
+            basis.col_status = [highspy.HighsBasisStatus(int(status)) for status in self._basis[0]]
+            basis.row_status = [highspy.HighsBasisStatus(int(status)) for status in self._basis[1]]
+            highs.setBasis(basis)
+            self._basis = None
+        self._highs = highs
+        return highs
+
+    def solve(self, matrix_lp: HighsMatrixLP, solver_options: dict[str, Any], random_seed: int) -> SolverResults:
+        """Bring the live HiGHS model up to date with ``matrix_lp``, solve it and store the values on ``matrix_lp``."""
+        start_time = time.time()
+        highs = self._highs
+        if highs is None and self._matrix is not None:
+            highs = self._rebuild(self._matrix)
+        update = self._update(highs, matrix_lp) if highs is not None else None
+        if highs is None or update is None:
+            highs = self._load(matrix_lp, solver_options, random_seed)
+            col_order = None
+            stats = {"mode": "full"}
+            self.full_loads += 1
+        else:
+            col_order, stats = update
+            self.incremental_updates += 1
+            for key, option in solver_options.items():
+                highs.setOptionValue(key, option)
+            highs.setOptionValue("random_seed", random_seed)
+            if highs.getBasis().valid and solver_options.get("solver", "ipm") == "ipm":
+                # IPM cannot start from a basis; simplex reuses last year's optimal basis directly
+                logger.info(
+                    "[TM] Persistent trade LP: solving the updated model with simplex (warm start) instead of IPM"
+                )
+                highs.setOptionValue("solver", "simplex")
+        update_elapsed = time.time() - start_time
+
+        highs.run()
+        result = matrix_lp.read_solution_from(highs, col_order)
+        info = highs.getInfo()
+        logger.info(
+            "operation=persistent_lp_solve "
+            + " ".join(f"{key}={value}" for key, value in stats.items())
+            + f" update_duration_s={update_elapsed:.3f} simplex_iterations={info.simplex_iteration_count}"
+            f" ipm_iterations={info.ipm_iteration_count} duration_s={time.time() - start_time:.3f}"
+        )
+        return result
+
+    def _load(self, matrix_lp: HighsMatrixLP, solver_options: dict[str, Any], random_seed: int) -> highspy.Highs:
+        highs = self._highs = _configured_highs(solver_options, random_seed)
+        self._solver_options = dict(solver_options)
+        self._random_seed = random_seed
+        matrix_lp.pass_model_to(highs)
+        self._col_keys = matrix_lp.col_keys
+        self._row_keys = list(matrix_lp.row_keys)
+        self._matrix = matrix_lp.matrix
+        self._col_cost = matrix_lp.col_cost.copy()
+        self._col_lower, self._col_upper = matrix_lp.column_bounds()
+        self._row_lower = matrix_lp.row_lower.copy()
+        self._row_upper = matrix_lp.row_upper.copy()
+        return highs
+
+    def _update(self, highs: highspy.Highs, matrix_lp: HighsMatrixLP) -> tuple[np.ndarray, dict[str, Any]] | None:
+        """Edit the live model into ``matrix_lp``; returns the HiGHS→matrix column order, or None to reload."""
+        if self._matrix is None:
+            return None
+        new_col_keys = matrix_lp.col_keys
+        new_row_keys = matrix_lp.row_keys
+        new_col_pos = {key: i for i, key in enumerate(new_col_keys)}
+        new_row_pos = {key: i for i, key in enumerate(new_row_keys)}
+        if len(new_row_pos) != matrix_lp.num_row or len(new_col_pos) != matrix_lp.num_col:
+            return None
+
+        kept_cols = [i for i, key in enumerate(self._col_keys) if key in new_col_pos]
+        kept_rows = [i for i, key in enumerate(self._row_keys) if key in new_row_pos]
+        kept_col_keys = {self._col_keys[i] for i in kept_cols}
+        kept_row_keys = {self._row_keys[i] for i in kept_rows}
+        # HiGHS compacts surviving columns/rows in their old order and appends new ones at the end
+        col_order = np.array(
+            [new_col_pos[self._col_keys[i]] for i in kept_cols]
+            + [i for i, key in enumerate(new_col_keys) if key not in kept_col_keys],
+            dtype=np.int64,
+        )
+        row_order = np.array(
+            [new_row_pos[self._row_keys[i]] for i in kept_rows]
+            + [i for i, key in enumerate(new_row_keys) if key not in kept_row_keys],
+            dtype=np.int64,
+        )
+
+        target = matrix_lp.matrix.tocsr()[row_order][:, col_order].tocsc()
+        current = self._matrix.tocsr()[kept_rows][:, kept_cols].tocsc()
+        current.resize(target.shape)
+        changed = (target - current).tocoo()
+        changed.eliminate_zeros()
+        if changed.nnz > self.max_changed_fraction * max(target.nnz, 1):
+            return None
+        changed_values = np.asarray(target[changed.row, changed.col]).ravel()
+
+        deleted_cols = np.setdiff1d(np.arange(len(self._col_keys)), kept_cols).astype(np.int32)
+        deleted_rows = np.setdiff1d(np.arange(len(self._row_keys)), kept_rows).astype(np.int32)
+        if deleted_cols.size:
+            highs.deleteCols(deleted_cols.size, deleted_cols)
+        if deleted_rows.size:
+            highs.deleteRows(deleted_rows.size, deleted_rows)
+
+        col_lower, col_upper = matrix_lp.column_bounds()
+        target_cost = matrix_lp.col_cost[col_order]
+        target_col_lower = col_lower[col_order]
+        target_col_upper = col_upper[col_order]
+        target_row_lower = matrix_lp.row_lower[row_order]
+        target_row_upper = matrix_lp.row_upper[row_order]
+
+        n_kept_rows = len(kept_rows)
+        n_new_rows = len(row_order) - n_kept_rows
+        if n_new_rows:
+            highs.addRows(
+                n_new_rows,
+                target_row_lower[n_kept_rows:],
+                target_row_upper[n_kept_rows:],
+                0,
+                np.zeros(n_new_rows, dtype=np.int32),
+                np.zeros(0, dtype=np.int32),
+                np.zeros(0),
+            )
+        n_kept_cols = len(kept_cols)
+        n_new_cols = len(col_order) - n_kept_cols
+        if n_new_cols:
+            highs.addCols(
+                n_new_cols,
+                target_cost[n_kept_cols:],
+                target_col_lower[n_kept_cols:],
+                target_col_upper[n_kept_cols:],
+                0,
+                np.zeros(n_new_cols, dtype=np.int32),
+                np.zeros(0, dtype=np.int32),
+                np.zeros(0),
+            )
+        for row, col, value in zip(changed.row.tolist(), changed.col.tolist(), changed_values.tolist()):
+            highs.changeCoeff(row, col, value)
+
+        cost_changed = np.flatnonzero(target_cost[:n_kept_cols] != self._col_cost[kept_cols]).astype(np.int32)
+        if cost_changed.size:
+            highs.changeColsCost(cost_changed.size, cost_changed, target_cost[cost_changed])
+        bounds_changed = np.flatnonzero(
+            (target_col_lower[:n_kept_cols] != self._col_lower[kept_cols])
+            | (target_col_upper[:n_kept_cols] != self._col_upper[kept_cols])
+        ).astype(np.int32)
+        if bounds_changed.size:
+            highs.changeColsBounds(
+                bounds_changed.size, bounds_changed, target_col_lower[bounds_changed], target_col_upper[bounds_changed]
+            )
+        row_bounds_changed = np.flatnonzero(
+            (target_row_lower[:n_kept_rows] != self._row_lower[kept_rows])
+            | (target_row_upper[:n_kept_rows] != self._row_upper[kept_rows])
+        )
+        for row in row_bounds_changed.tolist():
+            highs.changeRowBounds(row, target_row_lower[row], target_row_upper[row])
+
+        self._col_keys = [new_col_keys[i] for i in col_order]
+        self._row_keys = [new_row_keys[i] for i in row_order]
+        self._matrix = target
+        self._col_cost = target_cost
+        self._col_lower = target_col_lower
+        self._col_upper = target_col_upper
+        self._row_lower = target_row_lower
+        self._row_upper = target_row_upper
+        stats = {
+            "mode": "incremental",
+            "removed_columns": deleted_cols.size,
+            "added_columns": n_new_cols,
+            "removed_rows": deleted_rows.size,
+            "added_rows": n_new_rows,
+            "changed_coefficients": changed.nnz,
+            "changed_costs": cost_changed.size,
+            "changed_column_bounds": bounds_changed.size,
+            "changed_row_bounds": row_bounds_changed.size,
+        }
+        return col_order, stats
+
+
+def _configured_highs(solver_options: dict[str, Any], random_seed: int) -> highspy.Highs:
+    highs = highspy.Highs()
+    highs.setOptionValue("output_flag", False)
+    highs.setOptionValue("random_seed", random_seed)
+    for key, option in solver_options.items():
+        # Unknown options are reported by HiGHS and ignored, as in appsi_highs
+        highs.setOptionValue(key, option)
+    return highs
+
+
+class _RowBuffer:
+    """Accumulates constraint rows as COO triplets."""
+
+    def __init__(self):
+        self.row_indices: list[int] = []
+        self.col_indices: list[int] = []
+        self.values: list[float] = []
+        self.lower: list[float] = []
+        self.upper: list[float] = []
+        self.families: dict[str, int] = {}
+        self.keys: list[tuple[str, Any]] = []
+
+    def add(
+        self,
+        cols: list[int],
+        coefficients: list[float] | float,
+        lower: float,
+        upper: float,
+        family: str,
+        key: Any = None,
+    ):
+        row = len(self.lower)
+        self.row_indices.extend([row] * len(cols))
+        self.col_indices.extend(cols)
+        if isinstance(coefficients, list):
+            self.values.extend(coefficients)
+        else:
+            self.values.extend([coefficients] * len(cols))
+        self.lower.append(lower)
+        self.upper.append(upper)
+        self.families[family] = self.families.get(family, 0) + 1
+        self.keys.append((family, key))
+
+    def to_csc(self, n_cols: int) -> tuple[sparse.csc_matrix, np.ndarray, np.ndarray]:
+        n_rows = len(self.lower)
+        matrix = sparse.coo_matrix(
+            (
+                np.asarray(self.values, dtype=float),
+                (np.asarray(self.row_indices, dtype=np.int64), np.asarray(self.col_indices, dtype=np.int64)),
+            ),
+            shape=(n_rows, n_cols),
+        ).tocsc()
+        # A column can appear in several terms of one row (e.g. a ratio row whose numerator set overlaps its
+        # denominator set); tocsc() sums those duplicates like Pyomo collects terms
+        matrix.sum_duplicates()
+        matrix.eliminate_zeros()
+        matrix.indptr = matrix.indptr.astype(np.int32)
+        matrix.indices = matrix.indices.astype(np.int32)
+        return matrix, np.asarray(self.lower, dtype=float), np.asarray(self.upper, dtype=float)
+
+
+def _ratio_constraint_keys(trade_lp: "TradeLPModel", parameter: str) -> list[tuple[str, str]]:
+    """(process center, BOM commodity) pairs with a minimum/maximum ratio, deduplicated in Pyomo index order."""
+    return list(
+        dict.fromkeys(
+            (pc.name, bom.commodity.name)
+            for pc in trade_lp.process_centers
+            for bom in pc.process.bill_of_materials
+            if parameter in bom.parameters and bom.parameters[parameter] is not None
+        )
+    )
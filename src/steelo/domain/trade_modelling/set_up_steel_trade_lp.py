@@ -24,6 +24,7 @@ if TYPE_CHECKING:
 from collections import defaultdict
 import pyomo.environ as pyo
 from steelo.domain.constants import LP_TOLERANCE, T_TO_KT
+from steelo.domain.distance_matrix import DistanceMatrix
 
 
 def _ensure_secondary_feedstock_supplier(
@@ -161,7 +162,7 @@ def create_process_from_furnace_group(
     for primary_feedstock in furnace_group.effective_primary_feedstocks:
         try:
             bom = lp_model.get_bom_element(primary_feedstock.name)
-        except StopIteration:
+        except KeyError:
             # having issues with nan values in the dynamic business cases feedstock, have to filter them out
             if type(primary_feedstock.metallic_charge) is float:
                 continue
@@ -285,7 +286,7 @@ def create_process_from_meta_furnace_group(
     for primary_feedstock in relevant_feedstocks:
         try:
             bom = lp_model.get_bom_element(primary_feedstock.name)
-        except StopIteration:
+        except KeyError:
             # Filter out NaN metallic charge values
             if type(primary_feedstock.metallic_charge) is float:
                 continue
@@ -737,6 +738,37 @@ def enforce_trade_tariffs_on_allocations(
     lp_model.add_tariff_information(quota_dict=quota_dict, tax_dict=tax_dict)
 
 
+def build_allocation_distance_rules(config: "SimulationConfig", env=None) -> tlp.AllocationDistanceRules:
+    """Translate the commodity distance settings of ``config`` into rules applied during arc generation.
+
+    Same semantics as fix_to_zero_allocations_where_distance_doesnt_match_commodity: with furnace group clustering
+    hot commodities stay within one country (and one plant group when cluster_hot_metal_techs_by_plant_group is
+    on); otherwise closely allocated products must stay within hot_metal_radius and distantly allocated products
+    must travel beyond it.
+    """
+    if not getattr(config, "enable_furnace_group_clustering", False):
+        distance_matrix = getattr(env, "distance_matrix", None) if env is not None else None
+        return tlp.AllocationDistanceRules(
+            closely_allocated_products=config.closely_allocated_products,
+            distantly_allocated_products=config.distantly_allocated_products,
+            hot_metal_radius=config.hot_metal_radius,
+            distance_matrix=distance_matrix if isinstance(distance_matrix, DistanceMatrix) else None,
+        )
+
+    pc_name_to_plant_group: dict[str, str] = {}
+    if getattr(config, "cluster_hot_metal_techs_by_plant_group", False):
+        meta_fgs = getattr(env, "meta_furnace_groups", None) if env is not None else None
+        for mfg in meta_fgs or []:
+            if mfg.plant_group_id is not None:
+                pc_name_to_plant_group[mfg.meta_furnace_group_id] = mfg.plant_group_id
+    return tlp.AllocationDistanceRules(
+        closely_allocated_products=config.closely_allocated_products,
+        distantly_allocated_products=config.distantly_allocated_products,
+        same_country_only=True,
+        plant_group_by_pc_name=pc_name_to_plant_group,
+    )
+
+
 def fix_to_zero_allocations_where_distance_doesnt_match_commodity(
     trade_lp: tlp.TradeLPModel, config: "SimulationConfig", env=None
 ):
@@ -763,6 +795,8 @@ def fix_to_zero_allocations_where_distance_doesnt_match_commodity(
     Notes:
         - Variables are fixed using pyomo's .fix(0) method
         - This must be called after allocation variables are created but before solving
+        - set_up_steel_trade_lp applies the same rules while generating the legal allocations instead
+          (see build_allocation_distance_rules), so the fixed variables are never created there
     """
     logger = logging.getLogger(f"{__name__}.fix_to_zero_allocations_where_distance_doesnt_match_commodity")
 
@@ -1040,7 +1074,10 @@ def set_up_steel_trade_lp(
         distance_function = None  # Placeholder for now
 
     lp_model = tlp.TradeLPModel(
-        lp_epsilon=config.lp_epsilon, distance_function=distance_function, random_seed=config.random_seed
+        lp_epsilon=config.lp_epsilon,
+        distance_function=distance_function,
+        random_seed=config.random_seed,
+        lp_backend=getattr(config, "lp_backend", "pyomo"),
     )
     modelled_products = config.primary_products
 
@@ -1255,10 +1292,11 @@ def set_up_steel_trade_lp(
     # Get willingness to pay from environment
     willingness_to_pay_list = getattr(message_bus.env, "willingness_to_pay", [])
 
-    lp_model.build_lp_model(willingness_to_pay_list=willingness_to_pay_list)
-    lp_model = fix_to_zero_allocations_where_distance_doesnt_match_commodity(
-        trade_lp=lp_model, config=config, env=message_bus.env if hasattr(message_bus, "env") else None
+    # Distance limits are applied while the arcs are generated, so disallowed allocations never become variables
+    lp_model.allocation_distance_rules = build_allocation_distance_rules(
+        config=config, env=message_bus.env if hasattr(message_bus, "env") else None
     )
+    lp_model.build_lp_model(willingness_to_pay_list=willingness_to_pay_list)
 
     # Apply carbon border mechanisms if available
     if (
@@ -1286,13 +1324,41 @@ def set_up_steel_trade_lp(
     else:
         logger.info("No carbon border mechanisms defined in environment, skipping adjustments")
 
-    # Log distance cache statistics if available
+    # Log distance matrix statistics and keep new plant locations for the next years and runs
     if hasattr(getattr(message_bus, "env", None), "log_distance_cache_stats"):
         message_bus.env.log_distance_cache_stats()
+    if hasattr(getattr(message_bus, "env", None), "persist_distance_matrix"):
+        message_bus.env.persist_distance_matrix()
 
     return lp_model
 
 
+def _build_endpoint_resolver(repository: InMemoryRepository):
+    """Return a function mapping an LP ProcessCenter to its domain endpoint, resolving each name only once.
+
+    SUPPLY centers map to their Supplier, DEMAND centers to their DemandCenter and production centers to
+    (Plant, FurnaceGroup). A solution has many allocations per process center, so memoising by name keeps the
+    repository lookups (and the scan over each plant's furnace groups) at one per process center.
+    """
+    endpoints: dict[str, Any] = {}
+
+    def resolve_endpoint(pc: tlp.ProcessCenter) -> Any:
+        endpoint = endpoints.get(pc.name)
+        if endpoint is None:
+            if pc.process.type == tlp.ProcessType.SUPPLY:
+                endpoint = repository.suppliers.get(pc.name)
+            elif pc.process.type == tlp.ProcessType.DEMAND:
+                endpoint = repository.demand_centers.get(pc.name)
+            else:
+                # Furnace group ids start with the id of the plant that owns them
+                plant = repository.plants.get(pc.name.split("_")[0])
+                endpoint = (plant, plant.get_furnace_group(pc.name))
+            endpoints[pc.name] = endpoint
+        return endpoint
+
+    return resolve_endpoint
+
+
 def create_commodity_allocations_from_allocations(
     allocations: "tlp.Allocations", repository: InMemoryRepository, commodities: list["tlp.Commodity"]
 ) -> dict[str, CommodityAllocations]:
@@ -1323,34 +1389,15 @@ def create_commodity_allocations_from_allocations(
         return commodity_allocations
 
     logger.info(f"Converting {len(allocations.allocations)} raw allocations to CommodityAllocations")
+    resolve_endpoint = _build_endpoint_resolver(repository)
 
     # Iterate over all allocations
     for (from_pc, to_pc, comm), alloc_value in allocations.allocations.items():
         if alloc_value <= LP_TOLERANCE:
             continue  # Skip zero or negative allocations
 
-        # Map source
-        if from_pc.process.type == tlp.ProcessType.SUPPLY:
-            supplier = repository.suppliers.get(from_pc.name)
-            source = supplier
-        else:
-            furnace_group_id = from_pc.name
-            # Find the plant that owns the furnace group
-            plant_id = furnace_group_id.split("_")[0]
-            plant = repository.plants.get(plant_id)
-            furnace_group = plant.get_furnace_group(furnace_group_id)
-            source = (plant, furnace_group)  # type: ignore[assignment]
-
-        # Map destination
-        if to_pc.process.type == tlp.ProcessType.DEMAND:
-            demand_id = to_pc.name
-            demand_center = repository.demand_centers.get(demand_id)
-            destination = demand_center
-        else:
-            to_plant_id = to_pc.name.split("_")[0]
-            to_plant = repository.plants.get(to_plant_id)
-            to_furnace_group = to_plant.get_furnace_group(to_pc.name)
-            destination = (to_plant, to_furnace_group)  # type: ignore[assignment]
+        source = resolve_endpoint(from_pc)
+        destination = resolve_endpoint(to_pc)
 
         volume = alloc_value
         cost = allocations.get_allocation_cost(from_pc, to_pc, comm) if allocations.allocation_costs else 0.0
@@ -1476,8 +1523,7 @@ def solve_steel_trade_lp_and_return_commodity_allocations(
     variable_file = open("trade_lp_variables.csv", "w", newline="")
     variable_file.write("from_process_center,to_process_center,commodity,allocation_value,allocation_cost\n")
     commodity_counts: dict[str, int] = {}
-    for (from_pc_name, to_pc_name, commodity_name), var in trade_lp.lp_model.allocation_variables.items():
-        alloc_value = pyo.value(var)
+    for (from_pc_name, to_pc_name, commodity_name), alloc_value in trade_lp.get_allocation_values().items():
         variable_file.write(
             f"{from_pc_name},{to_pc_name},{commodity_name},{alloc_value},{trade_lp.lp_model.allocation_costs[(from_pc_name, to_pc_name, commodity_name)]}\n"
         )
@@ -1487,30 +1533,13 @@ def solve_steel_trade_lp_and_return_commodity_allocations(
     logger.info(f"Non-zero allocations by commodity: {commodity_counts}")
 
     # Iterate over all allocations from the LP model
+    resolve_endpoint = _build_endpoint_resolver(repository)
     for (from_pc, to_pc, comm), alloc_value in trade_lp.allocations.allocations.items():
         if alloc_value <= LP_TOLERANCE:
             continue  # Skip zero or negative allocations
 
-        if from_pc.process.type == tlp.ProcessType.SUPPLY:
-            supplier = repository.suppliers.get(from_pc.name)
-            source = supplier
-        else:
-            furnace_group_id = from_pc.name
-            # Find the plant that owns the furnace group
-            plant_id = furnace_group_id.split("_")[0]
-            plant = repository.plants.get(plant_id)
-            furnace_group = plant.get_furnace_group(furnace_group_id)
-            source = (plant, furnace_group)  # type: ignore[assignment]
-
-        if to_pc.process.type == tlp.ProcessType.DEMAND:
-            demand_id = to_pc.name
-            demand_center = repository.demand_centers.get(demand_id)
-            destination = demand_center
-        else:
-            to_plant_id = to_pc.name.split("_")[0]
-            to_plant = repository.plants.get(to_plant_id)
-            to_furnace_group = to_plant.get_furnace_group(to_pc.name)
-            destination = (to_plant, to_furnace_group)  # type: ignore[assignment]
+        source = resolve_endpoint(from_pc)
+        destination = resolve_endpoint(to_pc)
 
         volume = alloc_value
         cost = trade_lp.allocations.get_allocation_cost(from_pc, to_pc, comm)
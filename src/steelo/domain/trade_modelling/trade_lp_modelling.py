@@ -7,7 +7,11 @@ from typing import Tuple, Any
 import logging
 import time
 import functools
-from steelo.adapters.geospatial.geospatial_toolbox import haversine_distance
+import numpy as np
+from steelo.adapters.geospatial.geospatial_toolbox import haversine_distance, haversine_matrix
+from steelo.domain.distance_matrix import DistanceMatrix, apply_country_distance_tables
+from steelo.domain.trade_modelling.highs_matrix_backend import HighsMatrixLP, MatrixColumnSet, PersistentHighsSolver
+from steelo.utilities.tracing import current_span, traced
 
 
 def time_function(func):
@@ -23,6 +27,9 @@ def time_function(func):
     return wrapper
 
 
+LP_BACKENDS = ("pyomo", "highs")
+
+
 class MaterialParameters(Enum):
     # The ratio of the material in the product, so for example the amount of hot metal needed to produce 1 ton of steel
     INPUT_RATIO = "input_ratio"
@@ -349,6 +356,100 @@ class ProcessConnector:
         return f"ProcessConnector({from_name} -> {to_name})"
 
 
+class AllocationDistanceRules:
+    """Commodity-specific distance limits applied while the legal allocations are generated.
+
+    Same rules as ``fix_to_zero_allocations_where_distance_doesnt_match_commodity``, but evaluated as boolean
+    masks per pair of process buckets so arcs that would only be fixed to zero are never created:
+        - Default: closely allocated products (e.g. hot metal) must stay within ``hot_metal_radius`` and distantly
+          allocated products (e.g. pig iron) must travel further than it. Distances are the "pref_economic" ones of
+          ``ProcessCenter.distance_to_other_processcenter`` (country distance table, else haversine).
+        - ``same_country_only`` (furnace group clustering): closely allocated products stay within one country and,
+          when ``plant_group_by_pc_name`` is given, within one plant group; distantly allocated products are free.
+
+    Attributes:
+        closely_allocated_products: Commodity names restricted to short distances
+        distantly_allocated_products: Commodity names restricted to long distances
+        hot_metal_radius: Radius in km separating short from long distances
+        same_country_only: Apply the clustering (country / plant group) rule instead of the radius
+        plant_group_by_pc_name: Process center name → plant group id, for the clustering rule
+        distance_matrix: Shared distance matrix to read distances from instead of recomputing them
+    """
+
+    def __init__(
+        self,
+        closely_allocated_products,
+        distantly_allocated_products,
+        hot_metal_radius: float | None = None,
+        same_country_only: bool = False,
+        plant_group_by_pc_name: dict[str, str] | None = None,
+        distance_matrix: DistanceMatrix | None = None,
+    ):
+        if not same_country_only and hot_metal_radius is None:
+            raise ValueError("hot_metal_radius is required unless same_country_only is set")
+        self.closely_allocated_products = set(closely_allocated_products)
+        self.distantly_allocated_products = set(distantly_allocated_products)
+        self.hot_metal_radius = hot_metal_radius
+        self.same_country_only = same_country_only
+        self.plant_group_by_pc_name = plant_group_by_pc_name or {}
+        self.distance_matrix = distance_matrix
+
+    def applies_to(self, commodity_name: str) -> bool:
+        if commodity_name in self.closely_allocated_products:
+            return True
+        return not self.same_country_only and commodity_name in self.distantly_allocated_products
+
+    def local_pairs(self, from_pcs: list["ProcessCenter"], to_pcs: list["ProcessCenter"]) -> np.ndarray:
+        """Boolean matrix (from × to): True where the pair counts as local (within the radius / same cluster)."""
+        if self.same_country_only:
+            codes: dict[Any, int] = {}
+            from_iso3 = self._codes([(pc.location.iso3 or None) if pc.location else None for pc in from_pcs], codes)
+            to_iso3 = self._codes([(pc.location.iso3 or None) if pc.location else None for pc in to_pcs], codes)
+            local = (from_iso3[:, None] == to_iso3[None, :]) & (from_iso3[:, None] >= 0)
+            if self.plant_group_by_pc_name:
+                groups: dict[Any, int] = {}
+                from_group = self._codes([self.plant_group_by_pc_name.get(pc.name) for pc in from_pcs], groups)
+                to_group = self._codes([self.plant_group_by_pc_name.get(pc.name) for pc in to_pcs], groups)
+                different_group = (
+                    (from_group[:, None] >= 0) & (to_group[None, :] >= 0) & (from_group[:, None] != to_group[None, :])
+                )
+                local &= ~different_group
+            return local
+        return self._distances(from_pcs, to_pcs) <= self.hot_metal_radius
+
+    def blocked(self, commodity_name: str, local: np.ndarray) -> np.ndarray:
+        """Boolean matrix (from × to): True where an arc of ``commodity_name`` is not allowed."""
+        blocked = np.zeros(local.shape, dtype=bool)
+        if commodity_name in self.closely_allocated_products:
+            blocked |= ~local
+        if not self.same_country_only and commodity_name in self.distantly_allocated_products:
+            blocked |= local
+        return blocked
+
+    @staticmethod
+    def _codes(values: list, codes: dict[Any, int]) -> np.ndarray:
+        """Integer-encode values through a shared ``codes`` table; None becomes -1."""
+        return np.fromiter(
+            (codes.setdefault(value, len(codes)) if value is not None else -1 for value in values),
+            dtype=np.int64,
+            count=len(values),
+        )
+
+    def _distances(self, from_pcs: list["ProcessCenter"], to_pcs: list["ProcessCenter"]) -> np.ndarray:
+        """Vectorised ``ProcessCenter.distance_to_other_processcenter`` for every pair of ``from_pcs`` × ``to_pcs``."""
+        from_locations = [pc.location for pc in from_pcs]
+        to_locations = [pc.location for pc in to_pcs]
+        if self.distance_matrix is not None:
+            return self.distance_matrix.pref_economic(from_locations, to_locations)
+        distances = haversine_matrix(
+            [location.lat for location in from_locations],
+            [location.lon for location in from_locations],
+            [location.lat for location in to_locations],
+            [location.lon for location in to_locations],
+        )
+        return apply_country_distance_tables(distances, from_locations, to_locations)
+
+
 class TradeLPModel:
     """Linear programming model for optimizing global steel trade flows.
 
@@ -379,7 +480,11 @@ class TradeLPModel:
         soft_minimum_capacity_slack_cost: High cost for under-utilization (100k)
     """
 
-    def __init__(self, lp_epsilon: float = 1e-3, distance_function=None, random_seed: int = 42):
+    def __init__(
+        self, lp_epsilon: float = 1e-3, distance_function=None, random_seed: int = 42, lp_backend: str = "pyomo"
+    ):
+        if lp_backend not in LP_BACKENDS:
+            raise ValueError(f"Unknown LP backend '{lp_backend}', expected one of {LP_BACKENDS}")
         self.process_centers: list[ProcessCenter] = []
         self.process_connectors: list[ProcessConnector] = []
         self.commodities: list[Commodity] = []
@@ -400,11 +505,16 @@ class TradeLPModel:
         self._transportation_cost_lookup: dict[tuple[str, str, str], float] = {}
         self.lp_epsilon = lp_epsilon
         self.random_seed = random_seed
+        # "pyomo" builds Var/Constraint components and solves via appsi_highs; "highs" assembles the
+        # same constraint set as sparse arrays and hands them straight to highspy (see highs_matrix_backend)
+        self.lp_backend = lp_backend
+        self.matrix_lp: HighsMatrixLP | None = None
 
         # Store distance function for optimized lookups
         # If None, falls back to original implementation
         self._external_distance_function = distance_function
-        self._pc_by_name: dict[str, ProcessCenter] | None = None
+        # Name → object indexes over process_centers/commodities/processes/bom_elements, see _index_by_name
+        self._name_indexes: dict[str, tuple[list, int, dict[str, Any]]] = {}
 
         # Solver options for performance tuning (OPT-4)
         # Default to IPM - equivalent runtime to Simplex but uses ~5GB less memory
@@ -417,6 +527,16 @@ class TradeLPModel:
 
         # Warm-start support (OPT-2) - previous year's solution for faster convergence
         self.previous_solution: dict[tuple[str, str, str], float] | None = None
+        # Persistent year-over-year model ("highs" backend only): when set, the solver instance outlives this
+        # TradeLPModel and is updated in place instead of receiving a freshly built model
+        self.persistent_solver: PersistentHighsSolver | None = None
+        # Commodity distance limits applied while generating legal allocations. Arcs they exclude are never created;
+        # pruned_inbound (to_pc name → commodities) and pruned_outbound (from_pc names) remember where arcs were
+        # dropped so constraints that would only have held zero-fixed variables keep their structure
+        self.allocation_distance_rules: AllocationDistanceRules | None = None
+        self.pruned_allocation_count = 0
+        self.pruned_inbound: dict[str, set[str]] = {}
+        self.pruned_outbound: set[str] = set()
 
     def add_transportation_costs(self, transportation_costs: list[TransportationCost]) -> None:
         """Add transportation costs to the model."""
@@ -437,9 +557,21 @@ class TradeLPModel:
         key = (from_iso3, to_iso3, commodity_lower)
         return self._transportation_cost_lookup.get(key, 0.0)
 
-    def _build_pc_name_lookup(self) -> None:
-        """Build a name → ProcessCenter lookup dict for O(1) access."""
-        self._pc_by_name = {pc.name: pc for pc in self.process_centers}
+    def _index_by_name(self, attribute: str) -> dict[str, Any]:
+        """Name → object index over the list ``self.<attribute>``, rebuilt whenever that list is replaced or resized.
+
+        The first object wins on duplicate names, matching the linear ``next(...)`` scans this replaces.
+        """
+        indexes = self.__dict__.setdefault("_name_indexes", {})
+        items = getattr(self, attribute)
+        cached = indexes.get(attribute)
+        if cached is None or cached[0] is not items or cached[1] != len(items):
+            index: dict[str, Any] = {}
+            for item in items:
+                index.setdefault(item.name, item)
+            cached = (items, len(items), index)
+            indexes[attribute] = cached
+        return cached[2]
 
     def get_distance(self, from_pc_name, to_pc_name, type="pref_economic"):
         """
@@ -461,11 +593,9 @@ class TradeLPModel:
             return self._external_distance_function(from_pc_name, to_pc_name)
 
         # Fallback: O(1) dict lookup instead of O(n) linear scan
-        if not hasattr(self, "_pc_by_name") or self._pc_by_name is None:
-            self._build_pc_name_lookup()
-
-        from_pc = self._pc_by_name.get(from_pc_name)
-        to_pc = self._pc_by_name.get(to_pc_name)
+        pc_by_name = self._index_by_name("process_centers")
+        from_pc = pc_by_name.get(from_pc_name)
+        to_pc = pc_by_name.get(to_pc_name)
 
         if from_pc is None or to_pc is None:
             return float("inf")
@@ -506,7 +636,6 @@ class TradeLPModel:
 
     def add_process_centers(self, process_centers: list[ProcessCenter]):
         self.process_centers = self.process_centers + process_centers
-        self._pc_by_name = None  # Invalidate lookup cache
 
     def add_process_connectors(self, process_connectors: list[ProcessConnector]):
         self.process_connectors = self.process_connectors + process_connectors
@@ -519,18 +648,19 @@ class TradeLPModel:
                 self.add_commodities([element.commodity])
         self.bom_elements = self.bom_elements + bom_elements
 
+    def get_process_center(self, process_center_name: str) -> ProcessCenter:
+        return self._index_by_name("process_centers")[process_center_name]
+
     def get_commodity(self, commodity_name: str) -> Commodity:
-        return next(commodity for commodity in self.commodities if commodity.name == commodity_name)
+        """Raises ``KeyError`` (with the name) if there is no commodity called ``commodity_name``."""
+        return self._index_by_name("commodities")[commodity_name]
 
     def get_process(self, process_name: str) -> Process | None:
-        try:
-            return next(process for process in self.processes if process.name == process_name)
-        except StopIteration:
-            # logging.warning(f"Process {process_name} not found in processes")
-            return None
+        return self._index_by_name("processes").get(process_name)
 
     def get_bom_element(self, bom_element_name: str) -> BOMElement:
-        return next(bom_element for bom_element in self.bom_elements if bom_element.name == bom_element_name)
+        """Raises ``KeyError`` (with the name) if there is no BOM element called ``bom_element_name``."""
+        return self._index_by_name("bom_elements")[bom_element_name]
 
     def generate_process_graph_for_reporting(self):
         """Generate a graph representing processes (not process centers) and their connections, for reporting purposes."""
@@ -621,6 +751,13 @@ class TradeLPModel:
         return utilization
 
     def set_legal_allocations(self):
+        """Enumerate the (from_pc, to_pc, commodity) arcs the LP may use.
+
+        Process centers are bucketed by Process so arcs are only enumerated between bucket pairs with a legal
+        connector, and ``allocation_distance_rules`` (if set) are applied per bucket pair as a vectorised mask.
+        Arcs come out in the order of the plain nested loop: primary commodities by (from_pc, to_pc, product),
+        followed by the dependent-commodity arcs from SUPPLY to PRODUCTION centers.
+        """
         # Pre-index: set of (from_process, to_process) pairs with a legal connector — O(1) lookup
         connector_set: set[tuple[Process, Process]] = {
             (conn.from_process, conn.to_process) for conn in self.process_connectors
@@ -630,7 +767,9 @@ class TradeLPModel:
         primary_commodities_by_process: dict[Process, set[Commodity]] = {}
         # Pre-index: dependent (secondary) commodities per process
         dependent_commodities_by_process: dict[Process, set[Commodity]] = {}
-        for pc in self.process_centers:
+        # Buckets of process center positions per Process object (products are read per object, as before)
+        buckets: dict[int, tuple[Process, list[int]]] = {}
+        for position, pc in enumerate(self.process_centers):
             proc = pc.process
             if proc not in primary_commodities_by_process:
                 primary = set()
@@ -641,37 +780,110 @@ class TradeLPModel:
                         dependent.update(bom_element.dependent_commodities.keys())
                 primary_commodities_by_process[proc] = primary
                 dependent_commodities_by_process[proc] = dependent
+            buckets.setdefault(id(proc), (proc, []))[1].append(position)
+
+        rules = self.allocation_distance_rules
+        self.pruned_allocation_count = 0
+        self.pruned_inbound = {}
+        self.pruned_outbound = set()
+        commodity_table: list[Commodity] = []
+
+        def enumerate_arcs(accepted_commodities_by_process, is_legal_source, is_legal_target):
+            from_idx, to_idx, product_idx, commodity_idx = [], [], [], []
+            for from_proc, from_positions in buckets.values():
+                if not is_legal_source(from_proc):
+                    continue
+                for to_proc, to_positions in buckets.values():
+                    if not is_legal_target(to_proc) or (from_proc, to_proc) not in connector_set:
+                        continue
+                    accepted = accepted_commodities_by_process.get(to_proc, set())
+                    products = [
+                        (k, commodity)
+                        for k, commodity in enumerate(from_proc.products)
+                        if commodity is not None and commodity in accepted
+                    ]
+                    if not products:
+                        continue
+                    from_arr = np.asarray(from_positions, dtype=np.int64)
+                    to_arr = np.asarray(to_positions, dtype=np.int64)
+                    local = None
+                    for k, commodity in products:
+                        commodity_table.append(commodity)
+                        if rules is not None and rules.applies_to(commodity.name):
+                            if local is None:
+                                local = rules.local_pairs(
+                                    [self.process_centers[i] for i in from_positions],
+                                    [self.process_centers[j] for j in to_positions],
+                                )
+                            blocked = rules.blocked(commodity.name, local)
+                            self._record_pruned_arcs(from_arr, to_arr, commodity.name, blocked)
+                            rows, cols = np.nonzero(~blocked)
+                        else:
+                            rows = np.repeat(np.arange(len(from_arr)), len(to_arr))
+                            cols = np.tile(np.arange(len(to_arr)), len(from_arr))
+                        from_idx.append(from_arr[rows])
+                        to_idx.append(to_arr[cols])
+                        product_idx.append(np.full(len(rows), k, dtype=np.int64))
+                        commodity_idx.append(np.full(len(rows), len(commodity_table) - 1, dtype=np.int64))
+            if not from_idx:
+                return []
+            from_all, to_all, product_all, commodity_all = (
+                np.concatenate(arrays) for arrays in (from_idx, to_idx, product_idx, commodity_idx)
+            )
+            order = np.lexsort((product_all, to_all, from_all))
+            pcs = self.process_centers
+            return [
+                (pcs[f], pcs[t], commodity_table[c])
+                for f, t, c in zip(from_all[order].tolist(), to_all[order].tolist(), commodity_all[order].tolist())
+            ]
 
         # Standard legal allocations for primary commodities (any non-DEMAND source)
-        legal_allocations = [
-            (from_pc, to_pc, commodity)
-            for from_pc in self.process_centers
-            if from_pc.process.type != ProcessType.DEMAND
-            for to_pc in self.process_centers
-            if (from_pc.process, to_pc.process) in connector_set
-            for commodity in from_pc.process.products
-            if commodity is not None and commodity in primary_commodities_by_process.get(to_pc.process, set())
-        ]
-
+        legal_allocations = enumerate_arcs(
+            primary_commodities_by_process,
+            is_legal_source=lambda proc: proc.type != ProcessType.DEMAND,
+            is_legal_target=lambda proc: True,
+        )
         # Add legal allocations for dependent commodities (SUPPLY sources only → PRODUCTION destinations)
-        for from_pc in self.process_centers:
-            if from_pc.process.type != ProcessType.SUPPLY:
-                continue
-            for to_pc in self.process_centers:
-                if to_pc.process.type != ProcessType.PRODUCTION:
-                    continue
-                if (from_pc.process, to_pc.process) not in connector_set:
-                    continue
-                dep_commodities = dependent_commodities_by_process.get(to_pc.process, set())
-                for commodity in from_pc.process.products:
-                    if commodity is not None and commodity in dep_commodities:
-                        legal_allocations.append((from_pc, to_pc, commodity))
+        legal_allocations += enumerate_arcs(
+            dependent_commodities_by_process,
+            is_legal_source=lambda proc: proc.type == ProcessType.SUPPLY,
+            is_legal_target=lambda proc: proc.type == ProcessType.PRODUCTION,
+        )
 
         self.legal_allocations = legal_allocations
+        if rules is not None:
+            logging.getLogger(f"{__name__}.set_legal_allocations").info(
+                f"operation=set_legal_allocations arcs={len(legal_allocations)} "
+                f"pruned_by_distance={self.pruned_allocation_count}"
+            )
+
+    def _record_pruned_arcs(self, from_arr: np.ndarray, to_arr: np.ndarray, commodity_name: str, blocked: np.ndarray):
+        if not blocked.any():
+            return
+        self.pruned_allocation_count += int(blocked.sum())
+        for j in to_arr[blocked.any(axis=0)].tolist():
+            self.pruned_inbound.setdefault(self.process_centers[j].name, set()).add(commodity_name)
+        self.pruned_outbound.update(self.process_centers[i].name for i in from_arr[blocked.any(axis=1)].tolist())
+
+    def has_pruned_inbound(self, pc_name: str, commodity_names) -> bool:
+        """Whether distance pruning dropped an arc of any of ``commodity_names`` into ``pc_name``.
+
+        Constraints whose Skip decision depends on an arc set being empty use this to behave as if the pruned arcs
+        were still there (fixed at zero).
+        """
+        pruned = self.pruned_inbound.get(pc_name)
+        if not pruned:
+            return False
+        return any(commodity_name in pruned for commodity_name in commodity_names)
 
     @time_function
     def add_allocation_variables_to_lp(self):
         """Add the allocation variables to the LP model, the amount of a specific material allocated from one process center to another"""
+        if self.lp_backend == "highs":
+            self.lp_model.allocation_variables = MatrixColumnSet(
+                (from_pc.name, to_pc.name, commodity.name) for (from_pc, to_pc, commodity) in self.legal_allocations
+            )
+            return
         self.lp_model.allocation_variables = pyo.Var(
             [(from_pc.name, to_pc.name, commodity.name) for (from_pc, to_pc, commodity) in self.legal_allocations],
             domain=pyo.NonNegativeReals,
@@ -703,8 +915,9 @@ class TradeLPModel:
 
         def soft_min_rule(model, pc_name):
             idx_set = model.outbound_arcs[pc_name]
-            # If it's empty, we skip the constraint so Pyomo won't see a trivial boolean
-            if not idx_set:
+            # If it's empty, we skip the constraint so Pyomo won't see a trivial boolean; if distance pruning removed
+            # the arcs the slack still has to cover the soft minimum, as it would with the arcs fixed to zero
+            if not idx_set and pc_name not in self.pruned_outbound:
                 return pyo.Constraint.Skip
             # For each production center pc_name,
             # ensure the sum of flows *leaving* that center
@@ -725,9 +938,8 @@ class TradeLPModel:
         """Ensure that the minimum ratio of a material in a product is met, if specified in the bill of materials"""
 
         def minimum_ratio_rule(model, pc, bom_c):
-            if (
-                not model.allocations_that_produce_same_outputs[pc, bom_c]
-                or not model.allocations_of_bom_commodity[pc, bom_c]
+            if not model.allocations_that_produce_same_outputs[pc, bom_c] or (
+                not model.allocations_of_bom_commodity[pc, bom_c] and not self.has_pruned_inbound(pc, (bom_c,))
             ):
                 return pyo.Constraint.Skip
             # direct summation
@@ -760,9 +972,8 @@ class TradeLPModel:
         """Ensure that the maximum ratio of a material in a product is met, if specified in the bill of materials"""
 
         def maximum_ratio_rule(model, pc, bom_c):
-            if (
-                not model.allocations_that_produce_same_outputs[pc, bom_c]
-                or not model.allocations_of_bom_commodity[pc, bom_c]
+            if not model.allocations_that_produce_same_outputs[pc, bom_c] or (
+                not model.allocations_of_bom_commodity[pc, bom_c] and not self.has_pruned_inbound(pc, (bom_c,))
             ):
                 return pyo.Constraint.Skip
             # direct summation
@@ -795,15 +1006,12 @@ class TradeLPModel:
         """
         Build dictionaries to quickly look up inbound arcs and feedstock outputs.
         """
-        inbound_arcs = {}  # dict of t -> list of (f, t, c)
-        from_allocation_index = self.lp_model.allocation_variables.index_set()
-
         # 1) Precompute inbound arcs to each 't' (process center)
         from collections import defaultdict
 
         inbound_arcs = defaultdict(list)
         outbound_arcs = defaultdict(list)
-        for f, t, c in from_allocation_index:
+        for f, t, c in self.lp_model.allocation_variables:
             inbound_arcs[t].append((f, t, c))
             outbound_arcs[f].append((f, t, c))
 
@@ -913,6 +1121,16 @@ class TradeLPModel:
         1) Build inbound_arcs and feedstock_outputs one time.
         2) Use them to quickly fill same_output_set and bom_commodity_set.
         """
+        self.add_ratio_constraint_maps_to_parameters()
+
+        # After building these sets, call max/min ratio constraints
+        self.add_maximum_ratio_constraints_to_lp()
+        self.add_minimum_ratio_constraints_to_lp()
+
+    @time_function
+    def add_ratio_constraint_maps_to_parameters(self):
+        """Collect, per production center and BOM commodity, the inbound arcs of that commodity and the inbound arcs
+        yielding the same primary outputs. Needed for the minimum and maximum ratio constraints."""
         self.lp_model.allocations_that_produce_same_outputs = {}
         self.lp_model.allocations_of_bom_commodity = {}
 
@@ -955,10 +1173,6 @@ class TradeLPModel:
                 self.lp_model.allocations_that_produce_same_outputs[pc_name, bom_c] = same_output_set
                 self.lp_model.allocations_of_bom_commodity[pc_name, bom_c] = bom_commodity_set
 
-        # After building these sets, call max/min ratio constraints
-        self.add_maximum_ratio_constraints_to_lp()
-        self.add_minimum_ratio_constraints_to_lp()
-
     @time_function
     def add_bom_energy_costs_as_parameter_to_lp(self):
         """Add the energy costs as parameters to the LP model. Needed for the objective function."""
@@ -1083,12 +1297,11 @@ class TradeLPModel:
             )
 
     @time_function
-    def add_bom_inflow_constraints_to_lp(self):
+    def add_bom_inflow_maps_to_parameters(self):
         """
-        Ensure that every process center gets the inflow of material needed to produce
-        the output products, as specified by input ratios in the bill of materials.
+        Group inbound allocations by (process center, primary outputs) and collect the matching outbound
+        allocations. Needed for the BOM inflow constraints.
         """
-        import pyomo.environ as pyo
         from collections import defaultdict
 
         m = self.lp_model  # short reference
@@ -1097,7 +1310,7 @@ class TradeLPModel:
         INPUT = MaterialParameters.INPUT_RATIO.value
         PROD = ProcessType.PRODUCTION.value
 
-        allocation_index = m.allocation_variables.index_set()
+        allocation_index = m.allocation_variables
         product_pc = m.product_of_process_center
         bom_params = m.bom_parameters
         primary_outputs = m.primary_outputs_of_feedstock
@@ -1143,6 +1356,13 @@ class TradeLPModel:
 
             incoming_by_key[(t, outs)].append((f, t, c))
 
+        # Arcs dropped by distance pruning still open their (pc, outputs_group) balance, which then forces the
+        # matching outflow to zero exactly as the zero-fixed arcs would
+        for t, commodity_names in self.pruned_inbound.items():
+            for c in sorted(commodity_names):
+                if (t, c, INPUT) in bom_params and (t, c) in primary_outputs:
+                    incoming_by_key.setdefault((t, frozenset(primary_outputs[t, c])), [])
+
         # Expose for debugging parity with the original attribute names
         m.allocations_incoming_ingredients = incoming_by_key
         m._bom_ratio_inv = ratio_inv
@@ -1165,6 +1385,18 @@ class TradeLPModel:
             outgoing_by_key[(pc, outs_group)] = bucket
 
         m.allocations_outgoing_product = outgoing_by_key
+        m.bom_inflow_constraint_keys = [
+            (pc, outs_group) for (pc, outs_group) in incoming_by_key.keys() if pc_type[pc] == PROD
+        ]
+
+    @time_function
+    def add_bom_inflow_constraints_to_lp(self):
+        """
+        Ensure that every process center gets the inflow of material needed to produce
+        the output products, as specified by input ratios in the bill of materials.
+        """
+        self.add_bom_inflow_maps_to_parameters()
+        m = self.lp_model  # short reference
 
         # ---------- Constraint rule ----------
         def bom_inflow_rule(model, pc, outs_group):
@@ -1182,9 +1414,7 @@ class TradeLPModel:
             return produced - sent_out == 0
 
         # ---------- Index and build constraint ----------
-        constraint_keys = [(pc, outs_group) for (pc, outs_group) in incoming_by_key.keys() if pc_type[pc] == PROD]
-
-        m.bom_inflow_constraints = pyo.Constraint(constraint_keys, rule=bom_inflow_rule)
+        m.bom_inflow_constraints = pyo.Constraint(m.bom_inflow_constraint_keys, rule=bom_inflow_rule)
 
     @time_function
     def add_dependent_commodities_consistency_constraints_to_lp(self):
@@ -1217,6 +1447,65 @@ class TradeLPModel:
             - Process centers with no incoming connections are still checked (per Ioana's 20.05 note)
         """
         logger = logging.getLogger(f"{__name__}.add_dependent_commodities_consistency_constraints_to_lp")
+        self.add_dependent_commodity_maps_to_parameters()
+        model = self.lp_model
+
+        def dependent_commodities_rule(model, pc_name, dep_com_name):
+            # Skip if there are no possible sources for the dependent commodity
+            possible_sources = model.allocations_of_dependent_commodities_to_pc.get((pc_name, dep_com_name), [])
+            if not possible_sources and not self.has_pruned_inbound(pc_name, (dep_com_name,)):
+                return pyo.Constraint.Skip
+
+            needing = [
+                (f, t, c)
+                for (f, t, c) in model.allocations_of_boms_that_need_dependent_commodity_to_pc.get(
+                    (pc_name, dep_com_name), []
+                )
+                if (pc_name, c, dep_com_name) in model.dependent_commodities
+                # if c in model.boms_dependent_on_commodity_at_pc.get((pc_name, dep_com_name), [])
+            ]
+            # All sources pruned by distance and nothing needing them: the constraint would be 0 == 0
+            if not possible_sources and not needing:
+                return pyo.Constraint.Skip
+
+            # Summation over all (f, t, c) in the produce-output set
+            amount_of_needed_dependent_commodity = pyo.quicksum(
+                [
+                    model.dependent_commodities[pc_name, c, dep_com_name] * model.allocation_variables[f, t, c]
+                    for (f, t, c) in needing
+                ]
+            )
+            amount_of_dependent_commodity_flowing_into_pc = pyo.quicksum(
+                [model.allocation_variables[f, t, c] for (f, t, c) in possible_sources]
+            )
+            return amount_of_dependent_commodity_flowing_into_pc - amount_of_needed_dependent_commodity == 0
+
+        constraint_index = model.dependent_commodities_constraint_index
+
+        logger.info(f"Creating {len(constraint_index)} dependent commodity constraints")
+
+        # Count how many will actually be enforced (have sources)
+        enforced_count = sum(
+            1
+            for pc_name, dep_com_name in constraint_index
+            if model.allocations_of_dependent_commodities_to_pc.get((pc_name, dep_com_name), [])
+            or self.has_pruned_inbound(pc_name, (dep_com_name,))
+        )
+        skipped_count = len(constraint_index) - enforced_count
+
+        logger.info(f"  {enforced_count} will be enforced (have suppliers)")
+        if skipped_count > 0:
+            logger.warning(f"  {skipped_count} will be skipped (no suppliers for dependent commodity)")
+
+        model.dependent_commodities_constraints = pyo.Constraint(
+            constraint_index,
+            rule=dependent_commodities_rule,
+        )
+
+    @time_function
+    def add_dependent_commodity_maps_to_parameters(self):
+        """Collect, per production center and dependent commodity, the inbound arcs of the dependent commodity and of
+        the BOM commodities that need it. Needed for the dependent commodities consistency constraints."""
         model = self.lp_model
 
         # 1) Create dictionaries of sets
@@ -1267,30 +1556,8 @@ class TradeLPModel:
                                 in_bom_set
                             )
 
-        def dependent_commodities_rule(model, pc_name, dep_com_name):
-            # Skip if there are no possible sources for the dependent commodity
-            possible_sources = model.allocations_of_dependent_commodities_to_pc.get((pc_name, dep_com_name), [])
-            if not possible_sources:
-                return pyo.Constraint.Skip
-
-            # Summation over all (f, t, c) in the produce-output set
-            amount_of_needed_dependent_commodity = pyo.quicksum(
-                [
-                    model.dependent_commodities[pc_name, c, dep_com_name] * model.allocation_variables[f, t, c]
-                    for (f, t, c) in model.allocations_of_boms_that_need_dependent_commodity_to_pc.get(
-                        (pc_name, dep_com_name), []
-                    )
-                    if (pc_name, c, dep_com_name) in model.dependent_commodities
-                    # if c in model.boms_dependent_on_commodity_at_pc.get((pc_name, dep_com_name), [])
-                ]
-            )
-            amount_of_dependent_commodity_flowing_into_pc = pyo.quicksum(
-                [model.allocation_variables[f, t, c] for (f, t, c) in possible_sources]
-            )
-            return amount_of_dependent_commodity_flowing_into_pc - amount_of_needed_dependent_commodity == 0
-
         # Build constraint index
-        constraint_index = [
+        model.dependent_commodities_constraint_index = [
             (pc.name, dep_com.name)
             for pc in self.process_centers
             for bom in pc.process.bill_of_materials
@@ -1303,25 +1570,6 @@ class TradeLPModel:
             and (pc.name, bom.commodity.name, dep_com.name) in model.dependent_commodities
         ]
 
-        logger.info(f"Creating {len(constraint_index)} dependent commodity constraints")
-
-        # Count how many will actually be enforced (have sources)
-        enforced_count = sum(
-            1
-            for pc_name, dep_com_name in constraint_index
-            if model.allocations_of_dependent_commodities_to_pc.get((pc_name, dep_com_name), [])
-        )
-        skipped_count = len(constraint_index) - enforced_count
-
-        logger.info(f"  {enforced_count} will be enforced (have suppliers)")
-        if skipped_count > 0:
-            logger.warning(f"  {skipped_count} will be skipped (no suppliers for dependent commodity)")
-
-        model.dependent_commodities_constraints = pyo.Constraint(
-            constraint_index,
-            rule=dependent_commodities_rule,
-        )
-
     @time_function
     def add_dependent_commodities_as_parameters_to_lp(self):
         """Add the dependent commodities as parameters to the LP model. Needed for the dependent commodities constraints."""
@@ -1374,12 +1622,14 @@ class TradeLPModel:
     def add_demand_slack_variables_to_lp(self):
         """Add the slack variables to the LP model, the amount of material that is not allocated to a demand center to make demand fulfillment
         a soft constraint and avoid infeasibilities."""
+        demand_center_names = [
+            dc.name for dc in self.process_centers if dc.process.type == ProcessType.DEMAND and dc.capacity is not None
+        ]
+        if self.lp_backend == "highs":
+            self.lp_model.demand_slack_variable = MatrixColumnSet(demand_center_names)
+            return
         self.lp_model.demand_slack_variable = pyo.Var(
-            [
-                dc.name
-                for dc in self.process_centers
-                if dc.process.type == ProcessType.DEMAND and dc.capacity is not None
-            ],
+            demand_center_names,
             domain=pyo.NonNegativeReals,
             initialize=0,
         )
@@ -1388,12 +1638,16 @@ class TradeLPModel:
     def add_minimum_capacity_slack_variables_to_lp(self):
         """Add the slack variables to the LP model, the amount of material that is not allocated to a demand center to make demand fulfillment
         a soft constraint and avoid infeasibilities."""
+        process_center_names = [
+            pc.name
+            for pc in self.process_centers
+            if pc.process.type == ProcessType.PRODUCTION and pc.soft_minimum_capacity is not None
+        ]
+        if self.lp_backend == "highs":
+            self.lp_model.minimum_capacity_slack_variable = MatrixColumnSet(process_center_names)
+            return
         self.lp_model.minimum_capacity_slack_variable = pyo.Var(
-            [
-                pc.name
-                for pc in self.process_centers
-                if pc.process.type == ProcessType.PRODUCTION and pc.soft_minimum_capacity is not None
-            ],
+            process_center_names,
             domain=pyo.NonNegativeReals,
             initialize=0,
         )
@@ -1510,12 +1764,15 @@ class TradeLPModel:
                 )
 
     @time_function
-    def add_aggregate_commodity_constraints_to_lp(self):
-        """Add the aggregate commodity constraints to the LP model. Enforces min/max ratios for aggregated commodities."""
+    def add_aggregate_commodity_maps_to_parameters(self):
+        """Collect, per production center and commodity mask, the inbound arcs and the arcs matching the mask.
+        Needed for the aggregate commodity constraints."""
         self.lp_model.all_inbound_allocations_agg = {}
         self.lp_model.allocations_of_bom_commodity_agg = {}
+        # (pc, commodity mask) pairs where distance pruning dropped a matching inbound arc
+        self.lp_model.aggregate_masks_with_pruned_inbound = set()
 
-        logger = logging.getLogger(f"{__name__}.add_aggregate_commodity_constraints_to_lp")
+        logger = logging.getLogger(f"{__name__}.add_aggregate_commodity_maps_to_parameters")
 
         inbound_arcs = self.lp_model.inbound_arcs
 
@@ -1551,6 +1808,9 @@ class TradeLPModel:
                     if c.lower().startswith(mask_lower):
                         bom_commodity_set.add((f, t, c))
 
+                if any(c.lower().startswith(mask_lower) for c in self.pruned_inbound.get(pc_name, ())):
+                    self.lp_model.aggregate_masks_with_pruned_inbound.add((pc_name, commodity_mask))
+
                 # Store the sets for this process center and commodity mask
                 self.lp_model.all_inbound_allocations_agg[pc_name, commodity_mask] = all_inbound_set
                 self.lp_model.allocations_of_bom_commodity_agg[pc_name, commodity_mask] = bom_commodity_set
@@ -1562,14 +1822,21 @@ class TradeLPModel:
                         f"out of {len(all_inbound_set)} total for {pc_technology} process center {pc_name}"
                     )
 
+    @time_function
+    def add_aggregate_commodity_constraints_to_lp(self):
+        """Add the aggregate commodity constraints to the LP model. Enforces min/max ratios for aggregated commodities."""
+        logger = logging.getLogger(f"{__name__}.add_aggregate_commodity_constraints_to_lp")
+        self.add_aggregate_commodity_maps_to_parameters()
+
         def agg_maximum_ratio_rule(model, pc, comm_mask):
             # Skip if no allocations exist for this process center and commodity mask
             if (pc, comm_mask) not in model.all_inbound_allocations_agg:
                 return pyo.Constraint.Skip
 
-            if not model.all_inbound_allocations_agg.get(
-                (pc, comm_mask), set()
-            ) or not model.allocations_of_bom_commodity_agg.get((pc, comm_mask), set()):
+            if not model.all_inbound_allocations_agg.get((pc, comm_mask), set()) or (
+                not model.allocations_of_bom_commodity_agg.get((pc, comm_mask), set())
+                and (pc, comm_mask) not in model.aggregate_masks_with_pruned_inbound
+            ):
                 return pyo.Constraint.Skip
 
             # Total of ALL incoming allocations (denominator)
@@ -1595,9 +1862,10 @@ class TradeLPModel:
             if (pc, comm_mask) not in model.all_inbound_allocations_agg:
                 return pyo.Constraint.Skip
 
-            if not model.all_inbound_allocations_agg.get(
-                (pc, comm_mask), set()
-            ) or not model.allocations_of_bom_commodity_agg.get((pc, comm_mask), set()):
+            if not model.all_inbound_allocations_agg.get((pc, comm_mask), set()) or (
+                not model.allocations_of_bom_commodity_agg.get((pc, comm_mask), set())
+                and (pc, comm_mask) not in model.aggregate_masks_with_pruned_inbound
+            ):
                 return pyo.Constraint.Skip
 
             # Total of ALL incoming allocations (denominator)
@@ -1663,6 +1931,7 @@ class TradeLPModel:
         for pc in self.process_centers:
             self.lp_model.process_center_type[pc.name] = pc.process.type.value
 
+    @traced()
     def build_lp_model(self, willingness_to_pay_list=None):
         """Build the complete Pyomo LP model with all variables, parameters, and constraints.
 
@@ -1707,6 +1976,16 @@ class TradeLPModel:
         self.add_bom_energy_costs_as_parameter_to_lp()
         self.add_allocation_costs_as_parameters_to_lp()
         self.add_process_center_type_as_parameter_to_lp()
+        if self.lp_backend == "highs":
+            # Same constraint set, assembled as sparse arrays from the index maps instead of Pyomo components
+            if self.aggregated_commodity_constraints is not None:
+                self.add_aggregate_commodity_constraint_parameters()
+                self.add_aggregate_commodity_maps_to_parameters()
+            self.add_bom_inflow_maps_to_parameters()
+            self.add_ratio_constraint_maps_to_parameters()
+            self.add_dependent_commodity_maps_to_parameters()
+            self.matrix_lp = HighsMatrixLP.from_trade_lp(self)
+            return
         # Add constraints:
         if self.aggregated_commodity_constraints is not None:
             self.add_aggregate_commodity_constraint_parameters()
@@ -1722,6 +2001,14 @@ class TradeLPModel:
         # Add objective function:
         self.add_objective_function_to_lp()
 
+    def model_size(self) -> dict[str, int]:
+        """Number of variables and constraints of the built LP (for the performance report)."""
+        if self.lp_backend == "highs":
+            assert self.matrix_lp is not None, "build_lp_model() must be called first"
+            return {"variables": self.matrix_lp.num_col, "constraints": self.matrix_lp.num_row}
+        return {"variables": self.lp_model.nvariables(), "constraints": self.lp_model.nconstraints()}
+
+    @traced("solve")
     def solve_lp_model(self):
         """Solve the LP optimization problem using HiGHS solver.
 
@@ -1741,6 +2028,11 @@ class TradeLPModel:
             - Logs detailed diagnostics if model is infeasible
         """
         logger = logging.getLogger(f"{__name__}.solve_lp_model")
+        span = current_span()
+        if span.recording:
+            span.count(**self.model_size())
+        if self.lp_backend == "highs":
+            return self._solve_matrix_lp()
         start_time = time.time()
         solver = pyo.SolverFactory("appsi_highs")
         solver.options["random_seed"] = self.random_seed
@@ -1804,32 +2096,94 @@ class TradeLPModel:
         elif result.solver.termination_condition == pyo.TerminationCondition.optimal:
             # Load the solution if optimal
             self.lp_model.solutions.load_from(result)
+            self._log_unfulfilled_demand(self.lp_model.demand_slack_variable.extract_values())
+
+        return result
+
+    def _solve_matrix_lp(self):
+        """Solve the matrix built by the ``highs`` backend directly with highspy."""
+        logger = logging.getLogger(f"{__name__}.solve_lp_model")
+        if self.matrix_lp is None:
+            raise ValueError("build_lp_model() must be called before solve_lp_model()")
+        start_time = time.time()
+
+        if self.persistent_solver is not None:
+            # The live HiGHS instance already holds last year's basis, no value-based warm start needed
+            result = self.persistent_solver.solve(self.matrix_lp, self.solver_options, random_seed=self.random_seed)
+            return self._handle_matrix_lp_result(self.matrix_lp, result, start_time)
 
-            # Calculate and report unfulfilled demand percentage
-            total_demand = 0
-            total_unfulfilled = 0
-            for dc in self.process_centers:
-                if dc.process.type == ProcessType.DEMAND and dc.capacity is not None:
-                    demand = dc.capacity
-                    slack = pyo.value(self.lp_model.demand_slack_variable[dc.name])
-                    total_demand += demand
-                    total_unfulfilled += slack
-
-            if total_demand > 0:
-                unfulfilled_pct = (total_unfulfilled / total_demand) * 100
+        warm_start = None
+        if self.previous_solution is not None:
+            if self.solver_options.get("solver", "ipm") == "simplex":
+                warm_start = self.previous_solution
+                covered = sum(1 for key in self.previous_solution if key in self.lp_model.allocation_variables)
                 logger.info(
-                    f"LP Solution: {unfulfilled_pct:.2f}% of demand remains unfulfilled ({total_unfulfilled:,.0f} / {total_demand:,.0f} tons)"
+                    f"operation=warm_start variables_initialized={covered} "
+                    f"coverage={(covered / max(self.matrix_lp.num_col, 1)) * 100:.1f}%"
                 )
             else:
-                logger.info("LP Solution: No demand centers found")
+                logger.info("operation=warm_start status=skipped reason='IPM solver does not support warm starts'")
+
+        result = self.matrix_lp.solve(self.solver_options, random_seed=self.random_seed, warm_start=warm_start)
+        return self._handle_matrix_lp_result(self.matrix_lp, result, start_time)
+
+    def _handle_matrix_lp_result(self, matrix_lp: HighsMatrixLP, result, start_time: float):
+        """Record the solver status of a ``highs`` backend solve and report diagnostics."""
+        logger = logging.getLogger(f"{__name__}.solve_lp_model")
+        elapsed = time.time() - start_time
+        logger.info(f"operation=trade_optimization backend=highs duration_s={elapsed:.3f}")
+        self.solution_status = result.solver.status
 
+        if result.solver.termination_condition == pyo.TerminationCondition.infeasible:
+            logger.error("\n=== LP SOLVER DIAGNOSTICS ===")
+            logger.error(f"Termination condition: {result.solver.termination_condition}")
+            logger.error(
+                f"Model statistics: {matrix_lp.num_col} columns, {matrix_lp.num_row} rows, "
+                f"{len(self.process_centers)} process centers, rows by family: {matrix_lp.row_families}"
+            )
+            logger.error("The model is infeasible - no solution exists that satisfies all constraints.")
+        elif result.solver.termination_condition == pyo.TerminationCondition.optimal:
+            self._log_unfulfilled_demand(matrix_lp.values_of(1))
         return result
 
+    def _log_unfulfilled_demand(self, demand_slack_values: dict[str, float]) -> None:
+        """Calculate and report the unfulfilled demand percentage from the demand slack values."""
+        logger = logging.getLogger(f"{__name__}.solve_lp_model")
+        total_demand = 0.0
+        total_unfulfilled = 0.0
+        for dc in self.process_centers:
+            if dc.process.type == ProcessType.DEMAND and dc.capacity is not None:
+                total_demand += dc.capacity
+                total_unfulfilled += demand_slack_values[dc.name]
+
+        if total_demand > 0:
+            unfulfilled_pct = (total_unfulfilled / total_demand) * 100
+            logger.info(
+                f"LP Solution: {unfulfilled_pct:.2f}% of demand remains unfulfilled ({total_unfulfilled:,.0f} / {total_demand:,.0f} tons)"
+            )
+        else:
+            logger.info("LP Solution: No demand centers found")
+
+    def get_allocation_values(self, minimum: float | None = None) -> dict[tuple[str, str, str], float]:
+        """Return the solved value of every allocation variable, keyed by (from_pc, to_pc, commodity) names.
+
+        Values are read in bulk (the HiGHS column-value array, or ``extract_values()`` on the Pyomo ``Var``) rather
+        than through ``pyo.value()`` per variable. With ``minimum``, only allocations of at least that volume are
+        returned.
+        """
+        if self.lp_backend == "highs":
+            return self.matrix_lp.values_of(0, minimum=minimum) if self.matrix_lp is not None else {}
+        values = self.lp_model.allocation_variables.extract_values()
+        if minimum is None:
+            return values
+        return {key: value for key, value in values.items() if value is not None and value >= minimum}
+
+    @traced()
     def extract_solution(self):
         """Extract optimal allocation values from solved LP model.
 
-        Reads the Pyomo variable values from the solved model and populates the
-        allocations attribute with Allocations object containing flows and costs.
+        Reads the allocation values in bulk from the solved model, resolves names through the
+        name indexes and populates the allocations attribute with Allocations object containing flows and costs.
         Also sets optimal_production on each ProcessCenter.
 
         Raises:
@@ -1844,18 +2198,16 @@ class TradeLPModel:
         if self.solution_status != pyo.SolverStatus.ok:
             raise ValueError("No optimal solution found.")
 
+        pc_by_name = self._index_by_name("process_centers")
+        commodity_by_name = self._index_by_name("commodities")
+        lp_allocation_costs = self.lp_model.allocation_costs
         allocations = {}
         allocation_costs = {}
-        for (from_pc_name, to_pc_name, commodity_name), var in self.lp_model.allocation_variables.items():
-            volume = pyo.value(var)
-            if volume >= self.lp_epsilon:
-                from_pc = next(pc for pc in self.process_centers if pc.name == from_pc_name)
-                to_pc = next(pc for pc in self.process_centers if pc.name == to_pc_name)
-                comm = next(comm for comm in self.commodities if comm.name == commodity_name)
-                allocations[(from_pc, to_pc, comm)] = volume
-                allocation_costs[(from_pc, to_pc, comm)] = self.lp_model.allocation_costs[
-                    from_pc_name, to_pc_name, commodity_name
-                ]
+        for key, volume in self.get_allocation_values(minimum=self.lp_epsilon).items():
+            from_pc_name, to_pc_name, commodity_name = key
+            allocation = (pc_by_name[from_pc_name], pc_by_name[to_pc_name], commodity_by_name[commodity_name])
+            allocations[allocation] = volume
+            allocation_costs[allocation] = lp_allocation_costs[key]
 
         self.allocations = Allocations(
             allocations=allocations,
@@ -1873,9 +2225,4 @@ class TradeLPModel:
         Returns:
             Dictionary with allocation variable values for warm-starting future solves
         """
-        solution = {}
-        for (from_pc, to_pc, comm), var in self.lp_model.allocation_variables.items():
-            value = pyo.value(var)
-            if value >= self.lp_epsilon:
-                solution[(from_pc, to_pc, comm)] = value
-        return solution
+        return self.get_allocation_values(minimum=self.lp_epsilon)
@@ -0,0 +1,123 @@
+"""Batched transportation problems solved as one sparse LP.
+
+The disaggregation of clustered trade flows (``furnace_group_clustering``) splits every cluster-level flow into
+many small source → destination transportation problems, often one per connected component of the hot-metal
+reach graph. Instead of building a graph per component and solving each with an integer min-cost-flow
+algorithm, ``solve_transport_blocks`` stacks the components into one block-diagonal LP (one column per allowed
+edge, one row per source and per destination) and solves it with HiGHS in floating point. Volumes are used as
+they are, so there is no integer scaling and no rounding drift to rebalance afterwards.
+
+Components are independent, so the optimum of the stacked LP restricted to one block is an optimum of that
+block on its own.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import highspy
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TransportBlock:
+    """One transportation problem: supplies, demands and the allowed edges between them.
+
+    Attributes:
+        supplies: Supply volume per source (t)
+        demands: Demand volume per destination (t)
+        edge_source: Source index of every allowed edge
+        edge_dest: Destination index of every allowed edge
+        edge_cost: Cost per ton of every allowed edge (ignored when maximising the flow)
+    """
+
+    supplies: np.ndarray
+    demands: np.ndarray
+    edge_source: np.ndarray
+    edge_dest: np.ndarray
+    edge_cost: np.ndarray
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edge_source)
+
+
+def solve_transport_blocks(blocks: list[TransportBlock], maximise_flow: bool = False) -> list[np.ndarray] | None:
+    """Solve independent transportation problems as one block-diagonal LP.
+
+    In the default (min-cost) mode every source ships exactly its supply and every destination receives at most
+    its demand, so supplies and demands are expected to be balanced per block. With ``maximise_flow`` both sides
+    are upper bounds and the total shipped volume is maximised, which gives the maximum flow of every block.
+
+    Args:
+        blocks: The transportation problems
+        maximise_flow: Maximise the shipped volume instead of minimising the cost
+
+    Returns:
+        Flow per edge for each block (in the order of ``edge_source``), or None if the LP is not solved to
+        optimality (e.g. a block whose supply cannot reach enough demand)
+    """
+    if not blocks:
+        return []
+    num_edges = np.array([block.num_edges for block in blocks])
+    num_rows = np.array([len(block.supplies) + len(block.demands) for block in blocks])
+    edge_offsets = np.concatenate([[0], np.cumsum(num_edges)])
+    row_offsets = np.concatenate([[0], np.cumsum(num_rows)])
+    total_edges = int(edge_offsets[-1])
+    if total_edges == 0:
+        # Nothing can be shipped: only feasible if nothing has to be
+        if not maximise_flow and any(np.any(np.asarray(block.supplies) > 0) for block in blocks):
+            return None
+        return [np.zeros(0) for _ in blocks]
+
+    # Every edge column has exactly two entries: its source row and its destination row
+    source_rows = np.concatenate([row_offsets[b] + block.edge_source for b, block in enumerate(blocks)]).astype(
+        np.int32
+    )
+    dest_rows = np.concatenate(
+        [row_offsets[b] + len(block.supplies) + block.edge_dest for b, block in enumerate(blocks)]
+    ).astype(np.int32)
+    index = np.empty(2 * total_edges, dtype=np.int32)
+    index[0::2] = source_rows
+    index[1::2] = dest_rows
+
+    supplies = [np.asarray(block.supplies, dtype=float) for block in blocks]
+    demands = [np.asarray(block.demands, dtype=float) for block in blocks]
+    row_upper = np.concatenate([np.concatenate([s, d]) for s, d in zip(supplies, demands)])
+    if maximise_flow:
+        row_lower = np.zeros_like(row_upper)
+        col_cost = np.full(total_edges, -1.0)
+    else:
+        row_lower = np.concatenate([np.concatenate([s, np.zeros_like(d)]) for s, d in zip(supplies, demands)])
+        col_cost = np.concatenate([np.asarray(block.edge_cost, dtype=float) for block in blocks])
+
+    lp = highspy.HighsLp()
+    lp.num_col_ = total_edges
+    lp.num_row_ = int(row_offsets[-1])
+    lp.col_cost_ = col_cost
+    lp.col_lower_ = np.zeros(total_edges)
+    lp.col_upper_ = np.full(total_edges, highspy.kHighsInf)
+    lp.row_lower_ = row_lower
+    lp.row_upper_ = row_upper
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_ = np.arange(0, 2 * total_edges + 1, 2, dtype=np.int32)
+    lp.a_matrix_.index_ = index
+    lp.a_matrix_.value_ = np.ones(2 * total_edges)
+
+    highs = highspy.Highs()
+    highs.setOptionValue("output_flag", False)
+    # Simplex returns a vertex solution, i.e. as few used edges as possible
+    highs.setOptionValue("solver", "simplex")
+    highs.passModel(lp)
+    highs.run()
+    status = highs.getModelStatus()
+    logger.debug(
+        f"operation=transport_lp blocks={len(blocks)} edges={total_edges} rows={lp.num_row_} "
+        f"maximise_flow={maximise_flow} status={highs.modelStatusToString(status)}"
+    )
+    if status != highspy.HighsModelStatus.kOptimal:
+        return None
+
+    flows = np.asarray(highs.getSolution().col_value, dtype=float)
+    return [flows[edge_offsets[b] : edge_offsets[b + 1]] for b in range(len(blocks))]
@@ -1,16 +1,15 @@
 # TODO: Rename script to something more intuitive (e.g., economic_models.py)
+import functools
 import gc
 import logging
+import multiprocessing
 import pickle
 import random
 import time
-from typing import cast
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, cast
 
-from steelo.adapters.geospatial.top_location_finder import get_candidate_locations_for_opening_new_plants
-from steelo.adapters.geospatial.geospatial_statistics import (
-    export_lcoe_lcoh_statistics_by_country,
-    export_overbuild_factor_statistics_by_country,
-)
 from steelo.adapters.repositories.in_memory_repository import InMemoryRepository
 from steelo.domain import Year
 from steelo.domain.commands import (
@@ -20,18 +19,32 @@ from steelo.domain.commands import (
 )
 from steelo.domain.constants import T_TO_KT, Volumes
 from steelo.domain.events import SteelAllocationsCalculated
-from steelo.domain.trade_modelling.set_up_steel_trade_lp import (
-    set_up_steel_trade_lp,
-    solve_steel_trade_lp_and_return_commodity_allocations,
-)
+from steelo.domain.models import Environment, FurnaceGroup, Plant, PlantGroup, TechnologyOptions
 from steelo.service_layer.message_bus import MessageBus
 from steelo.utilities.file_output import export_commodity_allocations_to_csv
+from steelo.utilities.lazy_imports import lazy_callable
 from steelo.utilities.memory_profiling import MemoryTracker
-from steelo.utilities.plotting import (
-    plot_detailed_trade_map,
-    plot_trade_allocation_visualization,
-    plot_process_graph,
+from steelo.utilities.plot_queue import plots_enabled, plots_off_process, submit_plot
+from steelo.utilities.tracing import start_span
+
+# The geospatial layers, trade LP (pyomo) and plotting stacks are imported when a model first runs
+get_candidate_locations_for_opening_new_plants = lazy_callable(
+    "steelo.adapters.geospatial.top_location_finder", "get_candidate_locations_for_opening_new_plants"
+)
+export_lcoe_lcoh_statistics_by_country = lazy_callable(
+    "steelo.adapters.geospatial.geospatial_statistics", "export_lcoe_lcoh_statistics_by_country"
+)
+export_overbuild_factor_statistics_by_country = lazy_callable(
+    "steelo.adapters.geospatial.geospatial_statistics", "export_overbuild_factor_statistics_by_country"
 )
+set_up_steel_trade_lp = lazy_callable("steelo.domain.trade_modelling.set_up_steel_trade_lp", "set_up_steel_trade_lp")
+solve_steel_trade_lp_and_return_commodity_allocations = lazy_callable(
+    "steelo.domain.trade_modelling.set_up_steel_trade_lp", "solve_steel_trade_lp_and_return_commodity_allocations"
+)
+plot_detailed_trade_map = lazy_callable("steelo.utilities.plotting", "plot_detailed_trade_map")
+plot_process_graph = lazy_callable("steelo.utilities.plotting", "plot_process_graph")
+plot_trade_allocation_visualization = lazy_callable("steelo.utilities.plotting", "plot_trade_allocation_visualization")
+snapshot_allocations_for_plots = lazy_callable("steelo.utilities.plotting", "snapshot_allocations_for_plots")
 
 # ============================================================================
 # SOLVER CONFIGURATION - Edit this section to experiment with different solver settings
@@ -127,35 +140,17 @@ class GeospatialModel:
             if iso3 is not None:  # Filter out None keys
                 input_costs_converted[iso3] = {Year(year): costs for year, costs in year_costs.items()}
         ## Make a price series for COSA and NPV calculations
-        future_price_series: dict[str, list[float]] = {}
         start_year = bus.env.year
         end_year = bus.env.year + bus.env.config.construction_time + bus.env.config.plant_lifetime
-        steel_demand = []
-        iron_demand = []
-        for product in ["steel", "iron"]:
-            future_price_list: list[float] = []
-            for year in range(start_year, end_year):
-                if product == "steel":
-                    demand_in_year = Volumes(sum(entry.get(Year(year), 0) for entry in bus.env.demand_dict.values()))
-                    steel_demand.append(demand_in_year)
-                elif product == "iron":
-                    if bus.env.virgin_iron_demand is not None:
-                        demand_in_year = Volumes(bus.env.virgin_iron_demand.get_demand(Year(year)))
-                        iron_demand.append(demand_in_year)
-                    else:
-                        raise ValueError("virgin_iron_demand must be set in environment for iron price series")
-                future_price = bus.env.extract_price_from_costcurve(
-                    demand=demand_in_year, product=product, future=False
-                )
-                future_price_list.append(future_price)
-            future_price_series[product] = future_price_list
+        future_price_series = _future_price_series(bus.env, start_year, end_year)
 
         # Create geospatial layers and calculate outgoing cashflow proxy to find top locations
-        step_start = time.time()
+        step_span = start_span("get_candidate_locations_for_opening_new_plants")
         top_locations, custom_energy_costs = get_candidate_locations_for_opening_new_plants(
             bus.uow, bus.env, geo_config, bus.env.geo_paths
         )
-        step_time = time.time() - step_start
+        step_span.count(candidate_sites=sum(len(locations) for locations in top_locations.values()))
+        step_time = step_span.finish()
         logger.info(f"operation=geo_candidate_locations year={bus.env.year} duration_s={step_time:.3f}")
         logger.debug(f"[GEO] Number of top iron locations returned: {len(top_locations.get('iron', []))}")
         logger.debug(f"[GEO] Number of top steel locations returned: {len(top_locations.get('steel', []))}")
@@ -189,7 +184,7 @@ class GeospatialModel:
                     logger.warning(f"Failed to export {factor_name} statistics for year {bus.env.year}: {e}")
 
         # Update dynamic costs for all existing business opportunities yearly
-        step_start = time.time()
+        step_span = start_span("geo_update_costs")
         dynamic_cost_commands: list = []
         for pg in per_country_indi_groups:
             dynamic_cost_commands.extend(
@@ -208,14 +203,15 @@ class GeospatialModel:
             )
         for command in dynamic_cost_commands:
             bus.handle(command)
-        step_time = time.time() - step_start
+        step_span.count(furnace_groups=len(dynamic_cost_commands))
+        step_time = step_span.finish()
         logger.info(
             f"operation=geo_update_costs year={bus.env.year} duration_s={step_time:.3f} fg_count={len(dynamic_cost_commands)}"
         )
         logger.debug(f"[GEO] Updated dynamic costs for {len(dynamic_cost_commands)} furnace groups")
 
         # Update the status of all existing business opportunities (to move from opportunity to new plant)
-        step_start = time.time()
+        step_span = start_span("geo_update_status")
         status_commands: list = []
         for pg in per_country_indi_groups:
             status_commands.extend(
@@ -248,14 +244,16 @@ class GeospatialModel:
         if status_commands:
             for command in status_commands:
                 bus.handle(command)
-            step_time = time.time() - step_start
+            step_span.count(furnace_groups=len(status_commands))
+            step_time = step_span.finish()
             logger.info(
                 f"operation=geo_update_status year={bus.env.year} duration_s={step_time:.3f} fg_count={len(status_commands)}"
             )
             logger.debug(f"[GEO] Updated status for {len(status_commands)} furnace groups")
+        step_span.finish()
 
         # Identify new business opportunities and prioritize them by NPV
-        step_start = time.time()
+        step_span = start_span("geo_identify_opportunities")
         bus.handle(
             indi_master_pg.identify_new_business_opportunities_4indi(
                 current_year=bus.env.year,
@@ -293,7 +291,7 @@ class GeospatialModel:
                 co2_storage_diagnostics=bus.env.co2_storage_diagnostics,
             )
         )
-        step_time = time.time() - step_start
+        step_time = step_span.finish()
         logger.info(f"operation=geo_identify_opportunities year={bus.env.year} duration_s={step_time:.3f}")
 
         # End of geospatial model
@@ -323,7 +321,7 @@ class AllocationModel:
         memory_tracker = MemoryTracker()
 
         # Setup phase: emission factors, prices, carbon costs, LP construction
-        setup_start = time.time()
+        setup_span = start_span("allocation_setup")
         memory_tracker.checkpoint("before_lp_setup", year=bus.env.year)
 
         bus.env.set_primary_feedstocks_in_furnace_groups(world_plants=bus.uow.repository.plants.list())
@@ -406,7 +404,15 @@ class AllocationModel:
         if bus.env.previous_lp_solution is not None:
             trade_lp.previous_solution = bus.env.previous_lp_solution
 
-        setup_elapsed = time.time() - setup_start
+        # Persistent trade LP: the HiGHS instance lives on the environment and is updated in place every year
+        if getattr(bus.env.config, "persistent_trade_lp", None) is True:
+            if bus.env.persistent_lp_solver is None:
+                from steelo.domain.trade_modelling.highs_matrix_backend import PersistentHighsSolver
+
+                bus.env.persistent_lp_solver = PersistentHighsSolver()
+            trade_lp.persistent_solver = bus.env.persistent_lp_solver
+
+        setup_elapsed = setup_span.finish()
         logger.info(f"operation=allocation_setup year={bus.env.year} duration_s={setup_elapsed:.3f}")
         memory_tracker.checkpoint("after_lp_setup", year=bus.env.year)
 
@@ -459,6 +465,7 @@ class AllocationModel:
                 transport_kpis=bus.env.transport_kpis,
                 willingness_to_pay=bus.env.willingness_to_pay,
                 aggregated_constraints=bus.env.aggregated_metallic_charge_constraints,
+                distance_matrix=bus.env.distance_matrix,
             )
             # Use disaggregated allocations for TM-PAM connector
             trade_lp_allocations = disaggregated_allocations
@@ -474,7 +481,7 @@ class AllocationModel:
             logger.info("[DISAGGREGATION] CommodityAllocations created")
 
         # Post-processing: plotting and CSV export
-        postprocess_start = time.time()
+        postprocess_span = start_span("allocation_postprocess")
 
         if bus.env.transport_kpis:  # Check if list is not empty
             for _, allocations in commodity_allocations.items():
@@ -501,19 +508,30 @@ class AllocationModel:
         if output_dir is None:
             raise ValueError("output_dir must be set on bus.env")
 
-        if non_empty_allocations:
-            # # pickle the allocations for debugging purposes TODO: remove
-            # with open(output_dir / f"steel_trade_allocations_{bus.env.year}.pkl", "wb") as f:
-            #     pickle.dump(non_empty_allocations, f)
+        # # pickle the allocations for debugging purposes TODO: remove
+        # with open(output_dir / f"steel_trade_allocations_{bus.env.year}.pkl", "wb") as f:
+        #     pickle.dump(non_empty_allocations, f)
+
+        if non_empty_allocations and plots_enabled("trade"):
+            # Plot workers get a snapshot of what the plots read instead of the whole simulation state
+            plot_allocations = (
+                snapshot_allocations_for_plots(non_empty_allocations) if plots_off_process() else non_empty_allocations
+            )
 
             # Create detailed trade map (existing pydeck visualization)
-            plot_detailed_trade_map(
-                allocations_by_commodity=non_empty_allocations, chosen_year=bus.env.year, plot_paths=bus.env.plot_paths
+            submit_plot(
+                "trade",
+                plot_detailed_trade_map,
+                allocations_by_commodity=plot_allocations,
+                chosen_year=bus.env.year,
+                plot_paths=bus.env.plot_paths,
             )
 
             # Create trade allocation visualization (new network plot)
-            plot_trade_allocation_visualization(
-                allocations_by_commodity=non_empty_allocations,
+            submit_plot(
+                "trade",
+                plot_trade_allocation_visualization,
+                allocations_by_commodity=plot_allocations,
                 chosen_year=bus.env.year,
                 plot_paths=bus.env.plot_paths,
                 country_mappings=bus.env.country_mappings,
@@ -587,7 +605,7 @@ class AllocationModel:
             if (event := SteelAllocationsCalculated(trade_allocations=trade_lp_allocations)) is not None:
                 bus.handle(event)
 
-        postprocess_elapsed = time.time() - postprocess_start
+        postprocess_elapsed = postprocess_span.finish()
         logger.info(f"operation=allocation_postprocess year={bus.env.year} duration_s={postprocess_elapsed:.3f}")
 
         module_elapsed = time.time() - module_start
@@ -627,6 +645,283 @@ class AllocationModel:
 #                 bus.handle(event)
 
 
+# Tasks of the running speculative evaluation. Worker processes are forked, so they inherit this list (and the
+# whole simulation state it refers to) instead of receiving pickled copies; only task indices and results cross
+# the process boundary.
+_speculative_tasks: list[Callable[[], Any]] = []
+
+
+def _run_speculative_task(index: int) -> Any:
+    return _speculative_tasks[index]()
+
+
+def _init_speculative_worker() -> None:
+    # Decisions are logged by the serial replay in the parent process
+    logging.disable(logging.INFO)
+
+
+def _run_speculatively(tasks: list[Callable[[], Any]], workers: int) -> list[Any]:
+    """Run ``tasks`` in ``workers`` forked processes against a copy-on-write snapshot of the current state.
+
+    Whatever a task mutates (balances, the global random state, ...) is discarded with its worker; only the return
+    values come back, in task order. A worker runs several tasks, so a task must not depend on state that other
+    tasks change.
+    """
+    global _speculative_tasks
+    if not tasks:
+        return []
+    _speculative_tasks = tasks
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_speculative_worker,
+        ) as pool:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            return list(pool.map(_run_speculative_task, range(len(tasks)), chunksize=chunksize))
+    finally:
+        _speculative_tasks = []
+
+
+def _available_pam_workers(requested: int, logger: logging.Logger) -> int:
+    if requested > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("[PAM] pam_workers=%d needs the 'fork' start method; evaluating serially", requested)
+        return 1
+    return requested
+
+
+def _sweep_plant_group(
+    pg: PlantGroup, market_price: dict[str, float], active_statuses: list[str], logger: logging.Logger
+) -> None:
+    balance_before_sweep = pg.balance
+    pg.sweep_fg_balances_to_group(market_price=market_price, active_statuses=active_statuses)
+    logger.info(
+        "[PAM STEP 4] plant_group_id=%s num_plants=%d balance_before_sweep=%.2f balance_after_sweep=%.2f",
+        pg.plant_group_id,
+        len(pg.plants),
+        balance_before_sweep,
+        pg.balance,
+    )
+
+
+def _future_price_series(env: Environment, start_year: int, end_year: int) -> dict[str, list[float]]:
+    """
+    Expected steel and iron prices for every year from ``start_year`` to ``end_year`` (exclusive).
+
+    Each year's price is read off the current cost curve at that year's demand (total steel demand across demand
+    centers, virgin iron demand), all years of one product in a single vectorised cost curve lookup.
+    """
+    if env.virgin_iron_demand is None:
+        raise ValueError("virgin_iron_demand must be set in environment for iron price series")
+    years = range(start_year, end_year)
+    demands = {
+        "steel": [Volumes(sum(entry.get(Year(year), 0) for entry in env.demand_dict.values())) for year in years],
+        "iron": [Volumes(env.virgin_iron_demand.get_demand(Year(year))) for year in years],
+    }
+    return {
+        product: env.extract_prices_from_costcurve(product_demands, product=product, future=False).tolist()
+        for product, product_demands in demands.items()
+    }
+
+
+def _is_evaluated(fg: FurnaceGroup, active_statuses: list[str], market_price: dict[str, float]) -> bool:
+    """
+    Whether PAM evaluates the strategy of a furnace group.
+
+    Skipped are zero capacity furnace groups, inactive statuses (e.g., closed, mothballed), groups currently
+    switching technology, the "other" technology category (not modeled) and products without a market price.
+    """
+    return not (
+        fg.capacity == 0
+        or fg.status.lower() not in active_statuses
+        or fg.status.lower() == "operating switching technology"
+        or fg.technology.name.lower() == "other"
+        or fg.technology.product.lower() not in market_price
+    )
+
+
+def _furnace_group_strategy_kwargs(
+    bus: MessageBus,
+    plant: Plant,
+    future_price_series: dict[str, list[float]],
+    capacity_limit_steel: Volumes,
+    capacity_limit_iron: Volumes,
+    logger: logging.Logger,
+) -> dict[str, Any]:
+    """Keyword arguments of ``Plant.evaluate_furnace_group_strategy`` for a furnace group of ``plant``."""
+    # Retrieve location-specific subsidies for this plant
+    # Empty dicts are returned if no subsidies exist - this is expected behavior
+    tech_capex_subsidies = bus.env.capex_subsidies.get(plant.location.iso3, {})
+    tech_opex_subsidies = bus.env.opex_subsidies.get(plant.location.iso3, {})
+    tech_debt_subsidies = bus.env.debt_subsidies.get(plant.location.iso3, {})
+    logger.debug(f"[PAM] Subsidies for {plant.location.iso3}:")
+    logger.debug(f"[PAM]  - CAPEX: {list(tech_capex_subsidies.keys())}")
+    logger.debug(f"[PAM]  - OPEX:  {list(tech_opex_subsidies.keys())}")
+    logger.debug(f"[PAM]  - DEBT:  {list(tech_debt_subsidies.keys())}")
+
+    # Retrieve region-specific CAPEX data for technology switching/renovation
+    if "greenfield" in bus.env.name_to_capex:
+        # Map the plant's ISO3 code to its region
+        if bus.env.country_mappings is None:
+            raise ValueError("Country mapping required for furnace switching (not found in Environment)")
+        iso3_to_region_mapping = bus.env.country_mappings.iso3_to_region()
+        if plant.location.iso3 not in iso3_to_region_mapping:
+            raise ValueError(f"Region mapping not found for ISO3 code {plant.location.iso3}")
+        region = iso3_to_region_mapping[plant.location.iso3]
+        region_capex = bus.env.name_to_capex["greenfield"][region]
+        capex_renovation_share = bus.env.capex_renovation_share
+
+        logger.debug(f"[PAM] Region {region} CAPEX loaded for {plant.location.iso3}")
+        logger.debug(f"[PAM] Region CAPEX for technologies: {region_capex}")
+        logger.debug(f"[PAM] Renovation share: {capex_renovation_share}")
+    else:
+        raise KeyError("Region capex not found in bus.env.name_to_capex.")
+
+    # Get cost of debt for the plant location (before subsidies)
+    cost_of_debt = bus.env.industrial_cost_of_debt.get(plant.location.iso3)
+    if cost_of_debt is None:
+        raise ValueError(f"Cost of debt not found for ISO3 code {plant.location.iso3}.")
+
+    # Get cost of equity for the plant location
+    cost_of_equity = bus.env.industrial_cost_of_equity.get(plant.location.iso3)
+    if cost_of_equity is None:
+        raise ValueError(f"Cost of equity not found for ISO3 code {plant.location.iso3}")
+
+    logger.debug(f"[PAM] Cost of debt for {plant.location.iso3}: {cost_of_debt:.2%}")
+    logger.debug(f"[PAM] Cost of equity for {plant.location.iso3}: {cost_of_equity:.2%}")
+
+    return {
+        "market_price_series": future_price_series,
+        "region_capex": region_capex,
+        "cost_of_debt": cost_of_debt,
+        "cost_of_equity": cost_of_equity,
+        "capex_renovation_share": capex_renovation_share,
+        "get_bom_from_avg_boms": bus.env.get_bom_from_avg_boms,
+        "allowed_furnace_transitions": bus.env.allowed_furnace_transitions,
+        "dynamic_business_cases": bus.env.dynamic_feedstocks,
+        "probabilistic_agents": bus.env.config.probabilistic_agents,
+        "tech_capex_subsidies": tech_capex_subsidies,
+        "tech_opex_subsidies": tech_opex_subsidies,
+        "tech_debt_subsidies": tech_debt_subsidies,
+        "current_year": bus.env.year,
+        "allowed_techs": bus.env.allowed_techs,
+        "chosen_emissions_boundary_for_carbon_costs": bus.env.config.chosen_emissions_boundary_for_carbon_costs,
+        "technology_emission_factors": bus.env.technology_emission_factors,
+        "tech_to_product": bus.env.technology_to_product,
+        "plant_lifetime": bus.env.config.plant_lifetime,
+        "construction_time": bus.env.config.construction_time,
+        "risk_free_rate": bus.env.config.global_risk_free_rate,
+        "capacity_limit_steel": capacity_limit_steel,
+        "capacity_limit_iron": capacity_limit_iron,
+        "installed_capacity_in_year": bus.env.installed_capacity_in_year,
+        "new_plant_capacity_in_year": bus.env.new_plant_capacity_in_year,
+        "most_common_reductant_by_tech": bus.env.most_common_reductant_by_tech,
+        "get_co2_headroom": bus.env.get_co2_headroom,
+        "get_co2_need_by_name": bus.env.get_co2_need_by_name,
+        "co2_storage_diagnostics": bus.env.co2_storage_diagnostics,
+    }
+
+
+def _technology_options_on_snapshot(
+    bus: MessageBus,
+    pg: PlantGroup,
+    plant: Plant,
+    furnace_group_id: str,
+    future_price_series: dict[str, list[float]],
+    capacity_limit_steel: Volumes,
+    capacity_limit_iron: Volumes,
+) -> TechnologyOptions | None:
+    """Evaluate a furnace group strategy in a worker and keep only the technology NPVs it computed.
+
+    The decision itself (random draws, treasury debits, capacity checks) dies with the worker and is replayed
+    serially. Errors are left to the replay too, so they surface exactly where the serial evaluation raises them.
+    """
+    technology_options: dict[str, TechnologyOptions] = {}
+    try:
+        strategy_kwargs = _furnace_group_strategy_kwargs(
+            bus, plant, future_price_series, capacity_limit_steel, capacity_limit_iron, logging.getLogger(__name__)
+        )
+        plant.evaluate_furnace_group_strategy(
+            furnace_group_id, plant_group=pg, technology_options=technology_options, **strategy_kwargs
+        )
+    except Exception as error:  # noqa: BLE001 - re-raised by the serial replay
+        logging.getLogger(__name__).debug(f"[PAM] Speculative evaluation failed, left to the serial replay: {error}")
+    return technology_options.get(furnace_group_id)
+
+
+def _speculate_technology_options(
+    bus: MessageBus,
+    plant_groups: list[PlantGroup],
+    market_price: dict[str, float],
+    future_price_series: dict[str, list[float]],
+    capacity_limit_steel: Volumes,
+    capacity_limit_iron: Volumes,
+    workers: int,
+    logger: logging.Logger,
+) -> dict[str, dict[str, TechnologyOptions]]:
+    """Technology NPVs of every furnace group PAM evaluates this year, by plant ID and furnace group ID."""
+    span = start_span("pam_speculate_strategies")
+    keys: list[tuple[str, str]] = []
+    tasks: list[Callable[[], Any]] = []
+    for pg in plant_groups:
+        for plant in pg.plants:
+            for fg in plant.furnace_groups:
+                if _is_evaluated(fg, bus.env.config.active_statuses, market_price):
+                    keys.append((plant.plant_id, fg.furnace_group_id))
+                    tasks.append(
+                        functools.partial(
+                            _technology_options_on_snapshot,
+                            bus,
+                            pg,
+                            plant,
+                            fg.furnace_group_id,
+                            future_price_series,
+                            capacity_limit_steel,
+                            capacity_limit_iron,
+                        )
+                    )
+    technology_options_by_plant: dict[str, dict[str, TechnologyOptions]] = {}
+    for (plant_id, fg_id), options in zip(keys, _run_speculatively(tasks, workers)):
+        if options is not None:
+            technology_options_by_plant.setdefault(plant_id, {})[fg_id] = options
+    span.count(furnace_groups=len(tasks))
+    logger.info(
+        f"operation=pam_speculate_strategies year={bus.env.year} workers={workers} furnace_groups={len(tasks)} "
+        f"duration_s={span.finish():.3f}"
+    )
+    return technology_options_by_plant
+
+
+def _expansion_npvs_on_snapshot(
+    pg: PlantGroup, expansion_kwargs: dict[str, Any]
+) -> dict[tuple[str, str], float | None]:
+    """Evaluate a plant group expansion in a worker and keep only the option NPVs it computed (see
+    ``_technology_options_on_snapshot``)."""
+    expansion_npvs: dict[tuple[str, str], float | None] = {}
+    try:
+        pg.evaluate_expansion(**expansion_kwargs, expansion_npvs=expansion_npvs)
+    except Exception as error:  # noqa: BLE001 - re-raised by the serial replay
+        logging.getLogger(__name__).debug(f"[PAM] Speculative evaluation failed, left to the serial replay: {error}")
+    return expansion_npvs
+
+
+def _speculate_expansion_npvs(
+    plant_groups: list[PlantGroup], expansion_kwargs: dict[str, Any], workers: int, logger: logging.Logger
+) -> dict[str, dict[tuple[str, str], float | None]]:
+    """Expansion option NPVs of every plant group, by plant group ID."""
+    span = start_span("pam_speculate_expansions")
+    tasks: list[Callable[[], Any]] = [
+        functools.partial(_expansion_npvs_on_snapshot, pg, expansion_kwargs) for pg in plant_groups
+    ]
+    results = _run_speculatively(tasks, workers)
+    span.count(plant_groups=len(tasks))
+    logger.info(
+        f"operation=pam_speculate_expansions year={expansion_kwargs['current_year']} workers={workers} "
+        f"plant_groups={len(tasks)} duration_s={span.finish():.3f}"
+    )
+    return {pg.plant_group_id: npvs for pg, npvs in zip(plant_groups, results)}
+
+
 class PlantAgentsModel:
     """
     Economic decision-making model for steel and iron plant agents.
@@ -683,9 +978,9 @@ class PlantAgentsModel:
 
         # Step 1: Calculate carbon costs for all furnace groups
         # This updates each furnace group's carbon cost based on its emissions and the current carbon price
-        carbon_start = time.time()
+        carbon_span = start_span("pam_carbon_costs")
         bus.env.calculate_carbon_costs_of_furnace_groups(world_plants=plants)
-        carbon_elapsed = time.time() - carbon_start
+        carbon_elapsed = carbon_span.finish()
         logger.info(f"operation=pam_carbon_costs year={bus.env.year} duration_s={carbon_elapsed:.3f}")
 
         # Step 2: Extract current market prices from cost curves
@@ -705,31 +1000,9 @@ class PlantAgentsModel:
 
         # Step 3: Build future price series for NPV and COSA calculations
         # This creates a time series of expected prices for the duration of plant lifetime
-        future_price_series: dict[str, list[float]] = {}
         start_year = bus.env.year
         end_year = bus.env.year + bus.env.config.construction_time + bus.env.config.plant_lifetime
-        steel_demand = []
-        iron_demand = []
-        for product in ["steel", "iron"]:
-            future_price_list: list[float] = []
-            for year in range(start_year, end_year):
-                if product == "steel":
-                    # Sum steel demand across all demand centers for this year
-                    demand_in_year = Volumes(sum(entry.get(Year(year), 0) for entry in bus.env.demand_dict.values()))
-                    steel_demand.append(demand_in_year)
-                elif product == "iron":
-                    # Get virgin iron demand for this year
-                    if bus.env.virgin_iron_demand is not None:
-                        demand_in_year = Volumes(bus.env.virgin_iron_demand.get_demand(Year(year)))
-                        iron_demand.append(demand_in_year)
-                    else:
-                        raise ValueError("virgin_iron_demand must be set in environment for iron price series")
-                # Extract price from cost curve for this demand level
-                future_price = bus.env.extract_price_from_costcurve(
-                    demand=demand_in_year, product=product, future=False
-                )
-                future_price_list.append(future_price)
-            future_price_series[product] = future_price_list
+        future_price_series = _future_price_series(bus.env, start_year, end_year)
 
         # Calculate capacity limits for PAM (excluding capacity reserved for new plants)
         capacity_share = 1 - bus.env.config.new_capacity_share_from_new_plants
@@ -738,61 +1011,48 @@ class PlantAgentsModel:
 
         counter = 0  # Track number of commands executed across all plants
 
+        pam_workers = _available_pam_workers(bus.env.config.pam_workers, logger)
+
         # Step 4: Process each plant group for furnace group decisions.
         # Group-first ordering: sweep every FG's annual P&L into the group treasury BEFORE any plant
         # in the group runs its strategy. This gives all plants in the group equal information about
         # the year's available wallet. Plant-iteration order within a group remains random.
-        plant_eval_start = time.time()
+        plant_eval_span = start_span("pam_evaluate_plants")
         logger.info("[PAM] Step 4 - Evaluating furnace group strategies (group-first)")
         step4_plant_groups = bus.uow.plant_groups.list()
-        for pg in random.sample(step4_plant_groups, len(step4_plant_groups)):
-            balance_before_sweep = pg.balance
-            pg.sweep_fg_balances_to_group(
-                market_price=freeze_market_price,
-                active_statuses=bus.env.config.active_statuses,
-            )
-            logger.info(
-                "[PAM STEP 4] plant_group_id=%s num_plants=%d balance_before_sweep=%.2f balance_after_sweep=%.2f",
-                pg.plant_group_id,
-                len(pg.plants),
-                balance_before_sweep,
-                pg.balance,
+        step4_order = random.sample(step4_plant_groups, len(step4_plant_groups))
+        technology_options_by_plant: dict[str, dict[str, TechnologyOptions]] | None = None
+        if pam_workers > 1:
+            # A sweep only touches its own group, so sweeping all groups up front leaves every group in the state
+            # the serial loop would see; the NPVs are then computed in worker processes against that snapshot.
+            for pg in step4_order:
+                _sweep_plant_group(pg, freeze_market_price, bus.env.config.active_statuses, logger)
+            technology_options_by_plant = _speculate_technology_options(
+                bus,
+                step4_order,
+                freeze_market_price,
+                future_price_series,
+                capacity_limit_pam_steel,
+                capacity_limit_pam_iron,
+                pam_workers,
+                logger,
             )
 
+        for pg in step4_order:
+            if technology_options_by_plant is None:
+                _sweep_plant_group(pg, freeze_market_price, bus.env.config.active_statuses, logger)
+
             for plant in random.sample(pg.plants, len(pg.plants)):
                 logger.info(
                     f"\n\n[PAM] === Processing plant {plant.plant_id} in {plant.location.iso3} "
                     f"(year {bus.env.year}) === \n"
                 )
-
-                # Retrieve location-specific subsidies for this plant
-                # Empty dicts are returned if no subsidies exist - this is expected behavior
-                tech_capex_subsidies = bus.env.capex_subsidies.get(plant.location.iso3, {})
-                tech_opex_subsidies = bus.env.opex_subsidies.get(plant.location.iso3, {})
-                tech_debt_subsidies = bus.env.debt_subsidies.get(plant.location.iso3, {})
-
                 logger.debug(f"[PAM] Plant group: {plant.parent_gem_id}")
                 logger.debug(f"[PAM] Plant group balance: ${pg.balance:,.2f}")
-                logger.debug(f"[PAM] Subsidies for {plant.location.iso3}:")
-                logger.debug(f"[PAM]  - CAPEX: {list(tech_capex_subsidies.keys())}")
-                logger.debug(f"[PAM]  - OPEX:  {list(tech_opex_subsidies.keys())}")
-                logger.debug(f"[PAM]  - DEBT:  {list(tech_debt_subsidies.keys())}")
 
                 # Evaluate each furnace group within the plant in random order
                 for fg in random.sample(plant.furnace_groups, len(plant.furnace_groups)):
-                    # Skip furnace groups that should not be evaluated:
-                    # - Zero capacity furnace groups
-                    # - Inactive statuses (e.g., closed, mothballed)
-                    # - Groups currently switching technology
-                    # - "Other" technology category (not modeled)
-                    # - Products not in the market price dictionary
-                    if (
-                        fg.capacity == 0
-                        or fg.status.lower() not in bus.env.config.active_statuses
-                        or fg.status.lower() == "operating switching technology"
-                        or fg.technology.name.lower() == "other"
-                        or fg.technology.product.lower() not in freeze_market_price
-                    ):
+                    if not _is_evaluated(fg, bus.env.config.active_statuses, freeze_market_price):
                         logger.info(
                             f"[PAM] == Skipping FG {fg.furnace_group_id} - Tech: {fg.technology.name}, Capacity: {fg.capacity * T_TO_KT:,.0f} kt, Status: {fg.status}, Product: {fg.technology.product} ==\n"
                         )
@@ -803,73 +1063,21 @@ class PlantAgentsModel:
                     )
                     logger.debug(f"[PAM] FG balance: ${fg.balance:,.2f}, Historic balance: ${fg.historic_balance:,.2f}")
 
-                    # Retrieve region-specific CAPEX data for technology switching/renovation
-                    if "greenfield" in bus.env.name_to_capex:
-                        # Map the plant's ISO3 code to its region
-                        if bus.env.country_mappings is None:
-                            raise ValueError(
-                                "Country mapping required for furnace switching (not found in Environment)"
-                            )
-                        iso3_to_region_mapping = bus.env.country_mappings.iso3_to_region()
-                        if plant.location.iso3 not in iso3_to_region_mapping:
-                            raise ValueError(f"Region mapping not found for ISO3 code {plant.location.iso3}")
-                        region = iso3_to_region_mapping[plant.location.iso3]
-                        region_capex = bus.env.name_to_capex["greenfield"][region]
-                        capex_renovation_share = bus.env.capex_renovation_share
-
-                        logger.debug(f"[PAM] Region {region} CAPEX loaded for {plant.location.iso3}")
-                        logger.debug(f"[PAM] Region CAPEX for technologies: {region_capex}")
-                        logger.debug(f"[PAM] Renovation share: {capex_renovation_share}")
-                    else:
-                        raise KeyError("Region capex not found in bus.env.name_to_capex.")
-
-                    # Get cost of debt for the plant location (before subsidies)
-                    cost_of_debt = bus.env.industrial_cost_of_debt.get(plant.location.iso3)
-                    if cost_of_debt is None:
-                        raise ValueError(f"Cost of debt not found for ISO3 code {plant.location.iso3}.")
-
-                    # Get cost of equity for the plant location
-                    cost_of_equity = bus.env.industrial_cost_of_equity.get(plant.location.iso3)
-                    if cost_of_equity is None:
-                        raise ValueError(f"Cost of equity not found for ISO3 code {plant.location.iso3}")
-
-                    logger.debug(f"[PAM] Cost of debt for {plant.location.iso3}: {cost_of_debt:.2%}")
-                    logger.debug(f"[PAM] Cost of equity for {plant.location.iso3}: {cost_of_equity:.2%}")
+                    strategy_kwargs = _furnace_group_strategy_kwargs(
+                        bus, plant, future_price_series, capacity_limit_pam_steel, capacity_limit_pam_iron, logger
+                    )
+                    if technology_options_by_plant is not None:
+                        # Replay against the live state: NPVs computed by the workers are reused when the CO2-gated
+                        # transitions still match; treasury, random draws and capacity limits are evaluated here.
+                        strategy_kwargs["technology_options"] = technology_options_by_plant.setdefault(
+                            plant.plant_id, {}
+                        )
 
                     # Evaluate potential technology switch or renovation for this furnace group
                     # This considers: switching technology, renovating existing technology, or closing the furnace
                     if (
                         cmd := plant.evaluate_furnace_group_strategy(
-                            fg.furnace_group_id,
-                            plant_group=pg,
-                            market_price_series=future_price_series,
-                            region_capex=region_capex,
-                            cost_of_debt=cost_of_debt,
-                            cost_of_equity=cost_of_equity,
-                            capex_renovation_share=capex_renovation_share,
-                            get_bom_from_avg_boms=bus.env.get_bom_from_avg_boms,
-                            allowed_furnace_transitions=bus.env.allowed_furnace_transitions,
-                            dynamic_business_cases=bus.env.dynamic_feedstocks,
-                            probabilistic_agents=bus.env.config.probabilistic_agents,
-                            tech_capex_subsidies=tech_capex_subsidies,
-                            tech_opex_subsidies=tech_opex_subsidies,
-                            tech_debt_subsidies=tech_debt_subsidies,
-                            current_year=bus.env.year,
-                            allowed_techs=bus.env.allowed_techs,
-                            chosen_emissions_boundary_for_carbon_costs=bus.env.config.chosen_emissions_boundary_for_carbon_costs,
-                            technology_emission_factors=bus.env.technology_emission_factors,
-                            tech_to_product=bus.env.technology_to_product,
-                            plant_lifetime=bus.env.config.plant_lifetime,
-                            construction_time=bus.env.config.construction_time,
-                            risk_free_rate=bus.env.config.global_risk_free_rate,
-                            capacity_limit_steel=capacity_limit_pam_steel,
-                            capacity_limit_iron=capacity_limit_pam_iron,
-                            installed_capacity_in_year=bus.env.installed_capacity_in_year,
-                            new_plant_capacity_in_year=bus.env.new_plant_capacity_in_year,
-                            most_common_reductant_by_tech=bus.env.most_common_reductant_by_tech,
-                            get_co2_headroom=bus.env.get_co2_headroom,
-                            get_co2_need_by_name=bus.env.get_co2_need_by_name,
-                            co2_storage_diagnostics=bus.env.co2_storage_diagnostics,
+                            fg.furnace_group_id, plant_group=pg, **strategy_kwargs
                         )
                     ) is not None:
                         logger.info(f"[PAM] FG {fg.furnace_group_id} strategy returned command: {type(cmd).__name__}")
@@ -897,63 +1105,69 @@ class PlantAgentsModel:
                             counter += 1
                             bus.handle(cmd)
 
-        plant_eval_elapsed = time.time() - plant_eval_start
+        plant_eval_span.count(plants=len(plants))
+        plant_eval_elapsed = plant_eval_span.finish()
         logger.info(
             f"operation=pam_evaluate_plants year={bus.env.year} duration_s={plant_eval_elapsed:.3f} plant_count={len(plants)}"
         )
 
         # Step 5: Evaluate plant groups for expansion opportunities
         # Plant expansions add new furnace groups to existing plants based on NPV analysis
-        expansion_start = time.time()
+        expansion_span = start_span("pam_evaluate_expansions")
         logger.info("[PAM] Step 5 - Evaluating plant group expansions")
         logger.debug(f"[PAM] Total plant groups in simulation: {len(bus.uow.plant_groups.list())}")
         logger.debug(
             f"[PAM] Plant groups: {[plant_group.plant_group_id for plant_group in bus.uow.plant_groups.list()]}"
         )
+        expansion_kwargs: dict[str, Any] = {
+            "price_series": future_price_series,
+            "capacity": Volumes(bus.env.config.expanded_capacity),
+            "region_capex": bus.env.name_to_capex["greenfield"],
+            "dynamic_feedstocks": bus.env.dynamic_feedstocks,
+            "fopex_for_iso3": bus.env.fopex_by_country,
+            "equity_share": bus.env.config.equity_share,
+            "iso3_to_region_map": bus.env.country_mappings.iso3_to_region() if bus.env.country_mappings else {},
+            "probabilistic_agents": bus.env.config.probabilistic_agents,
+            "chosen_emissions_boundary_for_carbon_costs": bus.env.config.chosen_emissions_boundary_for_carbon_costs,
+            "technology_emission_factors": bus.env.technology_emission_factors,
+            "global_risk_free_rate": bus.env.config.global_risk_free_rate,
+            "tech_to_product": bus.env.technology_to_product,
+            "plant_lifetime": bus.env.config.plant_lifetime,
+            "construction_time": bus.env.config.construction_time,
+            "current_year": bus.env.year,
+            "allowed_techs": bus.env.allowed_techs,
+            "cost_of_debt_dict": bus.env.industrial_cost_of_debt,
+            "cost_of_equity_dict": bus.env.industrial_cost_of_equity,
+            "get_bom_from_avg_boms": bus.env.get_bom_from_avg_boms,
+            "capex_subsidies": bus.env.capex_subsidies,
+            "opex_subsidies": bus.env.opex_subsidies,
+            "debt_subsidies": bus.env.debt_subsidies,
+            "capacity_limit_steel": capacity_limit_pam_steel,
+            "capacity_limit_iron": capacity_limit_pam_iron,
+            "installed_capacity_in_year": bus.env.installed_capacity_in_year,
+            "new_plant_capacity_in_year": bus.env.new_plant_capacity_in_year,
+            "new_capacity_share_from_new_plants": bus.env.config.new_capacity_share_from_new_plants,
+            "environment_most_common_reductant": bus.env.most_common_reductant_by_tech,
+            "get_co2_headroom": bus.env.get_co2_headroom,
+            "get_co2_need_by_name": bus.env.get_co2_need_by_name,
+            "co2_storage_diagnostics": bus.env.co2_storage_diagnostics,
+        }
         # Evaluate plant groups in random order to avoid systematic biases
-        for pg in random.sample(bus.uow.plant_groups.list(), len(bus.uow.plant_groups.list())):
+        expansion_order = random.sample(bus.uow.plant_groups.list(), len(bus.uow.plant_groups.list()))
+        expansion_npvs_by_group: dict[str, dict[tuple[str, str], float | None]] | None = None
+        if pam_workers > 1:
+            expansion_npvs_by_group = _speculate_expansion_npvs(expansion_order, expansion_kwargs, pam_workers, logger)
+        for pg in expansion_order:
             logger.info(f"[PAM] === Evaluating plant group {pg.plant_group_id} for expansion ===")
             logger.debug(f"[PAM] Plant group contains {len(pg.plants)} plants")
 
             # Aggregate financial balance across all plants in the group
             # This is used to determine if the plant group can afford expansion
             logger.debug(f"[PAM] Plant group balance: ${pg.balance:,.2f}")
+            if expansion_npvs_by_group is not None:
+                expansion_kwargs["expansion_npvs"] = expansion_npvs_by_group.setdefault(pg.plant_group_id, {})
             # Evaluate expansion by comparing NPV of adding a new furnace group to status quo
-            if (
-                cmd := pg.evaluate_expansion(
-                    price_series=future_price_series,
-                    capacity=Volumes(bus.env.config.expanded_capacity),
-                    region_capex=bus.env.name_to_capex["greenfield"],
-                    dynamic_feedstocks=bus.env.dynamic_feedstocks,
-                    fopex_for_iso3=bus.env.fopex_by_country,
-                    equity_share=bus.env.config.equity_share,
-                    iso3_to_region_map=bus.env.country_mappings.iso3_to_region() if bus.env.country_mappings else {},
-                    probabilistic_agents=bus.env.config.probabilistic_agents,
-                    chosen_emissions_boundary_for_carbon_costs=bus.env.config.chosen_emissions_boundary_for_carbon_costs,
-                    technology_emission_factors=bus.env.technology_emission_factors,
-                    global_risk_free_rate=bus.env.config.global_risk_free_rate,
-                    tech_to_product=bus.env.technology_to_product,
-                    plant_lifetime=bus.env.config.plant_lifetime,
-                    construction_time=bus.env.config.construction_time,
-                    current_year=bus.env.year,
-                    allowed_techs=bus.env.allowed_techs,
-                    cost_of_debt_dict=bus.env.industrial_cost_of_debt,
-                    cost_of_equity_dict=bus.env.industrial_cost_of_equity,
-                    get_bom_from_avg_boms=bus.env.get_bom_from_avg_boms,
-                    capex_subsidies=bus.env.capex_subsidies,
-                    opex_subsidies=bus.env.opex_subsidies,
-                    debt_subsidies=bus.env.debt_subsidies,
-                    capacity_limit_steel=capacity_limit_pam_steel,
-                    capacity_limit_iron=capacity_limit_pam_iron,
-                    installed_capacity_in_year=bus.env.installed_capacity_in_year,
-                    new_plant_capacity_in_year=bus.env.new_plant_capacity_in_year,
-                    new_capacity_share_from_new_plants=bus.env.config.new_capacity_share_from_new_plants,
-                    environment_most_common_reductant=bus.env.most_common_reductant_by_tech,
-                    get_co2_headroom=bus.env.get_co2_headroom,
-                    get_co2_need_by_name=bus.env.get_co2_need_by_name,
-                    co2_storage_diagnostics=bus.env.co2_storage_diagnostics,
-                )
-            ) is not None:
+            if (cmd := pg.evaluate_expansion(**expansion_kwargs)) is not None:
                 logger.info(f"[PAM] Plant group {pg.plant_group_id} expansion returned: {type(cmd).__name__}")
                 if isinstance(cmd, AddFurnaceGroup):
                     # Execute expansion by adding a new furnace group to the plant
@@ -967,8 +1181,9 @@ class PlantAgentsModel:
                     counter += 1
                     bus.handle(cmd)
 
-        expansion_elapsed = time.time() - expansion_start
         group_count = len(bus.uow.plant_groups.list())
+        expansion_span.count(plant_groups=group_count)
+        expansion_elapsed = expansion_span.finish()
         logger.info(
             f"operation=pam_evaluate_expansions year={bus.env.year} duration_s={expansion_elapsed:.3f} group_count={group_count}"
         )
@@ -6,6 +6,7 @@ from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 
+from ..config import get_steelo_home
 from ..data.cache_manager import DataPreparationCache
 
 
@@ -33,12 +34,32 @@ def steelo_cache() -> str:
     list_parser = subparsers.add_parser("list", help="List cached preparations")
     list_parser.add_argument("--cache-dir", type=str, help="Cache directory (default: $STEELO_HOME/preparation_cache)")
 
+    # Stale command
+    stale_parser = subparsers.add_parser(
+        "stale", help="Show which cached outputs a changed master Excel file makes stale, and why"
+    )
+    stale_parser.add_argument("master_excel", type=str, help="Path to the master Excel file")
+    stale_parser.add_argument("--cache-dir", type=str, help="Cache directory (default: $STEELO_HOME/preparation_cache)")
+
+    # Geo layers command (cross-run cache of static geospatial layers)
+    geo_parser = subparsers.add_parser("geo-layers", help="Inspect and prune the static geo layer cache")
+    geo_parser.add_argument(
+        "action", choices=["stats", "list", "prune", "clear"], help="What to do with the geo layer cache"
+    )
+    geo_parser.add_argument("--cache-dir", type=str, help="Cache directory (default: $STEELO_HOME/geo_layer_cache)")
+    geo_parser.add_argument("--max-size-gb", type=float, help="prune: evict least recently used layers above this size")
+    geo_parser.add_argument("--older-than-days", type=float, help="prune: evict layers not used for this many days")
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return "No command specified"
 
+    if args.command == "geo-layers":
+        _geo_layer_cache_command(args, console)
+        return f"Cache {args.command} {args.action} completed"
+
     # Get cache directory
     if args.cache_dir:
         cache_root = Path(args.cache_dir)
@@ -157,8 +178,88 @@ def steelo_cache() -> str:
 
         console.print(table)
 
+    elif args.command == "stale":
+        _stale_outputs_command(cache_manager, Path(args.master_excel), console)
+
     return f"Cache {args.command} completed"
 
 
+def _stale_outputs_command(cache_manager: DataPreparationCache, master_excel_path: Path, console: Console) -> None:
+    """Run ``steelo-cache stale``: list the outputs a preparation of ``master_excel_path`` would recreate."""
+    if not master_excel_path.exists():
+        console.print(f"[red]Master Excel file not found: {master_excel_path}[/red]")
+        return
+    if cache_manager.get_cached_preparation(master_excel_path):
+        console.print("[green]A cached preparation of this exact file exists; nothing is stale[/green]")
+        return
+
+    stale_outputs = cache_manager.find_stale_outputs(master_excel_path)
+    if stale_outputs is None:
+        console.print("[yellow]No cached preparation records its dependencies; everything will be prepared[/yellow]")
+        return
+
+    console.print(f"Compared with cached preparation {stale_outputs.base_key[:8]}...")
+    table = Table(title="Stale Outputs")
+    table.add_column("Output", style="cyan")
+    table.add_column("Reason", style="yellow")
+    for output, reasons in sorted(stale_outputs.stale.items()):
+        table.add_row(output, "; ".join(reasons))
+    console.print(table)
+    total = len(stale_outputs.stale) + len(stale_outputs.fresh)
+    console.print(f"{len(stale_outputs.stale)} of {total} outputs are stale; {len(stale_outputs.fresh)} will be reused")
+
+
+def _geo_layer_cache_command(args: argparse.Namespace, console: Console) -> None:
+    """Run a ``steelo-cache geo-layers`` action."""
+    from ..adapters.geospatial.layer_cache import GeoLayerCache
+
+    cache_root = Path(args.cache_dir) if args.cache_dir else get_steelo_home() / "geo_layer_cache"
+    layer_cache = GeoLayerCache(cache_root)
+
+    if args.action == "stats":
+        stats = layer_cache.get_cache_stats()
+        console.print("[bold]Geo Layer Cache Statistics[/bold]")
+        console.print(f"Directory: {stats['cache_directory']}")
+        console.print(f"Total layers: {stats['total_entries']}")
+        for layer, count in sorted(stats["entries_per_layer"].items()):
+            console.print(f"  {layer}: {count}")
+        console.print(f"Total size: {stats['total_size_mb']:.1f} MB")
+        if stats["least_recently_used"]:
+            console.print(f"Least recently used: {stats['least_recently_used'][:19]}")
+        if stats["most_recently_used"]:
+            console.print(f"Most recently used: {stats['most_recently_used'][:19]}")
+
+    elif args.action == "list":
+        table = Table(title="Cached Geo Layers")
+        table.add_column("Layer", style="cyan")
+        table.add_column("Key", style="yellow")
+        table.add_column("Last used", style="green")
+        table.add_column("Size (MB)", style="magenta", justify="right")
+        for entry in reversed(layer_cache.entries()):
+            table.add_row(
+                entry.layer,
+                entry.key[:12] + "...",
+                entry.last_used.isoformat()[:19],
+                f"{entry.size_bytes / (1024 * 1024):.1f}",
+            )
+        console.print(table)
+
+    elif args.action == "prune":
+        if args.max_size_gb is None and args.older_than_days is None:
+            console.print("[yellow]Nothing to prune: pass --max-size-gb and/or --older-than-days[/yellow]")
+            return
+        max_size_bytes = int(args.max_size_gb * 1024**3) if args.max_size_gb is not None else None
+        removed = layer_cache.evict(max_size_bytes=max_size_bytes, older_than_days=args.older_than_days)
+        console.print(f"[green]Removed {removed} cached geo layers[/green]")
+
+    elif args.action == "clear":
+        confirm = console.input("Are you sure? (y/N): ")
+        if confirm.lower() == "y":
+            removed = layer_cache.clear_cache()
+            console.print(f"[green]Removed {removed} cached geo layers[/green]")
+        else:
+            console.print("[blue]Cancelled[/blue]")
+
+
 if __name__ == "__main__":
     steelo_cache()
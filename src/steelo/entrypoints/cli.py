@@ -21,6 +21,8 @@ from ..domain import Year
 
 from ..simulation import SimulationConfig
 from ..bootstrap import bootstrap_simulation
+from ..service_layer.checkpoint import RunSnapshots
+from ..utilities.plot_queue import PLOT_CLASSES
 from ..utils.symlink_manager import update_data_symlink, update_output_symlink, setup_legacy_symlinks
 
 
@@ -90,7 +92,7 @@ def run_full_simulation() -> str:
         "--resume-from-year",
         type=int,
         default=None,
-        help="Resume simulation from a checkpoint at the specified year",
+        help="Continue the latest run with a snapshot of the previous year, simulating again from this year on",
     )
 
     # New arguments for caching and paths
@@ -118,6 +120,37 @@ def run_full_simulation() -> str:
         action="store_true",
         help="Enable furnace group clustering to reduce LP complexity",
     )
+    parser.add_argument(
+        "--lp-backend",
+        type=str,
+        choices=["pyomo", "highs"],
+        default="pyomo",
+        help="Trade LP backend: 'pyomo' (Pyomo model + appsi_highs) or 'highs' (sparse matrices passed directly to highspy)",
+    )
+    parser.add_argument(
+        "--persistent-lp",
+        action="store_true",
+        help="Keep the trade LP solver alive across years and update it incrementally (requires --lp-backend highs)",
+    )
+    parser.add_argument(
+        "--pam-workers",
+        type=int,
+        default=1,
+        help="Worker processes evaluating plant agent NPVs in parallel (default: 1, i.e. serial)",
+    )
+    parser.add_argument(
+        "--plot-workers",
+        type=int,
+        default=1,
+        help="Worker processes rendering plots while the simulation continues (default: 1; 0 renders inline)",
+    )
+    parser.add_argument(
+        "--disable-plots",
+        nargs="+",
+        choices=list(PLOT_CLASSES),
+        default=[],
+        help="Plot classes to skip entirely",
+    )
 
     def _str2bool(v: str) -> bool:
         if v.lower() in ("true", "t", "yes", "y", "1"):
@@ -181,8 +214,16 @@ def run_full_simulation() -> str:
         output_base = steelo_home / "output"
         output_base.mkdir(exist_ok=True)
 
-        # Unique output directory for this simulation
-        output_dir = output_base / f"sim_{timestamp}"
+        # Unique output directory for this simulation; a resumed run continues in the directory of the run it resumes
+        if args.resume_from_year:
+            snapshot_name = RunSnapshots.file_name(args.resume_from_year - 1)
+            resumable = sorted(output_base.glob(f"sim_*/snapshots/{snapshot_name}"))
+            if not resumable:
+                console.print(f"[red]No run in {output_base} has a snapshot for year {args.resume_from_year - 1}[/red]")
+                sys.exit(1)
+            output_dir = resumable[-1].parent.parent
+        else:
+            output_dir = output_base / f"sim_{timestamp}"
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Map log level string to logging constants
@@ -255,6 +296,11 @@ def run_full_simulation() -> str:
                 "master_excel_path": master_excel_path,
                 "demand_sheet_name": args.demand_sheet,
                 "log_level": log_level,
+                "lp_backend": args.lp_backend,
+                "persistent_trade_lp": args.persistent_lp,
+                "pam_workers": args.pam_workers,
+                "plot_workers": args.plot_workers,
+                "disabled_plot_classes": args.disable_plots,
             }
 
             # Add custom baseload_power_sim_dir if provided
@@ -333,6 +379,11 @@ def run_full_simulation() -> str:
                     "master_excel_path": master_excel_path,
                     "demand_sheet_name": args.demand_sheet,
                     "log_level": log_level,
+                    "lp_backend": args.lp_backend,
+                    "persistent_trade_lp": args.persistent_lp,
+                    "pam_workers": args.pam_workers,
+                    "plot_workers": args.plot_workers,
+                    "disabled_plot_classes": args.disable_plots,
                 }
 
                 # Add custom baseload_power_sim_dir if provided
@@ -398,16 +449,14 @@ def run_full_simulation() -> str:
                     shutil.rmtree(prep_dir)
                 sys.exit(1)
 
-        # If resuming from checkpoint, override start year
         if args.resume_from_year:
-            config.start_year = Year(args.resume_from_year)
-            console.print(f"[blue]Resuming simulation from checkpoint at year {args.resume_from_year}[/blue]")
+            console.print(f"[blue]Resuming simulation from year {args.resume_from_year}[/blue]")
 
         # Run simulation
         console.print(f"[blue]Running simulation in: {output_dir}[/blue]")
         try:
             runner = bootstrap_simulation(config)
-            runner.run()
+            runner.run(resume_from_year=args.resume_from_year)
         except Exception as e:
             console.print(f"[red]Simulation failed: {e}[/red]")
             import traceback
@@ -9,6 +9,7 @@ Key Features:
 - Context-aware DEBUG filtering via thread-local tracking
 - Function-level overrides for noisy functions
 - CLI ceiling support (--log-level INFO suppresses all DEBUG)
+- Gated loggers for hot loops: the level/context decision is made (and cached) before any message is built
 
 Usage:
     # In bootstrap.py - load YAML config early
@@ -18,18 +19,33 @@ Usage:
     with LoggingConfig.simulation_logging("PlantAgentsModel"):
         # DEBUG logs filtered based on "pam" module config
         model.run()
+
+    # In hot loops - messages are only built if a handler will emit them
+    logger = get_logger(f"{__name__}.optimal_technology_name")
+    logger.debug("[OPTIMAL TECH] Capacity: %.0f kt", capacity)
+    logger.debug(lambda: f"[OPTIMAL TECH] Unit OPEX: ${self.unit_total_opex:,.2f}/t")
 """
 
+import functools
 import logging
 import yaml
 import threading
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
 from contextlib import contextmanager
 
 
 # Thread-local storage for current module context
 _current_module = threading.local()
 
+# Cached gate decisions of GatedLogger: (module context, logger name, level, effective level, logging.disable level)
+# -> whether a handler emits the record. Keying on the effective and disable levels keeps decisions valid across
+# Logger.setLevel and logging.disable calls. Only consulted once configure_from_yaml has installed the context filters;
+# cleared by LoggingConfig.reset_log_gates.
+_gate_decisions: Dict[tuple[Optional[str], str, int, int, int], bool] = {}
+_context_filters_installed = False
+
+F = TypeVar("F", bound=Callable[..., Any])
+
 
 class ShortNameFormatter(logging.Formatter):
     """
@@ -104,26 +120,180 @@ class ContextAwareFilter(logging.Filter):
         Returns:
             True if record should be logged, False otherwise
         """
+        return self.allows(record.name, record.levelno)
+
+    def allows(self, logger_name: str, levelno: int) -> bool:
+        """
+        Decide for a logger name and level in the current module context, without a log record.
+
+        Args:
+            logger_name: Name of the logger the record would come from
+            levelno: Numeric logging level of the record
+
+        Returns:
+            True if such a record should be logged, False otherwise
+        """
         # Check function override first (highest priority)
-        func_name = record.name.split(".")[-1]
+        func_name = logger_name.split(".")[-1]
         if func_name in self.function_overrides:
-            return record.levelno >= self.function_overrides[func_name]
+            return levelno >= self.function_overrides[func_name]
 
         # Non-DEBUG always allowed
-        if record.levelno > logging.DEBUG:
+        if levelno > logging.DEBUG:
             return True
 
         # For DEBUG: check current module context
         current_module = getattr(_current_module, "name", None)
         if not current_module:
             # Outside module context - use CLI level directly
-            return record.levelno >= self.cli_level
+            return levelno >= self.cli_level
 
         # Inside module context - use YAML level (CLI ceiling already applied to module_levels)
         module_level = self.module_levels.get(current_module, logging.INFO)
         return module_level <= logging.DEBUG
 
 
+def _handlers_emit(logger: logging.Logger, levelno: int) -> bool:
+    """
+    Whether any handler reachable from ``logger`` would emit a record of ``levelno`` in the current context.
+
+    Mirrors ``Logger.callHandlers``: walks up the hierarchy until a logger does not propagate, checking handler
+    levels and the ContextAwareFilters on the originating logger and on each handler. Other filter types are
+    assumed to pass, so the answer errs on the side of building the message.
+    """
+
+    def passes(filterer: logging.Filterer) -> bool:
+        return all(f.allows(logger.name, levelno) for f in filterer.filters if isinstance(f, ContextAwareFilter))
+
+    if not passes(logger):
+        return False
+    found_handler = False
+    current: Optional[logging.Logger] = logger
+    while current is not None:
+        for handler in current.handlers:
+            found_handler = True
+            if levelno >= handler.level and passes(handler):
+                return True
+        if not current.propagate:
+            break
+        current = current.parent
+    # Without any handler, logging falls back to logging.lastResort
+    return not found_handler
+
+
+class GatedLogger:
+    """
+    Logger facade that decides whether a record will be emitted before the message is built.
+
+    The decision combines the standard level check (``Logger.isEnabledFor``, cached by ``logging``) with the
+    ContextAwareFilter verdict for the current module context (geo/pam/tm), cached per context, logger and level.
+    Disabled calls therefore cost a couple of dictionary lookups, whereas a ``logger.debug(f"...")`` call formats
+    its message (and evaluates every property in it) before the filter rejects the record.
+
+    Messages are either ``%``-style with arguments, or a zero-argument callable returning the message, which is
+    only called if the record is emitted:
+
+        logger.debug("[VOPEX] FG %s: vopex=$%.4f/t", fg_id, vopex)
+        logger.debug(lambda: f"[OPTIMAL TECH] Unit OPEX: ${self.unit_total_opex:,.2f}/t")
+
+    Every other attribute is delegated to the wrapped ``logging.Logger``. Create instances with ``get_logger``.
+
+    Args:
+        logger: Standard library logger to wrap
+    """
+
+    __slots__ = ("_logger", "name")
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+        self.name = logger.name
+
+    def isEnabledFor(self, level: int) -> bool:
+        """Whether a record of ``level`` logged here would be emitted by at least one handler."""
+        if not self._logger.isEnabledFor(level):
+            return False
+        if not _context_filters_installed:
+            return True
+        key = (
+            getattr(_current_module, "name", None),
+            self.name,
+            level,
+            self._logger.getEffectiveLevel(),
+            logging.root.manager.disable,
+        )
+        try:
+            return _gate_decisions[key]
+        except KeyError:
+            decision = _gate_decisions[key] = _handlers_emit(self._logger, level)
+            return decision
+
+    def _emit(self, level: int, msg: Any, args: tuple, kwargs: Dict[str, Any]) -> None:
+        if callable(msg):
+            msg = msg()
+        # Attribute the record to the caller of debug()/info()/..., not to this module
+        kwargs["stacklevel"] = kwargs.get("stacklevel", 1) + 2
+        self._logger.log(level, msg, *args, **kwargs)
+
+    def debug(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self.isEnabledFor(logging.DEBUG):
+            self._emit(logging.DEBUG, msg, args, kwargs)
+
+    def info(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self.isEnabledFor(logging.INFO):
+            self._emit(logging.INFO, msg, args, kwargs)
+
+    def warning(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self.isEnabledFor(logging.WARNING):
+            self._emit(logging.WARNING, msg, args, kwargs)
+
+    def error(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, msg, args, kwargs)
+
+    def exception(self, msg: Any, *args: Any, exc_info: Any = True, **kwargs: Any) -> None:
+        if self.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, msg, args, {**kwargs, "exc_info": exc_info})
+
+    def critical(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self.isEnabledFor(logging.CRITICAL):
+            self._emit(logging.CRITICAL, msg, args, kwargs)
+
+    def log(self, level: int, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self.isEnabledFor(level):
+            self._emit(level, msg, args, kwargs)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._logger, attribute)
+
+    def __repr__(self) -> str:
+        return f"<GatedLogger {self.name}>"
+
+
+@functools.cache
+def get_logger(name: str) -> GatedLogger:
+    """
+    Gated logger for ``name`` (one instance per name, so it is cheap to call inside functions).
+
+    Args:
+        name: Logger name, e.g. ``f"{__name__}.optimal_technology_name"``
+
+    Returns:
+        GatedLogger wrapping ``logging.getLogger(name)``
+    """
+    return GatedLogger(logging.getLogger(name))
+
+
+def hot_path(func: F) -> F:
+    """
+    Mark a function as a hot simulation loop.
+
+    Has no runtime effect. ``tests/architecture/test_hot_path_logging.py`` checks that marked functions log through
+    ``get_logger`` and never build messages eagerly (f-strings, ``str.format`` or ``%`` on the message): they use
+    ``%``-style arguments or a callable message instead.
+    """
+    return func
+
+
 class LoggingConfig:
     """Manages logging configuration for the simulation."""
 
@@ -220,6 +390,21 @@ class LoggingConfig:
         for logger_name, level_str in config.get("external", {}).items():
             logging.getLogger(logger_name).setLevel(getattr(logging, level_str))
 
+        global _context_filters_installed
+        _context_filters_installed = True
+        cls.reset_log_gates()
+
+    @classmethod
+    def reset_log_gates(cls):
+        """
+        Forget the cached GatedLogger decisions.
+
+        Call after adding or removing handlers or filters, or changing handler levels, once the YAML configuration
+        has been loaded, so that gated loggers re-evaluate which records are emitted. Logger levels and
+        ``logging.disable`` are part of the cache key and need no reset.
+        """
+        _gate_decisions.clear()
+
     @classmethod
     def configure_base_loggers(cls):
         """
@@ -3,10 +3,10 @@ from typing import Any
 
 from .unit_of_work import UnitOfWork
 from .message_bus import MessageBus
-from .checkpoint import SimulationCheckpoint
+from .checkpoint import RunSnapshots, SimulationCheckpoint
 from ..adapters.repositories import Repository
 
-__all__ = ["MessageBus", "UnitOfWork", "SimulationCheckpoint"]
+__all__ = ["MessageBus", "UnitOfWork", "SimulationCheckpoint", "RunSnapshots"]
 
 
 def get_markers(repository: Repository):
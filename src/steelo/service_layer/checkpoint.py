@@ -3,21 +3,33 @@ Checkpoint system for saving and loading simulation state.
 
 This module provides functionality to save simulation state at regular intervals,
 allowing for recovery from crashes and debugging of long-running simulations.
+
+``SimulationCheckpoint`` writes partial, inspectable checkpoints; ``RunSnapshots`` writes the complete
+end-of-year state that ``SimulationRunner.run(resume_from_year=...)`` continues from.
 """
 
+import os
 import pickle
 import json
 import logging
+import random
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 from dataclasses import dataclass, asdict
 from collections import defaultdict
 
+import cloudpickle  # type: ignore[import-untyped]
+import numpy as np
+
 from ..domain import Environment, Year
 from ..service_layer.unit_of_work import UnitOfWork
 
+if TYPE_CHECKING:
+    from ..domain.datacollector import DataCollector
+    from .message_bus import MessageBus
+
 logger = logging.getLogger(__name__)
 
 
@@ -224,8 +236,8 @@ class SimulationCheckpoint:
         Serialize repository state using JsonRepository export functionality.
 
         Plant group entries carry exactly three fields — ``plant_group_id``, ``plants``
-        (list of plant ids), and ``balance``. The restore path is not yet wired;
-        ``LoadCheckpoint`` is tracked separately.
+        (list of plant ids), and ``balance``. The restore path is not wired for these checkpoints;
+        runs are resumed from ``RunSnapshots``.
         """
         # Use the JsonRepository's export functionality if available
         # Otherwise, manually serialize domain objects
@@ -251,3 +263,166 @@ class SimulationCheckpoint:
             # Add other repository collections as needed
         }
         return repo_data
+
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class RestoredRun:
+    """Runner state read back from a snapshot (the environment and repositories are restored in place)."""
+
+    year: int
+    data_collector: "DataCollector"
+    commands: dict
+
+
+class _SnapshotPickler(cloudpickle.Pickler):
+    # The bus, environment and unit of work are referenced by name: message handlers hold on to the live objects,
+    # so a restore overwrites their state instead of replacing them.
+    def __init__(self, file, live_objects: dict[str, Any]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._live_ids = {id(obj): name for name, obj in live_objects.items()}
+
+    def persistent_id(self, obj):
+        return self._live_ids.get(id(obj))
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, live_objects: dict[str, Any]):
+        super().__init__(file)
+        self._live_objects = live_objects
+
+    def persistent_load(self, pid):
+        return self._live_objects[pid]
+
+
+class RunSnapshots:
+    """
+    Complete end-of-year snapshots of a simulation run, for resuming it after a crash.
+
+    A snapshot holds the full environment and unit of work state (repositories, warm-start LP solution and
+    persistent solver), the data collector with its traces, the commands collected so far and the global random
+    number generator states. Continuing from the snapshot of year Y gives the same result as an uninterrupted run.
+    Snapshots are pickled with cloudpickle because the environment and data collector hold lambda-backed
+    defaultdicts; each file starts with a header carrying ``SNAPSHOT_VERSION``. Since every snapshot holds the full
+    state, the runner keeps only those of the latest years (``SimulationConfig.snapshot_keep_last``).
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def file_name(year: int) -> str:
+        return f"snapshot_year_{int(year)}.pkl"
+
+    def path(self, year: int) -> Path:
+        return self.directory / self.file_name(year)
+
+    def years(self) -> list[int]:
+        """Years with a snapshot, ascending."""
+        return sorted(int(path.stem.rsplit("_", 1)[1]) for path in self.directory.glob("snapshot_year_*.pkl"))
+
+    def save(
+        self,
+        year: int,
+        bus: "MessageBus",
+        data_collector: "DataCollector",
+        commands: dict,
+        start_year: int,
+        end_year: int,
+    ) -> Path:
+        """
+        Write the state at the end of ``year`` (atomically, replacing an older snapshot of the same year).
+
+        Raises:
+            CheckpointError: If the state cannot be pickled or written
+        """
+        start_time = time.time()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(year)
+        temporary = self.directory / f".{path.name}.tmp"
+        header = {
+            "snapshot_version": SNAPSHOT_VERSION,
+            "year": int(year),
+            "start_year": int(start_year),
+            "end_year": int(end_year),
+            "timestamp": datetime.now().isoformat(),
+        }
+        state = {
+            "environment": vars(bus.env),
+            "unit_of_work": vars(bus.uow),
+            # Commands handled after the year's collection (e.g. by the year-end handlers) count towards the next year
+            "processed_commands": bus.processed_commands,
+            "data_collector": data_collector,
+            "commands": commands,
+            "random_state": random.getstate(),
+            "numpy_random_state": np.random.get_state(),
+        }
+        try:
+            with open(temporary, "wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                _SnapshotPickler(f, {"bus": bus, "environment": bus.env, "unit_of_work": bus.uow}).dump(state)
+            os.replace(temporary, path)
+        except Exception as e:
+            temporary.unlink(missing_ok=True)
+            raise CheckpointError(f"Failed to save run snapshot for year {year}: {e}") from e
+        logger.info(
+            f"operation=snapshot_save year={int(year)} size_mb={path.stat().st_size / 1e6:.1f} "
+            f"duration_s={time.time() - start_time:.3f}"
+        )
+        return path
+
+    def clean_old_snapshots(self, keep_last_n: int, latest_year: Optional[int] = None) -> None:
+        """
+        Remove old snapshots, keeping only those of the most recent N years.
+
+        Args:
+            keep_last_n: Number of snapshots to keep
+            latest_year: Only snapshots up to this year are considered (those of later years, left by a run that was
+                resumed from an earlier year, are overwritten as the resumed run gets there)
+        """
+        years = [y for y in self.years() if latest_year is None or y <= latest_year]
+        for year in years[: max(0, len(years) - keep_last_n)]:
+            self.path(year).unlink(missing_ok=True)
+            logger.info(f"Removed old run snapshot: {self.path(year)}")
+
+    def restore(self, year: int, bus: "MessageBus", start_year: int, end_year: int) -> RestoredRun:
+        """
+        Load the snapshot of ``year`` into ``bus`` (environment and unit of work, in place) and the global RNGs.
+
+        Raises:
+            CheckpointError: If there is no snapshot for ``year``, it was written by another snapshot version or for
+                another simulation period, or it cannot be read
+        """
+        start_time = time.time()
+        path = self.path(year)
+        if not path.exists():
+            available = ", ".join(str(y) for y in self.years()) or "none"
+            raise CheckpointError(f"No run snapshot for year {year} in {self.directory} (available: {available})")
+        try:
+            with open(path, "rb") as f:
+                header = pickle.load(f)
+                if header.get("snapshot_version") != SNAPSHOT_VERSION:
+                    raise CheckpointError(
+                        f"Run snapshot {path} has version {header.get('snapshot_version')}, expected {SNAPSHOT_VERSION}"
+                    )
+                if (header["start_year"], header["end_year"]) != (int(start_year), int(end_year)):
+                    raise CheckpointError(
+                        f"Run snapshot {path} belongs to a {header['start_year']}-{header['end_year']} simulation, "
+                        f"not {int(start_year)}-{int(end_year)}"
+                    )
+                state = _SnapshotUnpickler(f, {"bus": bus, "environment": bus.env, "unit_of_work": bus.uow}).load()
+        except CheckpointError:
+            raise
+        except Exception as e:
+            raise CheckpointError(f"Failed to load run snapshot {path}: {e}") from e
+
+        for live, restored in ((bus.env, state["environment"]), (bus.uow, state["unit_of_work"])):
+            vars(live).clear()
+            vars(live).update(restored)
+        bus.processed_commands = state["processed_commands"]
+        random.setstate(state["random_state"])
+        np.random.set_state(state["numpy_random_state"])
+        logger.info(f"operation=snapshot_restore year={int(year)} duration_s={time.time() - start_time:.3f}")
+        return RestoredRun(year=int(year), data_collector=state["data_collector"], commands=state["commands"])
@@ -2,14 +2,13 @@ from typing import Callable, TYPE_CHECKING
 from collections import defaultdict
 
 from ..domain import events, commands, Volumes, Year, PointInTime, TimeFrame
-from ..domain.models import Environment
+from ..domain.models import Environment, FurnaceGroup
 from .unit_of_work import UnitOfWork
 from datetime import datetime
 import json
 
 # Global variables moved to Environment/Config
 from steelo.domain.constants import Commodities, T_TO_KT  # Keep enum as constant
-from steelo.domain.trade_modelling.TM_PAM_connector import TM_PAM_connector
 from steelo.domain.calculate_costs import filter_subsidies_for_year
 from steelo.domain import diagnostics as diag
 import logging
@@ -294,7 +293,53 @@ def update_future_cost_curve(_event: events.Event, uow: UnitOfWork, env: Environ
         uow.commit()
 
 
+def _find_furnace_group(uow: UnitOfWork, furnace_group_id: str, plant_id: str | None = None) -> FurnaceGroup | None:
+    plants = [uow.plants.get(plant_id)] if plant_id is not None else uow.plants.list()
+    for plant in plants:
+        for fg in plant.furnace_groups:
+            if fg.furnace_group_id == furnace_group_id:
+                return fg
+    return None
+
+
+def update_cost_curve_entry(
+    event: events.FurnaceGroupClosed | events.FurnaceGroupTechChanged | events.FurnaceGroupRenovated,
+    uow: UnitOfWork,
+    env: Environment,
+):
+    """
+    Update the cost curve entry of the one furnace group that was closed, switched technology or renovated.
+
+    Only this furnace group's unit cost or status changed, so its entry is re-inserted at its new merit-order
+    position instead of regenerating the whole curve from every plant. Falls back to the full regeneration of
+    ``update_cost_curve`` if the curve has not been generated yet.
+    """
+    with uow:
+        fg = _find_furnace_group(uow, event.furnace_group_id)
+        if not env.update_cost_curve_entry(event.furnace_group_id, fg, lag=0):
+            update_cost_curve(event, uow, env)
+        uow.commit()
+
+
+def update_future_cost_curve_entry(
+    event: events.FurnaceGroupAdded | events.SinteringCapacityAdded, uow: UnitOfWork, env: Environment
+):
+    """
+    Insert the furnace group added to a plant into the future cost curve.
+
+    Falls back to the full regeneration of ``update_future_cost_curve`` if the curve has not been generated yet.
+    """
+    with uow:
+        fg = _find_furnace_group(uow, event.furnace_group_id, plant_id=event.plant_id)
+        if not env.update_cost_curve_entry(event.furnace_group_id, fg, lag=3):
+            update_future_cost_curve(event, uow, env)
+        uow.commit()
+
+
 def update_furnace_utilization_rates(event: events.SteelAllocationsCalculated, uow: UnitOfWork, env: Environment):
+    # Imported here: the trade model pulls in pyomo and networkx, which bootstrapping a simulation does not need
+    from steelo.domain.trade_modelling.TM_PAM_connector import TM_PAM_connector
+
     trade_allocations = event.trade_allocations
     if env.config is None:
         raise ValueError("SimulationConfig is required for update_furnace_utilization_rates")
@@ -463,6 +508,7 @@ def finalise_iteration(
 
                 # Step 3a: Update current year in lifetime tracking
                 fg.lifetime.current = env.year
+                fg.invalidate_cost_cache()
 
                 # Step 3b: Execute scheduled technology switches if the future_switch_year matches current year
                 if fg.future_switch_year == env.year and fg.future_switch_cmd is not None:
@@ -520,6 +566,7 @@ def finalise_iteration(
                 all_opex_subsidies = env.opex_subsidies.get(plant.location.iso3, {}).get(fg.technology.name, [])
                 active_opex_subsidies = filter_subsidies_for_year(all_opex_subsidies, env.year)
                 fg.applied_subsidies["opex"] = active_opex_subsidies
+                fg.invalidate_cost_cache()
 
                 logger.debug(
                     f"[OPEX SUBSIDIES] Updated FG {fg.furnace_group_id} "
@@ -767,11 +814,11 @@ def load_checkpoint_handler(
 
 
 EVENT_HANDLERS: dict[type[events.Event], list[Callable]] = {
-    events.FurnaceGroupClosed: [update_cost_curve],
-    events.FurnaceGroupTechChanged: [update_cost_curve],
-    events.FurnaceGroupRenovated: [update_cost_curve],
-    events.FurnaceGroupAdded: [update_future_cost_curve, update_capacity_buildout],
-    events.SinteringCapacityAdded: [update_future_cost_curve],
+    events.FurnaceGroupClosed: [update_cost_curve_entry],
+    events.FurnaceGroupTechChanged: [update_cost_curve_entry],
+    events.FurnaceGroupRenovated: [update_cost_curve_entry],
+    events.FurnaceGroupAdded: [update_future_cost_curve_entry, update_capacity_buildout],
+    events.SinteringCapacityAdded: [update_future_cost_curve_entry],
     events.SteelAllocationsCalculated: [update_furnace_utilization_rates, update_cost_curve, update_future_cost_curve],
     events.IterationOver: [finalise_iteration, update_cost_curve],
     events.SaveCheckpoint: [save_checkpoint_handler],
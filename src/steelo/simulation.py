@@ -18,25 +18,36 @@ import sys
 
 from steelo.simulation_types import TechSettingsMap, get_default_technology_settings
 from steelo.utilities.memory_profiling import MemoryTracker
+from steelo.utilities.plot_queue import PLOT_CLASSES, PlotQueue, drain_plots, submit_plot
+from steelo.utilities.tracing import SpanTracer, start_span, traced
 
-from .domain import Year, PlantGroup
+from .domain import Year, Plant, PlantGroup
 from .service_layer.message_bus import MessageBus
+from .service_layer.checkpoint import CheckpointError, RunSnapshots
 from .economic_models import EconomicModel, PlantAgentsModel, AllocationModel, GeospatialModel
 from .domain.events import IterationOver
 from .domain.datacollector import DataCollector
-from .adapters.dataprocessing.postprocessing.post_process_datacollection import (
-    extract_and_process_stored_dataCollection,
-)
-from .adapters.dataprocessing.postprocessing.generate_post_run_plots import generate_post_run_cap_prod_plots
-from steelo.utilities.plotting import (
-    plot_bar_chart_of_new_plants_by_status,
-    plot_map_of_new_plants_operating,
-)
-from .adapters.geospatial.geospatial_statistics import aggregate_lcoe_lcoh_statistics
 from .logging_config import LoggingConfig
 from steelo.domain.constants import T_TO_KT, MT_TO_T
 from steelo.domain.calculate_costs import filter_subsidies_for_year, get_subsidised_energy_costs
 from .furnace_breakdown_logging_minimal import FurnaceBreakdownLogger
+from .utilities.lazy_imports import lazy_callable
+
+# Post-processing and plotting pull in the plotting and geospatial stacks; import them when a run finishes
+extract_and_process_stored_dataCollection = lazy_callable(
+    "steelo.adapters.dataprocessing.postprocessing.post_process_datacollection",
+    "extract_and_process_stored_dataCollection",
+)
+generate_post_run_cap_prod_plots = lazy_callable(
+    "steelo.adapters.dataprocessing.postprocessing.generate_post_run_plots", "generate_post_run_cap_prod_plots"
+)
+plot_bar_chart_of_new_plants_by_status = lazy_callable(
+    "steelo.utilities.plotting", "plot_bar_chart_of_new_plants_by_status"
+)
+plot_map_of_new_plants_operating = lazy_callable("steelo.utilities.plotting", "plot_map_of_new_plants_operating")
+aggregate_lcoe_lcoh_statistics = lazy_callable(
+    "steelo.adapters.geospatial.geospatial_statistics", "aggregate_lcoe_lcoh_statistics"
+)
 
 if TYPE_CHECKING:
     from .adapters.repositories import Repository
@@ -149,7 +160,7 @@ class Simulation:
     def run_simulation(self) -> None:
         # Use the LoggingConfig context manager with the model's class name
         model_name = self.economic_model.__class__.__name__
-        with LoggingConfig.simulation_logging(model_name):
+        with LoggingConfig.simulation_logging(model_name), start_span(model_name):
             self.economic_model.run(self.bus)
 
 
@@ -278,6 +289,12 @@ class SimulationConfig:
     # === Trade Module Parameters ===
     # Solver configuration
     lp_epsilon: float = 1e-3  # LP solver epsilon
+    # "pyomo": Pyomo model solved via appsi_highs; "highs": constraint matrix assembled with NumPy/SciPy and
+    # passed straight to highspy (no Pyomo model generation, same constraint set)
+    lp_backend: str = "pyomo"
+    # Keep one HiGHS instance across years and only apply the year-over-year changes (requires lp_backend="highs").
+    # The updated model is solved with simplex from last year's optimal basis, also when the solver option is IPM.
+    persistent_trade_lp: bool = False
     capacity_limit: float = 0.95
     soft_minimum_capacity_percentage: float = 0.6
     minimum_active_utilisation_rate: float = 0.01
@@ -328,6 +345,22 @@ class SimulationConfig:
     # === Plant Agent Module Parameters ===
     probabilistic_agents: bool = True  # Probabilitstic (mimick human decision-making) vs deterministic approach
     plant_lifetime: int = 20  # Years
+    # Worker processes computing furnace group and expansion NPVs ahead of the (serial) decisions; 1 = no workers.
+    # Decisions are replayed in the serial order, so results are identical for a fixed random_seed.
+    pam_workers: int = 1
+    # Write a complete run snapshot (output_dir/snapshots) at the end of every N-th simulated year; 0 = never.
+    # SimulationRunner.run(resume_from_year=...) continues a crashed run from such a snapshot.
+    snapshot_interval_years: int = 1
+    # Snapshots of only the latest N years are kept (each holds the full run state, often several GB); 0 = keep all.
+    snapshot_keep_last: int = 2
+    # Also write the pickled per-plant dicts (TM/datacollection_post_allocation_{year}.pkl) next to the columnar
+    # per-year tables, for tools that still read the legacy format
+    legacy_datacollection_pickles: bool = False
+    # Worker processes rendering plots (yearly trade maps, GEO layer screenshots, post-run figures) while the
+    # simulation continues; 0 = render every plot inline. The run returns once all queued plots are rendered.
+    plot_workers: int = 1
+    # Plot classes to skip entirely: "trade" (yearly trade maps), "geo" (GEO layer screenshots), "post_run"
+    disabled_plot_classes: list[str] = field(default_factory=list)
 
     # Statuses of furnace groups
     active_statuses: list[str] = field(
@@ -563,6 +596,19 @@ class SimulationConfig:
 
         if self.opening_balance_multiplier < 0:
             raise ValueError("opening_balance_multiplier must be >= 0.0")
+        if self.persistent_trade_lp and self.lp_backend != "highs":
+            raise ValueError("persistent_trade_lp requires lp_backend='highs'")
+        if self.pam_workers < 1:
+            raise ValueError("pam_workers must be >= 1")
+        if self.snapshot_interval_years < 0:
+            raise ValueError("snapshot_interval_years must be >= 0")
+        if self.snapshot_keep_last < 0:
+            raise ValueError("snapshot_keep_last must be >= 0")
+        if self.plot_workers < 0:
+            raise ValueError("plot_workers must be >= 0")
+        unknown_plot_classes = set(self.disabled_plot_classes) - set(PLOT_CLASSES)
+        if unknown_plot_classes:
+            raise ValueError(f"Unknown disabled_plot_classes {sorted(unknown_plot_classes)}; expected {PLOT_CLASSES}")
 
         # Convert strings to Path objects if needed
         self.output_dir = Path(self.output_dir)
@@ -1039,7 +1085,10 @@ class SimulationRunner:
         self.temp_dir = Path(tempfile.mkdtemp(prefix="steel_sim_static_"))
         self._update_geo_paths_for_static_files()
         self.data_collector = DataCollector(
-            world_plant_groups=self.bus.uow.plant_groups.list(), env=self.bus.env, output_dir=self.config.output_dir
+            world_plant_groups=self.bus.uow.plant_groups.list(),
+            env=self.bus.env,
+            output_dir=self.config.output_dir,
+            write_legacy_pickles=self.config.legacy_datacollection_pickles,
         )
         # Initialize furnace breakdown logger for better debugging
         self.furnace_logger = FurnaceBreakdownLogger()
@@ -1062,12 +1111,88 @@ class SimulationRunner:
             except Exception as e:
                 logger.warning(f"Failed to clean up temporary directory {self.temp_dir}: {e}")
 
-    def run(self):
+    @property
+    def snapshots(self) -> RunSnapshots:
+        return RunSnapshots(self.config.output_dir / "snapshots")
+
+    def _restore_snapshot(self, resume_from_year: int) -> dict:
+        """Restore the run state written at the end of ``resume_from_year - 1``; returns the collected commands."""
+        restored = self.snapshots.restore(
+            resume_from_year - 1, self.bus, start_year=self.config.start_year, end_year=self.config.end_year
+        )
+        self.data_collector = restored.data_collector
+        # The static layers of the crashed run lived in its own (possibly removed) temporary directory
+        self._update_geo_paths_for_static_files()
+        logger.info(f"operation=simulation_resume year={resume_from_year}")
+        return restored.commands
+
+    @traced("save_snapshot")
+    def _save_snapshot(self, year: int, commands: dict) -> None:
+        interval = self.config.snapshot_interval_years
+        if not interval or (year - int(self.config.start_year) + 1) % interval != 0:
+            return
+        try:
+            self.snapshots.save(
+                year,
+                self.bus,
+                self.data_collector,
+                commands,
+                start_year=self.config.start_year,
+                end_year=self.config.end_year,
+            )
+        except CheckpointError as e:
+            logger.warning(f"Failed to save run snapshot for year {year}: {e}")
+            return
+        if self.config.snapshot_keep_last:
+            self.snapshots.clean_old_snapshots(self.config.snapshot_keep_last, latest_year=year)
+
+    def run(self, resume_from_year: Optional[int] = None):
+        """
+        Simulate every year from ``config.start_year`` to ``config.end_year`` and post-process the results.
+
+        Args:
+            resume_from_year: Continue a previous run in the same output directory from the snapshot written at the
+                end of the year before (see ``SimulationConfig.snapshot_interval_years``) instead of starting over.
+                ``end_year + 1`` only repeats the post-processing.
+
+        Raises:
+            CheckpointError: If the snapshot to resume from is missing or does not match this configuration
+        """
+        # Every phase of the run is traced; the report is written to the output directory even if the run fails
+        tracer = SpanTracer()
+        # Plots are rendered by worker processes while the simulation continues (see SimulationConfig.plot_workers)
+        with PlotQueue(max_workers=self.config.plot_workers, disabled_classes=self.config.disabled_plot_classes):
+            try:
+                with tracer.activate(), tracer.start_span("simulation"):
+                    return self._run(resume_from_year)
+            finally:
+                self._write_performance_reports(tracer)
+
+    def _write_performance_reports(self, tracer: SpanTracer) -> None:
+        """Write the span trace and the per-phase summary of the run to ``output_dir/performance``."""
+        tracer.log_summary()
+        try:
+            trace_path, summary_path = tracer.write_reports(self.config.output_dir / "performance")
+        except OSError as e:
+            logger.warning(f"Failed to write performance reports: {e}")
+            return
+        logger.info(f"operation=performance_report trace={trace_path} summary={summary_path}")
+
+    def _run(self, resume_from_year: Optional[int]):
         bus = self.bus
-        data_collector = self.data_collector
         commands = {}
         start_year = int(self.config.start_year)
         end_year = int(self.config.end_year)
+        first_year = start_year
+        if resume_from_year is not None:
+            if not start_year < resume_from_year <= end_year + 1:
+                raise ValueError(
+                    f"resume_from_year must be after the first simulated year and at most {end_year + 1}, "
+                    f"got {resume_from_year}"
+                )
+            commands = self._restore_snapshot(resume_from_year)
+            first_year = resume_from_year
+        data_collector = self.data_collector
 
         # Reset memory tracking for this simulation run
         _reset_memory_tracking()
@@ -1084,29 +1209,31 @@ class SimulationRunner:
         _log_memory_usage("memory_snapshot", stage="simulation_start")
         memory_tracker.checkpoint("simulation_start")
 
-        plant_groups = {}
-        for plant in bus.uow.plants.list():
-            plant_groups[plant.ultimate_plant_group] = plant_groups.get(plant.ultimate_plant_group, []) + [plant]
-        for pg_id, plants in plant_groups.items():
-            new_plant_group = PlantGroup(plant_group_id=pg_id, plants=plants)
-            bus.uow.plant_groups.add(new_plant_group)
-
-        # Seed opening balances for initial plant groups
-        if self.config.opening_balance_multiplier > 0:
-            _seed_opening_balances(
-                plant_groups=bus.uow.plant_groups.list(),
-                env=bus.env,
-                multiplier=self.config.opening_balance_multiplier,
-                active_statuses=self.config.active_statuses,
-            )
+        # A resumed run restored its plant groups (with their balances) from the snapshot
+        if resume_from_year is None:
+            plant_groups: dict[str, list[Plant]] = {}
+            for plant in bus.uow.plants.list():
+                plant_groups[plant.ultimate_plant_group] = plant_groups.get(plant.ultimate_plant_group, []) + [plant]
+            for pg_id, plants in plant_groups.items():
+                new_plant_group = PlantGroup(plant_group_id=pg_id, plants=plants)
+                bus.uow.plant_groups.add(new_plant_group)
+
+            # Seed opening balances for initial plant groups
+            if self.config.opening_balance_multiplier > 0:
+                _seed_opening_balances(
+                    plant_groups=bus.uow.plant_groups.list(),
+                    env=bus.env,
+                    multiplier=self.config.opening_balance_multiplier,
+                    active_statuses=self.config.active_statuses,
+                )
 
         # Report initial progress before processing any simulation year
-        progress = Progress(start_year=start_year, end_year=end_year, current_year=start_year - 1)
+        progress = Progress(start_year=Year(start_year), end_year=Year(end_year), current_year=Year(first_year - 1))
         self.progress_callback(progress)
 
-        for i in range(start_year, end_year + 1):
+        for i in range(first_year, end_year + 1):
             # Performance logging: year start
-            year_start_time = time.time()
+            year_span = start_span("year", year=i)
             logger.info(f"operation=year_start year={i}")
             memory_tracker.checkpoint("year_start", year=i)
 
@@ -1134,7 +1261,7 @@ class SimulationRunner:
                     logging.info(f"Warning: Could not check for cancellation: {e}")
 
             # Report progress for this year
-            progress = Progress(start_year=start_year, end_year=end_year, current_year=i)
+            progress = Progress(start_year=Year(start_year), end_year=Year(end_year), current_year=Year(i))
             self.progress_callback(progress)
 
             # Set the environment year to match the loop iteration
@@ -1174,6 +1301,7 @@ class SimulationRunner:
                         all_opex_subs = bus.env.opex_subsidies.get(plant.location.iso3, {}).get(fg.technology.name, [])
                         active_opex_subs = filter_subsidies_for_year(all_opex_subs, bus.env.year)
                         fg.applied_subsidies["opex"] = active_opex_subs
+                        fg.invalidate_cost_cache()
 
             for plant in bus.uow.plants.list():
                 plant.update_furnace_tech_unit_fopex()
@@ -1280,7 +1408,8 @@ class SimulationRunner:
             commands[bus.env.year] = bus.collect_commands()
 
             with LoggingConfig.simulation_logging("DebugLogging"):
-                if LoggingConfig.FURNACE_GROUP_BREAKDOWN:
+                # The breakdown collects data on every furnace group; skip it if its INFO output is not emitted
+                if LoggingConfig.FURNACE_GROUP_BREAKDOWN and logging.getLogger().isEnabledFor(logging.INFO):
                     logging.info(f"========== FURNACE GROUP DEBUG - YEAR {bus.env.year} ==========\n")
 
                     # Use the new FurnaceBreakdownLogger for all plants
@@ -1321,16 +1450,20 @@ class SimulationRunner:
                         bus.handle(event(time_step_increment=1, iron_price=price["iron"]))
 
             # Performance logging: year complete
-            year_elapsed = time.time() - year_start_time
+            year_elapsed = year_span.finish()
             logger.info(f"operation=year_complete year={i} duration_s={year_elapsed:.3f}")
             _log_memory_usage("memory_snapshot", stage="year_complete", year=i)
             memory_tracker.checkpoint("year_end", year=i)
+            self._save_snapshot(i, commands)
 
         # Report completion once all years have been processed
-        progress = Progress(start_year=start_year, end_year=end_year, current_year=end_year + 1)
+        progress = Progress(start_year=Year(start_year), end_year=Year(end_year), current_year=Year(end_year + 1))
         self.progress_callback(progress)
 
         # Postprocessing
+        if bus.env.country_mappings is None:
+            raise ValueError("Country mappings must be configured in Environment for post-processing")
+        post_processing_span = start_span("post_processing")
         output_path = extract_and_process_stored_dataCollection(
             commands=commands,
             data_dir=self.config.output_dir / "TM",
@@ -1342,12 +1475,25 @@ class SimulationRunner:
             iso3_to_country_map=bus.env.country_mappings.code_to_country_map,
             iso3_to_region_map=bus.env.country_mappings.iso3_to_region(),
         )
-        plot_bar_chart_of_new_plants_by_status(data_collector.status_counts, plot_paths=bus.env.plot_paths)
-        plot_map_of_new_plants_operating(data_collector.new_plant_locations, plot_paths=bus.env.plot_paths)
+        # Post-run figures are rendered by the plot queue while the remaining results are exported
+        submit_plot(
+            "post_run",
+            plot_bar_chart_of_new_plants_by_status,
+            data_collector.status_counts,
+            plot_paths=bus.env.plot_paths,
+        )
+        submit_plot(
+            "post_run",
+            plot_map_of_new_plants_operating,
+            data_collector.new_plant_locations,
+            plot_paths=bus.env.plot_paths,
+        )
         steel_demand_by_year = {
             year: float(prices["steel_demand"]) for year, prices in data_collector.trace_price.items()
         }
-        generate_post_run_cap_prod_plots(
+        submit_plot(
+            "post_run",
+            generate_post_run_cap_prod_plots,
             file_path=output_path,
             capacity_limit=bus.env.config.capacity_limit,
             steel_demand=bus.env.current_demand,
@@ -1369,33 +1515,41 @@ class SimulationRunner:
 
         # Plot CAPEX investments by technology and year
         if data_collector.trace_capex:
-            plotter.plot_capex_by_technology(trace_capex=data_collector.trace_capex)
-            logger.info("Generated CAPEX investment plots")
+            submit_plot("post_run", plotter.plot_capex_by_technology, trace_capex=data_collector.trace_capex)
+            logger.info("Queued CAPEX investment plots")
 
         # Plot emissions stacked area charts (5 scope views per available boundary)
         if data_collector.trace_emissions:
-            plotter.plot_emissions_by_technology(
+            submit_plot(
+                "post_run",
+                plotter.plot_emissions_by_technology,
                 trace_emissions=data_collector.trace_emissions,
                 trace_production_by_product=data_collector.trace_production_by_product,
             )
-            logger.info("Generated emissions stacked area charts")
+            logger.info("Queued emissions stacked area charts")
 
         # Plot iron ore consumption stacked area chart by quality
         if data_collector.trace_iron_ore:
-            plotter.plot_iron_ore_by_quality(trace_iron_ore=data_collector.trace_iron_ore)
-            logger.info("Generated iron ore consumption chart")
+            submit_plot("post_run", plotter.plot_iron_ore_by_quality, trace_iron_ore=data_collector.trace_iron_ore)
+            logger.info("Queued iron ore consumption chart")
 
         # Plot metallic charges consumption stacked area chart
         if data_collector.trace_metallic_charges:
-            plotter.plot_metallic_charges(trace_metallic_charges=data_collector.trace_metallic_charges)
-            logger.info("Generated metallic charges consumption chart")
+            submit_plot(
+                "post_run",
+                plotter.plot_metallic_charges,
+                trace_metallic_charges=data_collector.trace_metallic_charges,
+            )
+            logger.info("Queued metallic charges consumption chart")
 
         # Plot international iron trade volumes stacked area chart
         if data_collector.trace_international_iron_trade:
-            plotter.plot_international_iron_trade(
-                trace_international_iron_trade=data_collector.trace_international_iron_trade
+            submit_plot(
+                "post_run",
+                plotter.plot_international_iron_trade,
+                trace_international_iron_trade=data_collector.trace_international_iron_trade,
             )
-            logger.info("Generated international iron trade wedge chart")
+            logger.info("Queued international iron trade wedge chart")
 
             # Export international iron trade data to CSV
             import pandas as pd
@@ -1439,17 +1593,21 @@ class SimulationRunner:
             price_df.to_csv(price_csv_path, index=False)
             logger.info(f"Saved market prices to {price_csv_path}")
 
-            price_plot_path = plotter.plot_market_prices(
+            submit_plot(
+                "post_run",
+                plotter.plot_market_prices,
                 price_df=price_df,
                 start_year=start_year,
                 end_year=end_year,
             )
-            if price_plot_path is not None:
-                logger.info(f"Saved market prices plot to {price_plot_path}")
 
         # Aggregate per-year LCOE/LCOH statistics into stacked CSVs
         aggregate_lcoe_lcoh_statistics(self.config.output_dir, start_year, end_year)
 
+        # The run is finished once every queued plot is rendered; GEO plots may still read the temporary layers
+        drain_plots()
+        post_processing_span.finish()
+
         # Clean up temporary directory
         self._cleanup_temp_dir()
 
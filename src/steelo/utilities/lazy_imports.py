@@ -0,0 +1,104 @@
+"""Defer importing the heavy scientific and plotting stacks until the code that needs them runs.
+
+geopandas, cartopy, matplotlib, xarray, pyomo, networkx and friends take several seconds to import. Modules on the
+import path of the CLI entry points (``run_simulation``, ``steelo-cache``, ``validate-master-input``, ...) and of
+the ``steeloweb`` task workers bind such dependencies through these proxies instead of importing them at module
+level, so ``--help`` and a worker spawn do not pay for stacks they never use:
+
+    >>> xr = lazy_module("xarray")  # nothing imported yet
+    >>> plot_detailed_trade_map = lazy_callable("steelo.utilities.plotting", "plot_detailed_trade_map")
+    >>> xr.DataArray([1, 2])  # first attribute access imports xarray
+
+A lazy callable stays a module attribute, so tests can still patch it (``mocker.patch("pkg.mod.func")``), and it
+pickles as the function it stands for, so it can be submitted to the plot queue. Annotations that name a lazily
+imported type must not be evaluated at import time (``from __future__ import annotations`` or ``TYPE_CHECKING``).
+
+``HEAVY_MODULES`` lists the top-level packages that must stay out of the light import paths;
+``tests/architecture/test_import_time.py`` enforces this together with an import-time budget.
+"""
+
+import importlib
+from types import ModuleType
+from typing import Any
+
+HEAVY_MODULES = (
+    "cartopy",
+    "folium",
+    "geopandas",
+    "highspy",
+    "matplotlib",
+    "networkx",
+    "pyomo",
+    "rasterio",
+    "reverse_geocoder",
+    "scipy",
+    "shapely",
+    "sklearn",
+    "xarray",
+)
+
+
+def load_attribute(module_name: str, attribute: str) -> Any:
+    """Import ``module_name`` and return its ``attribute``."""
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        if self.__dict__["_module"] is None:
+            self.__dict__["_module"] = importlib.import_module(self.__name__)
+        return self.__dict__["_module"]
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "imported" if self.__dict__["_module"] is not None else "not imported"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+class LazyCallable:
+    """Stand-in for a function that imports its module on the first call.
+
+    Args:
+        module_name: Module defining the function
+        attribute: Name of the function in that module
+    """
+
+    def __init__(self, module_name: str, attribute: str):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target: Any = None
+        self.__name__ = self.__qualname__ = attribute
+        self.__module__ = module_name
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self._target is None:
+            self._target = load_attribute(self._module_name, self._attribute)
+        return self._target(*args, **kwargs)
+
+    def __reduce__(self) -> tuple[Any, tuple[str, str]]:
+        # Unpickles as the real function, e.g. in plot queue worker processes
+        return load_attribute, (self._module_name, self._attribute)
+
+    def __repr__(self) -> str:
+        return f"<lazy callable {self._module_name}.{self._attribute}>"
+
+
+def lazy_module(name: str) -> Any:
+    """Module proxy for ``name`` that imports it on first attribute access."""
+    return LazyModule(name)
+
+
+def lazy_callable(module_name: str, attribute: str) -> Any:
+    """Function proxy for ``module_name.attribute`` that imports the module on first call."""
+    return LazyCallable(module_name, attribute)
@@ -0,0 +1,178 @@
+"""Plot job queue rendering figures in worker processes while the simulation continues.
+
+Plotting code calls ``submit_plot(plot_class, func, *args, **kwargs)`` instead of ``func(*args, **kwargs)``. Without
+an active ``PlotQueue`` the plot is rendered inline, exactly as before. Inside ``with PlotQueue(...)`` (see
+``SimulationRunner.run``) the job is pickled to a pool of spawned worker processes and the caller continues right
+away; leaving the block waits until every queued plot is rendered. A job therefore only carries its arguments, so
+callers should pass the small data a plot needs (e.g. ``snapshot_allocations_for_plots``) rather than domain
+objects that reference the whole simulation state.
+
+Plot classes:
+    - ``trade``: yearly trade maps and trade network visualisations
+    - ``geo``: GEO layer screenshots
+    - ``post_run``: figures rendered from the collected results at the end of a run
+"""
+
+import logging
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+PLOT_CLASSES = ("trade", "geo", "post_run")
+
+_active_queue: Optional["PlotQueue"] = None
+
+
+def _init_plot_worker(log_level: int) -> None:
+    # Spawned workers start without the parent's logging setup; keep warnings from the plotting code visible
+    logging.basicConfig(level=log_level)
+
+
+def _render(func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+    return func(*args, **kwargs)
+
+
+class PlotQueue:
+    """Queue of plot jobs rendered by ``max_workers`` worker processes.
+
+    Args:
+        max_workers: Worker processes rendering plots; 0 renders every plot inline in the calling process
+        disabled_classes: Plot classes (see ``PLOT_CLASSES``) that are skipped entirely
+        max_pending: Jobs that may wait for a worker before ``submit`` blocks (default: 4 per worker). Bounds the
+            memory held by pickled plot inputs when the simulation outpaces the workers.
+
+    Raises:
+        ValueError: If ``max_workers`` is negative or a disabled class is unknown
+    """
+
+    def __init__(self, max_workers: int = 1, disabled_classes: Iterable[str] = (), max_pending: int | None = None):
+        if max_workers < 0:
+            raise ValueError("max_workers must be >= 0")
+        unknown = set(disabled_classes) - set(PLOT_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown plot classes {sorted(unknown)}; expected some of {list(PLOT_CLASSES)}")
+        self.max_workers = max_workers
+        self.disabled_classes = frozenset(disabled_classes)
+        self.max_pending = max_pending if max_pending is not None else 4 * max(max_workers, 1)
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending: dict[Future, str] = {}
+        self.submitted = 0
+        self.skipped = 0
+        self.failed = 0
+        self._previous: Optional["PlotQueue"] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned (not forked) workers: the simulation may already run solver and dask threads, and a worker
+            # only needs the pickled job, not a copy of the simulation state
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_plot_worker,
+                initargs=(logging.getLogger().getEffectiveLevel(),),
+            )
+        return self._executor
+
+    def submit(self, plot_class: str, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> None:
+        """Queue ``func(*args, **kwargs)`` unless ``plot_class`` is disabled.
+
+        Args:
+            plot_class: One of ``PLOT_CLASSES``
+            func: Module-level plotting function (or a method of a picklable object)
+            *args: Positional arguments of ``func``
+            **kwargs: Keyword arguments of ``func``
+        """
+        if plot_class not in PLOT_CLASSES:
+            raise ValueError(f"Unknown plot class {plot_class!r}; expected one of {list(PLOT_CLASSES)}")
+        name = getattr(func, "__qualname__", repr(func))
+        if plot_class in self.disabled_classes:
+            self.skipped += 1
+            logger.debug(f"operation=plot_skipped plot_class={plot_class} plot={name}")
+            return
+        self.submitted += 1
+        if self.max_workers == 0:
+            func(*args, **kwargs)
+            return
+        if len(self._pending) >= self.max_pending:
+            done, _ = wait(list(self._pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                self._collect(future)
+        future = self._get_executor().submit(_render, func, args, kwargs)
+        self._pending[future] = name
+        logger.debug(f"operation=plot_queued plot_class={plot_class} plot={name} pending={len(self._pending)}")
+
+    def _collect(self, future: Future) -> None:
+        name = self._pending.pop(future)
+        error = future.exception()
+        if error is not None:
+            self.failed += 1
+            logger.error(f"[PLOTTING] Plot job {name} failed: {error!r}", exc_info=error)
+
+    def drain(self) -> None:
+        """Wait until every queued plot is rendered; failed jobs are logged, not raised."""
+        if not self._pending:
+            return
+        drain_start = time.time()
+        waiting = len(self._pending)
+        done, _ = wait(list(self._pending))
+        for future in done:
+            self._collect(future)
+        logger.info(
+            f"operation=plot_queue_drained waiting={waiting} submitted={self.submitted} skipped={self.skipped} "
+            f"failed={self.failed} duration_s={time.time() - drain_start:.3f}"
+        )
+
+    def close(self) -> None:
+        """Drain the queue and stop the worker processes."""
+        try:
+            self.drain()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def __enter__(self) -> "PlotQueue":
+        global _active_queue
+        self._previous = _active_queue
+        _active_queue = self
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        global _active_queue
+        _active_queue = self._previous
+        self._previous = None
+        self.close()
+
+
+def submit_plot(plot_class: str, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> None:
+    """Render ``func(*args, **kwargs)`` through the active ``PlotQueue``, or inline if there is none.
+
+    Args:
+        plot_class: One of ``PLOT_CLASSES``
+        func: Plotting function
+        *args: Positional arguments of ``func``
+        **kwargs: Keyword arguments of ``func``
+    """
+    if _active_queue is None:
+        func(*args, **kwargs)
+    else:
+        _active_queue.submit(plot_class, func, *args, **kwargs)
+
+
+def plots_enabled(plot_class: str) -> bool:
+    """Whether plots of ``plot_class`` are rendered; lets callers skip preparing the inputs of disabled plots."""
+    return _active_queue is None or plot_class not in _active_queue.disabled_classes
+
+
+def plots_off_process() -> bool:
+    """Whether submitted plots are pickled to worker processes, i.e. their inputs should be small snapshots."""
+    return _active_queue is not None and _active_queue.max_workers > 0
+
+
+def drain_plots() -> None:
+    """Wait until every plot queued on the active ``PlotQueue`` is rendered (no-op without one)."""
+    if _active_queue is not None:
+        _active_queue.drain()
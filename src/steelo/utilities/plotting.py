@@ -853,6 +853,128 @@ def plot_detailed_trade_map_folium(
     return fol_map
 
 
+# Stand-ins carrying only the attributes the trade map and network plots read. Hashed by identity like the domain
+# objects they replace, so a plant shared by several commodities stays one dictionary key after unpickling.
+@dataclass(eq=False)
+class _PlotLocation:
+    lat: float
+    lon: float
+    iso3: str
+
+
+@dataclass(eq=False)
+class _PlotTechnology:
+    name: str
+
+
+@dataclass(eq=False)
+class _PlotPlant:
+    plant_id: str
+    location: _PlotLocation
+
+
+@dataclass(eq=False)
+class _PlotFurnaceGroup:
+    technology: _PlotTechnology
+    capacity: float
+
+
+@dataclass(eq=False)
+class _PlotSupplier:
+    supplier_id: str
+    commodity: str
+    location: _PlotLocation
+    capacity_by_year: dict
+
+
+@dataclass(eq=False)
+class _PlotDemandCenter:
+    demand_center_id: str
+    center_of_gravity: _PlotLocation
+    demand_by_year: dict
+
+
+@dataclass
+class _PlotCommodityAllocations:
+    allocations: dict
+    allocation_costs: dict
+
+
+def snapshot_allocations_for_plots(allocations_by_commodity: Dict[str, CommodityAllocations]) -> Dict[str, Any]:
+    """
+    Reduce commodity allocations to the data the trade plots need, for rendering in a plot worker process.
+
+    Plants, furnace groups, suppliers and demand centers reference the whole simulation state; the snapshot keeps
+    only ids, coordinates, technology names, capacities and demands, plus the allocated volumes and their costs.
+    ``plot_detailed_trade_map`` and ``plot_trade_allocation_visualization`` accept the snapshot in place of the
+    allocations.
+
+    Args:
+        allocations_by_commodity: Dictionary mapping commodity names to their allocations
+
+    Returns:
+        Dictionary mapping commodity names to picklable stand-ins of their allocations
+    """
+    nodes: dict[int, Any] = {}
+
+    def location(loc) -> _PlotLocation:
+        return _PlotLocation(lat=loc.lat, lon=loc.lon, iso3=loc.iso3)
+
+    def node(obj):
+        key = id(obj)
+        if key in nodes:
+            return nodes[key]
+        if isinstance(obj, tuple):
+            plant, fg = obj
+            plant_key = id(plant)
+            if plant_key not in nodes:
+                nodes[plant_key] = _PlotPlant(plant_id=plant.plant_id, location=location(plant.location))
+            technology = getattr(getattr(fg, "technology", None), "name", None) or "unknown"
+            # Tuples are rebuilt per allocation, so they are memoised by their members
+            key = (plant_key, id(fg))
+            if key not in nodes:
+                nodes[key] = (
+                    nodes[plant_key],
+                    _PlotFurnaceGroup(technology=_PlotTechnology(name=technology), capacity=float(fg.capacity)),
+                )
+            return nodes[key]
+        if hasattr(obj, "center_of_gravity"):
+            nodes[key] = _PlotDemandCenter(
+                demand_center_id=obj.demand_center_id,
+                center_of_gravity=location(obj.center_of_gravity),
+                demand_by_year=dict(obj.demand_by_year),
+            )
+        elif hasattr(obj, "location"):
+            nodes[key] = _PlotSupplier(
+                supplier_id=obj.supplier_id,
+                commodity=str(getattr(obj, "commodity", "")),
+                location=location(obj.location),
+                capacity_by_year=dict(obj.capacity_by_year),
+            )
+        else:
+            return None
+        return nodes[key]
+
+    snapshot: Dict[str, Any] = {}
+    for commodity, ca in allocations_by_commodity.items():
+        allocations: dict = {}
+        allocation_costs: dict = {}
+        for source, destinations in ca.allocations.items():
+            source_node = node(source)
+            if source_node is None:
+                continue
+            costs = ca.allocation_costs.get(source, {})
+            for dest, volume in destinations.items():
+                dest_node = node(dest)
+                if dest_node is None:
+                    continue
+                allocations.setdefault(source_node, {})[dest_node] = float(volume)
+                if dest in costs:
+                    allocation_costs.setdefault(source_node, {})[dest_node] = float(costs[dest])
+        snapshot[commodity] = _PlotCommodityAllocations(allocations=allocations, allocation_costs=allocation_costs)
+    return snapshot
+
+
 def plot_detailed_trade_map(
     allocations_by_commodity, chosen_year, plot_paths: Optional["PlotPaths"] = None, zoom_threshold=5
 ):
@@ -0,0 +1,461 @@
+"""Span tracing for simulation runs: nested phases with wall time, CPU time, RSS delta, peak RSS and custom counters.
+
+``SimulationRunner`` activates a ``SpanTracer`` for the whole run. Code on the simulation path opens spans without
+knowing whether a tracer is active:
+
+    with start_span("year", year=2030):
+        ...
+
+    candidates = start_span("get_candidate_locations_for_opening_new_plants")
+    top_locations = ...
+    candidates.count(candidate_sites=len(top_locations))
+    duration_s = candidates.finish()  # the existing operation=... log lines keep working
+
+    @traced("solve")
+    def solve_lp_model(self): ...
+
+Without an active tracer a span only measures its wall time, so models run in tests or notebooks are unaffected.
+Spans nest per thread (year → model → sub-step). ``current_span().count(...)`` attaches counters such as LP
+variables and constraints to the innermost open span from deep inside a call. While a tracer is active, a sampler
+thread polls the resident set size and raises the peak RSS of every open span, so short allocation spikes inside a
+phase show up even if the memory is released before the phase ends. The RSS covers the simulation process and its
+child processes (plot workers, plant agent workers), i.e. all the memory a run needs.
+
+At the end of a run the tracer writes ``trace.json`` (Chrome trace event format, open it in ``chrome://tracing`` or
+https://ui.perfetto.dev) and ``phase_summary.csv`` (one row per phase path, aggregated over years) to the
+``performance`` directory of the output directory. The web UI reads the summary back with ``read_phase_summary``.
+"""
+
+import csv
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TRACE_FILENAME = "trace.json"
+SUMMARY_FILENAME = "phase_summary.csv"
+PHASE_SEPARATOR = " / "
+
+_MB = 1024 * 1024
+
+_active_tracer: "SpanTracer | None" = None
+
+
+class Span:
+    """One timed phase. Create spans with ``start_span`` (or ``SpanTracer.start_span``), not directly.
+
+    Attributes:
+        name: Phase name, e.g. ``"AllocationModel"`` or ``"solve"``
+        attributes: Descriptive values shown in the trace (e.g. ``year``)
+        counters: Numeric counters added with ``count`` (summed per phase in the summary)
+        path: Names of the enclosing spans and this one, outermost first
+        wall_s: Wall time in seconds (set when finished)
+        cpu_s: Process CPU time in seconds (traced spans only)
+        rss_delta_mb: Change of the resident set size in MB (traced spans only)
+        peak_rss_mb: Highest resident set size in MB seen while the span was open (traced spans only)
+    """
+
+    __slots__ = (
+        "name",
+        "attributes",
+        "counters",
+        "path",
+        "thread_id",
+        "start_s",
+        "wall_s",
+        "cpu_s",
+        "rss_delta_mb",
+        "rss_end_mb",
+        "peak_rss_mb",
+        "_tracer",
+        "_start",
+        "_cpu_start",
+        "_rss_start",
+        "_finished",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        tracer: "SpanTracer | None" = None,
+        parent: "Span | None" = None,
+        attributes: dict[str, Any] | None = None,
+    ):
+        self.name = name
+        self.attributes = attributes or {}
+        self.counters: dict[str, float] = {}
+        self.path: tuple[str, ...] = (*parent.path, name) if parent is not None else (name,)
+        self.thread_id = threading.get_ident()
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.rss_delta_mb = 0.0
+        self.rss_end_mb = 0.0
+        self.peak_rss_mb = 0.0
+        self._tracer = tracer
+        self._finished = False
+        if tracer is not None:
+            self._cpu_start = time.process_time()
+            self._rss_start = self.peak_rss_mb = tracer.rss_mb()
+        self._start = time.perf_counter()
+        self.start_s = self._start - tracer.epoch if tracer is not None else 0.0
+
+    @property
+    def recording(self) -> bool:
+        """Whether the span is recorded by a tracer (use it to skip computing expensive counters)."""
+        return self._tracer is not None
+
+    def count(self, **counters: float) -> None:
+        """Add to the span's counters, e.g. ``span.count(variables=n_cols, constraints=n_rows)``."""
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def finish(self) -> float:
+        """End the span (and any span still open inside it).
+
+        Returns:
+            Wall time of the span in seconds
+        """
+        if not self._finished:
+            end = time.perf_counter()
+            if self._tracer is not None:
+                self._tracer._finish(self, end)
+            else:
+                self.wall_s = end - self._start
+                self._finished = True
+        return self.wall_s
+
+    def _measure(self, end: float, rss_mb: float) -> None:
+        self.wall_s = end - self._start
+        self.cpu_s = time.process_time() - self._cpu_start
+        self.rss_end_mb = rss_mb
+        self.rss_delta_mb = rss_mb - self._rss_start
+        self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+        self._finished = True
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.finish()
+
+    def __repr__(self) -> str:
+        return f"Span({PHASE_SEPARATOR.join(self.path)!r}, wall_s={self.wall_s:.3f})"
+
+
+class SpanTracer:
+    """Collects the spans of one simulation run.
+
+    Spans nest per thread. Finishing a span first finishes any span still open inside it, so a phase that is left
+    through an exception is closed by its parent.
+
+    Args:
+        rss_sample_interval_s: How often the sampler thread polls the RSS for the peak of the open spans while the
+            tracer is active (None: peaks only reflect the RSS at the start and end of each span)
+    """
+
+    def __init__(self, rss_sample_interval_s: float | None = 0.5) -> None:
+        self.epoch = time.perf_counter()
+        self.spans: list[Span] = []
+        self.rss_sample_interval_s = rss_sample_interval_s
+        self._process = psutil.Process()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open: set[Span] = set()
+
+    def rss_mb(self) -> float:
+        """Resident set size in MB of this process and its child processes."""
+        rss = self._process.memory_info().rss
+        for child in self._process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return rss / _MB
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def start_span(self, name: str, **attributes: Any) -> Span:
+        """Open a span inside the innermost open span of the current thread."""
+        stack = self._stack()
+        span = Span(name, tracer=self, parent=stack[-1] if stack else None, attributes=attributes)
+        stack.append(span)
+        with self._lock:
+            self._open.add(span)
+        return span
+
+    def current_span(self) -> Span | None:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def _finish(self, span: Span, end: float) -> None:
+        stack = self._stack()
+        if span in stack:
+            while stack:
+                inner = stack.pop()
+                inner._measure(end, self.rss_mb())
+                with self._lock:
+                    self._open.discard(inner)
+                    self.spans.append(inner)
+                if inner is span:
+                    break
+        else:  # finished from another thread, or its stack was unwound already
+            span._measure(end, self.rss_mb())
+            with self._lock:
+                self._open.discard(span)
+                self.spans.append(span)
+
+    @contextmanager
+    def activate(self) -> Iterator["SpanTracer"]:
+        """Make this the tracer used by ``start_span``/``traced``/``current_span`` while the block runs."""
+        global _active_tracer
+        previous, _active_tracer = _active_tracer, self
+        stop = threading.Event()
+        sampler = None
+        if self.rss_sample_interval_s is not None:
+            sampler = threading.Thread(target=self._sample_rss, args=(stop,), name="rss-sampler", daemon=True)
+            sampler.start()
+        try:
+            yield self
+        finally:
+            _active_tracer = previous
+            stop.set()
+            if sampler is not None:
+                sampler.join()
+
+    def _sample_rss(self, stop: threading.Event) -> None:
+        assert self.rss_sample_interval_s is not None
+        while not stop.wait(self.rss_sample_interval_s):
+            rss_mb = self.rss_mb()
+            with self._lock:
+                for span in self._open:
+                    if rss_mb > span.peak_rss_mb:
+                        span.peak_rss_mb = rss_mb
+
+    def peak_rss_mb(self) -> float:
+        """Highest RSS in MB seen in any finished span (0 if there is none)."""
+        return max((span.peak_rss_mb for span in self.spans), default=0.0)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Finished spans as Chrome trace events (complete events plus an RSS counter track)."""
+        pid = os.getpid()
+        thread_numbers: dict[int, int] = {}
+        events: list[dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "steelo simulation"}}
+        ]
+        for span in sorted(self.spans, key=lambda s: (s.start_s, -s.wall_s)):
+            tid = thread_numbers.setdefault(span.thread_id, len(thread_numbers))
+            args = {
+                **span.attributes,
+                **span.counters,
+                "cpu_s": round(span.cpu_s, 6),
+                "rss_delta_mb": round(span.rss_delta_mb, 1),
+                "peak_rss_mb": round(span.peak_rss_mb, 1),
+            }
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.path[0],
+                    "ph": "X",
+                    "ts": round(span.start_s * 1e6, 1),
+                    "dur": round(span.wall_s * 1e6, 1),
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+            events.append(
+                {
+                    "name": "rss_mb",
+                    "ph": "C",
+                    "ts": round((span.start_s + span.wall_s) * 1e6, 1),
+                    "pid": pid,
+                    "args": {"rss_mb": round(span.rss_end_mb, 1)},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self) -> list[dict[str, Any]]:
+        """One row per phase path, aggregated over all its spans, in tree order.
+
+        Returns:
+            Rows with ``phase`` (path joined by " / "), ``name``, ``depth``, ``calls``, ``wall_s``, ``wall_s_mean``,
+            ``wall_s_max``, ``cpu_s``, ``rss_delta_mb``, ``peak_rss_mb`` (highest over all its spans), ``share_pct``
+            (of the total wall time of the outermost phases) and the summed counters
+        """
+        rows: dict[tuple[str, ...], dict[str, Any]] = {}
+        first_start: dict[tuple[str, ...], float] = {}
+        for span in self.spans:
+            row = rows.get(span.path)
+            if row is None:
+                row = rows[span.path] = {
+                    "phase": PHASE_SEPARATOR.join(span.path),
+                    "name": span.name,
+                    "depth": len(span.path) - 1,
+                    "calls": 0,
+                    "wall_s": 0.0,
+                    "wall_s_max": 0.0,
+                    "cpu_s": 0.0,
+                    "rss_delta_mb": 0.0,
+                    "peak_rss_mb": 0.0,
+                    "counters": {},
+                }
+                first_start[span.path] = span.start_s
+            first_start[span.path] = min(first_start[span.path], span.start_s)
+            row["calls"] += 1
+            row["wall_s"] += span.wall_s
+            row["wall_s_max"] = max(row["wall_s_max"], span.wall_s)
+            row["cpu_s"] += span.cpu_s
+            row["rss_delta_mb"] += span.rss_delta_mb
+            row["peak_rss_mb"] = max(row["peak_rss_mb"], span.peak_rss_mb)
+            for key, value in span.counters.items():
+                row["counters"][key] = row["counters"].get(key, 0) + value
+
+        total_s = sum(row["wall_s"] for row in rows.values() if row["depth"] == 0)
+        # Tree order: a phase follows its parent, siblings in order of their first start
+        ordered = sorted(rows, key=lambda path: tuple(first_start.get(path[: i + 1], 0.0) for i in range(len(path))))
+        summary = []
+        for path in ordered:
+            row = rows[path]
+            counters = row.pop("counters")
+            row["wall_s_mean"] = row["wall_s"] / row["calls"]
+            row["share_pct"] = 100 * row["wall_s"] / total_s if total_s else 0.0
+            summary.append({**row, **counters})
+        return summary
+
+    def write_reports(self, directory: Path) -> tuple[Path, Path]:
+        """Write the Chrome trace and the phase summary table to ``directory``.
+
+        Returns:
+            Paths of the trace JSON and of the summary CSV
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        trace_path = directory / TRACE_FILENAME
+        trace_path.write_text(json.dumps(self.chrome_trace()))
+
+        summary = self.summary()
+        counter_names = sorted({key for row in summary for key in row} - set(_SUMMARY_COLUMNS))
+        summary_path = directory / SUMMARY_FILENAME
+        with open(summary_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=[*_SUMMARY_COLUMNS, *counter_names], restval="")
+            writer.writeheader()
+            for row in summary:
+                writer.writerow({key: _format_cell(value) for key, value in row.items()})
+        return trace_path, summary_path
+
+    def log_summary(self, max_depth: int = 2) -> None:
+        """Log the phases down to ``max_depth`` as ``operation=phase_summary`` lines."""
+        for row in self.summary():
+            if row["depth"] <= max_depth:
+                logger.info(
+                    "operation=phase_summary phase=%s calls=%d duration_s=%.3f cpu_s=%.3f rss_delta_mb=%.1f "
+                    "peak_rss_mb=%.1f share_pct=%.1f",
+                    row["phase"].replace(" ", ""),
+                    row["calls"],
+                    row["wall_s"],
+                    row["cpu_s"],
+                    row["rss_delta_mb"],
+                    row["peak_rss_mb"],
+                    row["share_pct"],
+                )
+
+
+_SUMMARY_COLUMNS = (
+    "phase",
+    "name",
+    "depth",
+    "calls",
+    "wall_s",
+    "wall_s_mean",
+    "wall_s_max",
+    "cpu_s",
+    "rss_delta_mb",
+    "peak_rss_mb",
+    "share_pct",
+)
+
+
+def _format_cell(value: Any) -> Any:
+    return round(value, 4) if isinstance(value, float) else value
+
+
+def start_span(name: str, **attributes: Any) -> Span:
+    """Open a span in the active tracer; without one, a span that only measures its wall time.
+
+    Args:
+        name: Phase name
+        **attributes: Descriptive values shown in the trace (e.g. ``year=2030``)
+
+    Returns:
+        The open span; end it with ``finish()`` or use it as a context manager
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        return Span(name, attributes=attributes)
+    return tracer.start_span(name, **attributes)
+
+
+def current_span() -> Span:
+    """Innermost open span of the active tracer in this thread (a detached span if there is none)."""
+    tracer = _active_tracer
+    span = tracer.current_span() if tracer is not None else None
+    return span if span is not None else Span("detached")
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """Decorator that runs the function inside a span named ``name`` (default: the function name)."""
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with start_span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def read_phase_summary(path: Path, max_depth: int | None = None) -> list[dict[str, Any]]:
+    """Read a ``phase_summary.csv`` written by ``SpanTracer.write_reports``.
+
+    Args:
+        path: Path to the summary CSV
+        max_depth: Only return phases nested at most this deep (0 = outermost phases only)
+
+    Returns:
+        Rows in tree order with numeric columns converted (empty counter cells are dropped)
+    """
+    rows = []
+    with open(path, newline="") as f:
+        for raw in csv.DictReader(f):
+            row: dict[str, Any] = {}
+            for key, value in raw.items():
+                if value == "":
+                    continue
+                if key in ("phase", "name"):
+                    row[key] = value
+                elif key in ("depth", "calls"):
+                    row[key] = int(value)
+                else:
+                    row[key] = float(value)
+            if max_depth is None or row["depth"] <= max_depth:
+                rows.append(row)
+    return rows
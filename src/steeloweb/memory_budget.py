@@ -0,0 +1,97 @@
+"""
+Memory budgets of model runs for worker admission control.
+
+Every finished run records the measured peak RSS of its process and child processes (``ModelRun.peak_memory_mb``,
+from the phase summary of the span tracer) together with the configuration features that drive it
+(``ModelRun.memory_features``). A queued run's need is predicted from the finished runs with the same categorical
+features (clustering, GEO resolution): with enough of them by a linear fit over the simulated years and the size of
+the prepared data, otherwise by their highest peak.
+Without comparable measurements the fixed per-worker default is assumed.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+# Assumed peak of a run without comparable measurements (the former fixed per-worker peak)
+DEFAULT_PEAK_MEMORY_MB = 8 * 1024
+# Headroom on top of the prediction for the spread between runs
+SAFETY_MARGIN = 0.15
+# Comparable runs needed before the peak is extrapolated by a linear fit
+MIN_RUNS_FOR_FIT = 4
+
+CATEGORICAL_FEATURES = ("clustering", "geo_resolution")
+NUMERIC_FEATURES = ("years", "data_size_mb")
+
+
+def directory_size_mb(path: Optional[Path]) -> float:
+    """Total size in MB of the files below ``path`` (0 if it does not exist)."""
+    if path is None or not Path(path).is_dir():
+        return 0.0
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total / 1024**2
+
+
+def run_memory_features(config: dict[str, Any], data_directory: Optional[Path]) -> dict[str, Any]:
+    """
+    Features of a run configuration that its peak memory is predicted from.
+
+    Args:
+        config: ``ModelRun.config``
+        data_directory: Prepared data directory of the run (None if there is none)
+
+    Returns:
+        ``years`` simulated, furnace group ``clustering`` on/off, ``geo_resolution`` of the GEO layers (degrees) and
+        ``data_size_mb`` of the prepared data
+    """
+    from steelo.domain.constants import GEO_RESOLUTION
+
+    start_year = int(config.get("start_year") or 0)
+    end_year = int(config.get("end_year") or start_year)
+    return {
+        "years": max(1, end_year - start_year + 1),
+        "clustering": bool(config.get("enable_furnace_group_clustering", False)),
+        "geo_resolution": float(GEO_RESOLUTION),
+        "data_size_mb": round(directory_size_mb(data_directory), 1),
+    }
+
+
+def predict_peak_memory_mb(features: dict[str, Any], history: list[tuple[dict[str, Any], float]]) -> float:
+    """
+    Predict the peak memory of a run from the measured peaks of earlier runs.
+
+    Args:
+        features: Features of the run (see ``run_memory_features``)
+        history: Features and measured peak (MB) of earlier finished runs
+
+    Returns:
+        Predicted peak in MB, including ``SAFETY_MARGIN``
+    """
+    comparable = [
+        (past, peak)
+        for past, peak in history
+        if all(past.get(name) == features.get(name) for name in CATEGORICAL_FEATURES)
+        and all(past.get(name) is not None for name in NUMERIC_FEATURES)
+    ]
+    if not comparable:
+        return float(DEFAULT_PEAK_MEMORY_MB)
+
+    peaks = np.array([peak for _, peak in comparable], dtype=float)
+    if len(comparable) < MIN_RUNS_FOR_FIT:
+        return float(peaks.max()) * (1 + SAFETY_MARGIN)
+
+    design = np.array([[1.0, *(float(past[name]) for name in NUMERIC_FEATURES)] for past, _ in comparable])
+    coefficients, *_ = np.linalg.lstsq(design, peaks, rcond=None)
+    point = np.array([1.0, *(float(features[name]) for name in NUMERIC_FEATURES)])
+    # The largest underestimate of the fit is added, and a run is never predicted below the smallest comparable peak
+    underestimate = max(0.0, float((peaks - design @ coefficients).max()))
+    estimate = max(float(point @ coefficients) + underestimate, float(peaks.min()))
+    return estimate * (1 + SAFETY_MARGIN)
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("steeloweb", "0032_alter_simulationplot_plot_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="modelrun",
+            name="resume_from_year",
+            field=models.IntegerField(
+                blank=True,
+                help_text="First year to simulate again when the run continues from the snapshot of the year before",
+                null=True,
+            ),
+        ),
+    ]
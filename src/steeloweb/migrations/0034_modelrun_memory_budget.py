@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("steeloweb", "0033_modelrun_resume_from_year"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="modelrun",
+            name="predicted_memory_mb",
+            field=models.FloatField(
+                blank=True,
+                help_text="Peak memory (MB) predicted from earlier runs when queued; used for worker admission",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="modelrun",
+            name="peak_memory_mb",
+            field=models.FloatField(
+                blank=True, help_text="Measured peak resident memory (MB) of the simulation", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="modelrun",
+            name="memory_features",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Configuration features the peak memory is predicted from (recorded with the measured peak)",
+            ),
+        ),
+    ]
@@ -561,6 +561,24 @@ class ModelRun(models.Model):
         blank=True,
         help_text="CSV file containing the simulation results",
     )
+    resume_from_year = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text="First year to simulate again when the run continues from the snapshot of the year before",
+    )
+    predicted_memory_mb = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Peak memory (MB) predicted from earlier runs when queued; used for worker admission",
+    )
+    peak_memory_mb = models.FloatField(
+        null=True, blank=True, help_text="Measured peak resident memory (MB) of the simulation"
+    )
+    memory_features = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Configuration features the peak memory is predicted from (recorded with the measured peak)",
+    )
 
     def __str__(self):
         if self.name:
@@ -578,6 +596,58 @@ class ModelRun(models.Model):
             return Path(self.output_directory)
         return None
 
+    def get_phase_breakdown(self, max_depth: Optional[int] = 3) -> list[dict]:
+        """
+        Get the per-phase performance summary the simulation wrote to ``performance/phase_summary.csv``.
+
+        Returns a list of phases in tree order (see ``steelo.utilities.tracing.read_phase_summary``), or an empty list
+        if the run has not written a report (yet).
+        """
+        from steelo.utilities.tracing import SUMMARY_FILENAME, read_phase_summary
+
+        output_path = self.get_output_path()
+        if output_path is None:
+            return []
+        summary_path = output_path / "performance" / SUMMARY_FILENAME
+        if not summary_path.exists():
+            return []
+        try:
+            return read_phase_summary(summary_path, max_depth=max_depth)
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def collect_memory_features(self) -> dict:
+        """Features of this run's configuration that its peak memory is predicted from (see ``memory_budget``)."""
+        from steeloweb.memory_budget import run_memory_features
+
+        data_path = self.data_preparation.get_data_path() if self.data_preparation else None
+        return run_memory_features(self.config or {}, data_path)
+
+    def predict_memory_need(self) -> float:
+        """
+        Predict the peak memory (MB) of this run from the measured peaks of earlier finished runs.
+
+        Used for worker admission control; store the result in ``predicted_memory_mb`` when the run is queued.
+        """
+        from steeloweb.memory_budget import predict_peak_memory_mb
+
+        finished = ModelRun.objects.filter(state=ModelRun.RunState.FINISHED, peak_memory_mb__isnull=False)
+        history = list(finished.exclude(pk=self.pk).values_list("memory_features", "peak_memory_mb"))
+        return predict_peak_memory_mb(self.collect_memory_features(), history)
+
+    def record_memory_usage(self) -> bool:
+        """
+        Set ``peak_memory_mb`` and ``memory_features`` from the peak RSS per phase in the run's phase summary.
+
+        Does not save the model run. Returns False if the run has not written a phase summary with peaks.
+        """
+        peaks = [phase["peak_rss_mb"] for phase in self.get_phase_breakdown(max_depth=None) if "peak_rss_mb" in phase]
+        if not peaks:
+            return False
+        self.peak_memory_mb = max(peaks)
+        self.memory_features = self.collect_memory_features()
+        return True
+
     def ensure_output_directories(self):
         """Create output directory structure for this model run"""
         if not self.output_directory:
@@ -1079,6 +1149,8 @@ class ModelRun(models.Model):
         runner.progress_callback = progress_callback
         runner.modelrun_id = self.id
 
+        if self.resume_from_year is not None:
+            return runner.run(resume_from_year=self.resume_from_year)
         results = runner.run()
         return results
 
@@ -1151,9 +1223,37 @@ class ModelRun(models.Model):
             return True
         return self.failed_with_exception
 
+    @property
+    def latest_snapshot_year(self) -> int | None:
+        """Last simulated year with a run snapshot in the output directory, if any."""
+        from steelo.service_layer.checkpoint import RunSnapshots
+
+        output_path = self.get_output_path()
+        if output_path is None:
+            return None
+        years = RunSnapshots(output_path / "snapshots").years()
+        return years[-1] if years else None
+
+    @property
+    def can_resume(self) -> bool:
+        """Allow failed or cancelled runs to continue from their latest snapshot."""
+        if self.state not in [self.RunState.FAILED, self.RunState.CANCELLED]:
+            return False
+        return self.latest_snapshot_year is not None
+
+    def reset_for_resume(self) -> None:
+        """Queue the run again so that it continues after its latest snapshot instead of starting over."""
+        resume_from_year = self.latest_snapshot_year
+        if resume_from_year is None:
+            raise ValueError(f"ModelRun {self.pk} has no snapshot to resume from")
+        self.reset_for_rerun()
+        self.resume_from_year = resume_from_year + 1
+        self.save(update_fields=["resume_from_year", "updated_at"])
+
     def reset_for_rerun(self) -> None:
         """Restore the run to a pristine CREATED state so it can be queued again."""
         self.state = self.RunState.CREATED
+        self.resume_from_year = None
         self.error_message = ""
         self.results = {}
         self.progress = {}
@@ -1169,6 +1269,7 @@ class ModelRun(models.Model):
                 "run_started_at",
                 "finished_at",
                 "task_id",
+                "resume_from_year",
                 "updated_at",
             ]
         )
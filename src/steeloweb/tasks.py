@@ -4,6 +4,8 @@ from contextlib import contextmanager
 
 from django_tasks import task
 
+from steelo.logging_config import LoggingConfig
+
 from .models import ModelRun, ResultImages, DataPreparation, SimulationPlot
 from .services import DataPreparationService
 
@@ -97,6 +99,7 @@ def run_simulation_task(modelrun_id: int) -> None:
             steeloweb_logger.addHandler(file_handler)
             steelo_logger = logging.getLogger("steelo")
             steelo_logger.addHandler(file_handler)
+            LoggingConfig.reset_log_gates()
 
             logger.info(f"Performance logging enabled for ModelRun {modelrun_id} at {log_file_path}")
         except Exception as e:
@@ -145,6 +148,12 @@ def run_simulation_task(modelrun_id: int) -> None:
                 if modelrun.results is None:
                     modelrun.results = {}
 
+            # Measured peak memory feeds the memory predictions of later runs (worker admission control)
+            try:
+                modelrun.record_memory_usage()
+            except Exception as e:
+                logger.warning(f"Failed to record memory usage for ModelRun {modelrun_id}: {e}")
+
             modelrun.finished_at = timezone.now()
             modelrun.save()
     finally:
@@ -156,6 +165,7 @@ def run_simulation_task(modelrun_id: int) -> None:
                 steeloweb_logger.removeHandler(file_handler)
                 steelo_logger = logging.getLogger("steelo")
                 steelo_logger.removeHandler(file_handler)
+                LoggingConfig.reset_log_gates()
                 file_handler.close()
                 logger.info(f"Closed log file handler for ModelRun {modelrun_id}")
             except Exception as e:
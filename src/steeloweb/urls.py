@@ -29,6 +29,7 @@ urlpatterns = [
     path("modelrun/<int:pk>/", views.ModelRunDetailView.as_view(), name="modelrun-detail"),
     path("modelrun/<int:pk>/run/", views.run_simulation, name="run-simulation"),
     path("modelrun/<int:pk>/rerun/", views.rerun_modelrun, name="rerun-modelrun"),
+    path("modelrun/<int:pk>/resume/", views.resume_modelrun, name="resume-modelrun"),
     path("modelrun/<int:pk>/dismiss-warning/", views.dismiss_simulation_warning, name="dismiss-simulation-warning"),
     path("modelrun/<int:pk>/cancel/", views.cancel_modelrun, name="cancel-modelrun"),
     path("modelrun/<int:pk>/force-stop/", views.force_stop_modelrun, name="force-stop-modelrun"),
@@ -104,6 +104,9 @@ class ModelRunDetailView(DetailView):
         # Get log file path if available
         context["log_file_path"] = get_log_file_path(self.object.id)
 
+        # Per-phase timings written by the simulation's span tracer (empty until the run finishes or fails)
+        context["phase_breakdown"] = self.object.get_phase_breakdown()
+
         # Split simulation plots: cost curves, emissions, and the production/capacity
         # group each go into their own collapsible accordions; anything else falls
         # through to the flat grid.
@@ -198,6 +201,8 @@ def run_simulation(request, pk):
 
     modelrun.state = ModelRun.RunState.RUNNING
     modelrun.run_started_at = timezone.now()
+    # Memory need of the run, from the peaks measured in earlier runs (used for worker admission control)
+    modelrun.predicted_memory_mb = modelrun.predict_memory_need()
 
     # Start the task and store its ID for tracking
     task_result = run_simulation_task.enqueue(modelrun.pk)
@@ -223,6 +228,19 @@ def rerun_modelrun(request, pk):
     return run_simulation(request, pk)
 
 
+@require_POST
+def resume_modelrun(request, pk):
+    """Queue a failed or cancelled run again, continuing after its latest snapshot."""
+    modelrun = get_object_or_404(ModelRun, pk=pk)
+
+    if not modelrun.can_resume:
+        messages.error(request, "Only failed or cancelled runs with a saved snapshot can be resumed.")
+        return redirect("modelrun-detail", pk=pk)
+
+    modelrun.reset_for_resume()
+    return run_simulation(request, pk)
+
+
 @require_POST
 def dismiss_simulation_warning(request, pk):
     """Dismiss the simulation warning without starting the simulation"""
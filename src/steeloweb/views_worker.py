@@ -111,6 +111,7 @@ def _get_worker_status_data():
             "admissible": admissible,
             "active": active_count,
             "peak_per_worker": supervisor.peak_memory,
+            "predicted_needs": supervisor.predicted_memory_needs(),
             "can_add": active_count < admissible,  # Handles zero capacity correctly
             "no_capacity": admissible == 0,  # Explicit flag for UI
         },
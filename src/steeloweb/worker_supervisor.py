@@ -12,11 +12,14 @@ import psutil
 
 logger = logging.getLogger(__name__)
 
+MB = 1024**2
+
 
 class WorkerSupervisor:
     """Manages worker processes with production-grade resource management"""
 
     def __init__(self):
+        # Assumed peak per worker for runs that are not queued yet; queued runs use their predicted need
         self.peak_memory = 8 * 1024**3  # 8GB peak per worker
         self.is_windows = platform.system() == "Windows"
 
@@ -61,10 +64,68 @@ class WorkerSupervisor:
             logger.warning(f"Failed to get memory pressure: {e}")
             return "normal"  # Default to normal on error
 
+    def predicted_memory_needs(self):
+        """
+        Predicted peak memory (bytes) of the model runs that are running or waiting for a worker, in queue order.
+
+        Runs queued before predictions were stored are predicted on the fly.
+        """
+        from django.db import DatabaseError
+        from steeloweb.models import ModelRun
+
+        try:
+            runs = list(ModelRun.objects.filter(state=ModelRun.RunState.RUNNING).order_by("run_started_at", "pk"))
+            return [
+                int((run.predict_memory_need() if run.predicted_memory_mb is None else run.predicted_memory_mb) * MB)
+                for run in runs
+            ]
+        except DatabaseError as e:
+            logger.warning(f"Failed to read predicted memory needs, assuming the default peak per worker: {e}")
+            return []
+
+    def active_worker_memory(self):
+        """Resident memory (bytes) currently held by the live worker processes, including their children."""
+        from django.db import DatabaseError
+        from steeloweb.models import Worker
+
+        try:
+            workers = list(Worker.objects.filter(state__in=["STARTING", "RUNNING", "DRAINING"]))
+        except DatabaseError:
+            return 0
+        total = 0
+        for worker in workers:
+            if not worker.is_same_process():
+                continue
+            try:
+                process = psutil.Process(worker.pid)
+                total += process.memory_info().rss
+                total += sum(child.memory_info().rss for child in process.children(recursive=True))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total
+
+    def memory_based_limit(self, budget, needs):
+        """
+        Number of workers whose memory needs fit into ``budget`` bytes.
+
+        The predicted needs of running and queued runs are admitted in queue order. Once all of them fit, the rest
+        of the budget is divided by the default peak for runs that are not queued yet.
+        """
+        admitted = 0
+        for need in needs:
+            if need > budget:
+                return admitted
+            budget -= need
+            admitted += 1
+        return admitted + max(0, budget // self.peak_memory)
+
     def admissible_workers(self, guard=None, hard_cap=None):
         """
         Calculate maximum safe worker count based on system resources.
         NOW RETURNS ZERO when there's no capacity!
+
+        Memory admission sums the predicted peak memory of the running and queued model runs (see
+        ``predicted_memory_needs``) instead of assuming a fixed peak per worker.
         """
         # Get hard cap from environment if not provided
         if hard_cap is None:
@@ -78,8 +139,9 @@ class WorkerSupervisor:
         if guard is None:
             guard = max(2 * 1024**3, int(0.10 * vm.total))
 
-        # Platform-specific memory adjustments (use vm.available directly)
-        available = max(0, vm.available - guard - self.memory_guard_extra)
+        # Platform-specific memory adjustments. The live workers' memory counts towards the budget: the needs of
+        # the runs they are executing are counted in full below.
+        available = max(0, vm.available + self.active_worker_memory() - guard - self.memory_guard_extra)
 
         # macOS memory pressure handling
         if platform.system() == "Darwin":
@@ -89,7 +151,7 @@ class WorkerSupervisor:
                 logger.info(f"macOS memory pressure: {pressure}, reducing available memory")
 
         # Calculate limits
-        memory_based_limit = max(0, available // self.peak_memory)
+        memory_based_limit = self.memory_based_limit(available, self.predicted_memory_needs())
         cpu_based_limit = cpu_count  # Physical cores
 
         # Apply hard cap
@@ -262,6 +324,7 @@ class WorkerSupervisor:
             "limits": {
                 "admissible_workers": self.admissible_workers(),
                 "peak_memory_per_worker": self.peak_memory,
+                "predicted_memory_needs": self.predicted_memory_needs(),
                 "memory_pressure": self.get_macos_memory_pressure() if platform.system() == "Darwin" else "n/a",
             },
         }
@@ -0,0 +1,92 @@
+"""Static check that functions marked ``@hot_path`` never build log messages eagerly.
+
+Inside a hot simulation loop a ``logger.debug(f"...")`` call formats its message (and evaluates every property in
+it) even when DEBUG output is disabled. Marked functions must log through ``steelo.logging_config.get_logger`` and
+pass ``%``-style arguments or a callable message, so the gate decision is made before anything is built.
+"""
+
+import ast
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+LOG_METHODS = {"debug", "info", "warning", "error", "exception", "critical", "log"}
+
+
+def _is_hot_path(node: ast.AST) -> bool:
+    if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return False
+    names = {d.id if isinstance(d, ast.Name) else getattr(d, "attr", None) for d in node.decorator_list}
+    return "hot_path" in names
+
+
+def _eager_message(message: ast.expr) -> str | None:
+    if isinstance(message, ast.JoinedStr):
+        return "f-string message"
+    if isinstance(message, ast.Call) and isinstance(message.func, ast.Attribute) and message.func.attr == "format":
+        return "str.format() message"
+    if isinstance(message, ast.BinOp) and isinstance(message.op, (ast.Mod, ast.Add)):
+        return "message built with % or +"
+    return None
+
+
+def hot_path_violations(source: str, filename: str = "<string>") -> list[str]:
+    """Return ``file:line function: problem`` for every eager log message in ``@hot_path`` functions."""
+    violations = []
+    for function in ast.walk(ast.parse(source, filename)):
+        if not _is_hot_path(function):
+            continue
+        for node in ast.walk(function):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+                continue
+            receiver = node.func.value
+            problem = None
+            if isinstance(receiver, ast.Name) and receiver.id == "logging":
+                if node.func.attr == "getLogger":
+                    problem = "logging.getLogger() instead of get_logger()"
+                elif node.func.attr in LOG_METHODS:
+                    problem = "logs through the root logger instead of get_logger()"
+            elif node.func.attr in LOG_METHODS:
+                message_index = 1 if node.func.attr == "log" else 0
+                if len(node.args) > message_index:
+                    problem = _eager_message(node.args[message_index])
+            if problem:
+                violations.append(f"{filename}:{node.lineno} {function.name}: {problem}")
+    return violations
+
+
+def test_checker_flags_eager_messages():
+    source = """
+@hot_path
+def loop(items):
+    logger = logging.getLogger(__name__)
+    for item in items:
+        logger.debug(f"item {item}")
+        logger.info("item {}".format(item))
+        logger.log(10, "item %s" % item)
+        logger.debug("item %s", item)
+        logger.debug(lambda: f"item {item}")
+
+def cold(item):
+    logger.debug(f"item {item}")
+"""
+
+    violations = hot_path_violations(source)
+
+    assert [v.split(" ", 1)[0] for v in violations] == ["<string>:4", "<string>:6", "<string>:7", "<string>:8"]
+
+
+def test_hot_paths_defer_log_messages():
+    sources = sorted((PROJECT_ROOT / "src" / "steelo").rglob("*.py"))
+    marked = 0
+    violations = []
+    for path in sources:
+        source = path.read_text()
+        if "@hot_path" not in source:
+            continue
+        tree = ast.parse(source)
+        marked += sum(_is_hot_path(node) for node in ast.walk(tree))
+        violations += hot_path_violations(source, str(path.relative_to(PROJECT_ROOT)))
+
+    assert marked > 0, "No @hot_path functions found"
+    assert not violations, "Eager log messages in hot paths:\n" + "\n".join(violations)
@@ -0,0 +1,97 @@
+"""Import-time budgets for the CLI entry points and the steeloweb task worker.
+
+The heavy scientific and plotting stacks (geopandas, cartopy, matplotlib, xarray, pyomo, networkx, ...) must only be
+imported by the code paths that use them (see ``steelo.utilities.lazy_imports``). Each check imports the entry point
+in a fresh interpreter with ``python -X importtime`` and asserts that no heavy package was imported and that the
+import stays within a budget.
+
+The budget is expressed in units of the pandas import time, measured in the same interpreter right before the entry
+point is imported (every entry point needs pandas anyway). This keeps the check meaningful on slow or busy machines,
+where absolute import times vary several-fold. Importing ``steelo.entrypoints.cli`` used to cost about nine pandas
+imports; it now costs under two.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from steelo.utilities.lazy_imports import HEAVY_MODULES
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+BUDGET_IN_PANDAS_IMPORTS = 3.0
+
+
+def _import_times(
+    code: str, cwd: Path = PROJECT_ROOT, env: dict[str, str] | None = None
+) -> tuple[dict[str, float], float]:
+    """Run ``code`` after ``import pandas`` in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        Seconds per top-level package imported by ``code``, and the seconds it took to import pandas
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import pandas; {code}"],
+        cwd=cwd,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    times: dict[str, float] = {}
+    pandas_seconds = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        package = name.strip().split(".")[0]
+        if pandas_seconds is None:  # interpreter startup and pandas itself
+            if name.strip() == "pandas":
+                pandas_seconds = int(cumulative) / 1e6
+            continue
+        times.setdefault(package, 0.0)
+        if not name.startswith("  "):  # imported by ``code`` itself, its cumulative time covers its dependencies
+            times[package] += int(cumulative) / 1e6
+    assert pandas_seconds is not None
+    return times, pandas_seconds
+
+
+def _assert_light(times: dict[str, float], pandas_seconds: float) -> None:
+    heavy = sorted(set(HEAVY_MODULES) & set(times))
+    assert not heavy, f"Heavy packages imported at startup: {heavy}"
+    total = sum(times.values())
+    budget = BUDGET_IN_PANDAS_IMPORTS * pandas_seconds
+    slowest = sorted(times.items(), key=lambda item: -item[1])[:5]
+    assert total < budget, f"Import took {total:.2f}s (budget {budget:.2f}s): " + ", ".join(
+        f"{package}={seconds:.2f}s" for package, seconds in slowest
+    )
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "steelo.entrypoints.cli",
+        "steelo.entrypoints.cache_cli",
+        "steelo.entrypoints.data_cli",
+        "steelo.entrypoints.validate_master_input",
+    ],
+)
+def test_cli_entry_point_import_budget(module):
+    _assert_light(*_import_times(f"import {module}"))
+
+
+def test_steeloweb_worker_import_budget():
+    code = (
+        "import django; django.setup(); "
+        "import steeloweb.management.commands.steelo_worker, steeloweb.tasks, steeloweb.worker_supervisor"
+    )
+
+    times, pandas_seconds = _import_times(
+        code, cwd=PROJECT_ROOT / "src" / "django", env={"DJANGO_SETTINGS_MODULE": "config.settings.test"}
+    )
+
+    _assert_light(times, pandas_seconds)
@@ -3,6 +3,8 @@ import pytest
 from unittest.mock import patch
 
 from baseload_optimisation_atlas.boa_logic import (
+    calculate_costs_of_accepted_designs,
+    capacity_sampling,
     estimate_battery_capacity,
     calculate_installation_cost,
     calculate_net_energy_production,
@@ -10,6 +12,7 @@ from baseload_optimisation_atlas.boa_logic import (
     calculate_coverage,
     filter_designs_according_to_coverage_and_calculate_costs,
     show_optimal_design,
+    sample_design_space,
 )
 
 
@@ -206,3 +209,71 @@ def test_show_optimal_design_logs_correct_output(mock_plot, sample_data):
     assert opt_design == designs[0]
     assert opt_cost["installation cost"] == installation_costs[0]
     assert opt_cost["LCOE"] == lcoes[0]
+
+
+# ---------------------------------------------- Test sample_design_space ------------------------------------------
+@pytest.fixture
+def hourly_profile():
+    rng = np.random.default_rng(7)
+    hours = np.arange(8760)
+    solar = np.clip(np.sin((hours % 24 - 6) / 12 * np.pi), 0, None) * rng.uniform(0.5, 1.0, 8760)
+    wind = np.clip(0.35 + 0.25 * np.sin(hours / 500) + rng.normal(0, 0.15, 8760), 0, 1)
+    return {"solar": solar.astype(np.float32), "wind": wind.astype(np.float32)}
+
+
+def _legacy_designs(profile, p, n_samples, limit, seed):
+    """Per-design sizing and simulation, as before the batched kernel."""
+    np.random.seed(seed)
+    C_w = np.random.uniform(size=n_samples, low=0, high=limit["wind"])
+    C_s = np.clip(np.random.exponential(scale=5, size=n_samples), 0, limit["solar"])
+    designs = []
+    for i in range(n_samples):
+        net_nrg = calculate_net_energy_production(C_s[i], profile["solar"], C_w[i], profile["wind"])
+        battery = estimate_battery_capacity(net_nrg, q_deficit=p, q_duration=100 - p)
+        coverage = calculate_coverage(state_of_charge(net_nrg, battery), net_nrg)
+        designs.append({"wind": C_w[i], "solar": C_s[i], "battery": battery, "coverage": coverage})
+    return designs
+
+
+@pytest.mark.parametrize("p", [5, 15])
+def test_sample_design_space_matches_per_design_sizing(hourly_profile, p):
+    limit = {"wind": 12.0, "solar": 8.0}
+    expected = _legacy_designs(hourly_profile, p, 200, limit, seed=12)
+
+    designs = sample_design_space(hourly_profile, p, n_samples=200, limit=limit, seed=12)
+
+    for tech in ["wind", "solar", "battery", "coverage"]:
+        np.testing.assert_array_equal(designs[tech], [design[tech] for design in expected])
+    assert np.count_nonzero(designs["battery"]) > 0
+    assert capacity_sampling(hourly_profile, p, n_samples=200, limit=limit, seed=12) == [
+        {tech: design[tech] for tech in ["wind", "solar", "battery"]} for design in expected
+    ]
+
+
+def test_costs_of_accepted_designs_match_filter(hourly_profile):
+    p = 15
+    designs = sample_design_space(hourly_profile, p, n_samples=100, limit={"wind": 4.0, "solar": 8.0}, seed=3)
+    storage_costs = {"battery_cost_per_installed_unit": np.full(21, 300.0), "average_implied_storage": np.full(21, 2.0)}
+    cost_inputs = dict(
+        baseload_demand=500.0,
+        storage_costs=storage_costs,
+        opex_pct={"solar": 0.02, "wind": 0.03, "battery": 0.01},
+        profile=hourly_profile,
+        cost_of_capital=0.07,
+        investment_horizon=20,
+        p=p,
+    )
+
+    expected_designs, expected_costs, expected_lcoes = filter_designs_according_to_coverage_and_calculate_costs(
+        [{tech: designs[tech][i] for tech in ["wind", "solar", "battery"]} for i in range(100)],
+        capex={"solar": np.full(21, 700.0), "wind": np.full(21, 1200.0)},
+        **cost_inputs,
+    )
+    accepted, installation_costs, lcoes = calculate_costs_of_accepted_designs(
+        designs, capex={"solar": np.full(21, 700.0), "wind": np.full(21, 1200.0)}, **cost_inputs
+    )
+
+    assert len(accepted) == len(expected_designs) > 0
+    assert [designs["solar"][i] for i in accepted] == [design["solar"] for design in expected_designs]
+    np.testing.assert_array_equal(installation_costs, expected_costs)
+    np.testing.assert_array_equal(lcoes, expected_lcoes)
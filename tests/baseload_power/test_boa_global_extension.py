@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+import xarray as xr
+
+from baseload_optimisation_atlas.boa_global_extension import assemble_optimal_solution, extract_point_inputs
+
+
+def _grid(n_lat, n_lon):
+    return np.linspace(60, -60, n_lat), np.linspace(-180, 179.75, n_lon)
+
+
+def _results(n_points, seed=0):
+    rng = np.random.default_rng(seed)
+    results = []
+    for i in range(n_points):
+        design = {"wind": rng.uniform(0, 5), "solar": rng.uniform(0, 5), "battery": rng.uniform(0, 10)}
+        results.append((design, np.nan if i % 7 == 0 else rng.uniform(20, 200), rng.uniform(1e6, 1e9)))
+    return results
+
+
+def test_assemble_optimal_solution_places_results_on_grid():
+    all_lats, all_lons = _grid(6, 8)
+    land_points = np.array([[all_lats[i], all_lons[j]] for i, j in [(0, 0), (1, 3), (5, 7), (2, 2), (4, 6)]])
+    results = _results(len(land_points))
+
+    optimal_sol = assemble_optimal_solution(land_points, all_lats, all_lons, results)
+
+    assert optimal_sol["lcoe"].shape == (6, 8)
+    for (lat, lon), (design, lcoe, cost) in zip(land_points, results):
+        point = optimal_sol.sel(lat=lat, lon=lon)
+        if np.isnan(lcoe):
+            assert float(point["lcoe"]) == 0
+            continue
+        assert float(point["lcoe"]) == lcoe
+        assert float(point["installation_cost"]) == cost
+        for tech in ["solar", "wind", "battery"]:
+            assert float(point[f"{tech}_factor"]) == design[tech]
+    # Sea points stay zero
+    assert np.count_nonzero(optimal_sol["lcoe"].values) == 4
+
+
+def test_assemble_optimal_solution_scales_to_large_regions():
+    all_lats, all_lons = _grid(200, 300)
+    rng = np.random.default_rng(1)
+    flat = rng.choice(len(all_lats) * len(all_lons), size=10_000, replace=False)
+    land_points = np.column_stack([all_lats[flat // len(all_lons)], all_lons[flat % len(all_lons)]])
+    results = _results(len(land_points))
+
+    start = time.perf_counter()
+    optimal_sol = assemble_optimal_solution(land_points, all_lats, all_lons, results)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 5
+    valid = ~np.isnan([lcoe for _, lcoe, _ in results])
+    np.testing.assert_array_equal(
+        optimal_sol["lcoe"].values.reshape(-1)[flat[valid]], np.array([lcoe for _, lcoe, _ in results])[valid]
+    )
+
+
+def test_extract_point_inputs_matches_point_selection():
+    rng = np.random.default_rng(2)
+    y, x = np.linspace(50, 40, 5), np.linspace(0, 8, 9)
+    profile = xr.Dataset(
+        {
+            "solar": (("time", "y", "x"), rng.random((24, 5, 9)).astype(np.float32)),
+            "wind": (("time", "y", "x"), rng.random((24, 5, 9)).astype(np.float32)),
+        },
+        coords={"time": np.arange(24), "y": y, "x": x},
+    )
+    max_cap = xr.Dataset(
+        {"pv": (("y", "x"), rng.uniform(0, 5000, (5, 9))), "wind": (("y", "x"), rng.uniform(0, 5000, (5, 9)))},
+        coords={"y": y, "x": x},
+    )
+    points = np.array([[50.0, 0.0], [47.4, 3.1], [40.0, 8.0]])
+
+    solar, wind, limits = extract_point_inputs(profile, max_cap, points, baseload_demand=500.0)
+
+    for i, (lat, lon) in enumerate(points):
+        point = profile.sel(x=lon, y=lat, method="nearest")
+        np.testing.assert_array_equal(solar[i], point["solar"].values.flatten())
+        np.testing.assert_array_equal(wind[i], point["wind"].values.flatten())
+        cap = max_cap.sel(x=lon, y=lat, method="nearest")
+        assert limits[i] == {"solar": float(cap["pv"].values) / 500.0, "wind": float(cap["wind"].values) / 500.0}
@@ -0,0 +1,178 @@
+"""Fixtures and the JSON report of the simulation benchmarks.
+
+The benchmarks marked ``benchmark`` only run with ``--run-benchmarks``; run them without ``-n``:
+
+    pytest tests/benchmarks --run-benchmarks --bench-scale medium --bench-json bench.json -s
+    pytest tests/benchmarks --run-benchmarks --bench-scale medium --bench-compare bench.json
+
+``--bench-json`` stores the timings of every benchmark (with the commit and scale they were measured on) so runs can be
+compared across commits. ``--bench-compare`` compares the median times with an earlier file and fails the session if a
+benchmark got slower by more than ``--bench-threshold`` (default 20%).
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+from synthetic_world import SCALES, SyntheticScale, build_synthetic_world
+
+from steelo.simulation import SimulationRunner
+from steelo.utilities.plot_queue import PLOT_CLASSES, PlotQueue
+
+_results_key = pytest.StashKey[dict[str, dict[str, Any]]]()
+_report_key = pytest.StashKey[list[str]]()
+
+
+def pytest_configure(config):
+    config.stash[_results_key] = {}
+    config.stash[_report_key] = []
+
+
+@pytest.fixture
+def bench_scale(request) -> SyntheticScale:
+    return SCALES[request.config.getoption("--bench-scale")]
+
+
+@pytest.fixture
+def synthetic_world(bench_scale, tmp_path, monkeypatch) -> Callable[..., SimulationRunner]:
+    """
+    Factory of fresh synthetic worlds at the selected scale.
+
+    Plots are disabled and the working directory is the test's temporary directory (the trade LP writes its variables
+    to the working directory). Keyword arguments override ``SimulationConfig`` fields.
+    """
+    monkeypatch.chdir(tmp_path)
+    worlds = 0
+
+    def build(**config_overrides) -> SimulationRunner:
+        nonlocal worlds
+        worlds += 1
+        return build_synthetic_world(bench_scale, tmp_path / f"world_{worlds}", **config_overrides)
+
+    with PlotQueue(max_workers=0, disabled_classes=PLOT_CLASSES):
+        yield build
+
+
+@pytest.fixture
+def bench(request) -> Callable[..., Any]:
+    """
+    Time a function over ``--bench-rounds`` rounds and record the result under the test's name.
+
+    ``bench(func, setup=None, **workload)`` calls ``setup()`` untimed before every round and passes its result to
+    ``func`` (functions that mutate their inputs get fresh ones each round). ``workload`` (e.g. the number of furnace
+    groups) is stored with the timings. Returns the result of the last round.
+    """
+    rounds = request.config.getoption("--bench-rounds")
+    results = request.config.stash[_results_key]
+
+    def run(func: Callable[..., Any], setup: Callable[[], Any] | None = None, **workload) -> Any:
+        timings = []
+        result = None
+        for _ in range(rounds):
+            args = () if setup is None else (setup(),)
+            start = time.perf_counter()
+            result = func(*args)
+            timings.append(time.perf_counter() - start)
+        results[request.node.name] = {
+            "rounds": rounds,
+            "min_s": min(timings),
+            "median_s": statistics.median(timings),
+            "mean_s": statistics.fmean(timings),
+            "max_s": max(timings),
+            **workload,
+        }
+        print(f"\n{request.node.name}: median {statistics.median(timings):.3f} s over {rounds} rounds {workload}")
+        return result
+
+    return run
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def compare_benchmarks(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> tuple[list[str], int]:
+    """
+    Compare the median times of two benchmark runs.
+
+    Args:
+        baseline: Earlier run as written by ``--bench-json``
+        current: Current run in the same format
+        threshold: Relative slowdown of the median above which a benchmark counts as a regression
+
+    Returns:
+        Report lines and the number of regressions
+    """
+    lines = [f"{'benchmark':<60} {'baseline':>10} {'current':>10} {'change':>8}"]
+    if baseline.get("scale") != current["scale"]:
+        lines.append(f"Scales differ (baseline {baseline.get('scale')}, current {current['scale']}); not compared")
+        return lines, 0
+    regressions = 0
+    for name, result in current["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            lines.append(f"{name:<60} {'-':>10} {result['median_s']:>9.3f}s {'new':>8}")
+            continue
+        change = result["median_s"] / previous["median_s"] - 1 if previous["median_s"] > 0 else 0.0
+        status = ""
+        if change > threshold:
+            status = "  REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            status = "  improved"
+        lines.append(f"{name:<60} {previous['median_s']:>9.3f}s {result['median_s']:>9.3f}s {change:>+8.0%}{status}")
+    return lines, regressions
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = config.stash.get(_results_key, {})
+    if not results:
+        return
+    current = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "scale": config.getoption("--bench-scale"),
+        "rounds": config.getoption("--bench-rounds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+    json_path = config.getoption("--bench-json")
+    if json_path:
+        Path(json_path).write_text(json.dumps(current, indent=2))
+    compare_path = config.getoption("--bench-compare")
+    if compare_path:
+        baseline = json.loads(Path(compare_path).read_text())
+        threshold = config.getoption("--bench-threshold")
+        lines, regressions = compare_benchmarks(baseline, current, threshold)
+        lines.insert(0, f"Compared with {compare_path} (commit {baseline.get('commit')}, threshold {threshold:.0%})")
+        config.stash[_report_key] = lines
+        if regressions and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    results = config.stash.get(_results_key, {})
+    if not results:
+        return
+    terminalreporter.section("benchmarks")
+    for name, result in results.items():
+        terminalreporter.write_line(
+            f"{name:<60} median {result['median_s']:.3f}s  min {result['min_s']:.3f}s  max {result['max_s']:.3f}s"
+        )
+    report = config.stash.get(_report_key, [])
+    if report:
+        terminalreporter.section("benchmark comparison")
+        for line in report:
+            terminalreporter.write_line(line)
@@ -0,0 +1,443 @@
+"""Synthetic, internally consistent simulation worlds for the benchmark suite.
+
+A world is a bootstrapped ``SimulationRunner`` whose repository and environment are filled with generated but
+mutually consistent data: every plant sits in a mapped country with costs, capital costs and carbon prices, every
+technology has a bill of materials, a CAPEX entry and legal process connectors, and iron ore and scrap supply and
+steel demand are sized to the installed capacity so the trade LP is feasible. The size of the world is controlled by
+a ``SyntheticScale``; the same scale and seed always produce the same world.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from steelo.bootstrap import bootstrap_simulation
+from steelo.domain import Volumes, Year
+from steelo.domain.models import (
+    FOPEX,
+    Capex,
+    CarbonCostSeries,
+    CostOfCapital,
+    CountryMapping,
+    DemandCenter,
+    FurnaceGroup,
+    InputCosts,
+    LegalProcessConnector,
+    Location,
+    Plant,
+    PlantGroup,
+    PointInTime,
+    PrimaryFeedstock,
+    ProductCategory,
+    Supplier,
+    Technology,
+    TechnologyEmissionFactors,
+    TimeFrame,
+)
+from steelo.simulation import SimulationConfig, SimulationRunner
+from steelo.simulation_types import get_default_technology_settings
+
+START_YEAR = 2025
+# Demand, supply and cost series cover the plant lifetime plus construction time looked ahead by the PAM
+SERIES_YEARS = range(START_YEAR - 5, START_YEAR + 40)
+
+# iso3, country, region, latitude and longitude of the country centre
+COUNTRIES = [
+    ("DEU", "Germany", "Western Europe", 51.2, 10.4),
+    ("FRA", "France", "Western Europe", 46.6, 2.2),
+    ("ESP", "Spain", "Western Europe", 40.4, -3.7),
+    ("ITA", "Italy", "Western Europe", 42.8, 12.6),
+    ("POL", "Poland", "Eastern Europe", 52.1, 19.4),
+    ("SWE", "Sweden", "Western Europe", 62.0, 15.0),
+    ("GBR", "United Kingdom", "United Kingdom", 54.0, -2.0),
+    ("TUR", "Turkey", "Middle East", 39.0, 35.2),
+    ("UKR", "Ukraine", "Former Soviet Union", 49.0, 31.4),
+    ("RUS", "Russia", "Former Soviet Union", 56.0, 45.0),
+    ("USA", "United States", "United States of America", 39.8, -98.6),
+    ("CAN", "Canada", "Canada", 50.0, -100.0),
+    ("MEX", "Mexico", "Mexico", 23.6, -102.5),
+    ("BRA", "Brazil", "Central and South America", -14.2, -51.9),
+    ("ARG", "Argentina", "Central and South America", -38.4, -63.6),
+    ("CHN", "China", "China", 35.9, 104.2),
+    ("IND", "India", "India", 21.0, 78.0),
+    ("JPN", "Japan", "Japan", 36.2, 138.3),
+    ("KOR", "South Korea", "South Korea", 36.5, 127.9),
+    ("VNM", "Vietnam", "Other Developing Asia", 14.1, 108.3),
+    ("IDN", "Indonesia", "Other Developing Asia", -2.5, 118.0),
+    ("THA", "Thailand", "Other Developing Asia", 15.9, 100.9),
+    ("IRN", "Iran", "Middle East", 32.4, 53.7),
+    ("SAU", "Saudi Arabia", "Middle East", 23.9, 45.1),
+    ("EGY", "Egypt", "Africa", 26.8, 30.8),
+    ("ZAF", "South Africa", "Africa", -30.6, 22.9),
+    ("AUS", "Australia", "Australia", -25.3, 133.8),
+    ("KAZ", "Kazakhstan", "Former Soviet Union", 48.0, 66.9),
+    ("CHL", "Chile", "Central and South America", -35.7, -71.5),
+    ("NGA", "Nigeria", "Africa", 9.1, 8.7),
+]
+
+TECHNOLOGY_PRODUCTS = {"BF": "iron", "DRI": "iron", "BOF": "steel", "EAF": "steel"}
+GREENFIELD_CAPEX = {"BF": 450.0, "DRI": 400.0, "BOF": 250.0, "EAF": 200.0}
+FOPEX_PER_TONNE = {"bf": 40.0, "dri": 35.0, "bof": 25.0, "eaf": 30.0}
+LEGAL_CONNECTIONS = [
+    ("io_mid_supply", "BF"),
+    ("io_mid_supply", "DRI"),
+    ("BF", "BOF"),
+    ("DRI", "EAF"),
+    ("scrap_supply", "BOF"),
+    ("scrap_supply", "EAF"),
+    ("BOF", "demand"),
+    ("EAF", "demand"),
+]
+TECH_SWITCHES_CSV = (
+    "Technology,BF,DRI,BOF,EAF\nBF,YES,YES,NO,NO\nDRI,NO,YES,NO,NO\nBOF,NO,NO,YES,YES\nEAF,NO,NO,NO,YES\n"
+)
+# Plant archetypes: technology and capacity (t/year) of each furnace group
+PLANT_ARCHETYPES = [
+    (("BF", 3_000_000), ("BOF", 2_800_000)),
+    (("DRI", 2_000_000), ("EAF", 2_200_000)),
+    (("EAF", 1_500_000),),
+]
+
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    """Size of a synthetic world.
+
+    Attributes:
+        countries: Number of countries with plants, demand and supply (at most ``len(COUNTRIES)``).
+        plants_per_country: Steel plants per country; archetypes (BF-BOF, DRI-EAF, scrap EAF) alternate.
+        demand_centers_per_country: Steel demand centres per country.
+        grid_resolution: Spacing in degrees of the global grid used by the geospatial benchmarks.
+    """
+
+    countries: int
+    plants_per_country: int
+    demand_centers_per_country: int
+    grid_resolution: float
+
+    @property
+    def plants(self) -> int:
+        return self.countries * self.plants_per_country
+
+
+SCALES = {
+    "small": SyntheticScale(countries=4, plants_per_country=3, demand_centers_per_country=1, grid_resolution=5.0),
+    "medium": SyntheticScale(countries=12, plants_per_country=8, demand_centers_per_country=2, grid_resolution=2.0),
+    "large": SyntheticScale(countries=30, plants_per_country=20, demand_centers_per_country=3, grid_resolution=1.0),
+}
+
+
+def _series(value: float) -> dict[Year, float]:
+    return {Year(year): value for year in SERIES_YEARS}
+
+
+def _feedstock(
+    technology: str,
+    metallic_charge: str,
+    reductant: str,
+    quantity: float,
+    output: str,
+    energy: dict[str, float],
+    maximum_share: float = 1.0,
+    minimum_share: float = 0.0,
+) -> PrimaryFeedstock:
+    feedstock = PrimaryFeedstock(metallic_charge=metallic_charge, reductant=reductant, technology=technology)
+    feedstock.required_quantity_per_ton_of_product = quantity
+    feedstock.add_maximum_share_in_product(maximum_share)
+    feedstock.add_minimum_share_in_product(minimum_share)
+    feedstock.add_output(output, Volumes(1.0))
+    for vector, amount in energy.items():
+        feedstock.add_energy_requirement(vector, amount)
+    return feedstock
+
+
+def synthetic_feedstocks() -> list[PrimaryFeedstock]:
+    """Bills of materials of the four technologies: ore-based iron making and ore/scrap-based steel making."""
+    return [
+        _feedstock("BF", "io_mid", "coke", 1.6, "hot_metal", {"coke": 0.45, "electricity": 0.1}),
+        _feedstock("DRI", "io_mid", "natural_gas", 1.5, "dri_mid", {"natural_gas": 10.0, "electricity": 0.12}),
+        _feedstock("BOF", "hot_metal", "", 1.1, "steel", {"electricity": 0.05}, minimum_share=0.7),
+        _feedstock("BOF", "scrap", "", 1.1, "steel", {"electricity": 0.05}, maximum_share=0.3),
+        _feedstock("EAF", "dri_mid", "", 1.1, "steel", {"electricity": 0.6}, maximum_share=0.8),
+        _feedstock("EAF", "scrap", "", 1.1, "steel", {"electricity": 0.5}),
+    ]
+
+
+def _emission_factors(feedstocks: list[PrimaryFeedstock], boundary: str) -> list[TechnologyEmissionFactors]:
+    direct = {"BF": 1.9, "DRI": 0.9, "BOF": 0.2, "EAF": 0.05}
+    return [
+        TechnologyEmissionFactors(
+            business_case=feedstock.name,
+            technology=feedstock.technology.upper(),
+            boundary=boundary,
+            metallic_charge=feedstock.metallic_charge,
+            reductant=feedstock.reductant,
+            direct_ghg_factor=direct[feedstock.technology.upper()],
+            direct_with_biomass_ghg_factor=direct[feedstock.technology.upper()],
+            indirect_ghg_factor=0.1,
+        )
+        for feedstock in feedstocks
+    ]
+
+
+def _furnace_group(furnace_group_id: str, technology: str, capacity: float, rng: np.random.Generator) -> FurnaceGroup:
+    start = int(rng.integers(START_YEAR - 18, START_YEAR - 2))
+    return FurnaceGroup(
+        furnace_group_id=furnace_group_id,
+        capacity=Volumes(capacity * float(rng.uniform(0.7, 1.3))),
+        status="operating",
+        last_renovation_date=date(start, 1, 1),
+        technology=Technology(name=technology, product=TECHNOLOGY_PRODUCTS[technology]),
+        historical_production={},
+        utilization_rate=float(rng.uniform(0.6, 0.9)),
+        lifetime=PointInTime(
+            current=Year(START_YEAR),
+            time_frame=TimeFrame(start=Year(start), end=Year(start + 20)),
+            plant_lifetime=20,
+        ),
+    )
+
+
+def build_synthetic_world(
+    scale: SyntheticScale, directory: Path, seed: int = 0, **config_overrides
+) -> SimulationRunner:
+    """Bootstrap a simulation of ``scale`` ready to run its first year.
+
+    Args:
+        scale: Size of the world.
+        directory: Directory for the prepared data (``data/fixtures``) and the simulation output (``output``).
+        seed: Seed of the generator; the same seed and scale give the same world.
+        **config_overrides: ``SimulationConfig`` fields to override, e.g. ``enable_furnace_group_clustering=True``.
+
+    Returns:
+        The runner with the environment set to the first simulated year, as at the start of ``SimulationRunner.run``.
+    """
+    if scale.countries > len(COUNTRIES):
+        raise ValueError(f"At most {len(COUNTRIES)} countries are available, got {scale.countries}")
+    rng = np.random.default_rng(seed)
+    countries = COUNTRIES[: scale.countries]
+
+    fixtures_dir = directory / "data" / "fixtures"
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    (fixtures_dir / "tech_switches_allowed.csv").write_text(TECH_SWITCHES_CSV)
+    config = SimulationConfig(
+        start_year=Year(START_YEAR),
+        end_year=Year(START_YEAR),
+        master_excel_path=directory / "data" / "master.xlsx",
+        output_dir=directory / "output",
+        data_dir=directory / "data",
+        technology_settings=get_default_technology_settings(),
+        random_seed=seed,
+        log_level=30,
+        **config_overrides,
+    )
+
+    plants: list[Plant] = []
+    plant_groups: list[PlantGroup] = []
+    demand_centers: list[DemandCenter] = []
+    suppliers: list[Supplier] = []
+    total_steel_capacity = 0.0
+    total_iron_capacity = 0.0
+    for iso3, country, region, lat, lon in countries:
+        group_plants = []
+        for index in range(scale.plants_per_country):
+            plant_id = f"P{iso3}{index:04d}"
+            archetype = PLANT_ARCHETYPES[index % len(PLANT_ARCHETYPES)]
+            furnace_groups = [
+                _furnace_group(f"{plant_id}_{number}", technology, capacity, rng)
+                for number, (technology, capacity) in enumerate(archetype)
+            ]
+            for fg in furnace_groups:
+                if fg.technology.product == "steel":
+                    total_steel_capacity += fg.capacity
+                else:
+                    total_iron_capacity += fg.capacity
+            plant = Plant(
+                plant_id=plant_id,
+                location=Location(
+                    lat=lat + float(rng.uniform(-3, 3)),
+                    lon=lon + float(rng.uniform(-3, 3)),
+                    country=country,
+                    region=region,
+                    iso3=iso3,
+                ),
+                furnace_groups=furnace_groups,
+                power_source="grid",
+                soe_status="private",
+                parent_gem_id=f"{iso3}_owner",
+                workforce_size=1_000,
+                certified=False,
+                category_steel_product={ProductCategory("Flat")},
+                technology_unit_fopex=dict(FOPEX_PER_TONNE),
+            )
+            plants.append(plant)
+            group_plants.append(plant)
+        plant_groups.append(PlantGroup(plant_group_id=f"{iso3}_owner", plants=group_plants))
+
+    # Steel demand takes most of the steel capacity and grows slowly; ore and scrap cover what the plants can use
+    demand_per_center = 0.8 * total_steel_capacity / (scale.countries * scale.demand_centers_per_country)
+    for iso3, country, region, lat, lon in countries:
+        for index in range(scale.demand_centers_per_country):
+            demand_centers.append(
+                DemandCenter(
+                    demand_center_id=f"{iso3}_demand_{index}",
+                    center_of_gravity=Location(
+                        lat=lat + float(rng.uniform(-2, 2)),
+                        lon=lon + float(rng.uniform(-2, 2)),
+                        country=country,
+                        region=region,
+                        iso3=iso3,
+                    ),
+                    demand_by_year={
+                        Year(year): Volumes(demand_per_center * (1 + 0.01 * (year - START_YEAR)))
+                        for year in SERIES_YEARS
+                    },
+                )
+            )
+        location = Location(lat=lat, lon=lon, country=country, region=region, iso3=iso3)
+        ore_capacity = 2.0 * total_iron_capacity / scale.countries
+        scrap_capacity = 0.6 * total_steel_capacity / scale.countries
+        ore_cost = float(rng.uniform(60, 110))
+        scrap_cost = float(rng.uniform(280, 360))
+        suppliers += [
+            Supplier(
+                supplier_id=f"{iso3}_io_mid",
+                location=location,
+                commodity="io_mid",
+                capacity_by_year={Year(year): Volumes(ore_capacity) for year in SERIES_YEARS},
+                production_cost_by_year=_series(ore_cost),
+                mine_cost_by_year=_series(ore_cost),
+                mine_price_by_year=_series(ore_cost),
+            ),
+            Supplier(
+                supplier_id=f"{iso3}_scrap",
+                location=location,
+                commodity="scrap",
+                capacity_by_year={Year(year): Volumes(scrap_capacity) for year in SERIES_YEARS},
+                production_cost_by_year=_series(scrap_cost),
+            ),
+        ]
+
+    from steelo.adapters.repositories.in_memory_repository import InMemoryRepository
+
+    repository = InMemoryRepository()
+    repository.plants.add_list(plants)
+    repository.plant_groups.add_list(plant_groups)
+    repository.demand_centers.add_list(demand_centers)
+    repository.suppliers.add_list(suppliers)
+    repository.trade_tariffs.add_list([])
+    country_mappings = [
+        CountryMapping(
+            country=country,
+            iso2=iso3[:2],
+            iso3=iso3,
+            irena_name=country,
+            irena_region=region,
+            region_for_outputs=region,
+            ssp_region=region,
+            gem_country=country,
+            ws_region=region,
+            tiam_ucl_region=region,
+        )
+        for iso3, country, region, _, _ in countries
+    ]
+    cost_of_capital = [
+        CostOfCapital(
+            country=country,
+            iso3=iso3,
+            debt_res=0.05,
+            equity_res=0.09,
+            wacc_res=0.06,
+            debt_other=float(rng.uniform(0.04, 0.08)),
+            equity_other=float(rng.uniform(0.08, 0.14)),
+            wacc_other=0.08,
+        )
+        for iso3, country, _, _, _ in countries
+    ]
+    repository.country_mappings = country_mappings
+    repository.cost_of_capital = cost_of_capital
+
+    runner = bootstrap_simulation(config=config, repository=repository)
+    env = runner.bus.env
+    feedstocks = synthetic_feedstocks()
+    env.year = Year(START_YEAR)
+    env.initiate_fopex([FOPEX(iso3=iso3, technology_fopex=dict(FOPEX_PER_TONNE)) for iso3, *_ in countries])
+    env.initiate_demand_dicts(demand_centers)
+    env.initiate_carbon_costs(
+        [
+            CarbonCostSeries(iso3=iso3, carbon_cost={Year(y): 20.0 + 2.0 * (y - START_YEAR) for y in SERIES_YEARS})
+            for iso3, *_ in countries
+        ]
+    )
+    env.initiate_input_costs(
+        [
+            InputCosts(
+                year=Year(year),
+                iso3=iso3,
+                costs={
+                    "electricity": float(rng.uniform(0.05, 0.12)),
+                    "natural_gas": float(rng.uniform(0.02, 0.05)),
+                    "coke": float(rng.uniform(200, 320)),
+                    "hydrogen": float(rng.uniform(3, 6)),
+                },
+            )
+            for iso3, *_ in countries
+            for year in SERIES_YEARS
+        ]
+    )
+    env.initiate_dynamic_feedstocks(feedstocks)
+    env.initiate_techno_economic_details(
+        [
+            Capex(
+                technology_name=technology,
+                product=product,
+                greenfield_capex=GREENFIELD_CAPEX[technology],
+                capex_renovation_share=0.4,
+                learning_rate=0.02,
+            )
+            for technology, product in TECHNOLOGY_PRODUCTS.items()
+        ]
+    )
+    env.initiate_technology_emission_factors(
+        _emission_factors(feedstocks, config.chosen_emissions_boundary_for_carbon_costs)
+    )
+    env.set_legal_process_connectors(
+        [LegalProcessConnector(from_technology_name=a, to_technology_name=b) for a, b in LEGAL_CONNECTIONS]
+    )
+    env.initialize_virgin_iron_demand(world_suppliers_list=suppliers, steel_demand_dict=env.demand_dict)
+    env.calculate_demand()
+    env.update_regional_capacity(plants)
+    env.set_input_cost_in_furnace_groups(world_plants=plants)
+    env.set_primary_feedstocks_in_furnace_groups(world_plants=plants)
+    for plant in plants:
+        plant.set_carbon_cost_series(carbon_cost_series=env.carbon_costs[plant.location.iso3])
+    return runner
+
+
+def synthetic_candidate_sites(scale: SyntheticScale, seed: int = 0) -> list[dict]:
+    """Candidate sites for new plants, as the GEO model's top locations, on a grid around every country centre.
+
+    Args:
+        scale: Size of the world; ``grid_resolution`` sets the spacing of the sites (16 by 16 degrees per country).
+        seed: Seed of the power, hydrogen and railway costs of the sites.
+
+    Returns:
+        One dict per site with the keys the GEO model hands to ``identify_new_business_opportunities_4indi``.
+    """
+    rng = np.random.default_rng(seed)
+    offsets = np.arange(-8.0, 8.0, scale.grid_resolution)
+    return [
+        {
+            "Latitude": float(lat + lat_offset),
+            "Longitude": float(lon + lon_offset),
+            "iso3": iso3,
+            "power_price": float(rng.uniform(0.03, 0.1)),
+            "capped_lcoh": float(rng.uniform(3, 7)),
+            "rail_cost": float(rng.uniform(0, 50)),
+        }
+        for iso3, _, _, lat, lon in COUNTRIES[: scale.countries]
+        for lat_offset in offsets
+        for lon_offset in offsets
+    ]
@@ -0,0 +1,74 @@
+"""Micro-benchmark: design-space sampling of the baseload optimisation (BOA) for one grid point.
+
+Each grid point samples ``n`` solar/wind designs (3000 in production), sizes their batteries and simulates a full year
+of hourly operation. The per-design implementation (estimate_battery_capacity + state_of_charge + calculate_coverage)
+is compared with the batched kernel (sample_design_space). Run with ``pytest tests/benchmarks -s`` to see the timings.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from baseload_optimisation_atlas.boa_logic import (
+    calculate_coverage,
+    calculate_net_energy_production,
+    estimate_battery_capacity,
+    sample_design_space,
+    state_of_charge,
+)
+
+N_SAMPLES = 3000
+P = 15
+LIMIT = {"wind": 12.0, "solar": 8.0}
+N_POINTS = 3
+LEGACY_POINTS = 1
+
+
+def _profile(seed: int) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    hours = np.arange(8760)
+    solar = np.clip(np.sin((hours % 24 - 6) / 12 * np.pi), 0, None) * rng.uniform(0.5, 1.0, 8760)
+    wind = np.clip(0.35 + 0.25 * np.sin(hours / 500) + rng.normal(0, 0.15, 8760), 0, 1)
+    return {"solar": solar.astype(np.float32), "wind": wind.astype(np.float32)}
+
+
+def _legacy_sampling(profile: dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """The pre-kernel implementation: size and simulate one design at a time."""
+    np.random.seed(12)
+    C_w = np.random.uniform(size=N_SAMPLES, low=0, high=LIMIT["wind"])
+    C_s = np.clip(np.random.exponential(scale=5, size=N_SAMPLES), 0, LIMIT["solar"])
+    battery = np.zeros(N_SAMPLES)
+    coverage = np.zeros(N_SAMPLES)
+    for i in range(N_SAMPLES):
+        net_nrg = calculate_net_energy_production(C_s[i], profile["solar"], C_w[i], profile["wind"])
+        battery[i] = estimate_battery_capacity(net_nrg, q_deficit=P, q_duration=100 - P)
+        coverage[i] = calculate_coverage(state_of_charge(net_nrg, battery[i]), net_nrg)
+    return battery, coverage
+
+
+@pytest.mark.slow
+def test_bench_boa_capacity_sampling():
+    profiles = [_profile(seed) for seed in range(N_POINTS)]
+    # Compile the kernels outside the timed region
+    sample_design_space(profiles[0], P, n_samples=10, limit=LIMIT, seed=12)
+    _legacy_sampling({tech: values[:48] for tech, values in profiles[0].items()})
+
+    start = time.perf_counter()
+    batched = [sample_design_space(profile, P, n_samples=N_SAMPLES, limit=LIMIT, seed=12) for profile in profiles]
+    batched_s = (time.perf_counter() - start) / N_POINTS
+
+    start = time.perf_counter()
+    legacy = [_legacy_sampling(profile) for profile in profiles[:LEGACY_POINTS]]
+    legacy_s = (time.perf_counter() - start) / LEGACY_POINTS
+
+    print(
+        f"\ncapacity sampling: {N_SAMPLES:,} designs x 8760 hours per grid point\n"
+        f"  per design: {1 / legacy_s:8.2f} points/s ({legacy_s:.2f}s/point)\n"
+        f"  batched:    {1 / batched_s:8.2f} points/s ({batched_s:.3f}s/point)"
+    )
+
+    for (battery, coverage), designs in zip(legacy, batched):
+        np.testing.assert_array_equal(designs["battery"], battery)
+        np.testing.assert_array_equal(designs["coverage"], coverage)
+    assert batched_s < legacy_s
@@ -0,0 +1,106 @@
+"""Micro-benchmark: TradeLPModel.extract_solution at production scale.
+
+Real trade LPs have a few thousand process centers and hundreds of thousands of allocation variables. The model
+here is synthetic (no solve): a ``highs`` backend column set is filled with values directly, so only the extraction
+path is timed. Run with ``pytest tests/benchmarks -s`` to see the timings.
+"""
+
+import time
+
+import numpy as np
+import pyomo.environ as pyo
+import pytest
+
+from steelo.domain.trade_modelling.highs_matrix_backend import HighsMatrixLP, MatrixColumnSet
+from steelo.domain.trade_modelling.trade_lp_modelling import (
+    Commodity,
+    Process,
+    ProcessCenter,
+    ProcessType,
+    TradeLPModel,
+)
+
+N_PROCESS_CENTERS = 4_000
+N_ALLOCATIONS = 300_000
+NONZERO_SHARE = 0.2
+LEGACY_SAMPLE = 500
+
+
+class _Location:
+    def __init__(self):
+        self.lat = 0.0
+        self.lon = 0.0
+        self.iso3 = "XXX"
+        self.distance_to_other_iso3 = {}
+
+
+def _synthetic_solved_model() -> TradeLPModel:
+    rng = np.random.default_rng(0)
+    model = TradeLPModel(lp_backend="highs")
+    commodities = [Commodity(name) for name in ("iron_ore", "hot_metal", "pig_iron", "dri_mid", "scrap", "steel")]
+    process = Process("generic", ProcessType.PRODUCTION, [])
+    model.add_commodities(commodities)
+    model.add_process_centers(
+        [ProcessCenter(f"pc_{i}", process, 1_000.0, _Location()) for i in range(N_PROCESS_CENTERS)]
+    )
+
+    from_idx = rng.integers(0, N_PROCESS_CENTERS, N_ALLOCATIONS)
+    to_idx = rng.integers(0, N_PROCESS_CENTERS, N_ALLOCATIONS)
+    commodity_idx = rng.integers(0, len(commodities), N_ALLOCATIONS)
+    keys = list(
+        dict.fromkeys(
+            (f"pc_{f}", f"pc_{t}", commodities[c].name)
+            for f, t, c in zip(from_idx.tolist(), to_idx.tolist(), commodity_idx.tolist())
+        )
+    )
+    columns = MatrixColumnSet(keys)
+    model.lp_model.allocation_variables = columns
+    model.lp_model.allocation_costs = dict.fromkeys(keys, 100.0)
+
+    matrix_lp = HighsMatrixLP.__new__(HighsMatrixLP)
+    matrix_lp.allocation_keys = keys
+    matrix_lp.column_sets = [columns, MatrixColumnSet([]), MatrixColumnSet([])]
+    values = np.where(rng.random(len(keys)) < NONZERO_SHARE, rng.random(len(keys)) * 100 + 1, 0.0)
+    matrix_lp.col_value = values
+    model.matrix_lp = matrix_lp
+    model.solution_status = pyo.SolverStatus.ok
+    return model
+
+
+def _legacy_extract(model: TradeLPModel, items) -> dict:
+    """The pre-index implementation: a linear scan per variable for each name."""
+    allocations = {}
+    for (from_pc_name, to_pc_name, commodity_name), volume in items:
+        if volume >= model.lp_epsilon:
+            from_pc = next(pc for pc in model.process_centers if pc.name == from_pc_name)
+            to_pc = next(pc for pc in model.process_centers if pc.name == to_pc_name)
+            comm = next(comm for comm in model.commodities if comm.name == commodity_name)
+            allocations[(from_pc, to_pc, comm)] = volume
+    return allocations
+
+
+@pytest.mark.slow
+def test_bench_extract_solution():
+    model = _synthetic_solved_model()
+
+    start = time.perf_counter()
+    model.extract_solution()
+    indexed_s = time.perf_counter() - start
+
+    nonzero = [item for item in model.get_allocation_values().items() if item[1] >= model.lp_epsilon]
+    sample = nonzero[:LEGACY_SAMPLE]
+    start = time.perf_counter()
+    legacy = _legacy_extract(model, sample)
+    legacy_per_variable_s = (time.perf_counter() - start) / len(sample)
+    legacy_estimate_s = legacy_per_variable_s * len(nonzero)
+
+    print(
+        f"\nextract_solution: {len(model.lp_model.allocation_variables):,} variables, {len(nonzero):,} non-zero, "
+        f"{N_PROCESS_CENTERS:,} process centers\n"
+        f"  indexed:          {indexed_s:.3f}s\n"
+        f"  linear scan est.: {legacy_estimate_s:.1f}s ({legacy_per_variable_s * 1e6:.0f} us/variable)"
+    )
+
+    assert len(model.allocations.allocations) == len(nonzero)
+    assert all(model.allocations.allocations[key] == volume for key, volume in legacy.items())
+    assert indexed_s < legacy_estimate_s
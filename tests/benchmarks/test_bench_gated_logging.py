@@ -0,0 +1,88 @@
+"""Micro-benchmark: cost of disabled DEBUG logging in a hot loop, eager f-strings vs. gated loggers.
+
+Simulation runs configure the root logger at DEBUG and let the ContextAwareFilter drop DEBUG records of modules set
+to INFO in ``logging_config.yaml``. A ``logger.debug(f"...")`` call therefore formats its message, evaluates the
+properties in it and creates a LogRecord before the filter throws it away. A ``get_logger`` logger decides first
+(cached per module context, logger and level) and never builds the message. Run with
+``pytest tests/benchmarks -s`` to see the timings.
+"""
+
+import logging
+import os
+import time
+
+import pytest
+
+from steelo import logging_config
+from steelo.logging_config import ContextAwareFilter, GatedLogger, LoggingConfig
+
+N_CALLS = 100_000
+
+
+class _FurnaceGroup:
+    """Stand-in with a computed property, like FurnaceGroup.unit_total_opex."""
+
+    furnace_group_id = "P000_0"
+    capacity = 2.5e6
+
+    def __init__(self):
+        self.costs = [float(i) for i in range(20)]
+
+    @property
+    def unit_total_opex(self) -> float:
+        return sum(self.costs) / len(self.costs)
+
+
+def _per_call_ns(log_call) -> float:
+    start = time.perf_counter()
+    for _ in range(N_CALLS):
+        log_call()
+    return (time.perf_counter() - start) / N_CALLS * 1e9
+
+
+@pytest.fixture
+def pam_debug_logger(monkeypatch):
+    """DEBUG logger whose only handler carries the simulation's context filter (pam at INFO)."""
+    monkeypatch.setattr(logging_config, "_context_filters_installed", True)
+    # Outside the logger hierarchy, so pytest's capture handlers are not attached to it
+    logger = logging.Logger("benchmark.optimal_technology_name", logging.DEBUG)
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.addFilter(ContextAwareFilter({"pam": logging.INFO}, {}, logging.DEBUG))
+        logger.addHandler(handler)
+        LoggingConfig.reset_log_gates()
+        try:
+            with LoggingConfig.module_context("pam"):
+                yield logger
+        finally:
+            logger.removeHandler(handler)
+            LoggingConfig.reset_log_gates()
+
+
+@pytest.mark.slow
+def test_bench_disabled_debug_logging(pam_debug_logger):
+    logger = pam_debug_logger
+    gated = GatedLogger(logger)
+    fg = _FurnaceGroup()
+
+    baseline_ns = _per_call_ns(lambda: None)
+    eager_ns = _per_call_ns(
+        lambda: logger.debug(f"[OPTIMAL TECH] FG {fg.furnace_group_id}: unit total OPEX ${fg.unit_total_opex:,.2f}/t")
+    )
+    percent_ns = _per_call_ns(lambda: gated.debug("[OPTIMAL TECH] FG %s: capacity %.0f t", fg.furnace_group_id, 1.0))
+    callable_ns = _per_call_ns(
+        lambda: gated.debug(
+            lambda: f"[OPTIMAL TECH] FG {fg.furnace_group_id}: unit total OPEX ${fg.unit_total_opex:,.2f}/t"
+        )
+    )
+
+    print(
+        f"\ndisabled DEBUG call in pam context ({N_CALLS:,} calls, loop overhead {baseline_ns:.0f} ns subtracted)\n"
+        f"  stdlib logger, f-string:  {eager_ns - baseline_ns:7.0f} ns/call\n"
+        f"  gated logger, %-style:    {percent_ns - baseline_ns:7.0f} ns/call\n"
+        f"  gated logger, callable:   {callable_ns - baseline_ns:7.0f} ns/call"
+    )
+
+    assert gated.isEnabledFor(logging.DEBUG) is False
+    assert callable_ns < eager_ns
+    assert percent_ns < eager_ns
@@ -0,0 +1,245 @@
+"""Benchmarks: the simulation hot paths on synthetic worlds of configurable scale.
+
+Every benchmark bootstraps a synthetic world (see ``synthetic_world.py``) at ``--bench-scale`` and times one hot path
+of a simulation year: the trade LP, the disaggregation of clustered allocations, the TM-PAM connector, the plant
+agents, the business opportunity NPVs, the plant-dependent GEO layers and the data collection. Only runs with
+``--run-benchmarks``; see ``conftest.py`` for storing and comparing results. Run with
+``pytest tests/benchmarks --run-benchmarks -s`` to see the timings.
+"""
+
+from typing import cast
+
+import numpy as np
+import pytest
+import xarray as xr
+from synthetic_world import synthetic_candidate_sites
+
+from steelo.adapters.geospatial.geospatial_calculations import collect_distance_sources, fingerprint_distance_sources
+from steelo.adapters.geospatial.geospatial_toolbox import distance_to_closest_location
+from steelo.adapters.geospatial.layer_pipeline import GeoLayer, GeoLayerPipeline
+from steelo.adapters.repositories.in_memory_repository import InMemoryRepository
+from steelo.domain import Year
+from steelo.domain.calculate_costs import calculate_business_opportunity_npvs
+from steelo.domain.events import SteelAllocationsCalculated
+from steelo.domain.new_plant_opening import (
+    get_list_of_allowed_techs_for_target_year,
+    prepare_cost_data_for_business_opportunity,
+)
+from steelo.domain.trade_modelling.furnace_group_clustering import cluster_furnace_groups, disaggregate_allocations
+from steelo.domain.trade_modelling.set_up_steel_trade_lp import (
+    set_up_steel_trade_lp,
+    solve_lp_only,
+    solve_steel_trade_lp_and_return_commodity_allocations,
+)
+from steelo.economic_models.plant_agent import AllocationModel, PlantAgentsModel, _future_price_series
+from steelo.service_layer.handlers import update_furnace_utilization_rates
+
+pytestmark = [pytest.mark.slow, pytest.mark.benchmark]
+
+# Distance layers of the GEO pipeline and the transport cost rate (geo_config key) applied to each
+DISTANCE_LAYERS = {
+    "ore_mines": "iron_mine_to_plant",
+    "iron_plants": "iron_to_steel_plant",
+    "steel_plants": "iron_to_steel_plant",
+    "demand_centers": "steel_to_demand",
+}
+
+
+def _furnace_group_count(runner) -> int:
+    return sum(len(plant.furnace_groups) for plant in runner.bus.uow.plants.list())
+
+
+def _set_up_trade_lp(bus, furnace_groups_override=None):
+    return set_up_steel_trade_lp(
+        bus,
+        bus.env.year,
+        bus.env.config,
+        legal_process_connectors=bus.env.legal_process_connectors,
+        secondary_feedstock_constraints=bus.env.relevant_secondary_feedstock_constraints(),
+        aggregated_metallic_charge_constraints=bus.env.aggregated_metallic_charge_constraints,
+        transport_kpis=bus.env.transport_kpis,
+        furnace_groups_override=furnace_groups_override,
+    )
+
+
+@pytest.mark.parametrize("lp_backend", ["pyomo", "highs"])
+def test_trade_lp_setup_and_solve(bench, synthetic_world, lp_backend):
+    runner = synthetic_world(lp_backend=lp_backend)
+    bus = runner.bus
+    # One untimed year brings prices, emission factors and carbon costs to the state the LP is built from
+    AllocationModel.run(bus)
+
+    def setup_and_solve():
+        trade_lp = _set_up_trade_lp(bus)
+        return solve_steel_trade_lp_and_return_commodity_allocations(
+            trade_lp=trade_lp, repository=cast(InMemoryRepository, bus.uow.repository)
+        )
+
+    commodity_allocations = bench(setup_and_solve, furnace_groups=_furnace_group_count(runner))
+
+    assert sum(len(allocations.allocations) for allocations in commodity_allocations.values()) > 0
+
+
+def test_disaggregate_allocations(bench, synthetic_world):
+    runner = synthetic_world(enable_furnace_group_clustering=True)
+    bus = runner.bus
+    AllocationModel.run(bus)
+    meta_furnace_groups, _ = cluster_furnace_groups(
+        plants=bus.uow.plants.list(),
+        config=bus.env.config,
+        aggregated_constraints=bus.env.aggregated_metallic_charge_constraints or None,
+    )
+    trade_lp = _set_up_trade_lp(bus, furnace_groups_override=meta_furnace_groups)
+    solve_lp_only(trade_lp)
+
+    allocations = bench(
+        lambda: disaggregate_allocations(
+            clustered_allocations=trade_lp.allocations,
+            meta_furnace_groups=meta_furnace_groups,
+            plants_repo=bus.uow.plants,
+            config=bus.env.config,
+            transport_kpis=bus.env.transport_kpis,
+            willingness_to_pay=bus.env.willingness_to_pay,
+            aggregated_constraints=bus.env.aggregated_metallic_charge_constraints,
+            distance_matrix=bus.env.distance_matrix,
+        ),
+        furnace_groups=_furnace_group_count(runner),
+        clusters=len(meta_furnace_groups),
+    )
+
+    assert allocations.allocations
+
+
+def test_tm_pam_connector(bench, synthetic_world):
+    runner = synthetic_world()
+    bus = runner.bus
+    AllocationModel.run(bus)
+    event = SteelAllocationsCalculated(trade_allocations=bus.env.trade_allocations)
+
+    bench(
+        lambda: update_furnace_utilization_rates(event, uow=bus.uow, env=bus.env),
+        furnace_groups=_furnace_group_count(runner),
+    )
+
+    assert any(fg.utilization_rate > 0 for plant in bus.uow.plants.list() for fg in plant.furnace_groups)
+
+
+def test_plant_agents_model(bench, synthetic_world):
+    def allocated_world():
+        # The plant agents switch, expand and close furnace groups, so every round needs a fresh world
+        runner = synthetic_world()
+        AllocationModel.run(runner.bus)
+        return runner
+
+    runner = bench(lambda runner: (PlantAgentsModel.run(runner.bus), runner)[1], setup=allocated_world)
+
+    assert _furnace_group_count(runner) > 0
+
+
+def test_business_opportunity_npvs(bench, bench_scale, synthetic_world):
+    runner = synthetic_world()
+    bus = runner.bus
+    AllocationModel.run(bus)  # Fills the average BOMs new plants are costed with
+    env, config = bus.env, bus.env.config
+    sites = synthetic_candidate_sites(bench_scale)
+    target_year = Year(env.year + config.consideration_time + 1)
+    input_costs = {iso3: {Year(y): costs for y, costs in years.items()} for iso3, years in env.input_costs.items()}
+    cost_data = prepare_cost_data_for_business_opportunity(
+        product_to_tech=get_list_of_allowed_techs_for_target_year(
+            allowed_techs=env.allowed_techs, tech_to_product=env.technology_to_product, target_year=target_year
+        ),
+        best_locations_subset={"iron": sites, "steel": sites},
+        current_year=env.year,
+        target_year=target_year,
+        energy_costs=input_costs,
+        capex_dict_all_locs_techs=env.name_to_capex["greenfield"],
+        cost_of_debt_all_locs=env.industrial_cost_of_debt,
+        cost_of_equity_all_locs=env.industrial_cost_of_equity,
+        fopex_all_locs_techs=env.fopex_by_country,
+        steel_plant_capacity=config.expanded_capacity,
+        get_bom_from_avg_boms=env.get_bom_from_avg_boms,
+        iso3_to_region_map=env.country_mappings.iso3_to_region(),
+        global_risk_free_rate=config.global_risk_free_rate,
+        capex_subsidies={},
+        debt_subsidies={},
+        opex_subsidies={},
+        energy_subsidies={},
+        carbon_costs=env.carbon_costs,
+        most_common_reductant={},
+        environment_most_common_reductant=env.most_common_reductant_by_tech,
+    )
+    market_price = _future_price_series(env, env.year, env.year + config.construction_time + config.plant_lifetime)
+
+    npvs = bench(
+        lambda: calculate_business_opportunity_npvs(
+            cost_data=cost_data,
+            target_year=target_year,
+            market_price=market_price,
+            steel_plant_capacity=config.expanded_capacity,
+            plant_lifetime=config.plant_lifetime,
+            construction_time=config.construction_time,
+            equity_share=config.equity_share,
+            technology_emission_factors=env.technology_emission_factors,
+            chosen_emissions_boundary_for_carbon_costs=config.chosen_emissions_boundary_for_carbon_costs,
+            dynamic_business_cases=env.dynamic_feedstocks,
+            disposal_cost_outputs=config.disposal_cost_outputs,
+        ),
+        sites=len(sites),
+    )
+
+    assert all(npvs[product] for product in ("iron", "steel"))
+
+
+def _distance_layer(source: str, sources, lats: np.ndarray, lons: np.ndarray, cost_per_km: float) -> GeoLayer:
+    def compute(ds: xr.Dataset) -> xr.Dataset:
+        distance = distance_to_closest_location(sources[source], target_lats=lats, target_lons=lons)
+        return ds.assign({f"distance_{source}": distance, f"transport_cost_{source}": distance * cost_per_km})
+
+    return GeoLayer(f"distance_{source}", compute, inputs=("distance_sources",))
+
+
+def test_geo_distance_layers(bench, bench_scale, synthetic_world):
+    """The plant-dependent GEO layers, i.e. those recomputed every year the plant set changes.
+
+    Terrain, power price and hydrogen layers need the geo data files; the distance and transport cost layers only
+    need the repository and run on a global grid at the scale's resolution.
+    """
+    runner = synthetic_world()
+    bus = runner.bus
+    config = bus.env.config
+    lats = np.arange(-90, 90, bench_scale.grid_resolution)
+    lons = np.arange(-180, 180, bench_scale.grid_resolution)
+
+    def plant_set_changed():
+        sources = collect_distance_sources(bus.uow.repository, bus.env.year, config.active_statuses)
+        layers = [
+            _distance_layer(source, sources, lats, lons, config.geo_config.transportation_cost_per_km_per_ton[rate])
+            for source, rate in DISTANCE_LAYERS.items()
+        ]
+        pipeline = GeoLayerPipeline()
+        return pipeline.run(layers, {"distance_sources": fingerprint_distance_sources(sources)}), pipeline
+
+    dataset, pipeline = bench(plant_set_changed, grid_cells=lats.size * lons.size)
+
+    assert set(dataset.data_vars) == {
+        f"{kind}_{source}" for kind in ("distance", "transport_cost") for source in DISTANCE_LAYERS
+    }
+    assert all(stats.misses == 1 for stats in pipeline.stats.values())
+
+
+def test_data_collector_collect(bench, synthetic_world):
+    runner = synthetic_world()
+    bus = runner.bus
+    AllocationModel.run(bus)
+    PlantAgentsModel.run(bus)
+
+    bench(
+        lambda: runner.data_collector.collect(
+            world_plant_list=bus.uow.plants.list(),
+            world_plant_groups=bus.uow.plant_groups.list(),
+            year=bus.env.year,
+        ),
+        furnace_groups=_furnace_group_count(runner),
+    )
+
+    assert runner.data_collector.capacity_by_technology_and_PAM_status
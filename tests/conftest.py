@@ -24,6 +24,14 @@ from dataclasses import replace
 # get_default_technology_settings is now imported from simulation_types
 
 
+@pytest.fixture(autouse=True)
+def diagnostics_outside_the_working_directory(tmp_path_factory, monkeypatch):
+    """Diagnostics are written to output/diagnostics of the working directory by default; keep them out of the tree."""
+    from steelo.domain import diagnostics
+
+    monkeypatch.setattr(diagnostics, "DIAGNOSTICS_BASE_PATH", tmp_path_factory.getbasetemp() / "diagnostics")
+
+
 @pytest.fixture
 def default_technology_settings() -> TechSettingsMap:
     """Get default technology settings using production loader."""
@@ -150,6 +158,28 @@ def pytest_addoption(parser):
         default=False,
         help="Run tests for the wind_and_pv package only if this flag is set",
     )
+    # Benchmark suite (tests/benchmarks); fixtures and the JSON report live in tests/benchmarks/conftest.py
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run the simulation benchmarks (marked benchmark) only if this flag is set",
+    )
+    parser.addoption(
+        "--bench-scale",
+        choices=("small", "medium", "large"),
+        default="small",
+        help="Size of the synthetic world the benchmarks run on",
+    )
+    parser.addoption("--bench-rounds", type=int, default=3, help="Timed rounds per benchmark")
+    parser.addoption("--bench-json", default=None, help="Write the benchmark results to this JSON file")
+    parser.addoption("--bench-compare", default=None, help="Compare the benchmark results with this earlier JSON file")
+    parser.addoption(
+        "--bench-threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown of the median time reported as a regression (0.2 = 20%%)",
+    )
 
 
 def pytest_configure(config):
@@ -157,6 +187,10 @@ def pytest_configure(config):
         "markers",
         "wind_and_pv: wind_and_pv: Marks special tests that are only executed when --run-wind-and-pv-tests is set",
     )
+    config.addinivalue_line(
+        "markers",
+        "benchmark: simulation benchmarks on synthetic worlds, only executed when --run-benchmarks is set",
+    )
 
 
 def pytest_collection_modifyitems(config, items):
@@ -165,6 +199,11 @@ def pytest_collection_modifyitems(config, items):
         for item in items:
             if "wind_and_pv" in item.keywords:
                 item.add_marker(skip_marker)
+    if not config.getoption("--run-benchmarks"):
+        skip_marker = pytest.mark.skip(reason="--run-benchmarks not set")
+        for item in items:
+            if "benchmark" in item.keywords:
+                item.add_marker(skip_marker)
 
 
 # Removed preserve_iso3_to_region fixture as we're migrating to dynamic country mappings
@@ -391,7 +430,7 @@ def bus(tmp_path):
     }
 
     # Bootstrap with the environment that has a simulation config
-    return bootstrap(env=env)
+    return bootstrap(env=env, checkpoint_dir=str(tmp_path / "checkpoints"))
 
 
 @pytest.fixture
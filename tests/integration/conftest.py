@@ -37,7 +37,7 @@ def mock_tech_switches_file():
 
 
 @pytest.fixture
-def bus(mock_cost_of_x_file, mock_tech_switches_file):
+def bus(mock_cost_of_x_file, mock_tech_switches_file, tmp_path):
     """Create a message bus with all dependencies for integration tests."""
     from steelo.simulation import SimulationConfig
     from steelo.domain.constants import Year
@@ -55,4 +55,9 @@ def bus(mock_cost_of_x_file, mock_tech_switches_file):
         technology_settings=get_default_technology_settings(),
     )
 
-    return bootstrap(uow=uow, config=config, tech_switches_csv=mock_tech_switches_file)
+    return bootstrap(
+        uow=uow,
+        config=config,
+        tech_switches_csv=mock_tech_switches_file,
+        checkpoint_dir=str(tmp_path / "checkpoints"),
+    )
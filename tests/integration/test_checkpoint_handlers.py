@@ -7,12 +7,15 @@ ensuring all state is properly persisted and restored.
 
 import pytest
 from pathlib import Path
+import random
 import shutil
+from dataclasses import replace
 
 from steelo.simulation_types import get_default_technology_settings
 
 from steelo.domain import Year
-from steelo.service_layer.checkpoint import SimulationCheckpoint
+from steelo.service_layer.checkpoint import CheckpointError, RunSnapshots, SimulationCheckpoint
+from steelo.domain.datacollector import DataCollector
 from steelo.domain.events import IterationOver, SaveCheckpoint
 from steelo.devdata import get_plant
 from steelo.bootstrap import bootstrap
@@ -291,3 +294,88 @@ class TestCheckpointIntegration:
         assert "plants" in checkpoint_data["repository_state"]
         assert "suppliers" in checkpoint_data["repository_state"]
         assert "demand_centers" in checkpoint_data["repository_state"]
+
+
+class TestRunSnapshots:
+    """Complete run snapshots restore the environment and repositories into the live message bus."""
+
+    @pytest.fixture
+    def bus(self, mock_tech_switches_file, tmp_path):
+        from steelo.simulation import SimulationConfig
+
+        config = SimulationConfig(
+            start_year=Year(2025),
+            end_year=Year(2050),
+            master_excel_path=Path(tmp_path) / "master.xlsx",
+            output_dir=Path(tmp_path),
+            technology_settings=get_default_technology_settings(),
+        )
+        return bootstrap(
+            config=config, tech_switches_csv=mock_tech_switches_file, checkpoint_dir=str(tmp_path / "checkpoints")
+        )
+
+    def test_restore_continues_from_the_saved_state(self, bus, tmp_path):
+        env, uow = bus.env, bus.uow
+        plant = get_plant()
+        uow.plants.add(plant)
+        capacity = plant.furnace_groups[0].capacity
+        env.year = Year(2030)
+        env.previous_lp_solution = {("a", "b", "steel"): 1.0}
+        data_collector = DataCollector(world_plant_groups=[], env=env, output_dir=tmp_path)
+        data_collector.trace_capex[2030]["BOF"]["DEU"] += 5.0
+        snapshots = RunSnapshots(tmp_path / "snapshots")
+        random.seed(1)
+        snapshots.save(2030, bus, data_collector, {2030: {}}, start_year=2025, end_year=2050)
+        expected_draw = random.random()
+
+        # The run carries on (or crashes) and changes everything
+        random.seed(99)
+        plant.furnace_groups[0].capacity = capacity * 2
+        uow.plants.add(get_plant(plant_id="other"))
+        env.year = Year(2035)
+        env.previous_lp_solution = None
+
+        restored = snapshots.restore(2030, bus, start_year=2025, end_year=2050)
+
+        assert bus.env is env and bus.uow is uow
+        assert env.year == Year(2030)
+        assert env.previous_lp_solution == {("a", "b", "steel"): 1.0}
+        assert [p.plant_id for p in uow.plants.list()] == [plant.plant_id]
+        assert uow.plants.get(plant.plant_id).furnace_groups[0].capacity == capacity
+        assert restored.data_collector.env is env
+        assert restored.data_collector.trace_capex[2030]["BOF"]["DEU"] == 5.0
+        assert restored.commands == {2030: {}}
+        assert random.random() == expected_draw
+
+        # Message handlers keep working on the restored state
+        bus.handle(SaveCheckpoint(year=Year(2030)))
+        assert list((tmp_path / "checkpoints").glob("checkpoint_year_2030_*.pkl"))
+
+    def test_restore_rejects_missing_and_foreign_snapshots(self, bus, tmp_path):
+        data_collector = DataCollector(world_plant_groups=[], env=bus.env, output_dir=tmp_path)
+        snapshots = RunSnapshots(tmp_path / "snapshots")
+        snapshots.save(2030, bus, data_collector, {}, start_year=2025, end_year=2050)
+
+        assert snapshots.years() == [2030]
+        with pytest.raises(CheckpointError, match="available: 2030"):
+            snapshots.restore(2031, bus, start_year=2025, end_year=2050)
+        with pytest.raises(CheckpointError, match="2025-2050 simulation, not 2025-2040"):
+            snapshots.restore(2030, bus, start_year=2025, end_year=2040)
+
+    def test_runner_keeps_only_the_latest_snapshots(self, bus, tmp_path):
+        from steelo.simulation import SimulationRunner
+
+        config = replace(bus.env.config, snapshot_keep_last=2)
+        runner = SimulationRunner(config=config, bus=bus)
+        try:
+            # Left behind by a crashed run that is now resumed from an earlier year
+            runner.snapshots.save(2035, bus, runner.data_collector, {}, start_year=2025, end_year=2050)
+            for year in range(2025, 2031):
+                runner._save_snapshot(year, {})
+        finally:
+            runner._cleanup_temp_dir()
+
+        assert runner.snapshots.years() == [2029, 2030, 2035]
+
+        runner.snapshots.clean_old_snapshots(keep_last_n=1)
+        assert runner.snapshots.years() == [2035]
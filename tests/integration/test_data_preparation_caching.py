@@ -237,3 +237,68 @@ def test_cache_with_different_master_excel(prep_service, temp_dirs):
     assert cached1 != cached2
     assert (cached1 / "test.txt").read_text() == "test1"
     assert (cached2 / "test.txt").read_text() == "test2"
+
+
+def _write_master_excel(path, tariff):
+    import pandas as pd
+
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame({"Plant ID": ["P1", "P2"]}).to_excel(writer, sheet_name="Iron and steel plants", index=False)
+        pd.DataFrame({"From": ["DEU"], "Tariff": [tariff]}).to_excel(writer, sheet_name="Tariffs", index=False)
+
+
+def test_changed_sheet_recreates_only_stale_outputs_mock(prep_service_with_mock_data, temp_dirs):
+    """Test that a changed sheet only recreates the outputs read from it, reusing the rest from the cache."""
+    from unittest.mock import patch
+
+    from steelo.adapters.dataprocessing.workbook_session import WorkbookSession
+    from steelo.data.preparation import FileSource, PreparationResult, PreparedFile
+
+    master_excel = temp_dirs["excel"] / "master_input.xlsx"
+    _write_master_excel(master_excel, tariff=0.1)
+
+    # Cached preparation of the original workbook, with the sheets each output was read from
+    base_dir = temp_dirs["cache"] / "base_data"
+    (base_dir / "fixtures").mkdir(parents=True)
+    base_result = PreparationResult(master_excel_path=master_excel, total_duration=5.0)
+    for filename, sheet in [("plants.json", "Iron and steel plants"), ("tariffs.json", "Tariffs")]:
+        (base_dir / "fixtures" / filename).write_text(f'"cached {filename}"')
+        path = base_dir / "fixtures" / filename
+        base_result.add_file(PreparedFile(filename, FileSource.MASTER_EXCEL, sheet, 1.0, path, sheets=[sheet]))
+    with WorkbookSession(master_excel) as workbook:
+        base_result.sheet_hashes = {s: workbook.sheet_hash(s) for s in ["Iron and steel plants", "Tariffs"]}
+    cache_manager = prep_service_with_mock_data.cache_manager
+    cache_manager.save_preparation(base_dir, master_excel, 5.0, result=base_result)
+
+    _write_master_excel(master_excel, tariff=0.25)
+    output_dir = temp_dirs["output"] / "run_incremental"
+
+    def prepare_missing_files(output_dir, master_excel_path, skip_existing, **kwargs):
+        # Unchanged outputs were copied from the cache, stale ones are left for preparation
+        assert skip_existing
+        assert (output_dir / "fixtures" / "plants.json").read_text() == '"cached plants.json"'
+        assert not (output_dir / "fixtures" / "tariffs.json").exists()
+        (output_dir / "fixtures" / "tariffs.json").write_text('"new tariffs"')
+        result = PreparationResult(master_excel_path=master_excel_path, total_duration=1.0)
+        fixtures = output_dir / "fixtures"
+        plants = PreparedFile("plants.json", FileSource.MASTER_EXCEL, "", 0.0, fixtures / "plants.json", skipped=True)
+        tariffs = PreparedFile("tariffs.json", FileSource.MASTER_EXCEL, "", 0.5, fixtures / "tariffs.json")
+        tariffs.sheets = ["Tariffs"]
+        result.add_file(plants)
+        result.add_file(tariffs)
+        return result
+
+    with patch.object(prep_service_with_mock_data, "_prepare_data_internal", side_effect=prepare_missing_files):
+        result = prep_service_with_mock_data.prepare_data(output_dir=output_dir, master_excel_path=master_excel)
+
+    assert "Reuse unchanged cached outputs" in [step.name for step in result.steps]
+    assert {file.filename: file.sheets for file in result.files} == {
+        "plants.json": ["Iron and steel plants"],
+        "tariffs.json": ["Tariffs"],
+    }
+
+    # The new cache entry records the dependencies of reused outputs too, so the next change is incremental again
+    stale = cache_manager.find_stale_outputs(master_excel)
+    assert stale is not None
+    assert stale.stale == {}
+    assert sorted(stale.fresh) == ["fixtures/plants.json", "fixtures/tariffs.json"]
@@ -0,0 +1,196 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pyomo.environ as pyo
+import pytest
+
+from steelo.domain.constants import LP_EPSILON
+from steelo.domain.trade_modelling.set_up_steel_trade_lp import (
+    build_allocation_distance_rules,
+    fix_to_zero_allocations_where_distance_doesnt_match_commodity,
+)
+from steelo.domain.trade_modelling.trade_lp_modelling import (
+    AllocationDistanceRules,
+    BOMElement,
+    Commodity,
+    MaterialParameters,
+    Process,
+    ProcessCenter,
+    ProcessConnector,
+    ProcessType,
+    TradeLPModel,
+)
+
+CONFIG = SimpleNamespace(
+    hot_metal_radius=5.0,
+    closely_allocated_products=["hot_metal"],
+    distantly_allocated_products=["pig_iron"],
+)
+
+
+class _Location:
+    def __init__(self, lat, lon, iso3, distance_to_other_iso3=None):
+        self.lat = lat
+        self.lon = lon
+        self.iso3 = iso3
+        self.distance_to_other_iso3 = distance_to_other_iso3 if distance_to_other_iso3 is not None else {}
+
+
+def _build_network(lp_backend: str, rules: AllocationDistanceRules | None) -> TradeLPModel:
+    """Ore -> BF (hot metal / pig iron) -> BOF -> demand, with plants near and far from each other.
+
+    bof_far has no blast furnace within the hot metal radius, so all of its hot metal arcs are pruned while its
+    hot metal minimum ratio still has to hold.
+    """
+    model = TradeLPModel(lp_epsilon=LP_EPSILON, random_seed=42, lp_backend=lp_backend)
+    iron_ore, hot_metal, pig_iron, scrap, limestone, steel = (
+        Commodity(name) for name in ("iron_ore", "hot_metal", "pig_iron", "scrap", "limestone", "steel")
+    )
+    bf_ore = BOMElement(
+        "ore_to_iron", iron_ore, [hot_metal, pig_iron], {MaterialParameters.INPUT_RATIO.value: 1.6}, energy_cost=3.0
+    )
+    bof_boms = [
+        BOMElement(
+            "hot_metal_to_steel",
+            hot_metal,
+            [steel],
+            {MaterialParameters.INPUT_RATIO.value: 1.1, MaterialParameters.MINIMUM_RATIO.value: 0.6},
+            dependent_commodities={limestone: 0.1},
+        ),
+        BOMElement("pig_iron_to_steel", pig_iron, [steel], {MaterialParameters.INPUT_RATIO.value: 1.1}),
+        BOMElement(
+            "scrap_to_steel",
+            scrap,
+            [steel],
+            {MaterialParameters.INPUT_RATIO.value: 1.1, MaterialParameters.MAXIMUM_RATIO.value: 0.3},
+        ),
+    ]
+    ore_supply, scrap_supply, limestone_supply = (
+        Process(f"{c.name}_supply", ProcessType.SUPPLY, [BOMElement(f"{c.name}_supply", c, [c], {})])
+        for c in (iron_ore, scrap, limestone)
+    )
+    bf = Process("BF", ProcessType.PRODUCTION, [bf_ore])
+    bof = Process("BOF", ProcessType.PRODUCTION, bof_boms)
+    demand = Process("demand", ProcessType.DEMAND, [BOMElement("steel_demand", steel, [steel], {})])
+
+    centers = [
+        ProcessCenter("ore_AUS", ore_supply, 1_000.0, _Location(-25, 135, "AUS"), production_cost=10.0),
+        ProcessCenter("scrap_DEU", scrap_supply, 200.0, _Location(51, 10, "DEU"), production_cost=30.0),
+        ProcessCenter("limestone_DEU", limestone_supply, 500.0, _Location(50, 9, "DEU"), production_cost=1.0),
+        ProcessCenter("bf_DEU", bf, 300.0, _Location(50.0, 8.0, "DEU"), production_cost=20.0),
+        ProcessCenter("bf_ESP", bf, 300.0, _Location(40.0, -3.0, "ESP"), production_cost=25.0),
+        ProcessCenter("bof_DEU", bof, 150.0, _Location(50.01, 8.01, "DEU"), production_cost=15.0),
+        ProcessCenter(
+            "bof_ESP", bof, 150.0, _Location(40.02, -3.0, "ESP"), production_cost=12.0, soft_minimum_capacity=0.4
+        ),
+        ProcessCenter("bof_far", bof, 150.0, _Location(10.0, 100.0, "THA"), production_cost=5.0),
+        ProcessCenter("demand_DEU", demand, 180.0, _Location(48, 11, "DEU")),
+        ProcessCenter("demand_THA", demand, 90.0, _Location(13, 100, "THA")),
+    ]
+    model.add_commodities([iron_ore, hot_metal, pig_iron, scrap, limestone, steel])
+    model.add_processes([ore_supply, scrap_supply, limestone_supply, bf, bof, demand])
+    model.add_process_centers(centers)
+    model.add_bom_elements([bf_ore, *bof_boms])
+    model.add_process_connectors(
+        [
+            ProcessConnector(ore_supply, bf),
+            ProcessConnector(bf, bof),
+            ProcessConnector(scrap_supply, bof),
+            ProcessConnector(limestone_supply, bof),
+            ProcessConnector(bof, demand),
+        ]
+    )
+    model.allocation_distance_rules = rules
+    model.build_lp_model()
+    return model
+
+
+def _solve(model: TradeLPModel) -> tuple[float, dict[tuple[str, str, str], float]]:
+    result = model.solve_lp_model()
+    assert result.solver.termination_condition == pyo.TerminationCondition.optimal
+    if model.matrix_lp is not None:
+        objective = float(model.matrix_lp.col_cost @ model.matrix_lp.col_value)
+    else:
+        objective = pyo.value(model.lp_model.objective)
+    return objective, model.get_allocation_values(minimum=LP_EPSILON)
+
+
+@pytest.mark.parametrize("lp_backend", ["pyomo", "highs"])
+def test_pruned_generation_matches_fixing_to_zero(lp_backend):
+    fixed = _build_network(lp_backend, rules=None)
+    fix_to_zero_allocations_where_distance_doesnt_match_commodity(fixed, CONFIG)
+    pruned = _build_network(lp_backend, rules=build_allocation_distance_rules(CONFIG))
+
+    fixed_keys = set(fixed.lp_model.allocation_variables.keys())
+    pruned_keys = set(pruned.lp_model.allocation_variables.keys())
+    assert pruned_keys < fixed_keys
+    assert pruned.pruned_allocation_count == len(fixed_keys - pruned_keys)
+    assert all(fixed.lp_model.allocation_variables[key].fixed for key in fixed_keys - pruned_keys)
+    assert not any(key[2] == "hot_metal" and key[1] == "bof_far" for key in pruned_keys)
+
+    fixed_objective, _ = _solve(fixed)
+    pruned_objective, pruned_values = _solve(pruned)
+    assert pruned_objective == pytest.approx(fixed_objective, rel=1e-6)
+    assert pruned_values.get(("bof_far", "demand_THA", "steel"), 0.0) == pytest.approx(0.0, abs=LP_EPSILON)
+
+
+def test_set_legal_allocations_keeps_nested_loop_order():
+    model = _build_network("pyomo", rules=None)
+    expected = [
+        (from_pc, to_pc, commodity)
+        for from_pc in model.process_centers
+        if from_pc.process.type != ProcessType.DEMAND
+        for to_pc in model.process_centers
+        if any(c.from_process == from_pc.process and c.to_process == to_pc.process for c in model.process_connectors)
+        for commodity in from_pc.process.products
+        if commodity in {bom.commodity for bom in to_pc.process.bill_of_materials}
+    ]
+    expected += [
+        (from_pc, to_pc, commodity)
+        for from_pc in model.process_centers
+        if from_pc.process.type == ProcessType.SUPPLY
+        for to_pc in model.process_centers
+        if to_pc.process.type == ProcessType.PRODUCTION
+        and any(c.from_process == from_pc.process and c.to_process == to_pc.process for c in model.process_connectors)
+        for commodity in from_pc.process.products
+        if any(commodity in (bom.dependent_commodities or {}) for bom in to_pc.process.bill_of_materials)
+    ]
+
+    assert model.legal_allocations == expected
+
+
+def test_distance_rules_prefer_country_distance_table():
+    near = ProcessCenter("a", None, 1.0, _Location(0.0, 0.0, "AAA", {"BBB": 1.0}))
+    far = ProcessCenter("b", None, 1.0, _Location(0.0, 10.0, "BBB"))
+    same = ProcessCenter("c", None, 1.0, _Location(0.0, 0.01, "CCC"))
+    rules = AllocationDistanceRules(["hot_metal"], ["pig_iron"], hot_metal_radius=5.0)
+
+    local = rules.local_pairs([near], [far, same])
+
+    np.testing.assert_array_equal(local, [[True, True]])
+    np.testing.assert_array_equal(rules.blocked("pig_iron", local), [[True, True]])
+    np.testing.assert_array_equal(rules.blocked("steel", local), [[False, False]])
+
+
+def test_clustering_rules_block_cross_country_and_cross_plant_group():
+    config = SimpleNamespace(**vars(CONFIG), enable_furnace_group_clustering=True)
+    config.cluster_hot_metal_techs_by_plant_group = True
+    env = SimpleNamespace(
+        meta_furnace_groups=[
+            SimpleNamespace(meta_furnace_group_id="bf_1", plant_group_id="pg_1"),
+            SimpleNamespace(meta_furnace_group_id="bof_2", plant_group_id="pg_2"),
+        ]
+    )
+    rules = build_allocation_distance_rules(config, env)
+    bf = ProcessCenter("bf_1", None, 1.0, _Location(0, 0, "DEU"))
+    bofs = [
+        ProcessCenter("bof_1", None, 1.0, _Location(5, 5, "DEU")),
+        ProcessCenter("bof_2", None, 1.0, _Location(0, 0, "DEU")),
+        ProcessCenter("bof_3", None, 1.0, _Location(0, 0, "FRA")),
+        ProcessCenter("bof_4", None, 1.0, _Location(0, 0, None)),
+    ]
+
+    local = rules.local_pairs([bf], bofs)
+
+    np.testing.assert_array_equal(rules.blocked("hot_metal", local), [[False, True, True, True]])
+    assert not rules.applies_to("pig_iron")
@@ -0,0 +1,146 @@
+"""Unit tests for the pre-interpolated baseload LCOE cube."""
+
+import os
+import time
+from dataclasses import replace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from steelo.adapters.geospatial.baseload_lcoe_cube import (
+    MAX_CUBES_PER_COVERAGE,
+    evict_baseload_lcoe_cubes,
+    get_or_build_baseload_lcoe_cube,
+)
+from steelo.adapters.geospatial.geospatial_layers import add_baseload_power_price
+from steelo.domain.models import GeoDataPaths
+
+LAT = np.linspace(-60, 60, 4)
+LON = np.linspace(-180, 180, 5)
+
+
+def _write_source(directory, year, seed, with_factors=True):
+    rng = np.random.default_rng(seed)
+    shape = (len(LAT), len(LON))
+    data = {"lcoe": (("lat", "lon"), rng.uniform(30, 150, shape))}
+    if with_factors:
+        for factor in ["solar_factor", "wind_factor", "battery_factor"]:
+            data[factor] = (("lat", "lon"), rng.uniform(0, 3, shape))
+    path = directory / f"optimal_sol_GLOBAL_{year}_p15.nc"
+    xr.Dataset(data, coords={"lat": LAT, "lon": LON}).to_netcdf(path)
+    return path
+
+
+@pytest.fixture
+def file_map(tmp_path):
+    source_dir = tmp_path / "baseload_power_simulation" / "p15" / "GLOBAL"
+    source_dir.mkdir(parents=True)
+    return {year: _write_source(source_dir, year, seed) for seed, year in enumerate([2025, 2030, 2040])}
+
+
+@pytest.fixture
+def geo_paths(tmp_path, file_map):
+    return GeoDataPaths(
+        data_dir=tmp_path,
+        atlite_dir=tmp_path / "atlite",
+        geo_plots_dir=tmp_path / "plots",
+        terrain_nc_path=tmp_path / "terrain.nc",
+        rail_distance_nc_path=tmp_path / "rail.nc",
+        railway_capex_csv_path=tmp_path / "railway_capex.csv",
+        lcoh_capex_csv_path=tmp_path / "lcoh_capex.csv",
+        regional_energy_prices_xlsx=tmp_path / "energy_prices.xlsx",
+        countries_shapefile_dir=tmp_path / "countries",
+        disputed_areas_shapefile_dir=tmp_path / "disputed",
+        baseload_power_sim_dir=tmp_path / "baseload_power_simulation",
+        static_layers_dir=tmp_path / "static",
+        landtype_percentage_path=tmp_path / "landtype.nc",
+    )
+
+
+def _baseload_price(geo_paths, year):
+    ds = xr.Dataset(coords={"lat": LAT, "lon": LON})
+    ds["feasibility_mask"] = (("lat", "lon"), np.ones((len(LAT), len(LON))))
+    with (
+        patch("steelo.adapters.geospatial.geospatial_layers.plot_screenshot"),
+        patch("steelo.adapters.geospatial.geospatial_layers.plot_value_histogram"),
+    ):
+        return add_baseload_power_price(ds, 0.85, year, geo_paths=geo_paths, start_year=2025, end_year=2040)
+
+
+@pytest.mark.parametrize("year", [2025, 2027, 2030, 2033, 2040])
+def test_cube_matches_per_year_interpolation(geo_paths, tmp_path, year):
+    expected = _baseload_price(geo_paths, year)
+    actual = _baseload_price(replace(geo_paths, baseload_lcoe_cube_dir=tmp_path / "cube"), year)
+
+    assert (tmp_path / "cube" / "p15").is_dir()
+    for name in ["lcoe", "solar_factor", "wind_factor", "battery_factor"]:
+        np.testing.assert_allclose(actual[name].values, expected[name].values, rtol=1e-6)
+
+
+def test_cube_is_rebuilt_when_a_source_file_changes(tmp_path, file_map):
+    years = list(range(2025, 2041))
+    cube = get_or_build_baseload_lcoe_cube(tmp_path / "cube", 15, file_map, years)
+    assert get_or_build_baseload_lcoe_cube(tmp_path / "cube", 15, file_map, years).path == cube.path
+
+    _write_source(file_map[2030].parent, 2030, seed=99)
+    future = time.time_ns() + 10**9
+    os.utime(file_map[2030], ns=(future, future))
+    rebuilt = get_or_build_baseload_lcoe_cube(tmp_path / "cube", 15, file_map, years)
+
+    assert rebuilt.path != cube.path
+    assert cube.path.exists()  # Recently used, so possibly still mapped by another run
+    source = xr.open_dataset(file_map[2030])
+    np.testing.assert_array_equal(rebuilt.read_year(2030)["lcoe"].values, source["lcoe"].values)
+    source.close()
+
+
+def test_years_outside_calculated_range_are_nan(tmp_path, file_map):
+    cube = get_or_build_baseload_lcoe_cube(tmp_path / "cube", 15, file_map, list(range(2020, 2046)))
+
+    assert np.isnan(cube.read_year(2020)["lcoe"].values).all()
+    assert np.isnan(cube.read_year(2045)["lcoe"].values).all()
+    assert not np.isnan(cube.read_year(2035)["lcoe"].values).any()
+
+
+def test_overbuild_factors_require_all_sources(tmp_path, file_map):
+    _write_source(file_map[2040].parent, 2040, seed=5, with_factors=False)
+
+    cube = get_or_build_baseload_lcoe_cube(tmp_path / "cube", 15, file_map, list(range(2025, 2041)))
+
+    assert cube.variables == ["lcoe"]
+
+
+def _age(cube, seconds):
+    past = time.time() - seconds
+    os.utime(cube.path / "manifest.json", (past, past))
+
+
+def test_cubes_of_different_horizons_coexist(tmp_path, file_map):
+    short = get_or_build_baseload_lcoe_cube(tmp_path / "cube", 15, file_map, list(range(2025, 2041)))
+    long = get_or_build_baseload_lcoe_cube(tmp_path / "cube", 15, file_map, list(range(2025, 2051)))
+    _age(short, 7200)
+    _age(long, 7200)
+
+    # Alternating runs reuse both cubes instead of rebuilding them
+    assert get_or_build_baseload_lcoe_cube(tmp_path / "cube", 15, file_map, list(range(2025, 2041))).path == short.path
+    assert get_or_build_baseload_lcoe_cube(tmp_path / "cube", 15, file_map, list(range(2025, 2051))).path == long.path
+    assert short.path.exists() and long.path.exists()
+    np.testing.assert_array_equal(short.read_year(2030)["lcoe"].values, long.read_year(2030)["lcoe"].values)
+
+
+def test_least_recently_used_cubes_are_evicted(tmp_path, file_map):
+    cubes = [
+        get_or_build_baseload_lcoe_cube(tmp_path / "cube", 15, file_map, list(range(2025, end_year)))
+        for end_year in range(2041, 2042 + MAX_CUBES_PER_COVERAGE)
+    ]
+    assert all(cube.path.exists() for cube in cubes)  # All used within the grace period
+
+    for age, cube in enumerate(cubes):
+        _age(cube, 7200 - age)
+    _age(cubes[0], 60)  # Still in use by a running simulation
+
+    assert evict_baseload_lcoe_cubes(tmp_path / "cube" / "p15") == 1
+    assert not cubes[1].path.exists()
+    assert all(cube.path.exists() for i, cube in enumerate(cubes) if i != 1)
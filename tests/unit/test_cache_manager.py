@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from steelo.data.cache_manager import DataPreparationCache, get_preparation_hash
+from steelo.data.cache_manager import DataPreparationCache, get_preparation_hash, stale_outputs
 
 
 def test_hash_generation_consistent(tmp_path):
@@ -256,3 +256,72 @@ def test_cache_version_invalidation(tmp_path):
 
     # Should not find cache with different version
     assert cache_manager.get_cached_preparation(sample_file) is None
+
+
+def test_stale_outputs_follow_changed_sheets_and_derived_files():
+    """Only outputs read from changed sheets, and outputs derived from them, are stale."""
+    manifest = {
+        "sheets": {"Iron and steel plants": "a1", "Tariffs": "b1", "CBAM": "c1"},
+        "outputs": {
+            "fixtures/plants.json": {"sheets": ["Iron and steel plants"], "inputs": []},
+            "fixtures/plant_groups.json": {"sheets": [], "inputs": ["plants.json"]},
+            "fixtures/tariffs.json": {"sheets": ["Tariffs"], "inputs": []},
+            "fixtures/carbon_border_mechanisms.json": {"sheets": ["CBAM"], "inputs": []},
+            "fixtures/subsidies.json": {"sheets": None, "inputs": []},
+        },
+    }
+
+    stale = stale_outputs(manifest, {"Iron and steel plants": "a2", "Tariffs": "b1", "CBAM": None})
+
+    assert stale == {
+        "fixtures/plants.json": ["sheet 'Iron and steel plants' changed"],
+        "fixtures/plant_groups.json": ["depends on plants.json"],
+        "fixtures/carbon_border_mechanisms.json": ["sheet 'CBAM' was removed"],
+        "fixtures/subsidies.json": ["dependencies were not recorded"],
+    }
+
+
+def _write_master_excel(path, tariff):
+    import pandas as pd
+
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame({"Plant ID": ["P1", "P2"]}).to_excel(writer, sheet_name="Iron and steel plants", index=False)
+        pd.DataFrame({"From": ["DEU"], "Tariff": [tariff]}).to_excel(writer, sheet_name="Tariffs", index=False)
+
+
+def test_find_stale_outputs_compares_sheets_with_latest_cached_preparation(tmp_path):
+    """Changing one sheet makes only the outputs read from it stale."""
+    from steelo.adapters.dataprocessing.workbook_session import WorkbookSession
+    from steelo.data.preparation import FileSource, PreparationResult, PreparedFile
+
+    cache_manager = DataPreparationCache(cache_root=tmp_path / "cache")
+    master_excel = tmp_path / "master_input.xlsx"
+    _write_master_excel(master_excel, tariff=0.1)
+
+    source_dir = tmp_path / "data"
+    (source_dir / "fixtures").mkdir(parents=True)
+    result = PreparationResult(master_excel_path=master_excel)
+    for filename, sheet in [("plants.json", "Iron and steel plants"), ("tariffs.json", "Tariffs")]:
+        path = source_dir / "fixtures" / filename
+        path.write_text("{}")
+        result.add_file(PreparedFile(filename, FileSource.MASTER_EXCEL, sheet, 0.0, path, sheets=[sheet]))
+    result.add_file(
+        PreparedFile("countries.csv", FileSource.CORE_DATA, "", 0.0, source_dir / "fixtures" / "countries.csv")
+    )
+    with WorkbookSession(master_excel) as workbook:
+        result.sheet_hashes = {sheet: workbook.sheet_hash(sheet) for sheet in ["Iron and steel plants", "Tariffs"]}
+    cache_manager.save_preparation(source_dir, master_excel, 1.0, result=result)
+
+    # Rewriting identical values changes the file bytes but no sheet content
+    _write_master_excel(master_excel, tariff=0.1)
+    unchanged = cache_manager.find_stale_outputs(master_excel)
+    assert unchanged is not None
+    assert unchanged.stale == {}
+    assert sorted(unchanged.fresh) == ["fixtures/plants.json", "fixtures/tariffs.json"]
+
+    _write_master_excel(master_excel, tariff=0.25)
+    changed = cache_manager.find_stale_outputs(master_excel)
+    assert changed is not None
+    assert changed.stale == {"fixtures/tariffs.json": ["sheet 'Tariffs' changed"]}
+    assert changed.fresh == ["fixtures/plants.json"]
+    assert changed.data_dir == cache_manager.cache_root / f"prep_{changed.base_key}" / "data"
@@ -0,0 +1,87 @@
+"""Unit tests for the array-backed cost curve."""
+
+import numpy as np
+import pytest
+
+from steelo.domain.cost_curve import CostCurve
+
+
+def _walk(entries, demand):
+    """Linear merit-order walk, as the price lookup did before the curve was array-backed."""
+    for entry in entries:
+        if entry["cumulative_capacity"] >= demand:
+            return entry["production_cost"]
+    return entries[-1]["production_cost"]
+
+
+def test_curve_sorts_by_cost_and_accumulates_capacity():
+    curve = CostCurve(unit_costs=[300.0, 100.0, 200.0], capacities=[10.0, 20.0, 30.0], furnace_group_ids="abc")
+
+    assert curve == [
+        {"cumulative_capacity": 20.0, "production_cost": 100.0},
+        {"cumulative_capacity": 50.0, "production_cost": 200.0},
+        {"cumulative_capacity": 60.0, "production_cost": 300.0},
+    ]
+    assert curve[-1]["cumulative_capacity"] == curve.total_capacity == 60.0
+    assert list(curve.furnace_group_ids) == ["b", "c", "a"]
+    with pytest.raises(ValueError):
+        curve.unit_costs[0] = 0.0
+
+
+def test_binary_search_prices_match_linear_walk():
+    rng = np.random.default_rng(7)
+    curve = CostCurve(rng.uniform(300, 700, 200), rng.uniform(1e5, 5e6, 200), [f"fg_{i}" for i in range(200)])
+    entries = list(curve)
+    # Random demand levels, including some above the total capacity and some exactly on an entry
+    exact = [entry["cumulative_capacity"] for entry in entries[:5]]
+    demands = np.append(rng.uniform(0, curve.total_capacity * 1.1, 500), exact)
+
+    prices = curve.merit_order_prices(demands)
+
+    assert prices.tolist() == [_walk(entries, demand) for demand in demands]
+
+
+def test_clearing_prices_apply_shortage_premium_above_share():
+    curve = CostCurve(unit_costs=[100.0, 200.0, 300.0], capacities=[40.0, 40.0, 20.0], furnace_group_ids="abc")
+
+    assert curve.dispatchable_count(0.9) == 2
+    # 85 lands inside the boundary furnace but below the 90% threshold, so it clears at that furnace's cost
+    prices = curve.clearing_prices([10.0, 60.0, 85.0, 95.0, 150.0], share=0.9, buffer=50.0)
+    assert prices.tolist() == [100.0, 200.0, 300.0, 250.0, 250.0]
+    # No entry within a degenerate share: full-curve merit order, premium only beyond total capacity
+    assert curve.clearing_prices([95.0, 150.0], share=0.1, buffer=50.0).tolist() == [300.0, 350.0]
+
+
+def test_incremental_updates_match_rebuilt_curve():
+    rng = np.random.default_rng(3)
+    ids = [f"fg_{i:03d}" for i in range(60)]
+    costs = dict(zip(ids, rng.choice([400.0, 450.0, 500.0, 550.0], len(ids))))
+    capacities = dict(zip(ids, rng.uniform(1.0, 10.0, len(ids))))
+    curve = CostCurve(costs.values(), capacities.values(), costs.keys())
+
+    for fg_id in rng.choice(ids, 40):
+        if rng.random() < 0.3:
+            curve.discard(fg_id)
+            costs.pop(fg_id, None)
+            capacities.pop(fg_id, None)
+        else:
+            costs[fg_id], capacities[fg_id] = float(rng.choice([425.0, 450.0, 600.0])), float(rng.uniform(1, 10))
+            curve.upsert(fg_id, costs[fg_id], capacities[fg_id])
+
+    rebuilt = CostCurve(costs.values(), capacities.values(), costs.keys())
+    assert list(curve.furnace_group_ids) == list(rebuilt.furnace_group_ids)
+    np.testing.assert_allclose(curve.cumulative_capacities, rebuilt.cumulative_capacities)
+    assert not curve.discard("unknown")
+
+
+def test_curve_from_plain_entries_keeps_order():
+    entries = [
+        {"cumulative_capacity": 100.0, "production_cost": 400.0},
+        {"cumulative_capacity": 250.0, "production_cost": 500.0},
+    ]
+
+    curve = CostCurve.coerce(entries)
+
+    assert curve == entries
+    assert CostCurve.coerce(curve) is curve
+    assert curve.merit_order_prices([50.0, 200.0, 300.0]).tolist() == [400.0, 500.0, 500.0]
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from steelo.adapters.geospatial.geospatial_toolbox import haversine_distance
+from steelo.domain.distance_matrix import DistanceMatrix
+from steelo.domain.models import Location
+from steelo.domain.trade_modelling.trade_lp_modelling import ProcessCenter
+
+
+def _location(lat, lon, iso3, table=None):
+    return Location(lat=lat, lon=lon, country=iso3, region="", iso3=iso3, distance_to_other_iso3=table)
+
+
+@pytest.fixture
+def locations():
+    deu_table = {"FRA": 650.0, "DEU": 0.0}
+    return [
+        _location(52.52, 13.40, "DEU", deu_table),
+        _location(48.14, 11.58, "DEU", deu_table),
+        _location(48.86, 2.35, "FRA"),
+        _location(40.42, -3.70, "ESP"),
+    ]
+
+
+def test_haversine_block_matches_scalar_haversine(locations):
+    matrix = DistanceMatrix()
+
+    block = matrix.haversine(locations, locations)
+
+    expected = [[haversine_distance([a.lat, a.lon, b.lat, b.lon]) for b in locations] for a in locations]
+    np.testing.assert_allclose(block, expected, rtol=1e-6, atol=1e-3)
+
+
+def test_pref_economic_matches_process_center_distance(locations):
+    matrix = DistanceMatrix()
+    centers = [ProcessCenter(f"pc_{i}", None, 1.0, location) for i, location in enumerate(locations)]
+
+    block = matrix.pref_economic(locations, locations)
+
+    expected = [[a.distance_to_other_processcenter(b) for b in centers] for a in centers]
+    np.testing.assert_allclose(block, expected, rtol=1e-6, atol=1e-3)
+    assert matrix.distance(locations[0], locations[2]) == 650.0
+    assert matrix.distance(locations[2], locations[3]) == pytest.approx(expected[2][3], rel=1e-6)
+
+
+def test_new_locations_extend_the_matrix_incrementally(locations):
+    matrix = DistanceMatrix()
+    matrix.indices(locations[:3])
+    assert matrix.computed_pairs == 9
+
+    positions = matrix.indices([locations[3], locations[0]])
+
+    assert positions.tolist() == [3, 0]
+    assert len(matrix) == 4
+    assert matrix.computed_pairs == 16
+    np.testing.assert_allclose(
+        matrix.haversine(locations, locations), DistanceMatrix().haversine(locations, locations), rtol=1e-6
+    )
+
+
+def test_missing_coordinates_share_one_nan_row(locations):
+    matrix = DistanceMatrix()
+    missing = [_location(None, None, "XXX"), _location(float("nan"), 1.0, "YYY")]
+
+    positions = matrix.indices([*missing, locations[0]])
+
+    assert positions[0] == positions[1]
+    assert np.isnan(matrix.haversine(missing, [locations[0]])).all()
+
+
+def test_save_and_memory_mapped_load_round_trip(tmp_path, locations):
+    assert DistanceMatrix.load(tmp_path) is None
+    matrix = DistanceMatrix()
+    expected = matrix.pref_economic(locations[:3], locations[:3])
+    matrix.save(tmp_path)
+
+    loaded = DistanceMatrix.load(tmp_path)
+
+    assert loaded is not None
+    assert len(loaded) == 3 and loaded.persisted_size == 3
+    np.testing.assert_array_equal(loaded.pref_economic(locations[:3], locations[:3]), expected)
+    assert loaded.computed_pairs == 0
+
+    # Extending a read-only memory-mapped matrix copies it into memory first
+    np.testing.assert_allclose(
+        loaded.haversine(locations, locations), DistanceMatrix().haversine(locations, locations), rtol=1e-6
+    )
+    assert loaded.computed_pairs == 16 - 9
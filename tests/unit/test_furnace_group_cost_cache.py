@@ -0,0 +1,114 @@
+import pytest
+
+from steelo.domain import Year, calculate_costs, models
+from steelo.domain.models import FurnaceGroup, PointInTime, PrimaryFeedstock, Technology, TimeFrame
+
+
+def _bom(coke_cost: float = 100.0) -> dict[str, dict[str, dict[str, float]]]:
+    return {
+        "materials": {
+            "io_low": {"demand": 1400.0, "total_cost": 1400.0 * 90.0, "unit_cost": 90.0, "product_volume": 800.0}
+        },
+        "energy": {
+            "io_low": {
+                "demand": 800.0,
+                "total_cost": 800.0 * coke_cost,
+                "unit_cost": coke_cost,
+                "product_volume": 800.0,
+            }
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def _no_debug_mode(monkeypatch):
+    monkeypatch.setattr(models, "COST_CACHE_DEBUG", False)
+
+
+@pytest.fixture
+def furnace_group() -> FurnaceGroup:
+    fg = FurnaceGroup(
+        furnace_group_id="fg1",
+        capacity=1000.0,
+        status="operating",
+        last_renovation_date=None,
+        technology=Technology(
+            name="BF",
+            product="hot_metal",
+            capex=500.0,
+            dynamic_business_case=[PrimaryFeedstock(metallic_charge="IO_low", reductant="Coke", technology="BF")],
+        ),
+        historical_production={},
+        utilization_rate=0.8,
+        lifetime=PointInTime(
+            current=Year(2030), time_frame=TimeFrame(start=Year(2025), end=Year(2045)), plant_lifetime=20
+        ),
+        bill_of_materials=_bom(),
+        tech_unit_fopex=40.0,
+    )
+    fg.set_energy_costs(electricity=0.05, coke=0.1)
+    return fg
+
+
+def _fresh_unit_production_cost(fg: FurnaceGroup) -> float:
+    fg.invalidate_cost_cache()
+    return fg.unit_production_cost
+
+
+def test_unit_costs_are_computed_once(furnace_group, mocker):
+    vopex = mocker.spy(calculate_costs, "calculate_variable_opex")
+    first = furnace_group.unit_production_cost
+
+    assert furnace_group.unit_production_cost == first
+    assert furnace_group.unit_total_opex == furnace_group.unit_total_opex
+    assert furnace_group.unit_vopex == furnace_group.unit_vopex
+    assert vopex.call_count == 1
+
+
+def test_rebinding_cost_inputs_invalidates_the_cache(furnace_group):
+    cost = furnace_group.unit_production_cost
+
+    furnace_group.utilization_rate = 0.5
+    assert furnace_group.unit_production_cost != cost
+
+    cost = furnace_group.unit_production_cost
+    furnace_group.bill_of_materials = _bom(coke_cost=150.0)
+    assert furnace_group.unit_production_cost == pytest.approx(cost + 800.0 * 50.0 / 800.0)
+
+    furnace_group.set_energy_costs(electricity=0.05, coke=0.2, slag=-5.0)
+    assert "_cost_cache" not in vars(furnace_group)
+
+    furnace_group.unit_production_cost
+    furnace_group.status = "idle"
+    assert "_cost_cache" not in vars(furnace_group)
+
+
+def test_in_place_changes_need_explicit_invalidation(furnace_group):
+    cost = furnace_group.unit_production_cost
+    furnace_group.bill_of_materials["energy"]["io_low"]["total_cost"] *= 2
+
+    assert furnace_group.unit_production_cost == cost
+    furnace_group.invalidate_cost_cache()
+    assert furnace_group.unit_production_cost > cost
+
+
+def test_year_advance_invalidates_the_debt_repayment(furnace_group):
+    repayment = furnace_group.unit_current_debt_repayment
+
+    furnace_group.lifetime.current = Year(2031)
+    assert furnace_group.unit_current_debt_repayment == repayment
+    furnace_group.invalidate_cost_cache()
+
+    # Interest is charged on the declining balance, so the repayment falls every year
+    assert furnace_group.unit_current_debt_repayment < repayment
+
+
+def test_debug_mode_detects_stale_values(furnace_group, monkeypatch):
+    furnace_group.unit_production_cost
+    monkeypatch.setattr(models, "COST_CACHE_DEBUG", True)
+    assert furnace_group.unit_production_cost == _fresh_unit_production_cost(furnace_group)
+
+    furnace_group.bill_of_materials["energy"]["io_low"]["total_cost"] *= 2
+
+    with pytest.raises(AssertionError, match="Stale cached unit_vopex for FurnaceGroup fg1"):
+        furnace_group.unit_production_cost
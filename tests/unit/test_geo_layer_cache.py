@@ -0,0 +1,174 @@
+"""Unit tests for the persistent cross-run geo layer cache."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from steelo.adapters.geospatial.layer_cache import GeoLayerCache
+from steelo.entrypoints.cache_cli import steelo_cache
+
+
+@pytest.fixture
+def terrain_file(tmp_path):
+    path = tmp_path / "inputs" / "terrain.nc"
+    path.parent.mkdir()
+    path.write_bytes(b"terrain v1")
+    return path
+
+
+@pytest.fixture
+def layer_cache(tmp_path):
+    return GeoLayerCache(tmp_path / "geo_layer_cache")
+
+
+def test_key_depends_on_input_content_and_params(layer_cache, terrain_file):
+    key = layer_cache.key("feasibility_mask", [terrain_file], {"max_slope": 2.0})
+
+    assert key == layer_cache.key("feasibility_mask", [terrain_file], {"max_slope": 2.0})
+    assert key != layer_cache.key("feasibility_mask", [terrain_file], {"max_slope": 3.0})
+    assert key != layer_cache.key("rail_cost", [terrain_file], {"max_slope": 2.0})
+
+    terrain_file.write_bytes(b"terrain v2")
+    os.utime(terrain_file, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    assert key != layer_cache.key("feasibility_mask", [terrain_file], {"max_slope": 2.0})
+
+
+def test_key_hashes_directories_by_content(layer_cache, tmp_path):
+    shapes = tmp_path / "shapes"
+    shapes.mkdir()
+    (shapes / "countries.shp").write_bytes(b"shape")
+    key = layer_cache.key("global_grid_with_iso3", [shapes], {"resolution": 1.0})
+
+    copy = tmp_path / "elsewhere" / "shapes"
+    copy.mkdir(parents=True)
+    (copy / "countries.shp").write_bytes(b"shape")
+    assert layer_cache.key("global_grid_with_iso3", [copy], {"resolution": 1.0}) == key
+
+
+def test_get_or_create_builds_once(layer_cache):
+    calls = []
+
+    def build(target):
+        calls.append(target)
+        target.write_bytes(b"layer")
+
+    first = layer_cache.get_or_create("rail_cost", "abc", build)
+    second = layer_cache.get_or_create("rail_cost", "abc", build)
+
+    assert first == second
+    assert first.read_bytes() == b"layer"
+    assert len(calls) == 1
+    # The temporary build file is moved into place, nothing else is left behind
+    assert [p.name for p in first.parent.iterdir()] == ["abc.nc"]
+
+
+def test_failed_build_leaves_no_entry(layer_cache):
+    def build(target):
+        target.write_bytes(b"partial")
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        layer_cache.get_or_create("rail_cost", "abc", build)
+
+    assert layer_cache.get("rail_cost", "abc") is None
+    assert layer_cache.entries() == []
+    assert list((layer_cache.cache_root / ".locks").iterdir()) == []
+
+
+def test_put_copies_source(layer_cache, tmp_path):
+    source = tmp_path / "feasibility_mask.nc"
+    source.write_bytes(b"mask")
+
+    cached = layer_cache.put("feasibility_mask", "k1", source)
+
+    assert cached.read_bytes() == b"mask"
+    assert layer_cache.get("feasibility_mask", "k1") == cached
+
+
+def test_evicts_least_recently_used_above_size_bound(layer_cache, tmp_path):
+    for i, key in enumerate(["old", "used", "new"]):
+        path = layer_cache.put("layer", key, _source(tmp_path, key, b"x" * 10))
+        os.utime(path, (1000 + i, 1000 + i))
+    # A hit refreshes the entry, so "old" and "new" are now the least recently used ones
+    layer_cache.get("layer", "used")
+
+    assert layer_cache.evict(max_size_bytes=10) == 2
+    assert [entry.key for entry in layer_cache.entries()] == ["used"]
+
+
+def test_put_keeps_cache_within_size_bound(tmp_path):
+    layer_cache = GeoLayerCache(tmp_path / "cache", max_size_gb=25 / 1024**3)
+    for key in ["first", "second", "third"]:
+        layer_cache.put("layer", key, _source(tmp_path, key, b"x" * 10))
+        time.sleep(0.01)
+
+    assert [entry.key for entry in layer_cache.entries()] == ["second", "third"]
+
+
+def test_evict_older_than_days(layer_cache, tmp_path):
+    stale = layer_cache.put("layer", "stale", _source(tmp_path, "stale", b"x"))
+    layer_cache.put("layer", "fresh", _source(tmp_path, "fresh", b"x"))
+    ten_days_ago = time.time() - 10 * 86400
+    os.utime(stale, (ten_days_ago, ten_days_ago))
+
+    assert layer_cache.evict(older_than_days=5) == 1
+    assert [entry.key for entry in layer_cache.entries()] == ["fresh"]
+
+    stats = layer_cache.get_cache_stats()
+    assert stats["total_entries"] == 1
+    assert stats["entries_per_layer"] == {"layer": 1}
+
+
+def test_abandoned_lock_is_broken(layer_cache):
+    lock_dir = layer_cache.cache_root / ".locks"
+    lock_dir.mkdir()
+    lock_path = lock_dir / "layer_abc.lock"
+    lock_path.write_text("12345")
+    long_ago = time.time() - 2 * GeoLayerCache.LOCK_TIMEOUT_SECONDS
+    os.utime(lock_path, (long_ago, long_ago))
+
+    path = layer_cache.get_or_create("layer", "abc", lambda target: target.write_bytes(b"layer"))
+
+    assert path.read_bytes() == b"layer"
+    assert not lock_path.exists()
+
+
+def test_lock_heartbeat_keeps_a_long_build_alive(layer_cache, monkeypatch):
+    monkeypatch.setattr(GeoLayerCache, "LOCK_HEARTBEAT_SECONDS", 0.01)
+    lock_path = layer_cache.cache_root / ".locks" / "layer_abc.lock"
+    long_ago = time.time() - 2 * GeoLayerCache.LOCK_TIMEOUT_SECONDS
+
+    def slow_build(target):
+        os.utime(lock_path, (long_ago, long_ago))
+        deadline = time.time() + 5
+        while time.time() - lock_path.stat().st_mtime > GeoLayerCache.LOCK_TIMEOUT_SECONDS:
+            assert time.time() < deadline, "lock mtime was not refreshed during the build"
+            time.sleep(0.01)
+        target.write_bytes(b"layer")
+
+    path = layer_cache.get_or_create("layer", "abc", slow_build)
+
+    assert path.read_bytes() == b"layer"
+    assert not lock_path.exists()
+
+
+def test_cli_prunes_geo_layers(layer_cache, tmp_path):
+    stale = layer_cache.put("rail_cost", "stale", _source(tmp_path, "stale", b"x"))
+    layer_cache.put("rail_cost", "fresh", _source(tmp_path, "fresh", b"x"))
+    ten_days_ago = time.time() - 10 * 86400
+    os.utime(stale, (ten_days_ago, ten_days_ago))
+
+    argv = ["steelo-cache", "geo-layers", "prune", "--older-than-days", "5", "--cache-dir", str(layer_cache.cache_root)]
+    with patch("sys.argv", argv), patch("steelo.entrypoints.cache_cli.Console"):
+        result = steelo_cache()
+
+    assert result == "Cache geo-layers prune completed"
+    assert [entry.key for entry in layer_cache.entries()] == ["fresh"]
+
+
+def _source(tmp_path, name, content):
+    path = tmp_path / f"{name}.src"
+    path.write_bytes(content)
+    return path
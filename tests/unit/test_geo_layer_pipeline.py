@@ -0,0 +1,104 @@
+"""Unit tests for the incremental GEO layer pipeline."""
+
+import pickle
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from steelo.adapters.geospatial.layer_pipeline import GeoLayer, GeoLayerPipeline
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+def _layers(calls, transport_enabled=True):
+    def add_grid(ds):
+        calls.append("grid")
+        return xr.Dataset(coords={"lat": [0.0, 1.0], "lon": [0.0, 1.0]})
+
+    def add_price(ds):
+        calls.append("price")
+        ds["price"] = (("lat", "lon"), np.full((2, 2), float(len(calls))))
+        return ds
+
+    def add_transport(ds):
+        calls.append("transport")
+        # Layers merging new variables into the dataset must not conflict with their previous result
+        return xr.merge([ds, (ds["price"] * 2).rename("transport_cost")])
+
+    return [
+        GeoLayer("grid", add_grid, inputs=("static",)),
+        GeoLayer("price", add_price, inputs=("year",), depends_on=("grid",)),
+        GeoLayer(
+            "transport",
+            add_transport,
+            inputs=("plants",),
+            depends_on=("price",),
+            enabled=transport_enabled,
+        ),
+    ]
+
+
+def test_unchanged_inputs_reuse_all_layers(calls):
+    pipeline = GeoLayerPipeline()
+    inputs = {"static": "paths", "year": 2030, "plants": "abc"}
+
+    first = pipeline.run(_layers(calls), inputs)
+    second = pipeline.run(_layers(calls), inputs)
+
+    assert calls == ["grid", "price", "transport"]
+    assert second is first
+    assert pipeline.stats["price"].hits == 1
+    assert pipeline.stats["price"].misses == 1
+
+
+def test_changed_input_recomputes_layer_and_downstream_layers(calls):
+    pipeline = GeoLayerPipeline()
+    pipeline.run(_layers(calls), {"static": "paths", "year": 2030, "plants": "abc"})
+    calls.clear()
+
+    ds = pipeline.run(_layers(calls), {"static": "paths", "year": 2031, "plants": "abc"})
+
+    assert calls == ["price", "transport"]
+    np.testing.assert_array_equal(ds["transport_cost"].values, 2 * ds["price"].values)
+
+
+def test_changed_plants_only_recompute_transport(calls):
+    pipeline = GeoLayerPipeline()
+    pipeline.run(_layers(calls), {"static": "paths", "year": 2030, "plants": "abc"})
+    calls.clear()
+
+    pipeline.run(_layers(calls), {"static": "paths", "year": 2030, "plants": "abd"})
+
+    assert calls == ["transport"]
+
+
+def test_disabled_layer_is_skipped(calls):
+    ds = GeoLayerPipeline().run(_layers(calls, transport_enabled=False), {"static": "paths", "year": 2030})
+
+    assert calls == ["grid", "price"]
+    assert "transport_cost" not in ds
+
+
+def test_layers_must_be_listed_after_their_dependencies(calls):
+    layers = list(reversed(_layers(calls)))
+
+    with pytest.raises(ValueError, match="must be listed before it"):
+        GeoLayerPipeline().run(layers, {"static": "paths", "year": 2030, "plants": "abc"})
+    assert calls == []
+
+
+def test_pickled_pipeline_drops_dataset_and_recomputes(calls):
+    pipeline = GeoLayerPipeline()
+    inputs = {"static": "paths", "year": 2030, "plants": "abc"}
+    pipeline.run(_layers(calls), inputs)
+
+    restored = pickle.loads(pickle.dumps(pipeline))
+    assert restored.dataset is None
+    calls.clear()
+
+    restored.run(_layers(calls), inputs)
+    assert calls == ["grid", "price", "transport"]
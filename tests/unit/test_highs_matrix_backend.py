@@ -0,0 +1,214 @@
+import pickle
+
+import pyomo.environ as pyo
+import pytest
+
+from steelo.domain.constants import LP_EPSILON
+from steelo.domain.trade_modelling.highs_matrix_backend import (
+    HighsMatrixLP,
+    MatrixColumnSet,
+    PersistentHighsSolver,
+)
+from steelo.domain.trade_modelling.trade_lp_modelling import (
+    BOMElement,
+    Commodity,
+    MaterialParameters,
+    Process,
+    ProcessCenter,
+    ProcessConnector,
+    ProcessType,
+    TradeLPModel,
+)
+
+
+class _Location:
+    def __init__(self, lat, lon, iso3):
+        self.lat = lat
+        self.lon = lon
+        self.iso3 = iso3
+        self.distance_to_other_iso3 = {}
+
+
+def _build_trade_lp(
+    lp_backend: str,
+    fix_arc: tuple[str, str, str] | None = None,
+    demand_scale: float = 1.0,
+    plants: tuple[str, ...] = ("bof_CHN", "bof_DEU"),
+) -> TradeLPModel:
+    """Small but complete network: ore/scrap/limestone suppliers -> two BOF-like plants -> two demand centers.
+
+    Exercises production, demand (with slack), BOM inflow, min/max ratios, dependent commodities, soft minimum
+    capacity, trade quotas and tariffs so both backends have to agree on every constraint family.
+    """
+    model = TradeLPModel(lp_epsilon=LP_EPSILON, random_seed=42, lp_backend=lp_backend)
+
+    iron_ore = Commodity("iron_ore")
+    scrap = Commodity("scrap")
+    limestone = Commodity("limestone")
+    steel = Commodity("steel")
+
+    bom_ore = BOMElement(
+        name="ore_to_steel",
+        commodity=iron_ore,
+        output_commodities=[steel],
+        parameters={MaterialParameters.INPUT_RATIO.value: 1.5, MaterialParameters.MINIMUM_RATIO.value: 0.3},
+        dependent_commodities={limestone: 0.2},
+        energy_cost=5.0,
+    )
+    bom_scrap = BOMElement(
+        name="scrap_to_steel",
+        commodity=scrap,
+        output_commodities=[steel],
+        parameters={MaterialParameters.INPUT_RATIO.value: 1.1, MaterialParameters.MAXIMUM_RATIO.value: 0.4},
+        energy_cost=2.0,
+    )
+
+    ore_supply, scrap_supply, limestone_supply = (
+        Process(
+            f"{commodity.name}_supply",
+            ProcessType.SUPPLY,
+            [BOMElement(f"{commodity.name}_supply", commodity, [commodity], {})],
+        )
+        for commodity in (iron_ore, scrap, limestone)
+    )
+    bof = Process("BOF", ProcessType.PRODUCTION, [bom_ore, bom_scrap])
+    demand = Process("demand", ProcessType.DEMAND, [BOMElement("steel_demand", steel, [steel], {})])
+
+    bof_centers = {
+        "bof_CHN": ProcessCenter("bof_CHN", bof, 150.0, _Location(31, 121, "CHN"), production_cost=40.0),
+        "bof_DEU": ProcessCenter(
+            "bof_DEU", bof, 120.0, _Location(52, 7, "DEU"), production_cost=70.0, soft_minimum_capacity=0.5
+        ),
+        "bof_BRA": ProcessCenter("bof_BRA", bof, 100.0, _Location(-20, -44, "BRA"), production_cost=35.0),
+    }
+    centers = [
+        ProcessCenter("ore_AUS", ore_supply, 300.0, _Location(-25, 135, "AUS"), production_cost=10.0),
+        ProcessCenter("ore_BRA", ore_supply, 200.0, _Location(-10, -50, "BRA"), production_cost=12.0),
+        ProcessCenter("scrap_DEU", scrap_supply, 60.0, _Location(51, 10, "DEU"), production_cost=20.0),
+        ProcessCenter("limestone_CHN", limestone_supply, 500.0, _Location(35, 105, "CHN"), production_cost=1.0),
+        *(bof_centers[name] for name in plants),
+        ProcessCenter("demand_CHN", demand, 140.0 * demand_scale, _Location(39, 116, "CHN")),
+        ProcessCenter("demand_DEU", demand, 170.0 * demand_scale, _Location(48, 11, "DEU")),
+    ]
+
+    model.add_commodities([iron_ore, scrap, limestone, steel])
+    model.add_processes([ore_supply, scrap_supply, limestone_supply, bof, demand])
+    model.add_process_centers(centers)
+    model.add_bom_elements([bom_ore, bom_scrap])
+    model.add_process_connectors(
+        [
+            ProcessConnector(ore_supply, bof),
+            ProcessConnector(scrap_supply, bof),
+            ProcessConnector(limestone_supply, bof),
+            ProcessConnector(bof, demand),
+        ]
+    )
+    model.add_tariff_information(
+        quota_dict={("AUS", "CHN", "iron_ore"): 90.0},
+        tax_dict={("CHN", "DEU", "steel"): 15.0},
+    )
+
+    model.build_lp_model()
+    if fix_arc is not None:
+        model.lp_model.allocation_variables[fix_arc].fix(0)
+    return model
+
+
+def _solve(model: TradeLPModel) -> tuple[float, dict[tuple[str, str, str], float]]:
+    result = model.solve_lp_model()
+    assert result.solver.termination_condition == pyo.TerminationCondition.optimal
+    values = model.get_allocation_values()
+    costs = model.lp_model.allocation_costs
+    total_cost = sum(costs[key] * value for key, value in values.items())
+    return total_cost, values
+
+
+def test_highs_backend_builds_matrix_columns():
+    model = _build_trade_lp("highs")
+
+    assert isinstance(model.lp_model.allocation_variables, MatrixColumnSet)
+    assert isinstance(model.matrix_lp, HighsMatrixLP)
+    assert model.matrix_lp.num_col == (
+        len(model.lp_model.allocation_variables)
+        + len(model.lp_model.demand_slack_variable)
+        + len(model.lp_model.minimum_capacity_slack_variable)
+    )
+    assert model.matrix_lp.num_row > 0
+
+
+@pytest.mark.parametrize("fix_arc", [None, ("ore_AUS", "bof_DEU", "iron_ore")])
+def test_highs_backend_matches_pyomo_backend(fix_arc):
+    pyomo_cost, pyomo_values = _solve(_build_trade_lp("pyomo", fix_arc))
+    highs_cost, highs_values = _solve(_build_trade_lp("highs", fix_arc))
+
+    assert highs_values.keys() == pyomo_values.keys()
+    assert highs_cost == pytest.approx(pyomo_cost, rel=1e-6, abs=1e-6)
+    if fix_arc is not None:
+        assert highs_values[fix_arc] == pytest.approx(0.0, abs=LP_EPSILON)
+
+    # Delivered volume per demand center is unique even when the optimal flows are not
+    delivered_pyomo: dict[str, float] = {}
+    delivered_highs: dict[str, float] = {}
+    for (_, to_pc, commodity), value in pyomo_values.items():
+        if commodity == "steel":
+            delivered_pyomo[to_pc] = delivered_pyomo.get(to_pc, 0.0) + value
+    for (_, to_pc, commodity), value in highs_values.items():
+        if commodity == "steel":
+            delivered_highs[to_pc] = delivered_highs.get(to_pc, 0.0) + value
+    assert delivered_highs == pytest.approx(delivered_pyomo, abs=1e-4)
+
+
+def test_persistent_solver_matches_fresh_solves_across_years():
+    """Year-over-year edits (demand change, plant closure, new plant) give the same optimum as rebuilding."""
+    # The toy network is so small that one new plant touches most of the matrix; never fall back to a reload
+    solver = PersistentHighsSolver(max_changed_fraction=1.0)
+    years = [
+        {},
+        {"demand_scale": 1.1},
+        {"demand_scale": 1.1, "plants": ("bof_CHN", "bof_BRA")},
+        {"demand_scale": 0.9, "plants": ("bof_CHN", "bof_DEU", "bof_BRA")},
+    ]
+    for year_kwargs in years:
+        fresh_cost, fresh_values = _solve(_build_trade_lp("highs", **year_kwargs))
+        persistent_lp = _build_trade_lp("highs", **year_kwargs)
+        persistent_lp.persistent_solver = solver
+        persistent_cost, persistent_values = _solve(persistent_lp)
+
+        assert persistent_values.keys() == fresh_values.keys()
+        assert persistent_cost == pytest.approx(fresh_cost, rel=1e-6, abs=1e-6)
+
+    assert solver.full_loads == 1
+    assert solver.incremental_updates == len(years) - 1
+
+
+def test_unpickled_persistent_solver_continues_like_the_live_one():
+    """A run snapshot drops the HiGHS instance; the restored solver rebuilds it with the basis and edits on."""
+    years = [
+        {},
+        {"demand_scale": 1.1},
+        {"demand_scale": 1.1, "plants": ("bof_CHN", "bof_BRA")},
+        {"demand_scale": 0.9, "plants": ("bof_CHN", "bof_DEU", "bof_BRA")},
+    ]
+    live = PersistentHighsSolver(max_changed_fraction=1.0)
+    for year_kwargs in years[:2]:
+        lp = _build_trade_lp("highs", **year_kwargs)
+        lp.persistent_solver = live
+        _solve(lp)
+
+    restored = pickle.loads(pickle.dumps(live))
+
+    for year_kwargs in years[2:]:
+        results = []
+        for solver in (live, restored):
+            lp = _build_trade_lp("highs", **year_kwargs)
+            lp.persistent_solver = solver
+            _solve(lp)
+            results.append(lp.matrix_lp.col_value)
+        assert results[0].tolist() == results[1].tolist()
+    assert restored.full_loads == live.full_loads == 1
+    assert restored.incremental_updates == live.incremental_updates == len(years) - 1
+
+
+def test_unknown_lp_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown LP backend"):
+        TradeLPModel(lp_backend="gurobi")
@@ -2,18 +2,21 @@
 Unit tests for logging_config.py.
 
 Tests cover YAML loading, context-aware filtering, module context management,
-CLI ceiling behaviour, and simulation_logging context manager.
+CLI ceiling behaviour, simulation_logging context manager, and gated loggers.
 """
 
 import logging
 import pytest
 from pathlib import Path
 
+from steelo import logging_config
 from steelo.logging_config import (
     LoggingConfig,
     ContextAwareFilter,
+    GatedLogger,
     ShortNameFormatter,
     _current_module,
+    get_logger,
 )
 
 
@@ -684,3 +687,109 @@ def test_short_name_formatter_same_function_different_context(clean_logging_stat
 
     assert pam_result == "DEBUG   | PAM  | calculate_subsidies: Subsidy calc"
     assert geo_result == "DEBUG   | GEO  | calculate_subsidies: Subsidy calc"
+
+
+# ---------------------------------------------------------------------------
+# GatedLogger Tests
+# ---------------------------------------------------------------------------
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def gated_setup(clean_logging_state, monkeypatch):
+    """
+    Isolated DEBUG logger with one handler carrying a ContextAwareFilter (pam: INFO, geo: DEBUG).
+
+    Yields the wrapped logger and the handler collecting emitted records.
+    """
+    monkeypatch.setattr(logging_config, "_context_filters_installed", True)
+    LoggingConfig.reset_log_gates()
+    # Outside the logger hierarchy, so pytest's capture handlers are not attached to it
+    logger = logging.Logger("gated_test.hot_loop", logging.DEBUG)
+    handler = _ListHandler()
+    handler.addFilter(ContextAwareFilter({"pam": logging.INFO, "geo": logging.DEBUG}, {}, logging.WARNING))
+    logger.addHandler(handler)
+
+    yield GatedLogger(logger), handler
+
+    logger.removeHandler(handler)
+    LoggingConfig.reset_log_gates()
+
+
+def test_gated_logger_skips_message_when_context_filters_it(gated_setup):
+    """Callable messages are not built when the module context suppresses DEBUG."""
+    gated, handler = gated_setup
+
+    def message():
+        raise AssertionError("message built for a suppressed record")
+
+    with LoggingConfig.module_context("pam"):
+        assert gated.isEnabledFor(logging.DEBUG) is False
+        gated.debug(message)
+        gated.info("capacity %.0f kt", 1234.5)
+
+    assert [r.getMessage() for r in handler.records] == ["capacity 1234 kt"]
+
+
+def test_gated_logger_builds_callable_message_when_enabled(gated_setup):
+    """Enabled records get the callable's message and the caller's location."""
+    gated, handler = gated_setup
+
+    with LoggingConfig.module_context("geo"):
+        gated.debug(lambda: f"NPV {1e6:,.0f}")
+
+    (record,) = handler.records
+    assert record.getMessage() == "NPV 1,000,000"
+    assert record.funcName == "test_gated_logger_builds_callable_message_when_enabled"
+
+
+def test_gated_logger_decisions_are_cached_until_reset(gated_setup):
+    """Handler changes take effect for gated loggers after reset_log_gates()."""
+    gated, handler = gated_setup
+    unfiltered = _ListHandler()
+
+    with LoggingConfig.module_context("pam"):
+        assert gated.isEnabledFor(logging.DEBUG) is False
+        gated._logger.addHandler(unfiltered)
+        try:
+            assert gated.isEnabledFor(logging.DEBUG) is False
+            LoggingConfig.reset_log_gates()
+            gated.debug("now emitted")
+        finally:
+            gated._logger.removeHandler(unfiltered)
+
+    assert [r.getMessage() for r in unfiltered.records] == ["now emitted"]
+
+
+def test_gated_logger_decisions_follow_logger_level_changes(gated_setup):
+    """Logger.setLevel re-evaluates the gate without reset_log_gates()."""
+    gated, handler = gated_setup
+    unfiltered = _ListHandler()
+
+    with LoggingConfig.module_context("pam"):
+        assert gated.isEnabledFor(logging.DEBUG) is False
+        gated._logger.addHandler(unfiltered)
+        try:
+            gated._logger.setLevel(logging.DEBUG - 1)
+            gated.debug("emitted after setLevel")
+        finally:
+            gated._logger.removeHandler(unfiltered)
+
+    assert [r.getMessage() for r in unfiltered.records] == ["emitted after setLevel"]
+
+
+def test_get_logger_returns_one_gated_logger_per_name(clean_logging_state):
+    """get_logger wraps the standard logger and is cached per name."""
+    gated = get_logger("gated_test.get_logger")
+
+    assert gated is get_logger("gated_test.get_logger")
+    assert gated.name == "gated_test.get_logger"
+    assert gated.getEffectiveLevel() == logging.getLogger("gated_test.get_logger").getEffectiveLevel()
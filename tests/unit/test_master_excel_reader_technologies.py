@@ -137,7 +137,7 @@ class TestMasterExcelReaderTechnologies:
             reader = MasterExcelReader(excel_path, output_dir)
 
             # Mock the excel file to raise an exception
-            with patch.object(reader, "_excel_file", None):
+            with patch.object(reader, "_workbook", None):
                 with patch("pandas.ExcelFile", side_effect=Exception("Test error")):
                     result = reader.read_technologies_config()
 
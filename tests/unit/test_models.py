@@ -384,6 +384,34 @@ def test_update_and_extract(new_furnace, mocker, mock_cost_of_x_file, mock_tech_
     assert env.extract_price_from_costcurve(demand=400000, product="steel") == 60
 
 
+def test_cost_curve_entry_updates_match_full_regeneration(mock_cost_of_x_file, mock_tech_switches_file):
+    furnace_groups = [
+        FakeFurnaceGroup(furnace_group_id=f"fg_{i}", UR=0.6, capacity=capacity, unit_production_cost=cost)
+        for i, (capacity, cost) in enumerate(
+            [(100000, 62.6), (125000, 70), (140000, 30), (100000, 80), (125000, 60), (125000, 60)]
+        )
+    ]
+    env = create_test_environment(tech_switches_csv=mock_tech_switches_file)
+    assert not env.update_cost_curve_entry("fg_0", furnace_groups[0], lag=0)  # no curve generated yet
+
+    env.update_cost_curve(furnace_groups[:-1], lag=0)
+    assert env.update_cost_curve_entry("fg_5", furnace_groups[-1], lag=0)  # new furnace group
+    furnace_groups[0].unit_production_cost = 65.0  # e.g. renovated
+    env.update_cost_curve_entry("fg_0", furnace_groups[0], lag=0)
+    furnace_groups[2].status = "closed"
+    env.update_cost_curve_entry("fg_2", furnace_groups[2], lag=0)
+    incremental_curve, incremental_costs = list(env.cost_curve["steel"]), dict(env.cost_dict["steel"])
+
+    env.update_cost_curve(furnace_groups, lag=0)
+
+    assert incremental_curve == env.cost_curve["steel"]
+    assert incremental_costs == env.cost_dict["steel"]
+    demands = [50000, 200000, 400000, 1000000]
+    assert env.extract_prices_from_costcurve(demands, product="steel").tolist() == [
+        env.extract_price_from_costcurve(demand=demand, product="steel") for demand in demands
+    ]
+
+
 def test_predict_new_market_price(new_furnace, mocker, mock_cost_of_x_file, mock_tech_switches_file):
     repo = []
     # Scale capacities to ensure production > 50k tpa threshold
@@ -0,0 +1,152 @@
+"""Property test: the batched NPV kernel is bit-for-bit equal to the scalar list arithmetic it replaces."""
+
+import random
+
+import numpy as np
+import pytest
+
+from steelo.domain.calculate_costs import (
+    calculate_debt_repayment,
+    calculate_gross_cash_flow,
+    calculate_net_cash_flow,
+    calculate_npv_costs,
+    calculate_npv_full,
+    calculate_npv_full_batch,
+)
+
+
+def _scalar_npv_full(
+    capex,
+    capacity,
+    unit_total_opex_list,
+    expected_utilisation_rate,
+    price_series,
+    cost_of_debt,
+    cost_of_equity,
+    equity_share,
+    lifetime,
+    construction_time,
+    carbon_costs=None,
+    infrastructure_costs=0.0,
+    secondary_output_adjustment=0.0,
+):
+    """The list-based calculate_npv_full the kernel replaced."""
+    total_investment = capacity * capex + infrastructure_costs
+    expected_production = expected_utilisation_rate * capacity
+    debt_repayment = calculate_debt_repayment(
+        total_investment=total_investment, equity_share=equity_share, lifetime=lifetime, cost_of_debt=cost_of_debt
+    )
+    zeros = [0.0] * construction_time
+    debt_repayment_lagged = zeros + debt_repayment
+    unit_opex_lagged = zeros + unit_total_opex_list
+    if expected_production != 0 and carbon_costs:
+        unit_carbon_costs_lagged = zeros + [carbon_cost / expected_production for carbon_cost in carbon_costs]
+        unit_opex_lagged = [x + y for x, y in zip(unit_opex_lagged, unit_carbon_costs_lagged)]
+    secondary_adjustment_lagged = zeros + [secondary_output_adjustment] * len(unit_total_opex_list)
+    unit_opex_lagged = [x + y for x, y in zip(unit_opex_lagged, secondary_adjustment_lagged)]
+    gross_cash_flow = calculate_gross_cash_flow(
+        total_opex=unit_opex_lagged, price_series=price_series, expected_production=expected_production
+    )
+    net_cash_flow = calculate_net_cash_flow(total_debt_repayment=debt_repayment_lagged, gross_cash_flow=gross_cash_flow)
+    return calculate_npv_costs(
+        net_cash_flow=net_cash_flow,
+        cost_of_equity=cost_of_equity,
+        equity_share=equity_share,
+        total_investment=total_investment,
+    )
+
+
+def _random_candidate(rng: random.Random, lifetime: int, construction_time: int) -> dict:
+    years = lifetime + construction_time
+    opex = [rng.choice([0.0, rng.uniform(50, 800)]) for _ in range(lifetime)]
+    carbon_costs = rng.choice([None, [], [rng.uniform(0, 1e7) for _ in range(lifetime)]])
+    return {
+        "capex": rng.uniform(0, 2000),
+        "capacity": rng.choice([1000.0, 2.5e6]),
+        "unit_total_opex_list": opex,
+        "expected_utilisation_rate": rng.choice([0.0, rng.uniform(0.3, 1.0)]),
+        "price_series": [rng.uniform(200, 900) for _ in range(years + rng.randint(0, 3))],
+        "cost_of_debt": rng.uniform(0, 0.15),
+        "cost_of_equity": rng.choice([rng.uniform(0, 0.2), -1.0, 0.1]),
+        "carbon_costs": carbon_costs,
+        "infrastructure_costs": rng.choice([0.0, rng.uniform(0, 1e8)]),
+        "secondary_output_adjustment": rng.choice([0.0, rng.uniform(-50, 50)]),
+    }
+
+
+def _batch(candidates: list[dict], equity_share: float, lifetime: int, construction_time: int) -> np.ndarray:
+    return calculate_npv_full_batch(
+        capex=[c["capex"] for c in candidates],
+        capacity=[c["capacity"] for c in candidates],
+        unit_total_opex_lists=[c["unit_total_opex_list"] for c in candidates],
+        expected_utilisation_rates=[c["expected_utilisation_rate"] for c in candidates],
+        price_series=[c["price_series"] for c in candidates],
+        cost_of_debt=[c["cost_of_debt"] for c in candidates],
+        cost_of_equity=[c["cost_of_equity"] for c in candidates],
+        equity_share=equity_share,
+        lifetime=lifetime,
+        construction_time=construction_time,
+        carbon_costs=[c["carbon_costs"] for c in candidates],
+        infrastructure_costs=[c["infrastructure_costs"] for c in candidates],
+        secondary_output_adjustments=[c["secondary_output_adjustment"] for c in candidates],
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batched_npvs_are_bit_for_bit_equal_to_the_scalar_calculation(seed):
+    rng = random.Random(seed)
+    lifetime, construction_time = rng.randint(1, 30), rng.randint(0, 5)
+    equity_share = rng.choice([0.0, 0.2, rng.random(), 1.0])
+    candidates = [_random_candidate(rng, lifetime, construction_time) for _ in range(25)]
+
+    expected = [
+        _scalar_npv_full(**c, equity_share=equity_share, lifetime=lifetime, construction_time=construction_time)
+        for c in candidates
+    ]
+    batched = _batch(candidates, equity_share, lifetime, construction_time)
+    single = [
+        calculate_npv_full(**c, equity_share=equity_share, lifetime=lifetime, construction_time=construction_time)
+        for c in candidates
+    ]
+
+    assert batched.tolist() == expected
+    assert single == expected
+
+
+def test_nan_cash_flows_and_invalid_cost_of_equity_give_large_negative_npv():
+    common = dict(
+        capex=500.0,
+        capacity=1000.0,
+        unit_total_opex_list=[300.0] * 3,
+        expected_utilisation_rate=0.8,
+        cost_of_debt=0.05,
+        equity_share=0.3,
+        lifetime=3,
+        construction_time=1,
+    )
+
+    assert calculate_npv_full(**common, price_series=[600.0, float("nan"), 600.0, 600.0], cost_of_equity=0.1) == -1e9
+    assert calculate_npv_full(**common, price_series=[600.0] * 4, cost_of_equity=-1.5) == -1e9
+
+
+def test_mismatched_series_raise_like_the_scalar_calculation():
+    common = dict(
+        capex=500.0,
+        capacity=1000.0,
+        expected_utilisation_rate=0.8,
+        cost_of_debt=0.05,
+        cost_of_equity=0.1,
+        equity_share=0.3,
+        lifetime=3,
+        construction_time=1,
+    )
+
+    with pytest.raises(ValueError, match="lengths"):
+        calculate_npv_full(**common, unit_total_opex_list=[300.0] * 2, price_series=[600.0] * 4)
+    with pytest.raises(ValueError, match="lengths"):
+        calculate_npv_full(**common, unit_total_opex_list=[300.0] * 3, price_series=[600.0] * 4, carbon_costs=[1.0])
+    with pytest.raises(IndexError):
+        calculate_npv_full(**common, unit_total_opex_list=[300.0] * 3, price_series=[600.0] * 3)
+    # Years without production need no price
+    npv = calculate_npv_full(**common, unit_total_opex_list=[300.0, 300.0, 0.0], price_series=[600.0] * 3)
+    assert npv == _scalar_npv_full(**common, unit_total_opex_list=[300.0, 300.0, 0.0], price_series=[600.0] * 3)
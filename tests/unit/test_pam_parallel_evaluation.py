@@ -0,0 +1,218 @@
+"""Tests for the speculative (worker process) NPV evaluation of the plant agents model.
+
+Workers compute technology and expansion NPVs ahead of time; the serial replay reuses them through the
+``technology_options`` / ``expansion_npvs`` caches and must decide exactly as without them.
+"""
+
+import multiprocessing
+
+import pytest
+from benchmarks.synthetic_world import SCALES, build_synthetic_world
+
+from steelo.domain import Year
+from steelo.domain.models import (
+    FurnaceGroup,
+    Location,
+    Plant,
+    PlantGroup,
+    PointInTime,
+    PrimaryFeedstock,
+    Technology,
+    TechnologyOptions,
+    TimeFrame,
+    Volumes,
+)
+from steelo.economic_models import plant_agent
+from steelo.economic_models.plant_agent import AllocationModel, PlantAgentsModel, _run_speculatively
+from steelo.utilities.plot_queue import PLOT_CLASSES, PlotQueue
+
+
+def _make_plant() -> Plant:
+    tech = Technology(
+        name="BF",
+        product="hot_metal",
+        dynamic_business_case=[PrimaryFeedstock(metallic_charge="IO_low", reductant="Coke+PCI", technology="BF")],
+    )
+    fg = FurnaceGroup(
+        furnace_group_id="fg1",
+        capacity=1000.0,
+        status="operating",
+        last_renovation_date=None,
+        technology=tech,
+        historical_production={},
+        utilization_rate=0.0,
+        lifetime=PointInTime(
+            current=Year(2030), time_frame=TimeFrame(start=Year(2025), end=Year(2045)), plant_lifetime=20
+        ),
+        chosen_reductant="Coke+PCI",
+    )
+    fg.set_energy_costs(electricity=0.05, coke=0.1)
+    fg.balance = 1e9
+    fg.historic_balance = 0.0
+    return Plant(
+        plant_id="p1",
+        location=Location(lat=0.0, lon=0.0, country="USA", region="Region", iso3="USA"),
+        furnace_groups=[fg],
+        power_source="grid",
+        soe_status="private",
+        parent_gem_id="parent",
+        workforce_size=100,
+        certified=False,
+        category_steel_product=set(),
+        steel_capacity=Volumes(1000),
+        technology_unit_fopex={},
+    )
+
+
+def _evaluate_strategy(plant: Plant, technology_options: dict[str, TechnologyOptions], need_by_tech: dict[str, float]):
+    techs = ["BF", "BFCCS", "DRI"]
+    plant_group = PlantGroup(plant_group_id="parent", plants=[plant])
+    plant_group.balance = 1e15
+    return plant.evaluate_furnace_group_strategy(
+        "fg1",
+        plant_group=plant_group,
+        market_price_series={"steel": [500.0] * 30, "hot_metal": [500.0] * 30},
+        region_capex={tech: 500.0 for tech in techs},
+        capex_renovation_share={},
+        cost_of_debt=0.05,
+        cost_of_equity=0.1,
+        get_bom_from_avg_boms=lambda *a, **k: (None, 0.0, ""),
+        probabilistic_agents=False,
+        dynamic_business_cases={},
+        chosen_emissions_boundary_for_carbon_costs="Scope 1",
+        technology_emission_factors=[],
+        tech_to_product={tech: "hot_metal" for tech in techs},
+        plant_lifetime=20,
+        construction_time=4,
+        current_year=Year(2030),
+        allowed_techs={Year(2030): techs},
+        risk_free_rate=0.02,
+        allowed_furnace_transitions={"BF": ["BFCCS", "DRI"]},
+        capacity_limit_steel=Volumes(1e9),
+        capacity_limit_iron=Volumes(1e9),
+        installed_capacity_in_year=lambda _: Volumes(0),
+        new_plant_capacity_in_year=lambda _: Volumes(0),
+        most_common_reductant_by_tech={},
+        get_co2_headroom=lambda iso3, year, own=0.0: 100.0 + own,
+        get_co2_need_by_name=lambda tech, capacity, reductant: need_by_tech.get(tech, 0.0),
+        co2_storage_diagnostics=lambda iso3, year: (0.0, 0.0, 1000.0),
+        technology_options=technology_options,
+    )
+
+
+def test_technology_options_are_reused_for_the_same_transitions(mocker):
+    optimal = mocker.patch.object(FurnaceGroup, "optimal_technology_name", return_value=({}, {}, None, {}))
+    plant = _make_plant()
+    technology_options: dict[str, TechnologyOptions] = {}
+
+    _evaluate_strategy(plant, technology_options, need_by_tech={})
+    assert optimal.call_count == 1
+    assert technology_options["fg1"].transitions == ("BFCCS", "DRI")
+
+    _evaluate_strategy(plant, technology_options, need_by_tech={})
+    assert optimal.call_count == 1
+
+
+def test_technology_options_are_recomputed_when_the_co2_gate_changes_the_transitions(mocker):
+    optimal = mocker.patch.object(FurnaceGroup, "optimal_technology_name", return_value=({}, {}, None, {}))
+    plant = _make_plant()
+    technology_options = {"fg1": TechnologyOptions(("BFCCS", "DRI"), {"BFCCS": 1e12}, {"BFCCS": 1.0}, None, {})}
+
+    # BFCCS needs more storage than the headroom left by the decisions replayed so far
+    _evaluate_strategy(plant, technology_options, need_by_tech={"BFCCS": 500.0})
+
+    assert optimal.call_count == 1
+    assert optimal.call_args.kwargs["allowed_furnace_transitions"]["BF"] == ["DRI"]
+    assert technology_options["fg1"] == TechnologyOptions(("DRI",), {}, {}, None, {})
+
+
+def _evaluate_expansion_options(pg: PlantGroup, expansion_npvs: dict[tuple[str, str], float | None]):
+    return pg.evaluate_expansion_options(
+        price_series={"hot_metal": [500.0] * 30},
+        capacity=Volumes(1000.0),
+        region_capex={"Region": {"BF": 500.0, "DRI": 600.0}},
+        cost_of_debt_dict={"USA": 0.05},
+        cost_of_equity_dict={"USA": 0.1},
+        get_bom_from_avg_boms=None,
+        dynamic_feedstocks={},
+        fopex_for_iso3={"USA": {"BF": 10.0, "DRI": 10.0}},
+        iso3_to_region_map={"USA": "Region"},
+        chosen_emissions_boundary_for_carbon_costs="Scope 1",
+        technology_emission_factors=[],
+        global_risk_free_rate=0.02,
+        equity_share=0.3,
+        tech_to_product={"BF": "hot_metal", "DRI": "hot_metal"},
+        plant_lifetime=20,
+        construction_time=4,
+        current_year=Year(2030),
+        allowed_techs={Year(2030): ["BF", "DRI"]},
+        expansion_npvs=expansion_npvs,
+    )
+
+
+def test_expansion_npvs_are_recorded_and_reused():
+    pg = PlantGroup(plant_group_id="parent", plants=[_make_plant()])
+    pg.balance = 1e15
+
+    # Without BOM data no option can be valued; the skips are recorded as None
+    expansion_npvs: dict[tuple[str, str], float | None] = {}
+    assert _evaluate_expansion_options(pg, expansion_npvs) == {}
+    assert expansion_npvs == {("p1", "BF"): None, ("p1", "DRI"): None}
+
+    options = _evaluate_expansion_options(pg, {("p1", "BF"): 5.0, ("p1", "DRI"): 7.0})
+
+    assert options == {"p1": (7.0, "DRI", 600.0)}
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs the fork start method")
+def test_speculative_tasks_run_on_a_snapshot():
+    state = {"balance": 10}
+
+    def task(amount):
+        state["balance"] -= amount
+        return amount * 2
+
+    results = _run_speculatively([lambda amount=amount: task(amount) for amount in range(5)], workers=2)
+
+    assert results == [0, 2, 4, 6, 8]
+    assert state == {"balance": 10}
+    assert _run_speculatively([], workers=2) == []
+
+
+def _run_plant_agents(directory, pam_workers: int):
+    """Run one year of the plant agents on a small synthetic world; returns the commands and the plant state."""
+    runner = build_synthetic_world(SCALES["small"], directory, pam_workers=pam_workers)
+    bus = runner.bus
+    AllocationModel.run(bus)
+    commands = []
+    handle = bus.handle
+
+    def record(message):
+        commands.append(message)
+        return handle(message)
+
+    bus.handle = record
+    PlantAgentsModel.run(bus)
+    furnace_groups = sorted(
+        (plant.plant_id, fg.furnace_group_id, fg.technology.name, fg.status, fg.capacity, fg.balance)
+        for plant in bus.uow.plants.list()
+        for fg in plant.furnace_groups
+    )
+    balances = sorted((pg.plant_group_id, pg.balance) for pg in bus.uow.plant_groups.list())
+    return commands, furnace_groups, balances
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs the fork start method")
+def test_parallel_evaluation_decides_as_the_serial_one(tmp_path, monkeypatch, mocker):
+    monkeypatch.chdir(tmp_path)  # The trade LP writes its variables to the working directory
+    speculate = mocker.spy(plant_agent, "_run_speculatively")
+
+    with PlotQueue(max_workers=0, disabled_classes=PLOT_CLASSES):
+        serial = _run_plant_agents(tmp_path / "serial", pam_workers=1)
+        assert speculate.call_count == 0
+        parallel = _run_plant_agents(tmp_path / "parallel", pam_workers=2)
+
+    assert speculate.call_count > 0
+    serial_commands, serial_furnace_groups, serial_balances = serial
+    assert serial_commands, "the synthetic world should make the plant agents act"
+    assert parallel == (serial_commands, serial_furnace_groups, serial_balances)
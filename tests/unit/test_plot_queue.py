@@ -0,0 +1,133 @@
+"""Unit tests for the plot job queue and the trade plot snapshots it renders from."""
+
+import pickle
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from steelo.utilities import plot_queue
+from steelo.utilities.plot_queue import PlotQueue, drain_plots, plots_enabled, submit_plot
+from steelo.utilities.plotting import snapshot_allocations_for_plots
+
+
+def test_submit_plot_renders_inline_without_active_queue():
+    plot = Mock()
+
+    submit_plot("geo", plot, 1, title="x")
+
+    plot.assert_called_once_with(1, title="x")
+    assert plots_enabled("geo")
+
+
+def test_disabled_plot_classes_are_skipped():
+    plot = Mock()
+
+    with PlotQueue(max_workers=0, disabled_classes=["trade"]) as queue:
+        assert not plots_enabled("trade")
+        submit_plot("trade", plot)
+        submit_plot("geo", plot, "layer")
+
+    plot.assert_called_once_with("layer")
+    assert (queue.submitted, queue.skipped) == (1, 1)
+    assert plot_queue._active_queue is None
+
+
+def test_unknown_plot_class_is_rejected():
+    with pytest.raises(ValueError, match="Unknown plot classes"):
+        PlotQueue(disabled_classes=["maps"])
+    with pytest.raises(ValueError, match="Unknown plot class"):
+        PlotQueue(max_workers=0).submit("maps", Mock())
+
+
+def test_worker_processes_render_queued_plots_and_log_failures(tmp_path):
+    targets = [tmp_path / f"plot_{i}.txt" for i in range(5)]
+
+    with PlotQueue(max_workers=2, max_pending=2) as queue:
+        for i, target in enumerate(targets):
+            submit_plot("post_run", target.write_text, f"plot {i}")
+        # A failing job is logged when the queue drains instead of aborting the run
+        submit_plot("post_run", (tmp_path / "missing" / "plot.txt").write_text, "never written")
+        drain_plots()
+        assert not queue._pending
+
+    assert [target.read_text() for target in targets] == [f"plot {i}" for i in range(5)]
+    assert queue.submitted == 6
+    assert queue.failed == 1
+
+
+class _Node(SimpleNamespace):
+    """Hashable like the plants, suppliers and demand centers used as allocation keys."""
+
+    __hash__ = object.__hash__
+
+
+def _allocations():
+    plant = _Node(
+        plant_id="P1",
+        location=SimpleNamespace(lat=10.0, lon=20.0, iso3="DEU"),
+        furnace_groups=["large state that must not be pickled"],
+    )
+    fg = _Node(technology=SimpleNamespace(name="EAF"), capacity=1000.0)
+    supplier = _Node(
+        supplier_id="S1",
+        commodity="io_high",
+        location=SimpleNamespace(lat=1.0, lon=2.0, iso3="AUS"),
+        capacity_by_year={2030: 500.0},
+    )
+    demand_center = _Node(
+        demand_center_id="DC1",
+        center_of_gravity=SimpleNamespace(lat=11.0, lon=21.0, iso3="FRA"),
+        demand_by_year={2030: 800.0},
+    )
+    return {
+        "io_high": SimpleNamespace(
+            allocations={supplier: {(plant, fg): 400.0}},
+            allocation_costs={supplier: {(plant, fg): 30.0}},
+        ),
+        "steel": SimpleNamespace(
+            allocations={(plant, fg): {demand_center: 700.0}},
+            allocation_costs={(plant, fg): {demand_center: 12.5}},
+        ),
+    }
+
+
+def test_snapshot_keeps_plot_data_and_shared_nodes_across_pickling():
+    snapshot = pickle.loads(pickle.dumps(snapshot_allocations_for_plots(_allocations())))
+
+    ((supplier, destinations),) = snapshot["io_high"].allocations.items()
+    ((plant_fg, volume),) = destinations.items()
+    assert (supplier.supplier_id, supplier.location.iso3, supplier.capacity_by_year) == ("S1", "AUS", {2030: 500.0})
+    assert volume == 400.0
+    assert snapshot["io_high"].allocation_costs[supplier][plant_fg] == 30.0
+
+    ((steel_source, steel_destinations),) = snapshot["steel"].allocations.items()
+    # The furnace group feeding on iron ore and producing steel is one node in both commodities
+    assert steel_source is plant_fg
+    plant, fg = steel_source
+    assert (plant.plant_id, plant.location.lat, fg.technology.name, fg.capacity) == ("P1", 10.0, "EAF", 1000.0)
+    assert not hasattr(plant, "furnace_groups")
+    ((demand_center, steel_volume),) = steel_destinations.items()
+    assert (demand_center.demand_center_id, demand_center.center_of_gravity.iso3) == ("DC1", "FRA")
+    assert steel_volume == 700.0
+    assert snapshot["steel"].allocation_costs[steel_source][demand_center] == 12.5
+
+
+def test_snapshot_renders_detailed_trade_map(tmp_path):
+    from steelo.domain.models import PlotPaths
+    from steelo.utilities.plotting import plot_detailed_trade_map
+
+    snapshot = snapshot_allocations_for_plots(_allocations())
+
+    plot_detailed_trade_map(snapshot, chosen_year=2030, plot_paths=PlotPaths(tm_plots_dir=tmp_path))
+
+    assert list(Path(tmp_path).iterdir())
+
+
+def test_plots_off_process_only_with_workers():
+    assert not plot_queue.plots_off_process()
+    with PlotQueue(max_workers=0):
+        assert not plot_queue.plots_off_process()
+    with PlotQueue(max_workers=1):
+        assert plot_queue.plots_off_process()
@@ -5,6 +5,7 @@ import pandas as pd
 import pickle
 from pathlib import Path
 
+from steelo.adapters.dataprocessing.postprocessing.datacollection_tables import write_year_tables
 from steelo.adapters.dataprocessing.postprocessing.post_process_datacollection import (
     extract_and_process_stored_dataCollection,
 )
@@ -362,3 +363,104 @@ def test_chosen_reductant_values_are_normalized():
         reductants = df.loc[df["furnace_group_id"] == "plant_001_fg_001", "chosen_reductant"].unique()
         assert len(reductants) == 1
         assert reductants[0] == "natural_gas"
+
+
+def test_columnar_tables_match_legacy_pickles():
+    """Post-processing the columnar per-year tables gives the same rows as the legacy pickles of the same data."""
+    record = {
+        "furnace_group_id": "P001_1",
+        "technology": "BF",
+        "product": "iron",
+        "chosen_reductant": "coke",
+        "capacity": 1000.0,
+        "production": 900.0,
+        "unit_vopex": 100.0,
+        "unit_fopex": 50.0,
+        "unit_debt_repayment": 5.0,
+        "unit_production_cost": 155.0,
+        "debt_repayment_per_year": [5.0, 5.0],
+        "debt_repayment_for_current_year": 10.0,
+        "furnace_group_profit_and_loss": 500.0,
+        "unit_carbon_cost": 3.0,
+        "materials": {
+            "io_low": {"demand": 1400.0, "total_cost": 140000.0, "unit_cost": 100.0},
+            "scrap": {"demand": 100.0, "total_cost": 30000.0, "unit_cost": 300.0},
+        },
+        "energy": {"coke": {"demand": 400.0, "total_cost": 8000.0, "unit_cost": 20.0}},
+        "cost_breakdown": {
+            "io_low": {"material cost (incl. transport and tariffs)": 155.0, "coke": 8.0, "unit_cost": 100.0},
+            "scrap": {"material cost (incl. transport and tariffs)": 33.0},
+        },
+        "carbon_breakdown": {"io_low": {"coke": 1.2}},
+        "emissions": {"boundary_a": {"direct": 1.5, "indirect": 0.2}},
+        "emissions_boundary_a_direct": 1.5,
+        "emissions_boundary_a_indirect": 0.2,
+        "unit_subsidy_capex": 0.0,
+        "unit_subsidy_opex": 1.0,
+        "unit_subsidy_debt": 0.0,
+        "unit_subsidy_total": 1.0,
+    }
+    idle = {
+        "furnace_group_id": "P002_1",
+        "technology": "EAF",
+        "product": "steel",
+        "chosen_reductant": None,
+        "capacity": 500.0,
+        "production": 0.0,
+        "materials": None,
+        "energy": None,
+        "cost_breakdown": None,
+        "carbon_breakdown": None,
+        "unit_vopex": None,
+        "unit_fopex": 20.0,
+        "unit_debt_repayment": 0.0,
+        "unit_production_cost": 0.0,
+        "debt_repayment_for_current_year": 0.0,
+        "furnace_group_profit_and_loss": -10.0,
+        "unit_subsidy_capex": 0.0,
+        "unit_subsidy_opex": 0.0,
+        "unit_subsidy_debt": 0.0,
+        "unit_subsidy_total": 0.0,
+    }
+    plants = {
+        "P001": {
+            "furnace_groups": [record],
+            "plant_group_id": "group_1",
+            "location": "DEU",
+            "plant_profit_and_loss": 500.0,
+            "plant_group_balance": 490.0,
+        },
+        "P002": {
+            "furnace_groups": [idle],
+            "plant_group_id": "group_1",
+            "location": "FRA",
+            "plant_profit_and_loss": -10.0,
+            "plant_group_balance": 490.0,
+        },
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy_dir = Path(tmpdir) / "legacy"
+        legacy_dir.mkdir()
+        with open(legacy_dir / "datacollection_post_allocation_2025.pkl", "wb") as f:
+            pickle.dump(plants, f)
+        tables_dir = Path(tmpdir) / "tables"
+        write_year_tables(plants, 2025, tables_dir)
+
+        kwargs = dict(
+            commands={2025: {}},
+            store=False,
+            cost_breakdown_columns=["cost_breakdown - material cost (incl. transport and tariffs)"],
+            carbon_breakdown_columns=["carbon_breakdown - coke"],
+        )
+        legacy = extract_and_process_stored_dataCollection(data_dir=legacy_dir, output_path=Path(tmpdir), **kwargs)
+        columnar = extract_and_process_stored_dataCollection(data_dir=tables_dir, output_path=Path(tmpdir), **kwargs)
+
+    assert isinstance(legacy, pd.DataFrame) and isinstance(columnar, pd.DataFrame)
+    assert list(columnar.columns) == list(legacy.columns)
+    assert "emissions_boundary_a_direct" in columnar.columns
+    sort_by = ["furnace_group_id", "feedstock"]
+    pd.testing.assert_frame_equal(
+        columnar.sort_values(sort_by).reset_index(drop=True).astype(object).fillna(0),
+        legacy.sort_values(sort_by).reset_index(drop=True).astype(object).fillna(0),
+        check_dtype=False,
+    )
@@ -164,7 +164,7 @@ class DummyTradeLPModel:
     def get_bom_element(self, name):
         if name in self.bom_elements:
             return self.bom_elements[name]
-        raise StopIteration
+        raise KeyError(name)
 
     def add_bom_elements(self, boms):
         for bom in boms:
@@ -201,6 +201,9 @@ class DummyTradeLPModel:
     def extract_solution(self):
         pass
 
+    def get_allocation_values(self):
+        return {key: 0.0 for key in self.lp_model.allocation_variables}
+
     def add_commodities(self, commodities):
         self.commodities.extend(commodities)
 
@@ -438,6 +441,12 @@ def patch_exit(monkeypatch):
     monkeypatch.setattr("builtins.exit", lambda *args, **kwargs: None)
 
 
+@pytest.fixture(autouse=True)
+def working_directory(monkeypatch, tmp_path):
+    """Solving writes the allocations to trade_lp_variables.csv in the working directory."""
+    monkeypatch.chdir(tmp_path)
+
+
 # --- Tests ---
 def create_mock_config():
     """Create a mock config for testing."""
@@ -475,7 +484,7 @@ def test_create_process_from_furnace_group_empty_list():
 
 def test_create_process_from_furnace_group_feedstock():
     # Test branch when dynamic_business_case is a list of feedstocks.
-    # Create a feedstock that will cause lp_model.get_bom_element() to raise StopIteration.
+    # Create a feedstock that will cause lp_model.get_bom_element() to raise KeyError.
     outputs = {"steel": 1}
     feedstock = DummyFeedstock(
         name="HS",
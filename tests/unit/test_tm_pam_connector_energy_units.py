@@ -384,6 +384,7 @@ def test_utilization_correction_refreshes_shares_and_energy():
         },
     )
     furnace_group.set_allocated_volumes = lambda v: setattr(furnace_group, "allocated_volumes", v)
+    furnace_group.invalidate_cost_cache = lambda: None
 
     connector = TM_PAM_connector(
         dynamic_feedstocks_classes={},
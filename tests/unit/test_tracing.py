@@ -0,0 +1,155 @@
+import json
+import time
+from unittest.mock import Mock
+
+import psutil
+import pytest
+
+from steelo.utilities.tracing import SpanTracer, current_span, read_phase_summary, start_span, traced
+
+
+@pytest.fixture
+def tracer():
+    tracer = SpanTracer()
+    with tracer.activate():
+        yield tracer
+
+
+def _run_years(years):
+    @traced("solve")
+    def solve():
+        current_span().count(variables=10, constraints=4)
+
+    with start_span("simulation"):
+        for year in years:
+            with start_span("year", year=year):
+                with start_span("AllocationModel"):
+                    with start_span("build_lp_model"):
+                        pass
+                    solve()
+                geo = start_span("GeospatialModel")
+                geo.count(candidate_sites=3)
+                geo.finish()
+
+
+def test_spans_nest_and_aggregate_over_years(tracer):
+    _run_years([2025, 2026])
+
+    summary = tracer.summary()
+
+    assert [row["phase"] for row in summary] == [
+        "simulation",
+        "simulation / year",
+        "simulation / year / AllocationModel",
+        "simulation / year / AllocationModel / build_lp_model",
+        "simulation / year / AllocationModel / solve",
+        "simulation / year / GeospatialModel",
+    ]
+    rows = {row["phase"]: row for row in summary}
+    assert rows["simulation"]["share_pct"] == pytest.approx(100)
+    assert rows["simulation / year"]["calls"] == 2
+    assert rows["simulation / year / AllocationModel / solve"]["depth"] == 3
+    assert rows["simulation / year / AllocationModel / solve"]["variables"] == 20
+    assert rows["simulation / year / GeospatialModel"]["candidate_sites"] == 6
+
+
+def test_finishing_a_span_closes_its_open_children(tracer):
+    outer = start_span("outer")
+    inner = start_span("inner")
+
+    outer.finish()
+    after = start_span("after")
+    after.finish()
+
+    assert inner.wall_s > 0
+    assert inner.wall_s <= outer.wall_s
+    assert after.path == ("after",)
+
+
+def test_span_is_closed_when_the_traced_function_raises(tracer):
+    @traced()
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        failing()
+
+    assert [span.name for span in tracer.spans] == ["failing"]
+    assert tracer.current_span() is None
+
+
+def test_spans_without_a_tracer_only_measure_wall_time():
+    span = start_span("untraced", year=2030)
+    span.count(variables=1)
+
+    assert span.finish() >= 0
+    assert not span.recording
+    assert not current_span().recording
+
+
+def test_chrome_trace_has_complete_events_with_measurements(tracer):
+    _run_years([2025])
+
+    events = tracer.chrome_trace()["traceEvents"]
+
+    complete = [event for event in events if event["ph"] == "X"]
+    assert len(complete) == 6
+    year = next(event for event in complete if event["name"] == "year")
+    assert year["args"]["year"] == 2025
+    assert {"cpu_s", "rss_delta_mb"} <= set(year["args"])
+    assert all(event["dur"] >= 0 for event in complete)
+    assert any(event["ph"] == "C" and "rss_mb" in event["args"] for event in events)
+
+
+def test_reports_round_trip(tracer, tmp_path):
+    _run_years([2025, 2026])
+
+    trace_path, summary_path = tracer.write_reports(tmp_path / "performance")
+
+    assert json.loads(trace_path.read_text())["traceEvents"]
+    rows = read_phase_summary(summary_path, max_depth=2)
+    assert [row["name"] for row in rows] == ["simulation", "year", "AllocationModel", "GeospatialModel"]
+    assert rows[1]["calls"] == 2
+    assert "variables" not in rows[2]
+    assert rows[3]["candidate_sites"] == 6
+
+
+def test_sampler_records_the_peak_rss_inside_a_span():
+    tracer = SpanTracer(rss_sample_interval_s=0.001)
+    rss = {"mb": 100.0}
+    tracer.rss_mb = lambda: rss["mb"]
+
+    with tracer.activate():
+        span = start_span("lp_solve")
+        rss["mb"] = 900.0
+        deadline = time.monotonic() + 5
+        while span.peak_rss_mb < 900.0 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        rss["mb"] = 150.0
+        span.finish()
+
+    assert span.peak_rss_mb == 900.0
+    assert span.rss_delta_mb == 50.0
+    assert tracer.peak_rss_mb() == 900.0
+    assert tracer.summary()[0]["peak_rss_mb"] == 900.0
+
+
+def _process(rss_mb, children=()):
+    process = Mock()
+    process.memory_info.return_value.rss = rss_mb * 1024 * 1024
+    process.children.return_value = list(children)
+    return process
+
+
+def test_rss_includes_the_child_processes():
+    tracer = SpanTracer(rss_sample_interval_s=None)
+    exited = Mock()
+    exited.memory_info.side_effect = psutil.NoSuchProcess(pid=1)
+    tracer._process = _process(100.0, children=[_process(300.0), _process(50.0), exited])
+
+    with tracer.activate(), start_span("PlantAgentsModel") as span:
+        pass
+
+    assert tracer.rss_mb() == 450.0
+    assert span.peak_rss_mb == 450.0
+    tracer._process.children.assert_called_with(recursive=True)
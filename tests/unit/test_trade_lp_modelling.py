@@ -1,6 +1,7 @@
 from collections import defaultdict
 
 import pyomo.environ as pyo
+import pytest
 
 from steelo.domain.models import Location
 from steelo.domain.trade_modelling import trade_lp_modelling as tlp
@@ -145,3 +146,38 @@ def test_set_legal_allocations_does_not_collapse_reductant_variant_processes():
 
     assert (pc_bf_coke, pc_bof, hot_metal) in trade_lp.legal_allocations
     assert (pc_bf_hydrogen, pc_bof, hot_metal) in trade_lp.legal_allocations
+
+
+def test_name_indexes_follow_process_center_list_changes():
+    """Lookups go through name indexes that must see appended, reassigned and in-place-extended lists."""
+    trade_lp = tlp.TradeLPModel()
+    first = _make_bof_process_center("pc_a")
+    trade_lp.add_process_centers([first])
+    assert trade_lp.get_process_center("pc_a") is first
+
+    duplicate = _make_bof_process_center("pc_a")
+    trade_lp.add_process_centers([_make_bof_process_center("pc_b"), duplicate])
+    assert trade_lp.get_process_center("pc_b").name == "pc_b"
+    assert trade_lp.get_process_center("pc_a") is first  # first match wins, as with a linear scan
+
+    replacement = _make_bof_process_center("pc_c")
+    trade_lp.process_centers = [replacement]
+    assert trade_lp.get_process_center("pc_c") is replacement
+
+    appended = _make_bof_process_center("pc_d")
+    trade_lp.process_centers.append(appended)
+    assert trade_lp.get_process_center("pc_d") is appended
+    assert trade_lp.get_distance("pc_c", "missing") == float("inf")
+
+
+def test_get_commodity_and_bom_element_raise_key_error_on_missing_name():
+    trade_lp = tlp.TradeLPModel()
+    steel = tlp.Commodity("steel")
+    trade_lp.add_commodities([steel])
+
+    assert trade_lp.get_commodity("steel") is steel
+    assert trade_lp.get_process("unknown") is None
+    with pytest.raises(KeyError, match="unknown"):
+        trade_lp.get_commodity("unknown")
+    with pytest.raises(KeyError, match="unknown"):
+        trade_lp.get_bom_element("unknown")
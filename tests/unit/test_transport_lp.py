@@ -0,0 +1,213 @@
+"""Unit tests for the sparse LP transportation solver used by the clustered-allocation disaggregation."""
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from steelo.domain.models import Location
+from steelo.domain.trade_modelling.furnace_group_clustering import (
+    _solve_batched_transportation_problem,
+    _solve_strict_by_components,
+)
+from steelo.domain.trade_modelling.trade_lp_modelling import Commodity
+from steelo.domain.trade_modelling.transport_lp import TransportBlock, solve_transport_blocks
+
+
+class Config:
+    hot_metal_radius = 200.0
+    closely_allocated_products = ["hot_metal"]
+    distantly_allocated_products = ["pig_iron"]
+
+
+def _location(lat: float, lon: float) -> Location:
+    return Location(lat=lat, lon=lon, iso3="CHN", country="China", region="Asia", distance_to_other_iso3=None)
+
+
+def _network_simplex_reference(
+    supplies: dict[str, float], demands: dict[str, float], costs: dict[tuple[str, str], float]
+) -> dict[tuple[str, str], float]:
+    """The previous integer min-cost-flow formulation (volumes ×1000, costs ×100, largest demand balanced)."""
+    supplies_int = {k: int(round(v * 1000)) for k, v in supplies.items()}
+    demands_int = {k: int(round(v * 1000)) for k, v in demands.items()}
+    largest = max(demands_int, key=lambda k: demands_int[k])
+    demands_int[largest] += sum(supplies_int.values()) - sum(demands_int.values())
+    graph = nx.DiGraph()
+    for sid, supply in supplies_int.items():
+        graph.add_node(f"from_{sid}", demand=-supply)
+    for did, demand in demands_int.items():
+        graph.add_node(f"to_{did}", demand=demand)
+    for sid, did in costs:
+        graph.add_edge(f"from_{sid}", f"to_{did}", weight=int(max(costs[(sid, did)], 0.0) * 100))
+    flow_dict = nx.min_cost_flow(graph)
+    return {
+        (sid, did): flow_dict[f"from_{sid}"][f"to_{did}"] / 1000
+        for sid, did in costs
+        if flow_dict[f"from_{sid}"][f"to_{did}"] > 0
+    }
+
+
+def _random_problem(seed: int, n_sources: int, n_dests: int):
+    rng = np.random.default_rng(seed)
+    supplies = {f"s{i}": float(rng.uniform(10, 1000)) for i in range(n_sources)}
+    weights = rng.uniform(1, 2, n_dests)
+    total = sum(supplies.values())
+    demands = {f"d{j}": float(total * w / weights.sum()) for j, w in enumerate(weights)}
+    # Whole-dollar costs are represented exactly by the legacy ×100 integer weights
+    costs = {(sid, did): float(rng.integers(0, 500)) for sid in supplies for did in demands}
+    source_locations = {sid: _location(35.0, 110.0) for sid in supplies}
+    dest_locations = {did: _location(35.1, 110.1) for did in demands}
+    return supplies, demands, costs, source_locations, dest_locations
+
+
+def _totals(flows: dict[tuple[str, str], float], side: int) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for key, volume in flows.items():
+        totals[key[side]] = totals.get(key[side], 0.0) + volume
+    return totals
+
+
+@pytest.mark.parametrize("seed,n_sources,n_dests", [(0, 3, 4), (1, 8, 5), (2, 20, 30)])
+def test_batched_solver_matches_network_simplex(seed, n_sources, n_dests):
+    supplies, demands, costs, source_locations, dest_locations = _random_problem(seed, n_sources, n_dests)
+
+    flows, stats = _solve_batched_transportation_problem(
+        supplies, demands, source_locations, dest_locations, Commodity("steel"), Config(), allocation_costs=costs
+    )
+    reference = _network_simplex_reference(supplies, demands, costs)
+
+    def total_cost(solution):
+        return sum(volume * costs[key] for key, volume in solution.items())
+
+    # Same optimum; the reference is only exact to the half kilogram it rounds volumes to
+    assert total_cost(flows) == pytest.approx(total_cost(reference), abs=1e-3 * max(costs.values()) * len(costs))
+    for side in (0, 1):
+        expected = _totals(reference, side)
+        actual = _totals(flows, side)
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            assert actual[key] == pytest.approx(expected[key], abs=1e-2)
+    assert stats["total_flow_volume"] == pytest.approx(sum(supplies.values()))
+
+
+def test_batched_solver_ships_exact_fractional_volumes():
+    supplies = {"s0": 1.0004, "s1": 2.0004, "s2": 0.3333333}
+    demands = {"d0": 1.6670666, "d1": 1.6671}
+    source_locations = {sid: _location(35.0, 110.0) for sid in supplies}
+    dest_locations = {did: _location(35.2, 110.2) for did in demands}
+
+    flows, _ = _solve_batched_transportation_problem(
+        supplies, demands, source_locations, dest_locations, Commodity("steel"), Config()
+    )
+
+    # No integer scaling: every source ships its supply exactly (the ×1000 scaling lost up to 0.5 kg per node)
+    for sid, shipped in _totals(flows, 0).items():
+        assert shipped == pytest.approx(supplies[sid], abs=1e-9)
+
+
+def test_out_of_radius_edges_are_a_last_resort_for_hot_metal():
+    supplies = {"near": 100.0, "far": 100.0}
+    demands = {"a": 100.0, "b": 100.0}
+    source_locations = {"near": _location(35.0, 110.0), "far": _location(45.0, 125.0)}
+    dest_locations = {"a": _location(35.1, 110.0), "b": _location(35.2, 110.0)}
+
+    flows, stats = _solve_batched_transportation_problem(
+        supplies, demands, source_locations, dest_locations, Commodity("hot_metal"), Config(), is_hot_commodity=True
+    )
+
+    assert stats["infeasible_pairs"] == 2
+    assert stats["infeasible_flow_volume"] == pytest.approx(100.0)
+    assert sum(volume for (sid, _), volume in flows.items() if sid == "near") == pytest.approx(100.0)
+
+    with pytest.raises(RuntimeError, match="STRICT-RADIUS"):
+        _solve_batched_transportation_problem(
+            supplies,
+            demands,
+            source_locations,
+            dest_locations,
+            Commodity("hot_metal"),
+            Config(),
+            is_hot_commodity=True,
+            strict_radius=True,
+        )
+
+
+def test_strict_components_solved_together_match_separate_solves():
+    rng = np.random.default_rng(3)
+    supplies, demands, source_locations, dest_locations = {}, {}, {}, {}
+    # Four pockets ~1000 km apart, each balanced
+    for pocket in range(4):
+        lat, lon = 20.0 + 10 * pocket, 100.0 + 5 * pocket
+        pocket_supplies = {f"p{pocket}_s{i}": float(rng.uniform(50, 500)) for i in range(3)}
+        total = sum(pocket_supplies.values())
+        pocket_demands = {f"p{pocket}_d{j}": total / 4 for j in range(4)}
+        supplies |= pocket_supplies
+        demands |= pocket_demands
+        source_locations |= {sid: _location(lat + rng.uniform(0, 0.5), lon) for sid in pocket_supplies}
+        dest_locations |= {did: _location(lat, lon + rng.uniform(0, 0.5)) for did in pocket_demands}
+
+    flows, stats = _solve_strict_by_components(
+        supplies, demands, source_locations, dest_locations, Commodity("hot_metal"), Config()
+    )
+
+    separate: dict[tuple[str, str], float] = {}
+    for pocket in range(4):
+        pocket_flows, _ = _solve_batched_transportation_problem(
+            {k: v for k, v in supplies.items() if k.startswith(f"p{pocket}_")},
+            {k: v for k, v in demands.items() if k.startswith(f"p{pocket}_")},
+            source_locations,
+            dest_locations,
+            Commodity("hot_metal"),
+            Config(),
+            is_hot_commodity=True,
+            strict_radius=True,
+        )
+        separate |= pocket_flows
+    assert flows.keys() == separate.keys()
+    for key in flows:
+        assert flows[key] == pytest.approx(separate[key], abs=1e-6)
+    assert all(sid.split("_")[0] == did.split("_")[0] for sid, did in flows)
+    assert stats["total_pairs"] == 4 * 3 * 4
+    assert stats["dest_unmet_demand"] == {}
+
+
+def test_strict_components_reduce_demand_that_cannot_be_reached():
+    # d_a and d_b are only reachable from s_small; s_big can only serve d_c
+    supplies = {"s_small": 100.0, "s_big": 500.0}
+    demands = {"d_a": 200.0, "d_b": 200.0, "d_c": 200.0}
+    source_locations = {"s_small": _location(35.0, 110.0), "s_big": _location(35.0, 113.0)}
+    dest_locations = {"d_a": _location(35.0, 109.5), "d_b": _location(35.2, 109.6), "d_c": _location(35.0, 111.5)}
+
+    flows, stats = _solve_strict_by_components(
+        supplies, demands, source_locations, dest_locations, Commodity("hot_metal"), Config()
+    )
+
+    # The max flow is 100 t (s_small) + 200 t (s_big → d_c); the rest is unmet
+    assert sum(flows.values()) == pytest.approx(300.0)
+    assert sum(stats["dest_unmet_demand"].values()) == pytest.approx(300.0)
+    assert _totals(flows, 1)["d_c"] == pytest.approx(200.0)
+
+
+def test_solve_transport_blocks_maximises_flow_per_block():
+    blocks = [
+        TransportBlock(
+            supplies=np.array([5.0, 5.0]),
+            demands=np.array([8.0]),
+            edge_source=np.array([0, 1]),
+            edge_dest=np.array([0, 0]),
+            edge_cost=np.zeros(2),
+        ),
+        TransportBlock(
+            supplies=np.array([3.0]),
+            demands=np.array([1.0, 1.0]),
+            edge_source=np.array([0]),
+            edge_dest=np.array([1]),
+            edge_cost=np.zeros(1),
+        ),
+    ]
+
+    max_flows = solve_transport_blocks(blocks, maximise_flow=True)
+
+    assert max_flows[0].sum() == pytest.approx(8.0)
+    assert max_flows[1].sum() == pytest.approx(1.0)
+    # Balanced min-cost mode cannot ship the second block's supply
+    assert solve_transport_blocks(blocks) is None
@@ -0,0 +1,77 @@
+"""Tests for the workbook session that parses the master Excel file once for all readers."""
+
+import pandas as pd
+import pytest
+
+from steelo.adapters.dataprocessing.excel_reader import read_legal_process_connectors
+from steelo.adapters.dataprocessing.master_excel_reader import MasterExcelReader
+from steelo.adapters.dataprocessing.workbook_session import PARSE_COUNTS, WorkbookSession, read_sheet, sheet_names
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    path = tmp_path / "master_input.xlsx"
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame(
+            {"from_process": ["iron_bf", "steel_supply"], "to_process": ["steel_bof", "steel_demand"]}
+        ).to_excel(writer, sheet_name="Legal Process connectors", index=False)
+        pd.DataFrame({"ISO-3 Code": ["DEU", "FRA"], "Railway capex": [1.5, 2.0]}).to_excel(
+            writer, sheet_name="Railway cost", index=False
+        )
+        pd.DataFrame({"Tech": ["BF", "EAF"], "BF": ["YES", None], "EAF": ["YES", "YES"]}).to_excel(
+            writer, sheet_name="Allowed tech switches", index=False
+        )
+    return path
+
+
+def test_session_parses_workbook_once_and_caches_sheets(workbook_path):
+    with WorkbookSession(workbook_path) as workbook:
+        first = workbook.read_sheet("Railway cost")
+        first.loc[0, "Railway capex"] = 99.0  # callers get copies, the cache stays intact
+        second = read_sheet(workbook, "Railway cost")
+        connectors = workbook.read_sheet("Legal Process connectors")
+        indexed = workbook.read_sheet("Railway cost", index_col=0)
+
+    assert second["Railway capex"].tolist() == [1.5, 2.0]
+    assert len(connectors) == 2
+    assert indexed.index.tolist() == ["DEU", "FRA"]
+    assert workbook.parse_count == 1
+    assert (workbook.sheets_read, workbook.cache_hits) == (3, 1)
+
+
+def test_path_reads_are_served_by_the_open_session(workbook_path):
+    key = str(workbook_path.resolve())
+    parses_before = PARSE_COUNTS[key]
+
+    with WorkbookSession(workbook_path) as workbook:
+        connectors = read_legal_process_connectors(workbook_path)
+        connectors_again = read_legal_process_connectors(str(workbook_path))
+        assert "Railway cost" in sheet_names(workbook_path)
+
+    assert [c.from_technology_name for c in connectors] == ["BF", "steel_supply"]
+    assert len(connectors_again) == 2
+    assert PARSE_COUNTS[key] - parses_before == 1
+    assert workbook.cache_hits == 1
+
+    # Without a session every read parses the workbook again
+    read_legal_process_connectors(workbook_path)
+    read_legal_process_connectors(workbook_path)
+    assert PARSE_COUNTS[key] - parses_before == 3
+
+
+def test_missing_sheet_raises_value_error(workbook_path):
+    with WorkbookSession(workbook_path) as workbook:
+        with pytest.raises(ValueError):
+            workbook.read_sheet("Does not exist")
+
+
+def test_master_excel_reader_shares_the_open_session(workbook_path, tmp_path):
+    with WorkbookSession(workbook_path) as workbook:
+        with MasterExcelReader(workbook_path, output_dir=tmp_path / "out") as reader:
+            result = reader.read_railway_cost()
+            assert reader._workbook is workbook
+        # The reader does not close a session it did not open
+        assert workbook.read_sheet("Railway cost")["ISO-3 Code"].tolist() == ["DEU", "FRA"]
+
+    assert result.success
+    assert workbook.parse_count == 1
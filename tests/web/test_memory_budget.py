@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+from datetime import timedelta
+from unittest.mock import patch
+
+import psutil
+import pytest
+from django.utils import timezone
+
+from steeloweb.memory_budget import DEFAULT_PEAK_MEMORY_MB, SAFETY_MARGIN, predict_peak_memory_mb
+from steeloweb.models import ModelRun, Worker
+from steeloweb.worker_supervisor import MB, WorkerSupervisor
+
+
+def features(years=10, clustering=False, data_size_mb=100.0):
+    return {"years": years, "clustering": clustering, "geo_resolution": 0.25, "data_size_mb": data_size_mb}
+
+
+def test_prediction_without_history_is_the_default_peak():
+    assert predict_peak_memory_mb(features(), []) == DEFAULT_PEAK_MEMORY_MB
+
+
+def test_prediction_from_few_runs_is_their_highest_peak_with_margin():
+    history = [(features(years=5), 2000.0), (features(years=10), 3000.0)]
+
+    assert predict_peak_memory_mb(features(years=8), history) == pytest.approx(3000.0 * (1 + SAFETY_MARGIN))
+
+
+def test_prediction_extrapolates_over_the_simulated_years():
+    # 1000 MB base plus 100 MB per simulated year
+    history = [(features(years=years), 1000.0 + 100.0 * years) for years in (5, 10, 15, 20)]
+
+    assert predict_peak_memory_mb(features(years=30), history) == pytest.approx(4000.0 * (1 + SAFETY_MARGIN))
+
+
+def test_prediction_ignores_runs_with_other_clustering():
+    history = [(features(clustering=True), 1000.0)]
+
+    assert predict_peak_memory_mb(features(clustering=False), history) == DEFAULT_PEAK_MEMORY_MB
+
+
+def test_memory_based_limit_admits_predicted_needs_in_queue_order():
+    supervisor = WorkerSupervisor()
+    supervisor.peak_memory = 8 * 1024 * MB
+
+    assert supervisor.memory_based_limit(10 * 1024 * MB, [4 * 1024 * MB, 4 * 1024 * MB]) == 2
+    assert supervisor.memory_based_limit(10 * 1024 * MB, [12 * 1024 * MB, 1024 * MB]) == 0
+    assert supervisor.memory_based_limit(20 * 1024 * MB, [2 * 1024 * MB]) == 3
+    assert supervisor.memory_based_limit(-1024 * MB, []) == 0
+
+
+@pytest.mark.django_db
+def test_predicted_memory_needs_of_running_runs_in_queue_order():
+    now = timezone.now()
+    ModelRun.objects.create(
+        state=ModelRun.RunState.RUNNING, predicted_memory_mb=2000.0, run_started_at=now + timedelta(minutes=1)
+    )
+    ModelRun.objects.create(state=ModelRun.RunState.RUNNING, predicted_memory_mb=1000.0, run_started_at=now)
+    ModelRun.objects.create(state=ModelRun.RunState.FINISHED, predicted_memory_mb=5000.0, run_started_at=now)
+
+    needs = WorkerSupervisor().predicted_memory_needs()
+
+    assert needs == [1000 * MB, 2000 * MB]
+
+
+@pytest.mark.django_db
+def test_prediction_uses_the_peaks_of_finished_runs():
+    config = {"start_year": 2025, "end_year": 2034}
+    for _ in range(2):
+        finished = ModelRun.objects.create(state=ModelRun.RunState.FINISHED, config=config, peak_memory_mb=3000.0)
+        finished.memory_features = finished.collect_memory_features()
+        finished.save()
+    queued = ModelRun.objects.create(state=ModelRun.RunState.CREATED, config=config)
+
+    assert queued.predict_memory_need() == pytest.approx(3000.0 * (1 + SAFETY_MARGIN))
+
+
+@pytest.mark.django_db
+def test_active_worker_memory_counts_the_child_processes():
+    # The recorded peaks cover a run's child processes (plot and plant agent workers), so the memory they hold now
+    # has to be counted as well when it is added back to the budget
+    Worker.objects.create(worker_id="w1", pid=os.getpid(), state="RUNNING")
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        with patch.object(Worker, "is_same_process", return_value=True):
+            memory = WorkerSupervisor().active_worker_memory()
+        child_rss = psutil.Process(child.pid).memory_info().rss
+    finally:
+        child.kill()
+        child.wait()
+
+    assert child_rss > 0
+    assert memory >= psutil.Process().memory_info().rss + child_rss * 0.5
@@ -0,0 +1,85 @@
+import pytest
+from django.urls import reverse
+
+from steelo.utilities.tracing import SpanTracer
+from steeloweb.models import ModelRun
+
+
+@pytest.fixture
+def traced_output_directory(tmp_path):
+    tracer = SpanTracer()
+    with tracer.activate(), tracer.start_span("simulation"):
+        for year in (2025, 2026):
+            with tracer.start_span("year", year=year), tracer.start_span("PlantAgentsModel"):
+                pass
+    tracer.write_reports(tmp_path / "performance")
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_detail_shows_phase_breakdown(client, traced_output_directory):
+    modelrun = ModelRun.objects.create(state=ModelRun.RunState.FINISHED, output_directory=str(traced_output_directory))
+
+    response = client.get(reverse("modelrun-detail", args=[modelrun.pk]))
+
+    assert response.status_code == 200
+    assert [phase["name"] for phase in response.context["phase_breakdown"]] == [
+        "simulation",
+        "year",
+        "PlantAgentsModel",
+    ]
+    content = response.content.decode("utf-8")
+    assert "Performance" in content
+    assert "PlantAgentsModel" in content
+
+
+@pytest.mark.django_db
+def test_detail_hides_phase_breakdown_without_report(client, tmp_path):
+    modelrun = ModelRun.objects.create(state=ModelRun.RunState.RUNNING, output_directory=str(tmp_path))
+
+    response = client.get(reverse("modelrun-detail", args=[modelrun.pk]))
+
+    assert response.status_code == 200
+    assert response.context["phase_breakdown"] == []
+    assert "performance/trace.json" not in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_record_memory_usage_takes_the_peak_from_the_phase_summary(traced_output_directory):
+    modelrun = ModelRun.objects.create(
+        state=ModelRun.RunState.RUNNING,
+        output_directory=str(traced_output_directory),
+        config={"start_year": 2025, "end_year": 2026},
+    )
+
+    assert modelrun.record_memory_usage()
+
+    peaks = [phase["peak_rss_mb"] for phase in modelrun.get_phase_breakdown(max_depth=None)]
+    assert modelrun.peak_memory_mb == max(peaks)
+    assert modelrun.memory_features["years"] == 2
+
+
+@pytest.mark.django_db
+def test_record_memory_usage_without_report(tmp_path):
+    modelrun = ModelRun.objects.create(state=ModelRun.RunState.RUNNING, output_directory=str(tmp_path))
+
+    assert not modelrun.record_memory_usage()
+    assert modelrun.peak_memory_mb is None
+
+
+@pytest.mark.django_db
+def test_detail_shows_predicted_and_measured_memory(client, tmp_path):
+    modelrun = ModelRun.objects.create(
+        state=ModelRun.RunState.FINISHED,
+        output_directory=str(tmp_path),
+        predicted_memory_mb=4321.0,
+        peak_memory_mb=3210.0,
+    )
+
+    response = client.get(reverse("modelrun-detail", args=[modelrun.pk]))
+
+    content = response.content.decode("utf-8")
+    assert "Performance" in content
+    assert "Predicted peak memory" in content
+    assert "Measured peak memory" in content
+    assert "4321 MB" in content
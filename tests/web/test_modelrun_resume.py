@@ -0,0 +1,88 @@
+import types
+from unittest.mock import Mock
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from steeloweb.models import ModelRun
+
+
+@pytest.fixture(autouse=True)
+def _no_worker_check(monkeypatch):
+    """Allow resume tests to bypass worker capacity checks."""
+
+    monkeypatch.setattr(
+        "steeloweb.views_worker.check_worker_availability_for_simulation",
+        lambda: {"status": "ok", "message": "", "data": {}},
+    )
+
+
+@pytest.fixture
+def output_directory(tmp_path):
+    snapshots = tmp_path / "snapshots"
+    snapshots.mkdir()
+    for year in (2029, 2030):
+        (snapshots / f"snapshot_year_{year}.pkl").write_bytes(b"")
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_detail_shows_resume_button_when_a_snapshot_exists(client, output_directory):
+    modelrun = ModelRun.objects.create(
+        state=ModelRun.RunState.CANCELLED, output_directory=str(output_directory), error_message="Canceled"
+    )
+
+    response = client.get(reverse("modelrun-detail", args=[modelrun.pk]))
+    assert response.status_code == 200
+    assert "Resume from 2031" in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_detail_hides_resume_button_without_snapshot(client, tmp_path):
+    modelrun = ModelRun.objects.create(
+        state=ModelRun.RunState.FAILED, output_directory=str(tmp_path), error_message="Out of memory"
+    )
+
+    response = client.get(reverse("modelrun-detail", args=[modelrun.pk]))
+    assert response.status_code == 200
+    assert "Resume from" not in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_resume_resets_and_enqueues_after_latest_snapshot(client, monkeypatch, output_directory):
+    modelrun = ModelRun.objects.create(
+        state=ModelRun.RunState.FAILED,
+        output_directory=str(output_directory),
+        error_message="Out of memory",
+        finished_at=timezone.now(),
+    )
+
+    fake_result = types.SimpleNamespace(id="resumed-task")
+    enqueue_stub = Mock(return_value=fake_result)
+    monkeypatch.setattr("steeloweb.views.run_simulation_task", types.SimpleNamespace(enqueue=enqueue_stub))
+
+    response = client.post(reverse("resume-modelrun", args=[modelrun.pk]))
+    assert response.status_code == 302
+
+    modelrun.refresh_from_db()
+    assert modelrun.state == ModelRun.RunState.RUNNING
+    assert modelrun.resume_from_year == 2031
+    assert modelrun.error_message == ""
+    enqueue_stub.assert_called_once_with(modelrun.pk)
+
+    # A plain rerun starts from scratch again
+    modelrun.reset_for_rerun()
+    assert modelrun.resume_from_year is None
+
+
+@pytest.mark.django_db
+def test_resume_rejects_runs_without_snapshot(client, tmp_path):
+    modelrun = ModelRun.objects.create(state=ModelRun.RunState.FAILED, output_directory=str(tmp_path))
+
+    response = client.post(reverse("resume-modelrun", args=[modelrun.pk]))
+    assert response.status_code == 302
+
+    modelrun.refresh_from_db()
+    assert modelrun.state == ModelRun.RunState.FAILED
+    assert modelrun.resume_from_year is None